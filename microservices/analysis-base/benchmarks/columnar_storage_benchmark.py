@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Columnar Storage Benchmark
+
+Stores analysis artifacts (default 200 artifacts of 5,000 result rows,
+spread over 8 tenants and 10 days) and reads them back, comparing:
+- the current DataStorage destinations: a fixed simulated latency per
+  store or document lookup, measured on a handful of artifacts (nothing is
+  persisted, so reads return placeholder documents)
+- row-oriented files: one JSON document per result row, appended to a file
+  per tenant, read back by parsing every row and filtering in Python
+- the columnar store: Parquet files partitioned by tenant and date, read
+  with partition pruning, predicate pushdown and column projection
+
+Row-oriented reads build Python dicts, columnar reads return Arrow tables;
+both are checked for the same rows.
+
+Usage:
+    python benchmarks/columnar_storage_benchmark.py --artifacts 200 --rows 5000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.data_storage.columnar_store import ColumnarStore
+from src.data_storage.data_storage import DataStorage
+
+TENANTS = [f"tenant-{i}" for i in range(8)]
+DAYS = [f"2024-03-{day:02d}" for day in range(1, 11)]
+
+
+def make_artifact(index, rows, rng):
+    return {
+        "storage_id": f"data_{index}",
+        "tenant_id": TENANTS[index % len(TENANTS)],
+        "timestamp": f"{DAYS[index % len(DAYS)]}T12:00:00",
+        "template_id": "churn",
+        "results": [
+            {
+                "user_id": f"user-{rng.randrange(100_000)}",
+                "segment": rng.choice(["new", "active", "dormant"]),
+                "sessions": rng.randrange(500),
+                "spend": round(rng.gammavariate(2.0, 40.0), 2),
+                "score": rng.random(),
+            }
+            for _ in range(rows)
+        ],
+    }
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(base, name)) for base, _, names in os.walk(path) for name in names)
+
+
+def row_write(root, artifacts):
+    """Row-oriented persistence: one JSON line per result, a file per tenant."""
+    for artifact in artifacts:
+        date = artifact["timestamp"][:10]
+        with open(os.path.join(root, f"{artifact['tenant_id']}.jsonl"), "a", encoding="utf-8") as handle:
+            for record in artifact["results"]:
+                handle.write(json.dumps({"storage_id": artifact["storage_id"], "date": date, **record}) + "\n")
+
+
+def row_read(root, tenant, start_date=None, end_date=None, predicate=None, columns=None):
+    rows = []
+    with open(os.path.join(root, f"{tenant}.jsonl"), encoding="utf-8") as handle:
+        for line in handle:
+            row = json.loads(line)
+            if start_date and row["date"] < start_date or end_date and row["date"] > end_date:
+                continue
+            if predicate and not predicate(row):
+                continue
+            rows.append({column: row[column] for column in columns} if columns else row)
+    return rows
+
+
+def columnar_write(store, artifacts):
+    for artifact in artifacts:
+        records = [{"storage_id": artifact["storage_id"], **record} for record in artifact["results"]]
+        store.append("results", records, tenant_id=artifact["tenant_id"], day=artifact["timestamp"])
+
+
+async def current_implementation(artifacts):
+    storage = DataStorage(columnar_path=tempfile.gettempdir())
+    start = time.perf_counter()
+    for artifact in artifacts:
+        await storage.store_processed_data(artifact)
+    write_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for artifact in artifacts:
+        await storage.nosql_db.get_document(artifact["storage_id"])
+    return write_seconds, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the columnar storage backend")
+    parser.add_argument("--artifacts", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=5000, help="Result rows per artifact")
+    parser.add_argument("--current-artifacts", type=int, default=5,
+                        help="Artifacts stored through the current simulated destinations")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    rng = random.Random(0)
+    artifacts = [make_artifact(index, args.rows, rng) for index in range(args.artifacts)]
+    total_rows = args.artifacts * args.rows
+    print(f"{args.artifacts:,} artifacts, {total_rows:,} result rows, {len(TENANTS)} tenants, {len(DAYS)} days")
+
+    write_seconds, read_seconds = asyncio.run(current_implementation(artifacts[:args.current_artifacts]))
+    print(f"{'current (simulated)':<28} write {write_seconds / args.current_artifacts * 1000:8.1f} ms/artifact"
+          f"  read {read_seconds / args.current_artifacts * 1000:8.1f} ms/artifact (placeholder data)")
+
+    tenant = TENANTS[0]
+    queries = {
+        "tenant, all rows": dict(),
+        "tenant, 2 days": dict(start_date=DAYS[2], end_date=DAYS[3]),
+        "tenant, score > 0.99": dict(filters=[("score", ">", 0.99)], predicate=lambda row: row["score"] > 0.99),
+        "tenant, 2 columns": dict(columns=["user_id", "score"]),
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        row_root = os.path.join(directory, "rows")
+        os.makedirs(row_root)
+        store = ColumnarStore(os.path.join(directory, "columnar"))
+
+        row_seconds, _ = timed(row_write, row_root, artifacts)
+        columnar_seconds, _ = timed(columnar_write, store, artifacts)
+        print(f"{'write':<28} rows {row_seconds:7.2f} s  columnar {columnar_seconds:7.2f} s"
+              f"  ({total_rows / columnar_seconds:,.0f} rows/s, {row_seconds / columnar_seconds:.1f}x)")
+        print(f"{'size':<28} rows {directory_size(row_root) / 2 ** 20:7.1f} MiB"
+              f"  columnar {directory_size(store.root) / 2 ** 20:7.1f} MiB")
+
+        for label, query in queries.items():
+            predicate = query.pop("predicate", None)
+            filters = query.pop("filters", None)
+            row_seconds, rows = timed(lambda: row_read(row_root, tenant, predicate=predicate, **query))
+            columnar_seconds, table = timed(lambda: store.scan("results", tenant_id=tenant, filters=filters, **query))
+            assert table.num_rows == len(rows), label
+            if "columns" in query:
+                assert sorted(table.column("score").to_pylist()) == sorted(row["score"] for row in rows)
+            print(f"{'read ' + label:<28} rows {row_seconds:7.2f} s  columnar {columnar_seconds:7.3f} s"
+                  f"  ({row_seconds / columnar_seconds:.0f}x, {table.num_rows:,} rows)")
+
+
+if __name__ == "__main__":
+    main()
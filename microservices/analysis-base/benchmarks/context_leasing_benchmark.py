@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Context Leasing Benchmark
+
+Runs concurrent workers (default 16) that drain a queue of pending contexts
+in batches, processing and completing each context, and compares:
+- the legacy claim: find pending contexts, take one Redis SET NX lock per
+  context, then mark each won context as processing; locks are released
+  with a Lua compare-and-delete on completion
+- leases: candidates are leased with one conditional update_many and
+  fetched back by the lease token (ContextLeases.claim_batch)
+
+MongoDB and Redis are in-memory with a simulated round-trip latency, and
+operations are applied atomically as on the server. Reported per approach:
+round trips spent on claiming, claim attempts lost to other workers and
+contexts processed more than once. A legacy worker that loses every
+candidate waits one poll interval before trying again.
+
+Usage:
+    python benchmarks/context_leasing_benchmark.py --contexts 2000 --workers 16 --batch-size 10
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from collections import Counter
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.repository.context_leases import CLAIM_SORT, ContextLeases
+from tests.mongo_fakes import InMemoryCollection
+
+
+class InMemoryRedis:
+    """Redis SET NX and the lock release script, with simulated latency."""
+
+    def __init__(self, latency):
+        self.keys = {}
+        self.latency = latency
+        self.task_round_trips = Counter()
+
+    async def _call(self, operation):
+        self.task_round_trips[asyncio.current_task()] += 1
+        await asyncio.sleep(self.latency / 2)
+        result = operation()
+        await asyncio.sleep(self.latency / 2)
+        return result
+
+    async def set(self, key, value, nx=False, ex=None):
+        def operation():
+            if nx and key in self.keys:
+                return None
+            self.keys[key] = value
+            return True
+        return await self._call(operation)
+
+    async def eval(self, script, numkeys, key, value):
+        def operation():
+            if self.keys.get(key) == value:
+                del self.keys[key]
+                return 1
+            return 0
+        return await self._call(operation)
+
+
+def make_contexts(count):
+    return [
+        {"_id": i, "status": "pending", "created_at": f"2024-01-01T00:00:00.{i:06d}"}
+        for i in range(count)
+    ]
+
+
+def round_trips(*stores):
+    """Round trips made by the current worker."""
+    task = asyncio.current_task()
+    return sum(store.task_round_trips[task] for store in stores)
+
+
+class Stats:
+    def __init__(self):
+        self.claim_round_trips = 0
+        self.lost = 0
+        self.processed = Counter()
+
+
+async def legacy_worker(worker_id, collection, redis, batch_size, process_seconds, poll_seconds, stats):
+    """The pre-lease claim of Repository plus the worker's status update."""
+    while True:
+        before = round_trips(collection, redis)
+        query = {
+            "status": "pending",
+            "$or": [
+                {"retry_metadata.next_retry_at": {"$lte": datetime.utcnow().isoformat()}},
+                {"retry_metadata.next_retry_at": {"$exists": False}}
+            ]
+        }
+        candidates = await collection.find(query).sort(CLAIM_SORT).limit(batch_size * 2).to_list()
+        if not candidates:
+            return
+
+        claimed = []
+        for context in candidates:
+            if len(claimed) >= batch_size:
+                break
+            if await redis.set(f"analysis:lock:{context['_id']}", worker_id, nx=True, ex=300):
+                claimed.append(context)
+            else:
+                stats.lost += 1
+
+        for context in claimed:
+            await collection.update_one({"_id": context["_id"]}, {"$set": {"status": "processing"}})
+        stats.claim_round_trips += round_trips(collection, redis) - before
+        if not claimed:
+            await asyncio.sleep(poll_seconds)
+
+        for context in claimed:
+            await asyncio.sleep(process_seconds)
+            stats.processed[context["_id"]] += 1
+            await collection.update_one({"_id": context["_id"]}, {"$set": {"status": "completed"}})
+            await redis.eval("release", 1, f"analysis:lock:{context['_id']}", worker_id)
+
+
+async def lease_worker(worker_id, collection, batch_size, process_seconds, stats):
+    """Claims with ContextLeases."""
+    leases = ContextLeases(collection, owner=worker_id)
+    while True:
+        before = round_trips(collection)
+        claimed = await leases.claim_batch(batch_size)
+        stats.claim_round_trips += round_trips(collection) - before
+        if not claimed:
+            return
+
+        for context in claimed:
+            await asyncio.sleep(process_seconds)
+            stats.processed[context["_id"]] += 1
+            await collection.update_one(
+                {"_id": context["_id"]},
+                {"$set": {"status": "completed"}, "$unset": {"lease": ""}}
+            )
+
+
+class CountingCollection(InMemoryCollection):
+    """Counts candidates that were already taken when update_many ran."""
+
+    def __init__(self, *args, stats=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+
+    async def update_many(self, query, update):
+        result = await super().update_many(query, update)
+        if "_id" in query:
+            self.stats.lost += len(query["_id"]["$in"]) - result.modified_count
+        return result
+
+
+async def run_legacy(args):
+    stats = Stats()
+    collection = InMemoryCollection(make_contexts(args.contexts), latency=args.rtt_ms / 1000)
+    redis = InMemoryRedis(args.rtt_ms / 1000)
+    await asyncio.gather(*(
+        legacy_worker(
+            f"worker-{i}", collection, redis, args.batch_size, args.process_ms / 1000, args.poll_ms / 1000, stats
+        )
+        for i in range(args.workers)
+    ))
+    return stats
+
+
+async def run_leases(args):
+    stats = Stats()
+    collection = CountingCollection(make_contexts(args.contexts), latency=args.rtt_ms / 1000, stats=stats)
+    await asyncio.gather(*(
+        lease_worker(f"worker-{i}", collection, args.batch_size, args.process_ms / 1000, stats)
+        for i in range(args.workers)
+    ))
+    return stats
+
+
+def report(name, stats, contexts):
+    duplicates = sum(count - 1 for count in stats.processed.values() if count > 1)
+    assert len(stats.processed) == contexts, f"{name}: {contexts - len(stats.processed)} contexts never processed"
+    print(
+        f"{name:<8} {stats.claim_round_trips:>12,} {stats.claim_round_trips / contexts:>10.2f} "
+        f"{stats.lost:>10,} {duplicates:>11,}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lease-based context claiming")
+    parser.add_argument("--contexts", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="Simulated round trip per call")
+    parser.add_argument("--process-ms", type=float, default=1.0, help="Simulated processing per context")
+    parser.add_argument("--poll-ms", type=float, default=10.0, help="Legacy wait after losing every candidate")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    print(f"{args.contexts:,} contexts, {args.workers} workers, batches of {args.batch_size}, {args.rtt_ms} ms RTT")
+    print(f"{'claim':<8} {'round trips':>12} {'per ctx':>10} {'lost':>10} {'duplicates':>11}")
+    report("legacy", asyncio.run(run_legacy(args)), args.contexts)
+    report("leases", asyncio.run(run_leases(args)), args.contexts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Descriptive Scoring Benchmark
+
+Scores factors, batches and users and links users to factors for synthetic
+tenants (default 1M interactions in total), and compares:
+- the legacy implementation: a boolean mask over the tenant's frame and
+  per-column statistics for every entity, plus one value_counts per user
+  and category for the links. It is timed on a sample of entities and
+  extrapolated to all of them, since a full run takes tens of minutes.
+- the scoring engine: one groupby aggregation per entity type and a sparse
+  (user x value) join for the links
+
+It also counts repository round trips for persisting the results: one
+store_factor / store_secret_sauce / link_factor_to_entity call per record
+before, versus one bulk upsert per chunk. The persistence time is
+modelled from a fixed round-trip latency.
+
+Usage:
+    python benchmarks/descriptive_scoring_benchmark.py --interactions 1000000 --tenants 4
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from src.modules.descriptive_module.helpers.scoring_engine import (
+    EntityScores,
+    link_users_to_factors,
+    numeric_columns,
+)
+
+CATEGORIES = ["channel", "segment"]
+
+
+def make_tenant(interactions, users, seed):
+    """Synthetic interactions for one tenant."""
+    rng = np.random.default_rng(seed)
+    user_codes = rng.integers(0, users, interactions)
+    return pd.DataFrame({
+        "id": np.arange(interactions),
+        "user_id": np.array([f"user_{seed}_{code}" for code in range(users)], dtype=object)[user_codes],
+        "batch_id": np.array([f"batch_{seed}_{code}" for code in range(200)], dtype=object)[
+            rng.integers(0, 200, interactions)
+        ],
+        "channel": np.array([f"channel_{code}" for code in range(12)], dtype=object)[
+            (user_codes + rng.integers(0, 3, interactions)) % 12
+        ],
+        "segment": np.array([f"segment_{code}" for code in range(40)], dtype=object)[
+            rng.integers(0, 40, interactions)
+        ],
+        "engagement": rng.gamma(2.0, 5.0, interactions),
+        "conversion": (rng.random(interactions) < 0.1).astype(float),
+    })
+
+
+def legacy_stats(entity_data, columns):
+    return {
+        col: {
+            "mean": float(entity_data[col].mean()),
+            "median": float(entity_data[col].median()),
+            "std": float(entity_data[col].std()) if len(entity_data) > 1 else 0.0,
+            "min": float(entity_data[col].min()),
+            "max": float(entity_data[col].max()),
+            "count": int(len(entity_data)),
+        }
+        for col in columns
+    }
+
+
+def legacy_time_per_entity(df, key, columns, sample, link=False):
+    """Average legacy time per entity, measured on a sample of entities."""
+    entities = df[key].unique()[:sample]
+    start = time.perf_counter()
+    for entity in entities:
+        entity_data = df[df[key] == entity]
+        legacy_stats(entity_data, columns)
+        if link:
+            for category in CATEGORIES:
+                entity_data[category].value_counts().index[0]
+    return (time.perf_counter() - start) / len(entities)
+
+
+def engine_run(df):
+    """Score every entity type and build the user links with the engine."""
+    records = 0
+    for category in CATEGORIES:
+        metrics = numeric_columns(df, ["timestamp", "date", "id", "user_id", category])
+        records += sum(1 for _ in EntityScores(df, category, metrics).records())
+    records += sum(1 for _ in EntityScores(df, "batch_id", numeric_columns(df, ["batch_id", "id", "user_id"])).records())
+    records += sum(1 for _ in EntityScores(df, "user_id", numeric_columns(df, ["user_id", "id", "batch_id"])).records())
+    links = link_users_to_factors(df, "20240101000000")
+    return records, len(links)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the descriptive scoring engine")
+    parser.add_argument("--interactions", type=int, default=1_000_000, help="Interactions across all tenants")
+    parser.add_argument("--tenants", type=int, default=4)
+    parser.add_argument("--users", type=int, default=12_500, help="Users per tenant")
+    parser.add_argument("--sample", type=int, default=50, help="Entities timed for the legacy estimate")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="Modelled repository round trip")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    per_tenant = args.interactions // args.tenants
+    tenants = [make_tenant(per_tenant, args.users, seed) for seed in range(args.tenants)]
+    print(f"{args.tenants} tenants x {per_tenant:,} interactions, {args.users:,} users each")
+
+    engine_seconds, legacy_seconds = 0.0, 0.0
+    records, links = 0, 0
+    for df in tenants:
+        start = time.perf_counter()
+        tenant_records, tenant_links = engine_run(df)
+        engine_seconds += time.perf_counter() - start
+        records += tenant_records
+        links += tenant_links
+
+        metrics = ["engagement", "conversion"]
+        for category in CATEGORIES:
+            legacy_seconds += df[category].nunique() * legacy_time_per_entity(df, category, metrics, args.sample)
+        legacy_seconds += df["batch_id"].nunique() * legacy_time_per_entity(df, "batch_id", metrics, args.sample)
+        legacy_seconds += df["user_id"].nunique() * legacy_time_per_entity(
+            df, "user_id", metrics, args.sample, link=True
+        )
+
+    print(f"scored entities: {records:,}, user-factor links: {links:,}")
+    print(f"legacy scoring (estimated): {legacy_seconds:10.1f} s")
+    print(f"engine scoring:             {engine_seconds:10.1f} s  ({legacy_seconds / engine_seconds:,.0f}x)")
+
+    # Factors, batch Secret Sauces and user links, chunked per tenant and type
+    write_counts = [
+        count
+        for df in tenants
+        for count in (
+            sum(df[category].nunique() for category in CATEGORIES),
+            df["batch_id"].nunique(),
+            df["user_id"].nunique() * len(CATEGORIES),
+        )
+    ]
+    writes = sum(write_counts)
+    bulk_calls = sum(-(-count // args.chunk_size) for count in write_counts)
+    print(f"repository writes: {writes:,} records")
+    print(f"  one call per record:  {writes:10,} round trips  ~{writes * args.rtt_ms / 1000:8.1f} s")
+    print(f"  bulk upsert per {args.chunk_size}: {bulk_calls:10,} round trips  ~{bulk_calls * args.rtt_ms / 1000:8.1f} s")
+
+
+if __name__ == "__main__":
+    main()
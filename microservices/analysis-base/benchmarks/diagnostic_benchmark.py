@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Diagnostic Engine Benchmark
+
+Times the per-category diagnostics of DiagnosticWorker (feature importance,
+strengths/weaknesses and anomalies) for one categorical column, scaling the
+number of rows and the number of distinct values, and compares:
+- the legacy implementation: a boolean mask over the whole frame per
+  distinct value, and get_dummies followed by one correlation per dummy
+  column
+- the diagnostic engine: one groupby for the group means, deviations and
+  anomaly scores as (group x metric) matrices, and one correlation between
+  a sparse one-hot encoding and all metrics
+
+Results are checked for equivalence before timing.
+
+Usage:
+    python benchmarks/diagnostic_benchmark.py --rows 10000 100000 --cardinality 10 100 1000
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from src.modules.diagnostic_module.helpers.diagnostic_engine import DiagnosticEngine
+
+METRICS = ["engagement", "conversion", "retention"]
+
+
+def make_frame(rows, cardinality, seed=0):
+    """Random data with one categorical column of the given cardinality."""
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, cardinality, rows)
+    effect = rng.normal(0, 1, cardinality)
+    frame = pd.DataFrame({
+        "factor": np.array([f"value_{code}" for code in range(cardinality)], dtype=object)[codes],
+    })
+    for position, metric in enumerate(METRICS):
+        frame[metric] = 10 + effect[codes] * (position + 1) + rng.normal(0, 2, rows)
+    frame.loc[rng.random(rows) < 0.01, "factor"] = None
+    return frame
+
+
+def legacy_diagnostics(df, category, metrics):
+    """The pre-engine implementation: one boolean mask per distinct value."""
+    importance, deviations, anomalies = {}, {}, set()
+
+    for metric in metrics:
+        dummies = pd.get_dummies(df[category], prefix=category)
+        for col in dummies.columns:
+            corr = dummies[col].corr(df[metric])
+            if not pd.isna(corr):
+                importance[f"{col.replace(f'{category}_', '')}_{metric}"] = abs(corr)
+
+    for metric in metrics:
+        overall_avg = df[metric].mean()
+        overall_std = df[metric].std()
+        for value in df[category].unique():
+            if pd.isna(value):
+                continue
+            factor_data = df[df[category] == value]
+            factor_avg = factor_data[metric].mean()
+            percent_diff = (factor_avg - overall_avg) / overall_avg * 100 if overall_avg != 0 else 0
+            if abs(percent_diff) >= 10:
+                deviations[(value, metric)] = percent_diff
+            if len(factor_data) >= 5:
+                z_score = abs((factor_avg - overall_avg) / overall_std) if overall_std != 0 else 0
+                if z_score > 2.0:
+                    anomalies.add((value, metric))
+
+    return importance, deviations, anomalies
+
+
+def engine_diagnostics(df, category, metrics):
+    """The engine implementation."""
+    engine = DiagnosticEngine(df, metrics)
+
+    correlations = engine.feature_importance(category)
+    importance = {
+        f"{value}_{metric}": abs(corr)
+        for metric in metrics
+        for value, corr in correlations[metric].items()
+        if not pd.isna(corr)
+    }
+    deviations = {
+        (row["value"], row["metric"]): row["percent_diff"]
+        for row in engine.deviations(category, threshold=10).to_dict("records")
+    }
+    flagged = engine.anomalies(category)
+    anomalies = set(zip(flagged["value"], flagged["metric"]))
+
+    return importance, deviations, anomalies
+
+
+def check_equivalent(legacy, engine):
+    legacy_importance, legacy_deviations, legacy_anomalies = legacy
+    importance, deviations, anomalies = engine
+    assert legacy_importance.keys() == importance.keys()
+    assert all(np.isclose(legacy_importance[key], importance[key], rtol=1e-9, atol=1e-12) for key in importance)
+    assert legacy_deviations.keys() == deviations.keys()
+    assert all(np.isclose(legacy_deviations[key], deviations[key], rtol=1e-9) for key in deviations)
+    assert legacy_anomalies == anomalies
+
+
+def best_of(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the diagnostic engine")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--cardinality", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    print(f"{'rows':>9} {'values':>7} {'legacy (ms)':>12} {'engine (ms)':>12} {'speedup':>8}")
+    for rows in args.rows:
+        for cardinality in args.cardinality:
+            df = make_frame(rows, cardinality)
+            legacy_time, legacy = best_of(lambda: legacy_diagnostics(df, "factor", METRICS), args.repeat)
+            engine_time, engine = best_of(lambda: engine_diagnostics(df, "factor", METRICS), args.repeat)
+            check_equivalent(legacy, engine)
+            print(
+                f"{rows:>9} {cardinality:>7} {legacy_time * 1000:>12.1f} "
+                f"{engine_time * 1000:>12.1f} {legacy_time / engine_time:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Statistics Engine Benchmark
+
+Runs the statistical analysis of one series (default 10M points) and
+compares:
+- the legacy implementation: separate numpy calls for the median and each
+  percentile, and outliers filtered from the value list with a Python list
+  comprehension (one per method)
+- the statistics engine: one percentile partition for the median and all
+  percentiles, and vectorized outlier masks
+
+It also aggregates the series in chunks generated on the fly (never
+materialized) with StreamingMoments, measuring peak traced memory against
+numpy on the full array, and merges per-worker partial aggregates against
+recomputing the whole series.
+
+Outliers are checked for equivalence and the moments for accuracy.
+
+Usage:
+    python benchmarks/statistics_benchmark.py --points 10000000 --workers 16
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+
+from src.processing.statistics_engine import StreamingMoments, describe, merge_partials, outlier_mask
+
+PERCENTILES = [25, 50, 75, 90, 95, 99]
+METHODS = ["iqr", "z_score", "percentile"]
+
+
+def make_chunk(index, size):
+    """Chunk of a skewed series with a few extreme values."""
+    rng = np.random.default_rng(index)
+    chunk = 50 + rng.gamma(2.0, 10.0, size)
+    chunk[rng.random(size) < 1e-4] *= 20
+    return chunk
+
+
+def make_series(points, chunk_size):
+    return np.concatenate([
+        make_chunk(index, min(chunk_size, points - start))
+        for index, start in enumerate(range(0, points, chunk_size))
+    ])
+
+
+def legacy_statistics(values):
+    """The pre-engine _calculate_statistics."""
+    values_array = np.array(values)
+    stats = {
+        "count": len(values),
+        "mean": float(np.mean(values_array)),
+        "median": float(np.median(values_array)),
+        "std": float(np.std(values_array)),
+        "min": float(np.min(values_array)),
+        "max": float(np.max(values_array)),
+        "sum": float(np.sum(values_array))
+    }
+    stats["percentiles"] = {str(p): float(np.percentile(values_array, p)) for p in PERCENTILES}
+    return stats
+
+
+def legacy_outliers(values, method):
+    """The pre-engine _detect_outliers."""
+    values_array = np.array(values)
+    if method == "iqr":
+        q1 = np.percentile(values_array, 25)
+        q3 = np.percentile(values_array, 75)
+        iqr = q3 - q1
+        lower_bound, upper_bound = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+        return [v for v in values if v < lower_bound or v > upper_bound]
+    if method == "z_score":
+        mean = np.mean(values_array)
+        std = np.std(values_array)
+        return [v for v in values if abs((v - mean) / std) > 3.0]
+    lower_bound = np.percentile(values_array, 1)
+    upper_bound = np.percentile(values_array, 99)
+    return [v for v in values if v < lower_bound or v > upper_bound]
+
+
+def engine_outliers(values, method):
+    values_array = np.asarray(values, dtype=float)
+    return values_array[outlier_mask(values_array, method)].tolist()
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def traced(function, *args):
+    """Run a function and return its time, result and peak traced memory."""
+    tracemalloc.start()
+    seconds, result = timed(function, *args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, result, peak
+
+
+def relative_error(actual, expected):
+    return abs(actual - expected) / abs(expected)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the statistics engine")
+    parser.add_argument("--points", type=int, default=10_000_000)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=16, help="Partial aggregates to merge")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    series = make_series(args.points, args.chunk_size)
+    values = series.tolist()
+    print(f"{args.points:,} points")
+
+    # Component statistics and outliers on the value list
+    legacy_seconds, legacy = timed(legacy_statistics, values)
+    engine_seconds, engine = timed(describe, values, PERCENTILES)
+    assert all(np.isclose(legacy["percentiles"][p], engine["percentiles"][p]) for p in legacy["percentiles"])
+    print(f"{'statistics':<22} legacy {legacy_seconds:7.2f} s  engine {engine_seconds:7.2f} s"
+          f"  ({legacy_seconds / engine_seconds:.1f}x)")
+
+    for method in METHODS:
+        legacy_seconds, legacy = timed(legacy_outliers, values, method)
+        engine_seconds, engine = timed(engine_outliers, values, method)
+        assert legacy == engine, method
+        print(f"{'outliers ' + method:<22} legacy {legacy_seconds:7.2f} s  engine {engine_seconds:7.2f} s"
+              f"  ({legacy_seconds / engine_seconds:.1f}x, {len(engine):,} outliers)")
+    del values
+
+    # Moments over generated chunks versus the materialized array
+    def chunks():
+        for index, start in enumerate(range(0, args.points, args.chunk_size)):
+            yield make_chunk(index, min(args.chunk_size, args.points - start))
+
+    def numpy_moments():
+        array = make_series(args.points, args.chunk_size)
+        deviations = array - array.mean()
+        return array.mean(), (deviations ** 2).mean(), (deviations ** 3).mean()
+
+    numpy_seconds, (mean, variance, third), numpy_peak = traced(numpy_moments)
+    stream_seconds, moments, stream_peak = traced(StreamingMoments.from_chunks, chunks())
+    assert relative_error(moments.mean, mean) < 1e-12
+    assert relative_error(moments.variance(), variance) < 1e-9
+    assert relative_error(moments.m3 / moments.count, third) < 1e-8
+    print(f"{'moments (full array)':<22} {numpy_seconds:7.2f} s  peak {numpy_peak / 2 ** 20:8.1f} MiB")
+    print(f"{'moments (streamed)':<22} {stream_seconds:7.2f} s  peak {stream_peak / 2 ** 20:8.1f} MiB")
+
+    # Per-worker partials merged versus recomputing the whole series
+    parts = np.array_split(series, args.workers)
+    partials = [StreamingMoments.from_values(part).to_dict() for part in parts]
+    merge_seconds, merged = timed(merge_partials, partials)
+    full_seconds, full = timed(StreamingMoments.from_values, series)
+    assert relative_error(merged.variance(), full.variance()) < 1e-9
+    assert relative_error(merged.kurtosis + 3, full.kurtosis + 3) < 1e-9
+    print(f"{'merge ' + str(args.workers) + ' partials':<22} {merge_seconds * 1e6:7.0f} us"
+          f"  vs recompute {full_seconds * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+User Data Client Benchmark
+
+Looks up the users of a workload (default 2,000 lookups over 1,000 users,
+some repeated) against a local stub of the User Data Service with a
+simulated per-request latency, and compares:
+- the legacy client: one GET per user, a fresh connection per lookup, and
+  an unbounded dict cache consulted sequentially
+- get_users: cache hits served locally, the remaining users fetched with
+  one bulk request per chunk, chunks in parallel
+- concurrent get_user_info calls: duplicate lookups in flight coalesced
+  into one request
+
+Results are checked for equivalence and request counts are reported.
+
+Usage:
+    python benchmarks/user_data_client_benchmark.py --lookups 2000 --users 1000 --latency-ms 5
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx
+import structlog
+
+from src.repository.user_data_client import UserDataClient
+from tests.user_service_stub import UserServiceStub, make_users
+
+
+async def legacy_lookups(base_url, user_ids):
+    """The pre-batch get_user_info, called once per lookup."""
+    cache = {}
+    results = {}
+    for user_id in user_ids:
+        if user_id in cache:
+            results[user_id] = cache[user_id]
+            continue
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.get(f"{base_url}/api/v1/users/{user_id}")
+        user_info = response.json() if response.status_code == 200 else None
+        if user_info is not None:
+            cache[user_id] = user_info
+        results[user_id] = user_info
+    return results
+
+
+async def coalesced_lookups(client, user_ids):
+    infos = await asyncio.gather(*(client.get_user_info(user_id) for user_id in user_ids))
+    return dict(zip(user_ids, infos))
+
+
+def timed(stub, coroutine):
+    stub.requests.clear()
+    start = time.perf_counter()
+    result = asyncio.run(coroutine)
+    return time.perf_counter() - start, result, sum(stub.requests.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the user data client")
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Simulated latency per request")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--coalesce-lookups", type=int, default=200,
+                        help="Concurrent get_user_info calls in the coalescing run")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+
+    rng = random.Random(0)
+    users = make_users(args.users)
+    # Skewed workload with a few unknown users
+    population = list(users) + [f"unknown-{i}" for i in range(args.users // 100)]
+    lookups = [population[min(int(rng.paretovariate(0.6)) - 1, len(population) - 1) if rng.random() < 0.5
+                          else rng.randrange(len(population))] for _ in range(args.lookups)]
+    print(f"{args.lookups:,} lookups, {len(set(lookups)):,} distinct users, {args.latency_ms:g} ms latency")
+
+    with UserServiceStub(users, latency=args.latency_ms / 1000) as stub:
+        legacy_seconds, legacy, legacy_requests = timed(stub, legacy_lookups(stub.url, lookups))
+        print(f"{'legacy sequential':<20} {legacy_seconds:7.2f} s  {legacy_requests:6,} requests")
+
+        client = UserDataClient(base_url=stub.url, batch_size=args.batch_size)
+        batch_seconds, batched, batch_requests = timed(stub, client.get_users(lookups))
+        assert batched == legacy
+        print(f"{'get_users':<20} {batch_seconds:7.2f} s  {batch_requests:6,} requests"
+              f"  ({legacy_seconds / batch_seconds:.0f}x)")
+
+        warm_seconds, warm, warm_requests = timed(stub, client.get_users(lookups))
+        assert warm == legacy
+        print(f"{'get_users (warm)':<20} {warm_seconds:7.2f} s  {warm_requests:6,} requests"
+              f"  (unknown users asked again)")
+
+        subset = lookups[:args.coalesce_lookups]
+        client = UserDataClient(base_url=stub.url)
+        coalesce_seconds, coalesced, coalesce_requests = timed(stub, coalesced_lookups(client, subset))
+        assert coalesced == {user_id: legacy[user_id] for user_id in subset}
+        print(f"{'concurrent singles':<20} {coalesce_seconds:7.2f} s  {coalesce_requests:6,} requests"
+              f"  for {len(subset):,} lookups ({client.get_metrics()['coalesced']:,} coalesced)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+"""
+Columnar Store Module
+
+This module stores analysis artifacts as local Parquet (or Arrow IPC) files:
+- tables are partitioned by tenant and date in hive layout
+  (``<table>/tenant_id=<tenant>/partition_date=<YYYY-MM-DD>/part-*.parquet``),
+  so reads for one tenant or date range only open the matching files;
+- writes are append-only: every append adds a new file, written under a
+  hidden name and renamed into place, and existing files are never
+  rewritten;
+- reads push filters down to partition pruning and Parquet row-group
+  statistics, read only the requested columns, and go through memory-mapped
+  files (zero-copy for uncompressed Arrow IPC files);
+- column types are kept consistent across appends without losing values:
+  appends are only cast where the conversion is lossless (e.g. to a
+  string column), and columns whose types still conflict are read as
+  strings.
+"""
+import json
+import logging
+import os
+import re
+import uuid
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+TENANT_FIELD = "tenant_id"
+DATE_FIELD = "partition_date"
+DEFAULT_TENANT = "default"
+FILE_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# Filters as pyarrow.parquet accepts them: [(column, op, value), ...] for a
+# conjunction or a list of such lists for a disjunction
+Filters = Union[ds.Expression, List[Tuple[str, str, Any]], List[List[Tuple[str, str, Any]]]]
+
+PARTITIONING = ds.partitioning(
+    pa.schema([(TENANT_FIELD, pa.string()), (DATE_FIELD, pa.string())]),
+    flavor="hive"
+)
+
+_UNSAFE_PARTITION_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def partition_value(value: Any) -> str:
+    """
+    Make a value safe for use as a partition directory name.
+
+    Args:
+        value: Tenant identifier
+
+    Returns:
+        str: Value with unsafe characters replaced by "_"
+    """
+    text = _UNSAFE_PARTITION_CHARS.sub("_", str(value))
+    return text if text.strip("._") else DEFAULT_TENANT
+
+
+def partition_date(value: Any = None) -> str:
+    """
+    Get the ISO date partition for a date, datetime or ISO timestamp.
+
+    Args:
+        value: Date, datetime or ISO string; today (UTC) if None
+
+    Returns:
+        str: YYYY-MM-DD
+    """
+    if value is None:
+        return datetime.now(timezone.utc).date().isoformat()
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date().isoformat()
+
+
+def _column_values(values: List[Any]) -> List[Any]:
+    """Give a column one Arrow type: nested values become JSON, mixed kinds strings."""
+    kinds = {type(value) for value in values if value is not None}
+    if kinds and (kinds & {dict, list, tuple}):
+        return [None if value is None else json.dumps(value, default=str) for value in values]
+    if len(kinds) > 1 and not kinds <= {int, float}:
+        return [None if value is None else str(value) for value in values]
+    return values
+
+
+def _is_numeric(data_type: pa.DataType) -> bool:
+    return pa.types.is_integer(data_type) or pa.types.is_floating(data_type)
+
+
+def unify_schemas(schemas: Sequence[pa.Schema]) -> pa.Schema:
+    """
+    Unify file schemas into one read schema.
+
+    Columns are promoted as pyarrow's permissive unification does (e.g. int
+    to float, null to any type); columns whose types cannot be promoted
+    (e.g. int in one file and string in another) are read as strings.
+
+    Args:
+        schemas: File schemas
+
+    Returns:
+        pa.Schema: Fields in order of first appearance
+    """
+    try:
+        return pa.unify_schemas(list(schemas), promote_options="permissive")
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        pass
+
+    types: Dict[str, List[pa.DataType]] = {}
+    for schema in schemas:
+        for field in schema:
+            types.setdefault(field.name, []).append(field.type)
+
+    fields = []
+    for name, kinds in types.items():
+        try:
+            field = pa.unify_schemas([pa.schema([(name, kind)]) for kind in kinds],
+                                     promote_options="permissive").field(name)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            field = pa.field(name, pa.string())
+        fields.append(field)
+    return pa.schema(fields)
+
+
+def conform_table(table: pa.Table, schema: Optional[pa.Schema]) -> pa.Table:
+    """
+    Cast a table's columns losslessly towards the types they already have
+    in a schema.
+
+    Numeric and null columns are left for promotion on read. String columns
+    are kept as they are, never parsed into the existing type (``'02139'``
+    stays a string), so the column is read as string. Other columns whose
+    type differs are stored as strings.
+
+    Args:
+        table: Table to append
+        schema: Existing schema of the table (None if it has no files)
+
+    Returns:
+        pa.Table: The table with conforming column types
+    """
+    if schema is None:
+        return table
+
+    for index, field in enumerate(table.schema):
+        existing = schema.field(field.name).type if field.name in schema.names else None
+        if (existing is None or existing == field.type or pa.types.is_null(existing)
+                or pa.types.is_null(field.type) or (_is_numeric(existing) and _is_numeric(field.type))):
+            continue
+
+        if pa.types.is_string(field.type):
+            continue
+
+        column = table.column(index).cast(pa.string())
+        table = table.set_column(index, pa.field(field.name, column.type), column)
+    return table
+
+
+def records_to_table(records: Sequence[Dict[str, Any]], exclude: Iterable[str] = ()) -> pa.Table:
+    """
+    Convert records to an Arrow table.
+
+    Columns are the record keys in order of first appearance. Nested values
+    are stored as JSON strings and columns mixing value kinds (other than
+    int and float) as strings, so every column has one type.
+
+    Args:
+        records: Records
+        exclude: Keys to leave out
+
+    Returns:
+        pa.Table: One row per record
+    """
+    excluded = set(exclude)
+    columns: Dict[str, None] = {}
+    for record in records:
+        for key in record:
+            if key not in excluded:
+                columns.setdefault(key, None)
+
+    return pa.table({
+        str(column): pa.array(_column_values([record.get(column) for record in records]))
+        for column in columns
+    })
+
+
+class ColumnarStore:
+    """
+    Append-only columnar tables partitioned by tenant and date.
+
+    Attributes:
+        root (str): Directory holding one subdirectory per table
+        file_format (str): "parquet" or "arrow" (uncompressed Arrow IPC)
+        row_group_size (int): Rows per Parquet row group, the unit of
+            statistics-based skipping
+    """
+
+    def __init__(
+        self,
+        root: str,
+        file_format: str = "parquet",
+        row_group_size: int = 64 * 1024,
+        memory_map: bool = True
+    ):
+        """
+        Initialize the store. Directories are created on the first append.
+
+        Args:
+            root: Storage directory
+            file_format: "parquet" or "arrow"
+            row_group_size: Rows per Parquet row group
+            memory_map: Read files through memory maps
+
+        Raises:
+            ValueError: If the file format is not supported
+        """
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"Unsupported file format: {file_format}")
+
+        self.root = root
+        self.file_format = file_format
+        self.row_group_size = row_group_size
+        self.filesystem = pafs.LocalFileSystem(use_mmap=memory_map)
+        self._format = "ipc" if file_format == "arrow" else "parquet"
+        # File schemas by path; files are never rewritten, so entries stay valid
+        self._schemas: Dict[str, pa.Schema] = {}
+        # Unified schema of each table's files, used to conform appends
+        self._table_schemas: Dict[str, Optional[pa.Schema]] = {}
+
+    def table_path(self, table: str) -> str:
+        return os.path.join(self.root, partition_value(table))
+
+    def append(
+        self,
+        table: str,
+        records: Union[Sequence[Dict[str, Any]], pa.Table],
+        tenant_id: Optional[str] = None,
+        day: Any = None
+    ) -> Dict[str, Any]:
+        """
+        Append records to a table partition as a new file.
+
+        Args:
+            table: Table name
+            records: Records or an Arrow table; a tenant_id or
+                partition_date column is dropped in favour of the partition
+            tenant_id: Tenant partition (default partition if None)
+            day: Date partition as date, datetime or ISO string (today if
+                None)
+
+        Columns whose type conflicts with earlier appends are stored as
+        strings and read as strings (see conform_table).
+
+        Returns:
+            Dict[str, Any]: Written file path (None if there were no rows),
+            row count and partition
+        """
+        tenant = partition_value(tenant_id or DEFAULT_TENANT)
+        day = partition_date(day)
+        if isinstance(records, pa.Table):
+            arrow_table = records.drop_columns([c for c in (TENANT_FIELD, DATE_FIELD) if c in records.column_names])
+        else:
+            arrow_table = records_to_table(records, exclude=(TENANT_FIELD, DATE_FIELD))
+
+        if arrow_table.num_rows == 0:
+            return {"path": None, "rows": 0, "tenant_id": tenant, "date": day}
+
+        table_schema = self._table_schema(table)
+        arrow_table = conform_table(arrow_table, table_schema)
+
+        directory = os.path.join(self.table_path(table), f"{TENANT_FIELD}={tenant}", f"{DATE_FIELD}={day}")
+        os.makedirs(directory, exist_ok=True)
+
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S%f")
+        name = f"part-{stamp}-{uuid.uuid4().hex[:8]}{FILE_FORMATS[self.file_format]}"
+        path = os.path.join(directory, name)
+        temporary = os.path.join(directory, f".{name}.tmp")
+
+        if self.file_format == "arrow":
+            with pa.OSFile(temporary, "wb") as sink, pa.ipc.new_file(sink, arrow_table.schema) as writer:
+                writer.write_table(arrow_table)
+        else:
+            pq.write_table(arrow_table, temporary, row_group_size=self.row_group_size)
+        os.replace(temporary, path)
+        self._schemas[path] = arrow_table.schema
+        self._table_schemas[table] = unify_schemas(
+            [table_schema, arrow_table.schema] if table_schema is not None else [arrow_table.schema]
+        )
+
+        logger.info(f"Appended {arrow_table.num_rows} rows to {table} ({tenant}/{day})")
+        return {"path": path, "rows": arrow_table.num_rows, "tenant_id": tenant, "date": day}
+
+    def _discover(self, table: str) -> Optional[ds.FileSystemDataset]:
+        path = self.table_path(table)
+        if not os.path.isdir(path):
+            return None
+        return ds.dataset(path, format=self._format, partitioning=PARTITIONING, filesystem=self.filesystem)
+
+    def _file_schema(self, fragment: ds.Fragment) -> pa.Schema:
+        schema = self._schemas.get(fragment.path)
+        if schema is None:
+            schema = self._schemas[fragment.path] = fragment.physical_schema
+        return schema
+
+    def _table_schema(self, table: str) -> Optional[pa.Schema]:
+        """Get the unified schema of a table's files (None without files)."""
+        if table not in self._table_schemas:
+            discovered = self._discover(table)
+            schemas = [self._file_schema(fragment) for fragment in discovered.get_fragments()] if discovered else []
+            self._table_schemas[table] = unify_schemas(schemas) if schemas else None
+        return self._table_schemas[table]
+
+    def dataset(self, table: str, partition_filter: Optional[ds.Expression] = None) -> Optional[ds.Dataset]:
+        """
+        Open a table as a dataset over the files of the matching partitions.
+
+        Files appended with different columns or with int and float
+        versions of a column are read with the unified schema of the
+        selected files; columns with conflicting types are read as strings.
+
+        Args:
+            table: Table name
+            partition_filter: Condition on tenant_id and partition_date
+                selecting the files (all files if None)
+
+        Returns:
+            Optional[ds.Dataset]: The dataset, or None if no files match
+        """
+        discovered = self._discover(table)
+        if discovered is None:
+            return None
+
+        fragments = list(discovered.get_fragments(filter=partition_filter))
+        if not fragments:
+            return None
+
+        schema = unify_schemas([self._file_schema(fragment) for fragment in fragments] + [PARTITIONING.schema])
+        return ds.dataset([fragment.path for fragment in fragments], schema=schema, format=self._format,
+                          partitioning=PARTITIONING, partition_base_dir=self.table_path(table),
+                          filesystem=self.filesystem)
+
+    def scan(
+        self,
+        table: str,
+        tenant_id: Optional[str] = None,
+        start_date: Any = None,
+        end_date: Any = None,
+        filters: Optional[Filters] = None,
+        columns: Optional[List[str]] = None
+    ) -> pa.Table:
+        """
+        Read a table with partition pruning and predicate pushdown.
+
+        Args:
+            table: Table name
+            tenant_id: Only read this tenant's partition
+            start_date: First date to read (inclusive)
+            end_date: Last date to read (inclusive)
+            filters: Row filter as a dataset expression or in
+                pyarrow.parquet filter form
+            columns: Columns to read (all if None)
+
+        Returns:
+            pa.Table: Matching rows, including the tenant_id and
+            partition_date columns unless columns leaves them out
+        """
+        partition_filter = None
+        conditions = []
+        if tenant_id is not None:
+            conditions.append(ds.field(TENANT_FIELD) == partition_value(tenant_id))
+        if start_date is not None:
+            conditions.append(ds.field(DATE_FIELD) >= partition_date(start_date))
+        if end_date is not None:
+            conditions.append(ds.field(DATE_FIELD) <= partition_date(end_date))
+        for condition in conditions:
+            partition_filter = condition if partition_filter is None else partition_filter & condition
+
+        # Only the pruned partitions' files are opened and unified
+        dataset = self.dataset(table, partition_filter)
+        if dataset is None:
+            return pa.table({column: pa.array([], pa.null()) for column in columns or []})
+
+        expression = partition_filter
+        if filters is not None:
+            condition = filters if isinstance(filters, ds.Expression) else pq.filters_to_expression(filters)
+            expression = condition if expression is None else expression & condition
+
+        return dataset.to_table(columns=columns, filter=expression)
+
+    def read_records(self, table: str, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Read a table as records; takes the arguments of scan.
+
+        Returns:
+            List[Dict[str, Any]]: Matching rows
+        """
+        return self.scan(table, **kwargs).to_pylist()
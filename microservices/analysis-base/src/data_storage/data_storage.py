@@ -5,15 +5,25 @@ This module manages data storage across different database types and caching.
 """
 
 import logging
+import os
 from typing import Dict, Any, Optional, List
 import asyncio
 import json
 from datetime import datetime
 
+try:
+    from .columnar_store import ColumnarStore, Filters
+except ImportError:  # pyarrow is not installed
+    ColumnarStore = None
+    Filters = Any
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Destinations stored in the local columnar store
+COLUMNAR_DESTINATIONS = ("columnar", "parquet", "analytical")
+
 class SQLDatabase:
     """
     Handles SQL database operations.
@@ -223,11 +233,25 @@ class DataStorage:
     Manages data storage across different database types and caching.
     """
     
-    def __init__(self):
-        """Initialize data storage components"""
+    def __init__(self, columnar_path: Optional[str] = None, columnar_format: Optional[str] = None):
+        """
+        Initialize data storage components.
+        
+        Args:
+            columnar_path: Directory of the columnar store (default from
+                COLUMNAR_STORAGE_PATH)
+            columnar_format: "parquet" or "arrow" (default from
+                COLUMNAR_STORAGE_FORMAT)
+        """
         self.sql_db = SQLDatabase()
         self.nosql_db = NoSQLDatabase()
         self.cache = RedisCache()
+        self.columnar = None
+        if ColumnarStore is not None:
+            self.columnar = ColumnarStore(
+                columnar_path or os.environ.get("COLUMNAR_STORAGE_PATH", "data/columnar"),
+                file_format=columnar_format or os.environ.get("COLUMNAR_STORAGE_FORMAT", "parquet")
+            )
         logger.info("Data storage initialized")
     
     async def store_processed_data(self, data: Dict[str, Any], store_in: str = "default") -> Dict[str, Any]:
@@ -254,7 +278,11 @@ class DataStorage:
                 "store_in": store_in
             }
             
-            if store_in == "sql_db" or store_in == "relational":
+            if store_in in COLUMNAR_DESTINATIONS:
+                # Append to the local columnar store
+                storage_metadata.update(await self.store_columnar(data, storage_id))
+                
+            elif store_in == "sql_db" or store_in == "relational":
                 # Store in SQL database
                 table_name = data.get("template_id", "analysis_results").lower().replace("-", "_")
                 await self.sql_db.store_data(table_name, data)
@@ -317,6 +345,112 @@ class DataStorage:
                 "message": str(e)
             }
     
+    async def store_columnar(self, data: Dict[str, Any], storage_id: str) -> Dict[str, Any]:
+        """
+        Append processed data to the columnar store.
+        
+        The result records go to the "results" table, one row each, and the
+        rest of the data to the "artifacts" table as one row with the
+        payload as JSON. Both are partitioned by the data's tenant_id and
+        the date of its timestamp.
+        
+        Args:
+            data: Data to store
+            storage_id: Storage ID recorded with every row
+            
+        Returns:
+            Storage metadata
+            
+        Raises:
+            RuntimeError: If pyarrow is not installed
+        """
+        if self.columnar is None:
+            raise RuntimeError("Columnar storage requires pyarrow")
+        
+        tenant_id = data.get("tenant_id")
+        day = data.get("timestamp") or datetime.now()
+        results = data.get("results")
+        records = results if isinstance(results, list) else []
+        
+        artifact = {
+            "storage_id": storage_id,
+            "template_id": data.get("template_id"),
+            "analysis_type": data.get("analysis_type"),
+            "timestamp": str(data.get("timestamp") or datetime.now().isoformat()),
+            "result_count": len(records),
+            "payload": json.dumps({k: v for k, v in data.items() if k != "results"}, default=str)
+        }
+        
+        def write():
+            written = self.columnar.append(
+                "results",
+                [{"storage_id": storage_id, **record} for record in records if isinstance(record, dict)],
+                tenant_id=tenant_id,
+                day=day
+            )
+            self.columnar.append("artifacts", [artifact], tenant_id=tenant_id, day=day)
+            return written
+        
+        written = await asyncio.to_thread(write)
+        return {
+            "storage_type": "columnar",
+            "tables": ["artifacts", "results"],
+            "rows": written["rows"],
+            "tenant_id": written["tenant_id"],
+            "partition_date": written["date"]
+        }
+    
+    async def retrieve_columnar(
+        self,
+        table: str = "results",
+        tenant_id: Optional[str] = None,
+        start_date: Any = None,
+        end_date: Any = None,
+        filters: Optional[Filters] = None,
+        columns: Optional[List[str]] = None,
+        as_arrow: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Read rows from the columnar store.
+        
+        Tenant and date bounds prune partitions, filters are pushed down to
+        the files, and only the requested columns are read.
+        
+        Args:
+            table: "results", "artifacts" or another columnar table
+            tenant_id: Only read this tenant's rows
+            start_date: First date to read (inclusive)
+            end_date: Last date to read (inclusive)
+            filters: Row filter, e.g. [("storage_id", "==", "data_...")]
+            columns: Columns to read (all if None)
+            as_arrow: Return the rows as an Arrow table instead of records
+            
+        Returns:
+            Retrieved data
+            
+        Raises:
+            RuntimeError: If pyarrow is not installed
+        """
+        if self.columnar is None:
+            raise RuntimeError("Columnar storage requires pyarrow")
+        
+        logger.info(f"Retrieving columnar data from {table}")
+        arrow_table = await asyncio.to_thread(
+            self.columnar.scan,
+            table,
+            tenant_id=tenant_id,
+            start_date=start_date,
+            end_date=end_date,
+            filters=filters,
+            columns=columns
+        )
+        return {
+            "source": "columnar",
+            "table": table,
+            "row_count": arrow_table.num_rows,
+            "results": arrow_table if as_arrow else arrow_table.to_pylist()
+        }
+    
     async def retrieve_data(self, query: str) -> Dict[str, Any]:
         """
         Retrieve data based on query.
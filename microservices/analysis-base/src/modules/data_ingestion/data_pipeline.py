@@ -6,6 +6,7 @@ based on template specifications.
 """
 
 import logging
+import os
 from typing import Dict, Any, Optional, List
 import asyncio
 
@@ -66,6 +67,56 @@ class DataIngestion:
         except Exception as e:
             logger.error(f"Data retrieval failed: {str(e)}")
             raise
+    
+    async def ingest(
+        self,
+        source: Any,
+        sink: Optional[Any] = None,
+        keep_records: bool = True,
+        chunk_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        preprocessing: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Ingest a file or record stream chunk by chunk.
+        
+        Chunks are preprocessed in a process pool and feature extraction
+        runs once at the end, giving the same result as preprocessing all
+        records at once without loading the source whole.
+        
+        Args:
+            source: Path to a .jsonl, .ndjson, .csv or .json file, or an
+                iterable of records
+            sink: Optional function (or coroutine function) receiving each
+                preprocessed chunk in source order
+            keep_records: Keep the preprocessed records in the result
+            chunk_size: Records per chunk (default from INGESTION_CHUNK_SIZE)
+            max_workers: Worker processes (default from INGESTION_WORKERS,
+                else the CPU count), 0 to process inline
+            preprocessing: Preprocessing with the cleaning and numeric field
+                options to apply (default: records are kept as parsed)
+            
+        Returns:
+            Processed data with results, factors, scores and tags
+        """
+        from .helpers.ingestion_engine import DEFAULT_CHUNK_SIZE, IngestionEngine
+        
+        try:
+            logger.info(f"Ingesting data from: {source if isinstance(source, str) else type(source).__name__}")
+            
+            if max_workers is None and os.environ.get("INGESTION_WORKERS"):
+                max_workers = int(os.environ["INGESTION_WORKERS"])
+            engine = IngestionEngine(
+                chunk_size=chunk_size or int(os.environ.get("INGESTION_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)),
+                max_workers=max_workers,
+                preprocessing=preprocessing
+            )
+            data = {"source": source if isinstance(source, str) else self.data_source}
+            return await engine.run(source, data=data, sink=sink, keep_records=keep_records)
+            
+        except Exception as e:
+            logger.error(f"Data ingestion failed: {str(e)}")
+            raise
 
 # Singleton instance for global access
 data_ingestion = DataIngestion()
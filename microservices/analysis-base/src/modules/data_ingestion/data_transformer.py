@@ -6,20 +6,141 @@ before analysis.
 """
 
 import logging
-from typing import Dict, Any, Optional, List
+import re
+from typing import Dict, Any, Optional, Iterable, List
 import asyncio
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Decimal numbers as they appear in CSV exports and string-typed payloads
+NUMBER_PATTERN = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+
+
+def clean_record(record: Any) -> Optional[Dict[str, Any]]:
+    """
+    Clean one raw record.
+    
+    Strips surrounding whitespace from string values and drops fields that
+    are None or empty strings.
+    
+    Args:
+        record: Raw record
+        
+    Returns:
+        Cleaned record, or None if the record is not a mapping or has no
+        fields left
+    """
+    if not isinstance(record, dict):
+        return None
+    
+    cleaned = {}
+    for key, value in record.items():
+        if isinstance(value, str):
+            value = value.strip()
+            if not value:
+                continue
+        elif value is None:
+            continue
+        cleaned[key] = value
+    
+    return cleaned or None
+
+
+def normalize_value(value: Any) -> Any:
+    """
+    Convert a numeric string to a number.
+    
+    Only applied to fields listed for conversion: identifiers such as
+    "02139" look numeric but must stay strings.
+    
+    Args:
+        value: Cleaned value
+        
+    Returns:
+        int or float for numeric strings, the value unchanged otherwise
+    """
+    if isinstance(value, str) and NUMBER_PATTERN.match(value):
+        if "." in value or "e" in value or "E" in value:
+            return float(value)
+        return int(value)
+    return value
+
+
+def preprocess_records(
+    records: Iterable[Any],
+    clean: bool = False,
+    numeric_fields: Iterable[str] = ()
+) -> List[Dict[str, Any]]:
+    """
+    Clean and normalize records, as far as requested.
+    
+    Records are handled independently, so a dataset can be preprocessed as a
+    whole or chunk by chunk with the same result. Without options, records
+    are returned unchanged.
+    
+    Args:
+        records: Raw records
+        clean: Strip string values and drop empty fields and records (see
+            clean_record)
+        numeric_fields: Fields whose numeric strings are converted to
+            numbers; all other values keep their type
+        
+    Returns:
+        Preprocessed records in input order, without the dropped ones
+    """
+    numeric_fields = frozenset(numeric_fields)
+    if not clean and not numeric_fields:
+        return list(records)
+    
+    preprocessed = []
+    for record in records:
+        if clean:
+            record = clean_record(record)
+            if record is None:
+                continue
+        if numeric_fields and isinstance(record, dict):
+            record = {
+                key: normalize_value(value) if key in numeric_fields else value
+                for key, value in record.items()
+            }
+        preprocessed.append(record)
+    return preprocessed
+
+
+def mark_preprocessed(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Record the preprocessing steps in the data metadata.
+    
+    Args:
+        data: Data whose results were preprocessed
+        
+    Returns:
+        The data
+    """
+    data["metadata"] = data.get("metadata", {})
+    data["metadata"]["preprocessed"] = True
+    data["metadata"]["preprocessing_steps"] = ["cleaning", "normalization"]
+    return data
+
+
 class Preprocessing:
     """
     Handles data preprocessing and transformation.
     """
     
-    def __init__(self):
-        """Initialize the preprocessing component"""
+    def __init__(self, clean: bool = False, numeric_fields: Optional[Iterable[str]] = None):
+        """
+        Initialize the preprocessing component
+        
+        Args:
+            clean: Strip string values and drop empty fields and records
+            numeric_fields: Fields whose numeric strings are converted to
+                numbers (none by default, values keep their type)
+        """
+        self.clean = clean
+        self.numeric_fields = tuple(numeric_fields or ())
         logger.info("Preprocessing component initialized")
     
     async def preprocess_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -35,15 +156,11 @@ class Preprocessing:
         try:
             logger.info("Preprocessing data")
             
-            # This is a placeholder for actual preprocessing logic
-            # In a real implementation, this would clean, normalize, and prepare data
-            
-            # Example implementation:
             if "results" in data:
-                # Add preprocessing metadata
-                data["metadata"] = data.get("metadata", {})
-                data["metadata"]["preprocessed"] = True
-                data["metadata"]["preprocessing_steps"] = ["cleaning", "normalization"]
+                # Clean and normalize the records if configured, then add preprocessing metadata
+                if self.clean or self.numeric_fields:
+                    data["results"] = preprocess_records(data["results"], self.clean, self.numeric_fields)
+                mark_preprocessed(data)
             
             # Transform data
             transformed_data = await self.transform_data(data)
@@ -116,20 +116,8 @@ class FeatureExtraction:
             if "factors" in data:
                 data["tags"] = []
                 
-                # Fetch categories from repository
-                # Updated import to use the database-layer category repository service
-                from database_layer.category_repository_service.src.repository.category_repository import CategoryRepository
-                
-                # Create a repository instance
-                mongodb_uri = "mongodb://mongodb:27017"  # Use environment variables in production
-                category_repository = CategoryRepository(mongodb_uri=mongodb_uri)
-                await category_repository.connect()
-                
                 # Get categories
-                categories = []
-                categories_data = await category_repository.get_categories_by_type("tag")
-                if categories_data:
-                    categories = categories_data
+                categories = await self.get_tag_categories()
                 
                 # Tag based on factors and categories
                 for factor in data["factors"]:
@@ -148,3 +136,22 @@ class FeatureExtraction:
         except Exception as e:
             logger.error(f"Data tagging failed: {str(e)}")
             raise
+    
+    async def get_tag_categories(self) -> List[Dict[str, Any]]:
+        """
+        Fetch the tag categories from the category repository.
+        
+        Returns:
+            Tag categories with name and threshold
+        """
+        # Fetch categories from repository
+        # Updated import to use the database-layer category repository service
+        from database_layer.category_repository_service.src.repository.category_repository import CategoryRepository
+        
+        # Create a repository instance
+        mongodb_uri = "mongodb://mongodb:27017"  # Use environment variables in production
+        category_repository = CategoryRepository(mongodb_uri=mongodb_uri)
+        await category_repository.connect()
+        
+        categories_data = await category_repository.get_categories_by_type("tag")
+        return categories_data or []
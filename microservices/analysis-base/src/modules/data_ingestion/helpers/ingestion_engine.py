@@ -0,0 +1,315 @@
+"""
+Chunked ingestion engine for the data ingestion module.
+
+This module runs the record-level ingestion steps (parsing, then the
+configured cleaning and normalization) on a source chunk by chunk instead of
+on the full dataset:
+- ``read_chunks`` reads JSON Lines and CSV files incrementally, so the raw
+  source is never held in memory as a whole;
+- chunks are parsed and preprocessed in a process pool with a bounded number
+  of chunks in flight, and handed on in source order;
+- transformation, factors, scores and tags are computed once at the end.
+
+The result equals the in-memory path (``Preprocessing.preprocess_data`` on
+all records).
+"""
+import asyncio
+import csv
+import functools
+import inspect
+import itertools
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ..data_transformer import Preprocessing, mark_preprocessed, preprocess_records
+from ..feature_extraction import FeatureExtraction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# A chunk as read from the source: ("lines", JSON lines), ("rows", (header, CSV rows))
+# or ("records", records)
+RawChunk = Tuple[str, Any]
+
+# Receives each processed chunk, in source order
+ChunkSink = Callable[[List[Dict[str, Any]]], Union[None, Awaitable[None]]]
+
+Source = Union[str, os.PathLike, Iterable[Any]]
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def read_chunks(source: Source, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[RawChunk]:
+    """
+    Read a source in chunks of at most chunk_size records.
+
+    Files are read incrementally and left unparsed (JSON Lines) or split
+    into rows (CSV), so decoding happens in the workers. A .json file holds
+    a single array (or an object with a "results" array) and has to be
+    loaded whole before it is chunked.
+
+    Args:
+        source: Path to a .jsonl, .ndjson, .csv or .json file, or an
+            iterable of records
+        chunk_size: Maximum records per chunk
+
+    Yields:
+        RawChunk: Consecutive chunks
+
+    Raises:
+        ValueError: If the file type is not supported
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        for batch in _batches(source, chunk_size):
+            yield "records", batch
+        return
+
+    path = os.fspath(source)
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as handle:
+            lines = (line for line in handle if line.strip())
+            for batch in _batches(lines, chunk_size):
+                yield "lines", batch
+    elif extension == ".csv":
+        with open(path, newline="", encoding="utf-8") as handle:
+            reader = csv.reader(handle)
+            header = next(reader, None)
+            if header is None:
+                return
+            for batch in _batches(reader, chunk_size):
+                yield "rows", (header, batch)
+    elif extension == ".json":
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        records = data.get("results", []) if isinstance(data, dict) else data
+        for batch in _batches(records, chunk_size):
+            yield "records", batch
+    else:
+        raise ValueError(f"Unsupported source file type: {extension or path}")
+
+
+def decode_chunk(chunk: RawChunk) -> List[Any]:
+    """
+    Turn a raw chunk into records.
+
+    CSV rows map to dictionaries like csv.DictReader does: missing cells
+    become None and extra cells are kept in a list under the None key.
+
+    Args:
+        chunk: Chunk from read_chunks
+
+    Returns:
+        List[Any]: Raw records
+    """
+    kind, payload = chunk
+    if kind == "lines":
+        return [json.loads(line) for line in payload]
+    if kind == "rows":
+        header, rows = payload
+        records = []
+        for row in rows:
+            if not row:
+                continue
+            record = dict(zip(header, row))
+            if len(row) < len(header):
+                record.update((key, None) for key in header[len(row):])
+            elif len(row) > len(header):
+                record[None] = row[len(header):]
+            records.append(record)
+        return records
+    return payload
+
+
+def load_records(source: Source) -> List[Any]:
+    """
+    Read a whole source into memory, for the in-memory ingestion path.
+
+    Args:
+        source: Source as accepted by read_chunks
+
+    Returns:
+        List[Any]: All raw records in source order
+    """
+    records = []
+    for chunk in read_chunks(source):
+        records.extend(decode_chunk(chunk))
+    return records
+
+
+def process_chunk(
+    chunk: RawChunk,
+    clean: bool = False,
+    numeric_fields: Tuple[str, ...] = ()
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Decode a chunk and preprocess its records.
+
+    Runs in the worker processes, so it only depends on picklable inputs.
+
+    Args:
+        chunk: Chunk from read_chunks
+        clean: Clean the records (see preprocess_records)
+        numeric_fields: Fields whose numeric strings become numbers
+
+    Returns:
+        Tuple of the preprocessed records and the number of raw records
+    """
+    raw = decode_chunk(chunk)
+    return preprocess_records(raw, clean, numeric_fields), len(raw)
+
+
+class IngestionEngine:
+    """
+    Chunked, parallel ingestion of a source.
+
+    Attributes:
+        chunk_size (int): Records per chunk
+        max_workers (int): Worker processes, 0 to process chunks inline
+        max_pending (int): Chunks in flight at most, which bounds memory
+        preprocessing (Preprocessing): Preprocessing whose cleaning and
+            numeric field options are applied to each chunk
+        metrics (Dict[str, Any]): Counters of the last run
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        preprocessing: Optional[Preprocessing] = None
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            chunk_size: Records per chunk
+            max_workers: Worker processes (default: CPU count), 0 to process
+                chunks inline in the event loop
+            max_pending: Chunks in flight at most (default: twice the
+                workers)
+            executor: Executor to use instead of a process pool owned by
+                each run
+            preprocessing: Preprocessing to apply (default: records are
+                kept as parsed, as in Preprocessing())
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        self.chunk_size = chunk_size
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.max_pending = max_pending or 2 * max(self.max_workers, 1)
+        self.executor = executor
+        self.preprocessing = preprocessing or Preprocessing()
+        self.metrics: Dict[str, Any] = {}
+
+    async def iter_processed(self, source: Source) -> AsyncIterator[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Process a source chunk by chunk.
+
+        Args:
+            source: Source as accepted by read_chunks
+
+        Yields:
+            Results of process_chunk, in source order
+        """
+        executor = self.executor
+        owned = executor is None and self.max_workers > 0
+        if owned:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        process = functools.partial(
+            process_chunk, clean=self.preprocessing.clean, numeric_fields=self.preprocessing.numeric_fields
+        )
+        loop = asyncio.get_running_loop()
+        pending: deque = deque()
+        try:
+            for chunk in read_chunks(source, self.chunk_size):
+                if executor is None:
+                    yield process(chunk)
+                    continue
+                pending.append(loop.run_in_executor(executor, process, chunk))
+                if len(pending) >= self.max_pending:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
+            if owned:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    async def run(
+        self,
+        source: Source,
+        data: Optional[Dict[str, Any]] = None,
+        sink: Optional[ChunkSink] = None,
+        keep_records: bool = True,
+        feature_extraction: Optional[FeatureExtraction] = None
+    ) -> Dict[str, Any]:
+        """
+        Ingest a source.
+
+        Args:
+            source: Source as accepted by read_chunks
+            data: Fields to include in the result (e.g. source and query)
+            sink: Optional function (or coroutine function) receiving each
+                preprocessed chunk in order, e.g. to persist it
+            keep_records: Collect the preprocessed records under "results";
+                with False, memory stays bounded by the chunks in flight
+                and "results" is left empty
+            feature_extraction: Feature extraction to compute factors,
+                scores and tags with
+
+        Returns:
+            Dict[str, Any]: Data with results, metadata, factors, scores and
+            tags, as produced by the in-memory path
+        """
+        started = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        chunks = records_in = records_out = 0
+
+        async for records, raw_count in self.iter_processed(source):
+            chunks += 1
+            records_in += raw_count
+            records_out += len(records)
+            if sink is not None:
+                outcome = sink(records)
+                if inspect.isawaitable(outcome):
+                    await outcome
+            if keep_records:
+                results.extend(records)
+
+        data = dict(data or {})
+        data["results"] = results
+        mark_preprocessed(data)
+        data = await self.preprocessing.transform_data(data)
+        data = await (feature_extraction or FeatureExtraction()).extract_factors(data)
+
+        seconds = time.perf_counter() - started
+        self.metrics = {
+            "chunks": chunks,
+            "records_in": records_in,
+            "records_out": records_out,
+            "seconds": seconds,
+            "records_per_second": records_in / seconds if seconds else 0.0,
+        }
+        logger.info(
+            f"Ingested {records_in} records in {chunks} chunks "
+            f"({self.metrics['records_per_second']:.0f} records/s)"
+        )
+        return data
@@ -1,14 +1,17 @@
+import asyncio
 import logging
 import json
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import uuid
 
 # Updated import to use the database-layer category repository
 from database_layer.category_repository_service.src.repository.category_repository import CategoryRepository
 
+from .helpers.scoring_engine import EntityScores, chunked, link_users_to_factors, numeric_columns
+
 logger = logging.getLogger(__name__)
 
 class DescriptiveWorker:
@@ -19,14 +22,16 @@ class DescriptiveWorker:
     to factors, batches, users, and other entities based on template instructions.
     """
     
-    def __init__(self, category_repository: CategoryRepository):
+    def __init__(self, category_repository: CategoryRepository, chunk_size: int = 1000):
         """
         Initialize the descriptive worker.
         
         Args:
             category_repository: Repository for storing and retrieving categories and factors
+            chunk_size: Maximum number of records per repository write
         """
         self.category_repository = category_repository
+        self.chunk_size = chunk_size
         
     async def process(self, template: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -116,6 +121,10 @@ class DescriptiveWorker:
             # Try to infer factor categories from column names
             potential_factors = [col for col in df.columns if col not in ["timestamp", "date", "id", "user_id"]]
             factor_categories = potential_factors
+            
+        template_id = template.get("template_id", "")
+        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        factors = []
         
         # Score each factor category
         for category in factor_categories:
@@ -123,69 +132,16 @@ class DescriptiveWorker:
             if category not in df.columns:
                 continue
                 
-            # Get unique factor values in this category
-            unique_factors = df[category].unique()
+            # Engagement and conversion first, then other numeric columns
+            metric_columns = [col for col in ["engagement", "conversion"] if col in df.columns]
+            metric_columns += numeric_columns(
+                df, ["engagement", "conversion", "timestamp", "date", "id", "user_id", category]
+            )
             
-            for factor_value in unique_factors:
-                # Skip null values
-                if pd.isna(factor_value):
-                    continue
-                    
-                # Filter data for this factor
-                factor_data = df[df[category] == factor_value]
-                
-                # Calculate performance metrics
-                metrics = {}
-                
-                # Calculate engagement metrics if available
-                if "engagement" in df.columns:
-                    metrics["engagement"] = {
-                        "mean": float(factor_data["engagement"].mean()),
-                        "median": float(factor_data["engagement"].median()),
-                        "std": float(factor_data["engagement"].std()) if len(factor_data) > 1 else 0.0,
-                        "min": float(factor_data["engagement"].min()),
-                        "max": float(factor_data["engagement"].max()),
-                        "count": int(len(factor_data))
-                    }
-                    
-                # Calculate conversion metrics if available
-                if "conversion" in df.columns:
-                    metrics["conversion"] = {
-                        "mean": float(factor_data["conversion"].mean()),
-                        "median": float(factor_data["conversion"].median()),
-                        "std": float(factor_data["conversion"].std()) if len(factor_data) > 1 else 0.0,
-                        "min": float(factor_data["conversion"].min()),
-                        "max": float(factor_data["conversion"].max()),
-                        "count": int(len(factor_data))
-                    }
-                
-                # Calculate other available metrics
-                for metric_col in df.columns:
-                    if metric_col in ["engagement", "conversion", "timestamp", "date", "id", "user_id", category]:
-                        continue
-                        
-                    if pd.api.types.is_numeric_dtype(df[metric_col]):
-                        metrics[metric_col] = {
-                            "mean": float(factor_data[metric_col].mean()),
-                            "median": float(factor_data[metric_col].median()),
-                            "std": float(factor_data[metric_col].std()) if len(factor_data) > 1 else 0.0,
-                            "min": float(factor_data[metric_col].min()),
-                            "max": float(factor_data[metric_col].max()),
-                            "count": int(len(factor_data))
-                        }
-                
-                # Calculate overall score (simple average of available metrics)
-                overall_score = 0.0
-                metric_count = 0
-                
-                for metric_name, metric_values in metrics.items():
-                    if "mean" in metric_values:
-                        overall_score += metric_values["mean"]
-                        metric_count += 1
-                        
-                if metric_count > 0:
-                    overall_score /= metric_count
-                
+            # Statistics for every factor value in one pass
+            scores = EntityScores(df, category, metric_columns)
+            
+            for factor_value, metrics, overall_score, sample_size in scores.records():
                 # Store factor score
                 factor_id = f"{category}:{factor_value}"
                 factor_scores[factor_id] = {
@@ -193,17 +149,13 @@ class DescriptiveWorker:
                     "value": factor_value,
                     "metrics": metrics,
                     "overall_score": overall_score,
-                    "sample_size": len(factor_data)
+                    "sample_size": sample_size
                 }
                 
-                # Store factor in repository
-                await self.store_factor(
-                    category, 
-                    factor_value, 
-                    metrics, 
-                    overall_score, 
-                    template.get("template_id", "")
-                )
+                factors.append(self.build_factor(category, factor_value, metrics, overall_score, template_id, timestamp))
+                
+        # Store factors in repository
+        await self.store_factors(factors)
         
         return factor_scores
         
@@ -235,64 +187,26 @@ class DescriptiveWorker:
             logger.warning("No batch_id column found for batch scoring")
             return batch_scores
             
-        # Get unique batch IDs
-        unique_batches = df["batch_id"].unique()
+        # Calculate metrics for all numeric columns, for all batches at once
+        metric_columns = numeric_columns(df, ["batch_id", "timestamp", "date", "id", "user_id"])
+        scores = EntityScores(df, "batch_id", metric_columns)
         
-        # Score each batch
-        for batch_id in unique_batches:
-            # Skip null values
-            if pd.isna(batch_id):
-                continue
-                
-            # Filter data for this batch
-            batch_data = df[df["batch_id"] == batch_id]
-            
-            # Calculate performance metrics
-            metrics = {}
-            
-            # Calculate metrics for all numeric columns
-            for col in batch_data.columns:
-                if col in ["batch_id", "timestamp", "date", "id", "user_id"]:
-                    continue
-                    
-                if pd.api.types.is_numeric_dtype(batch_data[col]):
-                    metrics[col] = {
-                        "mean": float(batch_data[col].mean()),
-                        "median": float(batch_data[col].median()),
-                        "std": float(batch_data[col].std()) if len(batch_data) > 1 else 0.0,
-                        "min": float(batch_data[col].min()),
-                        "max": float(batch_data[col].max()),
-                        "count": int(len(batch_data))
-                    }
-            
-            # Calculate overall score (simple average of available metrics)
-            overall_score = 0.0
-            metric_count = 0
-            
-            for metric_name, metric_values in metrics.items():
-                if "mean" in metric_values:
-                    overall_score += metric_values["mean"]
-                    metric_count += 1
-                    
-            if metric_count > 0:
-                overall_score /= metric_count
-            
+        template_id = template.get("template_id", "")
+        secret_sauces = []
+        
+        for batch_id, metrics, overall_score, sample_size in scores.records():
             # Store batch score
             batch_scores[str(batch_id)] = {
                 "batch_id": str(batch_id),
                 "metrics": metrics,
                 "overall_score": overall_score,
-                "sample_size": len(batch_data)
+                "sample_size": sample_size
             }
             
-            # Create Secret Sauce for batch
-            await self.create_secret_sauce(
-                "batch", 
-                str(batch_id), 
-                metrics, 
-                overall_score, 
-                template.get("template_id", "")
-            )
+            secret_sauces.append(self.build_secret_sauce("batch", str(batch_id), metrics, overall_score, template_id))
+            
+        # Create Secret Sauce for batches
+        await self.store_secret_sauces(secret_sauces)
         
         return batch_scores
         
@@ -324,58 +238,22 @@ class DescriptiveWorker:
             logger.warning("No user_id column found for user scoring")
             return user_scores
             
-        # Get unique user IDs
-        unique_users = df["user_id"].unique()
+        # Calculate metrics for all numeric columns, for all users at once
+        metric_columns = numeric_columns(df, ["user_id", "timestamp", "date", "id", "batch_id"])
+        scores = EntityScores(df, "user_id", metric_columns)
         
-        # Score each user
-        for user_id in unique_users:
-            # Skip null values
-            if pd.isna(user_id):
-                continue
-                
-            # Filter data for this user
-            user_data = df[df["user_id"] == user_id]
-            
-            # Calculate performance metrics
-            metrics = {}
-            
-            # Calculate metrics for all numeric columns
-            for col in user_data.columns:
-                if col in ["user_id", "timestamp", "date", "id", "batch_id"]:
-                    continue
-                    
-                if pd.api.types.is_numeric_dtype(user_data[col]):
-                    metrics[col] = {
-                        "mean": float(user_data[col].mean()),
-                        "median": float(user_data[col].median()),
-                        "std": float(user_data[col].std()) if len(user_data) > 1 else 0.0,
-                        "min": float(user_data[col].min()),
-                        "max": float(user_data[col].max()),
-                        "count": int(len(user_data))
-                    }
-            
-            # Calculate overall score (simple average of available metrics)
-            overall_score = 0.0
-            metric_count = 0
-            
-            for metric_name, metric_values in metrics.items():
-                if "mean" in metric_values:
-                    overall_score += metric_values["mean"]
-                    metric_count += 1
-                    
-            if metric_count > 0:
-                overall_score /= metric_count
-            
+        for user_id, metrics, overall_score, sample_size in scores.records():
             # Store user score
             user_scores[str(user_id)] = {
                 "user_id": str(user_id),
                 "metrics": metrics,
                 "overall_score": overall_score,
-                "sample_size": len(user_data)
+                "sample_size": sample_size
             }
             
-            # Link user to appropriate factors
-            await self.link_user_to_factors(str(user_id), user_data, template.get("template_id", ""))
+        # Link users to appropriate factors
+        links = link_users_to_factors(df, datetime.now().strftime('%Y%m%d%H%M%S'))
+        await self.store_links(links)
         
         return user_scores
         
@@ -509,9 +387,17 @@ class DescriptiveWorker:
         
         await self.category_repository.store_factor(factor_id, factor_data)
         
-    async def store_factor(self, category: str, value: Any, metrics: Dict[str, Any], score: float, template_id: str) -> str:
+    def build_factor(
+        self,
+        category: str,
+        value: Any,
+        metrics: Dict[str, Any],
+        score: float,
+        template_id: str,
+        timestamp: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
         """
-        Store a factor in the repository.
+        Build a factor record.
         
         Args:
             category: Factor category
@@ -519,11 +405,13 @@ class DescriptiveWorker:
             metrics: Performance metrics
             score: Overall score
             template_id: Template ID
+            timestamp: Factor ID timestamp (%Y%m%d%H%M%S, now if None)
             
         Returns:
-            Factor ID
+            Factor ID and factor data
         """
-        factor_id = f"factor_{category}_{value}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        timestamp = timestamp or datetime.now().strftime('%Y%m%d%H%M%S')
+        factor_id = f"factor_{category}_{value}_{timestamp}"
         
         factor_data = {
             "factor_name": f"{category}:{value}",
@@ -535,13 +423,44 @@ class DescriptiveWorker:
             "factor_type": "descriptive"
         }
         
+        return factor_id, factor_data
+        
+    async def store_factor(self, category: str, value: Any, metrics: Dict[str, Any], score: float, template_id: str) -> str:
+        """
+        Store a factor in the repository.
+        
+        Args:
+            category: Factor category
+            value: Factor value
+            metrics: Performance metrics
+            score: Overall score
+            template_id: Template ID
+            
+        Returns:
+            Factor ID
+        """
+        factor_id, factor_data = self.build_factor(category, value, metrics, score, template_id)
+        
         await self.category_repository.store_factor(factor_id, factor_data)
         
         return factor_id
         
-    async def create_secret_sauce(self, entity_type: str, entity_id: str, metrics: Dict[str, Any], score: float, template_id: str) -> str:
+    async def store_factors(self, factors: List[Tuple[str, Dict[str, Any]]]) -> None:
         """
-        Create a Secret Sauce record for an entity.
+        Store factors in the repository in chunks.
+        
+        Args:
+            factors: Factor IDs and factor data
+        """
+        await self.persist_in_chunks(
+            factors,
+            "bulk_store_factors",
+            lambda factor: self.category_repository.store_factor(*factor)
+        )
+        
+    def build_secret_sauce(self, entity_type: str, entity_id: str, metrics: Dict[str, Any], score: float, template_id: str) -> Dict[str, Any]:
+        """
+        Build a Secret Sauce record for an entity.
         
         Args:
             entity_type: Type of entity (batch, campaign)
@@ -551,9 +470,9 @@ class DescriptiveWorker:
             template_id: Template ID
             
         Returns:
-            Secret Sauce ID
+            Secret Sauce data
         """
-        secret_sauce_data = {
+        return {
             f"{entity_type}_id": entity_id,
             "aggregated_score": score,
             "aggregated_metrics": metrics,
@@ -561,10 +480,39 @@ class DescriptiveWorker:
             "analysis_timestamp": datetime.now().isoformat()
         }
         
+    async def create_secret_sauce(self, entity_type: str, entity_id: str, metrics: Dict[str, Any], score: float, template_id: str) -> str:
+        """
+        Create a Secret Sauce record for an entity.
+        
+        Args:
+            entity_type: Type of entity (batch, campaign)
+            entity_id: ID of the entity
+            metrics: Performance metrics
+            score: Overall score
+            template_id: Template ID
+            
+        Returns:
+            Secret Sauce ID
+        """
+        secret_sauce_data = self.build_secret_sauce(entity_type, entity_id, metrics, score, template_id)
+        
         secret_sauce_id = await self.category_repository.store_secret_sauce(secret_sauce_data)
         
         return secret_sauce_id
         
+    async def store_secret_sauces(self, secret_sauces: List[Dict[str, Any]]) -> None:
+        """
+        Store Secret Sauce records in the repository in chunks.
+        
+        Args:
+            secret_sauces: Secret Sauce data
+        """
+        await self.persist_in_chunks(
+            secret_sauces,
+            "bulk_store_secret_sauces",
+            self.category_repository.store_secret_sauce
+        )
+        
     async def link_user_to_factors(self, user_id: str, user_data: pd.DataFrame, template_id: str) -> None:
         """
         Link a user to relevant factors based on their data.
@@ -574,26 +522,49 @@ class DescriptiveWorker:
             user_data: User data
             template_id: Template ID
         """
-        # Get factor categories from columns
-        factor_categories = [col for col in user_data.columns if col not in ["timestamp", "date", "id", "user_id", "batch_id"]]
+        user_data = user_data.assign(user_id=user_id)
+        links = link_users_to_factors(user_data, datetime.now().strftime('%Y%m%d%H%M%S'))
         
-        for category in factor_categories:
-            # Skip if not categorical
-            if not pd.api.types.is_object_dtype(user_data[category]):
-                continue
-                
-            # Get most common value for this user
-            value_counts = user_data[category].value_counts()
-            if len(value_counts) == 0:
-                continue
-                
-            most_common_value = value_counts.index[0]
-            
-            # Get or create factor
-            factor_id = f"factor_{category}_{most_common_value}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-            
-            # Link factor to user
-            await self.category_repository.link_factor_to_entity(factor_id, "user", user_id)
+        await self.store_links(links)
+        
+    async def store_links(self, links: List[Tuple[str, str, str]]) -> None:
+        """
+        Link factors to entities in the repository in chunks.
+        
+        Args:
+            links: (factor_id, entity_type, entity_id) links
+        """
+        await self.persist_in_chunks(
+            links,
+            "bulk_link_factors_to_entities",
+            lambda link: self.category_repository.link_factor_to_entity(*link)
+        )
+        
+    async def persist_in_chunks(
+        self,
+        records: List[Any],
+        bulk_method: str,
+        store_one: Callable[[Any], Awaitable[Any]]
+    ) -> None:
+        """
+        Persist records chunk by chunk.
+        
+        Each chunk is written with one call to the repository's bulk upsert
+        method if it provides one; otherwise the chunk's single-record calls
+        run concurrently.
+        
+        Args:
+            records: Records to persist
+            bulk_method: Name of the repository's bulk method
+            store_one: Persists one record
+        """
+        bulk_store = getattr(self.category_repository, bulk_method, None)
+        
+        for chunk in chunked(records, self.chunk_size):
+            if bulk_store is not None:
+                await bulk_store(list(chunk))
+            else:
+                await asyncio.gather(*(store_one(record) for record in chunk))
 
 async def create_worker(category_repository: CategoryRepository = None) -> DescriptiveWorker:
     """
@@ -0,0 +1,205 @@
+"""
+Columnar scoring engine for the descriptive module.
+
+This module computes the scores behind DescriptiveWorker for all entities of
+a type at once: one groupby aggregation gives every entity's metric
+statistics and overall score, and users are linked to factors through a
+sparse (entity x value) count matrix instead of one value_counts per user.
+"""
+import logging
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+STAT_NAMES = ("mean", "median", "std", "min", "max")
+
+
+def is_categorical(series: pd.Series) -> bool:
+    """
+    Check whether a column holds categorical (non-numeric) values.
+
+    Args:
+        series: Column to check
+
+    Returns:
+        bool: True for object and string columns
+    """
+    return pd.api.types.is_object_dtype(series) or isinstance(series.dtype, pd.StringDtype)
+
+
+def numeric_columns(df: pd.DataFrame, exclude: Sequence[str]) -> List[str]:
+    """
+    Get the numeric columns of a DataFrame.
+
+    Args:
+        df: Data
+        exclude: Columns to leave out
+
+    Returns:
+        List[str]: Numeric columns in frame order
+    """
+    return [col for col in df.columns if col not in exclude and pd.api.types.is_numeric_dtype(df[col])]
+
+
+def chunked(records: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    """
+    Split records into chunks.
+
+    Args:
+        records: Records
+        size: Maximum chunk size
+
+    Yields:
+        Sequence[Any]: Consecutive chunks
+    """
+    for start in range(0, len(records), size):
+        yield records[start:start + size]
+
+
+class EntityScores:
+    """
+    Metric statistics and overall scores of every entity of one type.
+
+    Attributes:
+        keys (pd.Index): Entity key values, in order of appearance
+        metrics (List[str]): Metric columns
+        size (np.ndarray): Number of rows per entity
+        stats (Dict[str, np.ndarray]): Statistic name -> (entities x metrics)
+        overall_score (np.ndarray): Average of the metric means per entity
+            (0.0 if there are no metrics)
+    """
+
+    def __init__(self, df: pd.DataFrame, key: str, metrics: Sequence[str]):
+        """
+        Compute the statistics with one groupby aggregation.
+
+        Args:
+            df: Data
+            key: Entity key column
+            metrics: Metric columns
+        """
+        self.metrics = list(metrics)
+        # Grouping by the key Series keeps the key usable as a metric as well
+        grouped = df[self.metrics].astype(float).groupby(df[key], sort=False)
+
+        sizes = grouped.size()
+        self.keys = sizes.index
+        self.size = sizes.to_numpy()
+
+        self.stats: Dict[str, np.ndarray] = {}
+        if self.metrics:
+            aggregated = grouped[self.metrics].agg(list(STAT_NAMES)).reindex(self.keys)
+            for name in STAT_NAMES:
+                self.stats[name] = aggregated.xs(name, axis=1, level=1)[self.metrics].to_numpy()
+            # Single-row entities report a standard deviation of 0
+            self.stats["std"] = np.where((self.size > 1)[:, None], self.stats["std"], 0.0)
+            self.overall_score = self.stats["mean"].sum(axis=1) / len(self.metrics)
+        else:
+            self.stats = {name: np.empty((len(self.keys), 0)) for name in STAT_NAMES}
+            self.overall_score = np.zeros(len(self.keys))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def records(self) -> Iterator[Tuple[Any, Dict[str, Dict[str, Any]], float, int]]:
+        """
+        Iterate over the entities.
+
+        Yields:
+            Tuple: Key value, metrics (metric -> mean, median, std, min, max
+            and count), overall score and sample size
+        """
+        columns = [self.stats[name].tolist() for name in STAT_NAMES]
+        sizes = self.size.tolist()
+        scores = self.overall_score.tolist()
+
+        for position, key in enumerate(self.keys):
+            count = sizes[position]
+            metrics = {}
+            for index, metric in enumerate(self.metrics):
+                entry = {name: column[position][index] for name, column in zip(STAT_NAMES, columns)}
+                entry["count"] = count
+                metrics[metric] = entry
+            yield key, metrics, scores[position], count
+
+
+def dominant_values(keys: pd.Series, values: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the most common value for each entity.
+
+    The (entity x value) count matrix is built in coordinate form from the
+    factorized columns, so its size is the number of distinct pairs rather
+    than entities x values. Ties go to the value that appears first for the
+    entity.
+
+    Args:
+        keys: Entity key of each row
+        values: Category value of each row
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Entity key, dominant value
+        and its count, one entry per entity with at least one value
+    """
+    key_codes, key_uniques = pd.factorize(keys)
+    value_codes, value_uniques = pd.factorize(values)
+    present = np.flatnonzero((key_codes >= 0) & (value_codes >= 0))
+    if len(present) == 0:
+        empty = np.array([], dtype=object)
+        return empty, empty, np.array([], dtype=np.int64)
+
+    width = len(value_uniques)
+    cells = key_codes[present].astype(np.int64) * width + value_codes[present]
+    cell_ids, first_seen, counts = np.unique(cells, return_index=True, return_counts=True)
+    rows, cols = np.divmod(cell_ids, width)
+
+    # Per row: highest count first, then earliest appearance
+    order = np.lexsort((first_seen, -counts, rows))
+    ordered_rows = rows[order]
+    best = order[np.r_[True, ordered_rows[1:] != ordered_rows[:-1]]]
+
+    return (
+        np.asarray(key_uniques, dtype=object)[rows[best]],
+        np.asarray(value_uniques, dtype=object)[cols[best]],
+        counts[best],
+    )
+
+
+def link_users_to_factors(
+    df: pd.DataFrame,
+    timestamp: str,
+    key: str = "user_id",
+    exclude: Sequence[str] = ("timestamp", "date", "id", "user_id", "batch_id")
+) -> List[Tuple[str, str, str]]:
+    """
+    Link each user to the factor of their most common value in every
+    categorical column.
+
+    Factor IDs are built once per distinct value and joined to the users
+    through the dominant value codes.
+
+    Args:
+        df: Data with one row per interaction
+        timestamp: Timestamp suffix of the factor IDs (%Y%m%d%H%M%S)
+        key: User key column
+        exclude: Columns that are not factor categories
+
+    Returns:
+        List[Tuple[str, str, str]]: (factor_id, "user", user_id) links
+    """
+    links: List[Tuple[str, str, str]] = []
+    for category in df.columns:
+        if category in exclude or not is_categorical(df[category]):
+            continue
+
+        users, values, _ = dominant_values(df[key], df[category])
+        if len(users) == 0:
+            continue
+
+        value_codes, distinct = pd.factorize(values)
+        factor_ids = np.array([f"factor_{category}_{value}_{timestamp}" for value in distinct], dtype=object)
+        links.extend(zip(factor_ids[value_codes], ["user"] * len(users), [str(user) for user in users]))
+
+    return links
@@ -10,6 +10,8 @@ from collections import defaultdict
 # Updated import to use the database-layer category repository
 from database_layer.category_repository_service.src.repository.category_repository import CategoryRepository
 
+from .helpers.diagnostic_engine import DiagnosticEngine, is_categorical
+
 logger = logging.getLogger(__name__)
 
 class DiagnosticWorker:
@@ -184,6 +186,11 @@ class DiagnosticWorker:
             logger.warning("No target metrics available for factor diagnostics")
             return results
             
+        # Overall statistics are computed once and group statistics once per category
+        engine = DiagnosticEngine(df, available_metrics)
+        anomaly_method = diagnostics_params.get("anomaly_method", "zscore")
+        anomaly_threshold = diagnostics_params.get("anomaly_threshold")
+        
         # Diagnose each factor category
         for category in factor_categories:
             # Skip if category not in data
@@ -194,7 +201,7 @@ class DiagnosticWorker:
             unique_factors = df[category].unique()
             
             # Calculate feature importance for this category
-            feature_importance = await self.calculate_feature_importance(df, category, available_metrics)
+            feature_importance = await self.calculate_feature_importance(df, category, available_metrics, engine)
             results["feature_importance"][category] = feature_importance
             
             # Identify strengths and weaknesses
@@ -203,14 +210,23 @@ class DiagnosticWorker:
                 category, 
                 unique_factors, 
                 available_metrics,
-                factor_scores
+                factor_scores,
+                engine
             )
             
             results["strengths"][category] = strengths
             results["weaknesses"][category] = weaknesses
             
             # Identify anomalies
-            anomalies = await self.identify_anomalies(df, category, unique_factors, available_metrics)
+            anomalies = await self.identify_anomalies(
+                df,
+                category,
+                unique_factors,
+                available_metrics,
+                engine,
+                method=anomaly_method,
+                threshold=anomaly_threshold
+            )
             results["anomalies"][category] = anomalies
             
             # Identify root causes
@@ -233,15 +249,20 @@ class DiagnosticWorker:
         self, 
         df: pd.DataFrame, 
         category: str, 
-        target_metrics: List[str]
+        target_metrics: List[str],
+        engine: Optional[DiagnosticEngine] = None
     ) -> Dict[str, float]:
         """
         Calculate feature importance for a category.
         
+        Categorical values are one-hot encoded and every indicator is
+        correlated with every metric in one pass.
+        
         Args:
             df: DataFrame with data
             category: Category to analyze
             target_metrics: Target metrics for importance calculation
+            engine: Diagnostic engine for the DataFrame (created if None)
             
         Returns:
             Dictionary of feature importance scores
@@ -249,26 +270,26 @@ class DiagnosticWorker:
         # Simple feature importance calculation based on correlation
         importance_scores = {}
         
-        for metric in target_metrics:
-            # Skip if metric not in data
-            if metric not in df.columns:
-                continue
-                
-            # Create dummy variables for categorical features
-            if pd.api.types.is_object_dtype(df[category]):
-                dummies = pd.get_dummies(df[category], prefix=category)
-                
-                # Calculate correlation with target metric
-                for col in dummies.columns:
-                    corr = dummies[col].corr(df[metric])
-                    if not pd.isna(corr):
-                        # Extract value from dummy column name
-                        value = col.replace(f"{category}_", "")
-                        importance_scores[f"{value}_{metric}"] = abs(corr)
-            else:
-                # For numeric categories, calculate direct correlation
-                corr = df[category].corr(df[metric])
-                if not pd.isna(corr):
+        metrics = [metric for metric in target_metrics if metric in df.columns]
+        if not metrics:
+            return importance_scores
+            
+        if engine is None or engine.df is not df:
+            engine = DiagnosticEngine(df, metrics)
+            
+        correlations = engine.feature_importance(category)
+        categorical = is_categorical(df[category])
+        
+        for metric in metrics:
+            for value, corr in correlations[metric].items():
+                if pd.isna(corr):
+                    continue
+                    
+                if categorical:
+                    # Keys match the dummy column names with the category prefix removed
+                    value = f"{category}_{value}".replace(f"{category}_", "")
+                    importance_scores[f"{value}_{metric}"] = abs(corr)
+                else:
                     importance_scores[f"{category}_{metric}"] = abs(corr)
                     
         return importance_scores
@@ -279,7 +300,8 @@ class DiagnosticWorker:
         category: str, 
         unique_values: np.ndarray, 
         target_metrics: List[str],
-        factor_scores: Dict[str, Any]
+        factor_scores: Dict[str, Any],
+        engine: Optional[DiagnosticEngine] = None
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
         Identify strengths and weaknesses for factor values.
@@ -290,6 +312,7 @@ class DiagnosticWorker:
             unique_values: Unique values in the category
             target_metrics: Target metrics for analysis
             factor_scores: Scores from descriptive analysis
+            engine: Diagnostic engine for the DataFrame (created if None)
             
         Returns:
             Tuple of strengths and weaknesses dictionaries
@@ -297,58 +320,29 @@ class DiagnosticWorker:
         strengths = {}
         weaknesses = {}
         
-        for metric in target_metrics:
-            # Skip if metric not in data
-            if metric not in df.columns:
-                continue
-                
-            # Calculate overall metric average
-            overall_avg = df[metric].mean()
+        if engine is None or engine.df is not df:
+            engine = DiagnosticEngine(df, target_metrics)
             
-            for value in unique_values:
-                # Skip null values
-                if pd.isna(value):
-                    continue
-                    
-                # Filter data for this factor value
-                factor_data = df[df[category] == value]
-                
-                if len(factor_data) == 0:
-                    continue
-                    
-                # Calculate average for this factor value
-                factor_avg = factor_data[metric].mean()
-                
-                # Calculate percent difference from overall average
-                if overall_avg != 0:
-                    percent_diff = ((factor_avg - overall_avg) / overall_avg) * 100
-                else:
-                    percent_diff = 0
-                    
-                # Determine if strength or weakness
-                factor_id = f"{category}:{value}"
+        # Groups at least 10% better or worse than the overall average
+        deviations = engine.deviations(category, unique_values, threshold=10)
+        
+        for row in deviations.to_dict("records"):
+            factor_id = f"{category}:{row['value']}"
+            entry = {
+                "category": category,
+                "value": row["value"],
+                "metric": row["metric"],
+                "factor_avg": float(row["group_mean"]),
+                "overall_avg": float(row["overall_mean"]),
+                "percent_diff": float(row["percent_diff"]),
+                "sample_size": int(row["sample_size"])
+            }
+            
+            if row["percent_diff"] > 0:
+                strengths[f"{factor_id}_{row['metric']}"] = entry
+            else:
+                weaknesses[f"{factor_id}_{row['metric']}"] = entry
                 
-                if percent_diff >= 10:  # 10% better than average
-                    strengths[f"{factor_id}_{metric}"] = {
-                        "category": category,
-                        "value": value,
-                        "metric": metric,
-                        "factor_avg": float(factor_avg),
-                        "overall_avg": float(overall_avg),
-                        "percent_diff": float(percent_diff),
-                        "sample_size": int(len(factor_data))
-                    }
-                elif percent_diff <= -10:  # 10% worse than average
-                    weaknesses[f"{factor_id}_{metric}"] = {
-                        "category": category,
-                        "value": value,
-                        "metric": metric,
-                        "factor_avg": float(factor_avg),
-                        "overall_avg": float(overall_avg),
-                        "percent_diff": float(percent_diff),
-                        "sample_size": int(len(factor_data))
-                    }
-                    
         return strengths, weaknesses
         
     async def identify_anomalies(
@@ -356,7 +350,10 @@ class DiagnosticWorker:
         df: pd.DataFrame, 
         category: str, 
         unique_values: np.ndarray, 
-        target_metrics: List[str]
+        target_metrics: List[str],
+        engine: Optional[DiagnosticEngine] = None,
+        method: str = "zscore",
+        threshold: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Identify anomalies in factor values.
@@ -366,56 +363,38 @@ class DiagnosticWorker:
             category: Category to analyze
             unique_values: Unique values in the category
             target_metrics: Target metrics for analysis
+            engine: Diagnostic engine for the DataFrame (created if None)
+            method: Anomaly scoring method ("zscore", "robust_z" or "iqr")
+            threshold: Score threshold (2 standard deviations for "zscore"
+                if None)
             
         Returns:
             Dictionary of anomalies
         """
         anomalies = {}
         
-        for metric in target_metrics:
-            # Skip if metric not in data
-            if metric not in df.columns:
-                continue
-                
-            # Calculate overall metric statistics
-            overall_mean = df[metric].mean()
-            overall_std = df[metric].std()
+        if engine is None or engine.df is not df:
+            engine = DiagnosticEngine(df, target_metrics)
             
-            # Set threshold for anomaly detection (2 standard deviations)
-            threshold = 2.0
+        # Require minimum sample size of 5 rows per factor value
+        flagged = engine.anomalies(category, unique_values, method=method, threshold=threshold, min_samples=5)
+        
+        for row in flagged.to_dict("records"):
+            factor_id = f"{category}:{row['value']}"
+            anomaly = {
+                "category": category,
+                "value": row["value"],
+                "metric": row["metric"],
+                "factor_mean": float(row["group_mean"]),
+                "overall_mean": float(row["overall_mean"]),
+                "z_score": float(row["score"]),
+                "direction": "above" if row["group_mean"] > row["center"] else "below",
+                "sample_size": int(row["sample_size"])
+            }
+            if method != "zscore":
+                anomaly["method"] = method
+            anomalies[f"{factor_id}_{row['metric']}"] = anomaly
             
-            for value in unique_values:
-                # Skip null values
-                if pd.isna(value):
-                    continue
-                    
-                # Filter data for this factor value
-                factor_data = df[df[category] == value]
-                
-                if len(factor_data) < 5:  # Require minimum sample size
-                    continue
-                    
-                # Calculate z-score for this factor value
-                factor_mean = factor_data[metric].mean()
-                if overall_std != 0:
-                    z_score = abs((factor_mean - overall_mean) / overall_std)
-                else:
-                    z_score = 0
-                    
-                # Check if anomaly
-                if z_score > threshold:
-                    factor_id = f"{category}:{value}"
-                    anomalies[f"{factor_id}_{metric}"] = {
-                        "category": category,
-                        "value": value,
-                        "metric": metric,
-                        "factor_mean": float(factor_mean),
-                        "overall_mean": float(overall_mean),
-                        "z_score": float(z_score),
-                        "direction": "above" if factor_mean > overall_mean else "below",
-                        "sample_size": int(len(factor_data))
-                    }
-                    
         return anomalies
         
     async def identify_root_causes(
@@ -673,254 +652,110 @@ class DiagnosticWorker:
         # Identify factor categories that might influence batch performance
         factor_categories = [col for col in df.columns if col not in ["id", "user_id", "batch_id", "timestamp", "date"] + available_metrics]
         
-        # Calculate overall batch statistics
-        batch_stats = {}
-        for batch_id in unique_batches:
-            # Skip null values
-            if pd.isna(batch_id):
-                continue
-                
-            # Filter data for this batch
-            batch_data = df[df["batch_id"] == batch_id]
-            
-            if len(batch_data) == 0:
-                continue
-                
-            # Calculate statistics for each metric
-            batch_stats[str(batch_id)] = {}
+        # Group statistics for all batches come from one groupby
+        engine = DiagnosticEngine(df, available_metrics)
+        batches = engine.group_summary("batch_id")
+        anomaly_method = diagnostics_params.get("anomaly_method", "zscore")
+        anomaly_threshold = diagnostics_params.get("anomaly_threshold")
+        
+        # Identify strengths and weaknesses for each batch (10% better or worse than average)
+        for row in engine.deviations("batch_id", threshold=10).to_dict("records"):
+            batch_id_str = str(row["value"])
+            metric = row["metric"]
+            side = "strengths" if row["percent_diff"] > 0 else "weaknesses"
             
-            for metric in available_metrics:
-                batch_stats[str(batch_id)][metric] = {
-                    "mean": float(batch_data[metric].mean()),
-                    "median": float(batch_data[metric].median()),
-                    "std": float(batch_data[metric].std()) if len(batch_data) > 1 else 0.0,
-                    "min": float(batch_data[metric].min()),
-                    "max": float(batch_data[metric].max()),
-                    "count": int(len(batch_data))
-                }
-                
-        # Calculate overall statistics across all batches
-        overall_stats = {}
-        for metric in available_metrics:
-            overall_stats[metric] = {
-                "mean": float(df[metric].mean()),
-                "median": float(df[metric].median()),
-                "std": float(df[metric].std()) if len(df) > 1 else 0.0,
-                "min": float(df[metric].min()),
-                "max": float(df[metric].max()),
-                "count": int(len(df))
+            results[side].setdefault(batch_id_str, {})[metric] = {
+                "batch_id": batch_id_str,
+                "metric": metric,
+                "batch_mean": float(row["group_mean"]),
+                "overall_mean": float(row["overall_mean"]),
+                "percent_diff": float(row["percent_diff"]),
+                "sample_size": int(row["sample_size"])
             }
             
-        # Identify strengths and weaknesses for each batch
-        for batch_id in unique_batches:
-            # Skip null values
-            if pd.isna(batch_id):
-                continue
-                
-            batch_id_str = str(batch_id)
-            
-            if batch_id_str not in batch_stats:
-                continue
-                
-            # Analyze each metric
-            for metric in available_metrics:
-                # Calculate percent difference from overall average
-                batch_mean = batch_stats[batch_id_str][metric]["mean"]
-                overall_mean = overall_stats[metric]["mean"]
-                
-                if overall_mean != 0:
-                    percent_diff = ((batch_mean - overall_mean) / overall_mean) * 100
-                else:
-                    percent_diff = 0
-                    
-                # Determine if strength or weakness
-                if percent_diff >= 10:  # 10% better than average
-                    if batch_id_str not in results["strengths"]:
-                        results["strengths"][batch_id_str] = {}
-                        
-                    results["strengths"][batch_id_str][metric] = {
-                        "batch_id": batch_id_str,
-                        "metric": metric,
-                        "batch_mean": batch_mean,
-                        "overall_mean": overall_mean,
-                        "percent_diff": float(percent_diff),
-                        "sample_size": batch_stats[batch_id_str][metric]["count"]
-                    }
-                elif percent_diff <= -10:  # 10% worse than average
-                    if batch_id_str not in results["weaknesses"]:
-                        results["weaknesses"][batch_id_str] = {}
-                        
-                    results["weaknesses"][batch_id_str][metric] = {
-                        "batch_id": batch_id_str,
-                        "metric": metric,
-                        "batch_mean": batch_mean,
-                        "overall_mean": overall_mean,
-                        "percent_diff": float(percent_diff),
-                        "sample_size": batch_stats[batch_id_str][metric]["count"]
-                    }
-                    
-            # Identify anomalies
-            for metric in available_metrics:
-                batch_mean = batch_stats[batch_id_str][metric]["mean"]
-                overall_mean = overall_stats[metric]["mean"]
-                overall_std = overall_stats[metric]["std"]
-                
-                # Set threshold for anomaly detection (2 standard deviations)
-                threshold = 2.0
-                
-                # Calculate z-score
-                if overall_std != 0:
-                    z_score = abs((batch_mean - overall_mean) / overall_std)
-                else:
-                    z_score = 0
-                    
-                # Check if anomaly
-                if z_score > threshold:
-                    if batch_id_str not in results["anomalies"]:
-                        results["anomalies"][batch_id_str] = {}
-                        
-                    results["anomalies"][batch_id_str][metric] = {
-                        "batch_id": batch_id_str,
-                        "metric": metric,
-                        "batch_mean": batch_mean,
-                        "overall_mean": overall_mean,
-                        "z_score": float(z_score),
-                        "direction": "above" if batch_mean > overall_mean else "below",
-                        "sample_size": batch_stats[batch_id_str][metric]["count"]
-                    }
-                    
-        # Identify root causes for batch performance
-        for batch_id in unique_batches:
-            # Skip null values
-            if pd.isna(batch_id):
-                continue
-                
-            batch_id_str = str(batch_id)
+        # Identify anomalies
+        flagged = engine.anomalies(
+            "batch_id",
+            method=anomaly_method,
+            threshold=anomaly_threshold,
+            min_samples=0
+        )
+        for row in flagged.to_dict("records"):
+            batch_id_str = str(row["value"])
+            metric = row["metric"]
+            anomaly = {
+                "batch_id": batch_id_str,
+                "metric": metric,
+                "batch_mean": float(row["group_mean"]),
+                "overall_mean": float(row["overall_mean"]),
+                "z_score": float(row["score"]),
+                "direction": "above" if row["group_mean"] > row["center"] else "below",
+                "sample_size": int(row["sample_size"])
+            }
+            if anomaly_method != "zscore":
+                anomaly["method"] = anomaly_method
+            results["anomalies"].setdefault(batch_id_str, {})[metric] = anomaly
             
-            # Filter data for this batch
-            batch_data = df[df["batch_id"] == batch_id]
+        categorical_factors = [category for category in factor_categories if is_categorical(df[category])]
+        
+        # Identify root causes for batch performance: factor values over- or
+        # under-represented (20% difference) in batches with a strength or weakness
+        diagnosed = [
+            batch_id for batch_id in batches.index
+            if str(batch_id) in results["strengths"] or str(batch_id) in results["weaknesses"]
+        ]
+        for category in categorical_factors:
+            shifts = engine.representation_shifts("batch_id", category, groups=diagnosed, min_samples=5, threshold=20)
             
-            if len(batch_data) < 5:  # Require minimum sample size
-                continue
-                
-            # Analyze factor distribution within batch
-            for category in factor_categories:
-                # Skip if not categorical
-                if not pd.api.types.is_object_dtype(df[category]):
-                    continue
-                    
-                # Get value counts for this category in the batch
-                value_counts = batch_data[category].value_counts(normalize=True)
+            for row in shifts.to_dict("records"):
+                batch_id_str = str(row["group"])
+                has_strength = batch_id_str in results["strengths"]
+                related = results["strengths"] if has_strength else results["weaknesses"]
                 
-                # Get overall value counts for comparison
-                overall_counts = df[category].value_counts(normalize=True)
-                
-                # Find overrepresented values in the batch
-                for value, batch_pct in value_counts.items():
-                    if value in overall_counts:
-                        overall_pct = overall_counts[value]
-                        
-                        # Calculate percent difference
-                        if overall_pct != 0:
-                            pct_diff = ((batch_pct - overall_pct) / overall_pct) * 100
-                        else:
-                            pct_diff = 0
-                            
-                        # If value is significantly overrepresented and batch has a strength or weakness
-                        if abs(pct_diff) >= 20:  # 20% difference in representation
-                            # Check if this batch has strengths or weaknesses
-                            has_strength = batch_id_str in results["strengths"]
-                            has_weakness = batch_id_str in results["weaknesses"]
-                            
-                            if has_strength or has_weakness:
-                                if batch_id_str not in results["root_causes"]:
-                                    results["root_causes"][batch_id_str] = {}
-                                    
-                                factor_key = f"{category}:{value}"
-                                results["root_causes"][batch_id_str][factor_key] = {
-                                    "batch_id": batch_id_str,
-                                    "category": category,
-                                    "value": value,
-                                    "batch_percentage": float(batch_pct),
-                                    "overall_percentage": float(overall_pct),
-                                    "percent_diff": float(pct_diff),
-                                    "impact": "positive" if has_strength else "negative",
-                                    "related_to": list(results["strengths"].get(batch_id_str, {}).keys()) if has_strength else list(results["weaknesses"].get(batch_id_str, {}).keys())
-                                }
-                                
-        # Calculate feature importance for batches
-        for metric in available_metrics:
-            # Create a new DataFrame with batch statistics
-            batch_stats_df = pd.DataFrame([
-                {
-                    "batch_id": batch_id,
-                    f"{metric}_mean": stats[metric]["mean"],
-                    f"{metric}_std": stats[metric]["std"],
-                    f"{metric}_count": stats[metric]["count"]
+                factor_key = f"{category}:{row['value']}"
+                results["root_causes"].setdefault(batch_id_str, {})[factor_key] = {
+                    "batch_id": batch_id_str,
+                    "category": category,
+                    "value": row["value"],
+                    "batch_percentage": float(row["group_pct"]),
+                    "overall_percentage": float(row["overall_pct"]),
+                    "percent_diff": float(row["percent_diff"]),
+                    "impact": "positive" if has_strength else "negative",
+                    "related_to": list(related.get(batch_id_str, {}).keys())
                 }
-                for batch_id, stats in batch_stats.items()
-            ])
+                
+        # Calculate feature importance for batches: how much of the variance of
+        # batch means is explained by each batch's dominant factor value
+        if len(batches.index) >= 3:  # Need at least a few batches for meaningful analysis
+            batch_means = batches.stat("mean")
+            dominant_values = {
+                category: engine.dominant_values("batch_id", category)
+                for category in categorical_factors
+            }
             
-            if len(batch_stats_df) < 3:  # Need at least a few batches for meaningful analysis
-                continue
+            for metric in available_metrics:
+                # Batches without a dominant value for a category are excluded
+                # from that category onwards
+                kept = np.ones(len(batches.index), dtype=bool)
                 
-            # For each factor category, calculate how well it explains batch performance
-            for category in factor_categories:
-                # Skip if not categorical
-                if not pd.api.types.is_object_dtype(df[category]):
-                    continue
-                    
-                # Calculate the most common value for each batch
-                batch_dominant_values = {}
-                for batch_id in unique_batches:
-                    if pd.isna(batch_id):
+                for category in categorical_factors:
+                    dominant = dominant_values[category]
+                    if len(dominant) < 3:
                         continue
                         
-                    batch_data = df[df["batch_id"] == batch_id]
-                    if len(batch_data) == 0:
+                    labels = dominant["value"].reindex(batches.index)
+                    kept &= labels.notna().to_numpy()
+                    if kept.sum() < 3:
                         continue
                         
-                    value_counts = batch_data[category].value_counts()
-                    if len(value_counts) == 0:
-                        continue
-                        
-                    batch_dominant_values[str(batch_id)] = value_counts.index[0]
+                    variance_explained = engine.variance_explained(
+                        batch_means[metric].to_numpy()[kept],
+                        labels.to_numpy()[kept]
+                    )
                     
-                # Skip if not enough batches have dominant values
-                if len(batch_dominant_values) < 3:
-                    continue
+                    # Store feature importance
+                    results["feature_importance"].setdefault(category, {})[metric] = variance_explained
                     
-                # Add dominant value to batch stats DataFrame
-                batch_stats_df["dominant_value"] = batch_stats_df["batch_id"].map(batch_dominant_values)
-                batch_stats_df = batch_stats_df.dropna(subset=["dominant_value"])
-                
-                if len(batch_stats_df) < 3:
-                    continue
-                    
-                # Calculate variance explained by dominant value
-                # (Simple approach: calculate ratio of between-group variance to total variance)
-                group_means = batch_stats_df.groupby("dominant_value")[f"{metric}_mean"].mean()
-                overall_mean = batch_stats_df[f"{metric}_mean"].mean()
-                
-                # Between-group sum of squares
-                between_ss = sum([(group_mean - overall_mean) ** 2 * len(batch_stats_df[batch_stats_df["dominant_value"] == value]) 
-                                for value, group_mean in group_means.items()])
-                
-                # Total sum of squares
-                total_ss = sum((batch_stats_df[f"{metric}_mean"] - overall_mean) ** 2)
-                
-                # Calculate variance explained (R-squared)
-                if total_ss != 0:
-                    variance_explained = between_ss / total_ss
-                else:
-                    variance_explained = 0
-                    
-                # Store feature importance
-                if category not in results["feature_importance"]:
-                    results["feature_importance"][category] = {}
-                    
-                results["feature_importance"][category][metric] = float(variance_explained)
-                
         # Update Secret Sauce for batches
         for batch_id in unique_batches:
             if pd.isna(batch_id):
@@ -1021,122 +856,58 @@ class DiagnosticWorker:
         # Identify factor categories that might influence user performance
         factor_categories = [col for col in df.columns if col not in ["id", "user_id", "batch_id", "timestamp", "date"] + available_metrics]
         
-        # Calculate overall user statistics
-        user_stats = {}
-        for user_id in unique_users:
-            # Skip null values
-            if pd.isna(user_id):
-                continue
-                
-            # Filter data for this user
-            user_data = df[df["user_id"] == user_id]
-            
-            if len(user_data) == 0:
-                continue
-                
-            # Calculate statistics for each metric
-            user_stats[str(user_id)] = {}
+        # Group statistics for all users come from one groupby
+        engine = DiagnosticEngine(df, available_metrics)
+        users = engine.group_summary("user_id")
+        
+        # Identify strengths and weaknesses for each user (15% better or worse than average)
+        for row in engine.deviations("user_id", threshold=15).to_dict("records"):
+            user_id_str = str(row["value"])
+            metric = row["metric"]
+            side = "strengths" if row["percent_diff"] > 0 else "weaknesses"
             
-            for metric in available_metrics:
-                user_stats[str(user_id)][metric] = {
-                    "mean": float(user_data[metric].mean()),
-                    "median": float(user_data[metric].median()),
-                    "std": float(user_data[metric].std()) if len(user_data) > 1 else 0.0,
-                    "min": float(user_data[metric].min()),
-                    "max": float(user_data[metric].max()),
-                    "count": int(len(user_data))
-                }
-                
-        # Calculate overall statistics across all users
-        overall_stats = {}
-        for metric in available_metrics:
-            overall_stats[metric] = {
-                "mean": float(df[metric].mean()),
-                "median": float(df[metric].median()),
-                "std": float(df[metric].std()) if len(df) > 1 else 0.0,
-                "min": float(df[metric].min()),
-                "max": float(df[metric].max()),
-                "count": int(len(df))
+            results[side].setdefault(user_id_str, {})[metric] = {
+                "user_id": user_id_str,
+                "metric": metric,
+                "user_mean": float(row["group_mean"]),
+                "overall_mean": float(row["overall_mean"]),
+                "percent_diff": float(row["percent_diff"]),
+                "sample_size": int(row["sample_size"])
             }
             
-        # Identify strengths and weaknesses for each user
-        for user_id in unique_users:
-            # Skip null values
-            if pd.isna(user_id):
-                continue
-                
-            user_id_str = str(user_id)
+        # Identify anomalies (2.5 standard deviations by default)
+        anomaly_method = diagnostics_params.get("anomaly_method", "zscore")
+        anomaly_threshold = diagnostics_params.get("anomaly_threshold", 2.5 if anomaly_method == "zscore" else None)
+        flagged = engine.anomalies(
+            "user_id",
+            method=anomaly_method,
+            threshold=anomaly_threshold,
+            min_samples=0
+        )
+        for row in flagged.to_dict("records"):
+            user_id_str = str(row["value"])
+            metric = row["metric"]
+            anomaly = {
+                "user_id": user_id_str,
+                "metric": metric,
+                "user_mean": float(row["group_mean"]),
+                "overall_mean": float(row["overall_mean"]),
+                "z_score": float(row["score"]),
+                "direction": "above" if row["group_mean"] > row["center"] else "below",
+                "sample_size": int(row["sample_size"])
+            }
+            if anomaly_method != "zscore":
+                anomaly["method"] = anomaly_method
+            results["anomalies"].setdefault(user_id_str, {})[metric] = anomaly
             
-            if user_id_str not in user_stats:
-                continue
-                
-            # Analyze each metric
-            for metric in available_metrics:
-                # Calculate percent difference from overall average
-                user_mean = user_stats[user_id_str][metric]["mean"]
-                overall_mean = overall_stats[metric]["mean"]
-                
-                if overall_mean != 0:
-                    percent_diff = ((user_mean - overall_mean) / overall_mean) * 100
-                else:
-                    percent_diff = 0
-                    
-                # Determine if strength or weakness
-                if percent_diff >= 15:  # 15% better than average
-                    if user_id_str not in results["strengths"]:
-                        results["strengths"][user_id_str] = {}
-                        
-                    results["strengths"][user_id_str][metric] = {
-                        "user_id": user_id_str,
-                        "metric": metric,
-                        "user_mean": user_mean,
-                        "overall_mean": overall_mean,
-                        "percent_diff": float(percent_diff),
-                        "sample_size": user_stats[user_id_str][metric]["count"]
-                    }
-                elif percent_diff <= -15:  # 15% worse than average
-                    if user_id_str not in results["weaknesses"]:
-                        results["weaknesses"][user_id_str] = {}
-                        
-                    results["weaknesses"][user_id_str][metric] = {
-                        "user_id": user_id_str,
-                        "metric": metric,
-                        "user_mean": user_mean,
-                        "overall_mean": overall_mean,
-                        "percent_diff": float(percent_diff),
-                        "sample_size": user_stats[user_id_str][metric]["count"]
-                    }
-                    
-            # Identify anomalies
-            for metric in available_metrics:
-                user_mean = user_stats[user_id_str][metric]["mean"]
-                overall_mean = overall_stats[metric]["mean"]
-                overall_std = overall_stats[metric]["std"]
-                
-                # Set threshold for anomaly detection (2.5 standard deviations)
-                threshold = 2.5
-                
-                # Calculate z-score
-                if overall_std != 0:
-                    z_score = abs((user_mean - overall_mean) / overall_std)
-                else:
-                    z_score = 0
-                    
-                # Check if anomaly
-                if z_score > threshold:
-                    if user_id_str not in results["anomalies"]:
-                        results["anomalies"][user_id_str] = {}
-                        
-                    results["anomalies"][user_id_str][metric] = {
-                        "user_id": user_id_str,
-                        "metric": metric,
-                        "user_mean": user_mean,
-                        "overall_mean": overall_mean,
-                        "z_score": float(z_score),
-                        "direction": "above" if user_mean > overall_mean else "below",
-                        "sample_size": user_stats[user_id_str][metric]["count"]
-                    }
-                    
+        # Most common value of each categorical factor per user
+        dominant_values = {
+            category: engine.dominant_values("user_id", category)
+            for category in factor_categories
+            if is_categorical(df[category])
+        }
+        user_sizes = dict(zip(users.index, users.size))
+        
         # Identify root causes for user performance
         for user_id in unique_users:
             # Skip null values
@@ -1145,10 +916,9 @@ class DiagnosticWorker:
                 
             user_id_str = str(user_id)
             
-            # Filter data for this user
-            user_data = df[df["user_id"] == user_id]
+            user_size = user_sizes.get(user_id, 0)
             
-            if len(user_data) < 5:  # Require minimum sample size
+            if user_size < 5:  # Require minimum sample size
                 continue
                 
             # Get factors associated with this user
@@ -1157,17 +927,12 @@ class DiagnosticWorker:
             # If no factors found, try to identify from data
             if not user_factors:
                 # Analyze factor distribution for this user
-                for category in factor_categories:
-                    # Skip if not categorical
-                    if not pd.api.types.is_object_dtype(df[category]):
-                        continue
-                        
+                for category, dominant in dominant_values.items():
                     # Get most common value for this user
-                    value_counts = user_data[category].value_counts()
-                    if len(value_counts) == 0:
+                    if user_id not in dominant.index:
                         continue
                         
-                    most_common_value = value_counts.index[0]
+                    most_common_value = dominant.at[user_id, "value"]
                     
                     # Check if this factor is associated with strengths or weaknesses
                     if (user_id_str in results["strengths"] or user_id_str in results["weaknesses"]):
@@ -1179,7 +944,7 @@ class DiagnosticWorker:
                             "user_id": user_id_str,
                             "category": category,
                             "value": most_common_value,
-                            "frequency": float(value_counts[most_common_value] / len(user_data)),
+                            "frequency": float(dominant.at[user_id, "count"] / user_size),
                             "impact": "positive" if user_id_str in results["strengths"] else "negative",
                             "related_to": list(results["strengths"].get(user_id_str, {}).keys()) if user_id_str in results["strengths"] else list(results["weaknesses"].get(user_id_str, {}).keys())
                         }
@@ -0,0 +1,519 @@
+"""
+Vectorized diagnostic engine for the diagnostic module.
+
+This module computes the statistics behind DiagnosticWorker in single passes
+over the data: one groupby per entity key for group statistics, group
+deviations and anomaly scores evaluated as (group x metric) matrices, and
+feature importance as one correlation between a sparse one-hot encoding of a
+category and all target metrics. The worker formats the results; nothing
+here iterates over the distinct values of a column in Python.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ANOMALY_METHODS = ("zscore", "robust_z", "iqr")
+
+# Default anomaly thresholds per method (z-score, robust z-score, IQR multiples)
+DEFAULT_ANOMALY_THRESHOLDS = {"zscore": 2.0, "robust_z": 3.5, "iqr": 1.5}
+
+# Scales the median absolute deviation to the standard deviation of a normal
+# distribution
+MAD_SCALE = 1.4826
+
+
+def is_categorical(series: pd.Series) -> bool:
+    """
+    Check whether a column holds categorical (non-numeric) values.
+
+    Args:
+        series: Column to check
+
+    Returns:
+        bool: True for object and string columns
+    """
+    return pd.api.types.is_object_dtype(series) or isinstance(series.dtype, pd.StringDtype)
+
+
+class OneHotEncoding:
+    """
+    Sparse one-hot encoding of a categorical column.
+
+    Each row has at most one non-zero entry, so the encoding is stored as one
+    category code per row (-1 for missing values) instead of an n x k dense
+    matrix. Products with the transposed encoding reduce to bincounts.
+
+    Attributes:
+        codes (np.ndarray): Category code of each row (-1 if missing)
+        categories (pd.Index): Categories, in the order of pandas.get_dummies
+    """
+
+    def __init__(self, codes: np.ndarray, categories: pd.Index):
+        """
+        Initialize the encoding.
+
+        Args:
+            codes: Category code of each row (-1 if missing)
+            categories: Categories
+        """
+        self.codes = np.asarray(codes, dtype=np.int64)
+        self.categories = categories
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "OneHotEncoding":
+        """
+        Encode a column.
+
+        Args:
+            series: Column to encode
+
+        Returns:
+            OneHotEncoding: The encoding
+        """
+        categorical = pd.Categorical(series)
+        return cls(categorical.codes, categorical.categories)
+
+    @property
+    def shape(self) -> tuple:
+        """Shape of the encoded matrix (rows, categories)."""
+        return len(self.codes), len(self.categories)
+
+    def transpose_dot(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Multiply the transposed encoding by a matrix (X^T M).
+
+        Args:
+            matrix: Array of shape (rows, m)
+
+        Returns:
+            np.ndarray: Array of shape (categories, m) with the per-category
+            sums of each column of the matrix
+        """
+        rows, n_categories = self.shape
+        matrix = np.asarray(matrix, dtype=float).reshape(rows, -1)
+        width = matrix.shape[1]
+        present = self.codes >= 0
+        # One bincount over (column, category) cells
+        cells = (np.arange(width) * n_categories)[None, :] + self.codes[present][:, None]
+        sums = np.bincount(
+            cells.ravel(),
+            weights=matrix[present].ravel(),
+            minlength=width * n_categories
+        )
+        return sums.reshape(width, n_categories).T
+
+    def to_sparse(self) -> Any:
+        """
+        Convert the encoding to a SciPy CSR matrix.
+
+        Returns:
+            scipy.sparse.csr_matrix: Matrix of shape (rows, categories)
+        """
+        from scipy import sparse
+
+        rows = np.flatnonzero(self.codes >= 0)
+        data = np.ones(len(rows))
+        return sparse.csr_matrix((data, (rows, self.codes[rows])), shape=self.shape)
+
+
+def indicator_correlations(encoding: OneHotEncoding, metrics: pd.DataFrame) -> pd.DataFrame:
+    """
+    Correlate every one-hot indicator with every metric in one pass.
+
+    Correlations are Pearson correlations over the rows where the metric is
+    present, as pandas.Series.corr computes them for each indicator column.
+
+    Args:
+        encoding: One-hot encoding of a category
+        metrics: Metric columns, aligned with the encoded rows
+
+    Returns:
+        pd.DataFrame: Correlations (categories x metrics); NaN where an
+        indicator or a metric is constant
+    """
+    values = metrics.to_numpy(dtype=float, na_value=np.nan)
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(valid, values, 0.0).sum(axis=0) / counts
+        centered = np.where(valid, values - means, 0.0)
+
+        # Indicator sums over the valid rows of each metric, and the
+        # indicator-metric cross products, from one product each
+        sums = encoding.transpose_dot(valid)
+        products = encoding.transpose_dot(centered)
+
+        share = sums / counts
+        covariance = products - share * centered.sum(axis=0)
+        indicator_ss = sums * (1.0 - share)
+        metric_ss = (centered ** 2).sum(axis=0)
+        correlations = covariance / np.sqrt(indicator_ss * metric_ss)
+
+    correlations[~np.isfinite(correlations)] = np.nan
+    return pd.DataFrame(correlations, index=encoding.categories, columns=metrics.columns)
+
+
+class GroupSummary:
+    """
+    Statistics of the target metrics per distinct value of a key column.
+
+    Statistics are computed by one groupby aggregation each, on first use.
+
+    Attributes:
+        key (str): Grouping column
+        index (pd.Index): Distinct non-null key values, in order of appearance
+        size (np.ndarray): Number of rows per group
+    """
+
+    def __init__(self, df: pd.DataFrame, key: str, metrics: Sequence[str]):
+        """
+        Group the data.
+
+        Args:
+            df: Data
+            key: Grouping column
+            metrics: Metric columns
+        """
+        self.key = key
+        self._grouped = df.groupby(key, sort=False)[list(metrics)]
+        sizes = self._grouped.size()
+        self.index = sizes.index
+        self.size = sizes.to_numpy()
+        self._stats: Dict[str, pd.DataFrame] = {}
+
+    def stat(self, name: str) -> pd.DataFrame:
+        """
+        Get a statistic per group.
+
+        Args:
+            name: Aggregation name ("mean", "median", "std", "min", "max")
+
+        Returns:
+            pd.DataFrame: Statistic (groups x metrics)
+        """
+        if name not in self._stats:
+            self._stats[name] = self._grouped.agg(name).reindex(self.index)
+        return self._stats[name]
+
+    def positions(self, values: Optional[Sequence[Any]] = None) -> np.ndarray:
+        """
+        Get the positions of groups, optionally restricted to some key values.
+
+        Args:
+            values: Key values to keep (all groups if None)
+
+        Returns:
+            np.ndarray: Group positions
+        """
+        if values is None:
+            return np.arange(len(self.index))
+        return np.flatnonzero(self.index.isin(list(values)))
+
+
+class DiagnosticEngine:
+    """
+    Single-pass diagnostics of the target metrics of a dataset.
+
+    Attributes:
+        df (pd.DataFrame): Data
+        metrics (List[str]): Target metric columns
+        overall (pd.DataFrame): Overall statistics per metric (mean, std,
+            median, mad, q1, q3)
+    """
+
+    def __init__(self, df: pd.DataFrame, metrics: Sequence[str]):
+        """
+        Initialize the engine and compute the overall metric statistics.
+
+        Args:
+            df: Data
+            metrics: Target metric columns
+        """
+        self.df = df
+        self.metrics = [metric for metric in metrics if metric in df.columns]
+        self._summaries: Dict[str, GroupSummary] = {}
+
+        overall = {}
+        for metric in self.metrics:
+            column = df[metric]
+            median = column.median()
+            overall[metric] = {
+                "mean": column.mean(),
+                "std": column.std(),
+                "median": median,
+                "mad": (column - median).abs().median(),
+                "q1": column.quantile(0.25),
+                "q3": column.quantile(0.75),
+            }
+        self.overall = pd.DataFrame.from_dict(
+            overall,
+            orient="index",
+            columns=["mean", "std", "median", "mad", "q1", "q3"]
+        ).reindex(self.metrics)
+
+    def group_summary(self, key: str) -> GroupSummary:
+        """
+        Get (and cache) the group statistics for a key column.
+
+        Args:
+            key: Grouping column
+
+        Returns:
+            GroupSummary: Group statistics
+        """
+        if key not in self._summaries:
+            self._summaries[key] = GroupSummary(self.df, key, self.metrics)
+        return self._summaries[key]
+
+    def deviations(
+        self,
+        key: str,
+        values: Optional[Sequence[Any]] = None,
+        threshold: float = 10.0
+    ) -> pd.DataFrame:
+        """
+        Find groups whose mean deviates from the overall mean of a metric.
+
+        Args:
+            key: Grouping column
+            values: Key values to consider (all if None)
+            threshold: Minimum absolute percent difference
+
+        Returns:
+            pd.DataFrame: One row per (metric, group) at or beyond the
+            threshold, with columns value, metric, group_mean, overall_mean,
+            percent_diff and sample_size
+        """
+        summary = self.group_summary(key)
+        positions = summary.positions(values)
+        group_means = summary.stat("mean").to_numpy(dtype=float)[positions]
+        overall_means = self.overall["mean"].to_numpy(dtype=float)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            percent_diff = np.where(
+                overall_means != 0,
+                (group_means - overall_means) / overall_means * 100,
+                0.0
+            )
+        selected = (percent_diff >= threshold) | (percent_diff <= -threshold)
+        return self._long_form(summary, positions, selected, {
+            "group_mean": group_means,
+            "overall_mean": np.broadcast_to(overall_means, group_means.shape),
+            "percent_diff": percent_diff,
+        })
+
+    def anomalies(
+        self,
+        key: str,
+        values: Optional[Sequence[Any]] = None,
+        method: str = "zscore",
+        threshold: Optional[float] = None,
+        min_samples: int = 5
+    ) -> pd.DataFrame:
+        """
+        Score every group mean against the distribution of its metric.
+
+        Methods:
+            zscore: |group mean - mean| / std
+            robust_z: |group mean - median| / (1.4826 * MAD), which is not
+                inflated by the outliers it looks for
+            iqr: distance of the group mean outside [Q1, Q3], in IQRs
+                (Tukey's fences at the default threshold of 1.5)
+
+        A score is 0 when the metric's spread is 0.
+
+        Args:
+            key: Grouping column
+            values: Key values to consider (all if None)
+            method: Scoring method
+            threshold: Score above which a group is anomalous (method
+                default if None)
+            min_samples: Minimum number of rows in a group
+
+        Returns:
+            pd.DataFrame: One row per anomalous (metric, group), with columns
+            value, metric, group_mean, overall_mean, center, score and
+            sample_size
+
+        Raises:
+            ValueError: If the method is unknown
+        """
+        if method not in ANOMALY_METHODS:
+            raise ValueError(f"Unknown anomaly method: {method}")
+        if threshold is None:
+            threshold = DEFAULT_ANOMALY_THRESHOLDS[method]
+
+        summary = self.group_summary(key)
+        positions = summary.positions(values)
+        group_means = summary.stat("mean").to_numpy(dtype=float)[positions]
+        overall = {name: self.overall[name].to_numpy(dtype=float) for name in self.overall.columns}
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if method == "zscore":
+                center, spread = overall["mean"], overall["std"]
+                score = np.abs(group_means - center) / spread
+            elif method == "robust_z":
+                center, spread = overall["median"], MAD_SCALE * overall["mad"]
+                score = np.abs(group_means - center) / spread
+            else:
+                center, spread = overall["median"], overall["q3"] - overall["q1"]
+                outside = np.maximum(overall["q1"] - group_means, group_means - overall["q3"])
+                score = np.maximum(outside, 0.0) / spread
+            score = np.where(spread != 0, score, 0.0)
+
+        selected = (score > threshold) & (summary.size[positions] >= min_samples)[:, None]
+        return self._long_form(summary, positions, selected, {
+            "group_mean": group_means,
+            "overall_mean": np.broadcast_to(overall["mean"], group_means.shape),
+            "center": np.broadcast_to(center, group_means.shape),
+            "score": score,
+        })
+
+    def feature_importance(self, category: str) -> pd.DataFrame:
+        """
+        Correlate a category with every metric.
+
+        Categorical columns are one-hot encoded and each indicator is
+        correlated with each metric; numeric columns are correlated directly.
+
+        Args:
+            category: Category column
+
+        Returns:
+            pd.DataFrame: Correlations (categories x metrics) for categorical
+            columns, or a single row labelled with the column name
+        """
+        column = self.df[category]
+        if is_categorical(column):
+            encoding = OneHotEncoding.from_series(column)
+            return indicator_correlations(encoding, self.df[self.metrics])
+
+        correlations = [column.corr(self.df[metric]) for metric in self.metrics]
+        return pd.DataFrame([correlations], index=[category], columns=self.metrics)
+
+    def representation_shifts(
+        self,
+        key: str,
+        category: str,
+        groups: Optional[Sequence[Any]] = None,
+        min_samples: int = 5,
+        threshold: float = 20.0
+    ) -> pd.DataFrame:
+        """
+        Find category values over- or under-represented within groups.
+
+        Args:
+            key: Grouping column
+            category: Category column
+            groups: Key values to consider (all if None)
+            min_samples: Minimum number of rows in a group
+            threshold: Minimum absolute percent difference between the
+                value's share of the group and its overall share
+
+        Returns:
+            pd.DataFrame: Columns group, value, group_pct, overall_pct and
+            percent_diff
+        """
+        summary = self.group_summary(key)
+        eligible = summary.index[summary.size >= min_samples]
+        if groups is not None:
+            eligible = eligible[eligible.isin(list(groups))]
+
+        counts = self._pair_counts(key, category)
+        counts = counts[counts.index.get_level_values(0).isin(eligible)]
+        if counts.empty:
+            return pd.DataFrame(columns=["group", "value", "group_pct", "overall_pct", "percent_diff"])
+
+        group_pct = counts / counts.groupby(level=0, sort=False).transform("sum")
+        overall_pct = self.df[category].value_counts(normalize=True)
+        value_level = counts.index.get_level_values(1)
+        overall_values = overall_pct.reindex(value_level).to_numpy(dtype=float)
+        group_values = group_pct.to_numpy(dtype=float)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            percent_diff = np.where(
+                overall_values != 0,
+                (group_values - overall_values) / overall_values * 100,
+                0.0
+            )
+        selected = np.abs(percent_diff) >= threshold
+        return pd.DataFrame({
+            "group": counts.index.get_level_values(0)[selected],
+            "value": value_level[selected],
+            "group_pct": group_values[selected],
+            "overall_pct": overall_values[selected],
+            "percent_diff": percent_diff[selected],
+        })
+
+    def dominant_values(self, key: str, category: str) -> pd.DataFrame:
+        """
+        Get the most common category value in each group.
+
+        Ties go to the value that appears first in the group.
+
+        Args:
+            key: Grouping column
+            category: Category column
+
+        Returns:
+            pd.DataFrame: Columns value and count, indexed by group (groups
+            whose category values are all missing are omitted)
+        """
+        counts = self._pair_counts(key, category)
+        if counts.empty:
+            return pd.DataFrame(columns=["value", "count"])
+        groups = counts.index.get_level_values(0)
+        best = counts.groupby(groups, sort=False).idxmax()
+        return pd.DataFrame(
+            {"value": [pair[1] for pair in best], "count": counts.loc[best.to_list()].to_numpy()},
+            index=best.index
+        )
+
+    @staticmethod
+    def variance_explained(values: np.ndarray, labels: np.ndarray) -> float:
+        """
+        Ratio of between-label to total sum of squares (R-squared of a
+        one-way grouping).
+
+        Args:
+            values: Values
+            labels: Group label of each value
+
+        Returns:
+            float: Variance explained (0 if the values are constant)
+        """
+        values = np.asarray(values, dtype=float)
+        codes, _ = pd.factorize(labels)
+        overall_mean = values.mean()
+        counts = np.bincount(codes)
+        group_means = np.bincount(codes, weights=values) / counts
+        between_ss = ((group_means - overall_mean) ** 2 * counts).sum()
+        total_ss = ((values - overall_mean) ** 2).sum()
+        return float(between_ss / total_ss) if total_ss != 0 else 0.0
+
+    def _pair_counts(self, key: str, category: str) -> pd.Series:
+        """Count rows per (key value, category value), in order of appearance."""
+        return self.df.groupby([key, category], sort=False).size()
+
+    def _long_form(
+        self,
+        summary: GroupSummary,
+        positions: np.ndarray,
+        selected: np.ndarray,
+        columns: Dict[str, np.ndarray]
+    ) -> pd.DataFrame:
+        """Collect the selected (group, metric) cells, metric by metric."""
+        metric_idx, group_idx = np.nonzero(selected.T)
+        frame = {
+            "value": summary.index[positions[group_idx]],
+            "metric": np.asarray(self.metrics, dtype=object)[metric_idx],
+        }
+        for name, matrix in columns.items():
+            frame[name] = np.asarray(matrix)[group_idx, metric_idx]
+        frame["sample_size"] = summary.size[positions[group_idx]]
+        return pd.DataFrame(frame)
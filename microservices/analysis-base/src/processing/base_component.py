@@ -6,7 +6,7 @@ for all processing components in the analysis system.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import structlog
 import time
 
@@ -18,8 +18,16 @@ class BaseComponent(ABC):
     Components are the building blocks of processing pipelines, each responsible
     for a specific analysis task. Subclasses must implement the process and
     validate_config methods.
+    
+    Subclasses may declare the context paths they read and write (inputs,
+    outputs) so pipelines can run independent components concurrently, and
+    mark themselves cpu_bound to run in an executor.
     """
     
+    inputs: Optional[Tuple[str, ...]] = None
+    outputs: Optional[Tuple[str, ...]] = None
+    cpu_bound: bool = False
+    
     def __init__(self, name: str, config: Dict[str, Any]):
         """
         Initialize the component.
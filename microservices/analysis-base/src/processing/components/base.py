@@ -5,7 +5,7 @@ This module contains the BaseComponent class which serves as the foundation
 for all processing components in the analysis-base microservice.
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, List, Type
+from typing import Any, Dict, Optional, List, Tuple, Type
 import logging
 import uuid
 
@@ -21,8 +21,17 @@ class BaseComponent(ABC):
         component_id (str): Unique identifier for the component
         logger (logging.Logger): Logger for the component
         configuration (Dict[str, Any]): Component configuration
+        inputs (Optional[Tuple[str, ...]]): Context paths the component reads
+        outputs (Optional[Tuple[str, ...]]): Context paths the component writes
+        cpu_bound (bool): Whether pipelines should run the component in an executor
     """
     
+    # Data dependencies used by pipelines to run independent components
+    # concurrently; None means undeclared (the component runs alone, in order)
+    inputs: Optional[Tuple[str, ...]] = None
+    outputs: Optional[Tuple[str, ...]] = None
+    cpu_bound: bool = False
+    
     def __init__(
         self, 
         component_id: Optional[str] = None, 
@@ -7,10 +7,11 @@ on numerical data in the context.
 
 import time
 import numpy as np
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import structlog
 
 from src.processing.base_component import BaseComponent
+from src.processing.statistics_engine import StreamingMoments, describe, outlier_mask
 from src.common.exceptions import ProcessingError, ValidationError
 
 
@@ -22,6 +23,14 @@ class StatisticalAnalysisComponent(BaseComponent):
     min, max, quartiles) for numerical fields in the data.
     """
     
+    inputs = ("data",)
+    cpu_bound = True
+    
+    @property
+    def outputs(self) -> Tuple[str, ...]:
+        """Context path written: merge_results stores results under _results.<name>."""
+        return (f"_results.{self.name}",)
+    
     def validate_config(self) -> None:
         """
         Validate the component configuration.
@@ -33,6 +42,8 @@ class StatisticalAnalysisComponent(BaseComponent):
         - detect_outliers: Optional boolean to detect outliers (default: False)
         - outlier_method: Optional string indicating the outlier detection method ('iqr', 'z_score', 'percentile')
         - outlier_threshold: Optional threshold value for the outlier detection method
+        - include_partials: Optional boolean to include mergeable moment aggregates per field
+          (default: False), see statistics_engine.merge_partials
         
         Raises:
             ValueError: If configuration is invalid
@@ -52,6 +63,9 @@ class StatisticalAnalysisComponent(BaseComponent):
         if "detect_outliers" in self.config and not isinstance(self.config["detect_outliers"], bool):
             raise ValueError("detect_outliers must be a boolean")
             
+        if "include_partials" in self.config and not isinstance(self.config["include_partials"], bool):
+            raise ValueError("include_partials must be a boolean")
+            
         if "outlier_method" in self.config:
             valid_methods = ["iqr", "z_score", "percentile"]
             if self.config["outlier_method"] not in valid_methods:
@@ -115,6 +129,10 @@ class StatisticalAnalysisComponent(BaseComponent):
                 # Detect outliers if configured
                 if self.config.get("detect_outliers", False):
                     field_stats[field_name]["outliers"] = self._detect_outliers(values)
+                
+                # Partial aggregates let batch results be merged across workers
+                if self.config.get("include_partials", False):
+                    field_stats[field_name]["partial"] = StreamingMoments().update(values).to_dict()
             
             # Prepare results
             results = {
@@ -280,28 +298,11 @@ class StatisticalAnalysisComponent(BaseComponent):
         Returns:
             Dict[str, Any]: Dictionary of statistics
         """
-        # Convert to numpy array
-        values_array = np.array(values)
-        
-        # Calculate basic statistics
-        stats = {
-            "count": len(values),
-            "mean": float(np.mean(values_array)),
-            "median": float(np.median(values_array)),
-            "std": float(np.std(values_array)),
-            "min": float(np.min(values_array)),
-            "max": float(np.max(values_array)),
-            "sum": float(np.sum(values_array))
-        }
-        
-        # Calculate percentiles if configured
+        percentiles = None
         if self.config.get("include_percentiles", True):
             percentiles = self.config.get("percentiles", [25, 50, 75, 90, 95, 99])
-            stats["percentiles"] = {
-                str(p): float(np.percentile(values_array, p)) for p in percentiles
-            }
         
-        return stats
+        return describe(values, percentiles)
     
     def _detect_outliers(self, values: List[float]) -> List[float]:
         """
@@ -314,42 +315,19 @@ class StatisticalAnalysisComponent(BaseComponent):
             List[float]: List of outlier values
         """
         method = self.config.get("outlier_method", "iqr")
-        values_array = np.array(values)
+        if method not in ("iqr", "z_score", "percentile"):
+            return []
         
-        if method == "iqr":
-            # Use IQR method
-            q1 = np.percentile(values_array, 25)
-            q3 = np.percentile(values_array, 75)
-            iqr = q3 - q1
-            threshold = self.config.get("outlier_threshold", 1.5)
-            
-            lower_bound = q1 - (threshold * iqr)
-            upper_bound = q3 + (threshold * iqr)
-            
-            outliers = [v for v in values if v < lower_bound or v > upper_bound]
-            
-        elif method == "z_score":
-            # Use Z-score method
-            mean = np.mean(values_array)
-            std = np.std(values_array)
-            threshold = self.config.get("outlier_threshold", 3.0)
-            
-            outliers = [v for v in values if abs((v - mean) / std) > threshold]
-            
-        elif method == "percentile":
-            # Use percentile method
-            lower_percentile = self.config.get("lower_percentile", 1)
-            upper_percentile = self.config.get("upper_percentile", 99)
-            
-            lower_bound = np.percentile(values_array, lower_percentile)
-            upper_bound = np.percentile(values_array, upper_percentile)
-            
-            outliers = [v for v in values if v < lower_bound or v > upper_bound]
-            
-        else:
-            outliers = []
-            
-        return outliers
+        values_array = np.asarray(values, dtype=float)
+        mask = outlier_mask(
+            values_array,
+            method=method,
+            threshold=self.config.get("outlier_threshold"),
+            lower_percentile=self.config.get("lower_percentile", 1),
+            upper_percentile=self.config.get("upper_percentile", 99)
+        )
+        
+        return values_array[mask].tolist()
     
     def _extract_statistical_tags(self, field_stats: Dict[str, Dict[str, Any]]) -> List[str]:
         """
@@ -8,11 +8,11 @@ from the repository based on various criteria.
 import asyncio
 import structlog
 from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
-import uuid
+from datetime import datetime
 
 from ..repository.repository import Repository
 from ..config.settings import Settings
+from .context_prefetcher import ContextPrefetcher, WakeFunction
 
 # Configure structured logging
 logger = structlog.get_logger(__name__)
@@ -25,15 +25,24 @@ class ContextPoller:
     - Manages fetching of pending contexts for processing
     - Provides both single and batch context polling
     - Applies business rules for context selection and prioritization
+    - Optionally prefetches contexts in the background (see start())
+    
+    Contexts are claimed through the repository's leases (see
+    ContextLeases), in the repository's claim order. Leases on prefetched
+    contexts are renewed while they wait in the buffer and released when
+    prefetching stops.
     """
     
-    def __init__(self, repository: Repository, settings: Settings):
+    def __init__(self, repository: Repository, settings: Settings, wake: Optional[WakeFunction] = None):
         """
         Initialize the context poller.
         
         Args:
             repository: Data repository
             settings: Application configuration settings
+            wake: Optional coroutine function that returns when new contexts
+                may be available (e.g. the next change stream event), used
+                while prefetching
         """
         self.repository = repository
         self.settings = settings
@@ -44,12 +53,28 @@ class ContextPoller:
         self.retry_delay = settings.retry_delay
         self.poll_interval = settings.poll_interval
         
+        # Buffered contexts are leased too; renew well before leases expire
+        lease_seconds = getattr(settings, "lease_seconds", getattr(settings, "lock_expiry_seconds", 300))
+        self.lease_renew_interval = getattr(settings, "lease_renew_interval", lease_seconds / 3)
+        self._renew_task: Optional[asyncio.Task] = None
+        
         # Controls for batch polling with wait time
         self.batch_accumulating = False
         self.batch_start_time = None
         self.batch_contexts = []
         self.batch_template_id = None
         
+        # Background prefetching, enabled by start(); the configured poll
+        # interval caps the backoff on empty polls
+        self.prefetcher = ContextPrefetcher(
+            self._fetch_contexts,
+            capacity=getattr(settings, "prefetch_capacity", 50),
+            min_interval=min(getattr(settings, "min_poll_interval", 0.1), self.poll_interval),
+            max_interval=self.poll_interval,
+            jitter=getattr(settings, "poll_jitter", 0.2),
+            wake=wake
+        )
+        
         logger.info(
             "Context poller initialized",
             service_type=self.service_type,
@@ -57,53 +82,121 @@ class ContextPoller:
             retry_delay=self.retry_delay
         )
     
-    async def get_next_context(self) -> Optional[Dict[str, Any]]:
+    async def start(self):
         """
-        Get the next pending context for processing.
+        Start prefetching contexts in the background.
+        
+        While prefetching, get_next_context and get_batch_contexts take
+        contexts from the prefetch buffer instead of polling the repository.
+        """
+        await self.prefetcher.start()
+        if self._renew_task is None:
+            self._renew_task = asyncio.create_task(self._renew_buffered_leases())
+    
+    async def stop(self) -> List[Dict[str, Any]]:
+        """
+        Stop prefetching.
         
         Returns:
-            A context document or None if no pending contexts are available
+            Claimed contexts that no worker took from the buffer; their
+            leases are released, so they are pending again
+        """
+        if self._renew_task is not None:
+            self._renew_task.cancel()
+            await asyncio.gather(self._renew_task, return_exceptions=True)
+            self._renew_task = None
+        
+        leftover = await self.prefetcher.stop()
+        if leftover:
+            released = await self.repository.release_leases([context["_id"] for context in leftover])
+            logger.info("Released unconsumed contexts", count=len(leftover), released=released)
+        return leftover
+    
+    def notify(self):
+        """Signal that new contexts may be available, e.g. from a notification callback."""
+        self.prefetcher.notify()
+    
+    def get_metrics(self) -> Dict[str, Any]:
         """
-        # Build filter for pending contexts matching service type
-        query_filter = {
-            "status": "pending",
+        Get prefetch queue depth and poll efficiency metrics.
+        
+        Returns:
+            Metrics dictionary (see ContextPrefetcher.metrics)
+        """
+        return self.prefetcher.metrics()
+    
+    def _claim_criteria(self, **criteria: Any) -> Dict[str, Any]:
+        """
+        Build the conditions for contexts this service claims.
+        
+        Retry delays are enforced by the claim itself (see
+        claimable_query); contexts that used up their retries are skipped.
+        
+        Args:
+            **criteria: Additional field conditions, e.g. template_id
+            
+        Returns:
+            MongoDB query conditions
+        """
+        claim_criteria = {
             "service_type": self.service_type,
             "$or": [
-                {"attempts": {"$lt": self.max_attempts}},
-                {"attempts": {"$exists": False}}
+                {"retry_metadata.retry_count": {"$lt": self.max_attempts}},
+                {"retry_metadata.retry_count": {"$exists": False}}
             ]
         }
         
-        # Add retry delay check if needed
-        if self.retry_delay > 0:
-            retry_threshold = datetime.utcnow() - timedelta(seconds=self.retry_delay)
-            query_filter["$or"] = [
-                {"last_attempt": {"$lt": retry_threshold.isoformat()}},
-                {"last_attempt": {"$exists": False}}
-            ]
+        claim_criteria.update(criteria)
+        return claim_criteria
+    
+    async def _fetch_contexts(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Claim up to limit pending contexts for the prefetch buffer.
         
-        # Sort by priority and created time
-        sort_criteria = [
-            ("priority", -1),  # Higher priority first
-            ("created_at", 1)   # Older contexts first
-        ]
-        
-        # Fetch one context
-        context = await self.repository.find_one_and_update_context(
-            query_filter=query_filter,
-            update={
-                "$inc": {"attempts": 1},
-                "$set": {"last_attempt": datetime.utcnow().isoformat()}
-            },
-            sort=sort_criteria
-        )
+        Args:
+            limit: Maximum number of contexts
+            
+        Returns:
+            Claimed contexts
+        """
+        contexts = await self.repository.get_pending_contexts_batch(limit, criteria=self._claim_criteria())
+        return contexts or []
+    
+    async def _renew_buffered_leases(self):
+        """Keep the leases on buffered contexts alive until workers take them."""
+        while True:
+            await asyncio.sleep(self.lease_renew_interval)
+            buffered = self.prefetcher.buffered_ids()
+            if not buffered:
+                continue
+            try:
+                await self.repository.renew_leases(buffered)
+            except Exception as e:
+                logger.error("Failed to renew leases on buffered contexts", error=str(e))
+    
+    async def get_next_context(self, timeout: float = 0) -> Optional[Dict[str, Any]]:
+        """
+        Get the next pending context for processing.
+        
+        Args:
+            timeout: Seconds to wait for a prefetched context (only used
+                while prefetching)
+        
+        Returns:
+            A context document or None if no pending contexts are available
+        """
+        if self.prefetcher.running:
+            return await self.prefetcher.get(timeout=timeout)
+        
+        # Claim one context
+        context = await self.repository.get_next_pending_context(criteria=self._claim_criteria())
         
         if context:
             logger.debug(
                 "Retrieved context for processing",
                 context_id=str(context.get("_id")),
                 template_id=context.get("template_id"),
-                attempt=context.get("attempts", 1)
+                retry_count=context.get("retry_metadata", {}).get("retry_count", 0)
             )
         
         return context
@@ -120,6 +213,9 @@ class ContextPoller:
         to enable more efficient batch processing. It may wait up to the specified
         wait_time to collect a full batch.
         
+        While prefetching, the batch is gathered from the prefetch buffer,
+        waiting up to wait_time for it to fill.
+        
         Args:
             batch_size: Maximum number of contexts to include in the batch
             wait_time: Maximum time to wait in seconds to gather a full batch
@@ -127,6 +223,13 @@ class ContextPoller:
         Returns:
             A list of context documents for batch processing
         """
+        if self.prefetcher.running:
+            return await self.prefetcher.get_batch(
+                batch_size,
+                wait_time,
+                key=lambda context: context.get("template_id")
+            )
+        
         # If we're already accumulating a batch, check if we should return it
         if self.batch_accumulating:
             current_size = len(self.batch_contexts)
@@ -178,44 +281,14 @@ class ContextPoller:
         # Stop if batch is already full
         if len(self.batch_contexts) >= batch_size:
             return
-            
-        # Build filter for pending contexts with matching template_id
-        query_filter = {
-            "status": "pending",
-            "service_type": self.service_type,
-            "template_id": self.batch_template_id,
-            "$or": [
-                {"attempts": {"$lt": self.max_attempts}},
-                {"attempts": {"$exists": False}}
-            ]
-        }
-        
-        # Add retry delay check if needed
-        if self.retry_delay > 0:
-            retry_threshold = datetime.utcnow() - timedelta(seconds=self.retry_delay)
-            query_filter["$or"] = [
-                {"last_attempt": {"$lt": retry_threshold.isoformat()}},
-                {"last_attempt": {"$exists": False}}
-            ]
         
         # Limit to the number of additional contexts needed
         limit = batch_size - len(self.batch_contexts)
         
-        # Sort by priority and created time
-        sort_criteria = [
-            ("priority", -1),  # Higher priority first
-            ("created_at", 1)   # Older contexts first
-        ]
-        
-        # Find the additional contexts
-        contexts = await self.repository.find_and_update_contexts(
-            query_filter=query_filter,
-            update={
-                "$inc": {"attempts": 1},
-                "$set": {"last_attempt": datetime.utcnow().isoformat()}
-            },
-            sort=sort_criteria,
-            limit=limit
+        # Claim the additional contexts with matching template_id
+        contexts = await self.repository.get_pending_contexts_batch(
+            limit,
+            criteria=self._claim_criteria(template_id=self.batch_template_id)
         )
         
         if contexts:
@@ -0,0 +1,329 @@
+"""
+Context Prefetcher Module
+
+This module keeps a bounded buffer of claimed contexts filled in the
+background, so workers take contexts from memory instead of waiting on a
+poll round trip. Empty polls back off exponentially with jitter, and an
+optional wake-up hook (e.g. a change stream or a notification channel)
+cuts the backoff short when new contexts arrive.
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+import structlog
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+# Claims up to the given number of contexts
+FetchFunction = Callable[[int], Awaitable[List[Dict[str, Any]]]]
+
+# Completes when new contexts may be available
+WakeFunction = Callable[[], Awaitable[Any]]
+
+
+class ContextPrefetcher:
+    """
+    Background prefetching of contexts into a bounded buffer.
+
+    The fetch loop refills the buffer whenever its depth drops to the low
+    watermark, asking only for the free capacity. A poll that fills the
+    request is followed immediately by the next one; an empty poll doubles
+    the wait (up to max_interval) and a non-empty one resets it.
+
+    Contexts in the buffer have already been claimed. Contexts left in it
+    when the prefetcher stops are returned by stop().
+
+    Attributes:
+        capacity (int): Maximum number of buffered contexts
+        low_watermark (int): Depth at or below which the buffer is refilled
+        min_interval (float): Wait after a partial poll, in seconds
+        max_interval (float): Longest wait after empty polls, in seconds
+        backoff_factor (float): Growth of the wait per empty poll
+        jitter (float): Relative random spread applied to every wait
+    """
+
+    def __init__(
+        self,
+        fetch: FetchFunction,
+        capacity: int = 50,
+        low_watermark: Optional[int] = None,
+        min_interval: float = 0.1,
+        max_interval: float = 5.0,
+        backoff_factor: float = 2.0,
+        jitter: float = 0.2,
+        wake: Optional[WakeFunction] = None,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            fetch: Coroutine function claiming up to N contexts
+            capacity: Maximum number of buffered contexts
+            low_watermark: Refill threshold, defaults to half the capacity
+            min_interval: Wait after a partial poll, in seconds
+            max_interval: Longest wait after empty polls, in seconds
+            backoff_factor: Growth of the wait per empty poll
+            jitter: Relative random spread of the waits (0.2 = +/-20%)
+            wake: Optional coroutine function that returns when new
+                contexts may be available; polling continues as a fallback
+            rng: Random generator for the jitter
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.fetch = fetch
+        self.capacity = capacity
+        self.low_watermark = capacity // 2 if low_watermark is None else min(low_watermark, capacity - 1)
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.wake = wake
+        self.rng = rng or random.Random()
+
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._arrived = asyncio.Condition()
+        self._space = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._interval = min_interval
+        self._tasks: List[asyncio.Task] = []
+        self.running = False
+
+        self._metrics = {
+            "polls": 0,
+            "empty_polls": 0,
+            "contexts_fetched": 0,
+            "contexts_requested": 0,
+            "wakeups": 0,
+            "poll_errors": 0,
+            "consumer_wait_seconds": 0.0,
+        }
+
+    @property
+    def depth(self) -> int:
+        """Number of buffered contexts."""
+        return len(self._buffer)
+
+    def buffered_ids(self) -> List[Any]:
+        """IDs of the buffered contexts, e.g. to renew their leases."""
+        return [context.get("_id") for context in self._buffer]
+
+    async def start(self):
+        """Start the fetch loop and, if configured, the wake-up watcher."""
+        if self.running:
+            return
+
+        self.running = True
+        self._tasks = [asyncio.create_task(self._fetch_loop())]
+        if self.wake:
+            self._tasks.append(asyncio.create_task(self._watch()))
+
+        logger.info(
+            "Context prefetcher started",
+            capacity=self.capacity,
+            low_watermark=self.low_watermark,
+            wake_hook=self.wake is not None
+        )
+
+    async def stop(self) -> List[Dict[str, Any]]:
+        """
+        Stop prefetching.
+
+        Returns:
+            Claimed contexts that were never taken from the buffer
+        """
+        self.running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        leftover = list(self._buffer)
+        self._buffer.clear()
+
+        logger.info("Context prefetcher stopped", unconsumed=len(leftover))
+        return leftover
+
+    def notify(self):
+        """Wake the fetch loop, e.g. from a notification callback."""
+        self._metrics["wakeups"] += 1
+        self._interval = self.min_interval
+        self._wakeup.set()
+
+    async def get(self, timeout: Optional[float] = 0) -> Optional[Dict[str, Any]]:
+        """
+        Take the next context from the buffer.
+
+        Args:
+            timeout: Seconds to wait for a context; 0 returns immediately
+                and None waits indefinitely
+
+        Returns:
+            A context, or None if none arrived in time
+        """
+        contexts = await self._take(1, timeout)
+        return contexts[0] if contexts else None
+
+    async def get_batch(
+        self,
+        batch_size: int,
+        wait_time: float,
+        key: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Take a batch of contexts, waiting up to wait_time to fill it.
+
+        With a key function, the batch only holds contexts with the same key
+        as its first context; other contexts stay buffered in order.
+
+        Args:
+            batch_size: Maximum number of contexts
+            wait_time: Maximum seconds to wait for a full batch
+            key: Optional grouping key, e.g. the template ID
+
+        Returns:
+            Contexts in buffer order, may be empty
+        """
+        deadline = time.monotonic() + wait_time
+        batch = await self._take(1, wait_time)
+        if not batch:
+            return batch
+
+        group = key(batch[0]) if key else None
+        match = (lambda context: key(context) == group) if key else None
+
+        while len(batch) < batch_size:
+            remaining = deadline - time.monotonic()
+            more = await self._take(batch_size - len(batch), max(remaining, 0), match)
+            if not more:
+                break
+            batch.extend(more)
+
+        return batch
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get buffer and poll metrics.
+
+        Returns:
+            Queue depth and capacity, poll counters, the share of polls that
+            returned contexts (hit_rate), the share of requested contexts
+            that polls returned (fill_rate) and the current poll interval
+        """
+        polls = self._metrics["polls"]
+        requested = self._metrics["contexts_requested"]
+        return {
+            **self._metrics,
+            "queue_depth": self.depth,
+            "capacity": self.capacity,
+            "hit_rate": (polls - self._metrics["empty_polls"]) / polls if polls else 0.0,
+            "fill_rate": self._metrics["contexts_fetched"] / requested if requested else 0.0,
+            "contexts_per_poll": self._metrics["contexts_fetched"] / polls if polls else 0.0,
+            "poll_interval": self._interval,
+            "running": self.running,
+        }
+
+    async def _take(
+        self,
+        limit: int,
+        timeout: Optional[float],
+        match: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> List[Dict[str, Any]]:
+        started = time.monotonic()
+        async with self._arrived:
+            if timeout != 0 and not self._has_match(match):
+                try:
+                    await asyncio.wait_for(self._arrived.wait_for(lambda: self._has_match(match)), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            taken = self._pop(limit, match)
+        self._metrics["consumer_wait_seconds"] += time.monotonic() - started
+
+        if len(self._buffer) <= self.low_watermark:
+            self._space.set()
+        return taken
+
+    def _has_match(self, match) -> bool:
+        if match is None:
+            return bool(self._buffer)
+        return any(match(context) for context in self._buffer)
+
+    def _pop(self, limit: int, match) -> List[Dict[str, Any]]:
+        if match is None:
+            return [self._buffer.popleft() for _ in range(min(limit, len(self._buffer)))]
+
+        taken, kept = [], deque()
+        while self._buffer:
+            context = self._buffer.popleft()
+            if len(taken) < limit and match(context):
+                taken.append(context)
+            else:
+                kept.append(context)
+        self._buffer = kept
+        return taken
+
+    async def _fetch_loop(self):
+        while self.running:
+            # Wait for consumers to drain the buffer to the low watermark
+            if len(self._buffer) > self.low_watermark:
+                self._space.clear()
+                await self._space.wait()
+                continue
+
+            requested = self.capacity - len(self._buffer)
+            try:
+                contexts = await self.fetch(requested)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._metrics["poll_errors"] += 1
+                logger.error("Prefetch poll failed", error=str(e))
+                contexts = None
+
+            self._metrics["polls"] += 1
+            self._metrics["contexts_requested"] += requested
+            if contexts:
+                self._metrics["contexts_fetched"] += len(contexts)
+                async with self._arrived:
+                    self._buffer.extend(contexts)
+                    self._arrived.notify_all()
+                self._interval = self.min_interval
+                if len(contexts) >= requested:
+                    # A full poll suggests more are pending
+                    continue
+            else:
+                if contexts is not None:
+                    self._metrics["empty_polls"] += 1
+                self._interval = min(self._interval * self.backoff_factor, self.max_interval)
+
+            await self._sleep(self._interval)
+
+    def _jittered(self, interval: float) -> float:
+        """Spread an interval randomly so workers do not poll in lockstep."""
+        return interval * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+    async def _sleep(self, interval: float):
+        """Wait for the jittered interval or until woken up."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self._jittered(interval))
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _watch(self):
+        """Forward wake-ups from the hook until it fails, then rely on polling."""
+        while self.running:
+            try:
+                await self.wake()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Wake-up hook failed, falling back to polling", error=str(e))
+                return
+            self.notify()
@@ -3,13 +3,19 @@ Pipeline module for the analysis-base microservice.
 
 This module provides classes for creating and executing pipelines of
 processing components. Pipelines define a sequence of processing steps
-to be applied to data.
+to be applied to data; components that declare their inputs and outputs
+are scheduled by data dependency, and independent ones run concurrently.
 """
+import asyncio
+import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from src.processing.components.base import BaseComponent
 from src.processing.component_registry import get_registry
+from src.processing.pipeline_graph import PipelineGraph
+from src.processing.spec_interpreter import get_interpreter
 
 
 class Pipeline:
@@ -20,11 +26,19 @@ class Pipeline:
     to data. Each step is a component that processes the data and
     produces output for the next component in the pipeline.
     
+    Components may declare the context paths they read and write
+    (``inputs`` and ``outputs``) and whether they are CPU bound
+    (``cpu_bound``). The pipeline compiles the components into a dependency
+    graph once; stages without conflicting paths run concurrently, each on
+    its own copy of the context, and their declared outputs are merged back
+    in pipeline order. Undeclared components run alone, in order.
+    
     Attributes:
         pipeline_id (str): Unique identifier for the pipeline
         name (str): Human-readable name for the pipeline
         description (str): Description of the pipeline's purpose
         components (List[BaseComponent]): List of component instances in the pipeline
+        executor (Optional[Executor]): Executor for CPU-bound components
         logger (logging.Logger): Logger for the pipeline
     """
     
@@ -33,7 +47,8 @@ class Pipeline:
         pipeline_id: str,
         name: str,
         description: str = "",
-        components: Optional[List[BaseComponent]] = None
+        components: Optional[List[BaseComponent]] = None,
+        executor: Optional[Executor] = None
     ):
         """
         Initialize a pipeline.
@@ -43,12 +58,19 @@ class Pipeline:
             name: Human-readable name for the pipeline
             description: Description of the pipeline's purpose
             components: List of component instances in the pipeline
+            executor: Executor for CPU-bound components (the event loop's
+                default thread pool if not provided)
         """
         self.pipeline_id = pipeline_id
         self.name = name
         self.description = description
         self.components = components or []
+        self.executor = executor
         self.logger = logging.getLogger(f"pipeline.{pipeline_id}")
+        
+        self._graph: Optional[PipelineGraph] = None
+        # Cumulative timings by component: runs, total and max duration
+        self._timings: Dict[str, Dict[str, float]] = {}
     
     def add_component(self, component: BaseComponent) -> None:
         """
@@ -58,8 +80,20 @@ class Pipeline:
             component: Component to add
         """
         self.components.append(component)
+        self._graph = None
         self.logger.debug(f"Added component {component.__class__.__name__} to pipeline")
     
+    @property
+    def graph(self) -> PipelineGraph:
+        """The compiled dependency graph (rebuilt after components change)."""
+        if self._graph is None or len(self._graph.stages) != len(self.components):
+            self._graph = PipelineGraph(self.components)
+            self.logger.debug(
+                f"Compiled {len(self.components)} components into {len(self._graph.levels)} levels "
+                f"(parallelism {self._graph.parallelism})"
+            )
+        return self._graph
+    
     async def process(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process data through the pipeline.
@@ -80,39 +114,95 @@ class Pipeline:
         processed_context["_metadata"]["pipeline"]["id"] = self.pipeline_id
         processed_context["_metadata"]["pipeline"]["name"] = self.name
         
-        # Process through each component
-        for i, component in enumerate(self.components):
-            try:
+        # Process level by level; stages within a level are independent
+        for level in self.graph.levels:
+            for stage in level:
                 # Log start of component processing
                 self.logger.debug(
-                    f"Processing component {i+1}/{len(self.components)}: "
-                    f"{component.__class__.__name__}"
+                    f"Processing component {stage.index + 1}/{len(self.components)}: "
+                    f"{stage.component.__class__.__name__}"
                 )
-                
-                # Process context through component
-                processed_context = await component.process(processed_context)
-                
-                # Validate that component returned a context
-                if processed_context is None:
-                    raise ValueError(
-                        f"Component {component.__class__.__name__} returned None"
-                    )
-                
+            
+            if len(level) == 1:
+                stage = level[0]
+                processed_context, duration_ms = await self._run_stage(stage, processed_context)
+                finished = [(stage, duration_ms)]
+            else:
+                outcomes = await asyncio.gather(
+                    *(self._run_stage(stage, PipelineGraph.isolate(processed_context, stage)) for stage in level),
+                    return_exceptions=True
+                )
+                for outcome in outcomes:
+                    if isinstance(outcome, BaseException):
+                        raise outcome
+                finished = []
+                for stage, (result, duration_ms) in zip(level, outcomes):
+                    PipelineGraph.merge_outputs(processed_context, stage, result)
+                    finished.append((stage, duration_ms))
+            
+            for stage, duration_ms in finished:
                 # Add component processing metadata
-                processed_context.setdefault("_metadata", {}).setdefault("components", []).append({
-                    "component_id": getattr(component, "component_id", str(i)),
-                    "component_type": component.__class__.__name__,
-                    "order": i
+                metadata = processed_context.setdefault("_metadata", {})
+                metadata.setdefault("components", []).append({
+                    "component_id": getattr(stage.component, "component_id", str(stage.index)),
+                    "component_type": stage.component.__class__.__name__,
+                    "order": stage.index
                 })
-                
-            except Exception as e:
-                # Log error and reraise
-                self.logger.error(
-                    f"Error in component {component.__class__.__name__}: {str(e)}"
-                )
-                raise
+                metadata.setdefault("stage_timings", {})[stage.name] = round(duration_ms, 3)
+                self._record_timing(stage.name, duration_ms)
         
         return processed_context
+    
+    async def execute(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process data through the pipeline (alias of process).
+        
+        Args:
+            context: Context to process
+            
+        Returns:
+            Dict[str, Any]: Processed context
+        """
+        return await self.process(context)
+    
+    async def _run_stage(self, stage: Any, context: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+        """
+        Run one stage, logging failures.
+        
+        Args:
+            stage: Stage to run
+            context: Context for the stage
+            
+        Returns:
+            Tuple[Dict[str, Any], float]: Processed context and duration in ms
+        """
+        try:
+            return await self.graph.run_stage(stage, context, self.executor)
+        except Exception as e:
+            # Log error and reraise
+            self.logger.error(
+                f"Error in component {stage.component.__class__.__name__}: {str(e)}"
+            )
+            raise
+    
+    def _record_timing(self, name: str, duration_ms: float) -> None:
+        timing = self._timings.setdefault(name, {"runs": 0, "total_ms": 0.0, "max_ms": 0.0})
+        timing["runs"] += 1
+        timing["total_ms"] += duration_ms
+        timing["max_ms"] = max(timing["max_ms"], duration_ms)
+    
+    def get_component_timings(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get cumulative per-component timings across runs of this pipeline.
+        
+        Returns:
+            Dict[str, Dict[str, float]]: Runs, total, mean and max duration
+            (ms) by component
+        """
+        return {
+            name: {**timing, "mean_ms": timing["total_ms"] / timing["runs"]}
+            for name, timing in self._timings.items()
+        }
 
 
 class PipelineFactory:
@@ -120,13 +210,69 @@ class PipelineFactory:
     Factory for creating pipelines from specifications.
     
     This class provides methods to create pipelines based on
-    configuration or specifications.
+    configuration or specifications. Pipelines obtained through
+    get_pipeline and get_pipeline_by_id are compiled once and reused.
     """
     
     def __init__(self):
         """Initialize the pipeline factory."""
         self.logger = logging.getLogger("pipeline_factory")
         self.registry = get_registry()
+        
+        # Compiled pipelines by analysis type and configuration, or by id
+        self._pipelines: Dict[Tuple[str, str], Pipeline] = {}
+    
+    def get_pipeline(
+        self,
+        analysis_type: str,
+        configuration: Optional[Dict[str, Any]] = None
+    ) -> Pipeline:
+        """
+        Get the pipeline for an analysis type, creating it on first use.
+        
+        Args:
+            analysis_type: Type of analysis (e.g., "descriptive", "diagnostic")
+            configuration: Configuration for the pipeline
+            
+        Returns:
+            Pipeline: The cached pipeline
+            
+        Raises:
+            ValueError: If the analysis type is not supported
+        """
+        key = (analysis_type, json.dumps(configuration or {}, sort_keys=True, default=str))
+        pipeline = self._pipelines.get(key)
+        if pipeline is None:
+            pipeline = self.create_pipeline_for_analysis_type(analysis_type, configuration)
+            self._pipelines[key] = pipeline
+        return pipeline
+    
+    def get_pipeline_by_id(self, pipeline_id: str) -> Pipeline:
+        """
+        Get a pipeline defined by a pipeline specification, creating it on
+        first use.
+        
+        Args:
+            pipeline_id: Name of the pipeline specification
+            
+        Returns:
+            Pipeline: The cached pipeline
+            
+        Raises:
+            FileNotFoundError: If the specification does not exist
+            ValueError: If the specification is invalid
+        """
+        key = ("id", pipeline_id)
+        pipeline = self._pipelines.get(key)
+        if pipeline is None:
+            spec = get_interpreter().load_pipeline_spec(pipeline_id)
+            pipeline = self.create_pipeline_from_spec(spec)
+            self._pipelines[key] = pipeline
+        return pipeline
+    
+    def clear_cache(self) -> None:
+        """Drop all cached pipelines."""
+        self._pipelines.clear()
     
     def create_pipeline_from_spec(self, spec: Dict[str, Any]) -> Pipeline:
         """
@@ -288,5 +434,5 @@ class PipelineFactory:
         )
         
         # In a real implementation, we would add components to the pipeline here
-            
-            return pipeline
\ No newline at end of file
+        
+        return pipeline
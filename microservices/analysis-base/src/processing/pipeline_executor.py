@@ -190,10 +190,8 @@ class PipelineExecutor:
                 - Exception if failure occurred, None otherwise
         """
         try:
-            # Create pipeline for the analysis type
-            pipeline = self.pipeline_factory.create_pipeline_for_analysis_type(
-                analysis_type, configuration
-            )
+            # Get the cached pipeline for the analysis type
+            pipeline = self.pipeline_factory.get_pipeline(analysis_type, configuration)
             
             if with_retry:
                 return await self.execute_with_retry(pipeline, context)
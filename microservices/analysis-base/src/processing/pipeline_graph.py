@@ -0,0 +1,256 @@
+"""
+Pipeline dependency graph for the analysis-base microservice.
+
+This module compiles the components of a pipeline into stages ordered by
+their declared data dependencies. Components declare the context paths they
+read (``inputs``) and write (``outputs``); stages whose paths do not conflict
+are grouped into the same level and run concurrently. Components without
+declarations act as barriers, so undeclared pipelines keep their sequential
+order.
+"""
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_MISSING = object()
+
+
+def split_path(path: str) -> Tuple[str, ...]:
+    """
+    Split a dot-notation context path.
+
+    Args:
+        path: Context path (e.g. "results.statistics")
+
+    Returns:
+        Tuple[str, ...]: Path parts
+    """
+    return tuple(path.split("."))
+
+
+def paths_overlap(first: Tuple[str, ...], second: Tuple[str, ...]) -> bool:
+    """
+    Check whether two context paths refer to overlapping data (one is a
+    prefix of the other).
+
+    Args:
+        first: Path parts
+        second: Path parts
+
+    Returns:
+        bool: True if the paths overlap
+    """
+    length = min(len(first), len(second))
+    return first[:length] == second[:length]
+
+
+def get_path(context: Dict[str, Any], parts: Tuple[str, ...]) -> Any:
+    """
+    Get the value at a context path.
+
+    Args:
+        context: Context to read
+        parts: Path parts
+
+    Returns:
+        Any: The value, or _MISSING if the path does not exist
+    """
+    current: Any = context
+    for part in parts:
+        if not isinstance(current, dict) or part not in current:
+            return _MISSING
+        current = current[part]
+    return current
+
+
+def set_path(context: Dict[str, Any], parts: Tuple[str, ...], value: Any) -> None:
+    """
+    Set the value at a context path, copying the dictionaries along the path
+    so that contexts sharing them are not modified.
+
+    Args:
+        context: Context to update
+        parts: Path parts
+        value: Value to set (_MISSING removes the key)
+    """
+    current = context
+    for part in parts[:-1]:
+        child = current.get(part)
+        child = dict(child) if isinstance(child, dict) else {}
+        current[part] = child
+        current = child
+    if value is _MISSING:
+        current.pop(parts[-1], None)
+    else:
+        current[parts[-1]] = value
+
+
+class PipelineStage:
+    """
+    A component with its declared data dependencies.
+
+    Attributes:
+        index (int): Position of the component in the pipeline
+        component (Any): The component
+        name (str): Component identifier used for timings
+        inputs (Optional[Tuple[Tuple[str, ...], ...]]): Paths read (None if undeclared)
+        outputs (Optional[Tuple[Tuple[str, ...], ...]]): Paths written (None if undeclared)
+        cpu_bound (bool): Whether the stage runs in an executor
+    """
+
+    def __init__(self, index: int, component: Any):
+        """
+        Initialize a stage from a component's declarations.
+
+        Args:
+            index: Position of the component in the pipeline
+            component: The component
+        """
+        self.index = index
+        self.component = component
+        self.name = str(getattr(component, "component_id", None) or getattr(component, "name", None) or index)
+
+        inputs = getattr(component, "inputs", None)
+        outputs = getattr(component, "outputs", None)
+        if inputs is None or outputs is None:
+            self.inputs = self.outputs = None
+        else:
+            self.inputs = tuple(split_path(path) for path in inputs)
+            self.outputs = tuple(split_path(path) for path in outputs)
+        self.cpu_bound = bool(getattr(component, "cpu_bound", False))
+
+    @property
+    def declared(self) -> bool:
+        """Whether the component declares its inputs and outputs."""
+        return self.outputs is not None
+
+    def depends_on(self, other: "PipelineStage") -> bool:
+        """
+        Check whether this stage must run after an earlier stage.
+
+        Args:
+            other: Earlier stage
+
+        Returns:
+            bool: True on a read-after-write, write-after-write or
+            write-after-read conflict, or if either stage is undeclared
+        """
+        if not self.declared or not other.declared:
+            return True
+        return (
+            any(paths_overlap(out, read) for out in other.outputs for read in self.inputs)
+            or any(paths_overlap(out, own) for out in other.outputs for own in self.outputs)
+            or any(paths_overlap(read, own) for read in other.inputs for own in self.outputs)
+        )
+
+
+class PipelineGraph:
+    """
+    Components of a pipeline compiled into levels of independent stages.
+
+    Attributes:
+        stages (List[PipelineStage]): Stages in pipeline order
+        levels (List[List[PipelineStage]]): Stages grouped by dependency
+            depth; stages in the same level do not conflict
+    """
+
+    def __init__(self, components: Sequence[Any]):
+        """
+        Compile the components.
+
+        Args:
+            components: Components in pipeline order
+        """
+        self.stages = [PipelineStage(index, component) for index, component in enumerate(components)]
+
+        depth: List[int] = []
+        for stage in self.stages:
+            earlier = [depth[other.index] for other in self.stages[:stage.index] if stage.depends_on(other)]
+            depth.append(max(earlier) + 1 if earlier else 0)
+
+        self.levels: List[List[PipelineStage]] = [[] for _ in range(max(depth) + 1 if depth else 0)]
+        for stage in self.stages:
+            self.levels[depth[stage.index]].append(stage)
+
+    @property
+    def parallelism(self) -> int:
+        """Largest number of stages that can run at the same time."""
+        return max((len(level) for level in self.levels), default=0)
+
+    async def run_stage(
+        self,
+        stage: PipelineStage,
+        context: Dict[str, Any],
+        executor: Optional[Executor] = None
+    ) -> Tuple[Dict[str, Any], float]:
+        """
+        Run one stage.
+
+        CPU-bound stages run their coroutine on a fresh event loop in the
+        executor (the loop's default thread pool if none is given), so they
+        do not block other stages.
+
+        Args:
+            stage: Stage to run
+            context: Context for the stage
+            executor: Executor for CPU-bound stages
+
+        Returns:
+            Tuple[Dict[str, Any], float]: Processed context and duration in ms
+
+        Raises:
+            ValueError: If the component returns None
+        """
+        start = time.perf_counter()
+        if stage.cpu_bound:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(executor, _run_coroutine, stage.component.process, context)
+        else:
+            result = await stage.component.process(context)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        if result is None:
+            raise ValueError(f"Component {stage.component.__class__.__name__} returned None")
+        return result, duration_ms
+
+    @staticmethod
+    def isolate(context: Dict[str, Any], stage: PipelineStage) -> Dict[str, Any]:
+        """
+        Copy a context for a concurrent stage, including the dictionaries
+        along its output paths, so in-place writes stay private to the stage.
+
+        Args:
+            context: Shared context
+            stage: Stage that will receive the copy
+
+        Returns:
+            Dict[str, Any]: Context for the stage
+        """
+        isolated = context.copy()
+        for parts in stage.outputs:
+            current = isolated
+            for part in parts[:-1]:
+                child = current.get(part)
+                if not isinstance(child, dict):
+                    break
+                current[part] = dict(child)
+                current = current[part]
+        return isolated
+
+    @staticmethod
+    def merge_outputs(context: Dict[str, Any], stage: PipelineStage, result: Dict[str, Any]) -> None:
+        """
+        Copy a concurrent stage's declared outputs into the shared context.
+
+        Args:
+            context: Shared context
+            stage: Stage that produced the result
+            result: The stage's processed context
+        """
+        for parts in stage.outputs:
+            set_path(context, parts, get_path(result, parts))
+
+
+def _run_coroutine(process: Any, context: Dict[str, Any]) -> Dict[str, Any]:
+    return asyncio.run(process(context))
@@ -115,7 +115,7 @@ class ProcessingEngine:
     
     async def _create_pipeline(self, context: Dict[str, Any]) -> Pipeline:
         """
-        Create a pipeline for processing the context.
+        Get the (cached) pipeline for processing the context.
         
         Args:
             context: The context to process
@@ -132,12 +132,13 @@ class ProcessingEngine:
             pipeline_config = context.get("pipeline_config", {})
             context_type = context.get("type", "default")
             
+            # Pipelines are compiled once per id or analysis type and reused
             if pipeline_id:
-                # Create pipeline from predefined configuration
-                pipeline = await self.pipeline_factory.create_pipeline_by_id(pipeline_id)
+                # Get pipeline from predefined configuration
+                pipeline = self.pipeline_factory.get_pipeline_by_id(pipeline_id)
             else:
-                # Create pipeline from context configuration or default for the type
-                pipeline = await self.pipeline_factory.create_pipeline(
+                # Get pipeline from context configuration or default for the type
+                pipeline = self.pipeline_factory.get_pipeline(
                     context_type,
                     pipeline_config
                 )
@@ -182,9 +183,9 @@ class ProcessingEngine:
             # Execute the pipeline
             result = await pipeline.execute(processing_context)
             
-            # Extract metrics
+            # Extract metrics (timings of this run; the pipeline is shared)
             metrics = {
-                "component_timings": pipeline.get_component_timings(),
+                "component_timings": result.get("_metadata", {}).get("stage_timings", {}),
                 "component_count": len(pipeline.components)
             }
             
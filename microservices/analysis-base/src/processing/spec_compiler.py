@@ -0,0 +1,441 @@
+"""
+Decision tree compiler for the analysis-base microservice.
+
+This module compiles decision tree specifications into trees of closures, so
+condition strings are parsed and field paths are split once per spec rather
+than on every evaluation. A compiled tree evaluates single contexts, lists of
+contexts, or a DataFrame (vectorized: each node evaluates its condition as a
+column mask over the rows that reach it).
+"""
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("spec_compiler")
+
+Accessor = Callable[[Any], Any]
+NodeFn = Callable[[Dict[str, Any]], Any]
+
+# Stands in for a missing branch (an invalid node, as in the interpreter)
+_MISSING_NODE: Dict[str, Any] = {}
+
+
+def parse_value(value_str: str) -> Any:
+    """
+    Parse a value string to the appropriate type.
+
+    Args:
+        value_str: Value string to parse
+
+    Returns:
+        Any: The parsed value
+    """
+    lowered = value_str.lower()
+    if lowered in ["true", "yes", "y"]:
+        return True
+    if lowered in ["false", "no", "n"]:
+        return False
+    if lowered in ["null", "none"]:
+        return None
+
+    try:
+        return int(value_str)
+    except ValueError:
+        pass
+
+    try:
+        return float(value_str)
+    except ValueError:
+        pass
+
+    if (value_str.startswith('"') and value_str.endswith('"')) or (
+        value_str.startswith("'") and value_str.endswith("'")
+    ):
+        return value_str[1:-1]
+
+    return value_str
+
+
+def compile_accessor(field: str) -> Accessor:
+    """
+    Compile a dot-notation field path into a lookup function.
+
+    Args:
+        field: Field path (dot notation)
+
+    Returns:
+        Accessor: Function returning the field value, or None if not found
+    """
+    parts = tuple(field.split("."))
+
+    if len(parts) == 1:
+        key = parts[0]
+
+        def get_one(context: Any) -> Any:
+            if isinstance(context, dict):
+                return context.get(key)
+            return None
+
+        return get_one
+
+    def get_path(context: Any) -> Any:
+        current = context
+        for part in parts:
+            if isinstance(current, dict) and part in current:
+                current = current[part]
+            else:
+                return None
+        return current
+
+    return get_path
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, (list, dict, str)):
+        return len(value) == 0
+    return False
+
+
+class CompiledCondition:
+    """
+    A parsed condition: an operator, a field path and an expected value.
+
+    Attributes:
+        op (str): "exists", "empty", "eq" or "unknown"
+        field (str): Field path the condition reads
+        expected (Any): Expected value for "eq"
+        test (Callable): Evaluates the condition against one context
+    """
+
+    def __init__(self, condition: str):
+        """
+        Parse a condition string.
+
+        Args:
+            condition: Condition string (exists:field, empty:field or field == value)
+        """
+        self.condition = condition
+        self.field = ""
+        self.expected = None
+
+        if condition.startswith("exists:"):
+            self.op = "exists"
+            self.field = condition[7:].strip()
+        elif condition.startswith("empty:"):
+            self.op = "empty"
+            self.field = condition[6:].strip()
+        elif "==" in condition:
+            self.op = "eq"
+            field, value_str = condition.split("==", 1)
+            self.field = field.strip()
+            self.expected = parse_value(value_str.strip())
+        else:
+            self.op = "unknown"
+            logger.warning(f"Unknown condition: {condition}")
+
+        self.test = self._compile()
+
+    def _compile(self) -> Callable[[Dict[str, Any]], bool]:
+        if self.op == "unknown":
+            return lambda context: False
+
+        get = compile_accessor(self.field)
+        if self.op == "exists":
+            return lambda context: get(context) is not None
+        if self.op == "empty":
+            return lambda context: _is_empty(get(context))
+
+        expected = self.expected
+        return lambda context: get(context) == expected
+
+    def mask(self, column: Optional[pd.Series], rows: int) -> np.ndarray:
+        """
+        Evaluate the condition over a column.
+
+        Args:
+            column: Field values (None if the field is absent); NaN is treated
+                as a missing value
+            rows: Number of rows
+
+        Returns:
+            np.ndarray: Boolean mask
+        """
+        if self.op == "unknown":
+            return np.zeros(rows, dtype=bool)
+        if column is None:
+            # Absent field: exists is false, empty is true, == compares None
+            return np.full(rows, self.op == "empty" or (self.op == "eq" and self.expected is None))
+
+        missing = column.isna().to_numpy()
+        if self.op == "exists":
+            return ~missing
+        if self.op == "empty":
+            if column.dtype == object:
+                return missing | column.map(_is_empty, na_action="ignore").fillna(True).to_numpy(dtype=bool)
+            return missing
+
+        if self.expected is None:
+            return missing
+        if column.dtype == object:
+            values = column.to_numpy()
+            return np.fromiter((v == self.expected for v in values), dtype=bool, count=len(values)) & ~missing
+        return (column == self.expected).to_numpy(dtype=bool) & ~missing
+
+
+class CompiledExpression:
+    """
+    A parsed switch expression: a context field reference or a literal.
+
+    Attributes:
+        field (Optional[str]): Field path for "context.<field>" expressions
+        literal (Any): Literal value otherwise
+        evaluate (Callable): Evaluates the expression against one context
+    """
+
+    def __init__(self, expression: str):
+        """
+        Parse an expression string.
+
+        Args:
+            expression: Expression string
+        """
+        self.expression = expression
+        self.field = None
+        self.literal = None
+
+        if expression.startswith("context."):
+            self.field = expression[8:].strip()
+            self.evaluate = compile_accessor(self.field)
+        else:
+            literal = parse_value(expression)
+            self.literal = literal
+            self.evaluate = lambda context: literal
+
+
+class CompiledDecisionTree:
+    """
+    A decision tree specification compiled into closures.
+
+    Attributes:
+        spec (Dict[str, Any]): The source specification
+        root (NodeFn): Compiled root node
+    """
+
+    def __init__(self, tree_spec: Dict[str, Any]):
+        """
+        Compile a decision tree specification.
+
+        Args:
+            tree_spec: Decision tree specification
+
+        Raises:
+            ValueError: If the tree has no root node
+        """
+        if "root" not in tree_spec:
+            raise ValueError("Invalid decision tree: missing root node")
+
+        self.spec = tree_spec
+        # Parsed conditions/expressions and closures by node, keyed by id()
+        # (the spec is kept alive by self.spec and is not modified)
+        self._parsed: Dict[int, Any] = {}
+        self._closures: Dict[int, NodeFn] = {}
+        self._root_node = tree_spec["root"]
+        self.root = self._compile_node(self._root_node)
+
+    def evaluate(self, context: Dict[str, Any]) -> Any:
+        """
+        Evaluate the tree for one context.
+
+        Args:
+            context: Context to evaluate against
+
+        Returns:
+            Any: The selected strategy or action
+        """
+        return self.root(context)
+
+    def evaluate_batch(
+        self,
+        contexts: Union[Sequence[Dict[str, Any]], pd.DataFrame]
+    ) -> Union[List[Any], pd.Series]:
+        """
+        Evaluate the tree over many contexts.
+
+        Lists are evaluated context by context with the compiled closures.
+        DataFrames are evaluated column-wise: field paths are read from the
+        column of the same (dotted) name, as produced by pandas.json_normalize
+        (or from a top-level column holding nested dicts), and missing values
+        (None/NaN) count as absent fields.
+
+        Args:
+            contexts: List of contexts or a DataFrame with one row per context
+
+        Returns:
+            Union[List[Any], pd.Series]: Results in input order (a Series with
+            the frame's index for DataFrame input)
+        """
+        if isinstance(contexts, pd.DataFrame):
+            return self.evaluate_frame(contexts)
+        root = self.root
+        return [root(context) for context in contexts]
+
+    def evaluate_frame(self, frame: pd.DataFrame) -> pd.Series:
+        """
+        Evaluate the tree over a DataFrame with vectorized conditions.
+
+        Args:
+            frame: One row per context, one column per field path
+
+        Returns:
+            pd.Series: Results indexed like the frame
+        """
+        results = np.empty(len(frame), dtype=object)
+        self._evaluate_rows(self._root_node, frame, np.arange(len(frame)), results)
+        return pd.Series(results, index=frame.index)
+
+    def _evaluate_rows(
+        self,
+        node: Dict[str, Any],
+        frame: pd.DataFrame,
+        rows: np.ndarray,
+        results: np.ndarray
+    ) -> None:
+        """
+        Evaluate a node for the given rows, partitioning them between branches.
+        """
+        if len(rows) == 0:
+            return
+
+        if "type" not in node:
+            if "result" in node:
+                results[rows] = node["result"]
+                return
+            raise ValueError("Invalid decision tree node: missing type or result")
+
+        node_type = node["type"]
+        if node_type == "condition":
+            condition = self._parsed[id(node)]
+            column = self._column(frame, condition.field, rows)
+            mask = condition.mask(column, len(rows))
+            self._evaluate_rows(node.get("then", _MISSING_NODE), frame, rows[mask], results)
+            self._evaluate_rows(node.get("else", _MISSING_NODE), frame, rows[~mask], results)
+
+        elif node_type == "switch":
+            expression = self._parsed[id(node)]
+            cases = node.get("cases", {})
+            default = node.get("default", _MISSING_NODE)
+            if expression.field is None:
+                branch = cases[expression.literal] if expression.literal in cases else default
+                self._evaluate_rows(branch, frame, rows, results)
+                return
+
+            column = self._column(frame, expression.field, rows)
+            if column is None:
+                branch = cases[None] if None in cases else default
+                self._evaluate_rows(branch, frame, rows, results)
+                return
+
+            keys = list(cases)
+            values = column.astype(object).where(column.notna(), None)
+            try:
+                positions = pd.Index(keys, dtype=object).get_indexer(values)
+            except TypeError:
+                # Unhashable values: evaluate these rows one by one
+                closure = self._closures[id(node)]
+                contexts = frame.iloc[rows].to_dict("records")
+                results[rows] = [closure(_nest(context)) for context in contexts]
+                return
+            for position in range(-1, len(keys)):
+                branch = cases[keys[position]] if position >= 0 else default
+                self._evaluate_rows(branch, frame, rows[positions == position], results)
+
+        else:
+            raise ValueError(f"Unknown decision tree node type: {node_type}")
+
+    @staticmethod
+    def _column(frame: pd.DataFrame, field: str, rows: np.ndarray) -> Optional[pd.Series]:
+        if field in frame.columns:
+            return frame[field].iloc[rows]
+
+        # Nested dicts in a top-level column: resolve the rest of the path per row
+        head, _, rest = field.partition(".")
+        if rest and head in frame.columns:
+            get = compile_accessor(rest)
+            return frame[head].iloc[rows].map(get)
+        return None
+
+    def _compile_node(self, node: Dict[str, Any]) -> NodeFn:
+        """
+        Compile a node and its children into a closure.
+
+        Invalid nodes compile to closures raising the same errors the
+        interpreter raises when it reaches them.
+        """
+        closure = self._compile_closure(node)
+        self._closures[id(node)] = closure
+        return closure
+
+    def _compile_closure(self, node: Dict[str, Any]) -> NodeFn:
+        if "type" in node:
+            node_type = node["type"]
+
+            if node_type == "condition":
+                condition = CompiledCondition(node.get("condition", ""))
+                self._parsed[id(node)] = condition
+                test = condition.test
+                then_branch = self._compile_node(node.get("then", _MISSING_NODE))
+                else_branch = self._compile_node(node.get("else", _MISSING_NODE))
+
+                def condition_node(context: Dict[str, Any]) -> Any:
+                    if test(context):
+                        return then_branch(context)
+                    return else_branch(context)
+
+                return condition_node
+
+            if node_type == "switch":
+                expression = CompiledExpression(node.get("expression", ""))
+                self._parsed[id(node)] = expression
+                evaluate = expression.evaluate
+                cases = {key: self._compile_node(case) for key, case in node.get("cases", {}).items()}
+                default = self._compile_node(node.get("default", _MISSING_NODE))
+
+                def switch_node(context: Dict[str, Any]) -> Any:
+                    value = evaluate(context)
+                    if value in cases:
+                        return cases[value](context)
+                    return default(context)
+
+                return switch_node
+
+            return _raiser(f"Unknown decision tree node type: {node_type}")
+
+        if "result" in node:
+            result = node["result"]
+            return lambda context: result
+
+        return _raiser("Invalid decision tree node: missing type or result")
+
+
+def _nest(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild a nested context from a flat row with dotted column names."""
+    context: Dict[str, Any] = {}
+    for column, value in row.items():
+        if not isinstance(value, (list, dict, str)) and pd.isna(value):
+            continue
+        current = context
+        *parents, leaf = str(column).split(".")
+        for part in parents:
+            current = current.setdefault(part, {})
+        current[leaf] = value
+    return context
+
+
+def _raiser(message: str) -> NodeFn:
+    def fail(context: Dict[str, Any]) -> Any:
+        raise ValueError(message)
+    return fail
@@ -5,15 +5,18 @@ This module provides the SpecInterpreter class for loading and interpreting
 declarative specifications for ML models and analysis pipelines. It serves
 as a bridge between ML expert-defined specifications and executable code.
 """
+import hashlib
 import json
 import logging
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
+import pandas as pd
 import yaml
 
 from src.config.config_loader import get_value
+from src.processing.spec_compiler import CompiledDecisionTree, parse_value
 
 
 class SpecInterpreter:
@@ -30,6 +33,8 @@ class SpecInterpreter:
         decision_trees_dir (str): Directory containing decision tree specifications
         pipelines_dir (str): Directory containing pipeline specifications
         loaded_specs (Dict[str, Dict[str, Any]]): Cached loaded specifications
+        compiled_trees (Dict[Tuple[str, str], CompiledDecisionTree]): Compiled
+            decision trees by spec id and version
     """
     
     def __init__(
@@ -61,6 +66,10 @@ class SpecInterpreter:
             "decision_trees": {},
             "pipelines": {}
         }
+        
+        # Compiled decision trees by (id, version), and by spec object
+        self.compiled_trees: Dict[Tuple[str, str], CompiledDecisionTree] = {}
+        self._compiled_by_object: Dict[int, CompiledDecisionTree] = {}
     
     def load_model_spec(self, model_name: str) -> Dict[str, Any]:
         """
@@ -204,51 +213,73 @@ class SpecInterpreter:
         Returns:
             str: The selected strategy or action
         """
-        # Verify that the tree has a root node
-        if "root" not in tree_spec:
-            raise ValueError("Invalid decision tree: missing root node")
+        return self.compile_decision_tree_spec(tree_spec).evaluate(context)
+    
+    def interpret_decision_tree_batch(
+        self,
+        tree_spec: Dict[str, Any],
+        contexts: Union[Sequence[Dict[str, Any]], pd.DataFrame]
+    ) -> Union[List[Any], pd.Series]:
+        """
+        Interpret a decision tree specification for many contexts at once.
         
-        # Start from the root node
-        current_node = tree_spec["root"]
+        Args:
+            tree_spec: Decision tree specification to interpret
+            contexts: List of contexts, or a DataFrame with one row per context
+                and one column per (dotted) field path
+            
+        Returns:
+            Union[List[Any], pd.Series]: Selected strategies in input order
+        """
+        return self.compile_decision_tree_spec(tree_spec).evaluate_batch(contexts)
+    
+    def compile_decision_tree_spec(self, tree_spec: Dict[str, Any]) -> CompiledDecisionTree:
+        """
+        Compile a decision tree specification, reusing the compiled tree for
+        the same spec id and version.
         
-        # Traverse the tree
-        while True:
-            # If the node has a type, it's an evaluation node
-            if "type" in current_node:
-                node_type = current_node["type"]
-                
-                if node_type == "condition":
-                    # Evaluate the condition
-                    condition_result = self._evaluate_condition(current_node, context)
-                    
-                    # Follow the appropriate branch
-                    if condition_result:
-                        current_node = current_node.get("then", {})
-                    else:
-                        current_node = current_node.get("else", {})
-                        
-                elif node_type == "switch":
-                    # Evaluate the expression
-                    expression_result = self._evaluate_expression(current_node.get("expression", ""), context)
-                    
-                    # Follow the matching case or default
-                    cases = current_node.get("cases", {})
-                    if expression_result in cases:
-                        current_node = cases[expression_result]
-                    else:
-                        current_node = current_node.get("default", {})
-                        
-                else:
-                    # Unknown node type
-                    raise ValueError(f"Unknown decision tree node type: {node_type}")
-                    
-            # If the node has a result, we've reached a leaf node
-            elif "result" in current_node:
-                return current_node["result"]
-                
-            # Neither a type nor a result, invalid node
-            else:
-                raise ValueError("Invalid decision tree node: missing type or result")
+        Specs without a version are keyed by a hash of their content.
+        
+        Args:
+            tree_spec: Decision tree specification to compile
+            
+        Returns:
+            CompiledDecisionTree: The compiled tree
+            
+        Raises:
+            ValueError: If the tree has no root node
+        """
+        # The compiled tree keeps its spec alive, so the object id stays unique
+        compiled = self._compiled_by_object.get(id(tree_spec))
+        if compiled is not None and compiled.spec is tree_spec:
+            return compiled
+        
+        key = self._compiled_tree_key(tree_spec)
+        compiled = self.compiled_trees.get(key)
+        if compiled is None:
+            compiled = CompiledDecisionTree(tree_spec)
+            self.compiled_trees[key] = compiled
+            self.logger.debug(f"Compiled decision tree {key[0]} (version {key[1]})")
+        self._compiled_by_object[id(compiled.spec)] = compiled
+        return compiled
+    
+    def _compiled_tree_key(self, tree_spec: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Get the compiled-tree cache key for a decision tree specification.
+        
+        Args:
+            tree_spec: Decision tree specification
+            
+        Returns:
+            Tuple[str, str]: Spec id and version
+        """
+        spec_id = tree_spec.get("id") or tree_spec.get("name")
+        version = tree_spec.get("version")
+        if spec_id is not None and version is not None:
+            return str(spec_id), str(version)
+        
+        content = json.dumps(tree_spec.get("root"), sort_keys=True, default=str)
+        return str(spec_id), "sha1:" + hashlib.sha1(content.encode("utf-8")).hexdigest()
     
     def interpret_pipeline_spec(self, pipeline_spec: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -717,37 +748,7 @@ class SpecInterpreter:
         Raises:
             ValueError: If the value cannot be parsed
         """
-        # Check for boolean values
-        if value_str.lower() in ["true", "yes", "y"]:
-            return True
-            
-        if value_str.lower() in ["false", "no", "n"]:
-            return False
-        
-        # Check for null value
-        if value_str.lower() in ["null", "none"]:
-            return None
-        
-        # Check for integer values
-        try:
-            return int(value_str)
-        except ValueError:
-            pass
-        
-        # Check for float values
-        try:
-            return float(value_str)
-        except ValueError:
-            pass
-        
-        # Check for string literals
-        if (value_str.startswith('"') and value_str.endswith('"')) or (
-            value_str.startswith("'") and value_str.endswith("'")
-        ):
-            return value_str[1:-1]
-        
-        # Unquoted string
-        return value_str
+        return parse_value(value_str)
 
 
 # Create a singleton instance
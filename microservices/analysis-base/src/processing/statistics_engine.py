@@ -0,0 +1,365 @@
+"""
+Statistics engine for the analysis-base microservice.
+
+This module provides the numerical core of the statistical analysis
+component:
+- ``describe`` computes the descriptive statistics of a series with one
+  percentile partition for the median and all percentiles;
+- ``outlier_mask`` flags outliers as a boolean array instead of filtering
+  values one by one in Python;
+- ``StreamingMoments`` accumulates count, sum, extrema and the first four
+  central moments in a single pass over chunks, so long series never have
+  to be materialized, and merges partial aggregates computed by different
+  workers or batches exactly (Chan/Pébay pairwise update).
+"""
+import math
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Union
+
+import numpy as np
+
+OUTLIER_METHODS = ("iqr", "z_score", "percentile")
+DEFAULT_PERCENTILES = (25, 50, 75, 90, 95, 99)
+DEFAULT_OUTLIER_THRESHOLDS = {"iqr": 1.5, "z_score": 3.0}
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def iter_chunks(values: Sequence[float], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """
+    Split a series into float arrays of at most chunk_size values.
+
+    Args:
+        values: Series (array, list or any sliceable sequence)
+        chunk_size: Maximum values per chunk
+
+    Yields:
+        np.ndarray: Consecutive chunks
+    """
+    for start in range(0, len(values), chunk_size):
+        yield np.asarray(values[start:start + chunk_size], dtype=float)
+
+
+class StreamingMoments:
+    """
+    Mergeable single-pass aggregate of a numeric series.
+
+    Each chunk is reduced with numpy and folded into the running aggregate
+    with the pairwise update of Chan et al. (extended to the third and
+    fourth moments by Pébay), which is Welford's update applied to blocks
+    instead of single values. Merging two aggregates uses the same update,
+    so partials from different workers combine into the aggregate of the
+    whole series.
+
+    Attributes:
+        count (int): Number of values
+        total (float): Sum of the values
+        mean (float): Mean
+        m2 (float): Sum of squared deviations from the mean
+        m3 (float): Sum of cubed deviations from the mean
+        m4 (float): Sum of fourth-power deviations from the mean
+        minimum (float): Smallest value (inf when empty)
+        maximum (float): Largest value (-inf when empty)
+    """
+
+    FIELDS = ("count", "total", "mean", "m2", "m3", "m4", "minimum", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    @classmethod
+    def from_values(cls, values: Sequence[float], chunk_size: int = DEFAULT_CHUNK_SIZE) -> "StreamingMoments":
+        """
+        Aggregate a series chunk by chunk.
+
+        Args:
+            values: Series
+            chunk_size: Values reduced at a time
+
+        Returns:
+            StreamingMoments: Aggregate of the series
+        """
+        return cls.from_chunks(iter_chunks(values, chunk_size))
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Sequence[float]]) -> "StreamingMoments":
+        """
+        Aggregate a series given as chunks, e.g. read from a file or cursor.
+
+        Args:
+            chunks: Iterable of numeric chunks
+
+        Returns:
+            StreamingMoments: Aggregate of all chunks
+        """
+        moments = cls()
+        for chunk in chunks:
+            moments.update(chunk)
+        return moments
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StreamingMoments":
+        """
+        Restore an aggregate serialized with to_dict.
+
+        Args:
+            data: Serialized aggregate
+
+        Returns:
+            StreamingMoments: The aggregate
+        """
+        moments = cls()
+        for field in cls.FIELDS:
+            setattr(moments, field, data[field] if data.get(field) is not None else getattr(moments, field))
+        moments.count = int(moments.count)
+        return moments
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the aggregate, e.g. to store it with batch results.
+
+        Returns:
+            Dict[str, Any]: JSON-compatible fields (extrema are None when
+            empty)
+        """
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        if not self.count:
+            data["minimum"] = data["maximum"] = None
+        return data
+
+    def update(self, values: Sequence[float]) -> "StreamingMoments":
+        """
+        Fold a chunk of values into the aggregate.
+
+        Args:
+            values: Numeric chunk
+
+        Returns:
+            StreamingMoments: self
+        """
+        chunk = np.asarray(values, dtype=float).ravel()
+        if chunk.size == 0:
+            return self
+
+        mean = float(chunk.mean())
+        deviations = chunk - mean
+        squared = deviations * deviations
+
+        block = StreamingMoments()
+        block.count = int(chunk.size)
+        block.total = float(chunk.sum())
+        block.mean = mean
+        block.m2 = float(squared.sum())
+        block.m3 = float(np.dot(squared, deviations))
+        block.m4 = float(np.dot(squared, squared))
+        block.minimum = float(chunk.min())
+        block.maximum = float(chunk.max())
+
+        self._combine(block)
+        return self
+
+    def merge(self, other: "StreamingMoments") -> "StreamingMoments":
+        """
+        Combine with another aggregate without modifying either.
+
+        Args:
+            other: Aggregate of another part of the series
+
+        Returns:
+            StreamingMoments: Aggregate of both parts
+        """
+        merged = StreamingMoments.from_dict(self.to_dict())
+        merged._combine(other)
+        return merged
+
+    def _combine(self, other: "StreamingMoments") -> None:
+        if other.count == 0:
+            return
+        if self.count == 0:
+            for field in self.FIELDS:
+                setattr(self, field, getattr(other, field))
+            return
+
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        cross = delta * delta_n * na * nb
+
+        m2 = self.m2 + other.m2 + cross
+        m3 = (
+            self.m3 + other.m3
+            + cross * delta_n * (na - nb)
+            + 3.0 * delta_n * (na * other.m2 - nb * self.m2)
+        )
+        m4 = (
+            self.m4 + other.m4
+            + cross * delta_n2 * (na * na - na * nb + nb * nb)
+            + 6.0 * delta_n2 * (na * na * other.m2 + nb * nb * self.m2)
+            + 4.0 * delta_n * (na * other.m3 - nb * self.m3)
+        )
+
+        self.mean += delta_n * nb
+        self.count = n
+        self.total += other.total
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def variance(self, ddof: int = 0) -> float:
+        """
+        Variance of the series.
+
+        Args:
+            ddof: Delta degrees of freedom (0 for the population variance)
+
+        Returns:
+            float: Variance, nan if there are not enough values
+        """
+        if self.count - ddof <= 0:
+            return math.nan
+        return max(self.m2, 0.0) / (self.count - ddof)
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation."""
+        return math.sqrt(self.variance())
+
+    @property
+    def skewness(self) -> float:
+        """Population skewness (0 for constant series)."""
+        if self.count == 0 or self.m2 <= 0:
+            return 0.0
+        return math.sqrt(self.count) * self.m3 / self.m2 ** 1.5
+
+    @property
+    def kurtosis(self) -> float:
+        """Population excess kurtosis (0 for constant series)."""
+        if self.count == 0 or self.m2 <= 0:
+            return 0.0
+        return self.count * self.m4 / (self.m2 * self.m2) - 3.0
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get the statistics that do not need the full series.
+
+        Returns:
+            Dict[str, Any]: count, mean, std, min, max, sum, skewness and
+            kurtosis
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.minimum,
+            "max": self.maximum,
+            "sum": self.total,
+            "skewness": self.skewness,
+            "kurtosis": self.kurtosis,
+        }
+
+
+def merge_partials(partials: Iterable[Union[StreamingMoments, Dict[str, Any]]]) -> StreamingMoments:
+    """
+    Combine partial aggregates, e.g. one per worker or batch.
+
+    Args:
+        partials: Aggregates or their to_dict serializations
+
+    Returns:
+        StreamingMoments: Aggregate of all parts
+    """
+    merged = StreamingMoments()
+    for partial in partials:
+        merged._combine(partial if isinstance(partial, StreamingMoments) else StreamingMoments.from_dict(partial))
+    return merged
+
+
+def describe(values: Sequence[float], percentiles: Optional[Sequence[float]] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+    """
+    Compute the descriptive statistics of a series.
+
+    The median and all percentiles come from a single percentile call, and
+    the mean and standard deviation from the moment aggregate.
+
+    Args:
+        values: Non-empty numeric series
+        percentiles: Percentiles to include, or None to leave them out
+
+    Returns:
+        Dict[str, Any]: count, mean, median, std, min, max, sum and, if
+        requested, percentiles keyed by their string value
+    """
+    array = np.asarray(values, dtype=float)
+    moments = StreamingMoments().update(array)
+
+    points = [50] + list(percentiles or [])
+    quantiles = np.percentile(array, points)
+
+    stats = {
+        "count": moments.count,
+        "mean": moments.mean,
+        "median": float(quantiles[0]),
+        "std": moments.std,
+        "min": moments.minimum,
+        "max": moments.maximum,
+        "sum": moments.total,
+    }
+    if percentiles is not None:
+        stats["percentiles"] = {str(p): float(q) for p, q in zip(percentiles, quantiles[1:])}
+    return stats
+
+
+def outlier_mask(
+    values: Sequence[float],
+    method: str = "iqr",
+    threshold: Optional[float] = None,
+    lower_percentile: float = 1,
+    upper_percentile: float = 99
+) -> np.ndarray:
+    """
+    Flag the outliers of a series.
+
+    Args:
+        values: Numeric series
+        method: "iqr" (beyond threshold x IQR from the quartiles),
+            "z_score" (more than threshold standard deviations from the
+            mean) or "percentile" (outside the given percentiles)
+        threshold: Method threshold (default 1.5 for iqr, 3.0 for z_score)
+        lower_percentile: Lower bound for the percentile method
+        upper_percentile: Upper bound for the percentile method
+
+    Returns:
+        np.ndarray: Boolean mask, True for outliers
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    array = np.asarray(values, dtype=float)
+    if method not in OUTLIER_METHODS:
+        raise ValueError(f"Unknown outlier method: {method}")
+    if array.size == 0:
+        return np.zeros(0, dtype=bool)
+
+    if method == "z_score":
+        threshold = DEFAULT_OUTLIER_THRESHOLDS["z_score"] if threshold is None else threshold
+        std = array.std()
+        if std == 0:
+            return np.zeros(array.shape, dtype=bool)
+        return np.abs((array - array.mean()) / std) > threshold
+
+    if method == "iqr":
+        threshold = DEFAULT_OUTLIER_THRESHOLDS["iqr"] if threshold is None else threshold
+        q1, q3 = np.percentile(array, [25, 75])
+        iqr = q3 - q1
+        lower, upper = q1 - threshold * iqr, q3 + threshold * iqr
+    else:
+        lower, upper = np.percentile(array, [lower_percentile, upper_percentile])
+
+    return (array < lower) | (array > upper)
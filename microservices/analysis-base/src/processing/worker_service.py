@@ -142,6 +142,8 @@ class WorkerService:
             return
         
         context_id = context.get("_id", "unknown")
+        # Updates only apply while this worker still holds the claim
+        lease_token = context.get("lease", {}).get("token")
         logger.info(
             "Processing single context",
             context_id=context_id,
@@ -152,7 +154,8 @@ class WorkerService:
             # Process the context
             await self.repository.update_context_status(
                 context_id=context_id,
-                status="processing"
+                status="processing",
+                lease_token=lease_token
             )
             
             result = await self.processing_engine.process_context(context)
@@ -167,7 +170,8 @@ class WorkerService:
             await self.repository.update_context_result(
                 context_id=context_id,
                 status="completed",
-                result=result
+                result=result,
+                lease_token=lease_token
             )
             
             # Update tags if available
@@ -216,7 +220,8 @@ class WorkerService:
             await self.repository.update_context_status(
                 context_id=context_id,
                 status="failed",
-                error=error_info
+                error=error_info,
+                lease_token=lease_token
             )
             
             # Schedule retry if recommended
@@ -254,6 +259,8 @@ class WorkerService:
             return
         
         context_ids = [context.get("_id", "unknown") for context in contexts]
+        # A batch is claimed under one lease
+        lease_token = contexts[0].get("lease", {}).get("token")
         logger.info(
             "Processing context batch",
             batch_size=len(contexts)
@@ -264,7 +271,8 @@ class WorkerService:
             for context_id in context_ids:
                 await self.repository.update_context_status(
                     context_id=context_id,
-                    status="processing"
+                    status="processing",
+                    lease_token=lease_token
                 )
             
             # Process the contexts as a batch
@@ -280,7 +288,8 @@ class WorkerService:
                 await self.repository.update_context_result(
                         context_id=context_id,
                         status="completed",
-                        result=item_result.get("result", {})
+                        result=item_result.get("result", {}),
+                        lease_token=lease_token
                     )
                     
                     # Update tags if available
@@ -307,7 +316,8 @@ class WorkerService:
                     await self.repository.update_context_status(
                         context_id=context_id,
                         status="failed",
-                        error=error_info
+                        error=error_info,
+                        lease_token=lease_token
                     )
                     
                     # Update metrics
@@ -343,7 +353,8 @@ class WorkerService:
             await self.repository.update_context_status(
                     context_id=context_id,
                     status="failed",
-                    error=error_info
+                    error=error_info,
+                    lease_token=lease_token
                 )
             
             # Update metrics
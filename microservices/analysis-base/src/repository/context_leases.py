@@ -0,0 +1,257 @@
+"""
+Context Leases Module
+
+This module claims pending contexts for a worker with leases stored on the
+context documents themselves. A claim is a conditional update in MongoDB, so
+it is atomic without a separate lock store: a batch is claimed by stamping a
+fresh lease token on the candidates with one update_many and fetching them
+back by that token. Leases carry an owner and an expiry, can be renewed while
+a context is being processed, and expired leases are reclaimed by later
+claims or reset to pending by a sweep.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Sort by priority (if exists) and then by creation time
+CLAIM_SORT = [
+    ("metadata.priority", 1),  # Lower number = higher priority
+    ("created_at", 1)  # Oldest first
+]
+
+
+def claimable_query(now: str, criteria: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build the query for contexts that can be claimed.
+
+    A context is claimable when it is pending and due for (re)try, or when it
+    is being processed under a lease that has expired.
+
+    Args:
+        now: Current time as an ISO string
+        criteria: Additional conditions a claimable context must meet,
+            e.g. a service type or template
+
+    Returns:
+        MongoDB query
+    """
+    query = {
+        "$or": [
+            {
+                "status": "pending",
+                "$or": [
+                    {"retry_metadata.next_retry_at": {"$lte": now}},
+                    {"retry_metadata.next_retry_at": {"$exists": False}}
+                ]
+            },
+            {"status": "processing", "lease.expires_at": {"$lt": now}}
+        ]
+    }
+    return {"$and": [query, criteria]} if criteria else query
+
+
+class ContextLeases:
+    """
+    Lease-based claiming of contexts.
+
+    Attributes:
+        collection: Contexts collection (Motor or compatible)
+        owner (str): Lease owner written on claimed contexts
+        lease_seconds (float): Lease duration
+        sort (List[Tuple[str, int]]): Claim order
+        max_attempts (int): Claim rounds per batch when losing candidates
+            to other workers
+    """
+
+    def __init__(
+        self,
+        collection: Any,
+        owner: str,
+        lease_seconds: float = 300,
+        sort: Optional[Sequence[Tuple[str, int]]] = None,
+        max_attempts: int = 3
+    ):
+        """
+        Initialize the leases.
+
+        Args:
+            collection: Contexts collection
+            owner: Lease owner, usually the worker ID
+            lease_seconds: Lease duration
+            sort: Claim order, defaults to priority then creation time
+            max_attempts: Claim rounds per batch
+        """
+        self.collection = collection
+        self.owner = owner
+        self.lease_seconds = lease_seconds
+        self.sort = list(sort or CLAIM_SORT)
+        self.max_attempts = max_attempts
+
+    def _lease(self, token: str, now: datetime) -> Dict[str, Any]:
+        return {
+            "owner": self.owner,
+            "token": token,
+            "claimed_at": now.isoformat(),
+            "expires_at": (now + timedelta(seconds=self.lease_seconds)).isoformat()
+        }
+
+    async def claim_batch(self, batch_size: int, criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Claim up to batch_size contexts.
+
+        Candidate IDs are read in claim order and leased with one
+        update_many that repeats the claimable query, so a context taken by
+        another worker in between is skipped rather than claimed twice.
+        Rounds repeat while candidates are lost to other workers, then the
+        claimed contexts are fetched by the lease token. Uncontended, a
+        batch costs three round trips.
+
+        Args:
+            batch_size: Maximum number of contexts to claim
+            criteria: Additional conditions for claimed contexts
+
+        Returns:
+            Claimed contexts in claim order, with status "processing" and
+            their lease
+        """
+        if batch_size <= 0:
+            return []
+
+        now = datetime.utcnow()
+        token = uuid.uuid4().hex
+        query = claimable_query(now.isoformat(), criteria)
+        update = {
+            "$set": {
+                "status": "processing",
+                "updated_at": now.isoformat(),
+                "lease": self._lease(token, now)
+            }
+        }
+
+        claimed = 0
+        for _ in range(self.max_attempts):
+            remaining = batch_size - claimed
+            candidates = await self.collection.find(query, {"_id": 1}).sort(self.sort).limit(remaining).to_list(
+                length=remaining
+            )
+            if not candidates:
+                break
+
+            result = await self.collection.update_many(
+                {"_id": {"$in": [candidate["_id"] for candidate in candidates]}, **query},
+                update
+            )
+            claimed += result.modified_count
+
+            # Stop when the batch is full, or every candidate was won and
+            # there were no more to read
+            if claimed >= batch_size or result.modified_count == len(candidates):
+                break
+
+        if not claimed:
+            return []
+
+        return await self.collection.find({"lease.token": token}).sort(self.sort).to_list(length=claimed)
+
+    async def claim_next(self, criteria: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Claim the next context with a single find_one_and_update.
+
+        Args:
+            criteria: Additional conditions for the claimed context
+
+        Returns:
+            The claimed context, or None if there is nothing to claim
+        """
+        now = datetime.utcnow()
+        lease = self._lease(uuid.uuid4().hex, now)
+        update = {"$set": {"status": "processing", "updated_at": now.isoformat(), "lease": lease}}
+
+        # The document is returned as it was before the update, the claimed
+        # fields are known here
+        context = await self.collection.find_one_and_update(
+            claimable_query(now.isoformat(), criteria), update, sort=self.sort
+        )
+        if context:
+            context.update(update["$set"])
+        return context
+
+    async def renew(
+        self,
+        context_ids: Sequence[Any],
+        lease_token: Optional[str] = None,
+        lease_seconds: Optional[float] = None
+    ) -> int:
+        """
+        Extend the leases this owner holds on contexts.
+
+        Args:
+            context_ids: Context document IDs
+            lease_token: Only renew leases from this claim
+            lease_seconds: New lease duration from now, defaults to the
+                configured duration
+
+        Returns:
+            Number of leases renewed; leases that expired and were reclaimed
+            by another worker are not renewed
+        """
+        if not context_ids:
+            return 0
+
+        query = {"_id": {"$in": list(context_ids)}, "status": "processing", "lease.owner": self.owner}
+        if lease_token:
+            query["lease.token"] = lease_token
+
+        seconds = self.lease_seconds if lease_seconds is None else lease_seconds
+        result = await self.collection.update_many(
+            query,
+            {"$set": {"lease.expires_at": (datetime.utcnow() + timedelta(seconds=seconds)).isoformat()}}
+        )
+        return result.modified_count
+
+    async def release(self, context_ids: Sequence[Any]) -> int:
+        """
+        Return contexts this owner holds to pending without waiting for
+        their leases to expire.
+
+        Args:
+            context_ids: Context document IDs
+
+        Returns:
+            Number of contexts released
+        """
+        if not context_ids:
+            return 0
+
+        result = await self.collection.update_many(
+            {"_id": {"$in": list(context_ids)}, "status": "processing", "lease.owner": self.owner},
+            {"$set": {"status": "pending", "updated_at": datetime.utcnow().isoformat()}, "$unset": {"lease": ""}}
+        )
+        return result.modified_count
+
+    async def sweep_expired(self) -> int:
+        """
+        Reset contexts whose lease expired to pending.
+
+        Claims already take over expired leases; the sweep makes those
+        contexts visible as pending again, e.g. to monitoring or to
+        consumers that only read pending contexts. Contexts left in
+        processing without a lease, by workers that still claimed with
+        Redis locks, are reset too since nothing else reclaims them.
+
+        Returns:
+            Number of contexts reset
+        """
+        now = datetime.utcnow().isoformat()
+        result = await self.collection.update_many(
+            {
+                "status": "processing",
+                "$or": [
+                    {"lease.expires_at": {"$lt": now}},
+                    {"lease": {"$exists": False}}
+                ]
+            },
+            {"$set": {"status": "pending", "updated_at": now}, "$unset": {"lease": ""}}
+        )
+        return result.modified_count
@@ -6,6 +6,8 @@ It handles all database interactions for the application.
 """
 
 import asyncio
+import os
+import socket
 import structlog
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
@@ -13,6 +15,8 @@ from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from bson.objectid import ObjectId
 import redis.asyncio as redis
 
+from .context_leases import ContextLeases
+
 # Configure structured logging
 logger = structlog.get_logger(__name__)
 
@@ -24,7 +28,7 @@ class Repository:
     - Connecting to and querying MongoDB
     - CRUD operations for contexts
     - Managing indexes and collections
-    - Handling distributed locks via Redis
+    - Leasing contexts to workers
     """
     
     def __init__(self, mongodb_url: str, database_name: str, redis_client: Optional[redis.Redis] = None, settings: Any = None):
@@ -34,7 +38,8 @@ class Repository:
         Args:
             mongodb_url: MongoDB connection URL
             database_name: Database name
-            redis_client: Optional Redis client for distributed locking
+            redis_client: Optional Redis client (contexts are leased in
+                MongoDB, see ContextLeases)
             settings: Application settings
         """
         self.mongodb_url = mongodb_url
@@ -47,6 +52,11 @@ class Repository:
         # Collections
         self.contexts_collection = None
         self.templates_collection = None
+        self.leases = None
+        
+        # Contexts are leased to this worker while it processes them
+        self.worker_id = getattr(settings, 'worker_id', None) or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = getattr(settings, 'lease_seconds', getattr(settings, 'lock_expiry_seconds', 300))
         
         logger.info(
             "Repository initialized",
@@ -65,6 +75,11 @@ class Repository:
             # Initialize collections
             self.contexts_collection = self.db.contexts
             self.templates_collection = self.db.templates
+            self.leases = ContextLeases(
+                self.contexts_collection,
+                owner=self.worker_id,
+                lease_seconds=self.lease_seconds
+            )
             
             # Create indexes
             await self._create_indexes()
@@ -110,7 +125,9 @@ class Repository:
             [("organization_id", 1), ("status", 1)],
             [("tags", 1)],
             [("batch_id", 1)],
-            [("metadata.priority", 1), ("status", 1), ("created_at", 1)]
+            [("metadata.priority", 1), ("status", 1), ("created_at", 1)],
+            [("status", 1), ("lease.expires_at", 1)],
+            [("lease.token", 1)]
         ]
         
         for index in indexes:
@@ -153,36 +170,24 @@ class Repository:
             )
             return None
     
-    async def get_next_pending_context(self) -> Optional[Dict[str, Any]]:
+    async def get_next_pending_context(self, criteria: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """
-        Get the next pending context for processing.
+        Claim the next pending context for processing.
         
-        This method uses optimistic locking with Redis to prevent
-        multiple workers from processing the same context.
+        The context is leased to this worker in one atomic update, so no
+        other worker can claim it until the lease expires.
         
+        Args:
+            criteria: Additional conditions for the claimed context
+            
         Returns:
-            The next pending context, or None if no pending contexts
+            The claimed context, or None if no pending contexts
         """
         if not self.is_connected():
             logger.error("Cannot get pending context: not connected to database")
             return None
-            
-        query = {
-            "status": "pending",
-            "$or": [
-                {"retry_metadata.next_retry_at": {"$lte": datetime.utcnow().isoformat()}},
-                {"retry_metadata.next_retry_at": {"$exists": False}}
-            ]
-        }
         
-        # Sort by priority (if exists) and then by creation time
-        sort = [
-            ("metadata.priority", 1),  # Lower number = higher priority
-            ("created_at", 1)  # Oldest first
-        ]
-        
-        # Find and get a pending context
-        context = await self.contexts_collection.find_one(query, sort=sort)
+        context = await self.leases.claim_next(criteria)
         
         if not context:
             return None
@@ -190,89 +195,151 @@ class Repository:
         # Convert ObjectId to string
         context["_id"] = str(context["_id"])
         
-        # If Redis is available, try to acquire a lock
-        if self.redis and self.settings:
-            # Try to acquire a lock to prevent other workers from processing the same context
-            lock_key = f"analysis:lock:{context['_id']}"
-            worker_id = getattr(self.settings, 'worker_id', 'unknown-worker')
-            lock_expiry = getattr(self.settings, 'lock_expiry_seconds', 300)
-            
-            lock_acquired = await self.redis.set(
-                lock_key, 
-                worker_id,
-                nx=True,  # Only set if the key doesn't exist
-                ex=lock_expiry
-            )
-            
-            if not lock_acquired:
-                logger.debug(
-                    "Context is being processed by another worker", 
-                    context_id=context["_id"]
-                )
-                return None
-        
         return context
     
-    async def get_pending_contexts_batch(self, batch_size: int) -> List[Dict[str, Any]]:
+    async def get_pending_contexts_batch(
+        self,
+        batch_size: int,
+        criteria: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Get a batch of pending contexts for processing.
+        Claim a batch of pending contexts for processing.
+        
+        The batch is leased to this worker atomically in MongoDB (see
+        ContextLeases.claim_batch). Contexts whose lease expired are
+        claimable again.
         
         Args:
             batch_size: Maximum number of contexts to retrieve
+            criteria: Additional conditions for the claimed contexts
             
         Returns:
-            List of pending contexts, may be empty
+            List of claimed contexts, may be empty
         """
         if not self.is_connected():
             logger.error("Cannot get pending contexts: not connected to database")
             return []
-            
-        query = {
-            "status": "pending",
-            "$or": [
-                {"retry_metadata.next_retry_at": {"$lte": datetime.utcnow().isoformat()}},
-                {"retry_metadata.next_retry_at": {"$exists": False}}
-            ]
-        }
-        
-        # Sort by priority (if exists) and then by creation time
-        sort = [
-            ("metadata.priority", 1),  # Lower number = higher priority
-            ("created_at", 1)  # Oldest first
-        ]
         
-        contexts = []
+        contexts = await self.leases.claim_batch(batch_size, criteria)
         
-        # Find pending contexts
-        cursor = self.contexts_collection.find(query).sort(sort).limit(batch_size * 2)  # Get more than needed in case some are locked
-        
-        async for context in cursor:
-            if len(contexts) >= batch_size:
-                break
-                
+        for context in contexts:
             # Convert ObjectId to string
             context["_id"] = str(context["_id"])
+        
+        return contexts
+    
+    async def renew_leases(
+        self,
+        context_ids: List[str],
+        lease_token: Optional[str] = None,
+        lease_seconds: Optional[float] = None
+    ) -> int:
+        """
+        Extend the leases this worker holds on contexts that are still being
+        processed.
+        
+        Args:
+            context_ids: IDs of the contexts
+            lease_token: Only renew leases from this claim
+            lease_seconds: New lease duration, defaults to the configured one
             
-            # If Redis is available, try to acquire locks
-            if self.redis and self.settings:
-                # Try to acquire a lock
-                lock_key = f"analysis:lock:{context['_id']}"
-                worker_id = getattr(self.settings, 'worker_id', 'unknown-worker')
-                lock_expiry = getattr(self.settings, 'lock_expiry_seconds', 300)
-                
-                lock_acquired = await self.redis.set(
-                    lock_key, 
-                    worker_id,
-                    nx=True,
-                    ex=lock_expiry
+        Returns:
+            Number of leases renewed
+        """
+        if not self.is_connected():
+            logger.error("Cannot renew leases: not connected to database")
+            return 0
+            
+        try:
+            renewed = await self.leases.renew(
+                [ObjectId(context_id) for context_id in context_ids],
+                lease_token=lease_token,
+                lease_seconds=lease_seconds
+            )
+            
+            if renewed < len(context_ids):
+                logger.warning(
+                    "Lost leases on contexts",
+                    requested=len(context_ids),
+                    renewed=renewed
                 )
-                
-                if lock_acquired:
-                    contexts.append(context)
-            else:
-                contexts.append(context)
+            
+            return renewed
+            
+        except Exception as e:
+            logger.error(
+                "Failed to renew leases",
+                error=str(e)
+            )
+            return 0
+    
+    async def release_leases(self, context_ids: List[str]) -> int:
+        """
+        Return contexts this worker claimed but will not process to pending,
+        without waiting for their leases to expire.
         
-        return contexts
+        Args:
+            context_ids: IDs of the contexts
+            
+        Returns:
+            Number of contexts released
+        """
+        if not self.is_connected():
+            logger.error("Cannot release leases: not connected to database")
+            return 0
+            
+        try:
+            return await self.leases.release([ObjectId(context_id) for context_id in context_ids])
+            
+        except Exception as e:
+            logger.error(
+                "Failed to release leases",
+                error=str(e)
+            )
+            return 0
+    
+    async def sweep_expired_leases(self) -> int:
+        """
+        Reset contexts whose lease expired, or that are processing without
+        a lease, back to pending.
+        
+        Returns:
+            Number of contexts reset
+        """
+        if not self.is_connected():
+            logger.error("Cannot sweep leases: not connected to database")
+            return 0
+            
+        try:
+            swept = await self.leases.sweep_expired()
+            
+            if swept:
+                logger.info("Reset contexts with expired leases", count=swept)
+            
+            return swept
+            
+        except Exception as e:
+            logger.error(
+                "Failed to sweep expired leases",
+                error=str(e)
+            )
+            return 0
+    
+    def _lease_query(self, context_id: str, lease_token: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the filter for updating a context, optionally under a lease.
+        
+        Args:
+            context_id: ID of the context
+            lease_token: Token of the lease this worker must still hold
+            
+        Returns:
+            MongoDB query
+        """
+        query = {"_id": ObjectId(context_id)}
+        if lease_token:
+            query.update({"status": "processing", "lease.owner": self.worker_id, "lease.token": lease_token})
+        return query
     
     async def update_context_status(
         self, 
@@ -280,7 +347,8 @@ class Repository:
         status: str, 
         error: Optional[Dict[str, Any]] = None,
         retry_metadata: Optional[Dict[str, Any]] = None,
-        processing_metadata: Optional[Dict[str, Any]] = None
+        processing_metadata: Optional[Dict[str, Any]] = None,
+        lease_token: Optional[str] = None
     ) -> bool:
         """
         Update the status of a context.
@@ -291,6 +359,8 @@ class Repository:
             error: Optional error information
             retry_metadata: Optional retry information
             processing_metadata: Optional processing information
+            lease_token: Token of the lease the context was claimed with;
+                the update only applies while that lease is held
             
         Returns:
             True if update was successful, False otherwise
@@ -312,8 +382,12 @@ class Repository:
             if processing_metadata:
                 update["$set"]["processing_metadata"] = processing_metadata
                 
+            if status != "processing":
+                # Leases only cover contexts being processed
+                update["$unset"] = {"lease": ""}
+                
             result = await self.contexts_collection.update_one(
-                {"_id": ObjectId(context_id)},
+                self._lease_query(context_id, lease_token),
                 update
             )
             
@@ -333,7 +407,8 @@ class Repository:
         context_id: str, 
         status: str, 
         result: Dict[str, Any],
-        processing_metadata: Optional[Dict[str, Any]] = None
+        processing_metadata: Optional[Dict[str, Any]] = None,
+        lease_token: Optional[str] = None
     ) -> bool:
         """
         Update a context with processing results.
@@ -343,6 +418,10 @@ class Repository:
             status: New status (usually 'completed')
             result: Processing results
             processing_metadata: Optional processing information
+            lease_token: Token of the lease the context was claimed with;
+                results are only written while that lease is held, so a
+                worker whose lease expired and was reclaimed cannot
+                complete the context
             
         Returns:
             True if update was successful, False otherwise
@@ -360,34 +439,21 @@ class Repository:
                     "updated_at": now,
                     "result": result,
                     "completed_at": now
-                }
+                },
+                # The context is done, drop the lease
+                "$unset": {"lease": ""}
             }
             
             if processing_metadata:
                 update["$set"]["processing_metadata"] = processing_metadata
                 
             result = await self.contexts_collection.update_one(
-                {"_id": ObjectId(context_id)},
+                self._lease_query(context_id, lease_token),
                 update
             )
             
-            # Release lock if Redis is available
-            if self.redis and self.settings:
-                lock_key = f"analysis:lock:{context_id}"
-                worker_id = getattr(self.settings, 'worker_id', 'unknown-worker')
-                
-                await self.redis.eval(
-                    """
-                    if redis.call('get', KEYS[1]) == ARGV[1] then
-                        return redis.call('del', KEYS[1])
-                    else
-                        return 0
-                    end
-                    """,
-                    1,
-                    lock_key,
-                    worker_id
-                )
+            if not result.modified_count and lease_token:
+                logger.warning("Lost lease before completing context", context_id=context_id)
             
             return result.modified_count > 0
             
@@ -27,6 +27,63 @@ from database_layer.common.task_client import (
 logger = structlog.get_logger(__name__)
 
 
+def _field(document: Dict[str, Any], path: str) -> Any:
+    """Look up a dotted path in a document, None if any part is missing."""
+    for part in path.split("."):
+        if not isinstance(document, dict) or part not in document:
+            return None
+        document = document[part]
+    return document
+
+
+def matches_criteria(context: Dict[str, Any], criteria: Optional[Dict[str, Any]]) -> bool:
+    """
+    Check a context against MongoDB-style claim criteria.
+    
+    The task repository service only filters by task type, so the criteria
+    the poller claims with are applied here. Supports equality, $or/$and and
+    the $exists, $in, $lt, $lte, $gt and $gte operators on dotted paths.
+    
+    Args:
+        context: Context document
+        criteria: Query the context must match
+        
+    Returns:
+        True if the context matches
+    """
+    for key, condition in (criteria or {}).items():
+        if key == "$or":
+            if not any(matches_criteria(context, branch) for branch in condition):
+                return False
+        elif key == "$and":
+            if not all(matches_criteria(context, branch) for branch in condition):
+                return False
+        elif isinstance(condition, dict) and condition and all(op.startswith("$") for op in condition):
+            value = _field(context, key)
+            for operator, operand in condition.items():
+                if operator == "$exists":
+                    matched = (value is not None) == bool(operand)
+                elif operator == "$in":
+                    matched = value in operand
+                elif value is None:
+                    matched = False
+                elif operator == "$lt":
+                    matched = value < operand
+                elif operator == "$lte":
+                    matched = value <= operand
+                elif operator == "$gt":
+                    matched = value > operand
+                elif operator == "$gte":
+                    matched = value >= operand
+                else:
+                    raise ValueError(f"Unsupported criteria operator: {operator}")
+                if not matched:
+                    return False
+        elif _field(context, key) != condition:
+            return False
+    return True
+
+
 class TaskRepositoryAdapter:
     """
     Adapter for the Task Repository Service.
@@ -73,6 +130,35 @@ class TaskRepositoryAdapter:
         """
         return True
 
+    def _task_to_context(self, task: Dict[str, Any], status: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Convert a pending task to the context format.
+        
+        Args:
+            task: Task document
+            status: Status to report instead of the task's
+            
+        Returns:
+            Context document
+        """
+        context = {
+            "_id": task.get("task_id"),
+            "status": status or task.get("status", "pending"),
+            "template_id": task.get("task_type"),
+            "service_type": task.get("task_type"),
+            "data": task.get("request", {}).get("content", {}),
+            "metadata": task.get("metadata", {}),
+            "created_at": task.get("created_at"),
+            "updated_at": task.get("updated_at"),
+            "tags": task.get("tags", {})
+        }
+        
+        # Add batch ID if available
+        if task.get("batch_id"):
+            context["batch_id"] = task.get("batch_id")
+        
+        return context
+    
     async def get_context(self, context_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a context by ID from the task repository.
@@ -119,18 +205,24 @@ class TaskRepositoryAdapter:
             )
             return None
     
-    async def get_next_pending_context(self) -> Optional[Dict[str, Any]]:
+    async def get_next_pending_context(self, criteria: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """
         Get the next pending context for processing.
         
+        Args:
+            criteria: Additional conditions the context must meet (see
+                matches_criteria)
+        
         Returns:
             The next pending context, or None if no pending contexts
         """
         try:
-            # Get pending tasks for this service type
-            tasks = await get_pending_tasks("analysis", limit=1)
+            # Get pending tasks for this service type; with criteria, skip
+            # the tasks that do not match instead of claiming them
+            tasks = await get_pending_tasks("analysis", limit=10 if criteria else 1)
+            tasks = [task for task in tasks or [] if matches_criteria(self._task_to_context(task), criteria)]
             
-            if not tasks or len(tasks) == 0:
+            if not tasks:
                 return None
             
             task = tasks[0]
@@ -145,24 +237,8 @@ class TaskRepositoryAdapter:
                 )
                 return None
             
-            # Convert task to context format
-            context = {
-                "_id": task.get("task_id"),
-                "status": "processing",  # Mark as processing since we claimed it
-                "template_id": task.get("task_type"),
-                "service_type": task.get("task_type"),
-                "data": task.get("request", {}).get("content", {}),
-                "metadata": task.get("metadata", {}),
-                "created_at": task.get("created_at"),
-                "updated_at": task.get("updated_at"),
-                "tags": task.get("tags", {})
-            }
-            
-            # Add batch ID if available
-            if task.get("batch_id"):
-                context["batch_id"] = task.get("batch_id")
-            
-            return context
+            # Mark as processing since we claimed it
+            return self._task_to_context(task, status="processing")
             
         except Exception as e:
             logger.error(
@@ -171,12 +247,18 @@ class TaskRepositoryAdapter:
             )
             return None
     
-    async def get_pending_contexts_batch(self, batch_size: int) -> List[Dict[str, Any]]:
+    async def get_pending_contexts_batch(
+        self,
+        batch_size: int,
+        criteria: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Get a batch of pending contexts for processing.
         
         Args:
             batch_size: Maximum number of contexts to retrieve
+            criteria: Additional conditions the contexts must meet (see
+                matches_criteria)
             
         Returns:
             List of pending contexts, may be empty
@@ -192,6 +274,9 @@ class TaskRepositoryAdapter:
             
             # Convert tasks to contexts and try to claim them
             for task in tasks:
+                if not matches_criteria(self._task_to_context(task), criteria):
+                    continue
+                
                 task_id = task.get("task_id")
                 
                 # Try to claim the task
@@ -204,24 +289,8 @@ class TaskRepositoryAdapter:
                     )
                     continue
                 
-                # Convert task to context format
-                context = {
-                    "_id": task_id,
-                    "status": "processing",  # Mark as processing since we claimed it
-                    "template_id": task.get("task_type"),
-                    "service_type": task.get("task_type"),
-                    "data": task.get("request", {}).get("content", {}),
-                    "metadata": task.get("metadata", {}),
-                    "created_at": task.get("created_at"),
-                    "updated_at": task.get("updated_at"),
-                    "tags": task.get("tags", {})
-                }
-                
-                # Add batch ID if available
-                if task.get("batch_id"):
-                    context["batch_id"] = task.get("batch_id")
-                
-                contexts.append(context)
+                # Mark as processing since we claimed it
+                contexts.append(self._task_to_context(task, status="processing"))
             
             return contexts
             
@@ -238,7 +307,8 @@ class TaskRepositoryAdapter:
         status: str, 
         error: Optional[Dict[str, Any]] = None,
         retry_metadata: Optional[Dict[str, Any]] = None,
-        processing_metadata: Optional[Dict[str, Any]] = None
+        processing_metadata: Optional[Dict[str, Any]] = None,
+        lease_token: Optional[str] = None
     ) -> bool:
         """
         Update a context's status in the task repository.
@@ -249,6 +319,8 @@ class TaskRepositoryAdapter:
             error: Optional error information
             retry_metadata: Optional retry metadata
             processing_metadata: Optional processing metadata
+            lease_token: Accepted for compatibility with Repository; task
+                ownership is tracked by the task repository service
             
         Returns:
             Success status
@@ -294,7 +366,8 @@ class TaskRepositoryAdapter:
         context_id: str, 
         status: str, 
         result: Dict[str, Any],
-        processing_metadata: Optional[Dict[str, Any]] = None
+        processing_metadata: Optional[Dict[str, Any]] = None,
+        lease_token: Optional[str] = None
     ) -> bool:
         """
         Update a context's result in the task repository.
@@ -304,6 +377,8 @@ class TaskRepositoryAdapter:
             status: New context status
             result: Result data
             processing_metadata: Optional processing metadata
+            lease_token: Accepted for compatibility with Repository; task
+                ownership is tracked by the task repository service
             
         Returns:
             Success status
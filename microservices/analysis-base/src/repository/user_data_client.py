@@ -7,11 +7,13 @@ Used to validate user permissions and roles.
 
 import os
 import logging
+import time
 import structlog
 import httpx
-from typing import Dict, Any, Optional, List, Set
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Iterable, Optional, List, Set, Tuple
 import asyncio
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 # Configure structured logging
 logger = structlog.get_logger(__name__)
@@ -19,21 +21,127 @@ logger = structlog.get_logger(__name__)
 # Cache expiration time for user info (5 minutes)
 USER_CACHE_EXPIRY = timedelta(minutes=5)
 
+# Cache bound and batch settings
+USER_CACHE_SIZE = 10000
+USER_BATCH_SIZE = 100
+USER_FETCH_CONCURRENCY = 8
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after a fixed time.
+    
+    Attributes:
+        max_entries (int): Maximum number of entries, least recently used
+            entries are evicted first
+        ttl_seconds (float): Lifetime of an entry
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = USER_CACHE_SIZE,
+        ttl_seconds: float = USER_CACHE_EXPIRY.total_seconds(),
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of entries
+            ttl_seconds: Lifetime of an entry
+            clock: Monotonic time source
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.metrics = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        item = self._entries.get(key)
+        return item is not None and self.clock() - item[0] < self.ttl_seconds
+    
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Get a live entry.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Tuple of (found, value)
+        """
+        item = self._entries.get(key)
+        if item is None:
+            self.metrics["misses"] += 1
+            return False, None
+        
+        stored_at, value = item
+        if self.clock() - stored_at >= self.ttl_seconds:
+            del self._entries[key]
+            self.metrics["expirations"] += 1
+            self.metrics["misses"] += 1
+            return False, None
+        
+        self._entries.move_to_end(key)
+        self.metrics["hits"] += 1
+        return True, value
+    
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used ones if needed.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self._entries[key] = (self.clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.metrics["evictions"] += 1
+    
+    def pop(self, key: str) -> None:
+        """Drop an entry if present."""
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
 
 class UserDataClient:
     """
     Client for the User Data Service.
     
-    Provides methods to validate users, permissions, and roles.
+    Provides methods to validate users, permissions, and roles. User info is
+    cached in a bounded TTL LRU cache, users are fetched in bulk with
+    get_users, and concurrent lookups of the same user share one request.
     """
     
-    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        cache_size: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ):
         """
         Initialize the user data client.
         
         Args:
             base_url: User Data Service URL (default from environment)
             api_key: API key for authentication (default from environment)
+            cache_size: Maximum number of cached users (default from environment)
+            cache_ttl: Lifetime of cached user info in seconds (default from environment)
+            batch_size: Maximum user IDs per bulk request (default from environment)
+            max_concurrency: Maximum concurrent requests per get_users call
+                (default from environment)
         """
         self.base_url = base_url or os.environ.get(
             "USER_DATA_URL", "http://user-data-service:8502"
@@ -43,15 +151,38 @@ class UserDataClient:
         # Request timeout in seconds
         self.timeout = float(os.environ.get("USER_DATA_TIMEOUT", "5.0"))
         
+        # Bulk lookup settings
+        self.batch_size = batch_size or int(os.environ.get("USER_DATA_BATCH_SIZE", USER_BATCH_SIZE))
+        self.max_concurrency = max_concurrency or int(
+            os.environ.get("USER_DATA_MAX_CONCURRENCY", USER_FETCH_CONCURRENCY)
+        )
+        # Set to False once the service turns out not to offer bulk lookups
+        self.batch_supported = True
+        
         # Initialize user cache
-        self.user_cache: Dict[str, Dict[str, Any]] = {}
-        self.cache_timestamps: Dict[str, datetime] = {}
+        self.user_cache = TTLCache(
+            max_entries=cache_size or int(os.environ.get("USER_DATA_CACHE_SIZE", USER_CACHE_SIZE)),
+            ttl_seconds=cache_ttl or float(
+                os.environ.get("USER_DATA_CACHE_TTL", USER_CACHE_EXPIRY.total_seconds())
+            )
+        )
+        
+        # Pending lookups by user ID, shared by concurrent callers
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        self.metrics = {"requests": 0, "bulk_requests": 0, "coalesced": 0}
         
         logger.info(
             "Initialized user data client",
             base_url=self.base_url
         )
     
+    def _headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.api_key:
+            headers["x-api-key"] = self.api_key
+        return headers
+    
     async def get_user_info(self, user_id: str) -> Optional[Dict[str, Any]]:
         """
         Get user information.
@@ -63,47 +194,221 @@ class UserDataClient:
             User information or None if not found
         """
         # Check cache first
-        if user_id in self.user_cache:
-            cache_time = self.cache_timestamps.get(user_id)
-            if cache_time and datetime.now() - cache_time < USER_CACHE_EXPIRY:
-                logger.debug(
-                    "Using cached user info",
-                    user_id=user_id
-                )
-                return self.user_cache[user_id]
+        found, user_info = self.user_cache.get(user_id)
+        if found:
+            logger.debug(
+                "Using cached user info",
+                user_id=user_id
+            )
+            return user_info
+        
+        # Share a lookup that is already in flight
+        if user_id in self._inflight:
+            self.metrics["coalesced"] += 1
+            return await asyncio.shield(self._inflight[user_id])
         
         # Cache miss or expired, fetch from service
+        futures = self._register([user_id])
+        user_info = None
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
-                headers = {}
-                if self.api_key:
-                    headers["x-api-key"] = self.api_key
-                
-                response = await client.get(
-                    f"{self.base_url}/api/v1/users/{user_id}",
-                    headers=headers
+                user_info = await self._fetch_user(client, user_id)
+        finally:
+            self._resolve(futures, {user_id: user_info})
+        
+        return user_info
+    
+    async def get_users(self, user_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get information for many users.
+        
+        Cached users are served from the cache and users already being
+        looked up by another caller are awaited. The rest are fetched in
+        chunks of batch_size IDs, one bulk request per chunk, with up to
+        max_concurrency requests in flight. If the service has no bulk
+        endpoint, users are fetched one request each with the same
+        concurrency bound.
+        
+        Args:
+            user_ids: User identifiers (duplicates are looked up once)
+            
+        Returns:
+            User ID -> user information, None for users that were not found
+            or could not be fetched
+        """
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        pending: Dict[str, asyncio.Future] = {}
+        missing: List[str] = []
+        
+        for user_id in dict.fromkeys(user_ids):
+            found, user_info = self.user_cache.get(user_id)
+            if found:
+                results[user_id] = user_info
+            elif user_id in self._inflight:
+                self.metrics["coalesced"] += 1
+                pending[user_id] = self._inflight[user_id]
+            else:
+                missing.append(user_id)
+        
+        if missing:
+            futures = self._register(missing)
+            fetched: Dict[str, Optional[Dict[str, Any]]] = {}
+            try:
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    fetched = await self._fetch_users(client, missing)
+            finally:
+                self._resolve(futures, fetched)
+            results.update(fetched)
+        
+        for user_id, future in pending.items():
+            results[user_id] = await asyncio.shield(future)
+        
+        return results
+    
+    def _register(self, user_ids: List[str]) -> Dict[str, asyncio.Future]:
+        """Create the in-flight futures for lookups this caller performs."""
+        loop = asyncio.get_running_loop()
+        futures = {}
+        for user_id in user_ids:
+            futures[user_id] = self._inflight[user_id] = loop.create_future()
+        return futures
+    
+    def _resolve(self, futures: Dict[str, asyncio.Future], fetched: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """Hand results to coalesced callers and drop the in-flight entries."""
+        for user_id, future in futures.items():
+            self._inflight.pop(user_id, None)
+            if not future.done():
+                future.set_result(fetched.get(user_id))
+    
+    async def _fetch_users(
+        self, client: httpx.AsyncClient, user_ids: List[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Fetch users from the service, in bulk when supported.
+        
+        Args:
+            client: HTTP client
+            user_ids: Users missing from the cache
+            
+        Returns:
+            User ID -> user information or None
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        fetched: Dict[str, Optional[Dict[str, Any]]] = {}
+        
+        async def fetch_chunk(chunk: List[str]):
+            async with semaphore:
+                if self.batch_supported:
+                    users = await self._fetch_user_batch(client, chunk)
+                    if users is not None:
+                        fetched.update(users)
+                        return
+            # No bulk endpoint: one request per user, still bounded
+            results = await asyncio.gather(*(self._fetch_single_bounded(client, semaphore, user_id) for user_id in chunk))
+            fetched.update(zip(chunk, results))
+        
+        chunks = [user_ids[start:start + self.batch_size] for start in range(0, len(user_ids), self.batch_size)]
+        await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+        return fetched
+    
+    async def _fetch_single_bounded(
+        self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, user_id: str
+    ) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            return await self._fetch_user(client, user_id)
+    
+    async def _fetch_user_batch(
+        self, client: httpx.AsyncClient, user_ids: List[str]
+    ) -> Optional[Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Fetch a chunk of users with one bulk request.
+        
+        The service answers POST /api/v1/users/batch with {"user_ids": [...]}
+        by {"users": {user_id: user_info}}; users missing from the response
+        were not found.
+        
+        Args:
+            client: HTTP client
+            user_ids: Users to fetch
+            
+        Returns:
+            User ID -> user information or None, or None if the service has
+            no bulk endpoint
+        """
+        try:
+            self.metrics["requests"] += 1
+            self.metrics["bulk_requests"] += 1
+            response = await client.post(
+                f"{self.base_url}/api/v1/users/batch",
+                json={"user_ids": user_ids},
+                headers=self._headers()
+            )
+            
+            if response.status_code == 200:
+                users = response.json().get("users", {})
+                for user_id, user_info in users.items():
+                    self.user_cache.set(user_id, user_info)
+                return {user_id: users.get(user_id) for user_id in user_ids}
+            elif response.status_code in (404, 405):
+                logger.warning(
+                    "User data service has no bulk endpoint, fetching users one by one",
+                    status_code=response.status_code
                 )
-                
-                if response.status_code == 200:
-                    user_info = response.json()
-                    # Update cache
-                    self.user_cache[user_id] = user_info
-                    self.cache_timestamps[user_id] = datetime.now()
-                    return user_info
-                elif response.status_code == 404:
-                    logger.warning(
-                        "User not found",
-                        user_id=user_id
-                    )
-                    return None
-                else:
-                    logger.error(
-                        "Failed to get user info",
-                        user_id=user_id,
-                        status_code=response.status_code,
-                        error=response.text
-                    )
-                    return None
+                self.batch_supported = False
+                return None
+            else:
+                logger.error(
+                    "Failed to get users",
+                    count=len(user_ids),
+                    status_code=response.status_code,
+                    error=response.text
+                )
+                return {user_id: None for user_id in user_ids}
+        except Exception as e:
+            logger.error(
+                "Error contacting user data service",
+                count=len(user_ids),
+                error=str(e)
+            )
+            return {user_id: None for user_id in user_ids}
+    
+    async def _fetch_user(self, client: httpx.AsyncClient, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch one user and cache it.
+        
+        Args:
+            client: HTTP client
+            user_id: User identifier
+            
+        Returns:
+            User information or None if not found
+        """
+        try:
+            self.metrics["requests"] += 1
+            response = await client.get(
+                f"{self.base_url}/api/v1/users/{user_id}",
+                headers=self._headers()
+            )
+            
+            if response.status_code == 200:
+                user_info = response.json()
+                # Update cache
+                self.user_cache.set(user_id, user_info)
+                return user_info
+            elif response.status_code == 404:
+                logger.warning(
+                    "User not found",
+                    user_id=user_id
+                )
+                return None
+            else:
+                logger.error(
+                    "Failed to get user info",
+                    user_id=user_id,
+                    status_code=response.status_code,
+                    error=response.text
+                )
+                return None
         except Exception as e:
             logger.error(
                 "Error contacting user data service",
@@ -246,12 +551,24 @@ class UserDataClient:
             user_id: Specific user to clear from cache, or None for all
         """
         if user_id:
-            if user_id in self.user_cache:
-                del self.user_cache[user_id]
-                del self.cache_timestamps[user_id]
+            self.user_cache.pop(user_id)
         else:
             self.user_cache.clear()
-            self.cache_timestamps.clear()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get request and cache counters.
+        
+        Returns:
+            Dictionary of metrics
+        """
+        return {
+            **self.metrics,
+            **self.user_cache.metrics,
+            "cached_users": len(self.user_cache),
+            "inflight": len(self._inflight),
+            "batch_supported": self.batch_supported
+        }
 
 
 # Global user data client instance
@@ -0,0 +1,217 @@
+"""
+In-memory stand-in for a Motor collection.
+
+Supports the subset of queries and updates the repository uses for contexts
+(equality, $lt/$lte/$gt/$gte/$ne/$in/$nin/$exists, $or/$and, dotted paths, $set,
+$unset and $inc). Every call counts as one round trip and can take a simulated
+latency; an operation is applied atomically halfway through its latency, as
+if on the server.
+"""
+import asyncio
+import copy
+import itertools
+from collections import Counter
+from types import SimpleNamespace
+
+_MISSING = object()
+
+
+def get_path(document, path):
+    value = document
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def set_path(document, path, value):
+    *parents, last = path.split(".")
+    for part in parents:
+        document = document.setdefault(part, {})
+    document[last] = value
+
+
+def unset_path(document, path):
+    *parents, last = path.split(".")
+    for part in parents:
+        document = document.get(part)
+        if not isinstance(document, dict):
+            return
+    document.pop(last, None)
+
+
+def _compare(value, operator, operand):
+    if operator == "$exists":
+        return (value is not _MISSING) == bool(operand)
+    if operator == "$in":
+        return value in operand
+    if operator == "$nin":
+        return value not in operand
+    if operator == "$ne":
+        return value != operand
+    if value is _MISSING or value is None:
+        return False
+    if operator == "$lt":
+        return value < operand
+    if operator == "$lte":
+        return value <= operand
+    if operator == "$gt":
+        return value > operand
+    if operator == "$gte":
+        return value >= operand
+    raise ValueError(f"Unsupported operator: {operator}")
+
+
+def matches(document, query):
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(document, branch) for branch in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(document, branch) for branch in condition):
+                return False
+        else:
+            value = get_path(document, key)
+            if isinstance(condition, dict) and condition and all(op.startswith("$") for op in condition):
+                if not all(_compare(value, op, operand) for op, operand in condition.items()):
+                    return False
+            elif value != condition:
+                return False
+    return True
+
+
+def _sort_key(value):
+    # Missing and null sort first, then numbers, then strings
+    if value is _MISSING or value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    return (2, str(value))
+
+
+def apply_update(document, update):
+    for path, value in update.get("$set", {}).items():
+        set_path(document, path, copy.deepcopy(value))
+    for path in update.get("$unset", {}):
+        unset_path(document, path)
+    for path, amount in update.get("$inc", {}).items():
+        current = get_path(document, path)
+        set_path(document, path, (0 if current is _MISSING else current) + amount)
+
+
+class InMemoryCursor:
+    """Cursor over the documents matching a query."""
+
+    def __init__(self, collection, query, projection):
+        self.collection = collection
+        self.query = query
+        self.projection = projection
+        self._sort = []
+        self._limit = 0
+
+    def sort(self, keys):
+        self._sort = list(keys)
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def _select(self):
+        documents = [doc for doc in self.collection.documents.values() if matches(doc, self.query)]
+        for path, direction in reversed(self._sort):
+            documents.sort(key=lambda doc: _sort_key(get_path(doc, path)), reverse=direction < 0)
+        if self._limit:
+            documents = documents[:self._limit]
+        if self.projection:
+            return [{"_id": doc["_id"]} for doc in documents]
+        return [copy.deepcopy(doc) for doc in documents]
+
+    async def to_list(self, length=None):
+        documents = await self.collection.call(self._select)
+        return documents[:length] if length else documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in await self.to_list():
+            yield document
+
+
+class InMemoryCollection:
+    """
+    Async collection over a dict of documents.
+
+    Attributes:
+        documents (dict): _id -> document
+        round_trips (int): Calls made against the collection
+        task_round_trips (Counter): Calls made per asyncio task
+        latency (float): Simulated seconds per call
+    """
+
+    def __init__(self, documents=(), latency=0.0):
+        self.documents = {}
+        self.round_trips = 0
+        self.task_round_trips = Counter()
+        self.latency = latency
+        self._ids = itertools.count(1)
+        for document in documents:
+            document = copy.deepcopy(document)
+            document.setdefault("_id", next(self._ids))
+            self.documents[document["_id"]] = document
+
+    async def call(self, operation):
+        self.round_trips += 1
+        self.task_round_trips[asyncio.current_task()] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency / 2)
+        result = operation()
+        if self.latency:
+            await asyncio.sleep(self.latency / 2)
+        return result
+
+    def find(self, query=None, projection=None):
+        return InMemoryCursor(self, query or {}, projection)
+
+    async def find_one(self, query=None, sort=None):
+        cursor = self.find(query).limit(1)
+        if sort:
+            cursor.sort(sort)
+        documents = await cursor.to_list()
+        return documents[0] if documents else None
+
+    async def find_one_and_update(self, query, update, sort=None):
+        def operation():
+            cursor = InMemoryCursor(self, query, None).sort(sort or []).limit(1)
+            selected = cursor._select()
+            if not selected:
+                return None
+            apply_update(self.documents[selected[0]["_id"]], update)
+            return selected[0]
+        return await self.call(operation)
+
+    async def update_many(self, query, update):
+        def operation():
+            selected = [doc for doc in self.documents.values() if matches(doc, query)]
+            for document in selected:
+                apply_update(document, update)
+            return SimpleNamespace(matched_count=len(selected), modified_count=len(selected))
+        return await self.call(operation)
+
+    async def update_one(self, query, update):
+        def operation():
+            if isinstance(query.get("_id"), (int, str)):
+                candidates = [self.documents[query["_id"]]] if query["_id"] in self.documents else []
+            else:
+                candidates = self.documents.values()
+            for document in candidates:
+                if matches(document, query):
+                    apply_update(document, update)
+                    return SimpleNamespace(matched_count=1, modified_count=1)
+            return SimpleNamespace(matched_count=0, modified_count=0)
+        return await self.call(operation)
+
+    async def create_index(self, keys, **kwargs):
+        return await self.call(lambda: None)
@@ -0,0 +1,166 @@
+"""
+Tests for the columnar store behind DataStorage.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_storage.columnar_store import ColumnarStore, partition_date, partition_value, records_to_table
+from src.data_storage.data_storage import DataStorage
+
+
+def make_rows(count, offset=0):
+    return [{"id": offset + i, "score": (offset + i) / 10, "segment": "ab"[i % 2]} for i in range(count)]
+
+
+class TestColumnarStore(unittest.TestCase):
+    """Test cases for ColumnarStore."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ColumnarStore(self.directory.name, row_group_size=100)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_appends_are_partitioned_and_never_rewritten(self):
+        """Test hive partitions and one new file per append."""
+        first = self.store.append("results", make_rows(10), tenant_id="acme", day="2024-03-01T10:00:00Z")
+        second = self.store.append("results", make_rows(5, 10), tenant_id="acme", day=date(2024, 3, 1))
+        self.store.append("results", make_rows(3), tenant_id="globex", day="2024-03-02")
+
+        self.assertNotEqual(first["path"], second["path"])
+        self.assertEqual(os.path.dirname(first["path"]), os.path.dirname(second["path"]))
+        self.assertIn(os.path.join("tenant_id=acme", "partition_date=2024-03-01"), first["path"])
+        files = [name for _, _, names in os.walk(self.directory.name) for name in names]
+        self.assertEqual(len(files), 3)
+        self.assertFalse(any(name.startswith(".") for name in files))
+
+        acme = self.store.scan("results", tenant_id="acme")
+        self.assertEqual(sorted(acme.column("id").to_pylist()), list(range(15)))
+        self.assertEqual(set(acme.column("partition_date").to_pylist()), {"2024-03-01"})
+        self.assertEqual(self.store.scan("results").num_rows, 18)
+
+    def test_filters_columns_and_date_ranges(self):
+        """Test predicate pushdown in both filter forms and column projection."""
+        for day in ("2024-03-01", "2024-03-02", "2024-03-03"):
+            self.store.append("results", make_rows(300), tenant_id="acme", day=day)
+
+        table = self.store.scan("results", start_date="2024-03-02", end_date="2024-03-02",
+                                filters=[("id", ">=", 250), ("segment", "==", "a")], columns=["id", "score"])
+        self.assertEqual(table.column_names, ["id", "score"])
+        self.assertEqual(table.column("id").to_pylist(), list(range(250, 300, 2)))
+
+        expression = ds.field("score") > 29.85
+        self.assertEqual(self.store.scan("results", filters=expression).num_rows, 3)
+        self.assertEqual(self.store.scan("results", tenant_id="missing").num_rows, 0)
+        self.assertEqual(self.store.scan("unknown").num_rows, 0)
+
+    def test_schema_evolution_across_appends(self):
+        """Test reading files with added columns and int/float promotion."""
+        self.store.append("results", [{"id": 1, "value": 3}], tenant_id="acme", day="2024-03-01")
+        self.store.append("results", [{"id": 2, "value": 2.5, "label": "x"}], tenant_id="acme", day="2024-03-01")
+        records = sorted(self.store.read_records("results", columns=["id", "value", "label"]), key=lambda r: r["id"])
+        self.assertEqual(records, [{"id": 1, "value": 3.0, "label": None}, {"id": 2, "value": 2.5, "label": "x"}])
+
+    def test_conflicting_column_types_across_appends(self):
+        """Test appending int, then str values to a column and scanning it."""
+        self.store.append("results", [{"a": 1}], tenant_id="acme", day="2024-03-01")
+        self.store.append("results", [{"a": "two"}], tenant_id="acme", day="2024-03-02")
+        table = self.store.scan("results", columns=["a"])
+        self.assertEqual(table.schema.field("a").type, pa.string())
+        self.assertEqual(sorted(table.column("a").to_pylist()), ["1", "two"])
+
+    def test_conflicting_appends_are_stored_as_strings(self):
+        """Test strings kept as strings in an int column, other conflicts stringified."""
+        self.store.append("results", [{"a": 1, "flag": "yes"}], tenant_id="acme", day="2024-03-01")
+        self.store.append("results", [{"a": "5", "flag": True}], tenant_id="acme", day="2024-03-01")
+        table = self.store.scan("results", columns=["a", "flag"])
+        self.assertEqual(table.schema.field("a").type, pa.string())
+        self.assertEqual(sorted(table.column("a").to_pylist()), ["1", "5"])
+        self.assertEqual(sorted(table.column("flag").to_pylist()), ["true", "yes"])
+
+    def test_leading_zeros_survive_an_int_column(self):
+        """Test that a zero-padded string appended to an int column is not parsed."""
+        self.store.append("results", [{"zip": 2139}], tenant_id="acme", day="2024-03-01")
+        self.store.append("results", [{"zip": "02139"}], tenant_id="acme", day="2024-03-01")
+        table = self.store.scan("results", columns=["zip"])
+        self.assertEqual(table.schema.field("zip").type, pa.string())
+        self.assertEqual(sorted(table.column("zip").to_pylist()), ["02139", "2139"])
+
+    def test_scan_unifies_only_pruned_partitions(self):
+        """Test a tenant scan keeps its types despite another tenant's files."""
+        self.store.append("results", [{"a": 1}], tenant_id="acme", day="2024-03-01")
+        other = ColumnarStore(self.directory.name)
+        other.append("results", [{"a": "x"}], tenant_id="globex", day="2024-03-01")
+        table = self.store.scan("results", tenant_id="acme", columns=["a"])
+        self.assertEqual(table.schema.field("a").type, pa.int64())
+        self.assertEqual(table.column("a").to_pylist(), [1])
+        self.assertEqual(sorted(self.store.scan("results", columns=["a"]).column("a").to_pylist()), ["1", "x"])
+
+    def test_arrow_format_round_trip(self):
+        """Test memory-mapped Arrow IPC files."""
+        store = ColumnarStore(os.path.join(self.directory.name, "ipc"), file_format="arrow")
+        store.append("results", pa.table({"id": [1, 2, 3], "tenant_id": ["x"] * 3}), tenant_id="acme",
+                     day="2024-03-01")
+        table = store.scan("results", filters=[("id", ">", 1)])
+        self.assertEqual(table.column("id").to_pylist(), [2, 3])
+        self.assertEqual(table.column("tenant_id").to_pylist(), ["acme", "acme"])
+
+    def test_record_conversion(self):
+        """Test column typing of nested and mixed values and partition names."""
+        table = records_to_table([{"a": {"x": 1}, "b": 1, "c": "s"}, {"a": None, "b": "two", "d": True}])
+        self.assertEqual(table.column("a").to_pylist(), ['{"x": 1}', None])
+        self.assertEqual(table.column("b").to_pylist(), ["1", "two"])
+        self.assertEqual(table.column_names, ["a", "b", "c", "d"])
+        self.assertEqual(partition_value("../acme corp"), ".._acme_corp")
+        self.assertEqual(partition_value(".."), "default")
+        self.assertEqual(partition_date("2024-03-01T23:30:00+00:00"), "2024-03-01")
+
+
+class TestDataStorageColumnar(unittest.TestCase):
+    """Test cases for the columnar destination of DataStorage."""
+
+    def test_store_and_retrieve(self):
+        """Test storing processed data and reading it back by tenant."""
+        with tempfile.TemporaryDirectory() as directory:
+            storage = DataStorage(columnar_path=directory)
+            data = {
+                "tenant_id": "acme",
+                "template_id": "churn",
+                "timestamp": "2024-03-01T12:00:00",
+                "results": [{"user": "u1", "score": 0.4}, {"user": "u2", "score": 0.9, "tags": ["vip"]}],
+                "factors": [{"name": "score", "value": 0.5}],
+            }
+
+            async def run():
+                metadata = await storage.store_processed_data(data, store_in="columnar")
+                results = await storage.retrieve_columnar(
+                    "results", tenant_id="acme", filters=[("score", ">", 0.5)]
+                )
+                artifacts = await storage.retrieve_columnar("artifacts", tenant_id="acme", as_arrow=True)
+                return metadata, results, artifacts
+
+            metadata, results, artifacts = asyncio.run(run())
+
+        self.assertEqual(metadata["storage_type"], "columnar")
+        self.assertEqual(metadata["rows"], 2)
+        self.assertEqual(metadata["partition_date"], "2024-03-01")
+        self.assertEqual(results["row_count"], 1)
+        row = results["results"][0]
+        self.assertEqual((row["user"], row["tags"], row["storage_id"]), ("u2", '["vip"]', metadata["storage_id"]))
+        self.assertEqual(artifacts["results"].column("result_count").to_pylist(), [2])
+        self.assertIn('"factors"', artifacts["results"].column("payload")[0].as_py())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,238 @@
+"""
+Tests for lease-based claiming of contexts.
+"""
+import asyncio
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.repository.context_leases import ContextLeases
+from tests.mongo_fakes import InMemoryCollection
+
+try:
+    from bson import ObjectId
+    from src.repository.repository import Repository
+    HAS_REPOSITORY = True
+except ImportError:
+    HAS_REPOSITORY = False
+
+try:
+    from src.repository.task_repository_adapter import TaskRepositoryAdapter
+    import src.repository.task_repository_adapter as task_repository_adapter
+    HAS_ADAPTER = True
+except ImportError:
+    HAS_ADAPTER = False
+
+
+def make_contexts(count, **fields):
+    return [
+        {"_id": i, "status": "pending", "created_at": f"2024-01-01T00:00:{i:02d}", **fields}
+        for i in range(count)
+    ]
+
+
+def iso(seconds):
+    return (datetime.utcnow() + timedelta(seconds=seconds)).isoformat()
+
+
+class TestContextLeases(unittest.TestCase):
+    """Test cases for ContextLeases against an in-memory collection."""
+
+    def test_claim_batch_in_priority_order(self):
+        """Test that a batch is claimed in priority and creation order."""
+        contexts = make_contexts(6)
+        contexts[4]["metadata"] = {"priority": 0}
+        contexts[5]["retry_metadata"] = {"next_retry_at": iso(60)}
+        collection = InMemoryCollection(contexts)
+        leases = ContextLeases(collection, owner="worker-1", lease_seconds=30)
+
+        claimed = asyncio.run(leases.claim_batch(3))
+
+        # Contexts without a priority sort first, as in MongoDB
+        self.assertEqual([context["_id"] for context in claimed], [0, 1, 2])
+        self.assertEqual(collection.round_trips, 3)
+        for context in claimed:
+            self.assertEqual(context["status"], "processing")
+            self.assertEqual(context["lease"]["owner"], "worker-1")
+            self.assertEqual(collection.documents[context["_id"]]["lease"], context["lease"])
+
+        # The context scheduled for a later retry is not claimable yet
+        remaining = asyncio.run(leases.claim_batch(10))
+        self.assertEqual([context["_id"] for context in remaining], [3, 4])
+
+    def test_concurrent_workers_never_share_contexts(self):
+        """Test that concurrent claims partition the contexts."""
+        collection = InMemoryCollection(make_contexts(50), latency=0.001)
+        workers = [ContextLeases(collection, owner=f"worker-{i}") for i in range(8)]
+
+        async def drain(leases):
+            claimed = []
+            while True:
+                batch = await leases.claim_batch(4)
+                if not batch:
+                    return claimed
+                claimed.extend(context["_id"] for context in batch)
+
+        async def run():
+            return await asyncio.gather(*(drain(leases) for leases in workers))
+
+        claimed = [context_id for batch in asyncio.run(run()) for context_id in batch]
+        self.assertEqual(sorted(claimed), list(range(50)))
+
+    def test_expired_leases_are_reclaimed(self):
+        """Test that a context with an expired lease can be claimed again."""
+        collection = InMemoryCollection(make_contexts(2))
+        first = ContextLeases(collection, owner="worker-1", lease_seconds=-1)
+        second = ContextLeases(collection, owner="worker-2")
+
+        self.assertEqual(len(asyncio.run(first.claim_batch(2))), 2)
+        reclaimed = asyncio.run(second.claim_next())
+        self.assertEqual(reclaimed["_id"], 0)
+        self.assertEqual(reclaimed["lease"]["owner"], "worker-2")
+
+        # The first worker can only renew the lease it still holds
+        self.assertEqual(asyncio.run(first.renew([0, 1])), 1)
+        self.assertEqual(collection.documents[0]["lease"]["owner"], "worker-2")
+
+    def test_renew_extends_own_leases(self):
+        """Test renewing leases by owner and token."""
+        collection = InMemoryCollection(make_contexts(3))
+        leases = ContextLeases(collection, owner="worker-1", lease_seconds=10)
+        claimed = asyncio.run(leases.claim_batch(2))
+        token = claimed[0]["lease"]["token"]
+        before = collection.documents[0]["lease"]["expires_at"]
+
+        self.assertEqual(asyncio.run(leases.renew([0, 1], lease_token=token, lease_seconds=600)), 2)
+        self.assertGreater(collection.documents[0]["lease"]["expires_at"], before)
+        self.assertEqual(asyncio.run(leases.renew([0, 1], lease_token="other")), 0)
+        self.assertEqual(asyncio.run(ContextLeases(collection, owner="worker-2").renew([0, 1])), 0)
+
+    def test_sweep_and_release(self):
+        """Test resetting expired and released leases to pending."""
+        collection = InMemoryCollection(make_contexts(4))
+        expired = ContextLeases(collection, owner="worker-1", lease_seconds=-1)
+        active = ContextLeases(collection, owner="worker-2")
+        asyncio.run(active.claim_batch(2))
+        asyncio.run(expired.claim_batch(2))
+
+        self.assertEqual(asyncio.run(active.sweep_expired()), 2)
+        self.assertEqual(asyncio.run(expired.release([0])), 0)
+        self.assertEqual(asyncio.run(active.release([0])), 1)
+
+        statuses = {context_id: doc["status"] for context_id, doc in collection.documents.items()}
+        self.assertEqual(statuses, {0: "pending", 1: "processing", 2: "pending", 3: "pending"})
+        self.assertNotIn("lease", collection.documents[0])
+        self.assertNotIn("lease", collection.documents[2])
+
+    def test_sweep_resets_contexts_without_lease(self):
+        """Test that contexts left processing by Redis-locking workers are swept."""
+        collection = InMemoryCollection(make_contexts(3))
+        collection.documents[0]["status"] = "processing"
+        leases = ContextLeases(collection, owner="worker-1")
+        asyncio.run(leases.claim_batch(1, criteria={"_id": 1}))
+
+        self.assertEqual(asyncio.run(leases.sweep_expired()), 1)
+        statuses = {context_id: doc["status"] for context_id, doc in collection.documents.items()}
+        self.assertEqual(statuses, {0: "pending", 1: "processing", 2: "pending"})
+
+    def test_nothing_to_claim(self):
+        """Test claiming from an empty queue."""
+        collection = InMemoryCollection(make_contexts(1, status="completed"))
+        leases = ContextLeases(collection, owner="worker-1")
+        self.assertEqual(asyncio.run(leases.claim_batch(5)), [])
+        self.assertIsNone(asyncio.run(leases.claim_next()))
+        self.assertEqual(collection.round_trips, 2)
+
+
+@unittest.skipUnless(HAS_REPOSITORY, "motor is required")
+class TestRepositoryLeases(unittest.TestCase):
+    """Test cases for completing leased contexts through the Repository."""
+
+    def setUp(self):
+        self.ids = [ObjectId() for _ in range(2)]
+        self.collection = InMemoryCollection(
+            [dict(context, _id=self.ids[i]) for i, context in enumerate(make_contexts(2))]
+        )
+        self.first = self.make_repository("worker-1", lease_seconds=-1)
+        self.second = self.make_repository("worker-2")
+
+    def make_repository(self, worker_id, lease_seconds=300):
+        repository = Repository("mongodb://unused", "test", settings=SimpleNamespace(
+            worker_id=worker_id, lease_seconds=lease_seconds
+        ))
+        repository.client = repository.db = object()
+        repository.contexts_collection = self.collection
+        repository.leases = ContextLeases(self.collection, owner=worker_id, lease_seconds=lease_seconds)
+        return repository
+
+    def test_completion_requires_the_lease(self):
+        """Test that a worker whose lease was reclaimed cannot complete the context."""
+        stale = asyncio.run(self.first.get_next_pending_context())
+        reclaimed = asyncio.run(self.second.get_next_pending_context())
+        self.assertEqual(stale["_id"], reclaimed["_id"])
+
+        async def complete(repository, context, result):
+            return await repository.update_context_result(
+                context["_id"], "completed", result, lease_token=context["lease"]["token"]
+            )
+
+        self.assertFalse(asyncio.run(complete(self.first, stale, {"by": "worker-1"})))
+        self.assertFalse(asyncio.run(self.first.update_context_status(
+            stale["_id"], "failed", lease_token=stale["lease"]["token"]
+        )))
+        document = self.collection.documents[ObjectId(stale["_id"])]
+        self.assertEqual(document["status"], "processing")
+
+        self.assertTrue(asyncio.run(complete(self.second, reclaimed, {"by": "worker-2"})))
+        self.assertEqual((document["status"], document["result"]), ("completed", {"by": "worker-2"}))
+        self.assertNotIn("lease", document)
+
+
+@unittest.skipUnless(HAS_ADAPTER, "the task client is required")
+class TestTaskRepositoryAdapterCriteria(unittest.TestCase):
+    """Test cases for claim criteria in the TaskRepositoryAdapter."""
+
+    def test_only_matching_tasks_are_claimed(self):
+        """Test that tasks outside the criteria are skipped, not claimed."""
+        tasks = [
+            {"task_id": "a", "task_type": "analysis"},
+            {"task_id": "b", "task_type": "reporting"},
+            {"task_id": "c", "task_type": "analysis", "metadata": {"priority": 1}}
+        ]
+        claimed = []
+
+        async def get_pending_tasks(task_type, limit):
+            return tasks[:limit]
+
+        async def claim_task(task_id):
+            claimed.append(task_id)
+            return True
+
+        originals = task_repository_adapter.get_pending_tasks, task_repository_adapter.claim_task
+        task_repository_adapter.get_pending_tasks, task_repository_adapter.claim_task = get_pending_tasks, claim_task
+        self.addCleanup(setattr, task_repository_adapter, "get_pending_tasks", originals[0])
+        self.addCleanup(setattr, task_repository_adapter, "claim_task", originals[1])
+
+        adapter = TaskRepositoryAdapter()
+        criteria = {
+            "service_type": "analysis",
+            "$or": [
+                {"retry_metadata.retry_count": {"$lt": 3}},
+                {"retry_metadata.retry_count": {"$exists": False}}
+            ]
+        }
+        batch = asyncio.run(adapter.get_pending_contexts_batch(3, criteria=criteria))
+        self.assertEqual([context["_id"] for context in batch], ["a", "c"])
+
+        next_context = asyncio.run(adapter.get_next_pending_context(criteria={"metadata.priority": 1}))
+        self.assertEqual(next_context["_id"], "c")
+        self.assertEqual(claimed, ["a", "c", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
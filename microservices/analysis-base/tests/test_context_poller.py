@@ -0,0 +1,245 @@
+"""
+Tests for the prefetching context poller.
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+import unittest
+from types import SimpleNamespace
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.processing.context_poller import ContextPoller
+from src.processing.context_prefetcher import ContextPrefetcher
+from src.repository.context_leases import ContextLeases
+from tests.mongo_fakes import InMemoryCollection
+
+
+class InMemoryRepository:
+    """Repository stand-in claiming through ContextLeases on an in-memory collection."""
+
+    def __init__(self, contexts=(), latency=0.0, lease_seconds=300):
+        self.collection = InMemoryCollection(contexts, latency=latency)
+        self.leases = ContextLeases(self.collection, owner="worker-1", lease_seconds=lease_seconds)
+        self.renewals = []
+
+    def add(self, *contexts):
+        for context in contexts:
+            self.collection.documents[context["_id"]] = dict(context)
+
+    async def get_next_pending_context(self, criteria=None):
+        return await self.leases.claim_next(criteria)
+
+    async def get_pending_contexts_batch(self, batch_size, criteria=None):
+        return await self.leases.claim_batch(batch_size, criteria)
+
+    async def renew_leases(self, context_ids, lease_token=None, lease_seconds=None):
+        self.renewals.append(list(context_ids))
+        return await self.leases.renew(context_ids, lease_token=lease_token, lease_seconds=lease_seconds)
+
+    async def release_leases(self, context_ids):
+        return await self.leases.release(context_ids)
+
+
+def make_contexts(count, start=0, template_id="t1"):
+    return [
+        {
+            "_id": i,
+            "status": "pending",
+            "service_type": "analysis",
+            "template_id": template_id,
+            "created_at": f"2024-01-01T00:00:00.{i:06d}",
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def make_settings(**overrides):
+    settings = {
+        "service_type": "analysis",
+        "max_processing_attempts": 3,
+        "retry_delay": 60,
+        "poll_interval": 0.05,
+        "min_poll_interval": 0.005,
+        "prefetch_capacity": 10,
+        "poll_jitter": 0.0,
+    }
+    settings.update(overrides)
+    return SimpleNamespace(**settings)
+
+
+class TestContextPoller(unittest.TestCase):
+    """Test cases for ContextPoller with prefetching."""
+
+    def test_prefetched_contexts_are_consumed_once(self):
+        """Test draining the queue through the bounded prefetch buffer."""
+        repository = InMemoryRepository(make_contexts(35), latency=0.002)
+
+        async def run():
+            poller = ContextPoller(repository, make_settings())
+            await poller.start()
+            taken, depths = [], []
+            while len(taken) < 35:
+                context = await poller.get_next_context(timeout=1)
+                self.assertIsNotNone(context)
+                taken.append(context["_id"])
+                depths.append(poller.get_metrics()["queue_depth"])
+            leftover = await poller.stop()
+            return taken, depths, leftover, poller.get_metrics()
+
+        taken, depths, leftover, metrics = asyncio.run(run())
+        self.assertEqual(taken, list(range(35)))
+        self.assertEqual(leftover, [])
+        self.assertLessEqual(max(depths), 10)
+        self.assertEqual(metrics["contexts_fetched"], 35)
+        self.assertGreater(metrics["fill_rate"], 0)
+        for context in repository.collection.documents.values():
+            self.assertEqual(context["status"], "processing")
+            self.assertEqual(context["lease"]["owner"], "worker-1")
+
+    def test_empty_polls_back_off(self):
+        """Test exponential backoff up to the poll interval."""
+        repository = InMemoryRepository()
+
+        async def run():
+            poller = ContextPoller(repository, make_settings(poll_interval=0.08))
+            await poller.start()
+            await asyncio.sleep(0.4)
+            await poller.stop()
+            return poller.get_metrics()
+
+        metrics = asyncio.run(run())
+        # 10, 20, 40, 80, 80 ms... instead of one poll every 5 ms
+        self.assertLess(metrics["polls"], 10)
+        self.assertEqual(metrics["empty_polls"], metrics["polls"])
+        self.assertEqual(metrics["hit_rate"], 0.0)
+        self.assertEqual(metrics["poll_interval"], 0.08)
+
+    def test_jitter_spreads_waits(self):
+        """Test that waits are spread around the backoff interval."""
+        prefetcher = ContextPrefetcher(InMemoryRepository().get_pending_contexts_batch, jitter=0.5,
+                                       rng=random.Random(0))
+        delays = [prefetcher._jittered(1.0) for _ in range(50)]
+        self.assertTrue(all(0.5 <= delay <= 1.5 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_wake_hook_cuts_backoff_short(self):
+        """Test that a wake-up from the hook triggers an immediate poll."""
+        repository = InMemoryRepository()
+
+        async def run():
+            changes = asyncio.Queue()
+            poller = ContextPoller(repository, make_settings(poll_interval=30), wake=changes.get)
+            await poller.start()
+            # Let the poller back off on the empty queue
+            await asyncio.sleep(0.1)
+
+            repository.add(*make_contexts(3))
+            started = time.monotonic()
+            await changes.put("insert")
+            batch = await poller.get_batch_contexts(batch_size=3, wait_time=1)
+            elapsed = time.monotonic() - started
+            await poller.stop()
+            return batch, elapsed, poller.get_metrics()
+
+        batch, elapsed, metrics = asyncio.run(run())
+        self.assertEqual([context["_id"] for context in batch], [0, 1, 2])
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(metrics["wakeups"], 1)
+
+    def test_failing_wake_hook_falls_back_to_polling(self):
+        """Test that polling continues when the wake-up hook fails."""
+        repository = InMemoryRepository()
+
+        async def broken_stream():
+            raise ConnectionError("change streams need a replica set")
+
+        async def run():
+            poller = ContextPoller(repository, make_settings(), wake=broken_stream)
+            await poller.start()
+            repository.add(*make_contexts(2))
+            context = await poller.get_next_context(timeout=1)
+            await poller.stop()
+            return context
+
+        self.assertEqual(asyncio.run(run())["_id"], 0)
+
+    def test_batches_group_by_template(self):
+        """Test that prefetched batches hold one template and keep the rest buffered."""
+        contexts = make_contexts(2, template_id="t1") + make_contexts(2, start=2, template_id="t2")
+        contexts += make_contexts(2, start=4, template_id="t1")
+        repository = InMemoryRepository(contexts)
+
+        async def run():
+            poller = ContextPoller(repository, make_settings())
+            await poller.start()
+            first = await poller.get_batch_contexts(batch_size=5, wait_time=0.2)
+            second = await poller.get_batch_contexts(batch_size=5, wait_time=0.2)
+            await poller.stop()
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertEqual([context["_id"] for context in first], [0, 1, 4, 5])
+        self.assertEqual([context["_id"] for context in second], [2, 3])
+
+    def test_stop_releases_unconsumed_contexts(self):
+        """Test that buffered contexts are handed back and released on stop."""
+        repository = InMemoryRepository(make_contexts(4))
+
+        async def run():
+            poller = ContextPoller(repository, make_settings())
+            await poller.start()
+            await poller.get_next_context(timeout=1)
+            return await poller.stop()
+
+        self.assertEqual([context["_id"] for context in asyncio.run(run())], [1, 2, 3])
+        documents = repository.collection.documents
+        self.assertEqual(documents[0]["status"], "processing")
+        for context_id in (1, 2, 3):
+            self.assertEqual(documents[context_id]["status"], "pending")
+            self.assertNotIn("lease", documents[context_id])
+
+    def test_buffered_leases_are_renewed(self):
+        """Test that leases on buffered contexts outlive their initial duration."""
+        repository = InMemoryRepository(make_contexts(3), lease_seconds=0.1)
+
+        async def run():
+            poller = ContextPoller(repository, make_settings(lease_seconds=0.1))
+            await poller.start()
+            await asyncio.sleep(0.3)
+            # Another worker would take over expired leases
+            other = ContextLeases(repository.collection, owner="worker-2")
+            stolen = await other.claim_batch(10)
+            taken = await poller.get_batch_contexts(batch_size=3, wait_time=0.1)
+            await poller.stop()
+            return stolen, taken
+
+        stolen, taken = asyncio.run(run())
+        self.assertEqual(stolen, [])
+        self.assertEqual([context["_id"] for context in taken], [0, 1, 2])
+        self.assertTrue(repository.renewals)
+
+    def test_claims_skip_other_services_and_exhausted_retries(self):
+        """Test the service type and retry limit conditions of claims."""
+        contexts = make_contexts(3)
+        contexts[0]["service_type"] = "reporting"
+        contexts[1]["retry_metadata"] = {"retry_count": 3}
+        repository = InMemoryRepository(contexts)
+        poller = ContextPoller(repository, make_settings())
+        self.assertEqual(asyncio.run(poller.get_next_context())["_id"], 2)
+        self.assertIsNone(asyncio.run(poller.get_next_context()))
+
+    def test_polls_directly_without_prefetching(self):
+        """Test the direct poll path when prefetching is not started."""
+        repository = InMemoryRepository(make_contexts(2))
+        poller = ContextPoller(repository, make_settings())
+        context = asyncio.run(poller.get_next_context())
+        self.assertEqual(context["_id"], 0)
+        self.assertEqual(repository.collection.round_trips, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Tests for the vectorized diagnostic engine.
+"""
+import os
+import random
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.modules.diagnostic_module.helpers.diagnostic_engine import (
+    DiagnosticEngine,
+    OneHotEncoding,
+    indicator_correlations,
+)
+
+
+def make_frame(seed=7, rows=500):
+    rng = random.Random(seed)
+    records = []
+    for i in range(rows):
+        batch = f"b{rng.randrange(6)}"
+        records.append({
+            "id": i,
+            "batch_id": batch if rng.random() > 0.02 else None,
+            "channel": rng.choice(["email", "sms", "push", None]),
+            "tier": rng.randrange(3),
+            "engagement": rng.gauss(10, 2) + (40 if batch == "b2" else 0) if rng.random() > 0.05 else None,
+            "conversion": rng.random() * (2 if batch == "b4" else 1),
+        })
+    return pd.DataFrame(records)
+
+
+class TestDiagnosticEngine(unittest.TestCase):
+    """Test cases for DiagnosticEngine against per-value masking."""
+
+    def setUp(self):
+        self.df = make_frame()
+        self.metrics = ["engagement", "conversion"]
+        self.engine = DiagnosticEngine(self.df, self.metrics)
+
+    def test_deviations_match_masked_means(self):
+        """Test group deviations against a boolean mask per value."""
+        expected = {}
+        for metric in self.metrics:
+            overall = self.df[metric].mean()
+            for value in self.df["batch_id"].dropna().unique():
+                group = self.df[self.df["batch_id"] == value]
+                diff = (group[metric].mean() - overall) / overall * 100
+                if abs(diff) >= 10:
+                    expected[(value, metric)] = (diff, len(group))
+
+        deviations = self.engine.deviations("batch_id", threshold=10)
+        actual = {
+            (row["value"], row["metric"]): (row["percent_diff"], row["sample_size"])
+            for row in deviations.to_dict("records")
+        }
+        self.assertEqual(set(expected), set(actual))
+        for key, (diff, size) in expected.items():
+            self.assertAlmostEqual(actual[key][0], diff, places=9)
+            self.assertEqual(actual[key][1], size)
+
+    def test_zscore_anomalies_match_masked_means(self):
+        """Test z-score anomalies against a boolean mask per value."""
+        expected = set()
+        for metric in self.metrics:
+            mean, std = self.df[metric].mean(), self.df[metric].std()
+            for value in self.df["batch_id"].dropna().unique():
+                group = self.df[self.df["batch_id"] == value]
+                if len(group) >= 5 and abs(group[metric].mean() - mean) / std > 2.0:
+                    expected.add((value, metric))
+
+        anomalies = self.engine.anomalies("batch_id")
+        self.assertEqual(set(zip(anomalies["value"], anomalies["metric"])), expected)
+        self.assertIn(("b2", "engagement"), expected)
+
+    def test_robust_anomalies(self):
+        """Test robust z-score and IQR anomalies."""
+        df = pd.DataFrame({
+            "group": ["a"] * 5 + ["b"] * 5 + ["c"] * 5 + ["d"] * 5,
+            "value": [1.0, 1.1, 0.9, 1.0, 1.0] * 3 + [9.0] * 5,
+        })
+        engine = DiagnosticEngine(df, ["value"])
+
+        robust = engine.anomalies("group", method="robust_z")
+        iqr = engine.anomalies("group", method="iqr")
+        self.assertEqual(list(robust["value"]), ["d"])
+        self.assertEqual(list(iqr["value"]), ["d"])
+        self.assertEqual(iqr["center"].iloc[0], df["value"].median())
+
+        with self.assertRaises(ValueError):
+            engine.anomalies("group", method="unknown")
+
+    def test_indicator_correlations_match_dummies(self):
+        """Test the one-hot correlations against get_dummies column by column."""
+        encoding = OneHotEncoding.from_series(self.df["channel"])
+        correlations = indicator_correlations(encoding, self.df[self.metrics])
+
+        dummies = pd.get_dummies(self.df["channel"], prefix="channel")
+        self.assertEqual(list(dummies.columns), [f"channel_{value}" for value in correlations.index])
+        for value in correlations.index:
+            for metric in self.metrics:
+                expected = dummies[f"channel_{value}"].corr(self.df[metric])
+                self.assertAlmostEqual(correlations.at[value, metric], expected, places=9)
+
+    def test_transpose_dot_matches_dense_product(self):
+        """Test the sparse product against the dense one-hot matrix."""
+        encoding = OneHotEncoding.from_series(self.df["channel"])
+        dense = pd.get_dummies(self.df["channel"]).to_numpy(dtype=float)
+        matrix = np.random.default_rng(0).normal(size=(len(self.df), 3))
+        np.testing.assert_allclose(encoding.transpose_dot(matrix), dense.T @ matrix)
+
+    def test_dominant_values_and_representation(self):
+        """Test dominant values and representation shifts per group."""
+        dominant = self.engine.dominant_values("batch_id", "channel")
+        for batch, row in dominant.iterrows():
+            counts = self.df[self.df["batch_id"] == batch]["channel"].value_counts()
+            self.assertEqual(row["count"], counts.iloc[0])
+            self.assertEqual(counts[row["value"]], counts.iloc[0])
+
+        shifts = self.engine.representation_shifts("batch_id", "channel", threshold=0)
+        overall = self.df["channel"].value_counts(normalize=True)
+        for row in shifts.to_dict("records"):
+            batch_counts = self.df[self.df["batch_id"] == row["group"]]["channel"].value_counts(normalize=True)
+            self.assertAlmostEqual(row["group_pct"], batch_counts[row["value"]])
+            self.assertAlmostEqual(row["overall_pct"], overall[row["value"]])
+
+    def test_variance_explained(self):
+        """Test the between-group share of the total sum of squares."""
+        values = np.array([1.0, 1.0, 3.0, 3.0])
+        self.assertAlmostEqual(DiagnosticEngine.variance_explained(values, np.array(["a", "a", "b", "b"])), 1.0)
+        self.assertAlmostEqual(DiagnosticEngine.variance_explained(values, np.array(["a", "b", "a", "b"])), 0.0)
+        self.assertEqual(DiagnosticEngine.variance_explained(np.ones(3), np.array(["a", "b", "c"])), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+Tests for the chunked ingestion engine of the data ingestion module.
+"""
+import asyncio
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.modules.data_ingestion.data_pipeline import DataIngestion
+from src.modules.data_ingestion.data_transformer import Preprocessing, preprocess_records
+from src.modules.data_ingestion.feature_extraction import FeatureExtraction
+from src.modules.data_ingestion.helpers.ingestion_engine import IngestionEngine, load_records, read_chunks
+
+CATEGORIES = [{"name": "engaged", "threshold": 0.2}, {"name": "champion", "threshold": 0.99}]
+
+
+def make_records(count, seed=5):
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        record = {
+            "id": i,
+            "user": f" u{rng.randrange(40)} ",
+            "sessions": rng.randrange(100),
+            "spend": str(round(rng.gammavariate(2.0, 30.0), 2)),
+            "rating": rng.choice([1, 2, 3, 4, 5, None, ""]),
+            "zip": f"{rng.randrange(100_000):05d}",
+        }
+        if rng.random() < 0.1:
+            record["late_field"] = rng.random()
+        records.append(record)
+    records[7] = {"note": "   ", "empty": None}
+    return records
+
+
+def write_jsonl(path, records):
+    with open(path, "w", encoding="utf-8") as handle:
+        for record in records:
+            handle.write(json.dumps(record) + "\n")
+        handle.write("\n")
+
+
+def write_csv(path, records):
+    fields = ["id", "user", "sessions", "spend", "rating", "zip", "late_field"]
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(records)
+
+
+async def in_memory(source, preprocessing=None):
+    data = {"source": "export", "results": load_records(source)}
+    return await (preprocessing or Preprocessing()).preprocess_data(data)
+
+
+@mock.patch.object(FeatureExtraction, "get_tag_categories", mock.AsyncMock(return_value=CATEGORIES))
+class TestIngestionEngine(unittest.TestCase):
+    """Test cases for IngestionEngine against the in-memory path."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.records = make_records(2500)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def assert_equivalent(self, streamed, expected):
+        for key in ("source", "results", "metadata", "factors", "scores", "tags"):
+            self.assertEqual(streamed[key], expected[key], key)
+
+    def test_jsonl_in_process_pool_matches_in_memory(self):
+        """Test that parallel chunked ingestion keeps order and results."""
+        source = self.path("export.jsonl")
+        write_jsonl(source, self.records)
+        expected = asyncio.run(in_memory(source))
+
+        engine = IngestionEngine(chunk_size=300, max_workers=2, max_pending=3)
+        streamed = asyncio.run(engine.run(source, data={"source": "export"}))
+
+        self.assert_equivalent(streamed, expected)
+        # Records are kept as parsed
+        self.assertEqual(expected["results"], self.records)
+        self.assertEqual([f["name"] for f in expected["factors"]], ["factor1", "factor2", "factor3"])
+        self.assertIn("engaged", expected["tags"])
+        self.assertEqual(engine.metrics["chunks"], 9)
+        self.assertEqual(engine.metrics["records_in"], 2500)
+        self.assertEqual(engine.metrics["records_out"], 2500)
+
+    def test_csv_inline_matches_in_memory(self):
+        """Test CSV sources processed without worker processes."""
+        source = self.path("export.csv")
+        write_csv(source, self.records)
+        expected = asyncio.run(in_memory(source))
+        streamed = asyncio.run(IngestionEngine(chunk_size=128, max_workers=0).run(source, data={"source": "export"}))
+
+        self.assert_equivalent(streamed, expected)
+        # CSV values stay strings, including numeric-looking identifiers
+        self.assertEqual(expected["results"][0]["user"], self.records[0]["user"])
+        self.assertEqual(expected["results"][0]["sessions"], str(self.records[0]["sessions"]))
+        self.assertEqual(expected["results"][0]["zip"], self.records[0]["zip"])
+
+    def test_opt_in_cleaning_and_numeric_fields(self):
+        """Test configured preprocessing applied per chunk and in memory alike."""
+        source = self.path("export.csv")
+        write_csv(source, self.records)
+        preprocessing = Preprocessing(clean=True, numeric_fields=["sessions", "spend"])
+        expected = asyncio.run(in_memory(source, preprocessing))
+        engine = IngestionEngine(chunk_size=128, max_workers=2, preprocessing=preprocessing)
+        streamed = asyncio.run(engine.run(source, data={"source": "export"}))
+
+        self.assert_equivalent(streamed, expected)
+        first = expected["results"][0]
+        self.assertEqual(first["user"], self.records[0]["user"].strip())
+        self.assertIsInstance(first["sessions"], int)
+        self.assertIsInstance(first["spend"], float)
+        self.assertEqual(first["zip"], self.records[0]["zip"])
+        self.assertIsInstance(first["id"], str)
+        self.assertEqual(engine.metrics["records_out"], 2499)
+
+    def test_sink_receives_chunks_in_order(self):
+        """Test streaming chunks to a sink without keeping them."""
+        received = []
+
+        async def sink(chunk):
+            await asyncio.sleep(0)
+            received.append(chunk)
+
+        engine = IngestionEngine(chunk_size=1000, max_workers=2)
+        streamed = asyncio.run(engine.run(iter(self.records), sink=sink, keep_records=False))
+
+        self.assertEqual(streamed["results"], [])
+        self.assertEqual([len(chunk) for chunk in received], [1000, 1000, 500])
+        self.assertEqual([record for chunk in received for record in chunk], self.records)
+        self.assertEqual(len(streamed["factors"]), 3)
+
+    def test_preprocess_records(self):
+        """Test that records are only rewritten as configured."""
+        records = [{"zip": "02139", "spend": " 12.50 ", "note": " "}, {"empty": None}]
+        self.assertEqual(preprocess_records(records), records)
+        self.assertEqual(preprocess_records(records, clean=True), [{"zip": "02139", "spend": "12.50"}])
+        self.assertEqual(preprocess_records(records, clean=True, numeric_fields=["spend"]),
+                         [{"zip": "02139", "spend": 12.5}])
+
+    def test_read_chunks(self):
+        """Test chunking of JSON files and unsupported sources."""
+        source = self.path("export.json")
+        with open(source, "w", encoding="utf-8") as handle:
+            json.dump({"results": self.records[:5]}, handle)
+        self.assertEqual([len(chunk[1]) for chunk in read_chunks(source, 2)], [2, 2, 1])
+        self.assertEqual(load_records(source), self.records[:5])
+        with self.assertRaises(ValueError):
+            list(read_chunks(self.path("export.xlsx")))
+
+    def test_data_ingestion_entry_point(self):
+        """Test DataIngestion.ingest with an empty source."""
+        source = self.path("empty.jsonl")
+        write_jsonl(source, [])
+        result = asyncio.run(DataIngestion().ingest(source, max_workers=0))
+        self.assertEqual(result["results"], [])
+        self.assertEqual(len(result["factors"]), 3)
+        self.assertEqual(result["source"], source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Tests for dependency-scheduled pipeline execution.
+"""
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.processing.pipeline import Pipeline, PipelineFactory
+from src.processing.pipeline_graph import PipelineGraph
+from src.processing.components.statistical_analysis import StatisticalAnalysisComponent
+
+
+class FakeComponent:
+    """Component writing a value derived from its inputs after a delay."""
+
+    def __init__(self, component_id, inputs=None, outputs=None, delay=0.0, cpu_bound=False, log=None):
+        self.component_id = component_id
+        self.inputs = inputs
+        self.outputs = outputs
+        self.delay = delay
+        self.cpu_bound = cpu_bound
+        self.log = log if log is not None else []
+
+    async def process(self, context):
+        self.log.append(("start", self.component_id))
+        if self.cpu_bound:
+            time.sleep(self.delay)
+        else:
+            await asyncio.sleep(self.delay)
+        result = dict(context)
+        results = dict(result.get("results", {}))
+        seen = sorted(k for k in results)
+        results[self.component_id] = {"seen": seen}
+        result["results"] = results
+        self.log.append(("end", self.component_id))
+        return result
+
+
+class FailingComponent(FakeComponent):
+    async def process(self, context):
+        raise RuntimeError("boom")
+
+
+class TestPipelineGraph(unittest.TestCase):
+    """Test cases for PipelineGraph and DAG execution in Pipeline."""
+
+    def test_levels_follow_declared_dependencies(self):
+        components = [
+            FakeComponent("clean", inputs=("data",), outputs=("data",)),
+            FakeComponent("stats", inputs=("data",), outputs=("results.stats",)),
+            FakeComponent("features", inputs=("data",), outputs=("results.features",)),
+            FakeComponent("report", inputs=("results",), outputs=("report",)),
+        ]
+        graph = PipelineGraph(components)
+        self.assertEqual([[s.component.component_id for s in level] for level in graph.levels],
+                         [["clean"], ["stats", "features"], ["report"]])
+        self.assertEqual(graph.parallelism, 2)
+
+    def test_undeclared_components_are_barriers(self):
+        components = [
+            FakeComponent("a", inputs=(), outputs=("results.a",)),
+            FakeComponent("legacy"),
+            FakeComponent("b", inputs=(), outputs=("results.b",)),
+            FakeComponent("c", inputs=(), outputs=("results.c",)),
+        ]
+        graph = PipelineGraph(components)
+        self.assertEqual([[s.component.component_id for s in level] for level in graph.levels],
+                         [["a"], ["legacy"], ["b", "c"]])
+
+    def test_independent_stages_overlap_and_merge(self):
+        log = []
+        pipeline = Pipeline("p", "Parallel", components=[
+            FakeComponent("stats", inputs=("data",), outputs=("results.stats",), delay=0.1, log=log),
+            FakeComponent("features", inputs=("data",), outputs=("results.features",), delay=0.1,
+                          cpu_bound=True, log=log),
+            FakeComponent("report", inputs=("results",), outputs=("results.report",), log=log),
+        ])
+
+        start = time.perf_counter()
+        result = asyncio.run(pipeline.process({"data": [1, 2, 3]}))
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.18)
+        self.assertEqual(log[:2], [("start", "stats"), ("start", "features")])
+        self.assertEqual(result["results"]["stats"], {"seen": []})
+        self.assertEqual(result["results"]["features"], {"seen": []})
+        self.assertEqual(result["results"]["report"], {"seen": ["features", "stats"]})
+
+        metadata = result["_metadata"]
+        self.assertEqual([c["order"] for c in metadata["components"]], [0, 1, 2])
+        self.assertEqual(set(metadata["stage_timings"]), {"stats", "features", "report"})
+        self.assertEqual(pipeline.get_component_timings()["stats"]["runs"], 1)
+
+    def test_component_results_survive_concurrent_merge(self):
+        stats = StatisticalAnalysisComponent("stats", {"target_fields": ["sessions"]})
+        spend = StatisticalAnalysisComponent("spend", {"target_fields": ["spend"]})
+        other = FakeComponent("other", inputs=("data",), outputs=("results.other",))
+        pipeline = Pipeline("p", "Statistics", components=[stats, spend, other])
+        self.assertEqual(pipeline.graph.parallelism, 3)
+
+        result = asyncio.run(pipeline.process({"data": {"sessions": [1, 2, 3, 10], "spend": [5.0, 7.0]}}))
+
+        self.assertEqual(result["_results"]["stats"]["fields_analyzed"], 1)
+        self.assertEqual(result["_results"]["stats"]["statistics"]["sessions"]["max"], 10.0)
+        self.assertEqual(result["_results"]["spend"]["statistics"]["spend"]["mean"], 6.0)
+        self.assertEqual(result["results"]["other"], {"seen": []})
+
+    def test_stage_failure_propagates(self):
+        pipeline = Pipeline("p", "Failing", components=[
+            FakeComponent("ok", inputs=(), outputs=("results.ok",), delay=0.01),
+            FailingComponent("bad", inputs=(), outputs=("results.bad",)),
+        ])
+        with self.assertRaises(RuntimeError):
+            asyncio.run(pipeline.process({}))
+
+    def test_factory_reuses_pipelines(self):
+        factory = PipelineFactory()
+        pipeline = factory.get_pipeline("diagnostic", {"depth": 1})
+        self.assertIs(factory.get_pipeline("diagnostic", {"depth": 1}), pipeline)
+        self.assertIsNot(factory.get_pipeline("diagnostic", {"depth": 2}), pipeline)
+        factory.clear_cache()
+        self.assertIsNot(factory.get_pipeline("diagnostic", {"depth": 1}), pipeline)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Tests for the columnar scoring engine of the descriptive module.
+"""
+import os
+import random
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.modules.descriptive_module.helpers.scoring_engine import (
+    EntityScores,
+    chunked,
+    dominant_values,
+    link_users_to_factors,
+)
+
+
+def make_frame(seed=3, rows=400):
+    rng = random.Random(seed)
+    records = []
+    for i in range(rows):
+        user = rng.randrange(25)
+        records.append({
+            "id": i,
+            "user_id": f"u{user}" if rng.random() > 0.02 else None,
+            "batch_id": f"b{rng.randrange(5)}",
+            # Each user leans towards one channel, so dominant values are unambiguous
+            "channel": rng.choice([f"c{user % 4}"] * 4 + ["c0", "c1", "c2", "c3"]) if rng.random() > 0.05 else None,
+            "engagement": rng.gauss(10, 2) if rng.random() > 0.05 else None,
+            "conversion": float(rng.random() < 0.3),
+        })
+    return pd.DataFrame(records)
+
+
+class TestScoringEngine(unittest.TestCase):
+    """Test cases for the scoring engine against per-entity masking."""
+
+    def setUp(self):
+        self.df = make_frame()
+
+    def test_entity_scores_match_masked_statistics(self):
+        """Test the grouped statistics against a boolean mask per entity."""
+        metrics = ["engagement", "conversion"]
+        scores = EntityScores(self.df, "batch_id", metrics)
+        records = {key: (stats, score, size) for key, stats, score, size in scores.records()}
+
+        self.assertEqual(set(records), set(self.df["batch_id"].unique()))
+        for batch_id, (stats, score, size) in records.items():
+            batch = self.df[self.df["batch_id"] == batch_id]
+            self.assertEqual(size, len(batch))
+            for metric in metrics:
+                self.assertAlmostEqual(stats[metric]["mean"], batch[metric].mean())
+                self.assertAlmostEqual(stats[metric]["median"], batch[metric].median())
+                self.assertAlmostEqual(stats[metric]["std"], batch[metric].std())
+                self.assertEqual(stats[metric]["max"], batch[metric].max())
+                self.assertEqual(stats[metric]["count"], len(batch))
+            self.assertAlmostEqual(score, np.mean([batch[metric].mean() for metric in metrics]))
+
+    def test_single_row_entities_have_zero_std(self):
+        """Test that entities with one row report a standard deviation of 0."""
+        df = pd.DataFrame({"key": ["a", "b", "b"], "value": [1.0, 2.0, 4.0]})
+        records = {key: stats for key, stats, _, _ in EntityScores(df, "key", ["value"]).records()}
+        self.assertEqual(records["a"]["value"]["std"], 0.0)
+        self.assertAlmostEqual(records["b"]["value"]["std"], np.std([2.0, 4.0], ddof=1))
+
+    def test_no_metrics(self):
+        """Test scoring without numeric metrics."""
+        df = pd.DataFrame({"key": ["a", "b", "a"]})
+        records = list(EntityScores(df, "key", []).records())
+        self.assertEqual([(key, stats, score, size) for key, stats, score, size in records],
+                         [("a", {}, 0.0, 2), ("b", {}, 0.0, 1)])
+
+    def test_dominant_values_match_value_counts(self):
+        """Test dominant values against value_counts per entity."""
+        users, values, counts = dominant_values(self.df["user_id"], self.df["channel"])
+        self.assertEqual(len(users), self.df["user_id"].nunique())
+        for user, value, count in zip(users, values, counts):
+            user_counts = self.df[self.df["user_id"] == user]["channel"].value_counts()
+            self.assertEqual(count, user_counts.iloc[0])
+            self.assertEqual(user_counts[value], user_counts.iloc[0])
+
+    def test_dominant_value_ties_go_to_first_seen(self):
+        """Test that ties go to the value seen first for the entity."""
+        keys = pd.Series(["u1", "u1", "u1", "u1", "u2"])
+        values = pd.Series(["b", "a", "a", "b", None])
+        users, dominant, counts = dominant_values(keys, values)
+        self.assertEqual(list(users), ["u1"])
+        self.assertEqual(list(dominant), ["b"])
+        self.assertEqual(list(counts), [2])
+
+    def test_link_users_to_factors(self):
+        """Test the user-factor links built from the sparse join."""
+        links = link_users_to_factors(self.df, "20240101000000")
+        expected = set()
+        for user, user_data in self.df.groupby("user_id"):
+            value = user_data["channel"].value_counts().index[0]
+            expected.add((f"factor_channel_{value}_20240101000000", "user", user))
+        self.assertEqual(set(links), expected)
+
+    def test_chunked(self):
+        """Test splitting records into chunks."""
+        self.assertEqual(list(chunked([1, 2, 3, 4, 5], 2)), [[1, 2], [3, 4], [5]])
+        self.assertEqual(list(chunked([], 2)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
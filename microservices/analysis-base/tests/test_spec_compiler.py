@@ -0,0 +1,123 @@
+"""
+Tests for the decision tree compiler and its use by the specification interpreter.
+"""
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.processing.spec_compiler import CompiledDecisionTree, compile_accessor
+from src.processing.spec_interpreter import SpecInterpreter
+
+
+TREE = {
+    "id": "routing",
+    "version": "1.0.0",
+    "root": {
+        "type": "condition",
+        "condition": "exists:user.segment",
+        "then": {
+            "type": "switch",
+            "expression": "context.user.segment",
+            "cases": {
+                "vip": {
+                    "type": "condition",
+                    "condition": "user.active == true",
+                    "then": {"result": "VIP_ACTIVE"},
+                    "else": {"result": "VIP_INACTIVE"}
+                },
+                "basic": {
+                    "type": "condition",
+                    "condition": "empty:user.tags",
+                    "then": {"result": "BASIC_UNTAGGED"},
+                    "else": {"result": "BASIC_TAGGED"}
+                }
+            },
+            "default": {"result": "OTHER_SEGMENT"}
+        },
+        "else": {
+            "type": "condition",
+            "condition": "region == 'eu'",
+            "then": {"result": "ANONYMOUS_EU"},
+            "else": {"result": "ANONYMOUS"}
+        }
+    }
+}
+
+CONTEXTS = [
+    {"user": {"segment": "vip", "active": True}},
+    {"user": {"segment": "vip", "active": False}},
+    {"user": {"segment": "basic", "tags": []}},
+    {"user": {"segment": "basic", "tags": ["new"]}},
+    {"user": {"segment": "trial"}},
+    {"region": "eu"},
+    {"region": "us"},
+    {},
+]
+
+EXPECTED = [
+    "VIP_ACTIVE", "VIP_INACTIVE", "BASIC_UNTAGGED", "BASIC_TAGGED",
+    "OTHER_SEGMENT", "ANONYMOUS_EU", "ANONYMOUS", "ANONYMOUS",
+]
+
+
+class TestSpecCompiler(unittest.TestCase):
+    """Test cases for CompiledDecisionTree."""
+
+    def test_accessor(self):
+        get = compile_accessor("a.b.c")
+        self.assertEqual(get({"a": {"b": {"c": 1}}}), 1)
+        self.assertIsNone(get({"a": {"b": 2}}))
+        self.assertIsNone(compile_accessor("a")(["not", "a", "dict"]))
+
+    def test_matches_interpreter_per_context(self):
+        interpreter = SpecInterpreter()
+        tree = CompiledDecisionTree(TREE)
+        self.assertEqual([tree.evaluate(context) for context in CONTEXTS], EXPECTED)
+        self.assertEqual([interpreter.interpret_decision_tree_spec(TREE, c) for c in CONTEXTS], EXPECTED)
+
+    def test_batch_over_list_and_frame(self):
+        tree = CompiledDecisionTree(TREE)
+        self.assertEqual(tree.evaluate_batch(CONTEXTS), EXPECTED)
+
+        frame = pd.json_normalize(CONTEXTS)
+        frame.index = [f"row{i}" for i in range(len(frame))]
+        results = tree.evaluate_batch(frame)
+        self.assertEqual(results.tolist(), EXPECTED)
+        self.assertEqual(list(results.index), list(frame.index))
+
+        # Nested dicts in a top-level column
+        nested = pd.DataFrame({"user": [c.get("user") for c in CONTEXTS], "region": [c.get("region") for c in CONTEXTS]})
+        self.assertEqual(tree.evaluate_batch(nested).tolist(), EXPECTED)
+
+    def test_invalid_nodes_raise_when_reached(self):
+        tree = CompiledDecisionTree({"root": {
+            "type": "condition", "condition": "flag == 1",
+            "then": {"type": "unknown"}, "else": {"result": "OK"}
+        }})
+        self.assertEqual(tree.evaluate({"flag": 0}), "OK")
+        with self.assertRaises(ValueError):
+            tree.evaluate({"flag": 1})
+        with self.assertRaises(ValueError):
+            tree.evaluate_batch(pd.DataFrame({"flag": [0, 1]}))
+        with self.assertRaises(ValueError):
+            CompiledDecisionTree({})
+
+    def test_compiled_once_per_spec_version(self):
+        interpreter = SpecInterpreter()
+        first = interpreter.compile_decision_tree_spec(TREE)
+        self.assertIs(interpreter.compile_decision_tree_spec(dict(TREE)), first)
+        self.assertIsNot(interpreter.compile_decision_tree_spec({**TREE, "version": "1.0.1"}), first)
+
+        unversioned = {"root": {"result": "X"}}
+        self.assertIs(interpreter.compile_decision_tree_spec(unversioned),
+                      interpreter.compile_decision_tree_spec({"root": {"result": "X"}}))
+        self.assertEqual(interpreter.interpret_decision_tree_batch(unversioned, [{}, {}]), ["X", "X"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Tests for the streaming statistics engine.
+"""
+import asyncio
+import json
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.processing.components.statistical_analysis import StatisticalAnalysisComponent
+from src.processing.statistics_engine import (
+    StreamingMoments,
+    describe,
+    iter_chunks,
+    merge_partials,
+    outlier_mask,
+)
+
+
+def central_moments(values):
+    deviations = values - values.mean()
+    n = len(values)
+    m2 = (deviations ** 2).sum()
+    return {
+        "variance": m2 / n,
+        "skewness": np.sqrt(n) * (deviations ** 3).sum() / m2 ** 1.5,
+        "kurtosis": n * (deviations ** 4).sum() / m2 ** 2 - 3,
+    }
+
+
+class TestStatisticsEngine(unittest.TestCase):
+    """Test cases for the statistics engine against direct numpy computations."""
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        # Skewed, offset data stresses the moment updates
+        self.values = 1e6 + rng.gamma(2.0, 3.0, 10_000)
+
+    def assert_matches_series(self, moments, values):
+        expected = central_moments(values)
+        self.assertEqual(moments.count, len(values))
+        self.assertAlmostEqual(moments.mean, values.mean(), delta=1e-9 * abs(values.mean()))
+        self.assertAlmostEqual(moments.total, values.sum(), delta=1e-9 * abs(values.sum()))
+        self.assertAlmostEqual(moments.variance() / expected["variance"], 1, places=9)
+        self.assertAlmostEqual(moments.skewness, expected["skewness"], places=7)
+        self.assertAlmostEqual(moments.kurtosis, expected["kurtosis"], places=7)
+        self.assertEqual(moments.minimum, values.min())
+        self.assertEqual(moments.maximum, values.max())
+
+    def test_chunked_moments_match_whole_series(self):
+        """Test that chunk-by-chunk accumulation matches the whole series."""
+        for chunk_size in (1, 7, 1000, 20_000):
+            self.assert_matches_series(StreamingMoments.from_values(self.values, chunk_size), self.values)
+
+    def test_chunks_are_not_materialized(self):
+        """Test aggregating a generator of chunks."""
+        chunks = (self.values[start:start + 999] for start in range(0, len(self.values), 999))
+        self.assert_matches_series(StreamingMoments.from_chunks(chunks), self.values)
+        self.assertEqual(sum(len(chunk) for chunk in iter_chunks(list(self.values[:10]), 3)), 10)
+
+    def test_merged_partials_match_whole_series(self):
+        """Test merging uneven partials, including serialized and empty ones."""
+        splits = np.split(self.values, [3, 2500, 2501, 7000])
+        partials = [StreamingMoments.from_values(part) for part in splits]
+        partials.append(StreamingMoments())
+
+        self.assert_matches_series(merge_partials(partials), self.values)
+        serialized = [json.loads(json.dumps(partial.to_dict())) for partial in partials]
+        self.assert_matches_series(merge_partials(reversed(serialized)), self.values)
+
+        merged = partials[0].merge(partials[1])
+        self.assertEqual(partials[0].count, 3)
+        self.assertEqual(merged.count, 2500)
+
+    def test_constant_and_empty_series(self):
+        """Test degenerate series."""
+        constant = StreamingMoments.from_values(np.full(5, 4.0))
+        self.assertEqual((constant.std, constant.skewness, constant.kurtosis), (0.0, 0.0, 0.0))
+        empty = StreamingMoments()
+        self.assertTrue(np.isnan(empty.variance()))
+        self.assertEqual(empty.to_dict()["minimum"], None)
+        self.assertEqual(StreamingMoments.from_dict(empty.to_dict()).minimum, np.inf)
+
+    def test_describe_matches_numpy(self):
+        """Test descriptive statistics against separate numpy calls."""
+        stats = describe(self.values, [25, 90])
+        self.assertEqual(stats["count"], len(self.values))
+        self.assertAlmostEqual(stats["mean"], np.mean(self.values))
+        self.assertAlmostEqual(stats["median"], np.median(self.values))
+        self.assertAlmostEqual(stats["std"], np.std(self.values))
+        self.assertEqual(stats["min"], np.min(self.values))
+        self.assertEqual(stats["percentiles"]["90"], np.percentile(self.values, 90))
+        self.assertNotIn("percentiles", describe(self.values, None))
+
+    def test_outlier_masks_match_filtering(self):
+        """Test the vectorized masks against filtering value by value."""
+        values = list(self.values)
+        q1, q3 = np.percentile(values, [25, 75])
+        iqr_expected = [v for v in values if v < q1 - 1.5 * (q3 - q1) or v > q3 + 1.5 * (q3 - q1)]
+        mean, std = np.mean(values), np.std(values)
+        z_expected = [v for v in values if abs((v - mean) / std) > 3.0]
+        low, high = np.percentile(values, [5, 95])
+        percentile_expected = [v for v in values if v < low or v > high]
+
+        array = np.asarray(values)
+        self.assertEqual(array[outlier_mask(values, "iqr")].tolist(), iqr_expected)
+        self.assertEqual(array[outlier_mask(values, "z_score")].tolist(), z_expected)
+        self.assertEqual(
+            array[outlier_mask(values, "percentile", lower_percentile=5, upper_percentile=95)].tolist(),
+            percentile_expected
+        )
+        self.assertGreater(len(z_expected), 0)
+
+        self.assertFalse(outlier_mask([2.0, 2.0, 2.0], "z_score").any())
+        with self.assertRaises(ValueError):
+            outlier_mask(values, "unknown")
+
+    def test_component_statistics_and_partials(self):
+        """Test the component output with outliers and partial aggregates."""
+        component = StatisticalAnalysisComponent("stats", {
+            "detect_outliers": True,
+            "outlier_method": "z_score",
+            "outlier_threshold": 2.0,
+            "include_partials": True,
+        })
+        context = {"data": {"scores": [1.0, 2.0, 2.5, 3.0, 2.0, 40.0], "nested": {"value": 5}}}
+        result = asyncio.run(component.process(context))["_results"]["stats"]
+
+        scores = result["statistics"]["scores"]
+        self.assertEqual(scores["outliers"], [40.0])
+        self.assertAlmostEqual(scores["std"], np.std(context["data"]["scores"]))
+        self.assertEqual(scores["percentiles"]["50"], scores["median"])
+        self.assertEqual(StreamingMoments.from_dict(scores["partial"]).count, 6)
+        self.assertIn("nested.value", result["statistics"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Tests for the user data client cache, bulk lookups and request coalescing.
+"""
+import asyncio
+import os
+import sys
+import unittest
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.repository.user_data_client import TTLCache, UserDataClient
+from tests.user_service_stub import UserServiceStub, make_users
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test cases for the bounded TTL LRU cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry goes first."""
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), (True, 1))
+        self.assertEqual(cache.get("b"), (False, None))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.metrics["evictions"], 1)
+
+    def test_entries_expire(self):
+        """Test that entries are dropped after the TTL."""
+        clock = FakeClock()
+        cache = TTLCache(max_entries=10, ttl_seconds=5, clock=clock)
+        cache.set("a", 1)
+        clock.now = 4.9
+        self.assertIn("a", cache)
+        clock.now = 5.0
+        self.assertEqual(cache.get("a"), (False, None))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.metrics["expirations"], 1)
+
+
+class TestUserDataClient(unittest.TestCase):
+    """Test cases for UserDataClient against a local stub service."""
+
+    def setUp(self):
+        self.users = make_users(25)
+
+    def test_get_users_uses_chunked_bulk_requests(self):
+        """Test that missing users are fetched with one request per chunk."""
+        with UserServiceStub(self.users) as stub:
+            client = UserDataClient(base_url=stub.url, batch_size=10)
+            ids = [f"user-{i}" for i in range(25)] + ["user-3", "missing"]
+            result = asyncio.run(client.get_users(ids))
+
+            self.assertEqual(set(result), set(ids))
+            self.assertEqual(result["user-7"], self.users["user-7"])
+            self.assertIsNone(result["missing"])
+            self.assertEqual(stub.requests, {"batch": 3})
+            self.assertEqual(max(stub.requested_ids.values()), 1)
+
+            # Found users are cached, the missing one is asked for again
+            again = asyncio.run(client.get_users(["user-1", "user-2", "missing"]))
+            self.assertEqual(again["user-2"], self.users["user-2"])
+            self.assertEqual(stub.requests["batch"], 4)
+            self.assertEqual(stub.requested_ids["user-1"], 1)
+            self.assertEqual(asyncio.run(client.get_user_info("user-20")), self.users["user-20"])
+            self.assertNotIn("single", stub.requests)
+
+    def test_concurrent_lookups_are_coalesced(self):
+        """Test that concurrent lookups of the same user share one request."""
+        with UserServiceStub(self.users, latency=0.05) as stub:
+            client = UserDataClient(base_url=stub.url)
+
+            async def run():
+                return await asyncio.gather(
+                    client.get_user_info("user-1"),
+                    client.get_user_info("user-1"),
+                    client.get_users(["user-1", "user-2"]),
+                    client.get_users(["user-2", "user-3"]),
+                )
+
+            single, duplicate, first, second = asyncio.run(run())
+            self.assertEqual(single, self.users["user-1"])
+            self.assertEqual(duplicate, single)
+            self.assertEqual(first, {"user-1": single, "user-2": self.users["user-2"]})
+            self.assertEqual(second["user-3"], self.users["user-3"])
+            self.assertEqual(max(stub.requested_ids.values()), 1)
+            self.assertEqual(client.get_metrics()["coalesced"], 3)
+            self.assertEqual(client.get_metrics()["inflight"], 0)
+
+    def test_falls_back_to_single_lookups(self):
+        """Test single lookups when the service has no bulk endpoint."""
+        with UserServiceStub(self.users, batch_endpoint=False) as stub:
+            client = UserDataClient(base_url=stub.url, batch_size=4)
+            result = asyncio.run(client.get_users(["user-1", "user-2", "nobody"]))
+
+            self.assertEqual(result, {"user-1": self.users["user-1"], "user-2": self.users["user-2"],
+                                      "nobody": None})
+            self.assertFalse(client.batch_supported)
+            self.assertEqual(stub.requests["single"], 3)
+
+            asyncio.run(client.get_users(["user-5", "user-6"]))
+            self.assertEqual(stub.requests["single"], 5)
+
+    def test_unreachable_service_returns_none(self):
+        """Test that connection errors yield None without caching."""
+        client = UserDataClient(base_url="http://127.0.0.1:9")
+        self.assertEqual(asyncio.run(client.get_users(["user-1"])), {"user-1": None})
+        self.assertIsNone(asyncio.run(client.get_user_info("user-1")))
+        self.assertEqual(client.get_metrics()["cached_users"], 0)
+
+    def test_clear_cache(self):
+        """Test clearing one user or the whole cache."""
+        with UserServiceStub(self.users) as stub:
+            client = UserDataClient(base_url=stub.url)
+            asyncio.run(client.get_users(["user-1", "user-2"]))
+            client.clear_cache("user-1")
+            self.assertEqual(client.get_metrics()["cached_users"], 1)
+            client.clear_cache()
+            self.assertEqual(client.get_metrics()["cached_users"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Local stub of the User Data Service.
+
+Serves GET /api/v1/users/{id} and, unless disabled, the bulk lookup
+POST /api/v1/users/batch from an in-memory user table on a background
+thread. Every request can take a simulated latency and is counted by path
+kind ("single" or "batch").
+"""
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class UserServiceStub:
+    """Threaded HTTP server answering user lookups."""
+
+    def __init__(self, users, latency=0.0, batch_endpoint=True):
+        self.users = users
+        self.latency = latency
+        self.batch_endpoint = batch_endpoint
+        self.requests = Counter()
+        self.requested_ids = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, kind, user_ids):
+        with self._lock:
+            self.requests[kind] += 1
+            self.requested_ids.update(user_ids)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                user_id = self.path.rsplit("/", 1)[-1]
+                stub._count("single", [user_id])
+                time.sleep(stub.latency)
+                if user_id in stub.users:
+                    self.reply(200, stub.users[user_id])
+                else:
+                    self.reply(404, {"detail": "User not found"})
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if not stub.batch_endpoint or self.path != "/api/v1/users/batch":
+                    self.reply(404, {"detail": "Not Found"})
+                    return
+                user_ids = json.loads(body)["user_ids"]
+                stub._count("batch", user_ids)
+                time.sleep(stub.latency)
+                self.reply(200, {"users": {
+                    user_id: stub.users[user_id] for user_id in user_ids if user_id in stub.users
+                }})
+
+        return Handler
+
+
+def make_users(count):
+    return {
+        f"user-{i}": {"user_id": f"user-{i}", "name": f"User {i}", "roles": ["analyst"]}
+        for i in range(count)
+    }
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Consultancy NLP Processor Benchmark
+
+Measures:
+- module import time (fresh interpreter) and first-use model load time
+- throughput of per-text process_text vs batched process_texts (nlp.pipe)
+- throughput of the async NLPBatcher under concurrent callers
+
+Uses spaCy/NLTK when installed, otherwise the fallback backend.
+
+Usage:
+    python benchmarks/consultancy_nlp_benchmark.py --texts 2000 --batch-size 64
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+MODULE = "src.bot_integration.consultancy_bot.nlp_processor"
+
+SAMPLES = [
+    "We need to review our marketing strategy before the Q3 campaign launch in Berlin.",
+    "Our revenue dropped and the budget is a problem, can you help urgently?",
+    "Please prepare a roadmap for the digital transformation of our supply chain.",
+    "Hey, just curious whether cloud automation would reduce operating cost.",
+    "Kindly send the compliance assessment for the new contract with Acme Corp.",
+    "How should we improve employee retention and hiring across our London office?",
+]
+
+
+def measure_import_time() -> float:
+    """Import the module in a fresh interpreter and return the elapsed seconds."""
+    code = (
+        "import time, sys; sys.path.insert(0, %r); start = time.perf_counter(); "
+        "import %s; print(time.perf_counter() - start)" % (ROOT, MODULE)
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def build_texts(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(SAMPLES, 2)) for _ in range(count)]
+
+
+async def run_batcher(processor, texts, concurrency: int, batch_size: int):
+    from src.bot_integration.consultancy_bot.nlp_processor import NLPBatcher
+
+    batcher = NLPBatcher(processor, max_batch_size=batch_size, max_wait_ms=2.0)
+    queue = list(texts)
+
+    async def caller():
+        while queue:
+            await batcher.process_text(queue.pop())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    await batcher.close()
+    return time.perf_counter() - start, batcher.batches_processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the consultancy NLP processor")
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--n-process", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"Module import time:      {measure_import_time() * 1000:.1f} ms")
+
+    from src.bot_integration.consultancy_bot.nlp_processor import NLPProcessor
+
+    processor = NLPProcessor(batch_size=args.batch_size, n_process=args.n_process)
+    start = time.perf_counter()
+    processor.process_text("warm up the backend")
+    print(f"First call (lazy load):  {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"(spacy={processor.use_spacy}, nltk={processor.use_nltk})")
+
+    texts = build_texts(args.texts)
+
+    start = time.perf_counter()
+    for text in texts:
+        processor.process_text(text)
+    sequential = time.perf_counter() - start
+    print(f"process_text loop:       {len(texts) / sequential:.0f} texts/s")
+
+    start = time.perf_counter()
+    processor.process_texts(texts)
+    batched = time.perf_counter() - start
+    print(f"process_texts (pipe):    {len(texts) / batched:.0f} texts/s "
+          f"({sequential / batched:.1f}x, batch_size={args.batch_size}, n_process={args.n_process})")
+
+    elapsed, batches = asyncio.run(run_batcher(processor, texts, args.concurrency, args.batch_size))
+    print(f"NLPBatcher ({args.concurrency} callers): {len(texts) / elapsed:.0f} texts/s "
+          f"in {batches} batches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Context Token Budget Benchmark
+
+Replays conversations turn by turn through ContextInjector.budget_context with
+a local tokenizer stand-in (a regex word/punctuation splitter, so no model
+download is needed) and compares:
+- the legacy approach: every context segment re-tokenized on every turn
+- cached counting: per-segment counts cached by content hash, with history
+  counts updated incrementally as messages are appended
+
+It also compares the total priority kept by greedy and knapsack packing when
+the context does not fit the budget.
+
+Total time includes packing, which both runs share; tokenizing time isolates
+the counting cost.
+
+Usage:
+    python benchmarks/context_budget_benchmark.py --conversations 50 --turns 40 --budget 1500
+"""
+
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.langchain_components.template.context_injector import ContextInjector
+from src.langchain_components.template.token_budget import TokenBudget, TokenCounter
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+class RegexTokenizer:
+    """Word/punctuation tokenizer standing in for a BPE tokenizer."""
+
+    def __init__(self):
+        self.calls = 0
+        self.characters = 0
+        self.seconds = 0.0
+
+    def __call__(self, text):
+        start = time.perf_counter()
+        tokens = len(TOKEN_PATTERN.findall(text))
+        self.calls += 1
+        self.characters += len(text)
+        self.seconds += time.perf_counter() - start
+        return tokens
+
+
+class UncachedCounter(TokenCounter):
+    """Counter without caching, as every turn re-tokenized everything."""
+
+    def count(self, text):
+        return self.tokenizer(text) if text else 0
+
+
+WORDS = ("price plan upgrade account billing support issue order shipping refund discount "
+         "the a of to and is it for on with can you I we please thanks").split()
+
+
+def sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)) + rng.choice(".?!")
+
+
+def replay(injector, args, seed, incremental):
+    rng = random.Random(seed)
+    documents = [sentence(rng, rng.randint(40, 160)) for _ in range(200)]
+    for conversation in range(args.conversations):
+        history = []
+        profile = {"name": f"user-{conversation}", "plan": "pro", "notes": sentence(rng, 60)}
+        for turn in range(args.turns):
+            message = sentence(rng, rng.randint(5, 40))
+            variables = {
+                "input": message,
+                "chat_history": list(history),
+                "knowledge_context": rng.sample(documents, 4),
+                "entities": [f"product: {rng.choice(WORDS)}" for _ in range(3)],
+                "user_profile": profile,
+                "memory_summary": sentence(rng, 50),
+            }
+            history_key = f"sales:{conversation}" if incremental else None
+            injector.budget_context(variables, max_tokens=args.budget, history_key=history_key)
+            history.append({"role": "user", "content": message})
+            history.append({"role": "assistant", "content": sentence(rng, rng.randint(20, 80))})
+
+
+def packing_values(args):
+    """Priority kept per turn by each strategy on over-budget contexts."""
+    rng = random.Random(3)
+    totals = {"greedy": 0.0, "knapsack": 0.0}
+    injector = ContextInjector(token_counter=TokenCounter(RegexTokenizer()))
+    for _ in range(args.packings):
+        variables = {
+            "input": sentence(rng, 20),
+            "chat_history": [{"role": "user", "content": sentence(rng, rng.randint(10, 120))} for _ in range(12)],
+            "knowledge_context": [sentence(rng, rng.randint(30, 300)) for _ in range(6)],
+            "entities": [sentence(rng, 4) for _ in range(5)],
+        }
+        for strategy in totals:
+            injector.token_budget = TokenBudget(strategy=strategy)
+            budgeted = injector.budget_context(variables, max_tokens=args.budget // 2)
+            # Recover the kept value from what survived
+            segments = []
+            for key in ("chat_history", "knowledge_context", "entities"):
+                kept = budgeted[key]
+                base = {"chat_history": 1.0, "knowledge_context": 0.8, "entities": 0.6}[key]
+                for index, item in enumerate(variables[key]):
+                    if item in kept:
+                        age = len(variables[key]) - 1 - index if key == "chat_history" else index
+                        segments.append(base * 0.9 ** age)
+            totals[strategy] += sum(segments)
+    return {strategy: total / args.packings for strategy, total in totals.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cached context token budgeting")
+    parser.add_argument("--conversations", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--budget", type=int, default=1500)
+    parser.add_argument("--packings", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{args.conversations} conversations x {args.turns} turns, budget {args.budget} tokens")
+    baseline = None
+    runs = (("legacy re-count", UncachedCounter, False), ("cached + incremental", TokenCounter, True))
+    for label, counter_class, incremental in runs:
+        tokenizer = RegexTokenizer()
+        injector = ContextInjector(token_counter=counter_class(tokenizer))
+        start = time.perf_counter()
+        replay(injector, args, seed=11, incremental=incremental)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or tokenizer.seconds
+        print(f"  {label:<21} total {elapsed:6.2f} s  tokenizing {tokenizer.seconds:6.3f} s  "
+              f"calls {tokenizer.calls:8d}  characters {tokenizer.characters:11,d}  "
+              f"tokenizing speedup {baseline / tokenizer.seconds:6.2f}x")
+
+    values = packing_values(args)
+    print(f"Mean priority kept over {args.packings} over-budget contexts "
+          f"(budget {args.budget // 2} tokens)")
+    for strategy, value in values.items():
+        print(f"  {strategy:<9} {value:6.3f}")
+
+
+if __name__ == "__main__":
+    main()
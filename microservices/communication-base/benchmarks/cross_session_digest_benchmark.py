@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Cross-Session Digest Benchmark
+
+Simulates users with hundreds of past sessions stored in a repository
+(JSON documents behind a simulated request latency) and times building
+cross-session context for a new session with:
+- the legacy path: fetch the last N sessions and re-aggregate them
+- the digest path: read one precomputed digest document
+- the digest path with the in-process cache (repeat sessions of a user)
+
+It also reports the cost of maintaining the digest when a session closes.
+
+Usage:
+    python benchmarks/cross_session_digest_benchmark.py --users 50 --sessions 300 --depth 20 --latency-ms 2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.langchain_components.rag.memo_cache import AsyncMemoCache
+from src.session.session_digest import CrossSessionDigest
+
+TOPICS = ["pricing", "setup", "billing", "api", "support", "security", "roadmap", "integrations"]
+CONCERNS = ["cost", "speed", "reliability", "complexity", "compliance"]
+
+
+def make_session(rng, n):
+    entities = [{"type": rng.choice(["PRODUCT", "FEATURE", "PERSON"]), "value": f"entity {rng.randrange(200)}",
+                 "importance": round(rng.random(), 2)} for _ in range(8)]
+    entities += [{"type": "CONCERN", "value": rng.choice(CONCERNS)} for _ in range(2)]
+    return {
+        "session_id": f"s{n}", "timestamp": 1.7e9 + n * 3600, "summary": f"discussed {rng.choice(TOPICS)} " * 5,
+        "entities": entities,
+        "topics": [{"name": rng.choice(TOPICS)} for _ in range(4)],
+        "questions": [{"topic": rng.choice(TOPICS)} for _ in range(3)],
+    }
+
+
+class FakeRepository:
+    """Stores JSON documents; every request pays the simulated latency."""
+
+    def __init__(self, latency_seconds):
+        self.latency_seconds = latency_seconds
+        self.sessions = {}
+        self.digests = {}
+        self.requests = 0
+
+    async def _request(self):
+        self.requests += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+    async def get_user_history(self, user_id, limit):
+        await self._request()
+        return [json.loads(raw) for raw in self.sessions[user_id][-limit:][::-1]]
+
+    async def get_last_session(self, user_id):
+        await self._request()
+        return json.loads(self.sessions[user_id][-1])
+
+    async def get_user_digest(self, user_id):
+        await self._request()
+        raw = self.digests.get(user_id)
+        return json.loads(raw) if raw else {}
+
+    async def store_user_digest(self, user_id, digest):
+        await self._request()
+        self.digests[user_id] = json.dumps(digest)
+
+
+def legacy_process(historical_data):
+    """The pre-digest aggregation of fetched sessions."""
+    entities, topics, questions = [], [], []
+    for session in historical_data:
+        entities.extend(session.get("entities", []))
+        topics.extend(session.get("topics", []))
+        questions.extend(session.get("questions", []))
+    entity_by_type = {}
+    for entity in entities:
+        entity_by_type.setdefault(entity.get("type"), []).append(entity)
+    topic_counts = Counter(t.get("name") for t in topics if t.get("name"))
+    question_counts = Counter(q.get("topic") for q in questions if q.get("topic"))
+    concern_counts = Counter(e.get("value") for e in entities if e.get("type") in ("PAIN_POINT", "CONCERN"))
+    return {
+        "entity_history": entity_by_type,
+        "conversation_topics": [t for t, _ in topic_counts.most_common(5)],
+        "question_topics": [t for t, _ in question_counts.most_common(5)],
+        "frequent_concerns": [c for c, _ in concern_counts.most_common(3)],
+    }
+
+
+async def legacy_build(repo, user_id, depth):
+    context = legacy_process(await repo.get_user_history(user_id, depth))
+    last = await repo.get_last_session(user_id)
+    context["last_conversation"] = {"summary": last["summary"]}
+    return context
+
+
+async def digest_build(repo, user_id, depth, cache=None):
+    async def load():
+        return CrossSessionDigest.from_dict(await repo.get_user_digest(user_id))
+
+    digest = await cache.get_or_compute(user_id, load) if cache is not None else await load()
+    context = digest.to_context(depth)
+    context["last_conversation"] = {"summary": digest.last_session["summary"]}
+    return context
+
+
+async def timed(label, repo, build, args, users):
+    repo.requests = 0
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for user_id in users:
+            await build(user_id)
+    builds = args.rounds * len(users)
+    seconds = (time.perf_counter() - start) / builds
+    print(f"  {label:<26} {seconds * 1000:8.3f} ms/build  {repo.requests / builds:5.2f} requests/build")
+    return seconds
+
+
+async def scenario(args):
+    rng = random.Random(5)
+    repo = FakeRepository(args.latency_ms / 1000)
+    users = [f"user-{n}" for n in range(args.users)]
+
+    # Close every historical session: stores raw sessions and maintains digests
+    update_seconds = 0.0
+    for user_id in users:
+        repo.sessions[user_id] = []
+        digest = CrossSessionDigest(window=args.window)
+        for n in range(args.sessions):
+            session = make_session(rng, n)
+            repo.sessions[user_id].append(json.dumps(session))
+            start = time.perf_counter()
+            digest.add_session(session)
+            document = digest.to_dict()
+            update_seconds += time.perf_counter() - start
+        repo.digests[user_id] = json.dumps(document)
+    closes = args.users * args.sessions
+
+    legacy = await legacy_build(repo, users[0], args.depth)
+    digest_context = await digest_build(repo, users[0], args.depth)
+    assert all(digest_context[key] == value for key, value in legacy.items()), "digest context differs from legacy"
+
+    print(f"{args.users} users x {args.sessions} past sessions, context depth {args.depth}, "
+          f"{args.latency_ms} ms simulated latency per request")
+    legacy_seconds = await timed("legacy fetch + aggregate", repo, lambda u: legacy_build(repo, u, args.depth), args, users)
+    digest_seconds = await timed("digest document", repo, lambda u: digest_build(repo, u, args.depth), args, users)
+    cache = AsyncMemoCache(max_entries=args.users)
+    cached_seconds = await timed("digest + in-process cache", repo,
+                                 lambda u: digest_build(repo, u, args.depth, cache), args, users)
+    print(f"  speedup: digest {legacy_seconds / digest_seconds:.1f}x, cached {legacy_seconds / cached_seconds:.1f}x")
+    print(f"  digest update on session close: {update_seconds / closes * 1000:.3f} ms "
+          f"(window {args.window}, document {len(repo.digests[users[0]]) / 1024:.1f} KiB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cross-session digests")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=300, help="Past sessions per user")
+    parser.add_argument("--depth", type=int, default=20, help="Sessions combined into context")
+    parser.add_argument("--window", type=int, default=20, help="Sessions kept in detail in a digest")
+    parser.add_argument("--rounds", type=int, default=5, help="New sessions per user")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Simulated latency per repository request")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    asyncio.run(scenario(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Entity Index Microbenchmarks
+
+Builds a session with N entities (default 10k) and times the entity memory
+queries against:
+- the legacy layout: summaries and attributes in two dicts keyed by raw name;
+  only exact-name lookups hit the dict, every other query scans (and sorts)
+  all entities
+- the EntityIndex: hash lookup by normalized name and alias, type and
+  recency indexes, and a sorted importance index
+
+It also compares per-turn persistence: the legacy full rewrite of every
+entity versus batched writes of changed entities in one pipeline. Uses
+fakeredis when installed, else a stub client counting round trips and bytes.
+
+Usage:
+    python benchmarks/entity_index_benchmark.py --entities 10000 --queries 2000
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.langchain_components.memory_manager.entity_index import EntityIndex
+
+try:
+    import fakeredis
+    FAKEREDIS_AVAILABLE = True
+except ImportError:
+    FAKEREDIS_AVAILABLE = False
+
+TYPES = ("person", "org", "product", "location", "date", "price", "feature", "issue")
+
+
+class CountingPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def hset(self, key, mapping):
+        self.commands.append(sum(len(k) + len(v) for k, v in mapping.items()))
+
+    def hdel(self, key, *fields):
+        self.commands.append(sum(len(f) for f in fields))
+
+    def expire(self, key, ttl):
+        self.commands.append(8)
+
+    def execute(self):
+        self.client.round_trips += 1
+        self.client.bytes += sum(self.commands)
+
+
+class CountingClient:
+    """Stand-in Redis client counting round trips and payload bytes."""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.bytes = 0
+
+    def pipeline(self, transaction=True):
+        return CountingPipeline(self)
+
+    def set(self, key, value):
+        self.round_trips += 1
+        self.bytes += len(value)
+
+
+def legacy_queries(summaries, attributes):
+    """The pre-index scanning implementations."""
+
+    def lookup(name):
+        if name in attributes:
+            return {"name": name, "summary": summaries.get(name, ""), **attributes[name]}
+        # Other spellings and aliases need a scan
+        for stored in attributes:
+            if stored.lower() == name.lower() or name in attributes[stored].get("aliases", []):
+                return {"name": stored, "summary": summaries.get(stored, ""), **attributes[stored]}
+        return None
+
+    def by_type(entity_type):
+        return [{"name": n, "summary": summaries.get(n, ""), **a}
+                for n, a in attributes.items() if a.get("type") == entity_type]
+
+    def most_recent_of_type(entity_type):
+        matches = [e for e in by_type(entity_type) if "last_seen" in e]
+        return sorted(matches, key=lambda e: e["last_seen"], reverse=True)[:1]
+
+    def by_importance(minimum):
+        entities = [{"name": n, "summary": summaries.get(n, ""), **a}
+                    for n, a in attributes.items() if a.get("importance", 0.0) >= minimum]
+        return sorted(entities, key=lambda e: e["importance"], reverse=True)
+
+    return lookup, by_type, most_recent_of_type, by_importance
+
+
+def timed(function, arguments):
+    start = time.perf_counter()
+    for argument in arguments:
+        function(argument)
+    return (time.perf_counter() - start) / len(arguments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indexed entity memory")
+    parser.add_argument("--entities", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--updates-per-turn", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    rng = random.Random(13)
+    records = []
+    for n in range(args.entities):
+        records.append({
+            "name": f"Entity {n}", "type": rng.choice(TYPES), "summary": f"summary of entity {n} " * 4,
+            "aliases": [f"E{n}"], "sentiment": 0.0, "importance": round(rng.random(), 3),
+            "first_seen": float(n), "last_seen": float(n), "mentions": 1,
+        })
+
+    summaries = {r["name"]: r["summary"] for r in records}
+    attributes = {r["name"]: {k: v for k, v in r.items() if k not in ("name", "summary")} for r in records}
+    start = time.perf_counter()
+    index = EntityIndex()
+    index.load(dict(r) for r in records)
+    print(f"{args.entities} entities; index built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    names = [f"Entity {rng.randrange(args.entities)}" for _ in range(args.queries)]
+    lowercase = [name.lower() for name in names[: max(1, args.queries // 20)]]
+    aliases = [f"E{rng.randrange(args.entities)}" for _ in range(args.queries)]
+    types = [rng.choice(TYPES) for _ in range(max(1, args.queries // 20))]
+    legacy_lookup, legacy_by_type, legacy_recent, legacy_importance = legacy_queries(summaries, attributes)
+    cases = [
+        ("lookup exact name", legacy_lookup, lambda n: index.get(n), names),
+        ("lookup other casing", legacy_lookup, lambda n: index.get(n), lowercase),
+        ("lookup by alias", legacy_lookup, lambda n: index.get(n), aliases[: max(1, args.queries // 20)]),
+        ("entities of type", legacy_by_type, index.by_type, types),
+        ("most recent of type", legacy_recent, lambda t: index.most_recent(t), types),
+        ("importance >= 0.9", legacy_importance, index.by_importance, [0.9] * len(types)),
+    ]
+    print(f"  {'query':<20} {'legacy':>12} {'indexed':>12} {'speedup':>9}")
+    for label, legacy, indexed, arguments in cases:
+        legacy_seconds, indexed_seconds = timed(legacy, arguments), timed(indexed, arguments)
+        print(f"  {label:<20} {legacy_seconds * 1e6:10.1f}us {indexed_seconds * 1e6:10.1f}us "
+              f"{legacy_seconds / indexed_seconds:8.0f}x")
+
+    # Per-turn persistence of a few updated entities
+    if FAKEREDIS_AVAILABLE:
+        from src.langchain_components.memory_manager.memory_store import RedisMemoryStore
+        legacy_client, batched_client = fakeredis.FakeRedis(), fakeredis.FakeRedis()
+        store = RedisMemoryStore(redis_client=batched_client)
+        backend = "fakeredis"
+    else:
+        legacy_client, batched_client = CountingClient(), CountingClient()
+        backend = "stub client"
+    index.take_changes()
+
+    legacy_seconds = batched_seconds = 0.0
+    for turn in range(args.turns):
+        keys = [f"entity {rng.randrange(args.entities)}" for _ in range(args.updates_per_turn)]
+        for key in keys:
+            index.records[key]["mentions"] += 1
+            index.records[key]["last_seen"] = args.entities + turn
+            index.touch(key)
+
+        start = time.perf_counter()
+        legacy_client.set("session_entities:s", json.dumps({"entities": summaries, "attributes": attributes}))
+        legacy_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        changed, removed = index.take_changes()
+        if FAKEREDIS_AVAILABLE:
+            store.save_entities("s", changed, removed)
+        else:
+            pipe = batched_client.pipeline()
+            pipe.hset("entities:s", mapping={k: json.dumps(r) for k, r in changed.items()})
+            pipe.execute()
+        batched_seconds += time.perf_counter() - start
+
+    print(f"Persistence per turn ({args.updates_per_turn} updated entities, {backend})")
+    print(f"  legacy full rewrite   {legacy_seconds / args.turns * 1000:8.3f} ms")
+    print(f"  batched pipeline      {batched_seconds / args.turns * 1000:8.3f} ms")
+    if not FAKEREDIS_AVAILABLE:
+        print(f"  bytes per turn: legacy {legacy_client.bytes / args.turns:,.0f}, "
+              f"batched {batched_client.bytes / args.turns:,.0f}; "
+              f"round trips per turn: {batched_client.round_trips / args.turns:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Filtered Search Benchmark
+
+Builds a FAISS store of random embeddings spread over tenants of skewed sizes
+and runs filtered queries (per tenant, and per tenant + language) with:
+- the legacy path: top-k similarity search, then metadata post-filtering,
+  with over-fetch multipliers of 1x, 10x and 100x
+- FilteredSearch: metadata index with exact scan or filtered ANN search
+
+Reports recall@k against a brute-force ground truth and mean/p95 latency,
+bucketed by filter selectivity.
+
+Usage:
+    python benchmarks/filtered_search_benchmark.py --documents 100000 --dimensions 64 --queries 200
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import faiss
+from langchain.docstore.in_memory import InMemoryDocstore
+from langchain.schema import Document
+from langchain.vectorstores import FAISS
+
+from src.langchain_components.rag.filtered_search import FilteredSearch, matches_filters
+
+
+def build_store(documents: int, dimensions: int, tenants: int, hnsw: bool, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((documents, dimensions)).astype(np.float32)
+    # Zipf-like tenant sizes: a few large tenants, a long tail of small ones
+    weights = np.array([1 / (rank + 1) for rank in range(tenants)])
+    tenant_of = rng.choice(tenants, size=documents, p=weights / weights.sum())
+
+    index = faiss.IndexHNSWFlat(dimensions, 32) if hnsw else faiss.IndexFlatL2(dimensions)
+    index.add(vectors)
+    docs = {
+        str(i): Document(page_content=str(i), metadata={"tenant": f"t{tenant_of[i]}", "lang": ("en", "de", "fr")[i % 3]})
+        for i in range(documents)
+    }
+    queries = {}
+    store = FAISS(lambda text: queries[text], index, InMemoryDocstore(docs), {i: str(i) for i in range(documents)})
+    return store, vectors, queries
+
+
+def ground_truth(store, vectors, query_vector, k, filters):
+    matching = np.array([
+        i for i in range(len(vectors)) if matches_filters(store.docstore.search(str(i)).metadata, filters)
+    ], dtype=np.int64)
+    if not len(matching):
+        return [], 0
+    distances = ((vectors[matching] - query_vector) ** 2).sum(axis=1)
+    return [str(i) for i in matching[np.argsort(distances)[:k]]], len(matching)
+
+
+def post_filter(store, query, k, filters, multiplier):
+    """The legacy path: unfiltered similarity search, then filter."""
+    results = store.similarity_search_with_score(query, k=k * multiplier)
+    return [doc for doc, _ in results if matches_filters(doc.metadata, filters)][:k]
+
+
+def recall(found, expected):
+    if not expected:
+        return 1.0
+    return len({doc.page_content for doc in found} & set(expected)) / len(expected)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pre-search metadata filtering")
+    parser.add_argument("--documents", type=int, default=100000)
+    parser.add_argument("--dimensions", type=int, default=64)
+    parser.add_argument("--tenants", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--exact-scan-max", type=int, default=4096)
+    parser.add_argument("--hnsw", action="store_true", help="Use an HNSW index instead of a flat index")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    store, vectors, queries = build_store(args.documents, args.dimensions, args.tenants, args.hnsw)
+    rng = random.Random(11)
+    np_rng = np.random.default_rng(11)
+
+    searcher = FilteredSearch(exact_scan_max=args.exact_scan_max)
+    queries["warm"] = [0.0] * args.dimensions
+    start = time.perf_counter()
+    searcher.search(store, "warm", 1, {"tenant": "t0"})
+    print(f"{args.documents} documents, {args.tenants} tenants, {'HNSW' if args.hnsw else 'flat'} index; "
+          f"metadata index built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    methods = [(f"post-filter {m}x", lambda q, f, m=m: post_filter(store, q, args.k, f, m)) for m in (1, 10, 100)]
+    methods.append(("pre-filter", lambda q, f: [doc for doc, _ in searcher.search(store, q, args.k, f)]))
+
+    buckets = {"< 0.5%": (0, 0.005), "0.5-5%": (0.005, 0.05), ">= 5%": (0.05, 1.01)}
+    stats = {(bucket, label): ([], []) for bucket in buckets for label, _ in methods}
+    for n in range(args.queries):
+        filters = {"tenant": f"t{min(int(rng.paretovariate(0.8)) - 1, args.tenants - 1)}"}
+        if n % 2:
+            filters["lang"] = rng.choice(["en", "de", "fr"])
+        query = f"q{n}"
+        queries[query] = np_rng.standard_normal(args.dimensions).astype(np.float32).tolist()
+        expected, matching = ground_truth(store, vectors, np.array(queries[query]), args.k, filters)
+        bucket = next(name for name, (low, high) in buckets.items() if low <= matching / args.documents < high)
+
+        for label, method in methods:
+            began = time.perf_counter()
+            found = method(query, filters)
+            stats[(bucket, label)][0].append(time.perf_counter() - began)
+            stats[(bucket, label)][1].append(recall(found, expected))
+
+    for bucket in buckets:
+        count = len(stats[(bucket, methods[0][0])][0])
+        if not count:
+            continue
+        print(f"Selectivity {bucket} ({count} queries)")
+        for label, _ in methods:
+            latencies, recalls = stats[(bucket, label)]
+            print(f"  {label:<18} recall@{args.k} {sum(recalls) / len(recalls):6.1%}  "
+                  f"mean {sum(latencies) / len(latencies) * 1000:7.2f} ms  "
+                  f"p95 {percentile(latencies, 0.95) * 1000:7.2f} ms")
+    print(f"Strategies: {searcher.get_metrics()}")
+
+
+if __name__ == "__main__":
+    main()
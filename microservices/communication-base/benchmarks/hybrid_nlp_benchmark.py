@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Hybrid NLP Analyzer Fan-out Benchmark
+
+Runs HybridNLPProcessor.process_message over a message trace with stub
+analyzers (simulated LLM latency for entities/intents/sentiment, a blocking
+CPU-bound local model, and an occasional straggler) and compares:
+- the legacy path: analyzers awaited one after another, no timeouts
+- the analyzer engine: concurrent fan-out with timeouts, without caching
+- the analyzer engine with the message-hash result cache
+
+Reports mean/p95/max message latency, degraded analyzer counts and the cache
+hit ratio.
+
+Usage:
+    python benchmarks/hybrid_nlp_benchmark.py --messages 300 --distinct 120 --timeout-ms 150
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.langchain_components.nlp.hybrid_processor import HybridNLPProcessor
+
+
+class StubConfig:
+    def __init__(self, settings):
+        self.settings = settings
+
+    def get_config(self, bot_type):
+        return self.settings
+
+
+class StubProcessor(HybridNLPProcessor):
+    """Hybrid processor whose analyzers simulate model latency."""
+
+    def __init__(self, latencies, straggler_rate, seed=1, **kwargs):
+        super().__init__(**kwargs)
+        self.latencies = latencies
+        self.straggler_rate = straggler_rate
+        self.rng = random.Random(seed)
+
+    async def _delay(self, name):
+        seconds = self.latencies[name] / 1000
+        if self.rng.random() < self.straggler_rate:
+            seconds *= 10
+        await asyncio.sleep(seconds)
+
+    async def _extract_entities(self, message, bot_type, session_id):
+        await self._delay("entities")
+        return [{"type": "product", "value": message.split()[-1], "confidence": 0.9}]
+
+    async def _extract_intents(self, message, bot_type):
+        await self._delay("intents")
+        return [{"name": "pricing_inquiry", "confidence": 0.8}]
+
+    async def _analyze_sentiment(self, message, bot_type):
+        await self._delay("sentiment")
+        return {"sentiment": "positive", "score": 0.8}
+
+
+def local_model(milliseconds):
+    """Blocking stand-in for a local (CPU-bound) model."""
+    def analyze(message, bot_type):
+        time.sleep(milliseconds / 1000)
+        return {"language": "en"}
+    return analyze
+
+
+async def legacy_process(processor, message, model):
+    """The sequential pre-engine flow."""
+    result = {"entities": [], "intents": [], "sentiment": None}
+    result["entities"].extend(await processor._extract_entities(message, "sales", "s"))
+    result["intents"].extend(await processor._extract_intents(message, "sales"))
+    result["sentiment"] = await processor._analyze_sentiment(message, "sales")
+    result["language"] = model(message, "sales")
+    return result
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent NLP analyzer fan-out")
+    parser.add_argument("--messages", type=int, default=300)
+    parser.add_argument("--distinct", type=int, default=120, help="Distinct messages in the trace")
+    parser.add_argument("--entities-ms", type=float, default=80)
+    parser.add_argument("--intents-ms", type=float, default=60)
+    parser.add_argument("--sentiment-ms", type=float, default=50)
+    parser.add_argument("--model-ms", type=float, default=30)
+    parser.add_argument("--straggler-rate", type=float, default=0.03)
+    parser.add_argument("--timeout-ms", type=float, default=150)
+    parser.add_argument("--concurrency", type=int, default=8, help="Messages processed at once")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    latencies = {"entities": args.entities_ms, "intents": args.intents_ms, "sentiment": args.sentiment_ms}
+    rng = random.Random(7)
+    weights = [1 / (rank + 1) for rank in range(args.distinct)]
+    trace = [f"how much is product-{i}" for i in rng.choices(range(args.distinct), weights, k=args.messages)]
+
+    def make_processor(cache_size):
+        processor = StubProcessor(
+            latencies, args.straggler_rate,
+            config_integration=StubConfig({}),
+            analyzer_timeout_seconds=args.timeout_ms / 1000,
+            analyzer_cache_size=cache_size
+        )
+        processor.register_analyzer("language", local_model(args.model_ms), fallback={}, cpu_bound=True)
+        return processor
+
+    async def replay(process):
+        semaphore = asyncio.Semaphore(args.concurrency)
+        timings = []
+
+        async def one(message):
+            async with semaphore:
+                start = time.perf_counter()
+                result = await process(message)
+                timings.append(time.perf_counter() - start)
+                return result
+
+        results = await asyncio.gather(*(one(message) for message in trace))
+        return timings, results
+
+    legacy = StubProcessor(latencies, args.straggler_rate)
+    model = local_model(args.model_ms)
+    runs = [("legacy sequential", None, lambda m: legacy_process(legacy, m, model))]
+    for label, cache_size in (("engine, no cache", 0), ("engine + cache", 4096)):
+        processor = make_processor(cache_size)
+        runs.append((label, processor, lambda m, p=processor: p.process_message(m, "s", "sales", "u")))
+
+    print(f"{len(trace)} messages ({args.distinct} distinct), concurrency {args.concurrency}, "
+          f"analyzer timeout {args.timeout_ms:.0f} ms")
+    for label, processor, process in runs:
+        start = time.perf_counter()
+        timings, results = asyncio.run(replay(process))
+        wall = time.perf_counter() - start
+        degraded = sum(len(r.get("metadata", {}).get("degraded", [])) for r in results)
+        line = (f"  {label:<18} mean {sum(timings) / len(timings) * 1000:7.1f} ms  "
+                f"p95 {percentile(timings, 0.95) * 1000:7.1f} ms  max {max(timings) * 1000:7.1f} ms  "
+                f"wall {wall:5.2f} s  degraded {degraded}")
+        if processor is not None:
+            line += f"  cache hit ratio {processor.get_analyzer_metrics()['cache']['hit_ratio']:.1%}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
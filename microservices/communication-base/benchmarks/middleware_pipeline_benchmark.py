@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Middleware Pipeline Benchmark
+
+Runs the base pre- and post-processors with simulated model/service latencies
+(each processor awaits a sleep before doing its real work) and compares:
+- the legacy pipeline: every processor in sequence
+- the dependency-graph scheduler: independent processors concurrently
+
+Reports per-request latency for each stage, and per-processor timings from
+the scheduler's instrumentation.
+
+Usage:
+    python benchmarks/middleware_pipeline_benchmark.py --requests 200 --intent-ms 40 --entity-ms 30
+"""
+
+import argparse
+import asyncio
+import functools
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.conversation.middleware.base_processors import (
+    entity_extraction_processor,
+    intent_detection_processor,
+    message_summarization_processor,
+    response_enhancement_processor,
+    response_formatting_processor,
+    sentiment_analysis_processor,
+)
+from src.conversation.middleware.scheduler import ProcessorGraph
+
+
+def with_latency(processor, milliseconds: float):
+    """Wrap a processor so it first awaits a simulated remote call."""
+    @functools.wraps(processor)
+    async def slow(*args):
+        await asyncio.sleep(milliseconds / 1000)
+        return await processor(*args)
+    return slow
+
+
+async def run_sequential(processors, text, context, call):
+    """The legacy pipeline loop."""
+    current_context = context.copy()
+    for processor in processors:
+        text, updates = await call(processor, text, current_context)
+        if updates:
+            current_context.update(updates)
+    return text, current_context
+
+
+async def measure(runner, requests):
+    latencies = []
+    for n in range(requests):
+        start = time.perf_counter()
+        await runner(n)
+        latencies.append(time.perf_counter() - start)
+    return sum(latencies) / len(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel middleware execution")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--intent-ms", type=float, default=40)
+    parser.add_argument("--entity-ms", type=float, default=30)
+    parser.add_argument("--sentiment-ms", type=float, default=20)
+    parser.add_argument("--summary-ms", type=float, default=60)
+    parser.add_argument("--format-ms", type=float, default=5)
+    parser.add_argument("--enhance-ms", type=float, default=15)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    pre = [
+        with_latency(intent_detection_processor, args.intent_ms),
+        with_latency(entity_extraction_processor, args.entity_ms),
+        with_latency(sentiment_analysis_processor, args.sentiment_ms),
+        with_latency(message_summarization_processor, args.summary_ms),
+    ]
+    post = [
+        with_latency(response_formatting_processor, args.format_ms),
+        with_latency(response_enhancement_processor, args.enhance_ms),
+    ]
+    # wraps() copies the declarations along with the name
+    pre_graph, post_graph = ProcessorGraph(pre), ProcessorGraph(post)
+    print(f"Pre-processor levels: {pre_graph.levels()}")
+    print(f"Post-processor levels: {post_graph.levels()}")
+
+    context = {"messages": [{"role": "user", "content": "hi"}] * 25, "sentiment_history": []}
+    message = "I'm frustrated, the product XR-7 costs $499 and my email is a@b.com"
+    pre_call = lambda processor, text, ctx: processor(text, ctx, "support")
+    post_call = lambda processor, text, ctx: processor(text, message, ctx, "support")
+
+    timings = {}
+
+    def record(name, seconds):
+        stats = timings.setdefault(name, [0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+
+    async def scenario():
+        results = {}
+        results["pre sequential"] = await measure(lambda n: run_sequential(pre, message, context, pre_call), args.requests)
+        results["pre graph"] = await measure(lambda n: pre_graph.run(message, context, pre_call, record), args.requests)
+        results["post sequential"] = await measure(
+            lambda n: run_sequential(post, "Here is a solution?", context, post_call), args.requests)
+        results["post graph"] = await measure(
+            lambda n: post_graph.run("Here is a solution?", context, post_call, record), args.requests)
+        return results
+
+    results = asyncio.run(scenario())
+    for stage in ("pre", "post"):
+        sequential, graph = results[f"{stage} sequential"], results[f"{stage} graph"]
+        print(f"  {stage:<5} sequential {sequential * 1000:7.2f} ms  graph {graph * 1000:7.2f} ms  "
+              f"speedup {sequential / graph:5.2f}x")
+
+    print("Per-processor timings (graph)")
+    for name, (calls, total) in timings.items():
+        print(f"  {name:<34} mean {total / calls * 1000:7.2f} ms over {calls} calls")
+
+
+if __name__ == "__main__":
+    main()
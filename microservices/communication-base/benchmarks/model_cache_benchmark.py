@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Model Cache Eviction Benchmark
+
+Replays a skewed model request trace over fake models of mixed sizes (small
+adapters to large base models) and compares:
+- the legacy cache (5 entries, linear-scan eviction, no size accounting)
+- the memory-aware cache under LRU and LFU with a byte budget
+
+Reports hit ratio, bytes (re)loaded, peak resident bytes against the budget,
+and the per-operation cost of eviction as the number of cached models grows.
+
+Usage:
+    python benchmarks/model_cache_benchmark.py --requests 50000 --budget-gb 24
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.models.llm.model_cache import ModelCacheEngine
+
+GB = 1024 ** 3
+MB = 1024 ** 2
+
+
+class FakeModel:
+    """Stand-in model reporting a resident size."""
+
+    def __init__(self, name: str, nbytes: int):
+        self.name = name
+        self.nbytes = nbytes
+
+
+def build_catalog(seed: int = 3):
+    """Mixed catalog: a few large base models and many small adapters."""
+    rng = random.Random(seed)
+    catalog = {f"base-{i}": FakeModel(f"base-{i}", rng.choice([4, 7, 13]) * GB) for i in range(4)}
+    catalog.update({f"adapter-{i}": FakeModel(f"adapter-{i}", rng.randint(20, 400) * MB) for i in range(40)})
+    return catalog
+
+
+def build_trace(catalog, count: int, seed: int = 9):
+    """Zipf-like trace whose popular set drifts every 10k requests."""
+    rng = random.Random(seed)
+    names = list(catalog)
+    trace = []
+    for start in range(0, count, 10000):
+        rng.shuffle(names)
+        weights = [1 / (rank + 1) ** 0.9 for rank in range(len(names))]
+        trace.extend(rng.choices(names, weights, k=min(10000, count - start)))
+    return trace
+
+
+class LegacyModelCache:
+    """The pre-budget cache: fixed entry count, linear scan for the oldest entry."""
+
+    def __init__(self, max_cache_size: int = 5):
+        self.max_cache_size = max_cache_size
+        self.cache = {}
+        self.tick = 0
+
+    def get(self, model_id):
+        if model_id not in self.cache:
+            return None
+        self.tick += 1
+        model, _ = self.cache[model_id]
+        self.cache[model_id] = (model, self.tick)
+        return model
+
+    def put(self, model_id, model):
+        if len(self.cache) >= self.max_cache_size and model_id not in self.cache:
+            oldest = min(self.cache, key=lambda key: self.cache[key][1])
+            del self.cache[oldest]
+        self.tick += 1
+        self.cache[model_id] = (model, self.tick)
+
+    @property
+    def resident_bytes(self):
+        return sum(model.nbytes for model, _ in self.cache.values())
+
+
+def replay(cache, catalog, trace):
+    hits = 0
+    loaded = peak = 0
+    for model_id in trace:
+        if cache.get(model_id) is not None:
+            hits += 1
+            continue
+        model = catalog[model_id]
+        loaded += model.nbytes
+        cache.put(model_id, model)
+        peak = max(peak, cache.resident_bytes)
+    return hits / len(trace), loaded, peak
+
+
+def eviction_cost(make_cache, entries: int, operations: int = 20000) -> float:
+    """Microseconds per put when every put evicts, with `entries` models cached."""
+    cache = make_cache(entries)
+    for i in range(entries):
+        cache.put(f"m{i}", FakeModel(f"m{i}", 1))
+    start = time.perf_counter()
+    for i in range(entries, entries + operations):
+        cache.put(f"m{i}", FakeModel(f"m{i}", 1))
+    return (time.perf_counter() - start) / operations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model cache eviction policies")
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--budget-gb", type=float, default=24.0)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    catalog = build_catalog()
+    trace = build_trace(catalog, args.requests)
+    budget = int(args.budget_gb * GB)
+    print(f"{len(catalog)} fake models ({sum(m.nbytes for m in catalog.values()) / GB:.1f} GB total), "
+          f"{len(trace)} requests, budget {args.budget_gb:.0f} GB")
+
+    caches = [
+        ("legacy (5 entries)", LegacyModelCache()),
+        ("lru + byte budget", ModelCacheEngine(max_cache_size=1000, max_memory_bytes=budget,
+                                               eviction_policy="lru", expiration_time=float("inf"))),
+        ("lfu + byte budget", ModelCacheEngine(max_cache_size=1000, max_memory_bytes=budget,
+                                               eviction_policy="lfu", expiration_time=float("inf"))),
+    ]
+    for label, cache in caches:
+        hit_ratio, loaded, peak = replay(cache, catalog, trace)
+        over = " OVER BUDGET" if peak > budget else ""
+        print(f"  {label:<20} hit ratio {hit_ratio:6.1%}  loaded {loaded / GB:8.1f} GB  "
+              f"peak resident {peak / GB:5.1f} GB{over}")
+
+    print("Eviction cost per put (every put evicts)")
+    for entries in (10, 100, 1000, 5000):
+        legacy = eviction_cost(lambda n: LegacyModelCache(n), entries)
+        engine = eviction_cost(lambda n: ModelCacheEngine(max_cache_size=n, expiration_time=float("inf"),
+                                                          size_estimator=lambda m: m.nbytes), entries)
+        print(f"  {entries:>5} models: legacy {legacy:8.2f} us, lru engine {engine:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
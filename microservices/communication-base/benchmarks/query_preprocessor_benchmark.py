@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Query Preprocessor Benchmark
+
+Replays a skewed stream of concurrent queries through QueryPreprocessor backed
+by a fake LLM that injects latency, with and without memoization, coalescing
+and the rule-based fast path. Reports wall time, LLM calls and cache metrics.
+
+Entity extraction goes through the hybrid NLP processor, which has no
+extraction chain configured here, so only the LLM cost is measured. Bot
+configuration is replaced by an empty config.
+
+Usage:
+    python benchmarks/query_preprocessor_benchmark.py --queries 1000 --llm-ms 50 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.langchain_components.rag.query_preprocessor import QueryPreprocessor
+
+SHORT_QUERIES = ["pricing", "how do I cancel", "refund policy", "what is SSO", "compare plans", "invoices"]
+LONG_QUERIES = [
+    "we are migrating from a competitor and need to keep our historical reports available",
+    "my team keeps getting logged out of the dashboard after the last release",
+    "can the enterprise tier support data residency requirements for our German subsidiary",
+    "our finance department wants consolidated billing across three workspaces",
+]
+
+
+class FakeLLM:
+    """LLM stand-in that sleeps, counts calls and returns parseable output."""
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.calls = 0
+
+    async def apredict(self, prompt: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if "RAG System:" in prompt:
+            return json.dumps({
+                "original_query": "q", "reformulated_query": "q expanded",
+                "rag_system": "vector_store", "explanation": "fake",
+            })
+        return json.dumps({"primary_intent": "informational", "question_type": "informational"})
+
+
+class EmptyConfig:
+    def get_config(self, bot_type):
+        return {}
+
+
+def build_stream(count: int, seed: int = 21):
+    rng = random.Random(seed)
+    queries = SHORT_QUERIES + LONG_QUERIES
+    weights = [1 / (rank + 1) for rank in range(len(queries))]
+    stream = []
+    for _ in range(count):
+        query = rng.choices(queries, weights)[0]
+        stream.append(query.capitalize() + rng.choice(["", "?"]) if rng.random() < 0.3 else query)
+    return stream
+
+
+async def run(preprocessor: QueryPreprocessor, stream, concurrency: int) -> float:
+    queue = list(stream)
+
+    async def worker():
+        while queue:
+            await preprocessor.preprocess_query(queue.pop(), "support")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memoized query preprocessing")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--llm-ms", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    stream = build_stream(args.queries)
+
+    configs = [
+        ("uncached", dict(cache_size=0, fast_path_max_words=0)),
+        ("fast path only", dict(cache_size=0)),
+        ("memoized + coalesced", dict(fast_path_max_words=0)),
+        ("memoized + fast path", dict()),
+    ]
+    baseline = None
+    for label, options in configs:
+        llm = FakeLLM(args.llm_ms)
+        preprocessor = QueryPreprocessor(llm=llm, **options)
+        preprocessor.config_inheritance = EmptyConfig()
+        elapsed = asyncio.run(run(preprocessor, stream, args.concurrency))
+        baseline = baseline or elapsed
+        metrics = preprocessor.get_cache_metrics()
+        cache_note = (f", hit ratio {metrics['hit_ratio']:.1%} ({metrics['coalesced']} coalesced)"
+                      if metrics else "")
+        print(f"{label:<22} {elapsed:7.2f} s  {llm.calls:6d} LLM calls  "
+              f"{baseline / elapsed:5.1f}x{cache_note}")
+
+
+if __name__ == "__main__":
+    main()
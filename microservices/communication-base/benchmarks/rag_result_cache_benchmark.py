@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+RAG Result Cache Replay Benchmark
+
+Replays a synthetic query log through RAGResultCache and reports hit ratios and
+the modeled retrieval latency with and without the cache.
+
+The log draws intents from a Zipf distribution and phrases each one with a
+random template, casing, punctuation and filler words, so it contains exact
+repeats, normalization-only repeats and paraphrases. Pipeline and embedding
+latencies are modeled (not slept) so long logs replay quickly; the cache's own
+overhead is measured.
+
+Usage:
+    python benchmarks/rag_result_cache_benchmark.py --queries 20000 --pipeline-ms 450
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.langchain_components.rag.result_cache import RAGResultCache
+
+TOPICS = [
+    "pricing of the pro plan", "refund policy", "cancel my subscription", "reset my password",
+    "integrate with salesforce", "data retention period", "upgrade to enterprise", "invoice history",
+    "two factor authentication", "api rate limits", "onboarding checklist", "export my data",
+    "change billing address", "team member permissions", "mobile app support", "service status",
+]
+TEMPLATES = [
+    "what is the {}", "tell me about the {}", "{}", "can you explain the {}",
+    "how does the {} work", "i have a question about {}", "info on {}",
+]
+FILLERS = ["", "", "", "please", "quickly", "hey"]
+DIMENSIONS = 256
+
+
+def hashed_embedding(text: str):
+    """Deterministic bag-of-words embedding (stand-in for a real model)."""
+    vector = [0.0] * DIMENSIONS
+    for word in text.split():
+        digest = hashlib.md5(word.encode()).digest()
+        vector[int.from_bytes(digest[:4], "little") % DIMENSIONS] += 1.0 if digest[4] & 1 else -1.0
+    return vector
+
+
+def build_log(count: int, users: int, seed: int = 13):
+    """Build a synthetic query log of (user, intent, query) tuples."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(len(TOPICS))]
+    log = []
+    for _ in range(count):
+        intent = rng.choices(range(len(TOPICS)), weights)[0]
+        query = rng.choice(TEMPLATES).format(TOPICS[intent])
+        filler = rng.choice(FILLERS)
+        if filler:
+            query = f"{query} {filler}"
+        if rng.random() < 0.3:
+            query = query.capitalize()
+        query += rng.choice(["", "?", "?", ".", " ?"])
+        log.append((f"user-{rng.randrange(users)}", intent, query))
+    return log
+
+
+class ReplayClock:
+    """Clock advanced by one second per replayed query."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def replay(log, cache: RAGResultCache, clock):
+    """Replay the log; returns (pipeline runs, embeddings, wrong answers, cache seconds)."""
+    embeddings = 0
+    original_function = cache.embedding_function
+
+    def counting_embedding(text):
+        nonlocal embeddings
+        embeddings += 1
+        return original_function(text)
+
+    if original_function is not None:
+        cache.embedding_function = counting_embedding
+
+    runs = wrong = 0
+    overhead = 0.0
+    for user, intent, query in log:
+        clock.now += 1.0
+        scope = cache.make_scope("support", user, {"region": "eu"}, None, 5)
+        start = time.perf_counter()
+        lookup = await cache.lookup(query, scope)
+        overhead += time.perf_counter() - start
+        if lookup.documents is None:
+            runs += 1
+            start = time.perf_counter()
+            cache.store(lookup, scope, [f"doc-{intent}"])
+            overhead += time.perf_counter() - start
+        elif lookup.documents != [f"doc-{intent}"]:
+            wrong += 1
+    return runs, embeddings, wrong, overhead
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a query log through the RAG result cache")
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--max-entries", type=int, default=10000)
+    parser.add_argument("--ttl", type=float, default=3600.0, help="TTL in replay seconds (one query per second)")
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--pipeline-ms", type=float, default=450.0, help="Modeled full RAG pipeline latency")
+    parser.add_argument("--embedding-ms", type=float, default=15.0, help="Modeled query embedding latency")
+    args = parser.parse_args()
+
+    log = build_log(args.queries, args.users)
+    baseline_ms = len(log) * args.pipeline_ms
+    print(f"Replaying {len(log)} queries from {args.users} users "
+          f"(no cache: {baseline_ms / len(log):.0f} ms/query modeled)")
+
+    for label, embedding in (("exact only", None), ("exact + semantic", hashed_embedding)):
+        clock = ReplayClock()
+        cache = RAGResultCache(
+            embedding_function=embedding, max_entries=args.max_entries, ttl_seconds=args.ttl,
+            similarity_threshold=args.threshold, clock=clock
+        )
+        runs, embeddings, wrong, overhead = asyncio.run(replay(log, cache, clock))
+        metrics = cache.get_metrics()
+        modeled_ms = runs * args.pipeline_ms + embeddings * args.embedding_ms + overhead * 1000
+        print(f"{label}:")
+        print(f"  hit ratio      {metrics['hit_ratio']:.1%} "
+              f"(exact {metrics['exact_hit_ratio']:.1%}, semantic {metrics['semantic_hit_ratio']:.1%})")
+        print(f"  wrong reuse    {wrong} ({wrong / max(1, metrics['semantic_hits']):.1%} of semantic hits)")
+        print(f"  cache overhead {overhead / len(log) * 1e6:.1f} us/query, entries {metrics['entries']}")
+        print(f"  modeled        {modeled_ms / len(log):.0f} ms/query ({baseline_ms / modeled_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Redis Batch Operations Benchmark
+
+Loads and saves session memory (tiers, entities, profile, context: several
+keys per session) against fakeredis and compares:
+- the legacy access pattern: one command (one round trip) per key
+- the batch store: one MGET per session load and one pipeline per save
+- the batch store with client-side caching of hot (profile) keys; fakeredis
+  has no client tracking, so this runs in the TTL-only fallback mode
+
+Round trips are counted at the connection level (each packed command sent to
+the server), and an optional simulated network latency is added to each one.
+
+Usage:
+    python benchmarks/redis_batch_benchmark.py --sessions 200 --loads 5 --latency-ms 0.5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import fakeredis.aioredis
+from fakeredis._clients._async import FakeAsyncRedisConnection
+
+from src.langchain_components.memory_manager.batch_store import RedisBatchStore, decode, encode
+
+SESSION_KEYS = ("short_term", "medium_term", "long_term", "entities", "context", "summary", "flags")
+ROUND_TRIPS = {"count": 0}
+
+
+def instrument(latency_seconds):
+    """Count (and delay) every packed command sent to the fake server."""
+    original = FakeAsyncRedisConnection.send_packed_command
+
+    async def send_packed_command(self, command, check_health=True):
+        ROUND_TRIPS["count"] += 1
+        if latency_seconds:
+            await asyncio.sleep(latency_seconds)
+        return await original(self, command, check_health)
+
+    FakeAsyncRedisConnection.send_packed_command = send_packed_command
+
+
+def session_keys(session):
+    return [f"memory:{session}:{name}" for name in SESSION_KEYS] + [f"profile:user-{session % 20}"]
+
+
+def session_values(session):
+    return {key: {"session": session, "data": ["message"] * 20} for key in session_keys(session)}
+
+
+async def legacy_load(client, session):
+    values = {}
+    for key in session_keys(session):
+        raw = await client.get(key)
+        if raw is not None:
+            values[key] = decode(raw)
+    return values
+
+
+async def legacy_save(client, session, ttl):
+    for key, value in session_values(session).items():
+        await client.set(key, encode(value), ex=ttl)
+
+
+async def run(label, load, save, lookup, args):
+    ROUND_TRIPS["count"] = 0
+    start = time.perf_counter()
+    for session in range(args.sessions):
+        await save(session)
+    save_trips = ROUND_TRIPS["count"]
+    save_seconds = time.perf_counter() - start
+
+    ROUND_TRIPS["count"] = 0
+    start = time.perf_counter()
+    for _ in range(args.loads):
+        for session in range(args.sessions):
+            values = await load(session)
+            assert len(values) == len(SESSION_KEYS) + 1
+    load_trips = ROUND_TRIPS["count"]
+    load_seconds = time.perf_counter() - start
+
+    # Per-message profile lookups (hot keys)
+    ROUND_TRIPS["count"] = 0
+    for _ in range(args.loads):
+        for session in range(args.sessions):
+            await lookup(f"profile:user-{session % 20}")
+    lookup_trips = ROUND_TRIPS["count"]
+
+    loads = args.sessions * args.loads
+    print(f"  {label:<22} load: {load_trips / loads:5.2f} round trips, {load_seconds / loads * 1000:6.3f} ms  "
+          f"save: {save_trips / args.sessions:5.2f} round trips, {save_seconds / args.sessions * 1000:6.3f} ms  "
+          f"profile lookup: {lookup_trips / loads:5.2f} round trips")
+
+
+async def scenario(args):
+    legacy_client = fakeredis.aioredis.FakeRedis()
+    await run("legacy per-key", lambda s: legacy_load(legacy_client, s),
+              lambda s: legacy_save(legacy_client, s, args.ttl), legacy_client.get, args)
+
+    for label, prefixes in (("batch store", ()), ("batch + hot-key cache", ("profile:",))):
+        store = RedisBatchStore(client=fakeredis.aioredis.FakeRedis(), hot_key_prefixes=prefixes)
+        await run(label, lambda s: store.get_many(session_keys(s)),
+                  lambda s: store.set_many(session_values(s), ttl=args.ttl),
+                  lambda key: store.get_many([key]), args)
+        await store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched Redis memory access")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--loads", type=int, default=5, help="Loads per session")
+    parser.add_argument("--ttl", type=int, default=3600)
+    parser.add_argument("--latency-ms", type=float, default=0.5, help="Simulated network latency per round trip")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    instrument(args.latency_ms / 1000)
+    print(f"{args.sessions} sessions x {len(SESSION_KEYS) + 1} keys, {args.loads} loads each, "
+          f"{args.latency_ms} ms simulated latency per round trip (fakeredis)")
+    asyncio.run(scenario(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tiered Memory Per-Turn Cost Benchmark
+
+Replays long conversations through TieredMemory.save_context with an instant
+stub LLM (random importance scores) and a session store that JSON-encodes what
+it is given, and compares:
+- the legacy flow: the short-term message list grows with the conversation,
+  medium-term memory is re-sorted on overflow and every tier is serialized
+  and written on every turn
+- incremental consolidation: fixed-capacity short tier, heap-based medium
+  tier with chunked promotion, and writes of changed tiers only
+
+Reports mean per-turn cost over successive blocks of turns (flat means the
+cost does not grow with conversation length) and bytes written per turn.
+
+Usage:
+    python benchmarks/tiered_memory_benchmark.py --turns 1000 --conversations 5 --block 200
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain.schema import AIMessage, HumanMessage
+
+from src.langchain_components.memory_manager.tiered_memory import TieredMemory
+
+
+class StubLLM:
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def predict(self, prompt):
+        if "rate its importance" in prompt:
+            return f"{self.rng.random():.2f}"
+        if "Consolidate" in prompt:
+            return "consolidated summary"
+        return f"SUMMARY: summary of the exchange\nTOPICS: {self.rng.choice(['pricing', 'billing', 'support'])}"
+
+
+class JsonSessionStore:
+    """Session store that encodes every write, as a real store would."""
+
+    def __init__(self, partial):
+        self.bytes_written = 0
+        if partial:
+            self.update_tiered_memory = self._write
+
+    def get_tiered_memory(self, session_id):
+        return None
+
+    def store_tiered_memory(self, session_id, tiers):
+        self._write(session_id, tiers)
+
+    def _write(self, session_id, tiers):
+        self.bytes_written += len(json.dumps(tiers))
+
+
+class LegacyTieredMemory:
+    """The pre-incremental save path."""
+
+    def __init__(self, llm, session_manager, medium_term_window=50, importance_threshold=0.7):
+        self.llm = llm
+        self.session_manager = session_manager
+        self.medium_term_window = medium_term_window
+        self.importance_threshold = importance_threshold
+        # ConversationBufferWindowMemory only windows on read; storage grows
+        self.messages = []
+        self.medium_term = []
+        self.long_term = []
+
+    def save_context(self, inputs, outputs):
+        self.messages.append(HumanMessage(content=inputs["question"]))
+        self.messages.append(AIMessage(content=outputs["answer"]))
+        importance = float(self.llm.predict("rate its importance"))
+        if importance >= self.importance_threshold:
+            self.medium_term.append((time.time(), {"human": inputs["question"], "ai": outputs["answer"]}, importance))
+            if len(self.medium_term) > self.medium_term_window:
+                self.medium_term.sort(key=lambda x: (x[2], x[0]), reverse=True)
+                for entry in self.medium_term[self.medium_term_window:]:
+                    if entry[2] >= self.importance_threshold * 1.2:
+                        self.llm.predict("SUMMARY")
+                        self.long_term.append((entry[0], "summary", ["pricing"], entry[2]))
+                        self.long_term = sorted(self.long_term, key=lambda x: x[3], reverse=True)[:20]
+                self.medium_term = self.medium_term[:self.medium_term_window]
+        short_term = [
+            {"type": "human" if isinstance(msg, HumanMessage) else "ai", "content": msg.content}
+            for msg in self.messages
+        ]
+        self.session_manager.store_tiered_memory(
+            "s", {"short_term": short_term, "medium_term": self.medium_term, "long_term": self.long_term}
+        )
+
+
+def run(factory, args):
+    """Mean per-turn seconds for each block of turns, and bytes per turn."""
+    blocks = [0.0] * (args.turns // args.block)
+    bytes_written = 0
+    rng = random.Random(5)
+    for conversation in range(args.conversations):
+        store = JsonSessionStore(partial=True)
+        memory = factory(StubLLM(conversation), store)
+        for turn in range(args.turns):
+            words = " ".join(rng.choice(("price", "plan", "refund", "order", "help")) for _ in range(30))
+            start = time.perf_counter()
+            memory.save_context({"question": f"q{turn} {words}"}, {"answer": f"a{turn} {words}"})
+            if turn // args.block < len(blocks):
+                blocks[turn // args.block] += time.perf_counter() - start
+        bytes_written += store.bytes_written
+    per_block = args.block * args.conversations
+    return [total / per_block for total in blocks], bytes_written / (args.turns * args.conversations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental tiered memory consolidation")
+    parser.add_argument("--turns", type=int, default=1000)
+    parser.add_argument("--conversations", type=int, default=5)
+    parser.add_argument("--block", type=int, default=200, help="Turns per reported block")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    runs = {
+        "legacy": lambda llm, store: LegacyTieredMemory(llm, store),
+        "incremental": lambda llm, store: TieredMemory(llm, store, "s", "sales"),
+    }
+    print(f"{args.conversations} conversations x {args.turns} turns; mean per-turn cost per block of {args.block}")
+    header = "  ".join(f"{start + 1:>5}-{start + args.block:<5}" for start in range(0, args.turns, args.block))
+    print(f"  {'':<12} {header}  bytes/turn")
+    for label, factory in runs.items():
+        blocks, per_turn_bytes = run(factory, args)
+        row = "  ".join(f"{seconds * 1e6:8.1f}us" for seconds in blocks)
+        print(f"  {label:<12} {row}  {per_turn_bytes:10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Transition Rule Evaluation Benchmark
+
+Compares the legacy sequential rule walk against the compiled rule set used by
+TransitionEngine, with hundreds of keyword/intent rules per state.
+
+Usage:
+    python benchmarks/transition_rules_benchmark.py --rules 500 --messages 2000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Dict, Any, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.conversation.transitions.rule_compiler import TransitionRuleCompiler
+
+BASE_WORDS = [
+    "price", "pricing", "cost", "discount", "cancel", "refund", "upgrade",
+    "demo", "trial", "invoice", "billing", "contract", "meeting", "schedule",
+    "support", "bug", "error", "install", "login", "password", "account",
+]
+SUFFIXES = ["", "s", "ing", "ed", "er", "plan", "team", "page", "fee", "date"]
+VOCABULARY = [word + suffix for word in BASE_WORDS for suffix in SUFFIXES]
+
+
+def build_rules(states: int, rules_per_state: int, seed: int = 7) -> Dict[str, List[Dict[str, Any]]]:
+    """Build a synthetic rule configuration."""
+    rng = random.Random(seed)
+    rules = {}
+    for s in range(states):
+        transitions = []
+        for r in range(rules_per_state):
+            keywords = [f"{rng.choice(VOCABULARY)} {rng.choice(VOCABULARY)}" for _ in range(4)]
+            conditions = [{"type": "keyword_match", "keywords": keywords}]
+            if r % 3 == 0:
+                # Shared intent condition repeated across many rules
+                conditions.insert(0, {"type": "intent_match", "intent": "purchase", "min_confidence": 0.7})
+            transitions.append({
+                "target": f"state_{(s + r) % states}",
+                "priority": rng.randint(0, 3),
+                "conditions": conditions,
+            })
+        rules[f"state_{s}"] = transitions
+    return rules
+
+
+async def intent_match(message: str, context: Dict[str, Any], condition: Dict[str, Any]) -> bool:
+    detected = context.get("detected_intent", {})
+    return (detected.get("name") == condition.get("intent")
+            and detected.get("confidence", 0) >= condition.get("min_confidence", 0.7))
+
+
+async def keyword_match(message: str, context: Dict[str, Any], condition: Dict[str, Any]) -> bool:
+    message_lower = message.lower()
+    for keyword in condition.get("keywords", []):
+        if keyword.lower() in message_lower:
+            return True
+    return False
+
+
+EVALUATORS = {"intent_match": intent_match, "keyword_match": keyword_match}
+
+
+async def legacy_evaluate(rules, state, message, context):
+    """The pre-compilation evaluation loop (configuration order, no sharing)."""
+    for transition in rules.get(state, []):
+        met = True
+        for condition in transition["conditions"]:
+            if not await EVALUATORS[condition["type"]](message, context, condition):
+                met = False
+                break
+        if met:
+            return transition["target"]
+    return None
+
+
+async def compiled_evaluate(compiled, state, message, context):
+    """The compiled evaluation loop used by TransitionEngine."""
+    scope = compiled.scope_for(state, message, context)
+    for transition in compiled.transitions_for(state):
+        met = True
+        for condition in transition.conditions:
+            if condition.keywords is not None:
+                result = not scope.keywords_found.isdisjoint(condition.keywords)
+            else:
+                result = scope.results.get(condition.key)
+                if result is None:
+                    result = await EVALUATORS[condition.condition_type](message, context, condition.config)
+                    scope.results[condition.key] = result
+            if not result:
+                met = False
+                break
+        if met:
+            return transition.target
+    return None
+
+
+async def run(args):
+    rng = random.Random(11)
+    rules = build_rules(args.states, args.rules)
+    messages = [
+        " ".join(rng.choice(VOCABULARY) for _ in range(args.words))
+        for _ in range(args.messages)
+    ]
+    context = {"detected_intent": {"name": "browse", "confidence": 0.9}}
+
+    compiler = TransitionRuleCompiler()
+    start = time.perf_counter()
+    compiled = compiler.compile("bench", rules, frozenset(EVALUATORS))
+    compile_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    compiler.compile("bench", rules, frozenset(EVALUATORS))
+    cached_ms = (time.perf_counter() - start) * 1000
+
+    states = list(rules)
+    start = time.perf_counter()
+    fired = 0
+    for i, message in enumerate(messages):
+        fired += await legacy_evaluate(rules, states[i % len(states)], message, context) is not None
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i, message in enumerate(messages):
+        await compiled_evaluate(compiled, states[i % len(states)], message, context)
+    fast = time.perf_counter() - start
+
+    print(f"Rules per state:     {args.rules} ({args.states} states)")
+    print(f"Transitions fired:   {fired / len(messages):.0%} of messages")
+    print(f"Compile time:        {compile_ms:.1f} ms (cached lookup {cached_ms:.1f} ms)")
+    print(f"Legacy evaluation:   {legacy / len(messages) * 1e6:.1f} us/message")
+    print(f"Compiled evaluation: {fast / len(messages) * 1e6:.1f} us/message")
+    print(f"Speedup:             {legacy / fast:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transition rule evaluation")
+    parser.add_argument("--states", type=int, default=5)
+    parser.add_argument("--rules", type=int, default=300, help="Rules per state")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=12, help="Words per message")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Response Variator Throughput Benchmark
+
+Measures end-to-end throughput of GrammarVariator and ResponseVariator, and
+compares the pattern-bank substitution passes against the legacy
+per-call-compile / per-rule-scan implementations.
+
+Usage:
+    python benchmarks/variator_throughput_benchmark.py --messages 2000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.langchain_components.generation.anti_ai.response_variator import (
+    ResponseVariator,
+    CONTRACTIONS,
+    VOCABULARY_SUBSTITUTIONS,
+)
+from src.langchain_components.generation.enhancers.grammar_variator import GrammarVariator
+
+SENTENCES = [
+    "I think it is important to review the contract before we commence the project.",
+    "You can utilize the dashboard and obtain numerous reports, but it is not required.",
+    "The report was prepared by the analytics team, so we do not need to redo it.",
+    "If you require assistance, we are happy to assist prior to the initial launch.",
+    "However, the pricing is currently approximately ten percent higher, because of demand.",
+    "For example, they have built a sufficient buffer in order to handle the following spikes.",
+    "It is worth noting that we would not terminate the agreement without notice.",
+]
+
+
+def build_messages(count: int, seed: int = 5):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(SENTENCES) for _ in range(rng.randint(2, 6))) for _ in range(count)]
+
+
+def legacy_conjunctions(variator: GrammarVariator, sentence: str, rng: random.Random) -> str:
+    """Legacy conjunction variation: compiles one regex per conjunction per call."""
+    for conjunction, alternatives in variator.conjunction_replacements.items():
+        matches = list(re.compile(rf'\b{conjunction}\b').finditer(sentence))
+        if matches:
+            match = rng.choice(matches)
+            start, end = match.span()
+            return sentence[:start] + rng.choice(alternatives) + sentence[end:]
+    return sentence
+
+
+def legacy_substitutions(text: str, rng: random.Random, chance: float) -> str:
+    """Legacy contraction + vocabulary passes: one split/scan per rule."""
+    result = text
+    for mapping, both_sides in ((CONTRACTIONS, False), (VOCABULARY_SUBSTITUTIONS, True)):
+        for full, replacement in mapping.items():
+            if full not in result or rng.random() >= chance:
+                continue
+            parts = result.split(full)
+            result = ""
+            for i, part in enumerate(parts):
+                result += part
+                if i < len(parts) - 1:
+                    prev_char = part[-1] if part else ""
+                    next_char = parts[i + 1][0] if parts[i + 1] else ""
+                    before_ok = not both_sides or not prev_char or prev_char.isspace() or prev_char in ".,;:!?"
+                    after_ok = not next_char or next_char.isspace() or next_char in ".,;:!?"
+                    result += replacement if before_ok and after_ok else full
+    return result
+
+
+def timed(label: str, func, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<38} {len(items) / elapsed:>10.0f} msg/s  ({elapsed / len(items) * 1e6:.1f} us/msg)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response variator throughput")
+    parser.add_argument("--messages", type=int, default=2000)
+    args = parser.parse_args()
+
+    messages = build_messages(args.messages)
+    grammar = GrammarVariator(seed=1)
+    response = ResponseVariator(seed=1)
+    response.variability_params["contraction_freq"] = 1.0
+    response.variability_params["vocabulary_variation"] = 1.0
+    rng = random.Random(1)
+
+    print("Substitution passes")
+    legacy = timed("  legacy conjunctions (compile/call)", lambda m: legacy_conjunctions(grammar, m, rng), messages)
+    banked = timed("  pattern bank conjunctions", grammar._vary_conjunctions, messages)
+    print(f"  speedup: {legacy / banked:.1f}x")
+    legacy = timed("  legacy contractions + vocabulary", lambda m: legacy_substitutions(m, rng, 1.0), messages)
+    banked = timed("  pattern bank contractions + vocab",
+                   lambda m: response._vary_vocabulary(response._apply_contractions(m)), messages)
+    print(f"  speedup: {legacy / banked:.1f}x")
+
+    print("End-to-end enhance()")
+    timed("  GrammarVariator.enhance", grammar.enhance, messages)
+    timed("  ResponseVariator.enhance", response.enhance, messages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Vector Store Cache Benchmark
+
+Simulates request traffic over many collections whose indexes take time to
+load (proportional to their size) and compares:
+- the legacy per-service dict (unbounded, loads inline on first request)
+- VectorStoreCache with a byte budget, with and without startup warmup
+
+Reports request latency percentiles, peak resident bytes, hit ratio, load
+latency metrics, and request latency while an index is reloaded in the
+background.
+
+Usage:
+    python benchmarks/vectorstore_cache_benchmark.py --collections 30 --requests 3000 --budget-mb 3072
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.langchain_components.rag.vectorstore_cache import StoreLoad, VectorStoreCache
+
+MB = 1024 ** 2
+
+
+def build_collections(count: int, seed: int = 4):
+    rng = random.Random(seed)
+    return {f"bot_{i % 3}/col_{i}": rng.choice([16, 64, 128, 256, 512]) * MB for i in range(count)}
+
+
+def build_trace(collections, count: int, seed: int = 8):
+    rng = random.Random(seed)
+    names = list(collections)
+    weights = [1 / (rank + 1) ** 1.2 for rank in range(len(names))]
+    return rng.choices(names, weights, k=count)
+
+
+def make_loader(name: str, size: int, ms_per_mb: float, version: int = 0):
+    async def load():
+        await asyncio.sleep(size / MB * ms_per_mb / 1000)
+        return StoreLoad(f"{name}@{version}", size, version)
+    return load
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+async def replay_legacy(collections, trace, ms_per_mb):
+    stores = {}
+    latencies, peak = [], 0
+    for name in trace:
+        start = time.perf_counter()
+        if name not in stores:
+            stores[name] = await make_loader(name, collections[name], ms_per_mb)()
+            peak = max(peak, sum(load.size_bytes for load in stores.values()))
+        latencies.append(time.perf_counter() - start)
+    return latencies, peak
+
+
+async def replay_cache(collections, trace, ms_per_mb, budget, warm):
+    cache = VectorStoreCache(max_bytes=budget)
+    if warm:
+        # Warm the collections expected to be hot, within half the budget
+        hot, total = [], 0
+        for name in dict.fromkeys(trace[:200]):
+            if total + collections[name] > budget // 2:
+                break
+            hot.append((name, make_loader(name, collections[name], ms_per_mb), None))
+            total += collections[name]
+        await cache.warmup(hot)
+
+    latencies, peak = [], 0
+    for name in trace:
+        start = time.perf_counter()
+        await cache.get_or_load(name, make_loader(name, collections[name], ms_per_mb))
+        latencies.append(time.perf_counter() - start)
+        peak = max(peak, cache.resident_bytes)
+    return latencies, peak, cache.get_metrics()
+
+
+async def reload_under_traffic(collections, ms_per_mb):
+    """Request latency for a collection while its changed index reloads in the background."""
+    name = max(collections, key=collections.get)
+    version = {"current": 0}
+    cache = VectorStoreCache()
+    await cache.get_or_load(name, lambda: make_loader(name, collections[name], ms_per_mb, version["current"])(),
+                            signature_fn=lambda: version["current"])
+
+    version["current"] = 1
+    reload_task = asyncio.ensure_future(cache.refresh_changed())
+    latencies = []
+    while not reload_task.done():
+        start = time.perf_counter()
+        store = await cache.get_or_load(name, make_loader(name, collections[name], ms_per_mb))
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.001)
+    return latencies, store, cache.peek(name)
+
+
+def report(label, latencies, peak, budget, startup=200):
+    over = " OVER BUDGET" if peak > budget else ""
+    print(f"  {label:<16} mean {sum(latencies) / len(latencies) * 1000:6.2f} ms  "
+          f"p99 {percentile(latencies, 0.99) * 1000:6.1f} ms  "
+          f"first {startup} requests {sum(latencies[:startup]) * 1000:7.0f} ms total  "
+          f"peak {peak / MB:5.0f} MB{over}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resident vector store cache")
+    parser.add_argument("--collections", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--budget-mb", type=int, default=3072)
+    parser.add_argument("--ms-per-mb", type=float, default=0.2, help="Simulated index load cost")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    collections = build_collections(args.collections)
+    trace = build_trace(collections, args.requests)
+    budget = args.budget_mb * MB
+    print(f"{len(collections)} collections ({sum(collections.values()) / MB:.0f} MB), "
+          f"{len(trace)} requests, budget {args.budget_mb} MB")
+
+    latencies, peak = asyncio.run(replay_legacy(collections, trace, args.ms_per_mb))
+    report("legacy dict", latencies, peak, budget)
+    for warm in (False, True):
+        latencies, peak, metrics = asyncio.run(replay_cache(collections, trace, args.ms_per_mb, budget, warm))
+        report("cache + warmup" if warm else "cache", latencies, peak, budget)
+        print(f"  {'':<16} hit ratio {metrics['hit_ratio']:.1%}, loads {metrics['loads']}, "
+              f"evictions {metrics['evictions']}, load p50 {metrics['load_seconds_p50'] * 1000:.0f} ms, "
+              f"p95 {metrics['load_seconds_p95'] * 1000:.0f} ms")
+
+    latencies, served, current = asyncio.run(reload_under_traffic(collections, args.ms_per_mb))
+    print(f"Background reload: {len(latencies)} requests served during reload, "
+          f"max latency {max(latencies) * 1000:.3f} ms (served {served}, now {current})")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,12 +31,15 @@ class ConsultancyLLMManager(BaseLLMManager):
         self.model_path = model_path
         self.config = config or {}
         self.default_model = None
+        self.default_model_name = None
         self.logger.info("Consultancy LLM Manager initialized")
     
     def _load_specific_model(self, model_path: str) -> Any:
         """
         Load a consultancy-specific model.
         
+        Called by the shared model cache on a miss, so it does not cache.
+        
         Args:
             model_path: Path to the model
             
@@ -46,11 +49,6 @@ class ConsultancyLLMManager(BaseLLMManager):
         Raises:
             ModelLoadingError: If model loading fails
         """
-        # Check if model is in cache first
-        cached_model = self.model_cache.get(model_path)
-        if cached_model:
-            return cached_model
-        
         try:
             self.logger.info(f"Loading consultancy model from {model_path}")
             # This is a placeholder for actual model loading code
@@ -73,9 +71,6 @@ class ConsultancyLLMManager(BaseLLMManager):
                 "loaded": True,
                 "type": "consultancy"
             }
-            
-            # Cache the model
-            self.model_cache.put(model_path, model_instance)
             return model_instance
             
         except Exception as e:
@@ -107,6 +102,7 @@ class ConsultancyLLMManager(BaseLLMManager):
             model_path, 
             fallback_path="/models/fallback/base_model"
         )
+        self.default_model_name = model_path
         return self.default_model
     
     def generate_response(self, 
@@ -128,28 +124,17 @@ class ConsultancyLLMManager(BaseLLMManager):
         Returns:
             Generated response text
         """
-        model_instance = model or self.default_model
-        if not model_instance:
+        if model is None and not self.default_model:
             self.logger.info("No model provided, loading default model")
-            model_instance = self.load_default_model()
+            self.load_default_model()
         
         try:
-            self.logger.info(f"Generating response with consultancy model")
-            # This is a placeholder for actual inference code
-            # In a real implementation, this would use the model's generate method
-            
-            # Example with transformers:
-            # inputs = model_instance["tokenizer"](prompt, return_tensors="pt").to("cuda")
-            # outputs = model_instance["model"].generate(
-            #     inputs.input_ids,
-            #     max_new_tokens=max_tokens,
-            #     temperature=temperature,
-            #     **kwargs
-            # )
-            # response = model_instance["tokenizer"].decode(outputs[0], skip_special_tokens=True)
-            
-            # Placeholder implementation
-            response = f"This is a consultancy response to: {prompt[:50]}..."
+            # Pin the default model in the shared cache for the duration of inference
+            if model is None:
+                with self.use_model(self.default_model_name) as model_instance:
+                    response = self._generate(model_instance, prompt, max_tokens, temperature, **kwargs)
+            else:
+                response = self._generate(model, prompt, max_tokens, temperature, **kwargs)
             
             # Report usage to MLOps
             self.mlops.report_model_usage(
@@ -168,6 +153,38 @@ class ConsultancyLLMManager(BaseLLMManager):
             self.logger.error(f"Error generating response: {e}")
             return f"I'm sorry, but I encountered an error while processing your request."
     
+    def _generate(self, model_instance: Any, prompt: str, max_tokens: int,
+                  temperature: float, **kwargs) -> str:
+        """
+        Run inference on a loaded consultancy model.
+        
+        Args:
+            model_instance: The loaded model
+            prompt: Input prompt for the model
+            max_tokens: Maximum tokens to generate
+            temperature: Temperature for generation
+            **kwargs: Additional parameters for generation
+            
+        Returns:
+            Generated response text
+        """
+        self.logger.info(f"Generating response with consultancy model")
+        # This is a placeholder for actual inference code
+        # In a real implementation, this would use the model's generate method
+        
+        # Example with transformers:
+        # inputs = model_instance["tokenizer"](prompt, return_tensors="pt").to("cuda")
+        # outputs = model_instance["model"].generate(
+        #     inputs.input_ids,
+        #     max_new_tokens=max_tokens,
+        #     temperature=temperature,
+        #     **kwargs
+        # )
+        # response = model_instance["tokenizer"].decode(outputs[0], skip_special_tokens=True)
+        
+        # Placeholder implementation
+        return f"This is a consultancy response to: {prompt[:50]}..."
+    
     def apply_business_frameworks(self, response: str, domain: str) -> str:
         """
         Enhance response with business frameworks relevant to the domain.
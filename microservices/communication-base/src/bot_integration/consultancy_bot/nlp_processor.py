@@ -4,79 +4,150 @@ Provides natural language processing capabilities including entity recognition,
 sentiment analysis, topic extraction, and other NLP features.
 """
 
-import os
+import asyncio
+import importlib.util
 import re
-import json
-from typing import Dict, List, Any, Optional, Tuple, Set, Union
+import threading
+from concurrent.futures import Executor
+from typing import Dict, List, Any, Optional, Tuple, Set, Union, Iterable
 import structlog
 from dataclasses import dataclass, field
-import numpy as np
-from collections import Counter
 
 # Configure logger
 logger = structlog.get_logger(__name__)
 
-# Try to import optional dependencies
-try:
-    import spacy
-    import nltk
-    from nltk.corpus import stopwords
-    from nltk.tokenize import word_tokenize
-    from nltk.stem import WordNetLemmatizer
-    
-    # Download necessary NLTK resources
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-    nltk.download('wordnet', quiet=True)
-    
-    SPACY_AVAILABLE = True
-    NLTK_AVAILABLE = True
-    
-    # Load spaCy model
-    try:
-        nlp = spacy.load("en_core_web_md")
-        logger.info("Loaded spaCy model: en_core_web_md")
-    except OSError:
-        # Fallback to small model if medium not available
-        try:
-            nlp = spacy.load("en_core_web_sm")
-            logger.info("Loaded spaCy model: en_core_web_sm")
-        except OSError:
+# Optional dependencies are only probed here; they are imported and their
+# models/resources loaded lazily on first use, so importing this module is cheap.
+SPACY_AVAILABLE = importlib.util.find_spec("spacy") is not None
+NLTK_AVAILABLE = importlib.util.find_spec("nltk") is not None
+
+if not (SPACY_AVAILABLE and NLTK_AVAILABLE):
+    logger.warning("spaCy and/or NLTK not available. Using fallback NLP processing.")
+
+# spaCy models to try, in order of preference
+SPACY_MODELS = ["en_core_web_md", "en_core_web_sm"]
+
+# Pipeline components the processor reads from (entities, noun chunks, POS,
+# lemmas, sentences); any other component in the model is disabled on load
+SPACY_REQUIRED_COMPONENTS = {"tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"}
+
+# Minimal stop word list used when NLTK is not available
+FALLBACK_STOP_WORDS = set([
+    "i", "me", "my", "myself", "we", "our", "ours", "ourselves", "you", "your", 
+    "yours", "yourself", "yourselves", "he", "him", "his", "himself", "she", 
+    "her", "hers", "herself", "it", "its", "itself", "they", "them", "their", 
+    "theirs", "themselves", "what", "which", "who", "whom", "this", "that", 
+    "these", "those", "am", "is", "are", "was", "were", "be", "been", "being", 
+    "have", "has", "had", "having", "do", "does", "did", "doing", "a", "an", 
+    "the", "and", "but", "if", "or", "because", "as", "until", "while", "of", 
+    "at", "by", "for", "with", "about", "against", "between", "into", "through", 
+    "during", "before", "after", "above", "below", "to", "from", "up", "down", 
+    "in", "out", "on", "off", "over", "under", "again", "further", "then", 
+    "once", "here", "there", "when", "where", "why", "how", "all", "any", 
+    "both", "each", "few", "more", "most", "other", "some", "such", "no", 
+    "nor", "not", "only", "own", "same", "so", "than", "too", "very", "s", 
+    "t", "can", "will", "just", "don", "don't", "should", "should've", "now", 
+    "d", "ll", "m", "o", "re", "ve", "y", "ain", "aren", "aren't", "couldn", 
+    "couldn't", "didn", "didn't", "doesn", "doesn't", "hadn", "hadn't", "hasn", 
+    "hasn't", "haven", "haven't", "isn", "isn't", "ma", "mightn", "mightn't", 
+    "mustn", "mustn't", "needn", "needn't", "shan", "shan't", "shouldn", 
+    "shouldn't", "wasn", "wasn't", "weren", "weren't", "won", "won't", "wouldn", 
+    "wouldn't"
+])
+
+# Lazily initialized backends, shared by all processors
+_spacy_models: Dict[Tuple[str, ...], Any] = {}
+_nltk_backend: Optional[Dict[str, Any]] = None
+_backend_lock = threading.Lock()
+
+# Kept for compatibility: resolves to the NLTK stop words once NLTK is loaded
+STOP_WORDS = FALLBACK_STOP_WORDS
+
+
+def load_spacy_model(disable: Iterable[str] = ()) -> Any:
+    """
+    Load the spaCy model on first use.
+
+    Tries the medium model first and falls back to the small one (downloading
+    it if necessary). Components not needed by the processor, plus any listed
+    in ``disable``, are disabled.
+
+    Args:
+        disable: Additional pipeline components to disable
+
+    Returns:
+        The loaded spaCy Language object
+    """
+    key = tuple(sorted(disable))
+    model = _spacy_models.get(key)
+    if model is not None:
+        return model
+
+    with _backend_lock:
+        model = _spacy_models.get(key)
+        if model is not None:
+            return model
+
+        import spacy
+
+        for model_name in SPACY_MODELS:
+            try:
+                model = spacy.load(model_name)
+                logger.info("Loaded spaCy model", model=model_name)
+                break
+            except OSError:
+                continue
+        else:
             logger.warning("Failed to load spaCy model, downloading en_core_web_sm")
             spacy.cli.download("en_core_web_sm")
-            nlp = spacy.load("en_core_web_sm")
-            
-    STOP_WORDS = set(stopwords.words('english'))
-    lemmatizer = WordNetLemmatizer()
-    
-except ImportError:
-    SPACY_AVAILABLE = False
-    NLTK_AVAILABLE = False
-    logger.warning("spaCy and/or NLTK not available. Using fallback NLP processing.")
-    
-    # Define minimal fallback implementations
-    STOP_WORDS = set([
-        "i", "me", "my", "myself", "we", "our", "ours", "ourselves", "you", "your", 
-        "yours", "yourself", "yourselves", "he", "him", "his", "himself", "she", 
-        "her", "hers", "herself", "it", "its", "itself", "they", "them", "their", 
-        "theirs", "themselves", "what", "which", "who", "whom", "this", "that", 
-        "these", "those", "am", "is", "are", "was", "were", "be", "been", "being", 
-        "have", "has", "had", "having", "do", "does", "did", "doing", "a", "an", 
-        "the", "and", "but", "if", "or", "because", "as", "until", "while", "of", 
-        "at", "by", "for", "with", "about", "against", "between", "into", "through", 
-        "during", "before", "after", "above", "below", "to", "from", "up", "down", 
-        "in", "out", "on", "off", "over", "under", "again", "further", "then", 
-        "once", "here", "there", "when", "where", "why", "how", "all", "any", 
-        "both", "each", "few", "more", "most", "other", "some", "such", "no", 
-        "nor", "not", "only", "own", "same", "so", "than", "too", "very", "s", 
-        "t", "can", "will", "just", "don", "don't", "should", "should've", "now", 
-        "d", "ll", "m", "o", "re", "ve", "y", "ain", "aren", "aren't", "couldn", 
-        "couldn't", "didn", "didn't", "doesn", "doesn't", "hadn", "hadn't", "hasn", 
-        "hasn't", "haven", "haven't", "isn", "isn't", "ma", "mightn", "mightn't", 
-        "mustn", "mustn't", "needn", "needn't", "shan", "shan't", "shouldn", 
-        "shouldn't", "wasn", "wasn't", "weren", "weren't", "won", "won't", "wouldn", 
-        "wouldn't"
-    ])
+            model = spacy.load("en_core_web_sm")
+
+        unused = [
+            name for name in model.pipe_names
+            if name not in SPACY_REQUIRED_COMPONENTS or name in key
+        ]
+        for name in unused:
+            model.disable_pipe(name)
+        if unused:
+            logger.info("Disabled spaCy pipeline components", components=unused)
+
+        _spacy_models[key] = model
+        return model
+
+
+def load_nltk_backend() -> Dict[str, Any]:
+    """
+    Import NLTK and download its resources on first use.
+
+    Returns:
+        Dictionary with ``stop_words``, ``lemmatizer`` and ``word_tokenize``
+    """
+    global _nltk_backend, STOP_WORDS
+    if _nltk_backend is not None:
+        return _nltk_backend
+
+    with _backend_lock:
+        if _nltk_backend is not None:
+            return _nltk_backend
+
+        import nltk
+        from nltk.corpus import stopwords
+        from nltk.tokenize import word_tokenize
+        from nltk.stem import WordNetLemmatizer
+
+        # Download necessary NLTK resources
+        nltk.download('punkt', quiet=True)
+        nltk.download('stopwords', quiet=True)
+        nltk.download('wordnet', quiet=True)
+
+        STOP_WORDS = set(stopwords.words('english'))
+        _nltk_backend = {
+            "stop_words": STOP_WORDS,
+            "lemmatizer": WordNetLemmatizer(),
+            "word_tokenize": word_tokenize
+        }
+        return _nltk_backend
+
 
 # Domain-specific terms for business consultancy
 BUSINESS_TERMS = {
@@ -132,10 +203,17 @@ class NLPFeatures:
 class NLPProcessor:
     """Natural Language Processing capabilities for consultancy bot"""
     
-    def __init__(self, use_spacy: bool = True, use_nltk: bool = True):
+    def __init__(self, use_spacy: bool = True, use_nltk: bool = True,
+                 disable_components: Optional[List[str]] = None,
+                 batch_size: int = 64, n_process: int = 1):
         self.use_spacy = use_spacy and SPACY_AVAILABLE
         self.use_nltk = use_nltk and NLTK_AVAILABLE
         
+        # spaCy settings; the model itself is loaded on first use
+        self.disable_components = list(disable_components or [])
+        self.batch_size = batch_size
+        self.n_process = n_process
+        
         # Load urgency terms
         self.urgency_terms = {
             "high": ["urgent", "immediately", "asap", "critical", "emergency", "now", "rushing",
@@ -162,26 +240,82 @@ class NLPProcessor:
             "information": [r"^(fyi|for your information|note that|be advised|please note|heads up|just to let you know)"],
             "clarification": [r"(i meant|to clarify|to be clear|what i mean is|in other words|let me explain|to elaborate)"]
         }
+        self._compiled_request_patterns = [
+            (req_type, [re.compile(pattern) for pattern in patterns])
+            for req_type, patterns in self.request_patterns.items()
+        ]
         
         logger.info("NLP Processor initialized", 
                    spacy_available=self.use_spacy, 
                    nltk_available=self.use_nltk)
     
+    @property
+    def nlp(self) -> Any:
+        """The spaCy pipeline, loaded on first access."""
+        return load_spacy_model(self.disable_components)
+    
+    @property
+    def stop_words(self) -> Set[str]:
+        """Stop words from NLTK when available, otherwise the fallback list."""
+        if self.use_nltk:
+            return load_nltk_backend()["stop_words"]
+        return FALLBACK_STOP_WORDS
+    
     def process_text(self, text: str) -> NLPFeatures:
         """Process text and extract NLP features"""
-        features = NLPFeatures()
-        
         if not text or not isinstance(text, str):
             logger.warning("Invalid input to NLP processor", text_type=type(text))
-            return features
+            return NLPFeatures()
         
         # Clean text
         cleaned_text = self._clean_text(text)
         
         # Use spaCy for advanced NLP if available
-        if self.use_spacy:
-            doc = nlp(cleaned_text)
+        doc = self.nlp(cleaned_text) if self.use_spacy else None
+        
+        return self._build_features(cleaned_text, doc)
+    
+    def process_texts(self, texts: List[str], batch_size: Optional[int] = None,
+                      n_process: Optional[int] = None) -> List[NLPFeatures]:
+        """
+        Process many texts at once, batching them through ``nlp.pipe``.
+        
+        Args:
+            texts: Texts to process
+            batch_size: Texts per spaCy batch (defaults to the processor setting)
+            n_process: Worker processes for spaCy (defaults to the processor setting)
             
+        Returns:
+            Extracted features, in the same order as ``texts``
+        """
+        results: List[NLPFeatures] = [NLPFeatures() for _ in texts]
+        valid = [(i, self._clean_text(text)) for i, text in enumerate(texts)
+                 if text and isinstance(text, str)]
+        if len(valid) < len(texts):
+            logger.warning("Invalid inputs to NLP processor", invalid_count=len(texts) - len(valid))
+        if not valid:
+            return results
+        
+        cleaned_texts = [cleaned for _, cleaned in valid]
+        if self.use_spacy:
+            docs = self.nlp.pipe(
+                cleaned_texts,
+                batch_size=batch_size or self.batch_size,
+                n_process=n_process or self.n_process
+            )
+        else:
+            docs = (None for _ in cleaned_texts)
+        
+        for (index, cleaned_text), doc in zip(valid, docs):
+            results[index] = self._build_features(cleaned_text, doc)
+        return results
+    
+    def _build_features(self, cleaned_text: str, doc: Any = None) -> NLPFeatures:
+        """Extract features from cleaned text and its spaCy doc (if any)"""
+        features = NLPFeatures()
+        stop_words = self.stop_words
+        
+        if doc is not None:
             # Extract entities
             features.entities = [
                 {"text": ent.text, "type": ent.label_, "start": ent.start_char, "end": ent.end_char}
@@ -191,7 +325,7 @@ class NLPProcessor:
             # Extract keywords using noun chunks and proper nouns
             keywords = list(set([chunk.text.lower() for chunk in doc.noun_chunks] + 
                                [token.text.lower() for token in doc if token.pos_ == "PROPN"]))
-            features.keywords = [k for k in keywords if k not in STOP_WORDS and len(k) > 1]
+            features.keywords = [k for k in keywords if k not in stop_words and len(k) > 1]
             
             # Basic sentiment analysis
             features.sentiment = self._analyze_sentiment_spacy(doc)
@@ -205,10 +339,11 @@ class NLPProcessor:
         # Fall back to or supplement with NLTK processing
         elif self.use_nltk:
             # Tokenize and extract keywords
-            tokens = word_tokenize(cleaned_text)
-            lemmatized_tokens = [lemmatizer.lemmatize(token.lower()) for token in tokens]
+            backend = load_nltk_backend()
+            tokens = backend["word_tokenize"](cleaned_text)
+            lemmatized_tokens = [backend["lemmatizer"].lemmatize(token.lower()) for token in tokens]
             features.keywords = [token for token in lemmatized_tokens 
-                              if token not in STOP_WORDS and len(token) > 1]
+                              if token not in stop_words and len(token) > 1]
             
             # Basic sentiment analysis
             features.sentiment = self._analyze_sentiment_nltk(cleaned_text)
@@ -217,7 +352,7 @@ class NLPProcessor:
         else:
             # Simple word extraction
             words = cleaned_text.lower().split()
-            features.keywords = [word for word in words if word not in STOP_WORDS and len(word) > 1]
+            features.keywords = [word for word in words if word not in stop_words and len(word) > 1]
             
             # Simple sentiment analysis
             features.sentiment = self._analyze_sentiment_simple(cleaned_text)
@@ -301,7 +436,7 @@ class NLPProcessor:
     def _analyze_sentiment_nltk(self, text: str) -> Dict[str, Any]:
         """Analyze sentiment using NLTK"""
         # Simple NLTK-based sentiment analysis
-        tokens = word_tokenize(text.lower())
+        tokens = load_nltk_backend()["word_tokenize"](text.lower())
         
         # Count positive and negative words
         positive_terms = ["good", "great", "excellent", "positive", "happy", "pleased", 
@@ -456,9 +591,10 @@ class NLPProcessor:
     def _determine_request_type(self, text: str) -> str:
         """Determine the type of request being made"""
         # Check each pattern type
-        for req_type, patterns in self.request_patterns.items():
+        text_lower = text.lower()
+        for req_type, patterns in self._compiled_request_patterns:
             for pattern in patterns:
-                if re.search(pattern, text.lower()):
+                if pattern.search(text_lower):
                     return req_type
         
         # Default to general request if no pattern matches
@@ -483,8 +619,7 @@ class NLPProcessor:
             return 0.0  # Similarity requires spaCy
         
         # Process both texts
-        doc1 = nlp(self._clean_text(text1))
-        doc2 = nlp(self._clean_text(text2))
+        doc1, doc2 = self.nlp.pipe([self._clean_text(text1), self._clean_text(text2)])
         
         # Return cosine similarity
         return doc1.similarity(doc2)
@@ -495,7 +630,7 @@ class NLPProcessor:
         
         # Use spaCy if available
         if self.use_spacy:
-            doc = nlp(text)
+            doc = self.nlp(text)
             
             # Look for imperative verbs and action patterns
             for sent in doc.sents:
@@ -536,6 +671,79 @@ class NLPProcessor:
         
         return action_items
 
+class NLPBatcher:
+    """
+    Async front end that micro-batches concurrent ``process_text`` calls.
+    
+    Requests arriving within ``max_wait_ms`` of each other (up to
+    ``max_batch_size``) are processed together with ``process_texts`` in an
+    executor thread, so concurrent callers share one ``nlp.pipe`` pass and
+    the event loop is never blocked by spaCy.
+    """
+    
+    def __init__(self, processor: NLPProcessor, max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0, executor: Optional[Executor] = None):
+        self.processor = processor
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.executor = executor
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches_processed = 0
+        self.texts_processed = 0
+    
+    async def process_text(self, text: str) -> NLPFeatures:
+        """Queue a text for the next batch and wait for its features"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000.0, self._flush)
+        
+        return await future
+    
+    async def close(self) -> None:
+        """Flush pending texts and wait for in-flight batches"""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+    
+    def _flush(self) -> None:
+        """Hand the pending texts to a batch task"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Process one batch in the executor and resolve its futures"""
+        loop = asyncio.get_running_loop()
+        texts = [text for text, _ in batch]
+        try:
+            results = await loop.run_in_executor(self.executor, self.processor.process_texts, texts)
+        except Exception as e:
+            logger.error("NLP batch processing failed", batch_size=len(batch), error=str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        self.batches_processed += 1
+        self.texts_processed += len(batch)
+        for (_, future), features in zip(batch, results):
+            if not future.done():
+                future.set_result(features)
+
 def get_nlp_processor() -> NLPProcessor:
     """Factory function to get an NLP processor instance"""
     return NLPProcessor(use_spacy=SPACY_AVAILABLE, use_nltk=NLTK_AVAILABLE) 
\ No newline at end of file
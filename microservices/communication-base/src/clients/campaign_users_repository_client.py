@@ -22,6 +22,25 @@ class CampaignUsersRepositoryClient:
         self.logger = logging.getLogger(__name__)
         self.base_config = self.config_inheritance.get_base_config()
         self.base_url = self.base_config.get("repository.campaign_users.url", "http://campaign-users-repository/api/v1")
+        # Shared across requests so connections are kept alive and reused
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared HTTP session, creating it on first use.
+        
+        Returns:
+            HTTP client session
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def get_campaign_user(self, user_id: str, campaign_id: str) -> Dict[str, Any]:
         """
@@ -37,16 +56,16 @@ class CampaignUsersRepositoryClient:
         url = f"{self.base_url}/campaigns/{campaign_id}/users/{user_id}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 404:
-                        self.logger.info(f"User {user_id} not found in campaign {campaign_id}")
-                        return {}
-                    else:
-                        self.logger.error(f"Error retrieving campaign user {user_id}: {response.status}")
-                        return {}
+            session = await self._get_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return await response.json()
+                elif response.status == 404:
+                    self.logger.info(f"User {user_id} not found in campaign {campaign_id}")
+                    return {}
+                else:
+                    self.logger.error(f"Error retrieving campaign user {user_id}: {response.status}")
+                    return {}
         except Exception as e:
             self.logger.error(f"Error connecting to campaign repository: {e}")
             return {}
@@ -70,13 +89,13 @@ class CampaignUsersRepositoryClient:
         data["user_id"] = user_id
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=data) as response:
-                    if response.status in (200, 201):
-                        return True
-                    else:
-                        self.logger.error(f"Error creating campaign user {user_id}: {response.status}")
-                        return False
+            session = await self._get_session()
+            async with session.post(url, json=data) as response:
+                if response.status in (200, 201):
+                    return True
+                else:
+                    self.logger.error(f"Error creating campaign user {user_id}: {response.status}")
+                    return False
         except Exception as e:
             self.logger.error(f"Error connecting to campaign repository: {e}")
             return False
@@ -98,16 +117,16 @@ class CampaignUsersRepositoryClient:
         url = f"{self.base_url}/campaigns/{campaign_id}/users/{user_id}/profile"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.put(url, json=profile_data) as response:
-                    if response.status in (200, 204):
-                        return True
-                    elif response.status == 404:
-                        # User not found in campaign, create instead
-                        return await self.create_campaign_user(user_id, campaign_id, {"profile": profile_data})
-                    else:
-                        self.logger.error(f"Error updating campaign user {user_id} profile: {response.status}")
-                        return False
+            session = await self._get_session()
+            async with session.put(url, json=profile_data) as response:
+                if response.status in (200, 204):
+                    return True
+                elif response.status == 404:
+                    # User not found in campaign, create instead
+                    return await self.create_campaign_user(user_id, campaign_id, {"profile": profile_data})
+                else:
+                    self.logger.error(f"Error updating campaign user {user_id} profile: {response.status}")
+                    return False
         except Exception as e:
             self.logger.error(f"Error connecting to campaign repository: {e}")
             return False
@@ -135,13 +154,13 @@ class CampaignUsersRepositoryClient:
         data["campaign_id"] = campaign_id
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=data) as response:
-                    if response.status in (200, 201):
-                        return True
-                    else:
-                        self.logger.error(f"Error storing campaign conversation metadata: {response.status}")
-                        return False
+            session = await self._get_session()
+            async with session.post(url, json=data) as response:
+                if response.status in (200, 201):
+                    return True
+                else:
+                    self.logger.error(f"Error storing campaign conversation metadata: {response.status}")
+                    return False
         except Exception as e:
             self.logger.error(f"Error connecting to campaign repository: {e}")
             return False
@@ -163,16 +182,16 @@ class CampaignUsersRepositoryClient:
         url = f"{self.base_url}/campaigns/{campaign_id}/users/{user_id}/conversations/{session_id}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 404:
-                        self.logger.info(f"Campaign conversation {session_id} not found")
-                        return {}
-                    else:
-                        self.logger.error(f"Error retrieving campaign conversation metadata: {response.status}")
-                        return {}
+            session = await self._get_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return await response.json()
+                elif response.status == 404:
+                    self.logger.info(f"Campaign conversation {session_id} not found")
+                    return {}
+                else:
+                    self.logger.error(f"Error retrieving campaign conversation metadata: {response.status}")
+                    return {}
         except Exception as e:
             self.logger.error(f"Error connecting to campaign repository: {e}")
             return {}
@@ -195,16 +214,16 @@ class CampaignUsersRepositoryClient:
         params = {"limit": limit}
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 404:
-                        self.logger.info(f"No campaign conversations found")
-                        return []
-                    else:
-                        self.logger.error(f"Error retrieving campaign conversations: {response.status}")
-                        return []
+            session = await self._get_session()
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    return await response.json()
+                elif response.status == 404:
+                    self.logger.info(f"No campaign conversations found")
+                    return []
+                else:
+                    self.logger.error(f"Error retrieving campaign conversations: {response.status}")
+                    return []
         except Exception as e:
             self.logger.error(f"Error connecting to campaign repository: {e}")
             return []
@@ -225,16 +244,70 @@ class CampaignUsersRepositoryClient:
         params = {"limit": limit, "offset": offset}
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 404:
-                        self.logger.info(f"No users found for campaign {campaign_id}")
-                        return []
-                    else:
-                        self.logger.error(f"Error retrieving campaign users: {response.status}")
-                        return []
+            session = await self._get_session()
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    return await response.json()
+                elif response.status == 404:
+                    self.logger.info(f"No users found for campaign {campaign_id}")
+                    return []
+                else:
+                    self.logger.error(f"Error retrieving campaign users: {response.status}")
+                    return []
         except Exception as e:
             self.logger.error(f"Error connecting to campaign repository: {e}")
-            return [] 
\ No newline at end of file
+            return []
+    
+    async def get_user_digest(self, user_id: str, campaign_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a user's cross-session digest for a campaign.
+        
+        Args:
+            user_id: The user ID
+            campaign_id: The campaign ID
+            
+        Returns:
+            Digest document (empty if none is stored), or None if the
+            repository could not be reached or returned an error
+        """
+        url = f"{self.base_url}/campaigns/{campaign_id}/users/{user_id}/digest"
+        
+        try:
+            session = await self._get_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return await response.json()
+                elif response.status == 404:
+                    return {}
+                else:
+                    self.logger.error(f"Error retrieving digest for campaign user {user_id}: {response.status}")
+                    return None
+        except Exception as e:
+            self.logger.error(f"Error connecting to campaign repository: {e}")
+            return None
+    
+    async def store_user_digest(self, user_id: str, campaign_id: str, digest: Dict[str, Any]) -> bool:
+        """
+        Store a user's cross-session digest for a campaign.
+        
+        Args:
+            user_id: The user ID
+            campaign_id: The campaign ID
+            digest: The digest document
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        url = f"{self.base_url}/campaigns/{campaign_id}/users/{user_id}/digest"
+        
+        try:
+            session = await self._get_session()
+            async with session.put(url, json=digest) as response:
+                if response.status in (200, 201, 204):
+                    return True
+                else:
+                    self.logger.error(f"Error storing digest for campaign user {user_id}: {response.status}")
+                    return False
+        except Exception as e:
+            self.logger.error(f"Error connecting to campaign repository: {e}")
+            return False
@@ -22,6 +22,25 @@ class SystemUsersConversationRepositoryClient:
         self.logger = logging.getLogger(__name__)
         self.base_config = self.config_inheritance.get_base_config()
         self.base_url = self.base_config.get("repository.system_users.url", "http://system-users-repository/api/v1")
+        # Shared across requests so connections are kept alive and reused
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared HTTP session, creating it on first use.
+        
+        Returns:
+            HTTP client session
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def get_user(self, user_id: str) -> Dict[str, Any]:
         """
@@ -36,16 +55,16 @@ class SystemUsersConversationRepositoryClient:
         url = f"{self.base_url}/users/{user_id}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 404:
-                        self.logger.info(f"User {user_id} not found in system repository")
-                        return {}
-                    else:
-                        self.logger.error(f"Error retrieving user {user_id}: {response.status}")
-                        return {}
+            session = await self._get_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return await response.json()
+                elif response.status == 404:
+                    self.logger.info(f"User {user_id} not found in system repository")
+                    return {}
+                else:
+                    self.logger.error(f"Error retrieving user {user_id}: {response.status}")
+                    return {}
         except Exception as e:
             self.logger.error(f"Error connecting to system repository: {e}")
             return {}
@@ -68,13 +87,13 @@ class SystemUsersConversationRepositoryClient:
         data["user_id"] = user_id
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=data) as response:
-                    if response.status in (200, 201):
-                        return True
-                    else:
-                        self.logger.error(f"Error creating user {user_id}: {response.status}")
-                        return False
+            session = await self._get_session()
+            async with session.post(url, json=data) as response:
+                if response.status in (200, 201):
+                    return True
+                else:
+                    self.logger.error(f"Error creating user {user_id}: {response.status}")
+                    return False
         except Exception as e:
             self.logger.error(f"Error connecting to system repository: {e}")
             return False
@@ -93,16 +112,16 @@ class SystemUsersConversationRepositoryClient:
         url = f"{self.base_url}/users/{user_id}/profile"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.put(url, json=profile_data) as response:
-                    if response.status in (200, 204):
-                        return True
-                    elif response.status == 404:
-                        # User not found, create instead
-                        return await self.create_user(user_id, {"profile": profile_data})
-                    else:
-                        self.logger.error(f"Error updating user {user_id} profile: {response.status}")
-                        return False
+            session = await self._get_session()
+            async with session.put(url, json=profile_data) as response:
+                if response.status in (200, 204):
+                    return True
+                elif response.status == 404:
+                    # User not found, create instead
+                    return await self.create_user(user_id, {"profile": profile_data})
+                else:
+                    self.logger.error(f"Error updating user {user_id} profile: {response.status}")
+                    return False
         except Exception as e:
             self.logger.error(f"Error connecting to system repository: {e}")
             return False
@@ -130,13 +149,13 @@ class SystemUsersConversationRepositoryClient:
         data["session_id"] = session_id
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=data) as response:
-                    if response.status in (200, 201):
-                        return True
-                    else:
-                        self.logger.error(f"Error storing conversation metadata for {user_id}: {response.status}")
-                        return False
+            session = await self._get_session()
+            async with session.post(url, json=data) as response:
+                if response.status in (200, 201):
+                    return True
+                else:
+                    self.logger.error(f"Error storing conversation metadata for {user_id}: {response.status}")
+                    return False
         except Exception as e:
             self.logger.error(f"Error connecting to system repository: {e}")
             return False
@@ -158,16 +177,16 @@ class SystemUsersConversationRepositoryClient:
         url = f"{self.base_url}/users/{user_id}/conversations/{session_id}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 404:
-                        self.logger.info(f"Conversation {session_id} not found for user {user_id}")
-                        return {}
-                    else:
-                        self.logger.error(f"Error retrieving conversation metadata: {response.status}")
-                        return {}
+            session = await self._get_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return await response.json()
+                elif response.status == 404:
+                    self.logger.info(f"Conversation {session_id} not found for user {user_id}")
+                    return {}
+                else:
+                    self.logger.error(f"Error retrieving conversation metadata: {response.status}")
+                    return {}
         except Exception as e:
             self.logger.error(f"Error connecting to system repository: {e}")
             return {}
@@ -193,16 +212,68 @@ class SystemUsersConversationRepositoryClient:
             params["bot_type"] = bot_type
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 404:
-                        self.logger.info(f"No conversations found for user {user_id}")
-                        return []
-                    else:
-                        self.logger.error(f"Error retrieving user conversations: {response.status}")
-                        return []
+            session = await self._get_session()
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    return await response.json()
+                elif response.status == 404:
+                    self.logger.info(f"No conversations found for user {user_id}")
+                    return []
+                else:
+                    self.logger.error(f"Error retrieving user conversations: {response.status}")
+                    return []
+        except Exception as e:
+            self.logger.error(f"Error connecting to system repository: {e}")
+            return []
+    
+    async def get_user_digest(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a user's cross-session digest from the system repository.
+        
+        Args:
+            user_id: The user ID
+            
+        Returns:
+            Digest document (empty if none is stored), or None if the
+            repository could not be reached or returned an error
+        """
+        url = f"{self.base_url}/users/{user_id}/digest"
+        
+        try:
+            session = await self._get_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return await response.json()
+                elif response.status == 404:
+                    return {}
+                else:
+                    self.logger.error(f"Error retrieving digest for {user_id}: {response.status}")
+                    return None
+        except Exception as e:
+            self.logger.error(f"Error connecting to system repository: {e}")
+            return None
+    
+    async def store_user_digest(self, user_id: str, digest: Dict[str, Any]) -> bool:
+        """
+        Store a user's cross-session digest in the system repository.
+        
+        Args:
+            user_id: The user ID
+            digest: The digest document
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        url = f"{self.base_url}/users/{user_id}/digest"
+        
+        try:
+            session = await self._get_session()
+            async with session.put(url, json=digest) as response:
+                if response.status in (200, 201, 204):
+                    return True
+                else:
+                    self.logger.error(f"Error storing digest for {user_id}: {response.status}")
+                    return False
         except Exception as e:
             self.logger.error(f"Error connecting to system repository: {e}")
-            return [] 
\ No newline at end of file
+            return False
@@ -12,9 +12,12 @@ import json
 from datetime import datetime
 import asyncio
 
+from src.conversation.middleware.scheduler import declare_processor
+
 logger = logging.getLogger(__name__)
 
 
+@declare_processor(writes=["detected_intent"])
 async def intent_detection_processor(
     message: str, 
     context: Dict[str, Any],
@@ -103,6 +106,7 @@ async def intent_detection_processor(
     return message, context_updates
 
 
+@declare_processor(writes=["entities"])
 async def entity_extraction_processor(
     message: str, 
     context: Dict[str, Any],
@@ -160,6 +164,10 @@ async def entity_extraction_processor(
     return message, context_updates
 
 
+@declare_processor(
+    reads=["messages", "current_state", "detected_topics"],
+    writes=["conversation_summary", "messages"]
+)
 async def message_summarization_processor(
     message: str, 
     context: Dict[str, Any],
@@ -214,6 +222,7 @@ async def message_summarization_processor(
     return message, context_updates
 
 
+@declare_processor(reads=["sentiment_history"], writes=["sentiment", "sentiment_history"])
 async def sentiment_analysis_processor(
     message: str, 
     context: Dict[str, Any],
@@ -272,7 +281,8 @@ async def sentiment_analysis_processor(
     logger.info(f"Detected sentiment: {sentiment} (score: {sentiment_score:.2f})")
     
     # Track sentiment history
-    sentiment_history = context.get("sentiment_history", [])
+    # Copy so the caller's context is not modified
+    sentiment_history = list(context.get("sentiment_history", []))
     sentiment_history.append({
         "score": sentiment_score,
         "label": sentiment,
@@ -290,6 +300,11 @@ async def sentiment_analysis_processor(
 
 # Post-processing middlewares
 
+@declare_processor(
+    reads=["user_info", "current_state", "conversation_flags"],
+    writes=["response_metadata", "conversation_flags"],
+    transforms_message=True
+)
 async def response_formatting_processor(
     response: str,
     original_message: str,
@@ -341,13 +356,14 @@ async def response_formatting_processor(
         if "As I was saying" not in formatted_response and "mentioned earlier" not in formatted_response:
             formatted_response = f"As I was saying about {continue_point}, {formatted_response}"
         # Clear the continue flag
-        context_updates["conversation_flags"] = context.get("conversation_flags", {})
+        context_updates["conversation_flags"] = dict(context.get("conversation_flags", {}))
         context_updates["conversation_flags"]["continue_point"] = None
     
     logger.info(f"Response formatted with typing delay: {typing_delay}s")
     return formatted_response, context_updates
 
 
+@declare_processor(reads=["sentiment"], writes=["response_analytics"], transforms_message=True)
 async def response_enhancement_processor(
     response: str,
     original_message: str,
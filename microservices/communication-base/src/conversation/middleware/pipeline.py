@@ -2,14 +2,17 @@
 Middleware Pipeline
 
 This module provides a pipeline for applying middleware processors to messages
-and responses during conversation processing.
+and responses during conversation processing. Processors that declare the
+context keys they read and write run concurrently when independent.
 """
 
 import logging
 from typing import Dict, Any, List, Tuple, Callable, Awaitable, Optional
 import asyncio
+import time
 
 from src.config.config_integration import ConfigIntegration
+from src.conversation.middleware.scheduler import ProcessorGraph, ProcessorSpec
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +49,15 @@ class MiddlewarePipeline:
             "all": []  # Applied to all bot types
         }
         
+        # Declarations passed at registration, overriding decorator ones
+        self.processor_specs: Dict[Callable, ProcessorSpec] = {}
+        
+        # Compiled processor graphs keyed by (stage, bot_type)
+        self._graphs: Dict[Tuple[str, str], ProcessorGraph] = {}
+        
+        # Per-processor timing statistics keyed by "stage:processor"
+        self.timings: Dict[str, Dict[str, float]] = {}
+        
         # Load middleware configuration
         self._load_middleware_config()
         
@@ -71,15 +83,31 @@ class MiddlewarePipeline:
     def register_pre_processor(
         self, 
         processor: PreProcessorType, 
-        bot_types: List[str] = ["all"]
+        bot_types: List[str] = ["all"],
+        reads: Optional[List[str]] = None,
+        writes: Optional[List[str]] = None,
+        transforms_message: bool = False
     ) -> None:
         """
         Register a pre-processor for specified bot types.
         
+        Processors declaring their context keys (here or with
+        ``declare_processor``) run concurrently with independent processors;
+        undeclared processors run alone, in registration order.
+        
         Args:
             processor: The pre-processor function
             bot_types: List of bot types to apply this processor to
+            reads: Context keys the processor reads
+            writes: Context keys the processor returns updates for
+            transforms_message: Whether the processor changes the message
         """
+        if reads is not None or writes is not None:
+            self.processor_specs[processor] = ProcessorSpec(
+                frozenset(reads or ()), frozenset(writes or ()), transforms_message
+            )
+        self._graphs.clear()
+        
         for bot_type in bot_types:
             if bot_type in self.pre_processors:
                 self.pre_processors[bot_type].append(processor)
@@ -90,15 +118,31 @@ class MiddlewarePipeline:
     def register_post_processor(
         self, 
         processor: PostProcessorType, 
-        bot_types: List[str] = ["all"]
+        bot_types: List[str] = ["all"],
+        reads: Optional[List[str]] = None,
+        writes: Optional[List[str]] = None,
+        transforms_message: bool = False
     ) -> None:
         """
         Register a post-processor for specified bot types.
         
+        Processors declaring their context keys (here or with
+        ``declare_processor``) run concurrently with independent processors;
+        undeclared processors run alone, in registration order.
+        
         Args:
             processor: The post-processor function
             bot_types: List of bot types to apply this processor to
+            reads: Context keys the processor reads
+            writes: Context keys the processor returns updates for
+            transforms_message: Whether the processor changes the response
         """
+        if reads is not None or writes is not None:
+            self.processor_specs[processor] = ProcessorSpec(
+                frozenset(reads or ()), frozenset(writes or ()), transforms_message
+            )
+        self._graphs.clear()
+        
         for bot_type in bot_types:
             if bot_type in self.post_processors:
                 self.post_processors[bot_type].append(processor)
@@ -123,26 +167,15 @@ class MiddlewarePipeline:
         Returns:
             Tuple of (processed_message, updated_context)
         """
-        processed_message = message
-        current_context = context.copy()
-        
         try:
-            # Apply general processors first
-            for processor in self.pre_processors["all"]:
-                processed_message, context_updates = await processor(
-                    processed_message, current_context, bot_type
-                )
-                if context_updates:
-                    current_context.update(context_updates)
-            
-            # Then apply bot-specific processors
-            if bot_type in self.pre_processors:
-                for processor in self.pre_processors[bot_type]:
-                    processed_message, context_updates = await processor(
-                        processed_message, current_context, bot_type
-                    )
-                    if context_updates:
-                        current_context.update(context_updates)
+            processed_message, current_context = await self._run_stage(
+                "pre",
+                self.pre_processors,
+                bot_type,
+                message,
+                context,
+                lambda processor, msg, ctx: processor(msg, ctx, bot_type)
+            )
             
             logger.info(f"Applied pre-processors for bot type {bot_type}")
             return processed_message, current_context
@@ -170,30 +203,99 @@ class MiddlewarePipeline:
         Returns:
             Tuple of (processed_response, updated_context)
         """
-        processed_response = response
-        current_context = context.copy()
-        
         try:
-            # Apply general processors first
-            for processor in self.post_processors["all"]:
-                processed_response, context_updates = await processor(
-                    processed_response, original_message, current_context, bot_type
-                )
-                if context_updates:
-                    current_context.update(context_updates)
-            
-            # Then apply bot-specific processors
-            if bot_type in self.post_processors:
-                for processor in self.post_processors[bot_type]:
-                    processed_response, context_updates = await processor(
-                        processed_response, original_message, current_context, bot_type
-                    )
-                    if context_updates:
-                        current_context.update(context_updates)
+            processed_response, current_context = await self._run_stage(
+                "post",
+                self.post_processors,
+                bot_type,
+                response,
+                context,
+                lambda processor, resp, ctx: processor(resp, original_message, ctx, bot_type)
+            )
             
             logger.info(f"Applied post-processors for bot type {bot_type}")
             return processed_response, current_context
         except Exception as e:
             logger.error(f"Error applying post-processors: {e}")
             # Return original response and context in case of error
-            return response, context 
\ No newline at end of file
+            return response, context
+    
+    async def _run_stage(
+        self,
+        stage: str,
+        registry: Dict[str, List[Callable]],
+        bot_type: str,
+        text: str,
+        context: Dict[str, Any],
+        call: Callable[[Callable, str, Dict[str, Any]], Awaitable[Tuple[str, Optional[Dict[str, Any]]]]]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Run the compiled processor graph of a stage for a bot type.
+        
+        Args:
+            stage: "pre" or "post"
+            registry: Registered processors of the stage by bot type
+            bot_type: The type of bot
+            text: The message or response to process
+            context: The conversation context
+            call: Invokes a processor with the current text and context
+            
+        Returns:
+            Tuple of (processed_text, updated_context)
+        """
+        graph = self._get_graph(stage, registry, bot_type)
+        start = time.perf_counter()
+        result = await graph.run(
+            text, context, call, lambda name, seconds: self._record_timing(f"{stage}:{name}", seconds)
+        )
+        self._record_timing(f"{stage}:total", time.perf_counter() - start)
+        return result
+    
+    def _get_graph(self, stage: str, registry: Dict[str, List[Callable]], bot_type: str) -> ProcessorGraph:
+        """
+        Get the processor graph of a stage for a bot type, compiling it once.
+        
+        Args:
+            stage: "pre" or "post"
+            registry: Registered processors of the stage by bot type
+            bot_type: The type of bot
+            
+        Returns:
+            Compiled processor graph
+        """
+        key = (stage, bot_type)
+        graph = self._graphs.get(key)
+        if graph is None:
+            # General processors first, then bot-specific ones
+            processors = registry["all"] + (registry.get(bot_type, []) if bot_type != "all" else [])
+            graph = self._graphs[key] = ProcessorGraph(processors, self.processor_specs)
+            logger.info(f"Compiled {stage}-processors for bot type {bot_type}: {graph.levels()}")
+        return graph
+    
+    def _record_timing(self, name: str, seconds: float) -> None:
+        """
+        Record a processor duration.
+        
+        Args:
+            name: Timing key ("stage:processor")
+            seconds: Duration in seconds
+        """
+        stats = self.timings.get(name)
+        if stats is None:
+            stats = self.timings[name] = {"calls": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        stats["calls"] += 1
+        stats["total_seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+    
+    def get_processor_timings(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-processor timing statistics.
+        
+        Returns:
+            Statistics keyed by "stage:processor" (and "stage:total" for the
+            whole stage), with calls, total, mean and max seconds
+        """
+        return {
+            name: {**stats, "mean_seconds": stats["total_seconds"] / stats["calls"]}
+            for name, stats in self.timings.items()
+        }
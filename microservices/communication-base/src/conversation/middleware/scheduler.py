@@ -0,0 +1,237 @@
+"""
+Middleware Scheduler
+
+This module schedules middleware processors as a dependency graph. Processors
+declare the context keys they read and write; processors that do not touch
+each other's keys run concurrently, while the rest keep their registration
+order. Processors without a declaration act as barriers, so they run alone
+and in order exactly as in a sequential pipeline.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pseudo context key standing for the message (or response) being processed
+MESSAGE_KEY = "@message"
+
+
+class ProcessorSpec(NamedTuple):
+    """Context keys a processor reads and writes."""
+
+    reads: FrozenSet[str]
+    writes: FrozenSet[str]
+    transforms_message: bool = False
+
+
+def declare_processor(
+    reads: Iterable[str] = (),
+    writes: Iterable[str] = (),
+    transforms_message: bool = False
+) -> Callable[[Callable], Callable]:
+    """
+    Decorator declaring the context keys a middleware processor reads and
+    writes, so the pipeline can run it alongside independent processors.
+
+    Args:
+        reads: Context keys the processor reads
+        writes: Context keys the processor returns updates for
+        transforms_message: Whether the processor changes the message (or
+            response); otherwise its returned message is ignored
+
+    Returns:
+        Decorator attaching the declaration to the processor
+    """
+    spec = ProcessorSpec(frozenset(reads), frozenset(writes), transforms_message)
+
+    def decorate(processor: Callable) -> Callable:
+        processor.middleware_spec = spec
+        return processor
+
+    return decorate
+
+
+def get_processor_spec(processor: Callable) -> Optional[ProcessorSpec]:
+    """
+    Get the declaration of a processor.
+
+    Args:
+        processor: Middleware processor
+
+    Returns:
+        The declared spec, or None for an undeclared processor
+    """
+    return getattr(processor, "middleware_spec", None)
+
+
+def processor_name(processor: Callable) -> str:
+    """
+    Get a readable name for a processor.
+
+    Args:
+        processor: Middleware processor
+
+    Returns:
+        Processor name
+    """
+    return getattr(processor, "__name__", None) or type(processor).__name__
+
+
+class _Node:
+    """A processor in the dependency graph."""
+
+    __slots__ = ("processor", "name", "spec", "reads", "writes", "deps", "warned")
+
+    def __init__(self, processor: Callable, spec: Optional[ProcessorSpec]):
+        self.processor = processor
+        self.name = processor_name(processor)
+        self.spec = spec
+        self.deps: List[int] = []
+        self.warned = False
+        if spec is not None:
+            self.reads: Set[str] = set(spec.reads) | {MESSAGE_KEY}
+            self.writes: Set[str] = set(spec.writes) | ({MESSAGE_KEY} if spec.transforms_message else set())
+
+    @property
+    def barrier(self) -> bool:
+        return self.spec is None
+
+    def depends_on(self, earlier: "_Node") -> bool:
+        if self.barrier or earlier.barrier:
+            return True
+        # Read-after-write, write-after-write and write-after-read
+        return bool(
+            earlier.writes & (self.reads | self.writes)
+            or earlier.reads & self.writes
+        )
+
+
+ProcessorCall = Callable[[Callable, str, Dict[str, Any]], Awaitable[Tuple[str, Optional[Dict[str, Any]]]]]
+TimingRecorder = Callable[[str, float], None]
+
+
+class ProcessorGraph:
+    """
+    Processors compiled into a dependency graph, in registration order.
+
+    Each processor starts as soon as the processors it depends on finish.
+    Context updates are merged into one working context as processors
+    complete; dependencies guarantee that no processor sees an update it
+    would not have seen when run sequentially.
+    """
+
+    def __init__(
+        self,
+        processors: List[Callable],
+        specs: Optional[Dict[Callable, ProcessorSpec]] = None
+    ):
+        """
+        Compile processors into a graph.
+
+        Args:
+            processors: Processors in registration order
+            specs: Declarations overriding those attached to the processors
+        """
+        specs = specs or {}
+        self.nodes = [_Node(p, specs.get(p) or get_processor_spec(p)) for p in processors]
+        for j, node in enumerate(self.nodes):
+            node.deps = [i for i in range(j) if node.depends_on(self.nodes[i])]
+
+        # Longest-path depth of each processor
+        self.depth: List[int] = []
+        for node in self.nodes:
+            self.depth.append(1 + max((self.depth[i] for i in node.deps), default=0))
+        self.sequential = len(self.nodes) <= 1 or len(set(self.depth)) == len(self.nodes)
+
+    def levels(self) -> List[List[str]]:
+        """
+        Get processor names grouped by dependency depth.
+
+        Returns:
+            Lists of processor names; processors in one list can run together
+        """
+        levels: List[List[str]] = [[] for _ in range(max(self.depth, default=0))]
+        for node, depth in zip(self.nodes, self.depth):
+            levels[depth - 1].append(node.name)
+        return levels
+
+    async def run(
+        self,
+        message: str,
+        context: Dict[str, Any],
+        call: ProcessorCall,
+        record: Optional[TimingRecorder] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Run the processors.
+
+        Args:
+            message: The message (or response) to process
+            context: The conversation context (not modified)
+            call: Coroutine function invoking a processor with the current
+                message and context
+            record: Callback receiving each processor's name and duration
+
+        Returns:
+            Tuple of (processed_message, updated_context)
+
+        Raises:
+            Exception: The first processor failure; other running processors
+                are cancelled
+        """
+        state = {"message": message, "context": dict(context)}
+
+        if self.sequential:
+            for node in self.nodes:
+                await self._run_node(node, state, call, record)
+            return state["message"], state["context"]
+
+        tasks: List[asyncio.Task] = []
+        for node in self.nodes:
+            deps = [tasks[i] for i in node.deps]
+            tasks.append(asyncio.ensure_future(self._run_after(deps, node, state, call, record)))
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return state["message"], state["context"]
+
+    async def _run_after(
+        self,
+        deps: List[asyncio.Task],
+        node: _Node,
+        state: Dict[str, Any],
+        call: ProcessorCall,
+        record: Optional[TimingRecorder]
+    ) -> None:
+        if deps:
+            await asyncio.gather(*deps)
+        await self._run_node(node, state, call, record)
+
+    async def _run_node(
+        self,
+        node: _Node,
+        state: Dict[str, Any],
+        call: ProcessorCall,
+        record: Optional[TimingRecorder]
+    ) -> None:
+        start = time.perf_counter()
+        message, updates = await call(node.processor, state["message"], state["context"])
+        if record:
+            record(node.name, time.perf_counter() - start)
+
+        if node.barrier or node.spec.transforms_message:
+            state["message"] = message
+        if updates:
+            if not node.barrier and not node.warned and not updates.keys() <= node.spec.writes:
+                node.warned = True
+                undeclared = sorted(set(updates) - node.spec.writes)
+                logger.warning(f"Processor {node.name} wrote undeclared context keys {undeclared}")
+            state["context"].update(updates)
@@ -12,6 +12,12 @@ import asyncio
 import json
 
 from src.config.config_integration import ConfigIntegration
+from src.conversation.transitions.rule_compiler import (
+    TransitionRuleCompiler,
+    CompiledCondition,
+    CompiledRuleSet,
+    EvaluationScope,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +42,9 @@ class TransitionEngine:
         self.config_integration = config_integration
         self.transition_rules: Dict[str, Dict[str, Any]] = {}
         self.condition_evaluators: Dict[str, ConditionEvaluatorType] = {}
+        self.rule_compiler = TransitionRuleCompiler()
+        self.compiled_rules: Dict[str, CompiledRuleSet] = {}
+        self._evaluator_generation = 0
         
         # Register built-in condition evaluators
         self._register_built_in_evaluators()
@@ -106,6 +115,35 @@ class TransitionEngine:
                 "consultancy": {},
                 "support": {}
             }
+        
+        self._compile_transition_rules()
+    
+    def reload_transition_rules(self) -> None:
+        """
+        Reload transition rules from configuration.
+        
+        Unchanged bot configurations reuse their cached compiled form.
+        """
+        self._load_transition_rules()
+    
+    def _compile_transition_rules(self) -> None:
+        """
+        Compile the loaded transition rules for every bot type.
+        """
+        evaluator_types = frozenset(self.condition_evaluators)
+        native_keyword_match = (
+            self.condition_evaluators.get("keyword_match") == self._evaluate_keyword_match
+        )
+        self.compiled_rules = {
+            bot_type: self.rule_compiler.compile(
+                bot_type,
+                rules,
+                evaluator_types,
+                native_keyword_match=native_keyword_match,
+                generation=self._evaluator_generation
+            )
+            for bot_type, rules in self.transition_rules.items()
+        }
     
     def register_condition_evaluator(
         self, 
@@ -120,6 +158,12 @@ class TransitionEngine:
             evaluator: Function to evaluate the condition
         """
         self.condition_evaluators[condition_type] = evaluator
+        self._evaluator_generation += 1
+        
+        # Recompile so the new evaluator takes effect (skipped during __init__)
+        if getattr(self, "transition_rules", None):
+            self._compile_transition_rules()
+        
         logger.info(f"Registered condition evaluator for {condition_type}")
     
     async def evaluate_transitions(
@@ -143,65 +187,78 @@ class TransitionEngine:
         Returns:
             Next state name or None if no transition applies
         """
-        if bot_type not in self.transition_rules:
+        compiled = self.compiled_rules.get(bot_type)
+        if compiled is None:
             logger.warning(f"No transition rules for bot type {bot_type}")
             return None
             
-        # Get transitions for current state
-        state_transitions = self.transition_rules[bot_type].get(current_state, [])
+        # Get priority-ordered transitions for current state
+        state_transitions = compiled.transitions_for(current_state)
         if not state_transitions:
             logger.info(f"No transitions defined for state {current_state} in {bot_type}")
             return None
         
-        # Evaluate each transition
+        # Condition results are shared across all rules for this message
+        scope = compiled.scope_for(current_state, message, context)
+        
         for transition in state_transitions:
-            target_state = transition.get("target")
-            conditions = transition.get("conditions", [])
-            
-            if not target_state:
-                logger.warning(f"Transition missing target state for {current_state}")
-                continue
-                
-            # Skip if there are no conditions (prevent unintended transitions)
-            if not conditions:
-                logger.warning(f"Transition has no conditions for {current_state} to {target_state}")
-                continue
-            
-            # Evaluate all conditions
-            all_conditions_met = True
-            for condition in conditions:
-                condition_type = condition.get("type")
-                if not condition_type:
-                    logger.warning(f"Condition missing type in {current_state} transition")
-                    all_conditions_met = False
-                    break
-                
-                # Skip if evaluator not available
-                if condition_type not in self.condition_evaluators:
-                    logger.warning(f"No evaluator for condition type {condition_type}")
-                    all_conditions_met = False
-                    break
-                
-                # Evaluate condition
-                evaluator = self.condition_evaluators[condition_type]
-                try:
-                    result = await evaluator(message, context, condition)
-                    if not result:
-                        all_conditions_met = False
-                        break
-                except Exception as e:
-                    logger.error(f"Error evaluating condition {condition_type}: {e}")
-                    all_conditions_met = False
-                    break
-            
-            # If all conditions are met, transition to the target state
-            if all_conditions_met:
-                logger.info(f"Transition conditions met: {current_state} -> {target_state}")
-                return target_state
+            if await self._conditions_met(transition.conditions, scope):
+                logger.info(f"Transition conditions met: {current_state} -> {transition.target}")
+                return transition.target
         
         # No transitions applicable
         return None
     
+    async def _conditions_met(
+        self,
+        conditions: List[CompiledCondition],
+        scope: EvaluationScope
+    ) -> bool:
+        """
+        Check whether all compiled conditions hold, reusing shared results.
+        
+        Args:
+            conditions: Compiled conditions of a transition
+            scope: Evaluation scope for the current message
+            
+        Returns:
+            True if all conditions are met, False otherwise
+        """
+        for condition in conditions:
+            if condition.keywords is not None:
+                # Answered from the state's keyword index, scanned once per message
+                result = not scope.keywords_found.isdisjoint(condition.keywords)
+            else:
+                result = scope.results.get(condition.key)
+                if result is None:
+                    result = await self._evaluate_compiled_condition(condition, scope)
+                    scope.results[condition.key] = result
+            if not result:
+                return False
+        return True
+    
+    async def _evaluate_compiled_condition(
+        self,
+        condition: CompiledCondition,
+        scope: EvaluationScope
+    ) -> bool:
+        """
+        Evaluate a single compiled condition.
+        
+        Args:
+            condition: Compiled condition
+            scope: Evaluation scope for the current message
+            
+        Returns:
+            Condition result (errors count as not met)
+        """
+        evaluator = self.condition_evaluators[condition.condition_type]
+        try:
+            return bool(await evaluator(scope.message, scope.context, condition.config))
+        except Exception as e:
+            logger.error(f"Error evaluating condition {condition.condition_type}: {e}")
+            return False
+    
     # ----- Built-in condition evaluators -----
     
     async def _evaluate_intent_match(
@@ -0,0 +1,409 @@
+"""
+Transition Rule Compiler
+
+This module compiles the raw ``transitions.{bot_type}`` configuration into an
+indexed, pre-validated form that the transition engine can evaluate quickly.
+
+Compilation does the following once per configuration version:
+
+- indexes transitions by source state and orders them by priority
+- drops malformed transitions (missing target, no conditions, unknown types)
+- precompiles every keyword condition of a state into one keyword index,
+  so a message is scanned once per state rather than once per rule
+- assigns each distinct condition a shared key so identical conditions used
+  by several rules are evaluated only once per message
+"""
+
+import hashlib
+import json
+import logging
+import re
+from typing import Dict, Any, List, Optional, Tuple, Pattern, FrozenSet, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+def rules_fingerprint(rules: Dict[str, Any]) -> str:
+    """
+    Compute a stable version identifier for a bot type's transition rules.
+
+    Args:
+        rules: Transition rules keyed by source state
+
+    Returns:
+        Hex digest identifying this exact rule configuration
+    """
+    payload = json.dumps(rules or {}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def condition_key(condition: Dict[str, Any]) -> str:
+    """
+    Build the shared cache key for a condition.
+
+    Two conditions with the same type and parameters get the same key, so
+    their result can be reused across rules within one evaluation.
+
+    Args:
+        condition: Condition configuration
+
+    Returns:
+        Canonical key for the condition
+    """
+    return json.dumps(condition, sort_keys=True, default=str)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex that matches any of the words, factored by common prefix.
+
+    Optional branches are greedy, so the regex prefers the longest word that
+    matches at a given position.
+
+    Args:
+        words: Non-empty literal words
+
+    Returns:
+        Regex source matching any of the words
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, Any]) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return ("(?:" + body + ")?") if len(branches) == 1 else body + "?"
+        return body
+
+    return render(trie)
+
+
+class KeywordIndex:
+    """
+    Precompiled keyword index for all ``keyword_match`` conditions of a state.
+
+    Preserves the original semantics (case-insensitive substring match on any
+    keyword) but scans the message once per state instead of once per rule.
+    The keywords are folded into a prefix-trie regex wrapped in a lookahead,
+    which finds the longest keyword starting at every position in time
+    proportional to the keyword length rather than the keyword count. Any
+    other keyword starting at that position is a prefix of it, so the full
+    set of present keywords is recovered from precomputed prefix sets.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Initialize the index.
+
+        Args:
+            keywords: Lowercased keywords used by the state's conditions
+        """
+        self.keywords: FrozenSet[str] = frozenset(k for k in keywords if k)
+        self.pattern: Optional[Pattern[str]] = None
+        self._prefixes: Dict[str, FrozenSet[str]] = {}
+        if self.keywords:
+            self.pattern = re.compile("(?=(" + _trie_pattern(self.keywords) + "))")
+            for keyword in self.keywords:
+                self._prefixes[keyword] = frozenset(
+                    keyword[:i] for i in range(1, len(keyword) + 1)
+                    if keyword[:i] in self.keywords
+                )
+
+    def find(self, message_lower: str) -> FrozenSet[str]:
+        """
+        Find every indexed keyword that occurs in the message.
+
+        Args:
+            message_lower: Lowercased user message
+
+        Returns:
+            Set of keywords present in the message
+        """
+        if self.pattern is None:
+            return frozenset()
+        found = set()
+        for match in self.pattern.finditer(message_lower):
+            found.update(self._prefixes[match.group(1)])
+        return frozenset(found)
+
+
+class CompiledCondition:
+    """
+    A single condition prepared for evaluation.
+    """
+
+    __slots__ = ("condition_type", "config", "key", "keywords")
+
+    def __init__(self, condition_type: str, config: Dict[str, Any],
+                 keywords: Optional[FrozenSet[str]] = None):
+        """
+        Initialize the compiled condition.
+
+        Args:
+            condition_type: Condition type identifier
+            config: Original condition configuration
+            keywords: Lowercased keywords when the condition is answered by
+                the state's keyword index instead of an evaluator
+        """
+        self.condition_type = condition_type
+        self.config = config
+        self.key = condition_key(config)
+        self.keywords = keywords
+
+
+class CompiledTransition:
+    """
+    A transition with its conditions compiled and its priority resolved.
+    """
+
+    __slots__ = ("target", "priority", "order", "conditions")
+
+    def __init__(self, target: str, priority: float, order: int,
+                 conditions: List[CompiledCondition]):
+        """
+        Initialize the compiled transition.
+
+        Args:
+            target: Target state name
+            priority: Transition priority (higher is evaluated first)
+            order: Position in the original configuration (tie breaker)
+            conditions: Compiled conditions, all of which must hold
+        """
+        self.target = target
+        self.priority = priority
+        self.order = order
+        self.conditions = conditions
+
+
+class CompiledRuleSet:
+    """
+    Compiled transition rules for one bot type and configuration version.
+    """
+
+    def __init__(self, bot_type: str, version: str,
+                 states: Dict[str, List[CompiledTransition]],
+                 keyword_indexes: Dict[str, KeywordIndex]):
+        """
+        Initialize the rule set.
+
+        Args:
+            bot_type: Type of bot
+            version: Fingerprint of the source configuration
+            states: Compiled transitions keyed by source state
+            keyword_indexes: Keyword index keyed by source state
+        """
+        self.bot_type = bot_type
+        self.version = version
+        self.states = states
+        self.keyword_indexes = keyword_indexes
+
+    def transitions_for(self, state: str) -> List[CompiledTransition]:
+        """
+        Get the priority-ordered transitions for a source state.
+
+        Args:
+            state: Source state name
+
+        Returns:
+            Compiled transitions, highest priority first
+        """
+        return self.states.get(state, [])
+
+    def scope_for(self, state: str, message: str, context: Dict[str, Any]) -> "EvaluationScope":
+        """
+        Create the evaluation scope for a message in a source state.
+
+        Args:
+            state: Source state name
+            message: User message
+            context: Conversation context
+
+        Returns:
+            A fresh evaluation scope bound to the state's keyword index
+        """
+        return EvaluationScope(message, context, self.keyword_indexes.get(state))
+
+    @property
+    def rule_count(self) -> int:
+        """Total number of compiled transitions."""
+        return sum(len(transitions) for transitions in self.states.values())
+
+
+class EvaluationScope:
+    """
+    Per-message scratch space shared by all rules evaluated for that message.
+
+    Holds derived values (the lowercased message and the keywords present in
+    it) and the results of conditions already evaluated, keyed by condition key.
+    """
+
+    __slots__ = ("message", "context", "results", "keyword_index",
+                 "_message_lower", "_keywords_found")
+
+    def __init__(self, message: str, context: Dict[str, Any],
+                 keyword_index: Optional[KeywordIndex] = None):
+        self.message = message
+        self.context = context
+        self.results: Dict[str, bool] = {}
+        self.keyword_index = keyword_index
+        self._message_lower: Optional[str] = None
+        self._keywords_found: Optional[FrozenSet[str]] = None
+
+    @property
+    def message_lower(self) -> str:
+        """Lowercased message, computed once per scope."""
+        if self._message_lower is None:
+            self._message_lower = (self.message or "").lower()
+        return self._message_lower
+
+    @property
+    def keywords_found(self) -> FrozenSet[str]:
+        """Indexed keywords present in the message, scanned once per scope."""
+        if self._keywords_found is None:
+            if self.keyword_index is None:
+                self._keywords_found = frozenset()
+            else:
+                self._keywords_found = self.keyword_index.find(self.message_lower)
+        return self._keywords_found
+
+
+class TransitionRuleCompiler:
+    """
+    Compiles and caches transition rules.
+
+    Compiled rule sets are cached per bot type, configuration fingerprint and
+    evaluator registry generation, so reloading an unchanged configuration
+    reuses the previous compilation.
+    """
+
+    def __init__(self, max_cached_versions: int = 16):
+        """
+        Initialize the compiler.
+
+        Args:
+            max_cached_versions: Maximum number of compiled rule sets to keep
+        """
+        self.max_cached_versions = max_cached_versions
+        self._cache: Dict[Tuple[str, str, int], CompiledRuleSet] = {}
+
+    def compile(
+        self,
+        bot_type: str,
+        rules: Dict[str, Any],
+        evaluator_types: FrozenSet[str],
+        native_keyword_match: bool = True,
+        generation: int = 0
+    ) -> CompiledRuleSet:
+        """
+        Compile (or fetch from cache) the rules for a bot type.
+
+        Args:
+            bot_type: Type of bot
+            rules: Transition rules keyed by source state
+            evaluator_types: Condition types that have a registered evaluator
+            native_keyword_match: Whether ``keyword_match`` uses the built-in
+                evaluator and may therefore be replaced by a compiled matcher
+            generation: Evaluator registry generation, bumped whenever an
+                evaluator is registered
+
+        Returns:
+            The compiled rule set
+        """
+        version = rules_fingerprint(rules)
+        cache_key = (bot_type, version, generation)
+        compiled = self._cache.get(cache_key)
+        if compiled is not None:
+            return compiled
+
+        states: Dict[str, List[CompiledTransition]] = {}
+        keyword_indexes: Dict[str, KeywordIndex] = {}
+        for state, transitions in (rules or {}).items():
+            if not isinstance(transitions, list):
+                continue
+            compiled_transitions = []
+            for order, transition in enumerate(transitions):
+                compiled_transition = self._compile_transition(
+                    state, order, transition, evaluator_types, native_keyword_match
+                )
+                if compiled_transition is not None:
+                    compiled_transitions.append(compiled_transition)
+            # Stable sort keeps configuration order among equal priorities
+            compiled_transitions.sort(key=lambda t: (-t.priority, t.order))
+            states[state] = compiled_transitions
+            keyword_indexes[state] = KeywordIndex(
+                keyword
+                for transition in compiled_transitions
+                for condition in transition.conditions
+                if condition.keywords
+                for keyword in condition.keywords
+            )
+
+        compiled = CompiledRuleSet(bot_type, version, states, keyword_indexes)
+        if len(self._cache) >= self.max_cached_versions:
+            # Drop the oldest entry (dicts preserve insertion order)
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[cache_key] = compiled
+
+        logger.info(
+            f"Compiled {compiled.rule_count} transition rules for {bot_type} "
+            f"(version {version[:8]})"
+        )
+        return compiled
+
+    def clear(self) -> None:
+        """Drop all cached compilations."""
+        self._cache.clear()
+
+    def _compile_transition(
+        self,
+        state: str,
+        order: int,
+        transition: Dict[str, Any],
+        evaluator_types: FrozenSet[str],
+        native_keyword_match: bool
+    ) -> Optional[CompiledTransition]:
+        """
+        Compile a single transition, or return None if it can never fire.
+        """
+        target_state = transition.get("target")
+        conditions = transition.get("conditions", [])
+
+        if not target_state:
+            logger.warning(f"Transition missing target state for {state}")
+            return None
+
+        # Skip if there are no conditions (prevent unintended transitions)
+        if not conditions:
+            logger.warning(f"Transition has no conditions for {state} to {target_state}")
+            return None
+
+        compiled_conditions = []
+        for condition in conditions:
+            condition_type = condition.get("type")
+            if not condition_type:
+                logger.warning(f"Condition missing type in {state} transition")
+                return None
+            if condition_type not in evaluator_types:
+                logger.warning(f"No evaluator for condition type {condition_type}")
+                return None
+
+            keywords = None
+            if condition_type == "keyword_match" and native_keyword_match:
+                keywords = frozenset(str(k).lower() for k in condition.get("keywords", []) if k)
+            compiled_conditions.append(CompiledCondition(condition_type, condition, keywords))
+
+        try:
+            priority = float(transition.get("priority", 0))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid priority for {state} to {target_state}, using 0")
+            priority = 0.0
+
+        return CompiledTransition(target_state, priority, order, compiled_conditions)
@@ -8,8 +8,78 @@ while preserving semantic meaning.
 
 import logging
 import random
+import re
 from typing import Dict, Any, List, Optional, Union
 
+from ..pattern_bank import PatternBank, literal_rules
+
+# Common contractions mapping
+CONTRACTIONS = {
+    "are not": "aren't",
+    "cannot": "can't",
+    "could not": "couldn't",
+    "did not": "didn't",
+    "does not": "doesn't",
+    "do not": "don't",
+    "had not": "hadn't",
+    "has not": "hasn't",
+    "have not": "haven't",
+    "he is": "he's",
+    "he would": "he'd",
+    "I am": "I'm",
+    "I have": "I've",
+    "I will": "I'll",
+    "I would": "I'd",
+    "is not": "isn't",
+    "it is": "it's",
+    "it would": "it'd",
+    "she is": "she's",
+    "she would": "she'd",
+    "that is": "that's",
+    "there is": "there's",
+    "they are": "they're",
+    "they have": "they've",
+    "they would": "they'd",
+    "we are": "we're",
+    "we have": "we've",
+    "we would": "we'd",
+    "were not": "weren't",
+    "what is": "what's",
+    "will not": "won't",
+    "would not": "wouldn't",
+    "you are": "you're",
+    "you have": "you've",
+    "you would": "you'd"
+}
+
+# Simple formal-to-informal word substitutions
+VOCABULARY_SUBSTITUTIONS = {
+    "utilize": "use",
+    "therefore": "so",
+    "however": "but",
+    "additionally": "also",
+    "approximately": "about",
+    "sufficient": "enough",
+    "obtain": "get",
+    "purchase": "buy",
+    "require": "need",
+    "assist": "help",
+    "commence": "begin",
+    "terminate": "end",
+    "numerous": "many",
+    "initial": "first",
+    "currently": "now",
+    "subsequently": "later",
+    "prior to": "before",
+    "following": "after"
+}
+
+# Word boundary characters used by the substitution techniques
+_BOUNDARY = r"\s.,;:!?"
+
+# Abbreviations that do not end a sentence
+_ABBREVIATIONS = ("Mr.", "Mrs.", "Dr.", "St.", "vs.", "etc.", "i.e.", "e.g.")
+
 class ResponseVariator:
     """
     Response variator that applies multiple techniques to avoid AI detection.
@@ -23,7 +93,8 @@ class ResponseVariator:
         config_integration: Any = None,
         llm: Any = None,
         level: str = "medium",
-        techniques: Optional[List[str]] = None
+        techniques: Optional[List[str]] = None,
+        seed: Optional[int] = None
     ):
         """
         Initialize response variator.
@@ -33,10 +104,12 @@ class ResponseVariator:
             llm: Language model for complex variations
             level: Variability level ("low", "medium", "high")
             techniques: List of techniques to use (None for all)
+            seed: Seed for the variator's random generator (for reproducible output)
         """
         self.config_integration = config_integration
         self.llm = llm
         self.level = level
+        self.rng = random.Random(seed)
         self.techniques = techniques or [
             "sentence_structure", 
             "punctuation", 
@@ -52,6 +125,22 @@ class ResponseVariator:
         
         # Initialize technique-specific components
         self.technique_components = {}
+        
+        # Contractions only require a boundary after the phrase; vocabulary
+        # substitutions require one on both sides
+        self.contraction_bank = PatternBank(
+            literal_rules(CONTRACTIONS, category="contractions", suffix=rf"(?![^{_BOUNDARY}])")
+        )
+        self.vocabulary_bank = PatternBank(
+            literal_rules(
+                VOCABULARY_SUBSTITUTIONS,
+                category="vocabulary",
+                prefix=rf"(?<![^{_BOUNDARY}])",
+                suffix=rf"(?![^{_BOUNDARY}])"
+            )
+        )
+        self.sentence_end_pattern = re.compile(r'[.!?]')
+        self.quote_end_pattern = re.compile(r'([.!?])"')
     
     def _get_variability_params(self, level: str) -> Dict[str, float]:
         """
@@ -180,7 +269,7 @@ class ResponseVariator:
         
         for sentence in sentences:
             # Apply sentence structure variation based on frequency
-            if random.random() < self.variability_params["sentence_structure_freq"]:
+            if self.rng.random() < self.variability_params["sentence_structure_freq"]:
                 varied = self._vary_single_sentence(sentence)
                 varied_sentences.append(varied)
             else:
@@ -239,7 +328,7 @@ class ResponseVariator:
         
         # If no specific rule applied, use more general approach
         words = sentence.split()
-        if len(words) > 6 and random.random() < 0.5:
+        if len(words) > 6 and self.rng.random() < 0.5:
             # Move a phrase to the beginning or end
             mid_point = len(words) // 2
             
@@ -248,14 +337,14 @@ class ResponseVariator:
                 parts = sentence.split(",")
                 if len(parts) >= 2:
                     # Randomly reorganize parts around commas
-                    random.shuffle(parts)
+                    self.rng.shuffle(parts)
                     return ", ".join(parts)
             
             # Create a phrase from the second half and move it to the beginning
             first_half = " ".join(words[:mid_point])
             second_half = " ".join(words[mid_point:])
             
-            if random.random() < 0.5 and not sentence.startswith("I ") and not sentence.startswith("You "):
+            if self.rng.random() < 0.5 and not sentence.startswith("I ") and not sentence.startswith("You "):
                 # Move second half to front: "The cat sat on the mat" -> "On the mat, the cat sat"
                 return f"{second_half}, {first_half[0].lower() + first_half[1:]}"
         
@@ -285,7 +374,7 @@ class ResponseVariator:
                 continue
             
             # Apply punctuation variation based on frequency
-            if random.random() < self.variability_params["punctuation_freq"]:
+            if self.rng.random() < self.variability_params["punctuation_freq"]:
                 # Replace period with exclamation or question mark occasionally
                 if sentence.endswith("."):
                     if "!" in sentence or "?" in sentence:
@@ -305,7 +394,7 @@ class ResponseVariator:
                 varied_sentences.append(sentence)
             
             # Occasionally add a trailing ellipsis between sentences
-            if i < len(sentences) - 1 and random.random() < 0.1 and not sentence.endswith(("...", "!", "?")):
+            if i < len(sentences) - 1 and self.rng.random() < 0.1 and not sentence.endswith(("...", "!", "?")):
                 varied_sentences[-1] = varied_sentences[-1][:-1] + "..."
         
         return " ".join(varied_sentences)
@@ -320,72 +409,7 @@ class ResponseVariator:
         Returns:
             Text with contractions
         """
-        # Common contractions mapping
-        contractions = {
-            "are not": "aren't",
-            "cannot": "can't",
-            "could not": "couldn't",
-            "did not": "didn't",
-            "does not": "doesn't",
-            "do not": "don't",
-            "had not": "hadn't",
-            "has not": "hasn't",
-            "have not": "haven't",
-            "he is": "he's",
-            "he would": "he'd",
-            "I am": "I'm",
-            "I have": "I've",
-            "I will": "I'll",
-            "I would": "I'd",
-            "is not": "isn't",
-            "it is": "it's",
-            "it would": "it'd",
-            "she is": "she's",
-            "she would": "she'd",
-            "that is": "that's",
-            "there is": "there's",
-            "they are": "they're",
-            "they have": "they've",
-            "they would": "they'd",
-            "we are": "we're",
-            "we have": "we've",
-            "we would": "we'd",
-            "were not": "weren't",
-            "what is": "what's",
-            "will not": "won't",
-            "would not": "wouldn't",
-            "you are": "you're",
-            "you have": "you've",
-            "you would": "you'd"
-        }
-        
-        result = text
-        
-        # Apply each contraction with probability based on frequency
-        for full, contracted in contractions.items():
-            # Skip if the full form isn't in the text
-            if full not in result:
-                continue
-            
-            # Apply contraction with probability
-            if random.random() < self.variability_params["contraction_freq"]:
-                # Replace but be careful with word boundaries
-                parts = result.split(full)
-                result = ""
-                for i, part in enumerate(parts):
-                    result += part
-                    if i < len(parts) - 1:
-                        # Check if it's a word boundary
-                        next_char = ""
-                        if i < len(parts) - 1 and parts[i+1]:
-                            next_char = parts[i+1][0]
-                        
-                        if not next_char or next_char.isspace() or next_char in ".,;:!?":
-                            result += contracted
-                        else:
-                            result += full
-        
-        return result
+        return self.contraction_bank.substitute_all(text, self.rng, self.variability_params["contraction_freq"])
     
     def _add_fillers(self, text: str) -> str:
         """
@@ -430,15 +454,15 @@ class ResponseVariator:
                 continue
             
             # Add beginning filler with low probability
-            if random.random() < self.variability_params["filler_freq"] * 0.7:
-                filler = random.choice(beginning_fillers)
+            if self.rng.random() < self.variability_params["filler_freq"] * 0.7:
+                filler = self.rng.choice(beginning_fillers)
                 sentence = filler + sentence[0].lower() + sentence[1:]
             
             # Add middle filler with low probability for longer sentences
             words = sentence.split()
-            if len(words) > 10 and random.random() < self.variability_params["filler_freq"] * 0.5:
-                insert_pos = random.randint(3, len(words) - 3)
-                filler = random.choice(middle_fillers)
+            if len(words) > 10 and self.rng.random() < self.variability_params["filler_freq"] * 0.5:
+                insert_pos = self.rng.randint(3, len(words) - 3)
+                filler = self.rng.choice(middle_fillers)
                 
                 # Insert at word boundary
                 before = " ".join(words[:insert_pos])
@@ -481,13 +505,13 @@ class ResponseVariator:
                 continue
             
             # Add interjection at the beginning for some sentences
-            if i > 0 and random.random() < self.variability_params["informality_level"] * 0.3:
-                interjection = random.choice(interjections)
+            if i > 0 and self.rng.random() < self.variability_params["informality_level"] * 0.3:
+                interjection = self.rng.choice(interjections)
                 sentence = f"{interjection.capitalize()}, {sentence[0].lower() + sentence[1:]}"
             
             # Change ending punctuation for some sentences
-            if sentence.endswith(".") and random.random() < self.variability_params["informality_level"] * 0.4:
-                ending = random.choice(informal_endings)
+            if sentence.endswith(".") and self.rng.random() < self.variability_params["informality_level"] * 0.4:
+                ending = self.rng.choice(informal_endings)
                 sentence = sentence[:-1] + ending
             
             varied_sentences.append(sentence)
@@ -508,62 +532,7 @@ class ResponseVariator:
         if self.variability_params["vocabulary_variation"] < 0.1:
             return text
         
-        # Simple word substitutions
-        substitutions = {
-            "utilize": "use",
-            "therefore": "so",
-            "however": "but",
-            "additionally": "also",
-            "approximately": "about",
-            "sufficient": "enough",
-            "obtain": "get",
-            "purchase": "buy",
-            "require": "need",
-            "assist": "help",
-            "commence": "begin",
-            "terminate": "end",
-            "numerous": "many",
-            "initial": "first",
-            "currently": "now",
-            "subsequently": "later",
-            "prior to": "before",
-            "following": "after"
-        }
-        
-        result = text
-        
-        # Apply each substitution with probability based on vocabulary variation
-        for formal, informal in substitutions.items():
-            # Skip if the formal word isn't in the text
-            if formal not in result:
-                continue
-            
-            # Apply substitution with probability
-            if random.random() < self.variability_params["vocabulary_variation"]:
-                # Replace but be careful with word boundaries
-                parts = result.split(formal)
-                result = ""
-                for i, part in enumerate(parts):
-                    result += part
-                    if i < len(parts) - 1:
-                        # Check if it's a word boundary
-                        prev_char = ""
-                        if part:
-                            prev_char = part[-1]
-                        
-                        next_char = ""
-                        if i < len(parts) - 1 and parts[i+1]:
-                            next_char = parts[i+1][0]
-                        
-                        is_boundary = (not prev_char or prev_char.isspace() or prev_char in ".,;:!?") and \
-                                    (not next_char or next_char.isspace() or next_char in ".,;:!?")
-                        
-                        if is_boundary:
-                            result += informal
-                        else:
-                            result += formal
-        
-        return result
+        return self.vocabulary_bank.substitute_all(text, self.rng, self.variability_params["vocabulary_variation"])
     
     def _split_into_sentences(self, text: str) -> List[str]:
         """
@@ -576,33 +545,29 @@ class ResponseVariator:
             List of sentences
         """
         # Basic sentence splitting
-        for end_marker in [".", "!", "?"]:
-            text = text.replace(f"{end_marker}\"", f"{end_marker}\" ")
+        text = self.quote_end_pattern.sub(r'\1" ', text)
         
         # Split on common sentence terminators but handle special cases
-        split_markers = [".", "!", "?"]
-        current_sentence = ""
         sentences = []
-        
-        for char in text:
-            current_sentence += char
+        start = 0
+        for match in self.sentence_end_pattern.finditer(text):
+            end = match.end()
             
-            if char in split_markers and len(current_sentence) > 1:
-                # Check if this is an actual end of sentence
-                sentence_ends = True
-                
-                # Check for common abbreviations
-                for abbr in ["Mr.", "Mrs.", "Dr.", "St.", "vs.", "etc.", "i.e.", "e.g."]:
-                    if current_sentence.strip().endswith(abbr):
-                        sentence_ends = False
-                        break
-                
-                if sentence_ends:
-                    sentences.append(current_sentence.strip())
-                    current_sentence = ""
+            # A terminator only ends a sentence that has other content
+            if end - start <= 1:
+                continue
+            
+            # Check for common abbreviations
+            candidate = text[start:end].strip()
+            if candidate.endswith(_ABBREVIATIONS):
+                continue
+            
+            sentences.append(candidate)
+            start = end
         
         # Add any remaining text
-        if current_sentence.strip():
-            sentences.append(current_sentence.strip())
+        remainder = text[start:].strip()
+        if remainder:
+            sentences.append(remainder)
         
-        return sentences 
\ No newline at end of file
+        return sentences
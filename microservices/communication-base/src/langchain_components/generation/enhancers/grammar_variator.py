@@ -10,6 +10,8 @@ import re
 import random
 from typing import Dict, Any, List, Optional, Union, Set
 
+from ..pattern_bank import PatternBank, literal_rules, regex_rules
+
 class GrammarVariator:
     """
     Grammar variator enhancer for varying grammar patterns in responses.
@@ -24,7 +26,8 @@ class GrammarVariator:
         config_integration: Any = None,
         llm: Any = None,
         variability_level: str = "medium",
-        enabled_techniques: Optional[List[str]] = None
+        enabled_techniques: Optional[List[str]] = None,
+        seed: Optional[int] = None
     ):
         """
         Initialize grammar variator.
@@ -34,10 +37,12 @@ class GrammarVariator:
             llm: Language model for complex transformations
             variability_level: Level of grammar variability (low, medium, high)
             enabled_techniques: List of enabled variation techniques
+            seed: Seed for the variator's random generator (for reproducible output)
         """
         self.config_integration = config_integration
         self.llm = llm
         self.variability_level = variability_level
+        self.rng = random.Random(seed)
         self.enabled_techniques = enabled_techniques or [
             "sentence_structure",
             "conjunctions",
@@ -84,6 +89,30 @@ class GrammarVariator:
         
         # Modifier placement patterns
         self.modifier_pattern = re.compile(r',\s+(however|therefore|nevertheless|consequently|subsequently|moreover|furthermore|additionally)')
+        self.mid_modifier_pattern = re.compile(r',\s+(however|therefore|nevertheless|consequently|subsequently|moreover|furthermore|additionally)[,]\s+')
+        self.front_modifier_pattern = re.compile(r'^(However|Therefore|Nevertheless|Consequently|Subsequently|Moreover|Furthermore|Additionally),\s+')
+        self.subject_verb_pattern = re.compile(r'^([^,\.]{10,30})[,\.]?')
+        
+        # Sentence splitting and clause patterns
+        self.sentence_split_pattern = re.compile(r'(?<=[.!?])\s+')
+        self.dependent_clause_pattern = re.compile(r'(.*?), (because|although|when|if|since|while) (.*)')
+        
+        # Tense patterns
+        self.continuous_pattern = re.compile(r'\b(is|are)\s+(\w+ing)\b')
+        self.perfect_pattern = re.compile(r'\b(have|has)\s+(\w+ed)\b')
+        
+        # Voice conversion patterns
+        self.passive_by_pattern = re.compile(r'\b(is|are|was|were)\s+(\w+ed|built|bought|sold|made|done|said|known)\s+by\s+([^.!?,;]+)')
+        self.subject_pattern = re.compile(r'(?:The|A|An|This|That|These|Those)?\s*([^\s]+(?:\s+[^\s]+)?)\s*$')
+        self.active_svo_pattern = re.compile(r'([A-Z]\w+|\b(?:I|we|they|he|she|it))\s+(\w+s|have|has|had)\s+([^.,;!?]+)', re.IGNORECASE)
+        
+        # Conjunction and phrase banks: all rules compiled into one regex each
+        self.conjunction_bank = PatternBank(
+            literal_rules(self.conjunction_replacements, prefix=r'\b', suffix=r'\b')
+        )
+        self.phrase_bank = PatternBank(
+            regex_rules(self.phrase_replacements), flags=re.IGNORECASE
+        )
     
     def enhance(
         self, 
@@ -139,7 +168,7 @@ class GrammarVariator:
         enhanced_response = response
         
         # Split into sentences for more controlled processing
-        sentences = re.split(r'(?<=[.!?])\s+', enhanced_response)
+        sentences = self.sentence_split_pattern.split(enhanced_response)
         processed_sentences = []
         
         for sentence in sentences:
@@ -151,22 +180,22 @@ class GrammarVariator:
             processed = sentence
             
             # Apply selected techniques to sentence based on random chance
-            if "sentence_structure" in active_techniques and random.random() < params["sentence_rewrite_chance"]:
+            if "sentence_structure" in active_techniques and self.rng.random() < params["sentence_rewrite_chance"]:
                 processed = self._vary_sentence_structure(processed)
                 
-            if "conjunctions" in active_techniques and random.random() < params["conjunction_replace_chance"]:
+            if "conjunctions" in active_techniques and self.rng.random() < params["conjunction_replace_chance"]:
                 processed = self._vary_conjunctions(processed)
                 
-            if "tense_variation" in active_techniques and random.random() < params["tense_change_chance"]:
+            if "tense_variation" in active_techniques and self.rng.random() < params["tense_change_chance"]:
                 processed = self._vary_tense(processed)
                 
-            if "passive_to_active" in active_techniques and self.passive_pattern.search(processed) and random.random() < params["voice_change_chance"]:
+            if "passive_to_active" in active_techniques and self.passive_pattern.search(processed) and self.rng.random() < params["voice_change_chance"]:
                 processed = self._passive_to_active(processed)
                 
-            if "active_to_passive" in active_techniques and self.active_pattern.search(processed) and random.random() < params["voice_change_chance"]:
+            if "active_to_passive" in active_techniques and self.active_pattern.search(processed) and self.rng.random() < params["voice_change_chance"]:
                 processed = self._active_to_passive(processed)
                 
-            if "modifier_placement" in active_techniques and self.modifier_pattern.search(processed) and random.random() < params["modifier_move_chance"]:
+            if "modifier_placement" in active_techniques and self.modifier_pattern.search(processed) and self.rng.random() < params["modifier_move_chance"]:
                 processed = self._vary_modifier_placement(processed)
                 
             # Apply phrase replacements with configured chance
@@ -265,17 +294,17 @@ class GrammarVariator:
             Sentence with varied structure
         """
         # Convert simple sentence to compound with conjunction
-        if len(sentence) > 30 and "," in sentence and random.random() < 0.5:
+        if len(sentence) > 30 and "," in sentence and self.rng.random() < 0.5:
             # Find a comma-delimited clause to convert
             comma_parts = sentence.split(",", 1)
             if len(comma_parts) > 1:
                 conjunctions = ["and", "but", "so", "while", "whereas", "although"]
-                conjunction = random.choice(conjunctions)
+                conjunction = self.rng.choice(conjunctions)
                 return comma_parts[0] + " " + conjunction + comma_parts[1]
         
         # Convert compound sentence to two simpler sentences
         compound_match = self.compound_pattern.search(sentence)
-        if compound_match and random.random() < 0.3:
+        if compound_match and self.rng.random() < 0.3:
             # Split at the conjunction
             conjunction = compound_match.group(0)
             parts = sentence.split(conjunction, 1)
@@ -288,8 +317,8 @@ class GrammarVariator:
                 return f"{parts[0].strip()}. {second_part}"
         
         # Move dependent clause to beginning
-        match = re.search(r'(.*?), (because|although|when|if|since|while) (.*)', sentence)
-        if match and random.random() < 0.4:
+        match = self.dependent_clause_pattern.search(sentence)
+        if match and self.rng.random() < 0.4:
             main_clause = match.group(1)
             subordinator = match.group(2)
             dependent_clause = match.group(3)
@@ -315,26 +344,9 @@ class GrammarVariator:
         Returns:
             Sentence with varied conjunctions
         """
-        for conjunction, alternatives in self.conjunction_replacements.items():
-            pattern = re.compile(rf'\b{conjunction}\b')
-            
-            # Find all matches first
-            matches = list(pattern.finditer(sentence))
-            
-            # Only replace one conjunction per sentence to avoid over-editing
-            if matches:
-                # Choose a random match to replace
-                match = random.choice(matches)
-                alternative = random.choice(alternatives)
-                
-                # Replace only this specific match
-                start, end = match.span()
-                sentence = sentence[:start] + alternative + sentence[end:]
-                
-                # Break after one replacement
-                break
-                
-        return sentence
+        # One scan finds every conjunction; only the first conjunction (in
+        # configuration order) that occurs is replaced, to avoid over-editing
+        return self.conjunction_bank.substitute_one(sentence, self.rng, first_only=True)
     
     def _vary_tense(self, sentence: str) -> str:
         """
@@ -350,8 +362,8 @@ class GrammarVariator:
         # would require more sophisticated NLP analysis
         
         # Convert present continuous to simple present (is/are verb+ing -> verb+s)
-        match = re.search(r'\b(is|are)\s+(\w+ing)\b', sentence)
-        if match and random.random() < 0.4:
+        match = self.continuous_pattern.search(sentence)
+        if match and self.rng.random() < 0.4:
             continuous = match.group(0)
             verb_base = match.group(2)[:-3]  # Remove 'ing'
             
@@ -364,8 +376,8 @@ class GrammarVariator:
             sentence = sentence.replace(continuous, replacement, 1)
             
         # Convert present perfect to simple past (have/has verb+ed -> verb+ed)
-        match = re.search(r'\b(have|has)\s+(\w+ed)\b', sentence)
-        if match and random.random() < 0.4:
+        match = self.perfect_pattern.search(sentence)
+        if match and self.rng.random() < 0.4:
             perfect = match.group(0)
             past_form = match.group(2)
             sentence = sentence.replace(perfect, past_form, 1)
@@ -385,7 +397,7 @@ class GrammarVariator:
         # This is a simplified approach that works for basic cases
         # A full implementation would require parsing and understanding subject-verb-object
         
-        match = re.search(r'\b(is|are|was|were)\s+(\w+ed|built|bought|sold|made|done|said|known)\s+by\s+([^.!?,;]+)', sentence)
+        match = self.passive_by_pattern.search(sentence)
         if match:
             passive_construct = match.group(0)
             auxiliary = match.group(1)
@@ -399,7 +411,7 @@ class GrammarVariator:
                 suffix = parts[1].strip()
                 
                 # Find the subject (simplistic - assumes it's right before the passive)
-                subject_match = re.search(r'(?:The|A|An|This|That|These|Those)?\s*([^\s]+(?:\s+[^\s]+)?)\s*$', prefix)
+                subject_match = self.subject_pattern.search(prefix)
                 if subject_match:
                     subject = subject_match.group(1)
                     subject_prefix = prefix[:subject_match.start()]
@@ -424,7 +436,7 @@ class GrammarVariator:
         # A full implementation would require parsing and understanding subject-verb-object
         
         # Look for <subject> <verb> <object> pattern
-        match = re.search(r'([A-Z]\w+|\b(?:I|we|they|he|she|it))\s+(\w+s|have|has|had)\s+([^.,;!?]+)', sentence, re.IGNORECASE)
+        match = self.active_svo_pattern.search(sentence)
         if match:
             active_construct = match.group(0)
             subject = match.group(1)
@@ -465,7 +477,7 @@ class GrammarVariator:
             Sentence with varied modifier placement
         """
         # Move modifiers from mid-sentence to beginning
-        match = re.search(r',\s+(however|therefore|nevertheless|consequently|subsequently|moreover|furthermore|additionally)[,]\s+', sentence)
+        match = self.mid_modifier_pattern.search(sentence)
         if match:
             modifier = match.group(1)
             modified = sentence.replace(match.group(0), " ")
@@ -473,13 +485,13 @@ class GrammarVariator:
             return modified
             
         # Move front-loaded modifiers to mid-sentence
-        match = re.search(r'^(However|Therefore|Nevertheless|Consequently|Subsequently|Moreover|Furthermore|Additionally),\s+', sentence)
+        match = self.front_modifier_pattern.search(sentence)
         if match:
             modifier = match.group(1).lower()
             rest = sentence[match.end():]
             
             # Find a good spot for the modifier (after subject-verb if possible)
-            sv_match = re.search(r'^([^,\.]{10,30})[,\.]?', rest)
+            sv_match = self.subject_verb_pattern.search(rest)
             if sv_match:
                 modified = sv_match.group(1) + ", " + modifier + "," + rest[sv_match.end():]
                 return modified
@@ -497,25 +509,16 @@ class GrammarVariator:
         Returns:
             Sentence with phrase replacements
         """
-        for pattern, alternatives in self.phrase_replacements.items():
-            # Only attempt replacement with the specified chance
-            if random.random() > replace_chance:
-                continue
-                
-            # Find all matches of this pattern
-            matches = list(re.finditer(pattern, sentence, re.IGNORECASE))
-            
-            # Only replace one instance per pattern to avoid over-editing
-            if matches:
-                # Choose a random match to replace
-                match = random.choice(matches)
-                alternative = random.choice(alternatives)
-                
-                # Replace only this specific match
-                start, end = match.span()
-                sentence = sentence[:start] + alternative + sentence[end:]
-                
-        return sentence
+        # Decide up front which patterns may be replaced
+        active = [
+            pattern for pattern in self.phrase_replacements
+            if self.rng.random() <= replace_chance
+        ]
+        if not active:
+            return sentence
+        
+        # Replace one random instance per active pattern, found in a single scan
+        return self.phrase_bank.substitute_one(sentence, self.rng, keys=active)
     
     def get_supported_techniques(self) -> List[str]:
         """
@@ -0,0 +1,288 @@
+"""
+Precompiled pattern bank for response variation.
+
+This module provides a pattern bank that compiles a family of substitution
+rules once and merges them into a single alternation regex with named groups.
+Text is then scanned once for all rules instead of once per rule, and every
+substitution is applied in that same pass.
+
+Literal phrases sharing the same boundary affixes are folded into one
+prefix-trie group and dispatched by the matched text, which keeps the merged
+regex fast; regex rules get one named group each.
+"""
+
+import random
+import re
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+Replacement = Union[str, Sequence[str]]
+
+
+class PatternRule(NamedTuple):
+    """A single substitution rule in a pattern bank."""
+
+    key: str
+    source: str
+    replacements: Sequence[str]
+    category: str = "default"
+    literal: bool = False
+    prefix: str = ""
+    suffix: str = ""
+
+
+def literal_rules(
+    mapping: Mapping[str, Replacement],
+    category: str = "default",
+    prefix: str = "",
+    suffix: str = ""
+) -> List[PatternRule]:
+    """
+    Build rules that match literal phrases.
+
+    Args:
+        mapping: Literal phrase to replacement (or list of alternatives)
+        category: Category used to look up the substitution chance
+        prefix: Zero-width assertion placed before each phrase (e.g. ``\\b``)
+        suffix: Zero-width assertion placed after each phrase
+
+    Returns:
+        List of pattern rules
+    """
+    return [
+        PatternRule(
+            phrase, re.escape(phrase), _as_alternatives(replacement), category,
+            literal=True, prefix=prefix, suffix=suffix
+        )
+        for phrase, replacement in mapping.items()
+    ]
+
+
+def regex_rules(mapping: Mapping[str, Replacement], category: str = "default") -> List[PatternRule]:
+    """
+    Build rules from regex sources.
+
+    Sources may contain unnamed groups but no named groups, since the bank
+    identifies rules by the named group it wraps around each source.
+
+    Args:
+        mapping: Regex source to replacement (or list of alternatives)
+        category: Category used to look up the substitution chance
+
+    Returns:
+        List of pattern rules
+    """
+    return [
+        PatternRule(source, source, _as_alternatives(replacement), category)
+        for source, replacement in mapping.items()
+    ]
+
+
+def _as_alternatives(replacement: Replacement) -> Sequence[str]:
+    if isinstance(replacement, str):
+        return (replacement,)
+    return tuple(replacement)
+
+
+def _trie_source(words: Iterable[str]) -> str:
+    """
+    Build a regex matching any of the words, factored by common prefix.
+
+    Optional branches are greedy, so the longest word wins at a position and
+    shorter words are tried on backtracking.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+class PatternBank:
+    """
+    A set of substitution rules compiled into one alternation regex.
+
+    A single ``finditer``/``sub`` over the text identifies which rule
+    produced every match. Groups are tried in rule order, so earlier rules win
+    when several rules could start at the same position; within a literal
+    group the longest phrase wins.
+    """
+
+    def __init__(self, rules: Iterable[PatternRule], flags: int = 0):
+        """
+        Initialize and compile the pattern bank.
+
+        Args:
+            rules: Substitution rules, in priority order
+            flags: Regex flags applied to the merged pattern
+        """
+        self.rules: List[PatternRule] = list(rules)
+        self._by_key: Dict[str, PatternRule] = {rule.key: rule for rule in self.rules}
+        self._fold = bool(flags & re.IGNORECASE)
+
+        # Group name -> (literal dispatch table, or the single regex rule)
+        self._groups: Dict[str, Union[Dict[str, PatternRule], PatternRule]] = {}
+        literal_groups: Dict[Tuple[str, str], str] = {}
+        sources: List[str] = []
+        for rule in self.rules:
+            if rule.literal:
+                affixes = (rule.prefix, rule.suffix)
+                group = literal_groups.get(affixes)
+                if group is None:
+                    group = literal_groups[affixes] = f"g{len(self._groups)}"
+                    self._groups[group] = {}
+                    sources.append(group)
+                self._groups[group].setdefault(self._normalize(rule.key), rule)
+            else:
+                group = f"g{len(self._groups)}"
+                self._groups[group] = rule
+                sources.append(group)
+
+        affixes_by_group = {group: affixes for affixes, group in literal_groups.items()}
+        alternation = "|".join(
+            f"{affixes_by_group[group][0]}(?P<{group}>{_trie_source(self._groups[group])}){affixes_by_group[group][1]}"
+            if group in affixes_by_group else f"(?P<{group}>{self._groups[group].source})"
+            for group in sources
+        )
+
+        self.pattern: Optional[re.Pattern] = None
+        if sources:
+            if all(rule.literal for rule in self.rules):
+                # Cheap first-character guard lets the scan skip most positions
+                first_chars = "".join(sorted({re.escape(rule.key[0]) for rule in self.rules if rule.key}))
+                alternation = f"(?=[{first_chars}])(?:{alternation})"
+            self.pattern = re.compile(alternation, flags)
+
+    def _normalize(self, text: str) -> str:
+        return text.lower() if self._fold else text
+
+    def _rule_for(self, match: re.Match) -> PatternRule:
+        group = match.lastgroup
+        entry = self._groups[group]
+        if isinstance(entry, PatternRule):
+            return entry
+        return entry[self._normalize(match.group(group))]
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def find_all(self, text: str) -> Dict[str, List[re.Match]]:
+        """
+        Find all matches in one pass, grouped by rule key.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Mapping of rule key to its matches, in rule order
+        """
+        if self.pattern is None:
+            return {}
+        found: Dict[str, List[re.Match]] = {}
+        for match in self.pattern.finditer(text):
+            found.setdefault(self._rule_for(match).key, []).append(match)
+        return {rule.key: found[rule.key] for rule in self.rules if rule.key in found}
+
+    def substitute_all(
+        self,
+        text: str,
+        rng: random.Random,
+        chances: Union[float, Mapping[str, float]] = 1.0,
+        categories: Optional[Iterable[str]] = None
+    ) -> str:
+        """
+        Apply every rule to every occurrence in a single pass.
+
+        Whether a rule fires is decided once per call, lazily on its first
+        occurrence, so all occurrences of a rule are replaced together (or
+        left alone together).
+
+        Args:
+            text: Text to transform
+            rng: Random generator used for decisions and alternatives
+            chances: Probability that a rule fires, either one value for all
+                rules or a mapping of category to probability
+            categories: Categories to apply (None for all)
+
+        Returns:
+            Transformed text
+        """
+        if self.pattern is None:
+            return text
+
+        allowed = None if categories is None else set(categories)
+        decisions: Dict[str, bool] = {}
+
+        def replace(match: re.Match) -> str:
+            rule = self._rule_for(match)
+            active = decisions.get(rule.key)
+            if active is None:
+                if allowed is not None and rule.category not in allowed:
+                    active = False
+                else:
+                    chance = chances if isinstance(chances, (int, float)) else chances.get(rule.category, 0.0)
+                    active = rng.random() < chance
+                decisions[rule.key] = active
+            if not active:
+                return match.group(0)
+            # Affix lookarounds are zero-width, so the whole match is the phrase
+            return self._pick(rule, rng)
+
+        return self.pattern.sub(replace, text)
+
+    def substitute_one(
+        self,
+        text: str,
+        rng: random.Random,
+        keys: Optional[Iterable[str]] = None,
+        first_only: bool = False
+    ) -> str:
+        """
+        Replace one randomly chosen occurrence per rule, in a single scan.
+
+        Args:
+            text: Text to transform
+            rng: Random generator used to pick occurrences and alternatives
+            keys: Rule keys eligible for replacement (None for all)
+            first_only: Only replace for the first rule (in rule order) that
+                has any occurrence
+
+        Returns:
+            Transformed text
+        """
+        matches = self.find_all(text)
+        if keys is not None:
+            eligible = set(keys)
+            matches = {key: found for key, found in matches.items() if key in eligible}
+        if not matches:
+            return text
+
+        chosen = []
+        for key, found in matches.items():
+            match = rng.choice(found)
+            start, end = match.span(match.lastgroup)
+            chosen.append((start, end, self._pick(self._by_key[key], rng)))
+            if first_only:
+                break
+
+        # Splice right to left so earlier offsets stay valid
+        for start, end, replacement in sorted(chosen, reverse=True):
+            text = text[:start] + replacement + text[end:]
+        return text
+
+    @staticmethod
+    def _pick(rule: PatternRule, rng: random.Random) -> str:
+        if len(rule.replacements) == 1:
+            return rule.replacements[0]
+        return rng.choice(rule.replacements)
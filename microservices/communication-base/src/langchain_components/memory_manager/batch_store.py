@@ -0,0 +1,385 @@
+"""
+Batched asynchronous Redis access for memory storage.
+
+This module provides the batch operations behind RedisMemoryStore: multi-key
+reads in one MGET, multi-key writes with TTLs in one pipeline, atomic
+multi-key updates (MULTI/EXEC) and conditional updates (Lua), all over a
+bounded async connection pool.
+
+Hot keys (selected by prefix) can be cached client side. Invalidation uses
+server-assisted client tracking (Redis 6+) in broadcast mode; the pinned
+redis-py client speaks RESP2, so invalidations are redirected to a dedicated
+connection subscribed to ``__redis__:invalidate``. When the server does not
+support tracking, cached keys are only kept for the cache TTL.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+INVALIDATE_CHANNEL = "__redis__:invalidate"
+
+# Sets every key only if all expected keys still hold their expected values.
+# KEYS: expected keys, then keys to set; ARGV: expected count, ttl, expected
+# values ("" for absent), then values to set
+COMPARE_AND_SET_SCRIPT = """
+local expected = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+for i = 1, expected do
+    local current = redis.call('GET', KEYS[i])
+    if (current or '') ~= ARGV[i + 2] then
+        return 0
+    end
+end
+for i = expected + 1, #KEYS do
+    if ttl > 0 then
+        redis.call('SET', KEYS[i], ARGV[i + 2], 'EX', ttl)
+    else
+        redis.call('SET', KEYS[i], ARGV[i + 2])
+    end
+end
+return 1
+"""
+
+TTL = Union[None, int, Mapping[str, int]]
+
+
+def encode(value: Any) -> str:
+    """
+    Serialize a value deterministically, so equal values compare equal in Lua.
+
+    Args:
+        value: JSON-serializable value
+
+    Returns:
+        JSON text
+    """
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def decode(raw: Union[bytes, str]) -> Any:
+    """
+    Deserialize a stored value.
+
+    Args:
+        raw: Stored JSON text
+
+    Returns:
+        Value
+    """
+    return json.loads(raw)
+
+
+class RedisBatchStore:
+    """
+    Batched async key-value access to Redis with an optional hot-key cache.
+    """
+
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        client: Any = None,
+        max_connections: int = 32,
+        hot_key_prefixes: Iterable[str] = (),
+        cache_max_entries: int = 4096,
+        cache_ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            redis_url: Redis URL (ignored when a client is given)
+            client: redis.asyncio client to use instead of a new pool
+            max_connections: Size of the connection pool; callers wait for a
+                free connection when all are in use
+            hot_key_prefixes: Key prefixes cached client side (none disables
+                the cache)
+            cache_max_entries: Maximum number of cached keys (LRU eviction)
+            cache_ttl_seconds: Lifetime of a cached key
+            clock: Monotonic time source
+        """
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise ImportError("redis is required for RedisBatchStore")
+            pool = aioredis.BlockingConnectionPool.from_url(redis_url, max_connections=max_connections)
+            client = aioredis.Redis(connection_pool=pool)
+        self.client = client
+        self.hot_key_prefixes = tuple(hot_key_prefixes)
+        self.cache_max_entries = cache_max_entries
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self._cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # Invalidation generations, so reads in flight during an invalidation
+        # are not cached: hot keys being read (reader counts), the generation
+        # each of them was last invalidated at, and that of the last clear
+        self._generation = 0
+        self._reading: Dict[str, int] = {}
+        self._invalidated_at: Dict[str, int] = {}
+        self._cleared_at = 0
+        self._compare_and_set = None
+        self._tracking_task: Optional[asyncio.Task] = None
+        self._tracking_connection = None
+        self.tracking = False
+
+        self.metrics: Dict[str, int] = {
+            "round_trips": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "invalidations": 0
+        }
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Read several keys in one round trip (hot keys may come from the cache).
+
+        Args:
+            keys: Keys to read
+
+        Returns:
+            Values of the keys that exist
+        """
+        keys = list(dict.fromkeys(keys))
+        result: Dict[str, Any] = {}
+        missing: List[str] = []
+        for key in keys:
+            cached = self._cache_get(key)
+            if cached is not None:
+                result[key] = cached[0]
+            else:
+                missing.append(key)
+        if not missing:
+            return result
+
+        await self._ensure_tracking()
+        hot = [key for key in missing if self._is_hot(key)]
+        generation = self._generation
+        for key in hot:
+            self._reading[key] = self._reading.get(key, 0) + 1
+        try:
+            self.metrics["round_trips"] += 1
+            values = await self.client.mget(missing)
+            for key, raw in zip(missing, values):
+                if raw is None:
+                    continue
+                value = decode(raw)
+                result[key] = value
+                if not self._invalidated_since(key, generation):
+                    self._cache_put(key, value)
+        finally:
+            for key in hot:
+                self._reading[key] -= 1
+                if not self._reading[key]:
+                    del self._reading[key]
+                    self._invalidated_at.pop(key, None)
+        return result
+
+    async def set_many(self, values: Mapping[str, Any], ttl: TTL = None) -> None:
+        """
+        Write several keys in one pipelined round trip.
+
+        Args:
+            values: Values by key
+            ttl: Expiry in seconds for all keys, or per key (None for no expiry)
+        """
+        if not values:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_sets(pipe, values, ttl)
+        self.metrics["round_trips"] += 1
+        await pipe.execute()
+        self._invalidate_local(values)
+
+    async def update_atomic(
+        self,
+        values: Mapping[str, Any],
+        delete: Iterable[str] = (),
+        ttl: TTL = None
+    ) -> None:
+        """
+        Set and delete several keys atomically (MULTI/EXEC), in one round trip.
+
+        Args:
+            values: Values to set by key
+            delete: Keys to delete
+            ttl: Expiry in seconds for all set keys, or per key
+        """
+        delete = list(delete)
+        pipe = self.client.pipeline(transaction=True)
+        self._queue_sets(pipe, values, ttl)
+        if delete:
+            pipe.delete(*delete)
+        self.metrics["round_trips"] += 1
+        await pipe.execute()
+        self._invalidate_local(list(values) + delete)
+
+    async def compare_and_set(
+        self,
+        expected: Mapping[str, Any],
+        values: Mapping[str, Any],
+        ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Set several keys only if other keys still hold expected values (Lua).
+
+        Args:
+            expected: Expected value by key (None for an absent key)
+            values: Values to set by key
+            ttl: Expiry in seconds for the set keys
+
+        Returns:
+            True if the values were set
+        """
+        if self._compare_and_set is None:
+            self._compare_and_set = self.client.register_script(COMPARE_AND_SET_SCRIPT)
+        keys = list(expected) + list(values)
+        args = [len(expected), ttl or 0]
+        args += ["" if value is None else encode(value) for value in expected.values()]
+        args += [encode(value) for value in values.values()]
+        self.metrics["round_trips"] += 1
+        applied = await self._compare_and_set(keys=keys, args=args)
+        if applied:
+            self._invalidate_local(values)
+        return bool(applied)
+
+    def _queue_sets(self, pipe: Any, values: Mapping[str, Any], ttl: TTL) -> None:
+        for key, value in values.items():
+            expiry = ttl.get(key) if isinstance(ttl, Mapping) else ttl
+            pipe.set(key, encode(value), ex=expiry)
+
+    def _is_hot(self, key: str) -> bool:
+        return bool(self.hot_key_prefixes) and key.startswith(self.hot_key_prefixes)
+
+    def _cache_get(self, key: str) -> Optional[Tuple[Any]]:
+        if not self._is_hot(key):
+            return None
+        entry = self._cache.get(key)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                del self._cache[key]
+            self.metrics["cache_misses"] += 1
+            return None
+        self._cache.move_to_end(key)
+        self.metrics["cache_hits"] += 1
+        return (entry[1],)
+
+    def _cache_put(self, key: str, value: Any) -> None:
+        if not self._is_hot(key):
+            return
+        # While the listener is still subscribing, an invalidation could be missed
+        if not self.tracking and not (self._tracking_task and self._tracking_task.done()):
+            return
+        self._cache[key] = (self.clock() + self.cache_ttl_seconds, value)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    def _invalidated_since(self, key: str, generation: int) -> bool:
+        return self._cleared_at > generation or self._invalidated_at.get(key, 0) > generation
+
+    def _invalidate_local(self, keys: Iterable[str]) -> None:
+        self._generation += 1
+        for key in keys:
+            self._cache.pop(key, None)
+            if key in self._reading:
+                self._invalidated_at[key] = self._generation
+
+    def _clear_local(self) -> None:
+        self._generation += 1
+        self._cleared_at = self._generation
+        self._cache.clear()
+
+    async def _ensure_tracking(self) -> None:
+        """
+        Start the invalidation listener for hot keys on first use.
+        """
+        if not self.hot_key_prefixes or self._tracking_task is not None:
+            return
+        self._tracking_task = asyncio.get_running_loop().create_task(self._track_invalidations())
+        # Let the listener subscribe before the first read is cached
+        await asyncio.sleep(0)
+
+    async def _track_invalidations(self) -> None:
+        """
+        Enable broadcast tracking for the hot prefixes, redirected to a
+        dedicated subscribed connection, and drop invalidated keys.
+        """
+        connection = self.client.connection_pool.make_connection()
+        self._tracking_connection = connection
+        try:
+            await connection.connect()
+            await connection.send_command("CLIENT", "ID")
+            client_id = await connection.read_response()
+            prefixes = [arg for prefix in self.hot_key_prefixes for arg in ("PREFIX", prefix)]
+            await connection.send_command("CLIENT", "TRACKING", "ON", "REDIRECT", client_id, "BCAST", *prefixes)
+            await connection.read_response()
+            await connection.send_command("SUBSCRIBE", INVALIDATE_CHANNEL)
+            await connection.read_response()
+            self.tracking = True
+            self.logger.info(f"Client-side caching enabled for prefixes {self.hot_key_prefixes}")
+
+            while True:
+                message = await connection.read_response()
+                if not message or message[0] not in (b"message", "message"):
+                    continue
+                keys = message[2]
+                self.metrics["invalidations"] += 1
+                if keys is None:
+                    # Flush on the server side
+                    self._clear_local()
+                else:
+                    self._invalidate_local(k.decode() if isinstance(k, bytes) else k for k in keys)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.warning(f"Client-side cache invalidation unavailable, using TTL only: {e}")
+        finally:
+            self.tracking = False
+            # Entries may have changed while no invalidations were received
+            self._clear_local()
+            await connection.disconnect()
+
+    def invalidate(self, keys: Optional[Iterable[str]] = None) -> None:
+        """
+        Drop cached keys.
+
+        Args:
+            keys: Keys to drop (None for all)
+        """
+        if keys is None:
+            self._clear_local()
+        else:
+            self._invalidate_local(keys)
+
+    async def close(self) -> None:
+        """
+        Stop the invalidation listener and close the connection pool.
+        """
+        if self._tracking_task is not None:
+            self._tracking_task.cancel()
+            try:
+                await self._tracking_task
+            except asyncio.CancelledError:
+                pass
+            self._tracking_task = None
+        await self.client.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get round trip and cache counters.
+
+        Returns:
+            Dictionary of metrics
+        """
+        return {**self.metrics, "cached_keys": len(self._cache), "tracking": self.tracking}
@@ -0,0 +1,232 @@
+"""
+Incremental consolidation structures for tiered memory.
+
+This module provides the bounded tiers used by TieredMemory so that the work
+done per conversation turn does not grow with conversation length: a
+fixed-capacity short-term buffer, a medium-term tier that evicts its least
+important entry in O(log n) and hands evicted entries over in chunks for
+summarization, and a topic index over long-term memory that tracks which
+topics changed since the last consolidation.
+"""
+
+import heapq
+import itertools
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from langchain.schema import AIMessage, BaseMessage, HumanMessage
+
+# (timestamp, {"human": ..., "ai": ...}, importance)
+MediumEntry = Tuple[float, Dict[str, str], float]
+# (timestamp, summary, topics, importance)
+LongEntry = Tuple[float, str, List[str], float]
+
+
+class ShortTermBuffer:
+    """
+    Fixed-capacity buffer of the most recent conversation turns.
+    """
+
+    def __init__(self, window: int):
+        """
+        Initialize the buffer.
+
+        Args:
+            window: Number of turns (human/AI message pairs) to keep
+        """
+        self.window = window
+        self._messages: deque = deque(maxlen=2 * window)
+
+    def add_turn(self, human: str, ai: str) -> None:
+        """
+        Append a turn, dropping the oldest one when full.
+
+        Args:
+            human: Human message
+            ai: AI response
+        """
+        self._messages.append(HumanMessage(content=human))
+        self._messages.append(AIMessage(content=ai))
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        """Messages in the buffer, oldest first."""
+        return list(self._messages)
+
+    def load(self, records: Iterable[Dict[str, str]]) -> None:
+        """
+        Replace the buffer contents with serialized messages.
+
+        Args:
+            records: Messages as {"type": "human"|"ai", "content": ...}
+        """
+        self._messages.clear()
+        for record in records:
+            message_class = HumanMessage if record["type"] == "human" else AIMessage
+            self._messages.append(message_class(content=record["content"]))
+
+    def serialize(self) -> List[Dict[str, str]]:
+        """
+        Serialize the buffer.
+
+        Returns:
+            Messages as {"type": "human"|"ai", "content": ...}
+        """
+        return [
+            {"type": "human" if isinstance(msg, HumanMessage) else "ai", "content": msg.content}
+            for msg in self._messages
+        ]
+
+    def clear(self) -> None:
+        self._messages.clear()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+
+class MediumTermTier:
+    """
+    Bounded set of important turns, evicting the least important (oldest on
+    ties) first.
+
+    Evicted entries that qualify for promotion are buffered and released in
+    chunks, so long-term summarization runs once per chunk instead of once per
+    eviction and never revisits entries already summarized.
+    """
+
+    def __init__(self, capacity: int, promotion_threshold: float, chunk_size: int = 4):
+        """
+        Initialize the tier.
+
+        Args:
+            capacity: Maximum number of entries
+            promotion_threshold: Minimum importance for an evicted entry to be
+                promoted to long-term memory
+            chunk_size: Number of promotable evicted entries per chunk
+        """
+        self.capacity = capacity
+        self.promotion_threshold = promotion_threshold
+        self.chunk_size = max(1, chunk_size)
+        # Heap of (importance, timestamp, sequence, entry)
+        self._heap: List[Tuple[float, float, int, MediumEntry]] = []
+        self._sequence = itertools.count()
+        self.pending: List[MediumEntry] = []
+
+    def add(self, entry: MediumEntry) -> Optional[List[MediumEntry]]:
+        """
+        Add an entry, evicting the least important one when over capacity.
+
+        Args:
+            entry: Medium-term entry
+
+        Returns:
+            A chunk of evicted entries to promote, once enough have accumulated
+        """
+        timestamp, _, importance = entry
+        heapq.heappush(self._heap, (importance, timestamp, next(self._sequence), entry))
+        if len(self._heap) <= self.capacity:
+            return None
+
+        evicted = heapq.heappop(self._heap)[3]
+        if evicted[2] < self.promotion_threshold:
+            return None
+        self.pending.append(evicted)
+        if len(self.pending) < self.chunk_size:
+            return None
+        chunk, self.pending = self.pending, []
+        return chunk
+
+    def entries(self) -> List[MediumEntry]:
+        """
+        Get the entries, most important (then most recent) first.
+
+        Returns:
+            Medium-term entries
+        """
+        return [item[3] for item in sorted(self._heap, key=lambda item: (item[0], item[1]), reverse=True)]
+
+    def load(self, entries: Iterable[MediumEntry], pending: Iterable[MediumEntry] = ()) -> None:
+        """
+        Replace the tier contents.
+
+        Args:
+            entries: Medium-term entries
+            pending: Evicted entries awaiting promotion
+        """
+        self._heap = [
+            (entry[2], entry[0], next(self._sequence), tuple(entry)) for entry in entries
+        ]
+        heapq.heapify(self._heap)
+        self.pending = [tuple(entry) for entry in pending]
+
+    def clear(self) -> None:
+        self._heap = []
+        self.pending = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class TopicIndex:
+    """
+    Index of long-term entries by topic, tracking topics that gained entries
+    since the last consolidation.
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, List[LongEntry]] = {}
+        self.dirty: Set[str] = set()
+
+    def add(self, entry: LongEntry) -> None:
+        """
+        Index a long-term entry and mark its topics as changed.
+
+        Args:
+            entry: Long-term entry
+        """
+        for topic in entry[2]:
+            self.entries.setdefault(topic, []).append(entry)
+            self.dirty.add(topic)
+
+    def remove(self, entry: LongEntry) -> None:
+        """
+        Remove a long-term entry from the index.
+
+        Args:
+            entry: Long-term entry
+        """
+        for topic in entry[2]:
+            members = self.entries.get(topic)
+            if members is None:
+                continue
+            members[:] = [member for member in members if member is not entry]
+            if not members:
+                del self.entries[topic]
+
+    def rebuild(self, entries: Iterable[LongEntry]) -> None:
+        """
+        Re-index all entries; every topic with several entries becomes dirty.
+
+        Args:
+            entries: Long-term entries
+        """
+        self.entries = {}
+        for entry in entries:
+            for topic in entry[2]:
+                self.entries.setdefault(topic, []).append(entry)
+        self.dirty = {topic for topic, members in self.entries.items() if len(members) > 1}
+
+    def take_dirty_groups(self) -> List[Tuple[str, List[LongEntry]]]:
+        """
+        Get the changed topics that have several entries, clearing the dirty set.
+
+        Returns:
+            (topic, entries) pairs to consolidate
+        """
+        groups = [
+            (topic, list(self.entries[topic]))
+            for topic in sorted(self.dirty)
+            if len(self.entries.get(topic, ())) > 1
+        ]
+        self.dirty = set()
+        return groups
@@ -0,0 +1,247 @@
+"""
+Indexed in-memory entity store.
+
+This module provides the entity store behind EnhancedEntityMemory. Entities
+are kept in a hash map by normalized name with secondary indexes by alias and
+by type, recency indexes ordered by last mention (globally and per type), and
+a sorted importance index, so lookups and "most recent entity of type
+X" queries do not scan the session's entities. Changed and removed entities
+are tracked for batched persistence.
+"""
+
+import bisect
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+EntityRecord = Dict[str, Any]
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize an entity name or alias for lookups.
+
+    Args:
+        name: Entity name
+
+    Returns:
+        Case-folded name with collapsed whitespace
+    """
+    return " ".join(name.casefold().split())
+
+
+class EntityIndex:
+    """
+    Entity records indexed by name, alias, type, recency and importance.
+
+    Records are dictionaries with at least "name" and "type"; "aliases",
+    "importance" and "last_seen" are indexed when present.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Remove all entities and pending changes.
+        """
+        self.records: Dict[str, EntityRecord] = {}
+        self._aliases: Dict[str, str] = {}
+        self._by_type: Dict[str, "OrderedDict[str, None]"] = {}
+        # Keys ordered by last mention, most recent last
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._recent_by_type: Dict[str, "OrderedDict[str, None]"] = {}
+        # Sorted (-importance, key) pairs, and the importance each key is indexed under
+        self._importance: List[Tuple[float, str]] = []
+        self._indexed_importance: Dict[str, float] = {}
+
+        self.dirty: Set[str] = set()
+        self.removed: Set[str] = set()
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        Resolve a name or alias to an entity key.
+
+        Args:
+            name: Entity name or alias
+
+        Returns:
+            Entity key, or None if unknown
+        """
+        key = normalize_name(name)
+        if key in self.records:
+            return key
+        return self._aliases.get(key)
+
+    def get(self, name: str) -> Optional[EntityRecord]:
+        """
+        Get an entity by name or alias.
+
+        Args:
+            name: Entity name or alias
+
+        Returns:
+            Entity record, or None if unknown
+        """
+        key = self.resolve(name)
+        return self.records[key] if key is not None else None
+
+    def put(self, record: EntityRecord) -> str:
+        """
+        Insert or replace an entity record.
+
+        Args:
+            record: Entity record
+
+        Returns:
+            Entity key
+        """
+        key = normalize_name(record["name"])
+        if key in self.records:
+            self._unindex(key)
+        self.records[key] = record
+        self._index(key, record)
+        self.removed.discard(key)
+        self.dirty.add(key)
+        return key
+
+    def touch(self, key: str) -> None:
+        """
+        Re-index an entity after its record was modified in place.
+
+        Args:
+            key: Entity key
+        """
+        record = self.records[key]
+        self._unindex(key)
+        self._index(key, record)
+        self.dirty.add(key)
+
+    def remove(self, name: str) -> Optional[EntityRecord]:
+        """
+        Remove an entity.
+
+        Args:
+            name: Entity name or alias
+
+        Returns:
+            Removed record, or None if unknown
+        """
+        key = self.resolve(name)
+        if key is None:
+            return None
+        self._unindex(key)
+        record = self.records.pop(key)
+        self.dirty.discard(key)
+        self.removed.add(key)
+        return record
+
+    def _index(self, key: str, record: EntityRecord) -> None:
+        for alias in record.get("aliases", ()):
+            alias_key = normalize_name(alias)
+            if alias_key != key:
+                self._aliases[alias_key] = key
+        entity_type = record.get("type")
+        self._by_type.setdefault(entity_type, OrderedDict())[key] = None
+        if record.get("last_seen") is not None:
+            self._recent[key] = None
+            self._recent_by_type.setdefault(entity_type, OrderedDict())[key] = None
+        importance = record.get("importance", 0.0)
+        bisect.insort(self._importance, (-importance, key))
+        self._indexed_importance[key] = importance
+
+    def _unindex(self, key: str) -> None:
+        record = self.records[key]
+        for alias in record.get("aliases", ()):
+            alias_key = normalize_name(alias)
+            if self._aliases.get(alias_key) == key:
+                del self._aliases[alias_key]
+        entity_type = record.get("type")
+        for index in (self._by_type, self._recent_by_type):
+            members = index.get(entity_type)
+            if members is not None:
+                members.pop(key, None)
+                if not members:
+                    del index[entity_type]
+        self._recent.pop(key, None)
+        importance = self._indexed_importance.pop(key)
+        position = bisect.bisect_left(self._importance, (-importance, key))
+        del self._importance[position]
+
+    def by_type(self, entity_type: str) -> List[EntityRecord]:
+        """
+        Get entities of a type, least recently updated first.
+
+        Args:
+            entity_type: Entity type
+
+        Returns:
+            Entity records
+        """
+        return [self.records[key] for key in self._by_type.get(entity_type, ())]
+
+    def most_recent(self, entity_type: Optional[str] = None, limit: int = 1) -> List[EntityRecord]:
+        """
+        Get the most recently mentioned entities, newest first.
+
+        Args:
+            entity_type: Restrict to this type (None for all)
+            limit: Maximum number of entities
+
+        Returns:
+            Entity records
+        """
+        order = self._recent if entity_type is None else self._recent_by_type.get(entity_type, OrderedDict())
+        result = []
+        for key in reversed(order):
+            if len(result) >= limit:
+                break
+            result.append(self.records[key])
+        return result
+
+    def by_importance(self, min_importance: float = 0.0) -> List[EntityRecord]:
+        """
+        Get entities at or above an importance, most important first.
+
+        Args:
+            min_importance: Minimum importance
+
+        Returns:
+            Entity records
+        """
+        # Entries with -importance <= -min_importance come first
+        end = bisect.bisect_right(self._importance, (-min_importance, "\U0010ffff"))
+        return [self.records[key] for _, key in self._importance[:end]]
+
+    def take_changes(self) -> Tuple[Dict[str, EntityRecord], Set[str]]:
+        """
+        Get and reset the entities changed or removed since the last call.
+
+        Returns:
+            Changed records by key, and removed keys
+        """
+        changed = {key: self.records[key] for key in self.dirty}
+        removed = self.removed
+        self.dirty, self.removed = set(), set()
+        return changed, removed
+
+    def load(self, records: Iterable[EntityRecord]) -> None:
+        """
+        Replace the contents with persisted records, oldest mention first.
+
+        Args:
+            records: Entity records
+        """
+        self.clear()
+        for record in sorted(records, key=lambda r: r.get("last_seen") or 0.0):
+            key = normalize_name(record["name"])
+            self.records[key] = record
+            self._index(key, record)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, name: str) -> bool:
+        return self.resolve(name) is not None
+
+    def values(self) -> Iterable[EntityRecord]:
+        return self.records.values()
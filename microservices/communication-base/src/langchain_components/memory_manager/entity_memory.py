@@ -12,6 +12,8 @@ from typing import Dict, Any, List, Optional, Set, Tuple
 from langchain.memory import ConversationEntityMemory
 from langchain.schema import BaseMessage
 
+from src.langchain_components.memory_manager.entity_index import EntityIndex
+
 class EnhancedEntityMemory(ConversationEntityMemory):
     """
     Enhanced entity memory that tracks entity mentions with additional context.
@@ -19,8 +21,22 @@ class EnhancedEntityMemory(ConversationEntityMemory):
     This class extends the ConversationEntityMemory to provide more sophisticated
     entity tracking, including sentiment, importance, and context retrieval based
     on conversation flow.
+    
+    Entities are kept in an EntityIndex (by name, alias, type, recency and
+    importance). When a memory store is given, only entities changed since
+    the last turn are persisted, batched into one Redis pipeline.
     """
     
+    session_manager: Any = None
+    session_id: str = ""
+    entity_extraction_service: Any = None
+    max_entities: int = 100
+    memory_key: str = "entities"
+    memory_store: Any = None
+    entity_ttl: Optional[int] = None
+    entity_index: Any = None
+    logger: Any = None
+    
     def __init__(
         self,
         llm: Any,
@@ -29,6 +45,8 @@ class EnhancedEntityMemory(ConversationEntityMemory):
         entity_extraction_service: Any,
         max_entities: int = 100,
         memory_key: str = "entities",
+        memory_store: Any = None,
+        entity_ttl: Optional[int] = None,
         **kwargs
     ):
         """
@@ -41,6 +59,9 @@ class EnhancedEntityMemory(ConversationEntityMemory):
             entity_extraction_service: Service for entity extraction from Phase 2.1
             max_entities: Maximum number of entities to track
             memory_key: Key to use for memory in chain inputs/outputs
+            memory_store: RedisMemoryStore for batched entity persistence
+                (entities are stored with the session manager if None)
+            entity_ttl: Expiry in seconds of persisted entities
         """
         super().__init__(
             llm=llm,
@@ -53,10 +74,12 @@ class EnhancedEntityMemory(ConversationEntityMemory):
         self.entity_extraction_service = entity_extraction_service
         self.max_entities = max_entities
         self.memory_key = memory_key
+        self.memory_store = memory_store
+        self.entity_ttl = entity_ttl
         self.logger = logging.getLogger(__name__)
         
-        # Store sentiment and importance with entities
-        self.entity_attributes = {}
+        # Entity summaries with sentiment and importance
+        self.entity_index = EntityIndex()
         
         # Load existing entities if available
         self._load_from_session()
@@ -66,11 +89,18 @@ class EnhancedEntityMemory(ConversationEntityMemory):
         Load entities from session if available.
         """
         try:
-            session_entities = self.session_manager.get_session_entities(self.session_id)
-            if session_entities:
-                self.entity_store = session_entities.get("entities", {})
-                self.entity_attributes = session_entities.get("attributes", {})
-                self.logger.info(f"Loaded {len(self.entity_store)} entities from session {self.session_id}")
+            if self.memory_store is not None:
+                self.entity_index.load(self.memory_store.load_entities(self.session_id).values())
+            else:
+                session_entities = self.session_manager.get_session_entities(self.session_id)
+                if session_entities:
+                    summaries = session_entities.get("entities", {})
+                    attributes = session_entities.get("attributes", {})
+                    self.entity_index.load(
+                        {"name": name, "summary": summaries.get(name, ""), **attrs}
+                        for name, attrs in attributes.items()
+                    )
+            self.logger.info(f"Loaded {len(self.entity_index)} entities from session {self.session_id}")
         except Exception as e:
             self.logger.warning(f"Failed to load entities from session: {e}")
     
@@ -97,43 +127,68 @@ class EnhancedEntityMemory(ConversationEntityMemory):
             entity_type = entity["type"]
             entity_sentiment = entity.get("sentiment", 0.0)
             entity_importance = entity.get("importance", 0.5)
+            aliases = entity.get("aliases", [])
+            now = time.time()
             
             # Update entity summary
-            summary = self.entity_store.get(entity_name, "")
+            record = self.entity_index.get(entity_name)
+            summary = record["summary"] if record else ""
             new_info = entity.get("context", "")
             updated_summary = self._update_entity_summary(entity_name, summary, new_info)
             
-            # Store updated entity information
-            self.entity_store[entity_name] = updated_summary
-            
-            # Store attributes
-            if entity_name not in self.entity_attributes:
-                self.entity_attributes[entity_name] = {
+            if record is None:
+                self.entity_index.put({
+                    "name": entity_name,
                     "type": entity_type,
+                    "summary": updated_summary,
+                    "aliases": list(aliases),
                     "sentiment": entity_sentiment,
                     "importance": entity_importance,
-                    "first_seen": time.time(),
+                    "first_seen": now,
+                    "last_seen": now,
                     "mentions": 1
-                }
+                })
             else:
                 # Update attributes
-                attrs = self.entity_attributes[entity_name]
-                attrs["sentiment"] = (attrs["sentiment"] * attrs["mentions"] + entity_sentiment) / (attrs["mentions"] + 1)
-                attrs["importance"] = max(attrs["importance"], entity_importance)
-                attrs["mentions"] += 1
-                attrs["last_seen"] = time.time()
+                record["summary"] = updated_summary
+                record["sentiment"] = (record["sentiment"] * record["mentions"] + entity_sentiment) / (record["mentions"] + 1)
+                record["importance"] = max(record["importance"], entity_importance)
+                record["mentions"] += 1
+                record["last_seen"] = now
+                record["aliases"] = record.get("aliases", []) + [a for a in aliases if a not in record.get("aliases", [])]
+                self.entity_index.touch(self.entity_index.resolve(entity_name))
+        
+        self._persist_entities()
+    
+    def _persist_entities(self) -> None:
+        """
+        Persist entities changed since the last save.
+        """
+        changed, removed = self.entity_index.take_changes()
+        if not changed and not removed:
+            return
         
-        # Save to session
         try:
-            self.session_manager.store_session_entities(
-                self.session_id, 
-                {
-                    "entities": self.entity_store,
-                    "attributes": self.entity_attributes
-                }
-            )
-            self.logger.debug(f"Saved entities to session {self.session_id}")
+            if self.memory_store is not None:
+                # One pipeline round trip for the whole turn
+                self.memory_store.save_entities(self.session_id, changed, removed, ttl=self.entity_ttl)
+            else:
+                records = list(self.entity_index.values())
+                self.session_manager.store_session_entities(
+                    self.session_id, 
+                    {
+                        "entities": {r["name"]: r["summary"] for r in records},
+                        "attributes": {
+                            r["name"]: {k: v for k, v in r.items() if k not in ("name", "summary")}
+                            for r in records
+                        }
+                    }
+                )
+            self.logger.debug(f"Saved {len(changed)} entities to session {self.session_id}")
         except Exception as e:
+            # Keep the changes pending for the next save
+            self.entity_index.dirty.update(k for k in changed if k in self.entity_index.records)
+            self.entity_index.removed.update(removed)
             self.logger.warning(f"Failed to save entities to session: {e}")
     
     def _update_entity_summary(self, entity_name: str, existing_summary: str, new_info: str) -> str:
@@ -186,18 +241,7 @@ class EnhancedEntityMemory(ConversationEntityMemory):
         Returns:
             List of entity dictionaries
         """
-        entities = []
-        
-        for name, attrs in self.entity_attributes.items():
-            if attrs.get("importance", 0.0) >= min_importance:
-                entities.append({
-                    "name": name,
-                    "summary": self.entity_store.get(name, ""),
-                    **attrs
-                })
-        
-        # Sort by importance (descending)
-        return sorted(entities, key=lambda e: e.get("importance", 0.0), reverse=True)
+        return [dict(record) for record in self.entity_index.by_importance(min_importance)]
     
     def get_entities_by_type(self, entity_type: str) -> List[Dict]:
         """
@@ -209,41 +253,33 @@ class EnhancedEntityMemory(ConversationEntityMemory):
         Returns:
             List of entity dictionaries
         """
-        entities = []
-        
-        for name, attrs in self.entity_attributes.items():
-            if attrs.get("type") == entity_type:
-                entities.append({
-                    "name": name,
-                    "summary": self.entity_store.get(name, ""),
-                    **attrs
-                })
-        
-        return entities
+        return [dict(record) for record in self.entity_index.by_type(entity_type)]
     
-    def get_recently_mentioned_entities(self, limit: int = 5) -> List[Dict]:
+    def get_recently_mentioned_entities(self, limit: int = 5, entity_type: Optional[str] = None) -> List[Dict]:
         """
         Get recently mentioned entities.
         
         Args:
             limit: Maximum number of entities to return
+            entity_type: Only return entities of this type
             
         Returns:
-            List of entity dictionaries
+            List of entity dictionaries, most recent first
         """
-        entities = []
-        
-        for name, attrs in self.entity_attributes.items():
-            if "last_seen" in attrs:
-                entities.append({
-                    "name": name,
-                    "summary": self.entity_store.get(name, ""),
-                    **attrs
-                })
+        return [dict(record) for record in self.entity_index.most_recent(entity_type, limit)]
+    
+    def get_entity(self, name: str) -> Optional[Dict]:
+        """
+        Get an entity by name or alias.
         
-        # Sort by last_seen (descending)
-        sorted_entities = sorted(entities, key=lambda e: e.get("last_seen", 0), reverse=True)
-        return sorted_entities[:limit]
+        Args:
+            name: Entity name or alias
+            
+        Returns:
+            Entity dictionary, or None if unknown
+        """
+        record = self.entity_index.get(name)
+        return dict(record) if record else None
     
     def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -291,13 +327,9 @@ class EnhancedEntityMemory(ConversationEntityMemory):
         if query:
             extracted = self.entity_extraction_service.extract_entities(query, "", self.session_id)
             for entity in extracted:
-                name = entity["name"]
-                if name in self.entity_store:
-                    mentioned_entities.append({
-                        "name": name,
-                        "summary": self.entity_store[name],
-                        **(self.entity_attributes.get(name, {}))
-                    })
+                record = self.entity_index.get(entity["name"])
+                if record:
+                    mentioned_entities.append(dict(record))
         
         # Combine entities (removing duplicates)
         seen = set()
@@ -1,11 +1,14 @@
 """Persistent memory storage implementation."""
 
-from typing import Dict, Optional
+import json
+from typing import Any, Dict, Iterable, Mapping, Optional
 from redis import Redis
 from langchain_core.messages import BaseMessage
 from langchain.memory import RedisChatMessageHistory
 from pydantic import BaseModel
 
+from .batch_store import TTL, RedisBatchStore
+
 class MemoryConfig(BaseModel):
     """Configuration for memory management."""
     window_size: int
@@ -15,15 +18,30 @@ class MemoryConfig(BaseModel):
     summarization_prompt: str
 
 class RedisMemoryStore:
-    """Stores active conversations and real-time data"""
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
-        self.redis_client = Redis.from_url(redis_url)
-    
+    """Stores active conversations and real-time data
+
     Stores:
     - Active chat messages (TTL-based)
     - Real-time insights
     - Session context
     - Current conversation window
+    - Session entities
+
+    Multi-key reads and writes go through the async batch store (one round
+    trip per batch, optional client-side caching of hot key prefixes).
+    """
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        redis_client: Optional[Redis] = None,
+        batch_store: Optional[RedisBatchStore] = None,
+        max_connections: int = 32,
+        hot_key_prefixes: Iterable[str] = ()
+    ):
+        self.redis_client = redis_client or Redis.from_url(redis_url)
+        self.batch_store = batch_store or RedisBatchStore(
+            redis_url, max_connections=max_connections, hot_key_prefixes=hot_key_prefixes
+        )
     
     def get_history(self, session_id: str, bot_config: Dict) -> RedisChatMessageHistory:
         """Get chat history for a session with bot-specific configuration."""
@@ -37,4 +55,47 @@ class RedisMemoryStore:
     def save_message(self, session_id: str, message: BaseMessage, bot_config: Dict):
         """Save a message to history with bot-specific settings."""
         history = self.get_history(session_id, bot_config)
-        history.add_message(message) 
\ No newline at end of file
+        history.add_message(message) 
+    
+    def save_entities(
+        self,
+        session_id: str,
+        changed: Dict[str, Dict[str, Any]],
+        removed: Iterable[str] = (),
+        ttl: Optional[int] = None
+    ):
+        """Write changed and removed entities of a session in one pipeline round trip."""
+        key = f"entities:{session_id}"
+        removed = list(removed)
+        pipe = self.redis_client.pipeline(transaction=True)
+        if changed:
+            pipe.hset(key, mapping={name: json.dumps(record) for name, record in changed.items()})
+        if removed:
+            pipe.hdel(key, *removed)
+        if ttl:
+            pipe.expire(key, ttl)
+        pipe.execute()
+    
+    def load_entities(self, session_id: str) -> Dict[str, Dict[str, Any]]:
+        """Load all entities of a session keyed by normalized name."""
+        stored = self.redis_client.hgetall(f"entities:{session_id}")
+        return {
+            (name.decode() if isinstance(name, bytes) else name): json.loads(record)
+            for name, record in stored.items()
+        }
+    
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Read several keys in one round trip; missing keys are omitted."""
+        return await self.batch_store.get_many(keys)
+    
+    async def set_many(self, values: Mapping[str, Any], ttl: TTL = None):
+        """Write several keys in one round trip, with one TTL or a TTL per key."""
+        await self.batch_store.set_many(values, ttl)
+    
+    async def update_atomic(self, values: Mapping[str, Any], delete: Iterable[str] = (), ttl: TTL = None):
+        """Set and delete several keys atomically."""
+        await self.batch_store.update_atomic(values, delete, ttl)
+    
+    async def compare_and_set(self, expected: Mapping[str, Any], values: Mapping[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several keys only if the expected keys still hold their values."""
+        return await self.batch_store.compare_and_set(expected, values, ttl)
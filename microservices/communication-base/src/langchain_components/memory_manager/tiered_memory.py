@@ -9,10 +9,18 @@ importance and relevance.
 import logging
 import time
 from typing import Dict, Any, List, Optional, Set, Tuple
-from datetime import datetime, timedelta
 
-from langchain.memory import ConversationBufferWindowMemory
-from langchain.schema import BaseMessage, AIMessage, HumanMessage
+from langchain.memory.utils import get_prompt_input_key
+
+from src.langchain_components.memory_manager.consolidation import (
+    LongEntry,
+    MediumEntry,
+    MediumTermTier,
+    ShortTermBuffer,
+    TopicIndex,
+)
+
+TIERS = ("short_term", "medium_term", "long_term")
 
 class TieredMemory:
     """
@@ -21,6 +29,11 @@ class TieredMemory:
     This class manages multiple memory tiers (short-term, medium-term, long-term) with
     different retention policies, automatically promoting important information to
     longer-term memory and consolidating/pruning as needed.
+    
+    Every tier is bounded and consolidated incrementally: the short-term tier
+    is a fixed-size buffer, medium-term entries are promoted in chunks as they
+    are evicted, long-term consolidation only revisits topics that gained
+    entries, and only tiers that changed are persisted.
     """
     
     def __init__(
@@ -34,6 +47,9 @@ class TieredMemory:
         long_term_capacity: int = 20,
         memory_key: str = "chat_history",
         importance_threshold: float = 0.7,
+        promotion_chunk_size: int = 4,
+        input_key: Optional[str] = None,
+        output_key: Optional[str] = None,
         **kwargs
     ):
         """
@@ -49,6 +65,16 @@ class TieredMemory:
             long_term_capacity: Number of summaries in long-term memory
             memory_key: Key to use for memory in chain inputs/outputs
             importance_threshold: Threshold for promoting to higher tiers
+            promotion_chunk_size: Number of entries evicted from medium-term
+                memory that are summarized together into long-term memory
+            input_key: Input holding the human message (None to use the
+                only input that is not a memory variable)
+            output_key: Output holding the AI message (None to use the only
+                output)
+        
+        If the session manager provides ``update_tiered_memory(session_id,
+        tiers)``, only changed tiers are written; otherwise the full memory is
+        stored with ``store_tiered_memory`` after each change.
         """
         self.llm = llm
         self.session_manager = session_manager
@@ -59,17 +85,24 @@ class TieredMemory:
         self.long_term_capacity = long_term_capacity
         self.memory_key = memory_key
         self.importance_threshold = importance_threshold
+        self.input_key = input_key
+        self.output_key = output_key
         self.logger = logging.getLogger(__name__)
         
         # Initialize memory tiers
-        self.short_term = ConversationBufferWindowMemory(
-            memory_key=memory_key,
-            return_messages=True,
-            k=short_term_window
+        self.short_term = ShortTermBuffer(short_term_window)
+        # Higher threshold for long-term
+        self.medium_term = MediumTermTier(
+            medium_term_window,
+            promotion_threshold=importance_threshold * 1.2,
+            chunk_size=promotion_chunk_size
         )
+        self.long_term: List[LongEntry] = []  # (timestamp, summary, topics, importance)
+        self.topic_index = TopicIndex()
         
-        self.medium_term = []  # List of (timestamp, message, importance) tuples
-        self.long_term = []    # List of (timestamp, summary, topics) tuples
+        # Tiers changed since the last save, and the last serialized form of each
+        self._dirty: Set[str] = set()
+        self._serialized: Dict[str, Any] = {}
         
         # Track when we last consolidated memory
         self.last_consolidation = time.time()
@@ -87,20 +120,17 @@ class TieredMemory:
             if tiered_memory:
                 if "short_term" in tiered_memory and tiered_memory["short_term"]:
                     # Recreate messages
-                    messages = []
-                    for msg in tiered_memory["short_term"]:
-                        if msg["type"] == "human":
-                            messages.append(HumanMessage(content=msg["content"]))
-                        else:
-                            messages.append(AIMessage(content=msg["content"]))
-                    
-                    self.short_term.chat_memory.messages = messages
+                    self.short_term.load(tiered_memory["short_term"])
                 
                 if "medium_term" in tiered_memory:
-                    self.medium_term = tiered_memory["medium_term"]
+                    self.medium_term.load(
+                        tiered_memory["medium_term"],
+                        tiered_memory.get("medium_term_pending", [])
+                    )
                 
                 if "long_term" in tiered_memory:
-                    self.long_term = tiered_memory["long_term"]
+                    self.long_term = [tuple(entry) for entry in tiered_memory["long_term"]]
+                    self.topic_index.rebuild(self.long_term)
                 
                 self.logger.info(f"Loaded tiered memory from session {self.session_id}")
         except Exception as e:
@@ -108,31 +138,50 @@ class TieredMemory:
     
     def _save_to_session(self) -> None:
         """
-        Save memory to session.
+        Save changed memory tiers to session.
         """
+        dirty = self._dirty if self._serialized else set(TIERS)
+        if not dirty:
+            return
+        
         try:
-            # Convert short-term messages to serializable format
-            short_term_messages = []
-            for msg in self.short_term.chat_memory.messages:
-                short_term_messages.append({
-                    "type": "human" if isinstance(msg, HumanMessage) else "ai",
-                    "content": msg.content
-                })
-            
-            tiered_memory = {
-                "short_term": short_term_messages,
-                "medium_term": self.medium_term,
-                "long_term": self.long_term
-            }
+            # Re-serialize only the tiers that changed
+            changed = {}
+            for tier in dirty:
+                changed.update(self._serialize_tier(tier))
+            self._serialized.update(changed)
             
-            self.session_manager.store_tiered_memory(
-                self.session_id, 
-                tiered_memory
-            )
-            self.logger.debug(f"Saved tiered memory to session {self.session_id}")
+            if hasattr(self.session_manager, "update_tiered_memory"):
+                self.session_manager.update_tiered_memory(self.session_id, changed)
+            else:
+                self.session_manager.store_tiered_memory(
+                    self.session_id, 
+                    dict(self._serialized)
+                )
+            self._dirty = set()
+            self.logger.debug(f"Saved tiers {sorted(dirty)} to session {self.session_id}")
         except Exception as e:
             self.logger.warning(f"Failed to save tiered memory to session: {e}")
     
+    def _serialize_tier(self, tier: str) -> Dict[str, Any]:
+        """
+        Serialize one memory tier.
+        
+        Args:
+            tier: Tier name
+            
+        Returns:
+            Session fields for the tier
+        """
+        if tier == "short_term":
+            return {"short_term": self.short_term.serialize()}
+        if tier == "medium_term":
+            return {
+                "medium_term": self.medium_term.entries(),
+                "medium_term_pending": list(self.medium_term.pending)
+            }
+        return {"long_term": list(self.long_term)}
+    
     def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
         """
         Save context to memory tiers.
@@ -141,40 +190,65 @@ class TieredMemory:
             inputs: Input values
             outputs: Output values
         """
+        input_text, output_text = self._get_input_output(inputs, outputs)
+        
         # Save to short-term memory
-        self.short_term.save_context(inputs, outputs)
+        self.short_term.add_turn(input_text, output_text)
+        self._dirty.add("short_term")
         
         # Assess importance
-        importance = self._assess_importance(inputs, outputs)
+        importance = self._assess_importance(input_text, output_text)
         
         # If important, also add to medium-term
         if importance >= self.importance_threshold:
-            self._add_to_medium_term(inputs, outputs, importance)
+            self._add_to_medium_term(input_text, output_text, importance)
         
         # Check if we should consolidate memory
         if time.time() - self.last_consolidation > self.consolidation_interval:
             self._consolidate_memory()
             self.last_consolidation = time.time()
         
-        # Save all memory tiers to session
+        # Save changed memory tiers to session
         self._save_to_session()
     
-    def _assess_importance(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> float:
+    def _get_input_output(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> Tuple[str, str]:
         """
-        Assess the importance of a conversation turn.
+        Get the human and AI messages of a turn.
+        
+        Keys are inferred as ConversationBufferWindowMemory does when
+        ``input_key`` or ``output_key`` is not set.
         
         Args:
             inputs: Input values
             outputs: Output values
             
+        Returns:
+            (human message, AI message)
+            
+        Raises:
+            ValueError: If a key is not set and cannot be inferred
+        """
+        input_key = self.input_key or get_prompt_input_key(inputs, [self.memory_key])
+        output_key = self.output_key
+        if output_key is None:
+            if len(outputs) != 1:
+                raise ValueError(f"One output key expected, got {outputs.keys()}")
+            output_key = list(outputs.keys())[0]
+        return inputs[input_key], outputs[output_key]
+    
+    def _assess_importance(self, input_text: str, output_text: str) -> float:
+        """
+        Assess the importance of a conversation turn.
+        
+        Args:
+            input_text: Human message
+            output_text: AI message
+            
         Returns:
             Importance score (0.0 to 1.0)
         """
         # Use LLM to assess importance
         try:
-            input_text = inputs.get("question", "")
-            output_text = outputs.get("answer", "")
-            
             prompt = f"""
             Analyze the following conversation turn and rate its importance from 0.0 to 1.0.
             High importance (0.8-1.0) should be given to messages that:
@@ -204,61 +278,52 @@ class TieredMemory:
             self.logger.warning(f"Failed to assess importance: {e}")
             return 0.5  # Default to medium importance
     
-    def _add_to_medium_term(self, inputs: Dict[str, Any], outputs: Dict[str, str], importance: float) -> None:
+    def _add_to_medium_term(self, input_text: str, output_text: str, importance: float) -> None:
         """
         Add important information to medium-term memory.
         
         Args:
-            inputs: Input values
-            outputs: Output values
+            input_text: Human message
+            output_text: AI message
             importance: Importance score
         """
         timestamp = time.time()
-        input_text = inputs.get("question", "")
-        output_text = outputs.get("answer", "")
         
-        self.medium_term.append((timestamp, {
+        chunk = self.medium_term.add((timestamp, {
             "human": input_text,
             "ai": output_text
         }, importance))
+        self._dirty.add("medium_term")
         
-        # Keep medium-term memory within size limit, removing oldest entries
-        if len(self.medium_term) > self.medium_term_window:
-            # Sort by importance and timestamp (keep recent and important)
-            self.medium_term.sort(key=lambda x: (x[2], x[0]), reverse=True)
-            
-            # Before removing, check if any should be promoted to long-term memory
-            for entry in self.medium_term[self.medium_term_window:]:
-                if entry[2] >= self.importance_threshold * 1.2:  # Higher threshold for long-term
-                    self._promote_to_long_term(entry)
-            
-            # Trim to window size
-            self.medium_term = self.medium_term[:self.medium_term_window]
+        # Entries evicted from medium-term memory are summarized in chunks
+        if chunk:
+            self._promote_to_long_term(chunk)
     
-    def _promote_to_long_term(self, entry: Tuple[float, Dict[str, str], float]) -> None:
+    def _promote_to_long_term(self, entries: List[MediumEntry]) -> None:
         """
-        Promote important information to long-term memory.
+        Promote a chunk of evicted medium-term entries to long-term memory.
         
         Args:
-            entry: Medium-term memory entry (timestamp, messages, importance)
+            entries: Medium-term entries (timestamp, messages, importance)
         """
-        timestamp, messages, importance = entry
+        importance = max(entry[2] for entry in entries)
         
         # Skip if already at capacity and this is less important than existing entries
         if (len(self.long_term) >= self.long_term_capacity and 
-            importance < min(e[2] for e in self.long_term)):
+            importance < min(e[3] for e in self.long_term)):
             return
         
-        # Create a summary of the entry
+        # Create a summary of the chunk
         try:
-            human_message = messages["human"]
-            ai_message = messages["ai"]
+            exchanges = "\n\n".join(
+                f"Human: {messages['human']}\nAI: {messages['ai']}"
+                for _, messages, _ in sorted(entries, key=lambda entry: entry[0])
+            )
             
             prompt = f"""
-            Create a concise, information-dense summary of the following exchange:
+            Create a concise, information-dense summary of the following exchanges:
             
-            Human: {human_message}
-            AI: {ai_message}
+            {exchanges}
             
             This summary should capture the key points and critical information only.
             Also identify the main topics discussed as a comma-separated list.
@@ -275,98 +340,105 @@ class TieredMemory:
             topics = []
             
             for line in response.split("\n"):
+                line = line.strip()
                 if line.startswith("SUMMARY:"):
                     summary = line[len("SUMMARY:"):].strip()
                 elif line.startswith("TOPICS:"):
-                    topics = [t.strip() for t in line[len("TOPICS:"):].split(",")]
+                    topics = [t.strip() for t in line[len("TOPICS:"):].split(",") if t.strip()]
             
             # Add to long-term memory
-            self.long_term.append((timestamp, summary, topics, importance))
-            
-            # Keep long-term memory within capacity, removing least important entries
-            if len(self.long_term) > self.long_term_capacity:
-                self.long_term.sort(key=lambda x: x[3], reverse=True)
-                self.long_term = self.long_term[:self.long_term_capacity]
+            self._add_to_long_term((max(entry[0] for entry in entries), summary, topics, importance))
                 
         except Exception as e:
             self.logger.warning(f"Failed to promote to long-term memory: {e}")
     
+    def _add_to_long_term(self, entry: LongEntry) -> None:
+        """
+        Add a long-term entry, removing the least important one when over capacity.
+        
+        Args:
+            entry: Long-term entry (timestamp, summary, topics, importance)
+        """
+        self.long_term.append(entry)
+        self.topic_index.add(entry)
+        
+        if len(self.long_term) > self.long_term_capacity:
+            least = min(range(len(self.long_term)), key=lambda i: self.long_term[i][3])
+            self.topic_index.remove(self.long_term.pop(least))
+        self._dirty.add("long_term")
+    
     def _consolidate_memory(self) -> None:
         """
-        Consolidate memory by summarizing older conversation chunks.
+        Consolidate long-term memory by merging summaries that share a topic.
+        
+        Only topics that gained entries since the last consolidation are
+        revisited.
         """
         # Skip if not enough entries
         if len(self.long_term) < 3:
             return
         
         try:
-            # Group related topics
-            topic_groups = {}
+            consolidated = []
+            merged_ids = set()
             
-            for entry in self.long_term:
-                timestamp, summary, topics, importance = entry
+            for topic, entries in self.topic_index.take_dirty_groups():
+                # An entry is merged into at most one consolidated summary
+                entries = [entry for entry in entries if id(entry) not in merged_ids]
+                if len(entries) < 2:
+                    continue
                 
-                for topic in topics:
-                    if topic not in topic_groups:
-                        topic_groups[topic] = []
-                    
-                    topic_groups[topic].append((timestamp, summary, importance))
-            
-            # For topics with multiple entries, consolidate
-            new_long_term = []
-            consolidated_entries = set()
-            
-            for topic, entries in topic_groups.items():
-                if len(entries) > 1:
-                    # Sort by timestamp
-                    entries.sort(key=lambda x: x[0])
-                    
-                    # Get summaries to consolidate
-                    summaries = [entry[1] for entry in entries]
-                    timestamps = [entry[0] for entry in entries]
-                    importance_scores = [entry[2] for entry in entries]
-                    
-                    # Track entry indices for later removal
-                    for i, (timestamp, _, _, _) in enumerate(self.long_term):
-                        if timestamp in timestamps:
-                            consolidated_entries.add(i)
-                    
-                    # Create consolidated summary
-                    prompt = f"""
-                    Consolidate these related summaries about '{topic}' into a single comprehensive summary:
-                    
-                    {' '.join([f'{i+1}. {summary}' for i, summary in enumerate(summaries)])}
-                    
-                    Your consolidated summary should:
-                    1. Maintain all key information
-                    2. Remove redundancy
-                    3. Be chronologically ordered if appropriate
-                    4. Be concise but complete
-                    """
-                    
-                    consolidated_summary = self.llm.predict(prompt).strip()
-                    avg_importance = sum(importance_scores) / len(importance_scores)
-                    
-                    # Add consolidated summary
-                    new_long_term.append((
-                        max(timestamps),  # Use latest timestamp
-                        consolidated_summary,
-                        [topic],
-                        avg_importance
-                    ))
+                # Sort by timestamp
+                entries.sort(key=lambda x: x[0])
+                
+                # Get summaries to consolidate
+                summaries = [entry[1] for entry in entries]
+                timestamps = [entry[0] for entry in entries]
+                importance_scores = [entry[3] for entry in entries]
+                
+                # Create consolidated summary
+                prompt = f"""
+                Consolidate these related summaries about '{topic}' into a single comprehensive summary:
+                
+                {' '.join([f'{i+1}. {summary}' for i, summary in enumerate(summaries)])}
+                
+                Your consolidated summary should:
+                1. Maintain all key information
+                2. Remove redundancy
+                3. Be chronologically ordered if appropriate
+                4. Be concise but complete
+                """
+                
+                consolidated_summary = self.llm.predict(prompt).strip()
+                avg_importance = sum(importance_scores) / len(importance_scores)
+                
+                merged_ids.update(id(entry) for entry in entries)
+                consolidated.append((
+                    max(timestamps),  # Use latest timestamp
+                    consolidated_summary,
+                    [topic],
+                    avg_importance
+                ))
             
-            # Add non-consolidated entries
-            for i, entry in enumerate(self.long_term):
-                if i not in consolidated_entries:
-                    new_long_term.append(entry)
+            if not consolidated:
+                return
             
-            # Update long-term memory
-            self.long_term = new_long_term
+            # Replace merged entries with their consolidated summaries
+            for entry in self.long_term:
+                if id(entry) in merged_ids:
+                    self.topic_index.remove(entry)
+            self.long_term = [entry for entry in self.long_term if id(entry) not in merged_ids]
+            for entry in consolidated:
+                self.long_term.append(entry)
+                self.topic_index.add(entry)
+            # Consolidated entries do not need another pass until their topic grows
+            self.topic_index.dirty = set()
             
             # Ensure we respect capacity
-            if len(self.long_term) > self.long_term_capacity:
-                self.long_term.sort(key=lambda x: x[3], reverse=True)
-                self.long_term = self.long_term[:self.long_term_capacity]
+            while len(self.long_term) > self.long_term_capacity:
+                least = min(range(len(self.long_term)), key=lambda i: self.long_term[i][3])
+                self.topic_index.remove(self.long_term.pop(least))
+            self._dirty.add("long_term")
             
         except Exception as e:
             self.logger.warning(f"Failed to consolidate memory: {e}")
@@ -378,12 +450,9 @@ class TieredMemory:
         Returns:
             Memory variables
         """
-        # Get short-term memory (most recent messages)
-        short_term_vars = self.short_term.load_memory_variables({})
-        
         # Create full memory context
         memory_context = {
-            self.memory_key: short_term_vars[self.memory_key],
+            self.memory_key: self.short_term.messages,
             "long_term_memory": self._format_long_term_memory()
         }
         
@@ -426,9 +495,11 @@ class TieredMemory:
         Clear all memory tiers.
         """
         self.short_term.clear()
-        self.medium_term = []
+        self.medium_term.clear()
         self.long_term = []
+        self.topic_index = TopicIndex()
         self.last_consolidation = time.time()
+        self._dirty = set(TIERS)
         
         # Save cleared state
         self._save_to_session() 
\ No newline at end of file
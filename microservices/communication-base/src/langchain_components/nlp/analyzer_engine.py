@@ -0,0 +1,189 @@
+"""
+Concurrent analyzer execution engine.
+
+This module runs independent message analyzers (entity extraction, intent
+classification, sentiment analysis, ...) concurrently for the hybrid NLP
+processor. CPU-bound analyzers (local models) are offloaded to a thread pool.
+Each analyzer has a timeout; an analyzer that times out or fails yields its
+fallback value instead of failing the message. Successful results are cached
+by message hash, so repeated messages skip the analyzers entirely.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import logging
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional
+
+from src.langchain_components.rag.memo_cache import AsyncMemoCache
+
+
+class Analyzer(NamedTuple):
+    """An analyzer to run on a message."""
+
+    name: str
+    # Zero-argument callable returning the result or an awaitable of it
+    run: Callable[[], Any]
+    fallback: Any = None
+    timeout_seconds: Optional[float] = None
+    cacheable: bool = True
+    # Run in the executor instead of on the event loop
+    cpu_bound: bool = False
+    # Extra cache scope for results that depend on more than the message,
+    # e.g. the session id for session-aware analyzers
+    scope: Optional[str] = None
+
+
+class AnalyzerOutcome(NamedTuple):
+    """Result of one analyzer."""
+
+    value: Any
+    # "ok", "cached", "timeout" or "error"
+    status: str
+    seconds: float
+
+    @property
+    def degraded(self) -> bool:
+        return self.status in ("timeout", "error")
+
+
+def message_hash(message: str) -> str:
+    """
+    Hash a message for use in cache keys.
+
+    Args:
+        message: Message text
+
+    Returns:
+        Hex digest of the message
+    """
+    return hashlib.sha256(message.encode("utf-8")).hexdigest()
+
+
+class AnalyzerEngine:
+    """
+    Runs analyzers concurrently with per-analyzer timeouts and a result cache.
+    """
+
+    def __init__(
+        self,
+        default_timeout_seconds: float = 5.0,
+        cache_size: int = 4096,
+        cache_ttl_seconds: float = 600.0,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            default_timeout_seconds: Timeout for analyzers without their own
+            cache_size: Maximum number of cached analyzer results
+            cache_ttl_seconds: Lifetime of a cached analyzer result
+            executor: Executor for CPU-bound analyzers (None for the
+                event loop's default thread pool)
+        """
+        self.default_timeout_seconds = default_timeout_seconds
+        self.executor = executor
+        self.cache = AsyncMemoCache(max_entries=cache_size, ttl_seconds=cache_ttl_seconds)
+        self.logger = logging.getLogger(__name__)
+
+        self.metrics: Dict[str, Dict[str, float]] = {}
+
+    async def run(
+        self,
+        analyzers: Iterable[Analyzer],
+        cache_scope: Optional[str] = None
+    ) -> Dict[str, AnalyzerOutcome]:
+        """
+        Run analyzers concurrently.
+
+        Args:
+            analyzers: Analyzers to run
+            cache_scope: Cache namespace identifying the input, e.g.
+                "<bot_type>:<message_hash>" (None disables caching)
+
+        Returns:
+            Outcome of each analyzer by name
+        """
+        analyzers = list(analyzers)
+        outcomes = await asyncio.gather(*(self._run_cached(analyzer, cache_scope) for analyzer in analyzers))
+        return {analyzer.name: outcome for analyzer, outcome in zip(analyzers, outcomes)}
+
+    async def _run_cached(self, analyzer: Analyzer, cache_scope: Optional[str]) -> AnalyzerOutcome:
+        if cache_scope is None or not analyzer.cacheable:
+            return await self._run_one(analyzer)
+
+        start = time.perf_counter()
+        computed = []
+
+        async def compute() -> AnalyzerOutcome:
+            outcome = await self._run_one(analyzer)
+            computed.append(outcome)
+            return outcome
+
+        outcome = await self.cache.get_or_compute(
+            (analyzer.name, cache_scope, analyzer.scope), compute, lambda outcome: not outcome.degraded
+        )
+        if computed:
+            return outcome
+        # Served from the cache or by another in-flight request
+        status = outcome.status if outcome.degraded else "cached"
+        elapsed = time.perf_counter() - start
+        self._record(analyzer.name, status, elapsed)
+        return AnalyzerOutcome(outcome.value, status, elapsed)
+
+    async def _run_one(self, analyzer: Analyzer) -> AnalyzerOutcome:
+        timeout = analyzer.timeout_seconds if analyzer.timeout_seconds is not None else self.default_timeout_seconds
+        start = time.perf_counter()
+        try:
+            value = await asyncio.wait_for(self._invoke(analyzer), timeout)
+            status = "ok"
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Analyzer {analyzer.name} timed out after {timeout}s, using fallback")
+            value, status = analyzer.fallback, "timeout"
+        except Exception as e:
+            self.logger.warning(f"Analyzer {analyzer.name} failed, using fallback: {e}")
+            value, status = analyzer.fallback, "error"
+
+        elapsed = time.perf_counter() - start
+        self._record(analyzer.name, status, elapsed)
+        return AnalyzerOutcome(value, status, elapsed)
+
+    async def _invoke(self, analyzer: Analyzer) -> Any:
+        if analyzer.cpu_bound:
+            # CPU-bound analyzers must not block the event loop
+            return await asyncio.get_running_loop().run_in_executor(self.executor, analyzer.run)
+        value = analyzer.run()
+        if inspect.isawaitable(value):
+            value = await value
+        return value
+
+    def _record(self, name: str, status: str, seconds: float) -> None:
+        stats = self.metrics.get(name)
+        if stats is None:
+            stats = self.metrics[name] = {
+                "ok": 0, "cached": 0, "timeout": 0, "error": 0, "total_seconds": 0.0, "max_seconds": 0.0
+            }
+        stats[status] += 1
+        stats["total_seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def invalidate(self) -> None:
+        """
+        Drop all cached analyzer results.
+        """
+        self.cache.invalidate()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get per-analyzer outcome counts and timings, and cache metrics.
+
+        Returns:
+            Dictionary of metrics
+        """
+        return {
+            "analyzers": {name: dict(stats) for name, stats in self.metrics.items()},
+            "cache": self.cache.get_metrics(),
+        }
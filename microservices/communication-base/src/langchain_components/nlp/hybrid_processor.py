@@ -5,13 +5,17 @@ This module provides a central coordinator for NLP processing that integrates
 LangChain components with custom extensions for enhanced capabilities.
 """
 
+import copy
 import logging
+import time
 from typing import Dict, Any, List, Optional, Union, Set
 
 from langchain.chains import LLMChain
 from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 
+from src.langchain_components.nlp.analyzer_engine import Analyzer, AnalyzerEngine, message_hash
+
 class HybridNLPProcessor:
     """
     Hybrid NLP processor that combines LangChain with custom components.
@@ -28,7 +32,10 @@ class HybridNLPProcessor:
         entity_store: Any = None,
         chain_initializer: Any = None,
         schema_loader: Any = None,
-        extraction_registry: Any = None
+        extraction_registry: Any = None,
+        analyzer_timeout_seconds: float = 5.0,
+        analyzer_cache_size: int = 4096,
+        analyzer_cache_ttl_seconds: float = 600.0
     ):
         """
         Initialize hybrid NLP processor.
@@ -40,6 +47,10 @@ class HybridNLPProcessor:
             chain_initializer: Initializer for extraction chains
             schema_loader: Loader for NLP extraction schemas
             extraction_registry: Registry for extraction configurations
+            analyzer_timeout_seconds: Default per-analyzer timeout; an analyzer
+                exceeding it yields its fallback result
+            analyzer_cache_size: Maximum number of cached analyzer results
+            analyzer_cache_ttl_seconds: Lifetime of a cached analyzer result
         """
         self.config_integration = config_integration
         self.llm_manager = llm_manager
@@ -54,6 +65,16 @@ class HybridNLPProcessor:
         
         # Custom processors for bot types
         self.custom_processors: Dict[str, Any] = {}
+        
+        # Additional analyzers by name: (analyzer, fallback, cpu_bound, timeout, bot_types)
+        self.analyzers: Dict[str, Any] = {}
+        
+        # Runs analyzers concurrently with timeouts and a result cache
+        self.analyzer_engine = AnalyzerEngine(
+            default_timeout_seconds=analyzer_timeout_seconds,
+            cache_size=analyzer_cache_size,
+            cache_ttl_seconds=analyzer_cache_ttl_seconds
+        )
     
     def register_custom_processor(self, bot_type: str, processor: Any) -> None:
         """
@@ -66,6 +87,32 @@ class HybridNLPProcessor:
         self.custom_processors[bot_type] = processor
         self.logger.info(f"Registered custom NLP processor for bot type: {bot_type}")
     
+    def register_analyzer(
+        self,
+        name: str,
+        analyzer: Any,
+        fallback: Any = None,
+        cpu_bound: bool = False,
+        timeout_seconds: Optional[float] = None,
+        bot_types: Optional[List[str]] = None
+    ) -> None:
+        """
+        Register an additional analyzer run alongside the built-in ones.
+        
+        Its result is added to processing results under ``name``.
+        
+        Args:
+            name: Result key for the analyzer
+            analyzer: Callable taking (message, bot_type); may be async
+            fallback: Result used when the analyzer fails or times out
+            cpu_bound: Run the analyzer in a worker thread (local models)
+            timeout_seconds: Analyzer timeout (None for the default)
+            bot_types: Bot types to run the analyzer for (None for all)
+        """
+        self.analyzers[name] = (analyzer, fallback, cpu_bound, timeout_seconds, bot_types)
+        self.analyzer_engine.invalidate()
+        self.logger.info(f"Registered NLP analyzer: {name}")
+    
     async def process_message(
         self,
         message: str,
@@ -87,6 +134,8 @@ class HybridNLPProcessor:
         Returns:
             Dictionary with NLP processing results
         """
+        start_time = time.perf_counter()
+        
         # Initialize result container
         result = {
             "original_message": message,
@@ -102,31 +151,87 @@ class HybridNLPProcessor:
         
         # Determine processing steps based on config
         extraction_types = processing_config.get("extraction_types", ["entities", "intents", "sentiment"])
+        timeouts = processing_config.get("analyzer_timeouts", {})
         
         try:
+            # The analyzers are independent, so they run concurrently
+            analyzers = []
+            
             # Apply bot-specific custom processor if available
             if bot_type in self.custom_processors:
-                custom_result = await self.custom_processors[bot_type].process(
-                    message=message,
-                    session_id=session_id,
-                    user_id=user_id,
-                    options=processing_options
-                )
-                # Merge custom results with standard results
-                self._merge_results(result, custom_result)
+                custom_processor = self.custom_processors[bot_type]
+                analyzers.append(Analyzer(
+                    "custom",
+                    lambda: custom_processor.process(
+                        message=message,
+                        session_id=session_id,
+                        user_id=user_id,
+                        options=processing_options
+                    ),
+                    fallback={},
+                    timeout_seconds=timeouts.get("custom"),
+                    cacheable=False
+                ))
             
             # Apply LangChain-based extractions
             if "entities" in extraction_types:
-                entities = await self._extract_entities(message, bot_type, session_id)
-                result["entities"].extend(entities)
+                analyzers.append(Analyzer(
+                    "entities",
+                    lambda: self._extract_entities(message, bot_type, session_id),
+                    fallback=[],
+                    timeout_seconds=timeouts.get("entities"),
+                    # Extraction sees the session, so results are cached per session
+                    scope=session_id
+                ))
             
             if "intents" in extraction_types:
-                intents = await self._extract_intents(message, bot_type)
-                result["intents"].extend(intents)
+                analyzers.append(Analyzer(
+                    "intents",
+                    lambda: self._extract_intents(message, bot_type),
+                    fallback=[],
+                    timeout_seconds=timeouts.get("intents")
+                ))
             
             if "sentiment" in extraction_types:
-                sentiment = await self._analyze_sentiment(message, bot_type)
-                result["sentiment"] = sentiment
+                analyzers.append(Analyzer(
+                    "sentiment",
+                    lambda: self._analyze_sentiment(message, bot_type),
+                    fallback={"sentiment": "neutral", "score": 0.5},
+                    timeout_seconds=timeouts.get("sentiment")
+                ))
+            
+            # Apply registered analyzers
+            for name, (analyzer, fallback, cpu_bound, timeout_seconds, bot_types) in self.analyzers.items():
+                if bot_types is None or bot_type in bot_types:
+                    analyzers.append(Analyzer(
+                        name,
+                        lambda analyzer=analyzer: analyzer(message, bot_type),
+                        fallback=fallback,
+                        timeout_seconds=timeouts.get(name, timeout_seconds),
+                        cpu_bound=cpu_bound
+                    ))
+            
+            outcomes = await self.analyzer_engine.run(
+                analyzers, cache_scope=f"{bot_type}:{message_hash(message)}"
+            )
+            values = {
+                # Cached results and fallbacks are shared, so each message gets its own copy
+                name: outcome.value if name == "custom" else copy.deepcopy(outcome.value)
+                for name, outcome in outcomes.items()
+            }
+            
+            # Merge custom results first, then standard results
+            if values.get("custom"):
+                self._merge_results(result, values["custom"])
+            if "entities" in values:
+                result["entities"].extend(values["entities"])
+            if "intents" in values:
+                result["intents"].extend(values["intents"])
+            if "sentiment" in values:
+                result["sentiment"] = values["sentiment"]
+            for name in self.analyzers:
+                if name in values:
+                    result[name] = values[name]
             
             # Store extracted entities if entity store is available
             if self.entity_store and result["entities"]:
@@ -139,10 +244,13 @@ class HybridNLPProcessor:
             
             # Apply additional metadata
             result["metadata"] = {
-                "processing_time": 0,  # Replace with actual processing time
+                **result["metadata"],
+                "processing_time": time.perf_counter() - start_time,
                 "confidence": self._calculate_confidence(result),
                 "bot_type": bot_type,
-                "session_id": session_id
+                "session_id": session_id,
+                "analyzers": {name: outcome.status for name, outcome in outcomes.items()},
+                "degraded": [name for name, outcome in outcomes.items() if outcome.degraded]
             }
             
             return result
@@ -154,6 +262,57 @@ class HybridNLPProcessor:
             result["metadata"]["success"] = False
             return result
     
+    async def process_text(
+        self,
+        text: str,
+        bot_type: str,
+        session_id: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Extract entities from text outside of a conversation turn.
+        
+        Used for standalone text such as retrieval queries: only entity
+        extraction runs, and nothing is written to the entity store.
+        
+        Args:
+            text: Text to process
+            bot_type: Type of bot
+            session_id: Session identifier, if the text belongs to a session
+        
+        Returns:
+            Dictionary with the extracted entities and analyzer metadata
+        """
+        timeouts = self._get_processing_config(bot_type).get("analyzer_timeouts", {})
+        outcomes = await self.analyzer_engine.run(
+            [Analyzer(
+                "entities",
+                lambda: self._extract_entities(text, bot_type, session_id),
+                fallback=[],
+                timeout_seconds=timeouts.get("entities"),
+                scope=session_id
+            )],
+            cache_scope=f"{bot_type}:{message_hash(text)}"
+        )
+        outcome = outcomes["entities"]
+        return {
+            "original_message": text,
+            "entities": copy.deepcopy(outcome.value),
+            "metadata": {
+                "bot_type": bot_type,
+                "analyzers": {"entities": outcome.status},
+                "degraded": ["entities"] if outcome.degraded else []
+            }
+        }
+    
+    def get_analyzer_metrics(self) -> Dict[str, Any]:
+        """
+        Get per-analyzer outcome counts, timings and cache metrics.
+        
+        Returns:
+            Dictionary of analyzer metrics
+        """
+        return self.analyzer_engine.get_metrics()
+    
     async def _extract_entities(
         self,
         message: str,
@@ -178,25 +337,20 @@ class HybridNLPProcessor:
             self.logger.warning(f"No extraction chain available for bot type: {bot_type}")
             return []
         
-        try:
-            # Run extraction through LangChain
-            extraction_result = await extraction_chain.arun(
-                input=message,
-                session_id=session_id,
-                bot_type=bot_type
-            )
-            
-            # Parse results
-            if isinstance(extraction_result, dict) and "entities" in extraction_result:
-                return extraction_result["entities"]
-            elif isinstance(extraction_result, list):
-                return extraction_result
-            else:
-                self.logger.warning(f"Unexpected entity extraction result format: {type(extraction_result)}")
-                return []
-                
-        except Exception as e:
-            self.logger.error(f"Entity extraction failed: {e}", exc_info=True)
+        # Run extraction through LangChain
+        extraction_result = await extraction_chain.arun(
+            input=message,
+            session_id=session_id,
+            bot_type=bot_type
+        )
+        
+        # Parse results
+        if isinstance(extraction_result, dict) and "entities" in extraction_result:
+            return extraction_result["entities"]
+        elif isinstance(extraction_result, list):
+            return extraction_result
+        else:
+            self.logger.warning(f"Unexpected entity extraction result format: {type(extraction_result)}")
             return []
     
     async def _extract_intents(
@@ -220,62 +374,57 @@ class HybridNLPProcessor:
         if not intent_config or not intent_config.get("enabled", True):
             return []
         
+        # Get appropriate LLM for intent classification
+        llm = self.llm_manager.get_model(bot_type, model_type="classification")
+        
+        # Get available intents from config
+        available_intents = intent_config.get("intents", [])
+        
+        if not available_intents:
+            return []
+        
+        # Create prompt for intent classification
+        intent_prompt = ChatPromptTemplate.from_template(
+            "Classify the following message into one of these intents: {intents}. "
+            "Return the intent name and confidence score (0-1) in JSON format.\n\n"
+            "Message: {input}"
+        )
+        
+        # Create intent classification chain
+        intent_chain = LLMChain(
+            llm=llm,
+            prompt=intent_prompt,
+            output_key="intent_classification"
+        )
+        
+        # Run intent classification
+        intent_result = await intent_chain.arun(
+            input=message,
+            intents=", ".join(available_intents)
+        )
+        
+        # Parse result (simple parsing, could be enhanced with a proper output parser)
+        # Expecting format like: {"intent": "intent_name", "confidence": 0.95}
+        import json
         try:
-            # Get appropriate LLM for intent classification
-            llm = self.llm_manager.get_model(bot_type, model_type="classification")
-            
-            # Get available intents from config
-            available_intents = intent_config.get("intents", [])
-            
-            if not available_intents:
+            parsed_intent = json.loads(intent_result)
+            if isinstance(parsed_intent, dict) and "intent" in parsed_intent:
+                return [{
+                    "name": parsed_intent["intent"],
+                    "confidence": parsed_intent.get("confidence", 0.7),
+                    "metadata": {}
+                }]
+            else:
                 return []
-            
-            # Create prompt for intent classification
-            intent_prompt = ChatPromptTemplate.from_template(
-                "Classify the following message into one of these intents: {intents}. "
-                "Return the intent name and confidence score (0-1) in JSON format.\n\n"
-                "Message: {input}"
-            )
-            
-            # Create intent classification chain
-            intent_chain = LLMChain(
-                llm=llm,
-                prompt=intent_prompt,
-                output_key="intent_classification"
-            )
-            
-            # Run intent classification
-            intent_result = await intent_chain.arun(
-                input=message,
-                intents=", ".join(available_intents)
-            )
-            
-            # Parse result (simple parsing, could be enhanced with a proper output parser)
-            # Expecting format like: {"intent": "intent_name", "confidence": 0.95}
-            import json
-            try:
-                parsed_intent = json.loads(intent_result)
-                if isinstance(parsed_intent, dict) and "intent" in parsed_intent:
+        except json.JSONDecodeError:
+            # Fallback parsing for non-JSON output
+            for intent in available_intents:
+                if intent.lower() in intent_result.lower():
                     return [{
-                        "name": parsed_intent["intent"],
-                        "confidence": parsed_intent.get("confidence", 0.7),
-                        "metadata": {}
+                        "name": intent,
+                        "confidence": 0.7,  # Default confidence when parsing fails
+                        "metadata": {"parsing_method": "fallback"}
                     }]
-                else:
-                    return []
-            except json.JSONDecodeError:
-                # Fallback parsing for non-JSON output
-                for intent in available_intents:
-                    if intent.lower() in intent_result.lower():
-                        return [{
-                            "name": intent,
-                            "confidence": 0.7,  # Default confidence when parsing fails
-                            "metadata": {"parsing_method": "fallback"}
-                        }]
-                return []
-                
-        except Exception as e:
-            self.logger.error(f"Intent extraction failed: {e}", exc_info=True)
             return []
     
     async def _analyze_sentiment(
@@ -299,61 +448,56 @@ class HybridNLPProcessor:
         if not sentiment_config or not sentiment_config.get("enabled", True):
             return {"sentiment": "neutral", "score": 0.5}
         
+        # Get appropriate LLM for sentiment analysis
+        llm = self.llm_manager.get_model(bot_type, model_type="classification")
+        
+        # Create prompt for sentiment analysis
+        sentiment_prompt = ChatPromptTemplate.from_template(
+            "Analyze the sentiment of the following message and classify it as positive, negative, or neutral. "
+            "Also provide a score from 0 (most negative) to 1 (most positive). "
+            "Return the result in JSON format with 'sentiment' and 'score' fields.\n\n"
+            "Message: {input}"
+        )
+        
+        # Create sentiment analysis chain
+        sentiment_chain = LLMChain(
+            llm=llm,
+            prompt=sentiment_prompt,
+            output_key="sentiment_analysis"
+        )
+        
+        # Run sentiment analysis
+        sentiment_result = await sentiment_chain.arun(input=message)
+        
+        # Parse result (simple parsing, could be enhanced with a proper output parser)
+        import json
         try:
-            # Get appropriate LLM for sentiment analysis
-            llm = self.llm_manager.get_model(bot_type, model_type="classification")
-            
-            # Create prompt for sentiment analysis
-            sentiment_prompt = ChatPromptTemplate.from_template(
-                "Analyze the sentiment of the following message and classify it as positive, negative, or neutral. "
-                "Also provide a score from 0 (most negative) to 1 (most positive). "
-                "Return the result in JSON format with 'sentiment' and 'score' fields.\n\n"
-                "Message: {input}"
-            )
-            
-            # Create sentiment analysis chain
-            sentiment_chain = LLMChain(
-                llm=llm,
-                prompt=sentiment_prompt,
-                output_key="sentiment_analysis"
-            )
-            
-            # Run sentiment analysis
-            sentiment_result = await sentiment_chain.arun(input=message)
-            
-            # Parse result (simple parsing, could be enhanced with a proper output parser)
-            import json
-            try:
-                parsed_sentiment = json.loads(sentiment_result)
-                if isinstance(parsed_sentiment, dict) and "sentiment" in parsed_sentiment:
-                    return {
-                        "sentiment": parsed_sentiment["sentiment"],
-                        "score": parsed_sentiment.get("score", 0.5),
-                        "metadata": {}
-                    }
-                else:
-                    return {"sentiment": "neutral", "score": 0.5}
-            except json.JSONDecodeError:
-                # Fallback parsing for non-JSON output
-                sentiment = "neutral"
-                score = 0.5
-                
-                if "positive" in sentiment_result.lower():
-                    sentiment = "positive"
-                    score = 0.8
-                elif "negative" in sentiment_result.lower():
-                    sentiment = "negative"
-                    score = 0.2
-                
+            parsed_sentiment = json.loads(sentiment_result)
+            if isinstance(parsed_sentiment, dict) and "sentiment" in parsed_sentiment:
                 return {
-                    "sentiment": sentiment,
-                    "score": score,
-                    "metadata": {"parsing_method": "fallback"}
+                    "sentiment": parsed_sentiment["sentiment"],
+                    "score": parsed_sentiment.get("score", 0.5),
+                    "metadata": {}
                 }
-                
-        except Exception as e:
-            self.logger.error(f"Sentiment analysis failed: {e}", exc_info=True)
-            return {"sentiment": "neutral", "score": 0.5}
+            else:
+                return {"sentiment": "neutral", "score": 0.5}
+        except json.JSONDecodeError:
+            # Fallback parsing for non-JSON output
+            sentiment = "neutral"
+            score = 0.5
+            
+            if "positive" in sentiment_result.lower():
+                sentiment = "positive"
+                score = 0.8
+            elif "negative" in sentiment_result.lower():
+                sentiment = "negative"
+                score = 0.2
+            
+            return {
+                "sentiment": sentiment,
+                "score": score,
+                "metadata": {"parsing_method": "fallback"}
+            }
     
     async def _determine_actions(
         self,
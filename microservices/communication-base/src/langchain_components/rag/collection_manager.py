@@ -25,6 +25,7 @@ class CollectionManager:
         self.logger = logging.getLogger(__name__)
         self.collections = {}
         self.retrievers = {}
+        self.update_listeners = []
     
     async def initialize_collections(self, bot_type: str):
         """
@@ -252,11 +253,37 @@ class CollectionManager:
                 collection.persist()
             
             self.logger.info(f"Added {len(documents)} documents to {collection_name} for {bot_type}")
+            self._notify_update_listeners(bot_type, collection_name)
             return True
             
         except Exception as e:
             self.logger.error(f"Error adding documents to {collection_name}: {e}")
             return False
+    
+    def add_update_listener(self, listener) -> None:
+        """
+        Register a callback invoked as ``listener(bot_type, collection_name)``
+        after documents are added to a collection.
+        
+        Args:
+            listener: Callback to register
+        """
+        if listener not in self.update_listeners:
+            self.update_listeners.append(listener)
+    
+    def _notify_update_listeners(self, bot_type: str, collection_name: str) -> None:
+        """
+        Notify update listeners about a collection change.
+        
+        Args:
+            bot_type: The type of bot
+            collection_name: The name of the collection
+        """
+        for listener in self.update_listeners:
+            try:
+                listener(bot_type, collection_name)
+            except Exception as e:
+                self.logger.warning(f"Collection update listener failed: {e}")
 
 # Global instance
 collection_manager = CollectionManager() 
\ No newline at end of file
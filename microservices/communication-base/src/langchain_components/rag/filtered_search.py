@@ -0,0 +1,438 @@
+"""
+Filter-aware vector search.
+
+This module provides metadata-filtered similarity search for the vector store
+service. Filtering happens before or inside the search instead of after it,
+so filtered queries return up to ``k`` matching documents without over-fetch
+multipliers:
+
+- FAISS stores get a metadata index mapping each (key, value) pair to index
+  positions. Small candidate sets are scored exactly, filters matching a
+  large share of the store use an unrestricted search over-fetching by the
+  inverse of that share, and the rest are searched with an ID selector
+  restricting the ANN search to the candidates.
+- Chroma and Pinecone stores get the filters pushed down to the backend.
+
+Maximal marginal relevance search re-ranks the best filtered candidates for
+diversity, as the unfiltered MMR retriever does.
+"""
+
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from langchain.schema import Document
+from langchain.vectorstores.utils import maximal_marginal_relevance
+
+
+def matches_filters(metadata: Optional[Dict[str, Any]], filters: Dict[str, Any]) -> bool:
+    """
+    Check whether metadata equals every filter value.
+
+    Args:
+        metadata: Document metadata
+        filters: Required metadata values
+
+    Returns:
+        True if all filters match
+    """
+    if not metadata:
+        return False
+    for key, value in filters.items():
+        if key not in metadata or metadata[key] != value:
+            return False
+    return True
+
+
+def to_chroma_where(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert equality filters to a Chroma ``where`` clause.
+
+    Args:
+        filters: Required metadata values
+
+    Returns:
+        ``where`` clause (``$and`` of equalities for several keys)
+    """
+    clauses = [{key: {"$eq": value}} for key, value in filters.items()]
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+class MetadataIndex:
+    """
+    Inverted index from metadata (key, value) pairs to FAISS index positions.
+
+    Positions are appended as the store grows; a store that shrank (deleted
+    documents are compacted, shifting positions) is re-indexed from scratch.
+    Searches run on executor threads, so callers hold ``lock`` while syncing
+    and reading the index.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Whether the index was built; until then it covers no positions
+        self.built = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self.postings: Dict[Tuple[str, Hashable], Set[int]] = {}
+        # Positions holding an unhashable value for a key, matched by scanning
+        self.unhashable: Dict[str, List[int]] = {}
+        self.indexed = 0
+
+    def sync(self, store: Any, rebuild: bool = False) -> int:
+        """
+        Index positions added to the store since the last sync.
+
+        Args:
+            store: FAISS vector store
+            rebuild: Re-index every position (e.g. after deletions)
+
+        Returns:
+            Number of positions indexed
+        """
+        total = len(store.index_to_docstore_id)
+        if rebuild or total < self.indexed:
+            self._reset()
+        start = self.indexed
+        for position in range(start, total):
+            doc = store.docstore.search(store.index_to_docstore_id[position])
+            metadata = getattr(doc, "metadata", None) or {}
+            for key, value in metadata.items():
+                try:
+                    self.postings.setdefault((key, value), set()).add(position)
+                except TypeError:
+                    self.unhashable.setdefault(key, []).append(position)
+        self.indexed = total
+        self.built = True
+        return total - start
+
+    def candidates(self, store: Any, filters: Dict[str, Any]) -> Set[int]:
+        """
+        Get the positions whose documents match all filters.
+
+        Args:
+            store: FAISS vector store the index was built from
+            filters: Required metadata values
+
+        Returns:
+            Matching index positions
+        """
+        sets = []
+        for key, value in filters.items():
+            try:
+                positions = self.postings.get((key, value), set())
+            except TypeError:
+                positions = {
+                    position for position in self.unhashable.get(key, [])
+                    if self._metadata(store, position).get(key) == value
+                }
+            if not positions:
+                return set()
+            sets.append(positions)
+
+        sets.sort(key=len)
+        result = set(sets[0])
+        for positions in sets[1:]:
+            result &= positions
+        return result
+
+    @staticmethod
+    def _metadata(store: Any, position: int) -> Dict[str, Any]:
+        doc = store.docstore.search(store.index_to_docstore_id[position])
+        return getattr(doc, "metadata", None) or {}
+
+
+class FilteredSearch:
+    """
+    Metadata-filtered similarity search over vector stores.
+
+    Metadata indexes are held weakly per store, so evicted stores release
+    their index too. A store's index is built by its first filtered search
+    and afterwards only updated by ``refresh``: whoever mutates a store calls
+    it before searches resume, so a search never indexes a store that is
+    being written.
+    """
+
+    def __init__(self, exact_scan_max: int = 4096, dense_fraction: float = 0.05, overfetch_factor: int = 2):
+        """
+        Initialize filtered search.
+
+        Args:
+            exact_scan_max: Largest candidate set scored by exact scan; larger
+                sets use a filtered ANN search
+            dense_fraction: Share of the store above which candidates are
+                found by over-fetching an unrestricted search instead
+            overfetch_factor: Extra over-fetch multiplier on top of the
+                inverse candidate share
+        """
+        self.exact_scan_max = exact_scan_max
+        self.dense_fraction = dense_fraction
+        self.overfetch_factor = overfetch_factor
+        self.logger = logging.getLogger(__name__)
+
+        self._indexes: "weakref.WeakKeyDictionary[Any, MetadataIndex]" = weakref.WeakKeyDictionary()
+        self._indexes_lock = threading.Lock()
+        self.metrics: Dict[str, int] = {
+            "searches": 0,
+            "mmr_searches": 0,
+            "exact_scans": 0,
+            "filtered_ann": 0,
+            "overfetch_searches": 0,
+            "pushdowns": 0,
+            "empty_candidates": 0,
+            "positions_indexed": 0,
+        }
+
+    def supports(self, store: Any) -> bool:
+        """
+        Check whether a store has a filter-aware search path.
+
+        Args:
+            store: Vector store
+
+        Returns:
+            True if ``search`` can handle the store
+        """
+        return self._is_faiss(store) or self._backend(store) in ("chroma", "pinecone")
+
+    def search(self, store: Any, query: str, k: int, filters: Dict[str, Any]) -> List[Tuple[Document, float]]:
+        """
+        Search a store for the documents most similar to a query among those
+        matching the filters.
+
+        Args:
+            store: Vector store
+            query: Query text
+            k: Number of documents to return
+            filters: Required metadata values
+
+        Returns:
+            (document, score) pairs, best first
+        """
+        self.metrics["searches"] += 1
+
+        if self._is_faiss(store):
+            return self._search_faiss(store, query, k, filters)
+
+        self.metrics["pushdowns"] += 1
+        backend_filter = to_chroma_where(filters) if self._backend(store) == "chroma" else filters
+        return store.similarity_search_with_score(query, k=k, filter=backend_filter)
+
+    def max_marginal_relevance_search(
+        self,
+        store: Any,
+        query: str,
+        k: int,
+        filters: Dict[str, Any],
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5
+    ) -> List[Document]:
+        """
+        Select documents matching the filters by maximal marginal relevance.
+
+        The ``fetch_k`` most similar matching documents are re-ranked to
+        balance similarity to the query against diversity.
+
+        Args:
+            store: Vector store
+            query: Query text
+            k: Number of documents to return
+            filters: Required metadata values
+            fetch_k: Number of matching documents to re-rank
+            lambda_mult: Trade-off between similarity (1) and diversity (0)
+
+        Returns:
+            Selected documents, in selection order
+        """
+        self.metrics["searches"] += 1
+        self.metrics["mmr_searches"] += 1
+
+        if not self._is_faiss(store):
+            self.metrics["pushdowns"] += 1
+            backend_filter = to_chroma_where(filters) if self._backend(store) == "chroma" else filters
+            return store.max_marginal_relevance_search(
+                query, k=k, fetch_k=fetch_k, lambda_mult=lambda_mult, filter=backend_filter
+            )
+
+        vector, hits = self._search_faiss_positions(store, query, max(k, fetch_k), filters)
+        if not hits:
+            return []
+        try:
+            vectors = store.index.reconstruct_batch(np.array([position for position, _ in hits], dtype=np.int64))
+        except RuntimeError:
+            # Vectors are not recoverable from this index; keep similarity order
+            return [doc for doc, _ in self._to_documents(store, hits[:k])]
+
+        selected = maximal_marginal_relevance(vector, vectors, lambda_mult=lambda_mult, k=k)
+        return [doc for doc, _ in self._to_documents(store, [hits[i] for i in selected])]
+
+    def refresh(self, store: Any, rebuild: bool = False) -> None:
+        """
+        Bring the metadata index of a mutated store up to date.
+
+        Call it after writing to the store and before searches on it resume.
+        Stores without an index yet are left alone; their first filtered
+        search builds one.
+
+        Args:
+            store: Vector store
+            rebuild: Re-index from scratch (required after deletions)
+        """
+        with self._indexes_lock:
+            index = self._indexes.get(store)
+        if index is None:
+            return
+        with index.lock:
+            self.metrics["positions_indexed"] += index.sync(store, rebuild=rebuild)
+
+    def invalidate(self, store: Any) -> None:
+        """
+        Drop the metadata index of a store, e.g. after documents were deleted.
+
+        Args:
+            store: Vector store
+        """
+        with self._indexes_lock:
+            self._indexes.pop(store, None)
+
+    def get_metrics(self) -> Dict[str, int]:
+        """
+        Get search strategy counters.
+
+        Returns:
+            Dictionary of metrics
+        """
+        return dict(self.metrics)
+
+    def _search_faiss(self, store: Any, query: str, k: int, filters: Dict[str, Any]) -> List[Tuple[Document, float]]:
+        _, hits = self._search_faiss_positions(store, query, k, filters)
+        return self._to_documents(store, hits)
+
+    def _candidates(self, store: Any, filters: Dict[str, Any]) -> Set[int]:
+        """Look up the matching positions, building the store's index on first use."""
+        with self._indexes_lock:
+            index = self._indexes.get(store)
+            if index is None:
+                index = self._indexes[store] = MetadataIndex()
+        with index.lock:
+            if not index.built:
+                self.metrics["positions_indexed"] += index.sync(store)
+            return index.candidates(store, filters)
+
+    def _search_faiss_positions(
+        self,
+        store: Any,
+        query: str,
+        k: int,
+        filters: Dict[str, Any]
+    ) -> Tuple[Optional[np.ndarray], List[Tuple[int, float]]]:
+        """Find the k best matching positions; returns the query vector too."""
+        candidates = self._candidates(store, filters)
+        if not candidates:
+            self.metrics["empty_candidates"] += 1
+            return None, []
+
+        vector = self._embed_query(store, query)
+        positions = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+
+        if len(positions) <= self.exact_scan_max:
+            hits = self._exact_scan(store, vector, positions, k)
+            if hits is not None:
+                self.metrics["exact_scans"] += 1
+                return vector, hits
+
+        fraction = len(positions) / max(store.index.ntotal, 1)
+        if fraction < self.dense_fraction:
+            hits = self._selector_search(store, vector, positions, k)
+            if hits is not None:
+                self.metrics["filtered_ann"] += 1
+                return vector, hits
+
+        self.metrics["overfetch_searches"] += 1
+        return vector, self._overfetch_search(store, vector, candidates, k, fraction)
+
+    def _exact_scan(
+        self,
+        store: Any,
+        vector: np.ndarray,
+        positions: np.ndarray,
+        k: int
+    ) -> Optional[List[Tuple[int, float]]]:
+        """Score every candidate; None if the index cannot reconstruct vectors."""
+        import faiss
+
+        try:
+            vectors = store.index.reconstruct_batch(positions)
+        except RuntimeError:
+            return None
+
+        if store.index.metric_type == faiss.METRIC_INNER_PRODUCT:
+            scores = vectors @ vector
+            order = np.argsort(-scores)[:k]
+        else:
+            scores = ((vectors - vector) ** 2).sum(axis=1)
+            order = np.argsort(scores)[:k]
+        return [(int(positions[i]), float(scores[i])) for i in order]
+
+    def _selector_search(
+        self,
+        store: Any,
+        vector: np.ndarray,
+        positions: np.ndarray,
+        k: int
+    ) -> Optional[List[Tuple[int, float]]]:
+        """ANN search restricted to the candidates; None if unsupported."""
+        import faiss
+
+        try:
+            params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(positions))
+            scores, indices = store.index.search(vector.reshape(1, -1), min(k, len(positions)), params=params)
+        except (AttributeError, RuntimeError, TypeError):
+            return None
+        return [(int(i), float(s)) for s, i in zip(scores[0], indices[0]) if i != -1]
+
+    def _overfetch_search(
+        self,
+        store: Any,
+        vector: np.ndarray,
+        candidates: Set[int],
+        k: int,
+        fraction: float
+    ) -> List[Tuple[int, float]]:
+        """Unrestricted search with a growing fetch size, keeping candidates."""
+        total = store.index.ntotal
+        fetch = min(total, int(k * self.overfetch_factor / fraction) + 1)
+        while True:
+            scores, indices = store.index.search(vector.reshape(1, -1), fetch)
+            hits = [(int(i), float(s)) for s, i in zip(scores[0], indices[0]) if i in candidates]
+            if len(hits) >= k or fetch >= total:
+                return hits[:k]
+            fetch = min(total, fetch * 2)
+
+    @staticmethod
+    def _embed_query(store: Any, query: str) -> np.ndarray:
+        import faiss
+
+        embed = getattr(store, "_embed_query", None) or store.embedding_function
+        if hasattr(embed, "embed_query"):
+            embed = embed.embed_query
+        vector = np.array([embed(query)], dtype=np.float32)
+        if getattr(store, "_normalize_L2", False):
+            faiss.normalize_L2(vector)
+        return vector[0]
+
+    @staticmethod
+    def _to_documents(store: Any, hits: List[Tuple[int, float]]) -> List[Tuple[Document, float]]:
+        return [(store.docstore.search(store.index_to_docstore_id[position]), score) for position, score in hits]
+
+    @staticmethod
+    def _is_faiss(store: Any) -> bool:
+        return all(hasattr(store, attr) for attr in ("index", "docstore", "index_to_docstore_id"))
+
+    @staticmethod
+    def _backend(store: Any) -> str:
+        return type(store).__name__.lower()
@@ -0,0 +1,181 @@
+"""
+Async memoization cache with request coalescing.
+
+This module provides a bounded LRU cache with a TTL for the results of
+expensive coroutines (LLM calls, remote lookups). Concurrent requests for a
+key that is already being computed wait for the in-flight computation instead
+of starting their own.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class AsyncMemoCache:
+    """
+    Bounded LRU + TTL cache for coroutine results with single-flight loading.
+
+    Failed computations are never cached; their exception is propagated to
+    every coalesced caller.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 600.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results (LRU eviction)
+            ttl_seconds: Lifetime of a cached result
+            clock: Monotonic time source
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+        self.metrics: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "uncached": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Get a live cached value without computing it.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (found, value)
+        """
+        item = self._entries.get(key)
+        if item is None:
+            return False, None
+        stored_at, value = item
+        if self.clock() - stored_at >= self.ttl_seconds:
+            del self._entries[key]
+            self.metrics["expirations"] += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entries if needed.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self._entries[key] = (self.clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        should_cache: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Return the cached value for a key, computing it at most once.
+
+        Args:
+            key: Cache key
+            factory: Coroutine function producing the value on a miss
+            should_cache: Predicate deciding whether a computed value is
+                stored (e.g. to skip degraded fallback results)
+
+        Returns:
+            Cached or freshly computed value
+        """
+        while True:
+            found, value = self.get(key)
+            if found:
+                self.metrics["hits"] += 1
+                return value
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+
+            self.metrics["coalesced"] += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # Retry only if the leader was cancelled, not this caller
+                if not inflight.cancelled():
+                    raise
+
+        self.metrics["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an uncoalesced failure does not warn at GC
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        if should_cache is None or should_cache(value):
+            self.set(key, value)
+        else:
+            self.metrics["uncached"] += 1
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drop one cached value, or all of them.
+
+        Args:
+            key: Key to drop (None for all)
+        """
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get cache counters and the hit ratio.
+
+        Coalesced requests count as hits since they skip the computation.
+
+        Returns:
+            Dictionary of metrics
+        """
+        served = self.metrics["hits"] + self.metrics["coalesced"]
+        requests = served + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hit_ratio": served / requests if requests else 0.0,
+        }
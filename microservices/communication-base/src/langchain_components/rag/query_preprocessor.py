@@ -5,6 +5,7 @@ This module provides functionality to analyze query intent and reformulate queri
 for optimal retrieval, and extract key parameters for effective RAG operations.
 """
 
+import asyncio
 import logging
 import re
 from typing import Dict, Any, List, Optional, Tuple
@@ -16,6 +17,19 @@ from pydantic import BaseModel, Field
 
 from src.config.config_inheritance import ConfigInheritance
 from src.langchain_components.nlp.hybrid_processor import hybrid_processor
+from src.langchain_components.rag.memo_cache import AsyncMemoCache
+from src.langchain_components.rag.result_cache import normalize_query
+
+# Rule-based intent keywords, checked in order
+INTENT_RULES = [
+    ("procedural", ("how to", "how do i", "steps", "process", "procedure")),
+    ("clarification", ("what does", "what is", "explain", "clarify", "mean")),
+    ("comparison", ("versus", "vs", "compare", "difference", "better")),
+]
+
+# Explanations of the fallback reformulations returned after an error
+REFORMULATION_ERROR = "Failed to reformulate query due to an error."
+PREPROCESSING_ERROR = "Fallback due to preprocessing error."
 
 class QueryIntent(BaseModel):
     """
@@ -47,18 +61,39 @@ class QueryPreprocessor:
     1. Analyze query intent to determine appropriate RAG systems
     2. Reformulate queries for optimal retrieval from each system
     3. Extract key parameters and constraints from queries
+    
+    Results are memoized per normalized query and bot type, and short queries
+    that the intent rules classify confidently skip the LLM entirely.
     """
     
-    def __init__(self, llm: Optional[BaseLLM] = None):
+    def __init__(
+        self,
+        llm: Optional[BaseLLM] = None,
+        cache_size: int = 2048,
+        cache_ttl_seconds: float = 900.0,
+        fast_path_max_words: int = 4
+    ):
         """
         Initialize the query preprocessor.
         
         Args:
             llm: Language model for advanced reformulation (optional)
+            cache_size: Maximum number of memoized preprocessing results
+                (0 to disable memoization)
+            cache_ttl_seconds: Lifetime of a memoized result
+            fast_path_max_words: Longest query (in words) eligible for the
+                rule-based fast path (0 to disable)
         """
         self.llm = llm
         self.config_inheritance = ConfigInheritance()
         self.logger = logging.getLogger(__name__)
+        self.fast_path_max_words = fast_path_max_words
+        
+        # Memoized intents and preprocessing results, with request coalescing
+        self.cache = (
+            AsyncMemoCache(max_entries=cache_size, ttl_seconds=cache_ttl_seconds)
+            if cache_size > 0 else None
+        )
         
         # Initialize output parsers
         self.intent_parser = PydanticOutputParser(pydantic_object=QueryIntent)
@@ -106,15 +141,35 @@ class QueryPreprocessor:
         Returns:
             Query intent analysis
         """
+        if self.cache is None:
+            return await self._analyze_intent(query, bot_type)
+        return await self.cache.get_or_compute(
+            ("intent", bot_type, normalize_query(query)),
+            lambda: self._analyze_intent(query, bot_type),
+            should_cache=self._is_cacheable_intent
+        )
+    
+    async def _analyze_intent(self, query: str, bot_type: str) -> QueryIntent:
+        """
+        Analyze the intent of a query without memoization.
+        
+        Args:
+            query: User query
+            bot_type: Type of bot
+            
+        Returns:
+            Query intent analysis
+        """
+        entities = []
         try:
             # First, use hybrid processor to extract entities
             nlp_results = await hybrid_processor.process_text(query, bot_type)
             entities = nlp_results.get("entities", [])
             
             # If we have an LLM, use it for more sophisticated intent analysis
-            if self.llm:
+            if self.llm and not self._is_fast_path(query):
                 intent_prompt = self.intent_prompt.format(query=query)
-                intent_raw = self.llm.predict(intent_prompt)
+                intent_raw = await self._predict(intent_prompt)
                 
                 try:
                     intent = self.intent_parser.parse(intent_raw)
@@ -151,25 +206,10 @@ class QueryPreprocessor:
         query_lower = query.lower()
         
         # Default intent is informational
-        primary_intent = "informational"
+        primary_intent = self._match_intent_rule(query_lower) or "informational"
         secondary_intents = []
-        question_type = "informational"
-        
-        # Check for procedural intent
-        if any(kw in query_lower for kw in ["how to", "how do i", "steps", "process", "procedure"]):
-            primary_intent = "procedural"
-            question_type = "procedural"
-        
-        # Check for clarification intent
-        elif any(kw in query_lower for kw in ["what does", "what is", "explain", "clarify", "mean"]):
-            primary_intent = "clarification"
-            question_type = "clarification"
+        question_type = primary_intent
         
-        # Check for comparison intent
-        elif any(kw in query_lower for kw in ["versus", "vs", "compare", "difference", "better"]):
-            primary_intent = "comparison"
-            question_type = "comparison"
-            
         # Extract parameters
         parameters = {}
         
@@ -191,6 +231,70 @@ class QueryPreprocessor:
             keywords=keywords
         )
     
+    @staticmethod
+    def _match_intent_rule(query_lower: str) -> Optional[str]:
+        """
+        Match a query against the rule-based intent keywords.
+        
+        Args:
+            query_lower: Lowercased user query
+            
+        Returns:
+            Matched intent, or None if no rule applies
+        """
+        for intent, keywords in INTENT_RULES:
+            if any(kw in query_lower for kw in keywords):
+                return intent
+        return None
+    
+    def _is_fast_path(self, query: str) -> bool:
+        """
+        Check whether a query is simple enough to skip the LLM.
+        
+        Only short queries that an intent rule matches qualify; short
+        queries no rule recognizes still go through the LLM.
+        
+        Args:
+            query: User query
+            
+        Returns:
+            True if rule-based analysis is sufficient
+        """
+        word_count = len(query.split())
+        if not word_count or word_count > self.fast_path_max_words:
+            return False
+        return self._match_intent_rule(query.lower()) is not None
+    
+    @staticmethod
+    def _is_cacheable_intent(intent: QueryIntent) -> bool:
+        """Skip caching the degraded intent returned after an error."""
+        return intent.primary_intent != "unknown"
+    
+    @classmethod
+    def _is_cacheable_result(cls, result: Dict[str, Any]) -> bool:
+        """Skip caching preprocessing results where any step fell back after an error."""
+        if result["intent"] is None or not cls._is_cacheable_intent(result["intent"]):
+            return False
+        return not any(
+            reformulation.explanation in (REFORMULATION_ERROR, PREPROCESSING_ERROR)
+            for reformulation in result["reformulations"].values()
+        )
+    
+    async def _predict(self, prompt: str) -> str:
+        """
+        Run the LLM without blocking the event loop.
+        
+        Args:
+            prompt: Formatted prompt
+            
+        Returns:
+            Raw LLM output
+        """
+        if hasattr(self.llm, "apredict"):
+            return await self.llm.apredict(prompt)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.llm.predict, prompt)
+    
     async def reformulate_query(
         self, 
         query: str, 
@@ -220,13 +324,13 @@ class QueryPreprocessor:
             rag_config = config.get("chain_config", {}).get("retrieval", {})
             
             # If we have an LLM, use it for sophisticated reformulation
-            if self.llm:
+            if self.llm and not self._is_fast_path(query):
                 reformulation_prompt = self.reformulation_prompt.format(
                     query=query,
                     rag_system=rag_system,
                     intent=intent.json()
                 )
-                reformulation_raw = self.llm.predict(reformulation_prompt)
+                reformulation_raw = await self._predict(reformulation_prompt)
                 
                 try:
                     return self.reformulation_parser.parse(reformulation_raw)
@@ -244,7 +348,7 @@ class QueryPreprocessor:
                 original_query=query,
                 reformulated_query=query,  # No reformulation
                 rag_system=rag_system,
-                explanation="Failed to reformulate query due to an error."
+                explanation=REFORMULATION_ERROR
             )
     
     def _basic_reformulation(
@@ -401,6 +505,27 @@ class QueryPreprocessor:
         2. Determines which RAG systems to use
         3. Reformulates the query for each selected system
         
+        Args:
+            query: User query
+            bot_type: Type of bot
+            
+        Returns:
+            Dictionary with preprocessing results (cached results are shared,
+            so treat the intent and reformulations as read-only)
+        """
+        if self.cache is None:
+            return await self._preprocess_query(query, bot_type)
+        result = await self.cache.get_or_compute(
+            ("preprocess", bot_type, normalize_query(query)),
+            lambda: self._preprocess_query(query, bot_type),
+            should_cache=self._is_cacheable_result
+        )
+        return {**result, "original_query": query}
+    
+    async def _preprocess_query(self, query: str, bot_type: str) -> Dict[str, Any]:
+        """
+        Preprocess a query for RAG retrieval without memoization.
+        
         Args:
             query: User query
             bot_type: Type of bot
@@ -440,11 +565,41 @@ class QueryPreprocessor:
                         original_query=query,
                         reformulated_query=query,
                         rag_system="vector_store",
-                        explanation="Fallback due to preprocessing error."
+                        explanation=PREPROCESSING_ERROR
                     )
                 }
             }
-
+    
+    async def process_query(
+        self,
+        query: str,
+        bot_type: str,
+        session_id: Optional[str] = None
+    ) -> str:
+        """
+        Get the retrieval query used by the RAG coordinator.
+        
+        Args:
+            query: User query
+            bot_type: Type of bot
+            session_id: Session identifier (unused, accepted for the
+                coordinator interface)
+            
+        Returns:
+            Vector store reformulation of the query, or the query itself
+        """
+        result = await self.preprocess_query(query, bot_type)
+        reformulation = result["reformulations"].get("vector_store")
+        return reformulation.reformulated_query if reformulation else query
+    
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        """
+        Get hit-ratio metrics for the preprocessing cache.
+        
+        Returns:
+            Dictionary of cache metrics
+        """
+        return self.cache.get_metrics() if self.cache else {}
 
 # Create singleton instance
 query_preprocessor = QueryPreprocessor() 
\ No newline at end of file
@@ -14,6 +14,9 @@ from langchain.vectorstores import VectorStore
 from langchain.retrievers import ContextualCompressionRetriever
 from langchain.retrievers.document_compressors import DocumentCompressor
 
+from src.langchain_components.rag.collection_manager import collection_manager as shared_collection_manager
+from src.langchain_components.rag.result_cache import RAGResultCache
+
 class RAGCoordinator:
     """
     RAG coordinator for managing and orchestrating retrieval augmented generation.
@@ -32,7 +35,9 @@ class RAGCoordinator:
         database_rag: Any = None,
         query_preprocessor: Any = None,
         relevance_scorer: Any = None,
-        reranker: Any = None
+        reranker: Any = None,
+        result_cache: Optional[RAGResultCache] = None,
+        collection_manager: Any = None
     ):
         """
         Initialize RAG coordinator.
@@ -46,6 +51,15 @@ class RAGCoordinator:
             query_preprocessor: Preprocessor for query optimization
             relevance_scorer: Scorer for assessing document relevance
             reranker: Reranker for optimizing document order
+            result_cache: Cache for retrieval results. Caching is off unless
+                a cache is passed; pass one with an embedding function to
+                also reuse results of near-duplicate queries. Cached results
+                are dropped when the vector store service or collection
+                manager report a collection update, and can be turned off
+                per bot with ``rag.cache_results``.
+            collection_manager: Collection manager whose updates invalidate
+                cached results (defaults to the shared instance used by the
+                vector store RAG)
         """
         self.config_integration = config_integration
         self.llm_manager = llm_manager
@@ -59,6 +73,11 @@ class RAGCoordinator:
         
         # Cache for retrievers
         self.retrievers: Dict[str, Any] = {}
+        
+        # Cache for retrieval results, dropped when collections change
+        self.result_cache = result_cache
+        self.watch_collection_updates(vector_store_rag)
+        self.watch_collection_updates(collection_manager or shared_collection_manager)
     
     async def retrieve_relevant(
         self,
@@ -88,6 +107,17 @@ class RAGCoordinator:
         # Get RAG configuration for this bot type
         rag_config = self._get_rag_config(bot_type)
         
+        # Serve repeated and near-duplicate queries from the result cache
+        cache_lookup = None
+        if self.result_cache is not None and rag_config.get("cache_results", True):
+            cache_scope = self.result_cache.make_scope(bot_type, user_id, filters, sources, limit)
+            try:
+                cache_lookup = await self.result_cache.lookup(query, cache_scope)
+            except Exception as e:
+                self.logger.warning(f"Result cache lookup failed: {e}")
+            if cache_lookup is not None and cache_lookup.documents is not None:
+                return cache_lookup.documents
+        
         # Process query if preprocessor available
         processed_query = query
         if self.query_preprocessor:
@@ -179,7 +209,12 @@ class RAGCoordinator:
                 self.logger.warning(f"Reranking failed: {e}")
         
         # Limit the number of documents
-        return all_documents[:limit]
+        documents = all_documents[:limit]
+        
+        if cache_lookup is not None:
+            self.result_cache.store(cache_lookup, cache_scope, documents)
+        
+        return documents
     
     def get_langchain_retriever(
         self,
@@ -419,6 +454,7 @@ class RAGCoordinator:
         default_config = {
             "sources": ["vector_store", "user_details", "database"],
             "use_compression": False,
+            "cache_results": True,
             "user_details_limit": 3,
             "vector_store_limit": 5,
             "database_limit": 3,
@@ -456,4 +492,41 @@ class RAGCoordinator:
         """
         if cache_key in self.retrievers:
             del self.retrievers[cache_key]
-            self.logger.info(f"Retriever {cache_key} invalidated in cache") 
\ No newline at end of file
+            self.logger.info(f"Retriever {cache_key} invalidated in cache") 
+    
+    def watch_collection_updates(self, source: Any) -> None:
+        """
+        Invalidate cached results whenever a source reports a collection update.
+        
+        Args:
+            source: Component exposing ``add_update_listener`` (e.g. the
+                vector store service or collection manager)
+        """
+        if source is not None and hasattr(source, "add_update_listener"):
+            source.add_update_listener(self.invalidate_result_cache)
+    
+    def invalidate_result_cache(
+        self,
+        bot_type: Optional[str] = None,
+        collection_name: Optional[str] = None
+    ) -> None:
+        """
+        Invalidate cached retrieval results.
+        
+        Args:
+            bot_type: Bot type whose results to drop (None for all)
+            collection_name: Updated collection, if known
+        """
+        if self.result_cache is not None:
+            self.result_cache.invalidate(bot_type, collection_name)
+    
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        """
+        Get hit-ratio metrics for the result cache.
+        
+        Returns:
+            Dictionary of cache metrics (empty when caching is off)
+        """
+        if self.result_cache is None:
+            return {}
+        return self.result_cache.get_metrics()
@@ -0,0 +1,349 @@
+"""
+Two-level result cache for RAG retrieval.
+
+This module provides the result cache used by the RAG coordinator. The first
+level is an exact cache keyed by the normalized query and the retrieval scope
+(bot type, user, filters, sources and limit). The second level is semantic:
+when a query misses the first level, its embedding is compared against recent
+cached queries in the same scope and a sufficiently similar one is reused.
+
+Entries expire after a TTL and are dropped when a collection of their bot type
+is updated.
+"""
+
+import inspect
+import json
+import logging
+import math
+import re
+import time
+from collections import OrderedDict
+from operator import mul
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+Scope = Tuple[Any, ...]
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = re.compile(r"^[\s\W_]+|[\s\W_]+$")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for exact cache lookups.
+
+    Case, repeated whitespace and leading/trailing punctuation are ignored,
+    so "What is the price?" and "what is the  price" share an entry.
+
+    Args:
+        query: Raw user query
+
+    Returns:
+        Normalized query
+    """
+    return _EDGE_PUNCTUATION.sub("", _WHITESPACE.sub(" ", query.lower()))
+
+
+def _unit_vector(vector: Sequence[float]) -> Optional[Tuple[float, ...]]:
+    norm = math.sqrt(sum(map(mul, vector, vector)))
+    if not norm:
+        return None
+    return tuple(value / norm for value in vector)
+
+
+class CacheLookup(NamedTuple):
+    """Outcome of a cache lookup, reused when storing the fresh result."""
+
+    documents: Optional[List[Any]]
+    level: Optional[str]
+    normalized_query: str
+    embedding: Optional[Tuple[float, ...]]
+    generation: int
+
+
+class _CacheEntry:
+    """A cached retrieval result."""
+
+    __slots__ = ("documents", "scope", "created_at", "embedding")
+
+    def __init__(self, documents: List[Any], scope: Scope, created_at: float,
+                 embedding: Optional[Tuple[float, ...]]):
+        self.documents = documents
+        self.scope = scope
+        self.created_at = created_at
+        self.embedding = embedding
+
+
+class RAGResultCache:
+    """
+    Exact + semantic cache for retrieval results.
+
+    Exact entries live in one LRU map keyed by (scope, normalized query).
+    Entries that carry an embedding are also indexed per scope for the
+    semantic level, which scans only the most recent candidates of the
+    query's own scope so results never leak across users or filters.
+    """
+
+    def __init__(
+        self,
+        embedding_function: Any = None,
+        max_entries: int = 2048,
+        ttl_seconds: float = 300.0,
+        semantic_ttl_seconds: Optional[float] = None,
+        similarity_threshold: float = 0.95,
+        max_semantic_candidates: int = 128,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the result cache.
+
+        Args:
+            embedding_function: Embeddings instance (``aembed_query`` or
+                ``embed_query``) or a sync/async callable mapping a query to a
+                vector. The semantic level is disabled without one.
+            max_entries: Maximum number of exact entries kept (LRU eviction)
+            ttl_seconds: Lifetime of an entry for exact hits
+            semantic_ttl_seconds: Lifetime of an entry for semantic hits
+                (defaults to ``ttl_seconds``)
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            max_semantic_candidates: Most recent entries per scope compared on
+                a semantic lookup
+            clock: Monotonic time source
+        """
+        self.embedding_function = embedding_function
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.semantic_ttl_seconds = ttl_seconds if semantic_ttl_seconds is None else semantic_ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.max_semantic_candidates = max_semantic_candidates
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self._entries: "OrderedDict[Tuple[Scope, str], _CacheEntry]" = OrderedDict()
+        self._semantic: Dict[Scope, "OrderedDict[str, _CacheEntry]"] = {}
+        self._generations: Dict[str, int] = {}
+        self._global_generation = 0
+
+        self.metrics: Dict[str, int] = {
+            "lookups": 0,
+            "exact_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "stale_stores": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+            "embedding_failures": 0,
+        }
+
+    @property
+    def semantic_enabled(self) -> bool:
+        """Whether the semantic level is active."""
+        return self.embedding_function is not None
+
+    @staticmethod
+    def make_scope(
+        bot_type: str,
+        user_id: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        sources: Optional[Sequence[str]] = None,
+        limit: int = 5
+    ) -> Scope:
+        """
+        Build the scope part of a cache key.
+
+        Args:
+            bot_type: Type of bot
+            user_id: User identifier
+            filters: Retrieval filters
+            sources: Retrieval sources
+            limit: Maximum number of documents
+
+        Returns:
+            Hashable scope tuple (bot type first)
+        """
+        filters_key = json.dumps(filters, sort_keys=True, default=str) if filters else ""
+        sources_key = tuple(sorted(sources)) if sources else ()
+        return (bot_type, user_id, filters_key, sources_key, limit)
+
+    def _generation(self, bot_type: str) -> int:
+        return self._global_generation + self._generations.get(bot_type, 0)
+
+    async def lookup(self, query: str, scope: Scope) -> CacheLookup:
+        """
+        Look up a query, trying the exact level then the semantic level.
+
+        Args:
+            query: Raw user query
+            scope: Scope from ``make_scope``
+
+        Returns:
+            Lookup outcome; ``documents`` is None on a miss
+        """
+        self.metrics["lookups"] += 1
+        normalized = normalize_query(query)
+        generation = self._generation(scope[0])
+        now = self.clock()
+
+        key = (scope, normalized)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now - entry.created_at < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.metrics["exact_hits"] += 1
+                return CacheLookup(list(entry.documents), "exact", normalized, entry.embedding, generation)
+            self._remove(key)
+            self.metrics["expirations"] += 1
+
+        embedding = None
+        if self.semantic_enabled:
+            embedding = await self._embed(normalized)
+            if embedding is not None:
+                match = self._semantic_match(scope, embedding, now)
+                if match is not None:
+                    self.metrics["semantic_hits"] += 1
+                    # Alias the paraphrase so repeats become exact hits
+                    self._insert(key, _CacheEntry(match.documents, scope, match.created_at, None))
+                    return CacheLookup(list(match.documents), "semantic", normalized, embedding, generation)
+
+        self.metrics["misses"] += 1
+        return CacheLookup(None, None, normalized, embedding, generation)
+
+    def store(self, lookup: CacheLookup, scope: Scope, documents: List[Any]) -> bool:
+        """
+        Store a freshly retrieved result for a missed lookup.
+
+        Results are discarded when the scope's bot type was invalidated while
+        they were being retrieved, since they may predate the update.
+
+        Args:
+            lookup: Outcome of the ``lookup`` call for this query
+            scope: Scope used for the lookup
+            documents: Retrieved documents
+
+        Returns:
+            True if the result was cached
+        """
+        if lookup.generation != self._generation(scope[0]):
+            self.metrics["stale_stores"] += 1
+            return False
+
+        entry = _CacheEntry(list(documents), scope, self.clock(), lookup.embedding)
+        self._insert((scope, lookup.normalized_query), entry)
+        self.metrics["stores"] += 1
+        return True
+
+    def invalidate(self, bot_type: Optional[str] = None, collection_name: Optional[str] = None) -> int:
+        """
+        Drop cached results after a collection update.
+
+        Results are not tracked per collection (one result mixes several
+        sources), so every entry of the bot type is dropped.
+
+        Args:
+            bot_type: Bot type whose results to drop (None for all)
+            collection_name: Updated collection, for logging only
+
+        Returns:
+            Number of entries dropped
+        """
+        if bot_type is None:
+            self._global_generation += 1
+            keys = list(self._entries)
+        else:
+            self._generations[bot_type] = self._generations.get(bot_type, 0) + 1
+            keys = [key for key in self._entries if key[0][0] == bot_type]
+
+        for key in keys:
+            self._remove(key)
+        self.metrics["invalidations"] += 1
+
+        target = f"{bot_type or 'all bots'}" + (f"/{collection_name}" if collection_name else "")
+        self.logger.info(f"Invalidated {len(keys)} cached RAG results for {target}")
+        return len(keys)
+
+    def clear(self) -> None:
+        """
+        Drop every cached result.
+        """
+        self.invalidate()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get cache counters and hit ratios.
+
+        Returns:
+            Dictionary of metrics
+        """
+        lookups = self.metrics["lookups"]
+        hits = self.metrics["exact_hits"] + self.metrics["semantic_hits"]
+        return {
+            **self.metrics,
+            "entries": len(self._entries),
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "exact_hit_ratio": self.metrics["exact_hits"] / lookups if lookups else 0.0,
+            "semantic_hit_ratio": self.metrics["semantic_hits"] / lookups if lookups else 0.0,
+        }
+
+    async def _embed(self, text: str) -> Optional[Tuple[float, ...]]:
+        """Embed a query as a unit vector, or None if embedding fails."""
+        function = self.embedding_function
+        try:
+            if hasattr(function, "aembed_query"):
+                vector = await function.aembed_query(text)
+            elif hasattr(function, "embed_query"):
+                vector = function.embed_query(text)
+            else:
+                vector = function(text)
+                if inspect.isawaitable(vector):
+                    vector = await vector
+        except Exception as e:
+            self.metrics["embedding_failures"] += 1
+            self.logger.warning(f"Query embedding for result cache failed: {e}")
+            return None
+        return _unit_vector(vector)
+
+    def _semantic_match(self, scope: Scope, embedding: Tuple[float, ...], now: float) -> Optional[_CacheEntry]:
+        """Find the most similar live entry in the scope above the threshold."""
+        candidates = self._semantic.get(scope)
+        if not candidates:
+            return None
+
+        best, best_score = None, self.similarity_threshold
+        expired = []
+        # Newest first, bounded so lookups stay cheap on busy scopes
+        for count, (normalized, entry) in enumerate(reversed(candidates.items())):
+            if count >= self.max_semantic_candidates:
+                break
+            if now - entry.created_at >= self.semantic_ttl_seconds:
+                expired.append(normalized)
+                continue
+            score = sum(map(mul, embedding, entry.embedding))
+            if score >= best_score:
+                best, best_score = entry, score
+
+        for normalized in expired:
+            if now - candidates[normalized].created_at >= self.ttl_seconds:
+                self._remove((scope, normalized))
+                self.metrics["expirations"] += 1
+        return best
+
+    def _insert(self, key: Tuple[Scope, str], entry: _CacheEntry) -> None:
+        self._remove(key)
+        self._entries[key] = entry
+        if entry.embedding is not None:
+            self._semantic.setdefault(key[0], OrderedDict())[key[1]] = entry
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.metrics["evictions"] += 1
+
+    def _remove(self, key: Tuple[Scope, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None or entry.embedding is None:
+            return
+        scoped = self._semantic.get(key[0])
+        if scoped is not None:
+            scoped.pop(key[1], None)
+            if not scoped:
+                del self._semantic[key[0]]
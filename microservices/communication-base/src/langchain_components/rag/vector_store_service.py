@@ -7,7 +7,9 @@ supporting embeddings, retrieval, and multiple adapters for different vectorstor
 
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional, Union, Tuple
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, List, Optional, Union, Tuple
 import json
 import os
 
@@ -16,6 +18,59 @@ from langchain.embeddings.base import Embeddings
 from langchain.embeddings import OpenAIEmbeddings, HuggingFaceEmbeddings
 from langchain.schema import BaseRetriever, Document
 
+from src.langchain_components.rag.filtered_search import FilteredSearch, matches_filters
+from src.langchain_components.rag.vectorstore_cache import (
+    StoreLoad,
+    VectorStoreCache,
+    path_signature,
+    signature_bytes,
+)
+
+class ReadWriteLock:
+    """
+    Thread lock admitting many readers or a single writer.
+    
+    Waiting writers hold back new readers, so a steady stream of searches
+    cannot starve writes. Not reentrant.
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+    
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Hold the lock shared for the duration of the block."""
+        with self._condition:
+            while self._writing or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+    
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the lock exclusively for the duration of the block."""
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
 class VectorStoreService:
     """
     Vector store service for RAG integration with LangChain.
@@ -30,7 +85,10 @@ class VectorStoreService:
         config_integration: Any = None,
         llm_manager: Any = None,
         embedding_service: Any = None,
-        document_processor: Any = None
+        document_processor: Any = None,
+        max_store_bytes: Optional[int] = None,
+        max_resident_stores: int = 64,
+        exact_scan_max: int = 4096
     ):
         """
         Initialize vector store service.
@@ -40,6 +98,11 @@ class VectorStoreService:
             llm_manager: LLM manager for accessing language models
             embedding_service: Service for generating and managing embeddings
             document_processor: Service for processing and preparing documents
+            max_store_bytes: Byte budget for resident vector stores (None for
+                no limit); least recently used stores are evicted
+            max_resident_stores: Maximum number of resident vector stores
+            exact_scan_max: Largest filtered candidate set scored exactly
+                instead of by a filtered ANN search
         """
         self.config_integration = config_integration
         self.llm_manager = llm_manager
@@ -47,11 +110,32 @@ class VectorStoreService:
         self.document_processor = document_processor
         self.logger = logging.getLogger(__name__)
         
-        # Cache for vectorstores
-        self.vectorstores: Dict[str, Any] = {}
+        # Resident vectorstores keyed by (bot_type, collection_name)
+        self.store_cache = VectorStoreCache(
+            max_bytes=max_store_bytes,
+            max_entries=max_resident_stores,
+            on_evict=self._on_store_evicted,
+            on_reload=self._on_store_reloaded
+        )
+        
+        # Embeddings per bot type, shared by all of its collections
+        self.embeddings: Dict[str, Embeddings] = {}
         
         # Cache for retrievers
         self.retrievers: Dict[str, BaseRetriever] = {}
+        
+        # Filter-aware search for filtered retrievals
+        self.filtered_search = FilteredSearch(exact_scan_max=exact_scan_max)
+        
+        # Callbacks notified when a collection changes
+        self.update_listeners: List[Any] = []
+        
+        # Per-collection locks serializing writes and saves
+        self._write_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        
+        # Per-collection locks between searches and mutations; both run on
+        # executor threads, where the asyncio write locks do not reach
+        self._store_locks: Dict[Tuple[str, str], ReadWriteLock] = {}
     
     async def retrieve(
         self,
@@ -102,12 +186,23 @@ class VectorStoreService:
                 except Exception as e:
                     self.logger.warning(f"Query processing failed: {e}")
             
-            # Retrieve documents
-            documents = retriever.get_relevant_documents(processed_query)
+            documents = None
+            
+            # Filter before or during the search where the store supports it
+            if filters:
+                documents = await self._filtered_retrieve(
+                    processed_query, bot_type, collection_name, vs_config, limit, filters
+                )
             
-            # Apply filters if provided
-            if filters and documents:
-                documents = self._apply_filters(documents, filters)
+            if documents is None:
+                # Retrieve documents
+                documents = await self._run_locked(
+                    bot_type, collection_name, False, retriever.get_relevant_documents, processed_query
+                )
+                
+                # Apply filters if provided
+                if filters and documents:
+                    documents = self._apply_filters(documents, filters)
             
             # Limit the number of documents
             documents = documents[:limit]
@@ -129,6 +224,65 @@ class VectorStoreService:
             self.logger.error(f"Vector store retrieval failed: {e}", exc_info=True)
             return []
     
+    async def _filtered_retrieve(
+        self,
+        query: str,
+        bot_type: str,
+        collection_name: str,
+        vs_config: Dict[str, Any],
+        limit: int,
+        filters: Dict[str, Any]
+    ) -> Optional[List[Document]]:
+        """
+        Retrieve documents matching filters with a filter-aware search.
+        
+        Args:
+            query: Processed query
+            bot_type: Type of bot
+            collection_name: Name of the vector store collection
+            vs_config: Vector store configuration
+            limit: Maximum number of documents to retrieve
+            filters: Filters to apply to retrieval
+            
+        Returns:
+            Matching documents, or None if the store has no filter-aware
+            search path and results must be filtered after retrieval
+        """
+        vectorstore = await self._get_vectorstore(bot_type, collection_name, vs_config)
+        
+        if not vectorstore or not self.filtered_search.supports(vectorstore):
+            return None
+        
+        # Honor the search type and kwargs configured for the retriever
+        search_type = vs_config.get("search_type", "similarity")
+        search_kwargs = vs_config.get("search_kwargs", {})
+        
+        try:
+            if search_type == "mmr":
+                return await self._run_locked(bot_type, collection_name, False, lambda: (
+                    self.filtered_search.max_marginal_relevance_search(
+                        vectorstore,
+                        query,
+                        limit,
+                        filters,
+                        fetch_k=search_kwargs.get("fetch_k", 20),
+                        lambda_mult=search_kwargs.get("lambda_mult", 0.5)
+                    )
+                ))
+            
+            results = await self._run_locked(
+                bot_type, collection_name, False, self.filtered_search.search, vectorstore, query, limit, filters
+            )
+            score_threshold = search_kwargs.get("score_threshold")
+            if search_type == "similarity_score_threshold" and score_threshold is not None:
+                # Keep the retriever's relevance cut-off
+                relevance = vectorstore._select_relevance_score_fn()
+                results = [(doc, score) for doc, score in results if relevance(score) >= score_threshold]
+            return [doc for doc, _ in results]
+        except Exception as e:
+            self.logger.warning(f"Filtered search failed, filtering after retrieval: {e}")
+            return None
+    
     async def get_langchain_retriever(
         self,
         bot_type: str,
@@ -236,45 +390,56 @@ class VectorStoreService:
             self.logger.warning(f"No vector store available for {bot_type}/{collection_name}")
             return False
         
-        try:
-            # Add documents to vector store
-            if hasattr(vectorstore, "add_documents"):
-                vectorstore.add_documents(documents)
-            else:
+        # Writes to one collection are serialized so a save never races a mutation
+        async with self._write_lock(bot_type, collection_name):
+            try:
                 # Fallback using from_documents with existing embeddings
-                embeddings = await self._get_embeddings(bot_type, vs_config)
+                embeddings = None
+                if not hasattr(vectorstore, "add_documents"):
+                    embeddings = await self._get_embeddings(bot_type, vs_config)
                 
-                if ids:
-                    # Use appropriate method based on vector store type
-                    if isinstance(vectorstore, FAISS):
-                        FAISS.add_documents(vectorstore, documents, embeddings)
-                    elif isinstance(vectorstore, Chroma):
-                        Chroma.add_documents(vectorstore, documents, embeddings, ids=ids)
-                    elif isinstance(vectorstore, Pinecone):
-                        Pinecone.add_documents(vectorstore, documents, embeddings, ids=ids)
-                    else:
-                        self.logger.warning(f"Unsupported vector store type: {type(vectorstore)}")
-                        return False
-                else:
-                    # No IDs provided
-                    if isinstance(vectorstore, FAISS):
-                        FAISS.add_documents(vectorstore, documents, embeddings)
-                    elif isinstance(vectorstore, Chroma):
-                        Chroma.add_documents(vectorstore, documents, embeddings)
-                    elif isinstance(vectorstore, Pinecone):
-                        Pinecone.add_documents(vectorstore, documents, embeddings)
+                def add() -> bool:
+                    # Add documents to vector store
+                    if embeddings is None:
+                        vectorstore.add_documents(documents)
+                    elif ids:
+                        # Use appropriate method based on vector store type
+                        if isinstance(vectorstore, FAISS):
+                            FAISS.add_documents(vectorstore, documents, embeddings)
+                        elif isinstance(vectorstore, Chroma):
+                            Chroma.add_documents(vectorstore, documents, embeddings, ids=ids)
+                        elif isinstance(vectorstore, Pinecone):
+                            Pinecone.add_documents(vectorstore, documents, embeddings, ids=ids)
+                        else:
+                            self.logger.warning(f"Unsupported vector store type: {type(vectorstore)}")
+                            return False
                     else:
-                        self.logger.warning(f"Unsupported vector store type: {type(vectorstore)}")
-                        return False
-            
-            # Invalidate retriever cache for this collection
-            self._invalidate_retrievers(bot_type, collection_name)
-            
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Failed to add documents to vector store: {e}", exc_info=True)
-            return False
+                        # No IDs provided
+                        if isinstance(vectorstore, FAISS):
+                            FAISS.add_documents(vectorstore, documents, embeddings)
+                        elif isinstance(vectorstore, Chroma):
+                            Chroma.add_documents(vectorstore, documents, embeddings)
+                        elif isinstance(vectorstore, Pinecone):
+                            Pinecone.add_documents(vectorstore, documents, embeddings)
+                        else:
+                            self.logger.warning(f"Unsupported vector store type: {type(vectorstore)}")
+                            return False
+                    return True
+                
+                if not await self._mutate(vectorstore, bot_type, collection_name, add):
+                    return False
+                
+                # Persist before acknowledging: an evicted store is reloaded from disk
+                await self._persist_vectorstore(vectorstore, bot_type, collection_name, vs_config)
+                
+                # Invalidate retriever cache for this collection
+                self._invalidate_retrievers(bot_type, collection_name)
+                
+                return True
+                
+            except Exception as e:
+                self.logger.error(f"Failed to add documents to vector store: {e}", exc_info=True)
+                return False
     
     async def delete_documents(
         self,
@@ -306,22 +471,29 @@ class VectorStoreService:
             self.logger.warning(f"No vector store available for {bot_type}/{collection_name}")
             return False
         
-        try:
-            # Delete documents from vector store
-            if hasattr(vectorstore, "delete"):
-                vectorstore.delete(ids)
-            else:
-                self.logger.warning(f"Vector store does not support deletion: {type(vectorstore)}")
+        # Writes to one collection are serialized so a save never races a mutation
+        async with self._write_lock(bot_type, collection_name):
+            try:
+                # Delete documents from vector store
+                if hasattr(vectorstore, "delete"):
+                    # Deletion shifts index positions
+                    await self._mutate(vectorstore, bot_type, collection_name, lambda: vectorstore.delete(ids),
+                                       rebuild_index=True)
+                else:
+                    self.logger.warning(f"Vector store does not support deletion: {type(vectorstore)}")
+                    return False
+                
+                # Persist before acknowledging: an evicted store is reloaded from disk
+                await self._persist_vectorstore(vectorstore, bot_type, collection_name, vs_config)
+                
+                # Invalidate retriever cache for this collection
+                self._invalidate_retrievers(bot_type, collection_name)
+                
+                return True
+                
+            except Exception as e:
+                self.logger.error(f"Failed to delete documents from vector store: {e}", exc_info=True)
                 return False
-            
-            # Invalidate retriever cache for this collection
-            self._invalidate_retrievers(bot_type, collection_name)
-            
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Failed to delete documents from vector store: {e}", exc_info=True)
-            return False
     
     async def _get_vectorstore(
         self,
@@ -340,13 +512,176 @@ class VectorStoreService:
         Returns:
             Vector store instance or None if not available
         """
-        # Generate cache key
-        cache_key = f"{bot_type}_{collection_name}"
+        vs_type = vs_config.get("type", "faiss")
+        signature_fn = None
+        if vs_type in ("faiss", "chroma"):
+            path = self._get_store_path(bot_type, collection_name, vs_config)
+            signature_fn = lambda: path_signature(path)
+        
+        return await self.store_cache.get_or_load(
+            (bot_type, collection_name),
+            lambda: self._load_vectorstore(bot_type, collection_name, vs_config),
+            signature_fn=signature_fn
+        )
+    
+    def _write_lock(self, bot_type: str, collection_name: str) -> asyncio.Lock:
+        """
+        Get the lock serializing writes to a collection.
         
-        # Return cached vector store if available
-        if cache_key in self.vectorstores:
-            return self.vectorstores[cache_key]
+        Args:
+            bot_type: Type of bot
+            collection_name: Name of the vector store collection
+            
+        Returns:
+            The collection's write lock
+        """
+        key = (bot_type, collection_name)
+        lock = self._write_locks.get(key)
+        if lock is None:
+            lock = self._write_locks[key] = asyncio.Lock()
+        return lock
+    
+    def _store_lock(self, bot_type: str, collection_name: str) -> ReadWriteLock:
+        """
+        Get the lock between searches and mutations of a collection.
         
+        Args:
+            bot_type: Type of bot
+            collection_name: Name of the vector store collection
+            
+        Returns:
+            The collection's store lock
+        """
+        key = (bot_type, collection_name)
+        lock = self._store_locks.get(key)
+        if lock is None:
+            lock = self._store_locks[key] = ReadWriteLock()
+        return lock
+    
+    async def _run_locked(
+        self,
+        bot_type: str,
+        collection_name: str,
+        write: bool,
+        func: Callable[..., Any],
+        *args: Any
+    ) -> Any:
+        """
+        Run a store operation on an executor thread under the collection's lock.
+        
+        Args:
+            bot_type: Type of bot
+            collection_name: Name of the vector store collection
+            write: Hold the lock exclusively (for mutations)
+            func: Operation to run
+            *args: Arguments of the operation
+            
+        Returns:
+            The operation's result
+        """
+        lock = self._store_lock(bot_type, collection_name)
+        
+        def run() -> Any:
+            with lock.write() if write else lock.read():
+                return func(*args)
+        
+        return await asyncio.get_running_loop().run_in_executor(None, run)
+    
+    async def _mutate(
+        self,
+        vectorstore: Any,
+        bot_type: str,
+        collection_name: str,
+        mutation: Callable[[], Any],
+        rebuild_index: bool = False
+    ) -> Any:
+        """
+        Write to a vector store while no search runs on it.
+        
+        The metadata index is brought up to date under the same lock, so
+        searches never see the store and its index out of step.
+        
+        Args:
+            vectorstore: The vector store
+            bot_type: Type of bot
+            collection_name: Name of the vector store collection
+            mutation: Write to apply
+            rebuild_index: Re-index the metadata from scratch (after deletions)
+            
+        Returns:
+            The mutation's result
+        """
+        def run() -> Any:
+            try:
+                return mutation()
+            finally:
+                self.filtered_search.refresh(vectorstore, rebuild=rebuild_index)
+        
+        return await self._run_locked(bot_type, collection_name, True, run)
+    
+    async def _persist_vectorstore(
+        self,
+        vectorstore: Any,
+        bot_type: str,
+        collection_name: str,
+        vs_config: Dict[str, Any]
+    ) -> None:
+        """
+        Save a written local vector store and update its cache entry.
+        
+        The resident store can be evicted at any time and is reloaded from
+        disk, so writes are saved before they are acknowledged. Remote
+        stores need no save.
+        
+        Args:
+            vectorstore: The written vector store
+            bot_type: Type of bot
+            collection_name: Name of the vector store collection
+            vs_config: Vector store configuration
+        """
+        if isinstance(vectorstore, FAISS):
+            path = self._get_store_path(bot_type, collection_name, vs_config)
+            await self._run_locked(bot_type, collection_name, False, vectorstore.save_local, path)
+        elif isinstance(vectorstore, Chroma) and hasattr(vectorstore, "persist"):
+            await self._run_locked(bot_type, collection_name, False, vectorstore.persist)
+        
+        # Our own writes must not trigger a background reload; the entry's
+        # size follows the saved index
+        self.store_cache.mark_current((bot_type, collection_name))
+    
+    def _get_store_path(self, bot_type: str, collection_name: str, vs_config: Dict[str, Any]) -> str:
+        """
+        Get the on-disk path of a local vector store.
+        
+        Args:
+            bot_type: Type of bot
+            collection_name: Name of the vector store collection
+            vs_config: Vector store configuration
+            
+        Returns:
+            Vector store path
+        """
+        persist_directory = vs_config.get("persist_directory", "./vectorstores")
+        return f"{persist_directory}/{bot_type}_{collection_name}"
+    
+    async def _load_vectorstore(
+        self,
+        bot_type: str,
+        collection_name: str,
+        vs_config: Dict[str, Any]
+    ) -> Optional[StoreLoad]:
+        """
+        Load a vector store, off the event loop for local indexes.
+        
+        Args:
+            bot_type: Type of bot
+            collection_name: Name of the vector store collection
+            vs_config: Vector store configuration
+            
+        Returns:
+            Loaded store with its resident size and index signature, or None
+            if not available
+        """
         # Get vector store type
         vs_type = vs_config.get("type", "faiss")
         
@@ -357,38 +692,37 @@ class VectorStoreService:
             self.logger.warning(f"No embeddings available for {bot_type}")
             return None
         
+        loop = asyncio.get_running_loop()
+        
         try:
             # Create vector store based on type
             if vs_type == "faiss":
-                # Determine path
-                persist_directory = vs_config.get("persist_directory", "./vectorstores")
-                if not os.path.exists(persist_directory):
-                    os.makedirs(persist_directory)
-                
-                path = f"{persist_directory}/{bot_type}_{collection_name}"
+                path = self._get_store_path(bot_type, collection_name, vs_config)
+                signature = path_signature(path)
                 
-                # Load or create FAISS vector store
+                # Load FAISS vector store, or start an empty one without
+                # persisting it (a saved placeholder would pollute results)
                 if os.path.exists(f"{path}/index.faiss"):
-                    vectorstore = FAISS.load_local(path, embeddings)
+                    vectorstore = await loop.run_in_executor(None, FAISS.load_local, path, embeddings)
+                    size_bytes = signature_bytes(signature)
                 else:
-                    # Create empty FAISS index
-                    vectorstore = FAISS.from_texts(["placeholder"], embeddings)
-                    vectorstore.save_local(path)
+                    vectorstore = await loop.run_in_executor(None, self._create_empty_faiss, embeddings, vs_config)
+                    size_bytes = 0
                 
-            elif vs_type == "chroma":
-                # Determine path
-                persist_directory = vs_config.get("persist_directory", "./vectorstores")
-                if not os.path.exists(persist_directory):
-                    os.makedirs(persist_directory)
+                return StoreLoad(vectorstore, size_bytes, signature)
                 
-                path = f"{persist_directory}/{bot_type}_{collection_name}"
+            elif vs_type == "chroma":
+                path = self._get_store_path(bot_type, collection_name, vs_config)
+                os.makedirs(path, exist_ok=True)
                 
                 # Load or create Chroma vector store
-                vectorstore = Chroma(
+                vectorstore = await loop.run_in_executor(None, lambda: Chroma(
                     collection_name=collection_name,
                     embedding_function=embeddings,
                     persist_directory=path
-                )
+                ))
+                signature = path_signature(path)
+                return StoreLoad(vectorstore, signature_bytes(signature), signature)
                 
             elif vs_type == "pinecone":
                 # Get Pinecone configuration
@@ -411,25 +745,140 @@ class VectorStoreService:
                     self.logger.warning(f"Pinecone index {index_name} does not exist")
                     return None
                 
-                # Create vector store
+                # Create vector store (remote index, nothing resident)
                 vectorstore = Pinecone.from_existing_index(
                     index_name=index_name,
                     embedding=embeddings,
                     namespace=collection_name
                 )
+                return StoreLoad(vectorstore, 0, None)
                 
             else:
                 self.logger.warning(f"Unsupported vector store type: {vs_type}")
                 return None
             
-            # Cache vector store
-            self.vectorstores[cache_key] = vectorstore
-            return vectorstore
-            
         except Exception as e:
             self.logger.error(f"Failed to create vector store: {e}", exc_info=True)
             return None
     
+    def _create_empty_faiss(self, embeddings: Embeddings, vs_config: Dict[str, Any]) -> FAISS:
+        """
+        Create an empty in-memory FAISS vector store.
+        
+        Args:
+            embeddings: Embeddings for the store
+            vs_config: Vector store configuration (``embedding.dimensions``
+                avoids probing the embedding model for the dimension)
+            
+        Returns:
+            Empty FAISS vector store
+        """
+        import faiss
+        from langchain.docstore.in_memory import InMemoryDocstore
+        
+        dimensions = vs_config.get("embedding", {}).get("dimensions")
+        if not dimensions:
+            dimensions = len(embeddings.embed_query("dimension probe"))
+        
+        return FAISS(embeddings.embed_query, faiss.IndexFlatL2(dimensions), InMemoryDocstore({}), {})
+    
+    async def warmup(
+        self,
+        bot_types: List[str],
+        collections: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Load hot collections ahead of traffic.
+        
+        Collections default to the bot's ``warm_collections`` setting, or its
+        default collection.
+        
+        Args:
+            bot_types: Bot types to warm up
+            collections: Collections to load for every bot type (optional)
+            
+        Returns:
+            Keys (``bot_type/collection``) of the collections now resident
+        """
+        items = []
+        for bot_type in bot_types:
+            vs_config = self._get_vs_config(bot_type)
+            names = collections or vs_config.get("warm_collections") or [
+                vs_config.get("default_collection", bot_type)
+            ]
+            for collection_name in names:
+                items.append((bot_type, collection_name, vs_config))
+        
+        async def warm(bot_type: str, collection_name: str, vs_config: Dict[str, Any]) -> Optional[Any]:
+            store = await self._get_vectorstore(bot_type, collection_name, vs_config)
+            if store is not None:
+                await self._get_retriever(bot_type, collection_name, vs_config)
+            return store
+        
+        results = await asyncio.gather(*(warm(*item) for item in items), return_exceptions=True)
+        warmed = []
+        for (bot_type, collection_name, _), result in zip(items, results):
+            if isinstance(result, Exception) or result is None:
+                self.logger.warning(f"Warmup failed for {bot_type}/{collection_name}: {result}")
+            else:
+                warmed.append(f"{bot_type}/{collection_name}")
+        
+        self.logger.info(f"Warmed up {len(warmed)}/{len(items)} vector store collections")
+        return warmed
+    
+    def start_index_watcher(self, interval_seconds: float = 30.0) -> None:
+        """
+        Reload resident local indexes in the background when they change on disk.
+        
+        Must be called from a running event loop.
+        
+        Args:
+            interval_seconds: Seconds between checks
+        """
+        self.store_cache.start_watcher(interval_seconds)
+    
+    async def stop_index_watcher(self) -> None:
+        """
+        Stop the background index watcher.
+        """
+        await self.store_cache.stop_watcher()
+    
+    def _on_store_evicted(self, key: Tuple[str, str]) -> None:
+        """
+        Drop retrievers of an evicted store so it can be freed.
+        
+        Args:
+            key: (bot_type, collection_name) of the evicted store
+        """
+        self._drop_retrievers(*key)
+    
+    def _on_store_reloaded(self, key: Tuple[str, str]) -> None:
+        """
+        Rebuild retrievers and notify listeners after an index reload.
+        
+        Args:
+            key: (bot_type, collection_name) of the reloaded store
+        """
+        self._invalidate_retrievers(*key)
+    
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        """
+        Get residency, hit and load-latency metrics for vector stores.
+        
+        Returns:
+            Dictionary of cache metrics
+        """
+        return self.store_cache.get_metrics()
+    
+    def get_filter_metrics(self) -> Dict[str, int]:
+        """
+        Get counters of the strategies used for filtered retrievals.
+        
+        Returns:
+            Dictionary of filtered search metrics
+        """
+        return self.filtered_search.get_metrics()
+    
     async def _get_retriever(
         self,
         bot_type: str,
@@ -467,6 +916,30 @@ class VectorStoreService:
         """
         Get an embeddings instance for a bot type.
         
+        Args:
+            bot_type: Type of bot
+            vs_config: Vector store configuration
+            
+        Returns:
+            Embeddings instance or None if not available
+        """
+        # Reuse embeddings already built for this bot type
+        if bot_type in self.embeddings:
+            return self.embeddings[bot_type]
+        
+        embeddings = await self._create_embeddings(bot_type, vs_config)
+        if embeddings:
+            self.embeddings[bot_type] = embeddings
+        return embeddings
+    
+    async def _create_embeddings(
+        self,
+        bot_type: str,
+        vs_config: Dict[str, Any]
+    ) -> Optional[Embeddings]:
+        """
+        Create an embeddings instance for a bot type.
+        
         Args:
             bot_type: Type of bot
             vs_config: Vector store configuration
@@ -529,33 +1002,7 @@ class VectorStoreService:
         Returns:
             Filtered documents
         """
-        filtered_docs = []
-        
-        for doc in documents:
-            # Check all filter criteria
-            match = True
-            
-            for key, value in filters.items():
-                # Check if document has metadata
-                if not hasattr(doc, "metadata") or not doc.metadata:
-                    match = False
-                    break
-                
-                # Check if key exists in metadata
-                if key not in doc.metadata:
-                    match = False
-                    break
-                
-                # Check if value matches
-                if doc.metadata[key] != value:
-                    match = False
-                    break
-            
-            # Add document if it matches all filters
-            if match:
-                filtered_docs.append(doc)
-        
-        return filtered_docs
+        return [doc for doc in documents if matches_filters(getattr(doc, "metadata", None), filters)]
     
     def _get_vs_config(self, bot_type: str) -> Dict[str, Any]:
         """
@@ -600,6 +1047,17 @@ class VectorStoreService:
         """
         Invalidate retrievers for a collection.
         
+        Args:
+            bot_type: Type of bot
+            collection_name: Name of the vector store collection
+        """
+        self._drop_retrievers(bot_type, collection_name)
+        self._notify_update_listeners(bot_type, collection_name)
+    
+    def _drop_retrievers(self, bot_type: str, collection_name: str) -> None:
+        """
+        Remove cached retrievers for a collection.
+        
         Args:
             bot_type: Type of bot
             collection_name: Name of the vector store collection
@@ -615,10 +1073,35 @@ class VectorStoreService:
             del self.retrievers[key]
             self.logger.info(f"Invalidated retriever {key}")
     
+    def add_update_listener(self, listener: Any) -> None:
+        """
+        Register a callback invoked as ``listener(bot_type, collection_name)``
+        after documents are added to or deleted from a collection.
+        
+        Args:
+            listener: Callback to register
+        """
+        if listener not in self.update_listeners:
+            self.update_listeners.append(listener)
+    
+    def _notify_update_listeners(self, bot_type: str, collection_name: str) -> None:
+        """
+        Notify update listeners about a collection change.
+        
+        Args:
+            bot_type: Type of bot
+            collection_name: Name of the vector store collection
+        """
+        for listener in self.update_listeners:
+            try:
+                listener(bot_type, collection_name)
+            except Exception as e:
+                self.logger.warning(f"Collection update listener failed: {e}")
+    
     def clear_cache(self) -> None:
         """
         Clear the cache of vectorstores and retrievers.
         """
-        self.vectorstores = {}
+        self.store_cache.clear()
         self.retrievers = {}
         self.logger.info("Cleared vectorstore and retriever caches") 
\ No newline at end of file
@@ -0,0 +1,412 @@
+"""
+Resident vector store cache.
+
+This module provides the cache that keeps loaded vector stores resident for
+the vector store service. Stores are bounded by a byte budget with LRU
+eviction, loaded at most once per key even under concurrent requests, can be
+warmed up ahead of traffic, and are reloaded in the background when the index
+they were loaded from changes on disk.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class StoreLoad(NamedTuple):
+    """Result of loading a vector store."""
+
+    store: Any
+    size_bytes: int = 0
+    signature: Any = None
+
+
+Loader = Callable[[], Awaitable[StoreLoad]]
+SignatureFunction = Callable[[], Any]
+
+
+def path_signature(path: str) -> Optional[Tuple[Tuple[str, int, int], ...]]:
+    """
+    Fingerprint the files of an on-disk index.
+
+    Args:
+        path: Index file or directory
+
+    Returns:
+        Sorted (name, size, mtime_ns) tuples, or None if the path is missing
+    """
+    if not os.path.exists(path):
+        return None
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return ((os.path.basename(path), stat.st_size, stat.st_mtime_ns),)
+
+    entries = []
+    for root, _, files in os.walk(path):
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            entries.append((os.path.relpath(os.path.join(root, name), path), stat.st_size, stat.st_mtime_ns))
+    return tuple(sorted(entries))
+
+
+def signature_bytes(signature: Optional[Tuple[Tuple[str, int, int], ...]]) -> int:
+    """
+    Total on-disk size recorded in a path signature.
+
+    Args:
+        signature: Result of ``path_signature``
+
+    Returns:
+        Size in bytes (0 for a missing path)
+    """
+    return sum(size for _, size, _ in signature or ())
+
+
+class _StoreEntry:
+    """A resident vector store."""
+
+    __slots__ = ("store", "size_bytes", "signature", "loader", "signature_fn", "loaded_at")
+
+    def __init__(self, load: StoreLoad, loader: Loader, signature_fn: Optional[SignatureFunction]):
+        self.store = load.store
+        self.size_bytes = load.size_bytes
+        self.signature = load.signature
+        self.loader = loader
+        self.signature_fn = signature_fn
+        self.loaded_at = time.time()
+
+
+class VectorStoreCache:
+    """
+    LRU cache of loaded vector stores under a byte budget.
+
+    Evicting a store only drops the cache's reference; requests already
+    holding it finish normally.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_entries: int = 64,
+        on_evict: Optional[Callable[[Hashable], None]] = None,
+        on_reload: Optional[Callable[[Hashable], None]] = None,
+        latency_window: int = 256
+    ):
+        """
+        Initialize the store cache.
+
+        Args:
+            max_bytes: Resident byte budget (None for no limit)
+            max_entries: Maximum number of resident stores
+            on_evict: Callback invoked with the key of an evicted store
+            on_reload: Callback invoked with the key of a store reloaded
+                because its index changed
+            latency_window: Number of recent load latencies kept for
+                percentiles
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self.on_reload = on_reload
+        self.logger = logging.getLogger(__name__)
+
+        self._entries: "OrderedDict[Hashable, _StoreEntry]" = OrderedDict()
+        self._loading: Dict[Hashable, asyncio.Future] = {}
+        self._watcher: Optional[asyncio.Task] = None
+        self.resident_bytes = 0
+
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self.metrics: Dict[str, Any] = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "loads": 0,
+            "load_failures": 0,
+            "reloads": 0,
+            "evictions": 0,
+            "load_seconds_total": 0.0,
+            "load_seconds_max": 0.0,
+        }
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a resident store without loading it or updating recency.
+
+        Args:
+            key: Store key
+
+        Returns:
+            The store, or None if not resident
+        """
+        entry = self._entries.get(key)
+        return entry.store if entry else None
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Loader,
+        signature_fn: Optional[SignatureFunction] = None
+    ) -> Optional[Any]:
+        """
+        Get a resident store, loading it once on a miss.
+
+        Args:
+            key: Store key
+            loader: Coroutine function returning a ``StoreLoad`` (or None if
+                the store is unavailable, which is not cached)
+            signature_fn: Function returning the current on-disk signature,
+                used by the background watcher to detect index changes
+
+        Returns:
+            The store, or None if it could not be loaded
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.metrics["hits"] += 1
+            return entry.store
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            self.metrics["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        self.metrics["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            load = await self._timed_load(key, loader)
+            if load is not None:
+                self._insert(key, _StoreEntry(load, loader, signature_fn))
+            store = load.store if load is not None else None
+            future.set_result(store)
+            return store
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an uncoalesced failure does not warn at GC
+            future.exception()
+            raise
+        finally:
+            self._loading.pop(key, None)
+
+    async def _timed_load(self, key: Hashable, loader: Loader) -> Optional[StoreLoad]:
+        """Run a loader and record its latency."""
+        start = time.perf_counter()
+        try:
+            load = await loader()
+        except Exception:
+            self.metrics["load_failures"] += 1
+            raise
+        elapsed = time.perf_counter() - start
+
+        self.metrics["loads"] += 1
+        self.metrics["load_seconds_total"] += elapsed
+        self.metrics["load_seconds_max"] = max(self.metrics["load_seconds_max"], elapsed)
+        self._latencies.append(elapsed)
+        self.logger.info(f"Loaded vector store {key} in {elapsed * 1000:.1f} ms")
+        return load
+
+    def _insert(self, key: Hashable, entry: _StoreEntry, keep_position: bool = False) -> None:
+        existing = self._entries.get(key)
+        if existing is not None:
+            self.resident_bytes -= existing.size_bytes
+            if not keep_position:
+                self._entries.move_to_end(key)
+        # Assigning to an existing key keeps its LRU position
+        self._entries[key] = entry
+        self.resident_bytes += entry.size_bytes
+        self._enforce_budget(protect=key)
+
+    def _enforce_budget(self, protect: Hashable) -> None:
+        """Evict least recently used stores, never ``protect``, until within budget."""
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self.resident_bytes > self.max_bytes)
+        ):
+            victim = next(iter(self._entries))
+            if victim == protect:
+                self._entries.move_to_end(victim)
+                victim = next(iter(self._entries))
+            evicted = self._entries.pop(victim)
+            self.resident_bytes -= evicted.size_bytes
+            self.metrics["evictions"] += 1
+            self.logger.info(f"Evicted vector store {victim} ({evicted.size_bytes} bytes)")
+            if self.on_evict:
+                self.on_evict(victim)
+
+        if self.max_bytes is not None and self.resident_bytes > self.max_bytes:
+            self.logger.warning(f"Vector store {protect} alone exceeds the cache budget of {self.max_bytes} bytes")
+
+    async def warmup(self, items: Iterable[Tuple[Hashable, Loader, Optional[SignatureFunction]]]) -> List[Hashable]:
+        """
+        Load stores ahead of traffic, concurrently.
+
+        Args:
+            items: (key, loader, signature_fn) tuples
+
+        Returns:
+            Keys that are resident after warmup
+        """
+        items = list(items)
+        results = await asyncio.gather(
+            *(self.get_or_load(key, loader, signature_fn) for key, loader, signature_fn in items),
+            return_exceptions=True
+        )
+        warmed = []
+        for (key, _, _), result in zip(items, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"Warmup of vector store {key} failed: {result}")
+            elif result is not None:
+                warmed.append(key)
+        return warmed
+
+    async def refresh_changed(self) -> List[Hashable]:
+        """
+        Reload resident stores whose on-disk index changed.
+
+        The old store keeps serving until the new one is loaded, then the
+        entry is swapped in place.
+
+        Returns:
+            Keys that were reloaded
+        """
+        reloaded = []
+        for key, entry in list(self._entries.items()):
+            if entry.signature_fn is None or key in self._loading:
+                continue
+            try:
+                signature = entry.signature_fn()
+            except Exception as e:
+                self.logger.warning(f"Could not check index of vector store {key}: {e}")
+                continue
+            if signature == entry.signature:
+                continue
+
+            try:
+                load = await self._timed_load(key, entry.loader)
+            except Exception as e:
+                self.logger.error(f"Background reload of vector store {key} failed: {e}")
+                continue
+            if load is None or self._entries.get(key) is not entry:
+                # Unavailable now, or evicted/replaced while reloading
+                continue
+
+            # A reload is not an access, so the entry keeps its recency
+            self._insert(key, _StoreEntry(load, entry.loader, entry.signature_fn), keep_position=True)
+            self.metrics["reloads"] += 1
+            reloaded.append(key)
+            if self.on_reload:
+                self.on_reload(key)
+        return reloaded
+
+    def mark_current(self, key: Hashable, size_bytes: Optional[int] = None) -> None:
+        """
+        Accept the current on-disk index of a store as its own.
+
+        Call after this process persists a write to a store, so the watcher
+        does not reload the store it just saved. The store's resident size
+        is updated and the budget enforced, as a write can grow the store.
+
+        Args:
+            key: Store key
+            size_bytes: New resident size (the size of the index on disk
+                if omitted, as for a load)
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        if entry.signature_fn is not None:
+            entry.signature = entry.signature_fn()
+            if size_bytes is None:
+                size_bytes = signature_bytes(entry.signature)
+        if size_bytes is not None and size_bytes != entry.size_bytes:
+            self.resident_bytes += size_bytes - entry.size_bytes
+            entry.size_bytes = size_bytes
+            self._enforce_budget(protect=key)
+
+    def start_watcher(self, interval_seconds: float = 30.0) -> None:
+        """
+        Start a background task that periodically reloads changed indexes.
+
+        Args:
+            interval_seconds: Seconds between checks
+        """
+        if self._watcher is not None and not self._watcher.done():
+            return
+
+        async def watch():
+            while True:
+                await asyncio.sleep(interval_seconds)
+                try:
+                    await self.refresh_changed()
+                except Exception as e:
+                    self.logger.error(f"Vector store index watcher failed: {e}")
+
+        self._watcher = asyncio.get_running_loop().create_task(watch())
+
+    async def stop_watcher(self) -> None:
+        """
+        Stop the background index watcher.
+        """
+        if self._watcher is None:
+            return
+        self._watcher.cancel()
+        try:
+            await self._watcher
+        except asyncio.CancelledError:
+            pass
+        self._watcher = None
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Drop a resident store.
+
+        Args:
+            key: Store key
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.resident_bytes -= entry.size_bytes
+
+    def clear(self) -> None:
+        """
+        Drop every resident store.
+        """
+        self._entries.clear()
+        self.resident_bytes = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get residency, hit and load-latency metrics.
+
+        Returns:
+            Dictionary of metrics
+        """
+        latencies = sorted(self._latencies)
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+        lookups = self.metrics["hits"] + self.metrics["misses"] + self.metrics["coalesced"]
+        loads = self.metrics["loads"]
+        return {
+            **self.metrics,
+            "resident_stores": len(self._entries),
+            "resident_bytes": self.resident_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_ratio": self.metrics["hits"] / lookups if lookups else 0.0,
+            "load_seconds_mean": self.metrics["load_seconds_total"] / loads if loads else 0.0,
+            "load_seconds_p50": percentile(0.5),
+            "load_seconds_p95": percentile(0.95),
+        }
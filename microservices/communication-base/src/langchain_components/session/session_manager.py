@@ -99,7 +99,8 @@ class SessionManager:
         repository_client: Any = None,
         memory_factory: Any = None,
         session_timeout: int = 1800,  # 30 minutes
-        max_history_length: int = 100
+        max_history_length: int = 100,
+        context_builder: Any = None
     ):
         """
         Initialize the session manager.
@@ -110,12 +111,15 @@ class SessionManager:
             memory_factory: Factory for creating memory components
             session_timeout: Session timeout in seconds
             max_history_length: Maximum number of messages to keep in history
+            context_builder: Cross-session context builder whose per-user
+                digest is updated when a session ends
         """
         self.config_integration = config_integration
         self.repository_client = repository_client
         self.memory_factory = memory_factory
         self.session_timeout = session_timeout
         self.max_history_length = max_history_length
+        self.context_builder = context_builder
         self.logger = logging.getLogger(__name__)
         
         # In-memory session cache
@@ -571,6 +575,14 @@ class SessionManager:
                 except Exception as e:
                     self.logger.error(f"Failed to save ended session: {e}")
             
+            # Fold the session into the user's cross-session digest
+            if self.context_builder and session.user_id:
+                await self.context_builder.record_session_close(
+                    session.user_id,
+                    self._digest_session_data(session),
+                    campaign_id=session.metadata.get("campaign_id")
+                )
+            
             # Remove from memory cache
             del self.sessions[session_id]
             
@@ -581,6 +593,34 @@ class SessionManager:
                 
             self.logger.info(f"Ended session: {session_id}")
     
+    def _digest_session_data(self, session: SessionState) -> Dict[str, Any]:
+        """
+        Get the data of an ended session in cross-session digest form.
+        
+        Args:
+            session: Ended session
+            
+        Returns:
+            Session data with entities, topics, questions, summary,
+            session_id and timestamp
+        """
+        entities = []
+        for entity_type, values in session.entities.items():
+            for value in values if isinstance(values, list) else [values]:
+                if isinstance(value, dict):
+                    entities.append({"type": entity_type, **value})
+                else:
+                    entities.append({"type": entity_type, "value": value})
+        
+        return {
+            "session_id": session.session_id,
+            "timestamp": session.last_updated,
+            "summary": session.summary or "",
+            "entities": entities,
+            "topics": session.context.get("topics", []),
+            "questions": session.context.get("questions", [])
+        }
+    
     async def cleanup_expired_sessions(self) -> int:
         """
         Clean up expired sessions.
@@ -8,8 +8,20 @@ other available information.
 
 import logging
 import re
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Set, Union, Tuple
 
+from src.langchain_components.template.token_budget import HistoryTokens, Segment, TokenBudget, TokenCounter
+
+# Context variables packed into the token budget, with their default priority
+DEFAULT_CONTEXT_PRIORITIES = {
+    "chat_history": 1.0,
+    "knowledge_context": 0.8,
+    "memory_summary": 0.7,
+    "entities": 0.6,
+    "user_profile": 0.5
+}
+
 class ContextInjector:
     """
     Context injector for enriching templates with relevant contextual information.
@@ -26,7 +38,10 @@ class ContextInjector:
         entity_store: Any = None,
         rag_coordinator: Any = None,
         profile_manager: Any = None,
-        context_truncation_limit: int = 4000
+        context_truncation_limit: int = 4000,
+        token_counter: Optional[TokenCounter] = None,
+        packing_strategy: str = "auto",
+        max_tracked_histories: int = 1024
     ):
         """
         Initialize context injector.
@@ -38,6 +53,12 @@ class ContextInjector:
             rag_coordinator: RAG coordinator for retrieving knowledge
             profile_manager: Profile manager for user preferences
             context_truncation_limit: Maximum token limit for context
+            token_counter: Token counter with a per-segment cache (defaults to
+                tiktoken when installed, else a 4-characters-per-token estimate)
+            packing_strategy: How context segments are packed into the token
+                budget: "greedy", "knapsack" or "auto"
+            max_tracked_histories: Number of conversations whose history token
+                counts are tracked incrementally
         """
         self.config_integration = config_integration
         self.memory_manager = memory_manager
@@ -46,6 +67,13 @@ class ContextInjector:
         self.profile_manager = profile_manager
         self.context_truncation_limit = context_truncation_limit
         self.logger = logging.getLogger(__name__)
+        
+        self.token_counter = token_counter or TokenCounter()
+        self.token_budget = TokenBudget(strategy=packing_strategy)
+        
+        # Incremental history token counts keyed by "bot_type:session_id"
+        self.max_tracked_histories = max_tracked_histories
+        self._histories: "OrderedDict[str, HistoryTokens]" = OrderedDict()
     
     def inject_context(
         self,
@@ -117,6 +145,16 @@ class ContextInjector:
             except Exception as e:
                 self.logger.warning(f"Failed to retrieve user profile: {e}")
         
+        # Fit the context into the token budget
+        if context_settings.get("enforce_token_budget", True):
+            context_variables = self.budget_context(
+                context_variables,
+                max_tokens=context_settings.get("max_context_tokens"),
+                history_key=f"{bot_type}:{session_id}",
+                priorities=context_settings.get("context_priorities"),
+                decay=context_settings.get("context_priority_decay", 0.9)
+            )
+        
         # Apply context to template
         injected_template = self._apply_context_to_template(template_data, context_variables)
         
@@ -141,7 +179,11 @@ class ContextInjector:
             "include_user_profile": True,
             "max_history_messages": 10,
             "max_entities": 5,
-            "max_rag_chunks": 3
+            "max_rag_chunks": 3,
+            "enforce_token_budget": True,
+            "max_context_tokens": self.context_truncation_limit,
+            "context_priorities": DEFAULT_CONTEXT_PRIORITIES,
+            "context_priority_decay": 0.9
         }
         
         # If no config integration, return defaults
@@ -353,15 +395,155 @@ class ContextInjector:
         """
         max_tokens = max_tokens or self.context_truncation_limit
         
-        # Simple approximation: 1 token ≈ 4 characters
-        max_chars = max_tokens * 4
-        
-        if len(context) <= max_chars:
+        tokens = self.token_counter.count(context)
+        if tokens <= max_tokens:
             return context
         
-        # Truncate to max_chars and add indicator
-        truncated = context[:max_chars]
-        return truncated + "... [truncated]"
+        # Cut proportionally, then shrink until the cut fits; cut prefixes
+        # are one-off strings, so they bypass the count cache
+        end = int(len(context) * max_tokens / tokens)
+        while end > 0 and self.token_counter.tokenizer(context[:end]) > max_tokens:
+            end = int(end * 0.9)
+        
+        # Truncate and add indicator
+        return context[:end] + "... [truncated]"
+    
+    def budget_context(
+        self,
+        context_variables: Dict[str, Any],
+        max_tokens: Optional[int] = None,
+        history_key: Optional[str] = None,
+        priorities: Optional[Dict[str, float]] = None,
+        decay: float = 0.9
+    ) -> Dict[str, Any]:
+        """
+        Fit context variables into a token budget.
+        
+        Chat history messages, knowledge chunks and entities compete
+        individually, the memory summary and user profile as a whole; every
+        other variable (including the input) is always kept. History is kept
+        newest first without gaps, and each older message, chunk or entity
+        gets a lower priority.
+        
+        Args:
+            context_variables: Context variables
+            max_tokens: Token budget (uses default if None)
+            history_key: Conversation key for incremental history counts
+            priorities: Priority per budgeted variable
+            decay: Priority factor applied per position in a list
+            
+        Returns:
+            Context variables with dropped items removed
+        """
+        max_tokens = max_tokens or self.context_truncation_limit
+        priorities = {**DEFAULT_CONTEXT_PRIORITIES, **(priorities or {})}
+        
+        segments = []
+        for key, value in context_variables.items():
+            if key not in priorities or not value:
+                segments.append(Segment(key, 0, self._count_value(value), 0.0, required=True))
+            elif key == "chat_history" and isinstance(value, list):
+                for index, tokens in enumerate(self._history_tokens(value, history_key)):
+                    age = len(value) - 1 - index
+                    segments.append(Segment(key, index, tokens, priorities[key] * decay ** age, contiguous=True))
+            elif isinstance(value, list):
+                for index, item in enumerate(value):
+                    tokens = self.token_counter.count(self._segment_text(item))
+                    segments.append(Segment(key, index, tokens, priorities[key] * decay ** index))
+            else:
+                segments.append(Segment(key, 0, self._count_value(value), priorities[key]))
+        
+        result = self.token_budget.pack(segments, max_tokens)
+        if not result.dropped:
+            return context_variables
+        
+        kept: Dict[str, Set[int]] = {}
+        for segment in result.selected:
+            kept.setdefault(segment.key, set()).add(segment.index)
+        
+        budgeted = dict(context_variables)
+        for key in {segment.key for segment in result.dropped}:
+            value = context_variables[key]
+            if isinstance(value, list):
+                budgeted[key] = [item for index, item in enumerate(value) if index in kept.get(key, ())]
+            else:
+                # Keep the variable so templates referencing it still render
+                budgeted[key] = "" if isinstance(value, str) else None
+        
+        self.logger.debug(
+            f"Packed context into {result.tokens}/{max_tokens} tokens ({result.strategy}), "
+            f"dropped {len(result.dropped)} segments"
+        )
+        return budgeted
+    
+    def _history_tokens(self, history: List[Any], history_key: Optional[str]) -> List[int]:
+        """
+        Get per-message token counts, counting only messages appended since
+        the previous call for the same conversation.
+        
+        Args:
+            history: Chat history messages, oldest first
+            history_key: Conversation key (None to count without tracking)
+            
+        Returns:
+            Token count of each message
+        """
+        texts = [self._segment_text(message) for message in history]
+        if history_key is None:
+            return [self.token_counter.count(text) for text in texts]
+        
+        tracker = self._histories.get(history_key)
+        if tracker is None:
+            tracker = self._histories[history_key] = HistoryTokens()
+            if len(self._histories) > self.max_tracked_histories:
+                self._histories.popitem(last=False)
+        else:
+            self._histories.move_to_end(history_key)
+        return tracker.sync(texts, self.token_counter)
+    
+    def _count_value(self, value: Any) -> int:
+        """
+        Count the tokens of a whole context variable.
+        
+        Args:
+            value: Context variable value
+            
+        Returns:
+            Token count
+        """
+        if isinstance(value, list):
+            return sum(self.token_counter.count(self._segment_text(item)) for item in value)
+        return self.token_counter.count(self._segment_text(value))
+    
+    def _segment_text(self, item: Any) -> str:
+        """
+        Render a context item as it appears in the prompt.
+        
+        Args:
+            item: Message, document chunk, entity or other value
+            
+        Returns:
+            Text to count
+        """
+        if isinstance(item, str):
+            return item
+        if hasattr(item, "content") and hasattr(item, "type"):
+            # LangChain message
+            return f"{item.type}: {item.content}"
+        if isinstance(item, dict):
+            if "role" in item and "content" in item:
+                return f"{item['role']}: {item['content']}"
+            return self._format_dict_for_prompt(item)
+        return str(item)
+    
+    def get_token_metrics(self) -> Dict[str, Any]:
+        """
+        Get token count cache metrics.
+        
+        Returns:
+            Dictionary of metrics
+        """
+        return {**self.token_counter.get_metrics(), "tracked_histories": len(self._histories)}
     
     def get_special_placeholders(self) -> List[str]:
         """
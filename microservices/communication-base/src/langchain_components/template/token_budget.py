@@ -0,0 +1,345 @@
+"""
+Token budgeting for prompt context.
+
+This module provides the token accounting used by the context injector:
+token counts cached per segment by content hash, incremental history
+tracking so appended messages are the only ones counted, and priority-based
+packing of context segments (history, retrieved documents, entities, user
+details) into a token budget with a greedy or knapsack strategy.
+"""
+
+import hashlib
+import logging
+import math
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+TokenizerFunction = Callable[[str], int]
+
+
+def approximate_token_count(text: str) -> int:
+    """
+    Approximate a token count at 4 characters per token.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Approximate token count
+    """
+    return math.ceil(len(text) / 4)
+
+
+def get_tokenizer(model_name: Optional[str] = None) -> TokenizerFunction:
+    """
+    Get a token counting function, exact when tiktoken is installed.
+
+    Args:
+        model_name: Model whose encoding to use (cl100k_base if unknown)
+
+    Returns:
+        Function returning the token count of a text
+    """
+    if not TIKTOKEN_AVAILABLE:
+        return approximate_token_count
+    try:
+        encoding = tiktoken.encoding_for_model(model_name) if model_name else tiktoken.get_encoding("cl100k_base")
+    except KeyError:
+        encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def content_hash(text: str) -> bytes:
+    """
+    Hash segment content for token count caching.
+
+    Args:
+        text: Segment text
+
+    Returns:
+        16-byte digest
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class TokenCounter:
+    """
+    Token counter caching counts per segment by content hash (LRU bounded).
+    """
+
+    def __init__(self, tokenizer: Optional[TokenizerFunction] = None, max_entries: int = 16384):
+        """
+        Initialize the counter.
+
+        Args:
+            tokenizer: Function returning the token count of a text
+                (defaults to ``get_tokenizer()``)
+            max_entries: Maximum number of cached counts
+        """
+        self.tokenizer = tokenizer or get_tokenizer()
+        self.max_entries = max_entries
+        self._counts: "OrderedDict[bytes, int]" = OrderedDict()
+        self.metrics: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    def count(self, text: str) -> int:
+        """
+        Count the tokens of a text.
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Token count
+        """
+        if not text:
+            return 0
+        key = content_hash(text)
+        tokens = self._counts.get(key)
+        if tokens is not None:
+            self._counts.move_to_end(key)
+            self.metrics["hits"] += 1
+            return tokens
+
+        self.metrics["misses"] += 1
+        tokens = self.tokenizer(text)
+        self._counts[key] = tokens
+        if len(self._counts) > self.max_entries:
+            self._counts.popitem(last=False)
+        return tokens
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary of metrics
+        """
+        lookups = self.metrics["hits"] + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "entries": len(self._counts),
+            "hit_ratio": self.metrics["hits"] / lookups if lookups else 0.0,
+        }
+
+
+class HistoryTokens:
+    """
+    Running token counts of one conversation's history.
+
+    Appending messages only counts the new ones; the history is recounted
+    when it no longer extends the tracked messages (e.g. after trimming or
+    an edit to an earlier message).
+    """
+
+    __slots__ = ("texts", "tokens", "prefix")
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.tokens: List[int] = []
+        # prefix[i] is the token total of the first i messages
+        self.prefix: List[int] = [0]
+
+    def sync(self, texts: Sequence[str], counter: TokenCounter) -> List[int]:
+        """
+        Update counts for the current history.
+
+        Args:
+            texts: Message texts, oldest first
+            counter: Token counter for new messages
+
+        Returns:
+            Token count of each message
+        """
+        known = len(self.texts)
+        # The whole tracked prefix is compared; list equality checks identity
+        # before contents, so unchanged message strings compare without a scan
+        if len(texts) < known or list(texts[:known]) != self.texts:
+            self.texts, self.tokens, self.prefix = [], [], [0]
+            known = 0
+
+        for text in texts[known:]:
+            tokens = counter.count(text)
+            self.texts.append(text)
+            self.tokens.append(tokens)
+            self.prefix.append(self.prefix[-1] + tokens)
+        return self.tokens
+
+    @property
+    def total(self) -> int:
+        """Token total of the tracked history."""
+        return self.prefix[-1]
+
+
+class Segment(NamedTuple):
+    """A unit of context competing for the token budget."""
+
+    key: str
+    # Position within its variable (list index), kept in the output order
+    index: int
+    tokens: int
+    priority: float
+    required: bool = False
+    # Segments of a contiguous group are kept newest-first without gaps
+    # (e.g. chat history); higher index means newer
+    contiguous: bool = False
+
+
+class PackResult(NamedTuple):
+    """Outcome of packing segments into a budget."""
+
+    selected: List[Segment]
+    dropped: List[Segment]
+    tokens: int
+    strategy: str
+
+
+def _group_options(segments: List[Segment]) -> List[List[Tuple[int, float, List[Segment]]]]:
+    """
+    Turn segments into choice groups for a multiple-choice knapsack.
+
+    A contiguous group becomes one choice per number of newest segments kept;
+    every other segment is its own take-or-leave group.
+    """
+    groups: Dict[str, List[Segment]] = {}
+    options = []
+    for segment in segments:
+        if segment.contiguous:
+            groups.setdefault(segment.key, []).append(segment)
+        else:
+            options.append([(segment.tokens, segment.priority, [segment])])
+
+    for members in groups.values():
+        members.sort(key=lambda s: s.index, reverse=True)
+        choices, tokens, value = [], 0, 0.0
+        for n, segment in enumerate(members, 1):
+            tokens += segment.tokens
+            value += segment.priority
+            choices.append((tokens, value, members[:n]))
+        options.append(choices)
+    return options
+
+
+class TokenBudget:
+    """
+    Packs prioritized context segments into a token budget.
+
+    Required segments are always kept. The greedy strategy takes segments in
+    priority order while they fit; the knapsack strategy maximizes the total
+    priority kept, with token costs quantized to ``resolution`` buckets (costs
+    round up, so the result never exceeds the budget) and leftover room filled
+    greedily.
+    """
+
+    def __init__(self, strategy: str = "auto", resolution: int = 256, knapsack_max_cells: int = 50000):
+        """
+        Initialize the packer.
+
+        Args:
+            strategy: "greedy", "knapsack", or "auto" (knapsack when the
+                table stays under ``knapsack_max_cells``)
+            resolution: Number of capacity buckets for the knapsack table
+            knapsack_max_cells: Largest knapsack table "auto" will build
+        """
+        if strategy not in ("auto", "greedy", "knapsack"):
+            raise ValueError(f"Unknown packing strategy: {strategy}")
+        self.strategy = strategy
+        self.resolution = resolution
+        self.knapsack_max_cells = knapsack_max_cells
+        self.logger = logging.getLogger(__name__)
+
+    def pack(self, segments: List[Segment], budget: int) -> PackResult:
+        """
+        Choose the segments to keep.
+
+        Args:
+            segments: Candidate segments
+            budget: Token budget
+
+        Returns:
+            Selected and dropped segments (in input order) and tokens used
+        """
+        required = [s for s in segments if s.required]
+        optional = [s for s in segments if not s.required]
+        used = sum(s.tokens for s in required)
+        remaining = budget - used
+
+        if remaining <= 0 or not optional:
+            chosen, strategy = [], "required"
+        elif sum(s.tokens for s in optional) <= remaining:
+            chosen, strategy = optional, "all"
+        else:
+            strategy = self.strategy
+            if strategy == "auto":
+                options = sum(len(group) for group in _group_options(optional))
+                strategy = "knapsack" if options * self.resolution <= self.knapsack_max_cells else "greedy"
+            if strategy == "knapsack":
+                chosen = self._knapsack(optional, remaining)
+            else:
+                chosen = self._greedy(optional, remaining, [])
+
+        kept = {id(s) for s in required} | {id(s) for s in chosen}
+        selected = [s for s in segments if id(s) in kept]
+        dropped = [s for s in segments if id(s) not in kept]
+        return PackResult(selected, dropped, used + sum(s.tokens for s in chosen), strategy)
+
+    def _greedy(self, segments: List[Segment], capacity: int, chosen: List[Segment]) -> List[Segment]:
+        """Add segments in priority order while they fit, extending ``chosen``."""
+        taken = {id(s) for s in chosen}
+        capacity -= sum(s.tokens for s in chosen)
+
+        # Untaken members of each contiguous group, newest first; a group
+        # only ever grows by its newest untaken member
+        pending: Dict[str, List[Segment]] = {}
+        for segment in sorted(segments, key=lambda s: -s.index):
+            if segment.contiguous and id(segment) not in taken:
+                pending.setdefault(segment.key, []).append(segment)
+        closed = set()
+
+        ordered = sorted((s for s in segments if id(s) not in taken), key=lambda s: -s.priority)
+        for segment in ordered:
+            if segment.contiguous:
+                if segment.key in closed:
+                    continue
+                segment = pending[segment.key][0]
+            if segment.tokens <= capacity:
+                chosen.append(segment)
+                capacity -= segment.tokens
+                if segment.contiguous:
+                    pending[segment.key].pop(0)
+                    if not pending[segment.key]:
+                        closed.add(segment.key)
+            elif segment.contiguous:
+                closed.add(segment.key)
+        return chosen
+
+    def _knapsack(self, segments: List[Segment], capacity: int) -> List[Segment]:
+        """Multiple-choice knapsack over quantized token costs."""
+        groups = _group_options(segments)
+        scale = max(1, math.ceil(capacity / self.resolution))
+        cells = capacity // scale
+
+        # best[c] = (value, choices) using at most c buckets
+        best: List[Tuple[float, Tuple]] = [(0.0, ())] * (cells + 1)
+        for g, choices in enumerate(groups):
+            updated = list(best)
+            for option, (tokens, value, _) in enumerate(choices):
+                cost = math.ceil(tokens / scale)
+                if cost > cells:
+                    continue
+                for c in range(cost, cells + 1):
+                    candidate = best[c - cost][0] + value
+                    if candidate > updated[c][0]:
+                        updated[c] = (candidate, best[c - cost][1] + ((g, option),))
+            best = updated
+
+        chosen = []
+        for g, option in best[cells][1]:
+            chosen.extend(groups[g][option][2])
+        # Quantization rounds costs up; spend the slack greedily
+        return self._greedy(segments, capacity, chosen)
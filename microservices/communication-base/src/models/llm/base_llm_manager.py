@@ -4,9 +4,11 @@ Provides common functionality for model loading, caching, and adapter integratio
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import MutableMapping
+from contextlib import contextmanager
 import os
 import logging
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Iterator, Optional, List, Union
 import structlog
 from src.models.adapters.adapter_manager import AdapterManager
 from src.models.adapters.adapter_registry import AdapterRegistry
@@ -20,6 +22,41 @@ class ModelLoadingError(Exception):
     """Exception raised when model loading fails."""
     pass
 
+class _CachedModels(MutableMapping):
+    """
+    A manager's models by name, held only by the shared model cache.
+    
+    Names resolve to cache keys (model paths), so a model the cache evicts
+    or expires is gone from this view as well and its memory can be freed.
+    """
+    
+    def __init__(self, model_cache: ModelCache, model_paths: Dict[str, str]):
+        self._model_cache = model_cache
+        self._model_paths = model_paths
+    
+    def __getitem__(self, model_name: str) -> Any:
+        model_path = self._model_paths.get(model_name)
+        model = self._model_cache.get(model_path) if model_path is not None else None
+        if model is None:
+            raise KeyError(model_name)
+        return model
+    
+    def __setitem__(self, model_name: str, model: Any) -> None:
+        self._model_cache.put(self._model_paths.setdefault(model_name, model_name), model)
+    
+    def __delitem__(self, model_name: str) -> None:
+        del self._model_paths[model_name]
+    
+    def __contains__(self, model_name: object) -> bool:
+        model_path = self._model_paths.get(model_name)
+        return model_path is not None and model_path in self._model_cache
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter([model_name for model_name in list(self._model_paths) if model_name in self])
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
 class BaseLLMManager(ABC):
     """
     Base abstract class for LLM handling across different bot types.
@@ -39,8 +76,11 @@ class BaseLLMManager(ABC):
             bot_type: The type of bot (consultancy, sales, support)
         """
         self.bot_type = bot_type
-        self.models = {}
+        # Cache key (model path) of each loaded model, by model name
+        self.model_paths: Dict[str, str] = {}
         self.model_cache = ModelCache()
+        # Models are only held by the cache, so its memory budget applies
+        self.models = _CachedModels(self.model_cache, self.model_paths)
         self.adapter_manager = AdapterManager()
         self.adapter_registry = AdapterRegistry()
         self.config_integration = ConfigIntegration()
@@ -71,25 +111,20 @@ class BaseLLMManager(ABC):
         if not model_path:
             model_path = self.config.get(f"models.paths.{model_name}", f"models/{self.bot_type}/{model_name}")
         
-        # Check cache first
-        cached_model = self.model_cache.get(model_path)
-        if cached_model:
-            logger.info(f"Using cached model: {model_name} from {model_path}")
-            return cached_model
-        
         try:
-            logger.info(f"Loading model: {model_name} from {model_path}")
-            model = self._load_specific_model(model_path)
-            self.models[model_name] = model
-            self.model_cache.add(model_path, model)
+            # Served from the shared cache; concurrent requests share one load
+            model = self.model_cache.get_or_load(model_path, lambda: self._load_specific_model(model_path))
+            self.model_paths[model_name] = model_path
             return model
         except Exception as e:
             logger.error(f"Failed to load model {model_name} from {model_path}: {e}")
             if fallback_path:
                 logger.info(f"Attempting to load fallback model from {fallback_path}")
                 try:
-                    fallback_model = self._load_specific_model(fallback_path)
-                    self.models[model_name] = fallback_model
+                    fallback_model = self.model_cache.get_or_load(
+                        fallback_path, lambda: self._load_specific_model(fallback_path)
+                    )
+                    self.model_paths[model_name] = fallback_path
                     return fallback_model
                 except Exception as fallback_e:
                     logger.error(f"Failed to load fallback model from {fallback_path}: {fallback_e}")
@@ -109,11 +144,33 @@ class BaseLLMManager(ABC):
         Raises:
             KeyError: If the model is not loaded
         """
-        if model_name not in self.models:
+        model = self.models.get(model_name)
+        if model is None:
             logger.warning(f"Model {model_name} not loaded, attempting to load now")
-            return self.load_model(model_name)
+            return self.load_model(model_name, self.model_paths.get(model_name))
+            
+        return model
+    
+    @contextmanager
+    def use_model(self, model_name: str) -> Iterator[Any]:
+        """
+        Context manager yielding a model pinned in the shared cache.
+        
+        Wrap inference in it so the model cannot be evicted while in use.
+        The model is loaded first if it is not cached.
+        
+        Args:
+            model_name: Name of the model
             
-        return self.models[model_name]
+        Yields:
+            The model
+        """
+        if model_name not in self.model_paths:
+            self.load_model(model_name)
+        model_path = self.model_paths[model_name]
+        
+        with self.model_cache.use(model_path, loader=lambda: self._load_specific_model(model_path)) as model:
+            yield model
     
     def activate_adapter(self, model_name: str, adapter_name: str) -> bool:
         """
@@ -127,11 +184,11 @@ class BaseLLMManager(ABC):
             True if successful, False otherwise
         """
         logger.info(f"Activating adapter {adapter_name} for model {model_name}")
-        if model_name not in self.models:
+        model = self.models.get(model_name)
+        if model is None:
             logger.error(f"Cannot activate adapter: Model {model_name} not loaded")
             return False
             
-        model = self.models[model_name]
         return self.adapter_manager.activate_adapter(model, adapter_name)
     
     def get_adapter_list(self) -> List[str]:
@@ -150,15 +207,15 @@ class BaseLLMManager(ABC):
         Args:
             model_name: Name of the model to release
         """
-        if model_name in self.models:
+        if model_name in self.model_paths:
             logger.info(f"Releasing model: {model_name}")
-            # Implementation depends on specific model type
+            # The shared cache unloads the model once it is evicted
             del self.models[model_name]
     
     def release_all_models(self) -> None:
         """Release all model resources."""
         logger.info(f"Releasing all models for {self.bot_type}")
-        for model_name in list(self.models.keys()):
+        for model_name in list(self.model_paths):
             self.release_model(model_name)
     
     @abstractmethod
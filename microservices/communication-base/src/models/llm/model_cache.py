@@ -3,139 +3,571 @@ Model caching system for improving LLM performance.
 
 This module provides caching mechanisms for LLM models to avoid
 repeated loading of the same models and improve response times.
+
+The cache is bounded by entry count and, optionally, by the resident bytes
+of the cached models. Eviction is O(1) under an LRU or LFU policy, models in
+use can be pinned, and loads run in the background so lookups never hold
+the cache lock while a model is being loaded.
 """
 
 import logging
+import sys
 import time
-from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
 from threading import Lock
 
-class ModelCache:
+
+def estimate_model_bytes(model: Any) -> int:
     """
-    Cache for LLM models with time-based expiration.
-    
-    This cache stores loaded models and handles expiration to manage memory usage.
+    Estimate the resident memory of a model.
+
+    Tries, in order: ``get_memory_footprint()`` (transformers models), the
+    parameters and buffers of torch modules, an ``nbytes`` attribute (arrays),
+    and finally a shallow ``sys.getsizeof`` walk of dicts/lists (so that
+    ``{"model": ..., "tokenizer": ...}`` bundles are summed).
+
+    Args:
+        model: Loaded model instance
+
+    Returns:
+        Estimated size in bytes
     """
-    
-    _instance = None  # Singleton instance
-    
-    def __new__(cls):
-        """Implement singleton pattern."""
-        if cls._instance is None:
-            cls._instance = super(ModelCache, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
-    def __init__(self, max_cache_size=5, expiration_time=3600):
+    footprint = getattr(model, "get_memory_footprint", None)
+    if callable(footprint):
+        try:
+            return int(footprint())
+        except Exception:
+            pass
+
+    parameters = getattr(model, "parameters", None)
+    if callable(parameters):
+        try:
+            total = sum(p.numel() * p.element_size() for p in parameters())
+            buffers = getattr(model, "buffers", None)
+            if callable(buffers):
+                total += sum(b.numel() * b.element_size() for b in buffers())
+            return int(total)
+        except Exception:
+            pass
+
+    nbytes = getattr(model, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+
+    if isinstance(model, dict):
+        return sys.getsizeof(model) + sum(estimate_model_bytes(value) for value in model.values())
+    if isinstance(model, (list, tuple)):
+        return sys.getsizeof(model) + sum(estimate_model_bytes(value) for value in model)
+    return sys.getsizeof(model)
+
+
+class _CacheEntry:
+    """A cached model with its accounting data."""
+
+    __slots__ = ("model", "size_bytes", "timestamp", "hits", "pins")
+
+    def __init__(self, model: Any, size_bytes: int, timestamp: float):
+        self.model = model
+        self.size_bytes = size_bytes
+        self.timestamp = timestamp
+        self.hits = 0
+        self.pins = 0
+
+
+class LRUPolicy:
+    """Least-recently-used eviction order backed by an ordered dict."""
+
+    def __init__(self):
+        self._order: "OrderedDict[str, None]" = OrderedDict()
+
+    def add(self, model_id: str) -> None:
+        self._order[model_id] = None
+
+    def touch(self, model_id: str) -> None:
+        self._order.move_to_end(model_id)
+
+    def remove(self, model_id: str) -> None:
+        self._order.pop(model_id, None)
+
+    def candidates(self) -> Iterator[str]:
+        """Yield model IDs in eviction order (do not mutate while iterating)."""
+        return iter(self._order)
+
+
+class LFUPolicy:
+    """
+    Least-frequently-used eviction order with O(1) updates.
+
+    Models are kept in per-frequency buckets; ties within a bucket are broken
+    by recency, so the policy degrades to LRU among equally used models.
+    """
+
+    def __init__(self):
+        self._frequency: Dict[str, int] = {}
+        self._buckets: Dict[int, "OrderedDict[str, None]"] = {}
+        self._min_frequency = 0
+
+    def add(self, model_id: str) -> None:
+        self._frequency[model_id] = 1
+        self._buckets.setdefault(1, OrderedDict())[model_id] = None
+        self._min_frequency = 1
+
+    def touch(self, model_id: str) -> None:
+        frequency = self._frequency[model_id]
+        bucket = self._buckets[frequency]
+        del bucket[model_id]
+        if not bucket:
+            del self._buckets[frequency]
+            if self._min_frequency == frequency:
+                self._min_frequency = frequency + 1
+        self._frequency[model_id] = frequency + 1
+        self._buckets.setdefault(frequency + 1, OrderedDict())[model_id] = None
+
+    def remove(self, model_id: str) -> None:
+        frequency = self._frequency.pop(model_id, None)
+        if frequency is None:
+            return
+        bucket = self._buckets[frequency]
+        del bucket[model_id]
+        if not bucket:
+            del self._buckets[frequency]
+            if self._min_frequency == frequency:
+                self._min_frequency = min(self._buckets, default=0)
+
+    def candidates(self) -> Iterator[str]:
+        """Yield model IDs in eviction order (do not mutate while iterating)."""
+        if not self._buckets:
+            return
+        # The lowest bucket usually yields a victim; sort only if it is all pinned
+        yield from self._buckets[self._min_frequency]
+        for frequency in sorted(self._buckets):
+            if frequency != self._min_frequency:
+                yield from self._buckets[frequency]
+
+
+EVICTION_POLICIES = {"lru": LRUPolicy, "lfu": LFUPolicy}
+
+
+class ModelCacheEngine:
+    """
+    Memory-aware model cache with pinning and background loading.
+
+    Entries are bounded by ``max_cache_size`` and, when set, by
+    ``max_memory_bytes`` of resident model memory. Pinned models are never
+    evicted or expired; if only pinned models remain, the budget is exceeded
+    with a warning rather than unloading a model that is in use.
+    """
+
+    def __init__(
+        self,
+        max_cache_size: int = 5,
+        expiration_time: float = 3600,
+        max_memory_bytes: Optional[int] = None,
+        eviction_policy: str = "lru",
+        size_estimator: Callable[[Any], int] = estimate_model_bytes,
+        max_loader_threads: int = 2,
+        clock: Callable[[], float] = time.time
+    ):
         """
         Initialize the model cache.
-        
+
         Args:
             max_cache_size: Maximum number of models to keep in cache
-            expiration_time: Expiration time in seconds
+            expiration_time: Expiration time in seconds since last access
+            max_memory_bytes: Resident memory budget in bytes (None for no limit)
+            eviction_policy: Eviction policy ("lru" or "lfu")
+            size_estimator: Function estimating a model's resident bytes
+            max_loader_threads: Threads used for background loading
+            clock: Time source
         """
-        if self._initialized:
-            return
-            
+        if eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+
         self.logger = logging.getLogger(self.__class__.__name__)
         self.max_cache_size = max_cache_size
         self.expiration_time = expiration_time
-        self.cache: Dict[str, Tuple[Any, float]] = {}  # model_id -> (model, timestamp)
+        self.max_memory_bytes = max_memory_bytes
+        self.eviction_policy = eviction_policy
+        self.size_estimator = size_estimator
+        self.clock = clock
+
+        self.cache: Dict[str, _CacheEntry] = {}
+        self.policy = EVICTION_POLICIES[eviction_policy]()
         self.cache_lock = Lock()
-        self._initialized = True
-        self.logger.info(f"Model cache initialized with max size: {max_cache_size}, expiration: {expiration_time}s")
-    
+        self.resident_bytes = 0
+
+        # Loads in progress; waiters block on the future, not the lock
+        self._loading: Dict[str, Future] = {}
+        self._max_loader_threads = max_loader_threads
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.stats = {"hits": 0, "misses": 0, "loads": 0, "load_failures": 0,
+                      "evictions": 0, "expirations": 0, "load_waits": 0}
+
+        self.logger.info(
+            f"Model cache initialized with max size: {max_cache_size}, expiration: {expiration_time}s, "
+            f"memory budget: {max_memory_bytes or 'unlimited'} bytes, policy: {eviction_policy}"
+        )
+
     def get(self, model_id: str) -> Optional[Any]:
         """
         Get a model from cache if available and not expired.
-        
+
         Args:
             model_id: The ID of the model to retrieve
-            
+
         Returns:
             The cached model if available and not expired, None otherwise
         """
         with self.cache_lock:
-            if model_id not in self.cache:
-                return None
-            
-            model, timestamp = self.cache[model_id]
-            current_time = time.time()
-            
-            # Check if expired
-            if current_time - timestamp > self.expiration_time:
-                self.logger.info(f"Model {model_id} expired from cache")
-                del self.cache[model_id]
-                return None
-            
-            # Update timestamp on access
-            self.cache[model_id] = (model, current_time)
-            self.logger.debug(f"Cache hit for model: {model_id}")
-            return model
-    
-    def put(self, model_id: str, model: Any) -> None:
-        """
-        Add a model to the cache.
-        
+            entry = self._lookup(model_id)
+            return entry.model if entry else None
+
+    def __contains__(self, model_id: str) -> bool:
+        """
+        Check whether a live model is cached, without recording an access.
+
+        Args:
+            model_id: The ID of the model
+
+        Returns:
+            True if the model is cached and not expired
+        """
+        with self.cache_lock:
+            entry = self.cache.get(model_id)
+            return entry is not None and (
+                entry.pins > 0 or self.clock() - entry.timestamp <= self.expiration_time
+            )
+
+    def put(self, model_id: str, model: Any, size_bytes: Optional[int] = None) -> None:
+        """
+        Add a model to the cache, evicting others to stay within budget.
+
         Args:
             model_id: The ID to use for the model
             model: The model to cache
+            size_bytes: Resident size of the model (estimated if omitted)
         """
+        if size_bytes is None:
+            size_bytes = self.size_estimator(model)
+
         with self.cache_lock:
-            # Check if cache is full and evict oldest entry if needed
-            if len(self.cache) >= self.max_cache_size and model_id not in self.cache:
-                self._evict_oldest()
-            
-            # Add or update model in cache
-            self.cache[model_id] = (model, time.time())
-            self.logger.info(f"Added model to cache: {model_id}")
-    
-    def _evict_oldest(self) -> None:
-        """Evict the oldest model from the cache."""
-        if not self.cache:
+            self._insert(model_id, model, size_bytes)
+        self.logger.info(f"Added model to cache: {model_id} ({size_bytes} bytes)")
+
+    # Kept for callers using the older name
+    add = put
+
+    def load_async(self, model_id: str, loader: Callable[[], Any], size_bytes: Optional[int] = None) -> Future:
+        """
+        Get a model, loading it in the background on a miss.
+
+        Concurrent requests for the same model share one load. The cache
+        lock is only held to check and register state, never during the load.
+
+        Args:
+            model_id: The ID of the model
+            loader: Zero-argument callable that loads the model
+            size_bytes: Resident size of the model (estimated if omitted)
+
+        Returns:
+            Future resolving to the model
+        """
+        with self.cache_lock:
+            entry = self._lookup(model_id)
+            if entry is not None:
+                future: Future = Future()
+                future.set_result(entry.model)
+                return future
+
+            pending = self._loading.get(model_id)
+            if pending is not None:
+                self.stats["load_waits"] += 1
+                return pending
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_loader_threads, thread_name_prefix="model-loader"
+                )
+            future = Future()
+            self._loading[model_id] = future
+
+        self._executor.submit(self._run_load, model_id, loader, size_bytes, future)
+        return future
+
+    def get_or_load(
+        self,
+        model_id: str,
+        loader: Callable[[], Any],
+        size_bytes: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Get a model, loading it (once, in the background) on a miss.
+
+        Args:
+            model_id: The ID of the model
+            loader: Zero-argument callable that loads the model
+            size_bytes: Resident size of the model (estimated if omitted)
+            timeout: Maximum seconds to wait for the load
+
+        Returns:
+            The model
+        """
+        return self.load_async(model_id, loader, size_bytes).result(timeout)
+
+    def _run_load(self, model_id: str, loader: Callable[[], Any], size_bytes: Optional[int], future: Future) -> None:
+        """Load a model on a loader thread and publish it to waiters."""
+        try:
+            model = loader()
+            if size_bytes is None:
+                size_bytes = self.size_estimator(model)
+        except BaseException as e:
+            with self.cache_lock:
+                self.stats["load_failures"] += 1
+                self._loading.pop(model_id, None)
+            self.logger.error(f"Failed to load model {model_id}: {e}")
+            future.set_exception(e)
             return
-            
-        oldest_id = None
-        oldest_time = float('inf')
-        
-        for model_id, (_, timestamp) in self.cache.items():
-            if timestamp < oldest_time:
-                oldest_time = timestamp
-                oldest_id = model_id
-        
-        if oldest_id:
-            self.logger.info(f"Evicting oldest model from cache: {oldest_id}")
-            del self.cache[oldest_id]
-    
+
+        with self.cache_lock:
+            self.stats["loads"] += 1
+            self._insert(model_id, model, size_bytes)
+            self._loading.pop(model_id, None)
+        self.logger.info(f"Loaded model into cache: {model_id} ({size_bytes} bytes)")
+        future.set_result(model)
+
+    def pin(self, model_id: str) -> bool:
+        """
+        Pin a cached model so it cannot be evicted or expired.
+
+        Pins are counted; each ``pin`` needs a matching ``unpin``.
+
+        Args:
+            model_id: ID of the model to pin
+
+        Returns:
+            True if the model was cached and is now pinned
+        """
+        with self.cache_lock:
+            entry = self.cache.get(model_id)
+            if entry is None:
+                return False
+            entry.pins += 1
+            return True
+
+    def unpin(self, model_id: str) -> None:
+        """
+        Release a pin and apply any eviction deferred while it was held.
+
+        Args:
+            model_id: ID of the model to unpin
+        """
+        with self.cache_lock:
+            entry = self.cache.get(model_id)
+            if entry is not None and entry.pins > 0:
+                entry.pins -= 1
+                self._enforce_budget()
+
+    @contextmanager
+    def use(self, model_id: str, loader: Optional[Callable[[], Any]] = None) -> Iterator[Any]:
+        """
+        Context manager yielding a model pinned for the duration of the block.
+
+        Args:
+            model_id: ID of the model
+            loader: Loader used on a cache miss (None to yield None on a miss)
+
+        Yields:
+            The model, or None if not cached and no loader was given
+        """
+        model = self._acquire(model_id)
+        pinned = model is not None
+        if not pinned and loader is not None:
+            model = self.get_or_load(model_id, loader)
+            # Pin atomically; only fails if the model was evicted right after loading
+            pinned_model = self._acquire(model_id)
+            pinned = pinned_model is not None
+            model = pinned_model if pinned else model
+        try:
+            yield model
+        finally:
+            if pinned:
+                self.unpin(model_id)
+
+    def _acquire(self, model_id: str) -> Optional[Any]:
+        """Look up and pin a model in one critical section."""
+        with self.cache_lock:
+            entry = self._lookup(model_id)
+            if entry is None:
+                return None
+            entry.pins += 1
+            return entry.model
+
+    def _lookup(self, model_id: str) -> Optional[_CacheEntry]:
+        """Return a live entry and record the access (lock held)."""
+        entry = self.cache.get(model_id)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        current_time = self.clock()
+        if not entry.pins and current_time - entry.timestamp > self.expiration_time:
+            self.logger.info(f"Model {model_id} expired from cache")
+            self._remove_entry(model_id)
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        entry.timestamp = current_time
+        entry.hits += 1
+        self.policy.touch(model_id)
+        self.stats["hits"] += 1
+        self.logger.debug(f"Cache hit for model: {model_id}")
+        return entry
+
+    def _insert(self, model_id: str, model: Any, size_bytes: int) -> None:
+        """Add or replace an entry and enforce the budget (lock held)."""
+        existing = self.cache.get(model_id)
+        pins = existing.pins if existing else 0
+        if existing is not None:
+            self._remove_entry(model_id)
+
+        entry = _CacheEntry(model, size_bytes, self.clock())
+        entry.pins = pins
+        self.cache[model_id] = entry
+        self.policy.add(model_id)
+        self.resident_bytes += size_bytes
+        self._enforce_budget(protect=model_id)
+
+    def _over_budget(self) -> bool:
+        if len(self.cache) > self.max_cache_size:
+            return True
+        return self.max_memory_bytes is not None and self.resident_bytes > self.max_memory_bytes
+
+    def _enforce_budget(self, protect: Optional[str] = None) -> None:
+        """Evict unpinned models in policy order until within budget (lock held)."""
+        if not self._over_budget():
+            return
+
+        # Pick victims first; the policy's order must not change mid-iteration
+        excess_models = len(self.cache) - self.max_cache_size
+        excess_bytes = (self.resident_bytes - self.max_memory_bytes
+                        if self.max_memory_bytes is not None else 0)
+        victims = []
+        for model_id in self.policy.candidates():
+            if excess_models <= 0 and excess_bytes <= 0:
+                break
+            entry = self.cache[model_id]
+            if model_id == protect or entry.pins:
+                continue
+            victims.append(model_id)
+            excess_models -= 1
+            excess_bytes -= entry.size_bytes
+
+        for model_id in victims:
+            self.logger.info(f"Evicting model from cache: {model_id}")
+            self._remove_entry(model_id)
+            self.stats["evictions"] += 1
+
+        if self._over_budget():
+            self.logger.warning(
+                f"Model cache over budget ({len(self.cache)} models, {self.resident_bytes} bytes); "
+                f"remaining models are pinned"
+            )
+
+    def _remove_entry(self, model_id: str) -> None:
+        entry = self.cache.pop(model_id)
+        self.policy.remove(model_id)
+        self.resident_bytes -= entry.size_bytes
+
     def clear(self) -> None:
         """Clear all models from the cache."""
         with self.cache_lock:
             self.cache.clear()
+            self.policy = EVICTION_POLICIES[self.eviction_policy]()
+            self.resident_bytes = 0
             self.logger.info("Cache cleared")
-    
+
     def remove(self, model_id: str) -> None:
         """
         Remove a specific model from the cache.
-        
+
         Args:
             model_id: ID of the model to remove
         """
         with self.cache_lock:
             if model_id in self.cache:
-                del self.cache[model_id]
+                self._remove_entry(model_id)
                 self.logger.info(f"Removed model from cache: {model_id}")
-    
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get cache statistics.
-        
+
         Returns:
             Dictionary with cache statistics
         """
         with self.cache_lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
             return {
                 "size": len(self.cache),
                 "max_size": self.max_cache_size,
                 "expiration_time": self.expiration_time,
-                "models": list(self.cache.keys())
-            } 
\ No newline at end of file
+                "resident_bytes": self.resident_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "eviction_policy": self.eviction_policy,
+                "models": list(self.cache.keys()),
+                "pinned": [model_id for model_id, entry in self.cache.items() if entry.pins],
+                "loading": list(self._loading),
+                "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0,
+                **self.stats
+            }
+
+
+class ModelCache(ModelCacheEngine):
+    """
+    Process-wide model cache shared by the LLM managers.
+
+    The first construction configures the cache; later constructions return
+    the same instance and ignore their arguments.
+    """
+
+    _instance = None  # Singleton instance
+
+    def __new__(cls, *args, **kwargs):
+        """Implement singleton pattern."""
+        if cls._instance is None:
+            cls._instance = super(ModelCache, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(
+        self,
+        max_cache_size: int = 5,
+        expiration_time: float = 3600,
+        max_memory_bytes: Optional[int] = None,
+        eviction_policy: str = "lru"
+    ):
+        """
+        Initialize the model cache.
+
+        Args:
+            max_cache_size: Maximum number of models to keep in cache
+            expiration_time: Expiration time in seconds
+            max_memory_bytes: Resident memory budget in bytes (None for no limit)
+            eviction_policy: Eviction policy ("lru" or "lfu")
+        """
+        if self._initialized:
+            return
+
+        super().__init__(
+            max_cache_size=max_cache_size,
+            expiration_time=expiration_time,
+            max_memory_bytes=max_memory_bytes,
+            eviction_policy=eviction_policy
+        )
+        self._initialized = True
@@ -6,18 +6,22 @@ multiple sessions, enabling seamless conversation continuity and improved
 personalization.
 """
 
+import asyncio
 import logging
 import json
 import time
+import weakref
 from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
 from src.config.config_inheritance import ConfigInheritance
-from src.clients.system_users_conversation_repository_client import SystemUsersRepositoryClient
+from src.clients.system_users_conversation_repository_client import SystemUsersConversationRepositoryClient
 from src.clients.campaign_users_repository_client import CampaignUsersRepositoryClient
 from src.langchain_components.nlp.hybrid_processor import hybrid_processor
 from src.storage.entity_history_tracker import EntityHistoryTracker
 from src.analytics.entity_trend_analyzer import EntityTrendAnalyzer
+from src.langchain_components.rag.memo_cache import AsyncMemoCache
+from src.session.session_digest import CrossSessionDigest, digest_scope
 
 class CrossSessionContextBuilder:
     """
@@ -27,16 +31,39 @@ class CrossSessionContextBuilder:
     1. Track entity data across multiple sessions
     2. Analyze trends in user interactions
     3. Build contextual background for new sessions
+    
+    Historical sessions are folded into a per-user digest when each session
+    closes (see record_session_close), so building context reads one
+    precomputed document instead of re-fetching and re-aggregating the
+    user's past sessions.
     """
     
-    def __init__(self):
-        """Initialize the cross-session context builder."""
+    def __init__(
+        self,
+        digest_window: int = 20,
+        digest_cache_size: int = 1024,
+        digest_cache_ttl: float = 300.0
+    ):
+        """
+        Initialize the cross-session context builder.
+        
+        Args:
+            digest_window: Number of most recent sessions kept in detail in a
+                digest (deeper context falls back to fetching history)
+            digest_cache_size: Maximum number of digests cached in process
+            digest_cache_ttl: Lifetime of a cached digest in seconds
+        """
         self.logger = logging.getLogger(__name__)
         self.config_inheritance = ConfigInheritance()
-        self.system_repo_client = SystemUsersRepositoryClient()
+        self.system_repo_client = SystemUsersConversationRepositoryClient()
         self.campaign_repo_client = CampaignUsersRepositoryClient()
         self.entity_history_tracker = EntityHistoryTracker()
         self.entity_trend_analyzer = EntityTrendAnalyzer()
+        
+        self.digest_window = digest_window
+        self.digest_cache = AsyncMemoCache(max_entries=digest_cache_size, ttl_seconds=digest_cache_ttl)
+        # Serializes read-modify-write of a digest; idle locks are dropped
+        self._digest_locks: "weakref.WeakValueDictionary[Tuple[str, str], asyncio.Lock]" = weakref.WeakValueDictionary()
     
     async def build_cross_session_context(
         self, 
@@ -66,34 +93,30 @@ class CrossSessionContextBuilder:
             if context_depth is None:
                 context_depth = session_config.get("context_depth", 3)  # Default to 3 sessions
             
-            # Determine which repository to use
-            if campaign_id:
-                historical_data = await self.campaign_repo_client.get_user_history(
-                    user_id=user_id,
-                    campaign_id=campaign_id,
-                    limit=context_depth
-                )
+            last_conversation = None
+            digest = await self._get_digest(user_id, campaign_id)
+            if digest is not None and digest.covers(context_depth):
+                context = digest.to_context(context_depth)
+                last_conversation = digest.last_conversation(self._format_time_ago)
             else:
-                historical_data = await self.system_repo_client.get_user_history(
-                    user_id=user_id,
-                    limit=context_depth
-                )
-            
-            # Process historical data
-            context = await self._process_historical_data(historical_data, bot_type)
-            
-            # Add entity trends analysis
-            entity_trends = await self._analyze_entity_trends(user_id, bot_type, campaign_id)
+                # Deeper than the digest keeps: fetch and process the sessions
+                historical_data = await self._get_user_history(user_id, campaign_id, context_depth)
+                context = await self._process_historical_data(historical_data, bot_type)
+            
+            # Entity trends and profile are independent lookups
+            entity_trends, profile_data = await asyncio.gather(
+                self._analyze_entity_trends(user_id, bot_type, campaign_id),
+                self._get_user_profile(user_id, bot_type, campaign_id)
+            )
             if entity_trends:
                 context["entity_trends"] = entity_trends
             
-            # Add user profile data
-            profile_data = await self._get_user_profile(user_id, bot_type, campaign_id)
             if profile_data:
                 context["user_profile"] = profile_data
             
             # Add last conversation summary if available
-            last_conversation = await self._get_last_conversation_summary(user_id, bot_type, campaign_id)
+            if last_conversation is None:
+                last_conversation = await self._get_last_conversation_summary(user_id, bot_type, campaign_id)
             if last_conversation:
                 context["last_conversation"] = last_conversation
             
@@ -103,6 +126,149 @@ class CrossSessionContextBuilder:
             self.logger.error(f"Error building cross-session context: {e}")
             return {}
     
+    async def _get_user_history(
+        self,
+        user_id: str,
+        campaign_id: Optional[str],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch a user's most recent sessions (newest first) from the repository.
+        
+        Args:
+            user_id: User identifier
+            campaign_id: Optional campaign identifier
+            limit: Maximum number of sessions
+            
+        Returns:
+            List of historical session data
+        """
+        if campaign_id:
+            return await self.campaign_repo_client.get_user_history(
+                user_id=user_id,
+                campaign_id=campaign_id,
+                limit=limit
+            )
+        return await self.system_repo_client.get_user_history(
+            user_id=user_id,
+            limit=limit
+        )
+    
+    async def _get_digest(self, user_id: str, campaign_id: Optional[str] = None) -> Optional[CrossSessionDigest]:
+        """
+        Get a user's cross-session digest (cache, then repository).
+        
+        Users without a stored digest get one backfilled once from their most
+        recent sessions; lifetime counters then start from those sessions.
+        
+        Args:
+            user_id: User identifier
+            campaign_id: Optional campaign identifier
+            
+        Returns:
+            Digest, or None if it could not be loaded
+        """
+        key = (user_id, digest_scope(campaign_id))
+        try:
+            return await self.digest_cache.get_or_compute(
+                key,
+                lambda: self._load_digest(user_id, campaign_id),
+                should_cache=lambda digest: digest is not None
+            )
+        except Exception as e:
+            self.logger.error(f"Error loading cross-session digest for {user_id}: {e}")
+            return None
+    
+    async def _load_digest(self, user_id: str, campaign_id: Optional[str]) -> Optional[CrossSessionDigest]:
+        """
+        Load a digest from the repository, backfilling it if none is stored.
+        
+        Only a missing digest is backfilled; when the repository fails, the
+        stored digest is left alone and None is returned, so callers fall
+        back to fetching history.
+        
+        Args:
+            user_id: User identifier
+            campaign_id: Optional campaign identifier
+            
+        Returns:
+            Digest, or None if it could not be loaded
+        """
+        if campaign_id:
+            document = await self.campaign_repo_client.get_user_digest(user_id, campaign_id)
+        else:
+            document = await self.system_repo_client.get_user_digest(user_id)
+        if document is None:
+            return None
+        
+        digest = CrossSessionDigest.from_dict(document)
+        if digest is not None:
+            return digest
+        
+        history = await self._get_user_history(user_id, campaign_id, self.digest_window)
+        digest = CrossSessionDigest.from_sessions(reversed(history or []), window=self.digest_window)
+        await self._store_digest(user_id, campaign_id, digest)
+        self.logger.info(f"Backfilled cross-session digest for {user_id} from {len(history or [])} sessions")
+        return digest
+    
+    async def _store_digest(self, user_id: str, campaign_id: Optional[str], digest: CrossSessionDigest) -> bool:
+        """
+        Store a digest in the repository.
+        
+        Args:
+            user_id: User identifier
+            campaign_id: Optional campaign identifier
+            digest: Digest to store
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if campaign_id:
+            return await self.campaign_repo_client.store_user_digest(user_id, campaign_id, digest.to_dict())
+        return await self.system_repo_client.store_user_digest(user_id, digest.to_dict())
+    
+    async def record_session_close(
+        self,
+        user_id: str,
+        session_data: Dict[str, Any],
+        campaign_id: Optional[str] = None
+    ) -> bool:
+        """
+        Fold a closed session into the user's cross-session digest.
+        
+        Args:
+            user_id: User identifier
+            session_data: Session data with "entities", "topics", "questions",
+                "summary", "session_id" and "timestamp"
+            campaign_id: Optional campaign identifier
+            
+        Returns:
+            True if the digest was updated and stored, False otherwise
+        """
+        key = (user_id, digest_scope(campaign_id))
+        lock = self._digest_locks.get(key)
+        if lock is None:
+            lock = self._digest_locks[key] = asyncio.Lock()
+        
+        try:
+            async with lock:
+                digest = await self._get_digest(user_id, campaign_id)
+                if digest is None:
+                    return False
+                session_data.setdefault("timestamp", time.time())
+                digest.add_session(session_data)
+                stored = await self._store_digest(user_id, campaign_id, digest)
+                if stored:
+                    self.digest_cache.set(key, digest)
+                else:
+                    # Reload the stored version next time
+                    self.digest_cache.invalidate(key)
+                return stored
+        except Exception as e:
+            self.logger.error(f"Error recording session close for {user_id}: {e}")
+            self.digest_cache.invalidate(key)
+            return False
+    
     async def _process_historical_data(
         self, 
         historical_data: List[Dict[str, Any]],
@@ -423,11 +589,15 @@ class CrossSessionContextBuilder:
         """
         try:
             # Get last conversation summary
-            last_conversation = await self._get_last_conversation_summary(
-                user_id=user_id,
-                bot_type=bot_type,
-                campaign_id=campaign_id
-            )
+            digest = await self._get_digest(user_id, campaign_id)
+            if digest is not None:
+                last_conversation = digest.last_conversation(self._format_time_ago)
+            else:
+                last_conversation = await self._get_last_conversation_summary(
+                    user_id=user_id,
+                    bot_type=bot_type,
+                    campaign_id=campaign_id
+                )
             
             if not last_conversation:
                 return ""
@@ -0,0 +1,225 @@
+"""
+Per-user cross-session digest.
+
+This module provides the precomputed document that the cross-session context
+builder reads when a session starts. The digest is updated incrementally each
+time one of the user's sessions closes, so building context reads one
+document instead of fetching and re-aggregating the user's historical
+sessions.
+"""
+
+from collections import Counter, deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+CONCERN_TYPES = ("PAIN_POINT", "CONCERN")
+
+
+def digest_scope(campaign_id: Optional[str] = None) -> str:
+    """
+    Get the digest scope for a conversation.
+
+    Args:
+        campaign_id: Optional campaign identifier
+
+    Returns:
+        "system" or "campaign:<campaign_id>"
+    """
+    return f"campaign:{campaign_id}" if campaign_id else "system"
+
+
+def _top(counts: Counter, limit: int) -> List[str]:
+    return [name for name, _ in counts.most_common(limit)]
+
+
+class CrossSessionDigest:
+    """
+    Incrementally maintained summary of a user's past sessions.
+
+    Keeps per-session contributions (entities, topic and concern counts) for
+    the most recent ``window`` sessions, so context for any depth up to the
+    window is combined from those alone, plus lifetime counters and the last
+    session's summary.
+    """
+
+    VERSION = 1
+
+    def __init__(self, window: int = 20):
+        """
+        Initialize an empty digest.
+
+        Args:
+            window: Number of most recent sessions kept in detail
+        """
+        self.window = window
+        # Most recent session last
+        self.recent: deque = deque(maxlen=window)
+        self.session_count = 0
+        self.topic_counts: Counter = Counter()
+        self.question_topic_counts: Counter = Counter()
+        self.concern_counts: Counter = Counter()
+        self.last_session: Optional[Dict[str, Any]] = None
+        # Combined context by depth, reset whenever a session is added
+        self._contexts: Dict[int, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[Dict[str, Any]], window: int = 20) -> "CrossSessionDigest":
+        """
+        Build a digest from historical sessions (used once per user to backfill).
+
+        Args:
+            sessions: Session data, oldest first
+            window: Number of most recent sessions kept in detail
+
+        Returns:
+            Digest
+        """
+        digest = cls(window)
+        for session_data in sessions:
+            digest.add_session(session_data)
+        return digest
+
+    def add_session(self, session_data: Dict[str, Any]) -> None:
+        """
+        Fold a closed session into the digest.
+
+        Args:
+            session_data: Session data with "entities", "topics", "questions",
+                "summary", "session_id" and "timestamp"
+        """
+        entities = list(session_data.get("entities", []))
+        topics = Counter(t.get("name") for t in session_data.get("topics", []) if t.get("name"))
+        questions = Counter(q.get("topic") for q in session_data.get("questions", []) if q.get("topic"))
+        concerns = Counter(
+            e.get("value") for e in entities if e.get("type") in CONCERN_TYPES and e.get("value")
+        )
+
+        self.recent.append({
+            "session_id": session_data.get("session_id"),
+            "timestamp": session_data.get("timestamp", 0),
+            "entities": entities,
+            "topics": dict(topics),
+            "questions": dict(questions),
+            "concerns": dict(concerns),
+        })
+        self.session_count += 1
+        self._contexts.clear()
+        self.topic_counts.update(topics)
+        self.question_topic_counts.update(questions)
+        self.concern_counts.update(concerns)
+        self.last_session = {
+            "session_id": session_data.get("session_id"),
+            "summary": session_data.get("summary", ""),
+            "key_entities": [e for e in entities if e.get("importance", 0) > 0.7],
+            "timestamp": session_data.get("timestamp", 0),
+        }
+
+    def covers(self, depth: int) -> bool:
+        """
+        Check whether the digest holds enough detail for a context depth.
+
+        Args:
+            depth: Number of most recent sessions to combine
+
+        Returns:
+            True if the depth is within the window or all sessions are kept
+        """
+        return depth <= self.window or self.session_count <= self.window
+
+    def to_context(self, depth: int) -> Dict[str, Any]:
+        """
+        Combine the most recent sessions into cross-session context.
+
+        Args:
+            depth: Number of most recent sessions to combine
+
+        Returns:
+            Context with entity history, top topics, question topics and
+            frequent concerns (a new top-level dict; nested values are shared)
+        """
+        if depth not in self._contexts:
+            self._contexts[depth] = self._combine(depth)
+        return dict(self._contexts[depth])
+
+    def _combine(self, depth: int) -> Dict[str, Any]:
+        sessions = list(self.recent)[-depth:] if depth > 0 else []
+        if not sessions:
+            return {}
+
+        entity_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        topics, questions, concerns = Counter(), Counter(), Counter()
+        # Newest session first, as the repository returns history
+        for session in reversed(sessions):
+            for entity in session["entities"]:
+                entity_type = entity.get("type")
+                if entity_type:
+                    entity_by_type.setdefault(entity_type, []).append(entity)
+            topics.update(session["topics"])
+            questions.update(session["questions"])
+            concerns.update(session["concerns"])
+
+        return {
+            "entity_history": entity_by_type,
+            "conversation_topics": _top(topics, 5),
+            "question_topics": _top(questions, 5),
+            "frequent_concerns": _top(concerns, 3),
+            "lifetime_topics": _top(self.topic_counts, 5),
+            "session_count": self.session_count,
+        }
+
+    def last_conversation(self, format_time_ago: Callable[[float], str]) -> Dict[str, Any]:
+        """
+        Get the last session's summary.
+
+        Args:
+            format_time_ago: Formats a timestamp relative to now
+
+        Returns:
+            Summary, key entities and time since the session (empty if none)
+        """
+        if not self.last_session:
+            return {}
+        return {
+            "summary": self.last_session["summary"],
+            "key_entities": self.last_session["key_entities"],
+            "time_ago": format_time_ago(self.last_session["timestamp"]),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the digest as one document.
+
+        Returns:
+            Digest document
+        """
+        return {
+            "version": self.VERSION,
+            "window": self.window,
+            "recent": list(self.recent),
+            "session_count": self.session_count,
+            "topic_counts": dict(self.topic_counts),
+            "question_topic_counts": dict(self.question_topic_counts),
+            "concern_counts": dict(self.concern_counts),
+            "last_session": self.last_session,
+        }
+
+    @classmethod
+    def from_dict(cls, document: Dict[str, Any]) -> Optional["CrossSessionDigest"]:
+        """
+        Deserialize a digest document.
+
+        Args:
+            document: Digest document
+
+        Returns:
+            Digest, or None for a missing or incompatible document
+        """
+        if not document or document.get("version") != cls.VERSION:
+            return None
+        digest = cls(document.get("window", 20))
+        digest.recent.extend(document.get("recent", []))
+        digest.session_count = document.get("session_count", len(digest.recent))
+        digest.topic_counts = Counter(document.get("topic_counts", {}))
+        digest.question_topic_counts = Counter(document.get("question_topic_counts", {}))
+        digest.concern_counts = Counter(document.get("concern_counts", {}))
+        digest.last_session = document.get("last_session")
+        return digest
@@ -0,0 +1,211 @@
+"""
+Tests for lazy backend loading and batching in the consultancy bot NLP processor.
+"""
+
+import asyncio
+import importlib
+import importlib.machinery
+import time
+import types
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from src.bot_integration.consultancy_bot import nlp_processor
+
+
+class FakeLanguage:
+    """Stand-in for a spaCy Language object."""
+
+    pipe_names = ["tok2vec", "tagger", "parser", "ner", "textcat"]
+
+    def __init__(self):
+        self.disabled = []
+
+    def disable_pipe(self, name):
+        self.disabled.append(name)
+
+
+def make_fake_backends():
+    """Build fake spacy and nltk modules that record when they load anything."""
+    spacy = types.ModuleType("spacy")
+    spacy.__spec__ = importlib.machinery.ModuleSpec("spacy", None)
+    spacy.load = mock.Mock(side_effect=lambda name: FakeLanguage())
+    spacy.cli = mock.Mock()
+
+    nltk = types.ModuleType("nltk")
+    nltk.__spec__ = importlib.machinery.ModuleSpec("nltk", None)
+    nltk.download = mock.Mock()
+    corpus = types.ModuleType("nltk.corpus")
+    corpus.stopwords = mock.Mock(words=mock.Mock(return_value=["the", "a"]))
+    tokenize = types.ModuleType("nltk.tokenize")
+    tokenize.word_tokenize = str.split
+    stem = types.ModuleType("nltk.stem")
+    stem.WordNetLemmatizer = mock.Mock()
+
+    return {
+        "spacy": spacy,
+        "nltk": nltk,
+        "nltk.corpus": corpus,
+        "nltk.tokenize": tokenize,
+        "nltk.stem": stem,
+    }
+
+
+class TestLazyLoading(unittest.TestCase):
+    """Test cases for on-demand loading of the spaCy and NLTK backends."""
+
+    def setUp(self):
+        self.reloaded = False
+        self.addCleanup(self.restore_module)
+        self.modules = make_fake_backends()
+        patcher = mock.patch.dict(sys.modules, self.modules)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.reset_backends)
+        self.reset_backends()
+
+    def reset_backends(self):
+        nlp_processor._spacy_models.clear()
+        nlp_processor._nltk_backend = None
+        nlp_processor.STOP_WORDS = nlp_processor.FALLBACK_STOP_WORDS
+
+    def restore_module(self):
+        # Runs after the fake backends are removed from sys.modules
+        if self.reloaded:
+            importlib.reload(nlp_processor)
+
+    def test_nothing_loads_at_import_or_construction(self):
+        """Test that importing the module and building a processor load no backend."""
+        module = importlib.reload(nlp_processor)
+        self.reloaded = True
+
+        self.assertTrue(module.SPACY_AVAILABLE)
+        self.assertTrue(module.NLTK_AVAILABLE)
+        processor = module.NLPProcessor()
+        self.assertTrue(processor.use_spacy)
+        self.assertTrue(processor.use_nltk)
+
+        self.modules["spacy"].load.assert_not_called()
+        self.modules["nltk"].download.assert_not_called()
+        self.assertEqual(module._spacy_models, {})
+        self.assertIsNone(module._nltk_backend)
+
+    def test_spacy_model_loads_once_on_first_use(self):
+        """Test that the model is loaded on first access and cached per disable set."""
+        with mock.patch.object(nlp_processor, "SPACY_AVAILABLE", True):
+            processor = nlp_processor.NLPProcessor(use_nltk=False, disable_components=["ner"])
+        spacy = self.modules["spacy"]
+        spacy.load.assert_not_called()
+
+        model = processor.nlp
+        self.assertIs(processor.nlp, model)
+        spacy.load.assert_called_once_with(nlp_processor.SPACY_MODELS[0])
+        self.assertEqual(model.disabled, ["ner", "textcat"])
+
+        self.assertIsNot(nlp_processor.load_spacy_model(), model)
+        self.assertEqual(spacy.load.call_count, 2)
+
+    def test_nltk_backend_loads_once_on_first_use(self):
+        """Test that NLTK resources are downloaded on first use only."""
+        with mock.patch.object(nlp_processor, "NLTK_AVAILABLE", True):
+            processor = nlp_processor.NLPProcessor(use_spacy=False)
+        nltk = self.modules["nltk"]
+        nltk.download.assert_not_called()
+
+        self.assertEqual(processor.stop_words, {"the", "a"})
+        self.assertEqual(processor.stop_words, {"the", "a"})
+        self.assertEqual(nltk.download.call_count, 3)
+        self.assertEqual(nlp_processor.STOP_WORDS, {"the", "a"})
+
+
+class TestProcessTexts(unittest.TestCase):
+    """Test cases for batch processing with NLPProcessor.process_texts."""
+
+    def setUp(self):
+        self.processor = nlp_processor.NLPProcessor(use_spacy=False, use_nltk=False)
+        self.texts = [
+            "Hey, we need a marketing strategy ASAP!",
+            "",
+            "Could you kindly review our budget and cash flow forecast?",
+            None,
+            "FYI the supply chain workflow is pending.",
+        ]
+
+    def test_matches_per_text_results(self):
+        """Test that batch results equal processing each text on its own."""
+        batched = self.processor.process_texts(self.texts)
+        single = [self.processor.process_text(text) for text in self.texts]
+
+        self.assertEqual([f.as_dict() for f in batched], [f.as_dict() for f in single])
+        self.assertEqual(batched[1].as_dict(), nlp_processor.NLPFeatures().as_dict())
+        self.assertEqual(batched[0].domain_terms.get("marketing"), ["market"])
+
+    def test_uses_one_pipe_pass_with_spacy(self):
+        """Test that valid texts go through a single nlp.pipe call in order."""
+        nlp = mock.Mock()
+        nlp.pipe.side_effect = lambda texts, **kwargs: [None for _ in texts]
+        self.processor.use_spacy = True
+
+        with mock.patch.object(nlp_processor, "load_spacy_model", return_value=nlp):
+            batched = self.processor.process_texts(self.texts, batch_size=8)
+
+        nlp.pipe.assert_called_once()
+        args, kwargs = nlp.pipe.call_args
+        self.assertEqual(len(args[0]), 3)
+        self.assertEqual(kwargs["batch_size"], 8)
+        self.assertEqual(batched[2].request_type, "question")
+
+
+class TestNLPBatcher(unittest.TestCase):
+    """Test cases for micro-batching with NLPBatcher."""
+
+    def setUp(self):
+        self.processor = nlp_processor.NLPProcessor(use_spacy=False, use_nltk=False)
+        self.texts = ["first request?", "please deploy it", "no rush", "thanks"]
+
+    def test_flushes_when_batch_is_full(self):
+        """Test that a full batch is processed without waiting for the timer."""
+        batcher = nlp_processor.NLPBatcher(self.processor, max_batch_size=2, max_wait_ms=60_000)
+
+        async def run():
+            results = await asyncio.wait_for(
+                asyncio.gather(*(batcher.process_text(text) for text in self.texts)), timeout=5
+            )
+            await batcher.close()
+            return results
+
+        with mock.patch.object(self.processor, "process_texts", wraps=self.processor.process_texts) as spy:
+            results = asyncio.run(run())
+
+        self.assertEqual([len(call.args[0]) for call in spy.call_args_list], [2, 2])
+        self.assertEqual(batcher.batches_processed, 2)
+        self.assertEqual(batcher.texts_processed, 4)
+        self.assertEqual(
+            [f.as_dict() for f in results],
+            [self.processor.process_text(text).as_dict() for text in self.texts]
+        )
+
+    def test_flushes_partial_batch_after_timeout(self):
+        """Test that a partial batch is processed once max_wait_ms elapses."""
+        batcher = nlp_processor.NLPBatcher(self.processor, max_batch_size=100, max_wait_ms=50)
+
+        async def run():
+            start = time.perf_counter()
+            results = await asyncio.gather(*(batcher.process_text(text) for text in self.texts[:3]))
+            return results, time.perf_counter() - start
+
+        results, elapsed = asyncio.run(run())
+
+        self.assertGreaterEqual(elapsed, 0.045)
+        self.assertEqual(batcher.batches_processed, 1)
+        self.assertEqual(batcher.texts_processed, 3)
+        self.assertEqual(results[2].as_dict(), self.processor.process_text(self.texts[2]).as_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Tests for the middleware processor scheduler.
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from src.conversation.middleware.scheduler import ProcessorGraph, declare_processor
+from src.conversation.middleware.base_processors import (
+    entity_extraction_processor,
+    intent_detection_processor,
+    message_summarization_processor,
+    sentiment_analysis_processor,
+)
+
+
+def make_processor(name, log, reads=(), writes=(), transforms=False, delay=0.01, declared=True):
+    async def processor(message, context, bot_type):
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        log.append(("end", name))
+        seen = ",".join(str(context.get(key)) for key in reads)
+        updates = {key: f"{name}:{seen}" for key in writes}
+        return (f"{message}+{name}" if transforms else message), updates
+
+    processor.__name__ = name
+    if declared:
+        declare_processor(reads, writes, transforms)(processor)
+    return processor
+
+
+def call(processor, message, context):
+    return processor(message, context, "sales")
+
+
+class TestProcessorGraph(unittest.TestCase):
+    """Test cases for ProcessorGraph."""
+
+    def test_independent_processors_run_concurrently(self):
+        log = []
+        processors = [make_processor(name, log, writes=[name]) for name in "abc"]
+        graph = ProcessorGraph(processors)
+        self.assertEqual(graph.levels(), [["a", "b", "c"]])
+
+        _, context = asyncio.run(graph.run("hi", {}, call))
+        self.assertEqual([event for event, _ in log[:3]], ["start"] * 3)
+        self.assertEqual(set(context), {"a", "b", "c"})
+
+    def test_dependencies_follow_registration_order(self):
+        log = []
+        processors = [
+            make_processor("writer", log, writes=["x"]),
+            make_processor("reader", log, reads=["x"], writes=["y"]),
+            make_processor("overwriter", log, writes=["x"]),
+            make_processor("other", log, writes=["z"]),
+        ]
+        graph = ProcessorGraph(processors)
+        self.assertEqual(graph.levels(), [["writer", "other"], ["reader"], ["overwriter"]])
+
+        _, context = asyncio.run(graph.run("hi", {"x": 0}, call))
+        self.assertEqual(context["y"], "reader:writer:")
+        self.assertEqual(context["x"], "overwriter:")
+
+    def test_message_transforms_are_ordered(self):
+        log = []
+        processors = [
+            make_processor("upper", log, transforms=True),
+            make_processor("tag", log, writes=["t"]),
+            make_processor("suffix", log, transforms=True),
+        ]
+        message, _ = asyncio.run(ProcessorGraph(processors).run("hi", {}, call))
+        self.assertEqual(message, "hi+upper+suffix")
+        self.assertLess(log.index(("end", "tag")), log.index(("start", "suffix")))
+
+    def test_undeclared_processors_are_barriers(self):
+        log = []
+        processors = [
+            make_processor("a", log, writes=["a"]),
+            make_processor("legacy", log, transforms=True, declared=False),
+            make_processor("b", log, writes=["b"]),
+        ]
+        graph = ProcessorGraph(processors)
+        self.assertTrue(graph.sequential)
+        message, _ = asyncio.run(graph.run("hi", {}, call))
+        self.assertEqual(message, "hi+legacy")
+
+    def test_failure_cancels_and_propagates(self):
+        async def failing(message, context, bot_type):
+            raise ValueError("boom")
+
+        log = []
+        declare_processor(writes=["f"])(failing)
+        graph = ProcessorGraph([failing, make_processor("slow", log, writes=["s"], delay=1)])
+        context = {"k": 1}
+        with self.assertRaises(ValueError):
+            asyncio.run(graph.run("hi", context, call))
+        self.assertNotIn(("end", "slow"), log)
+        self.assertEqual(context, {"k": 1})
+
+    def test_base_pre_processors_are_independent(self):
+        processors = [
+            intent_detection_processor,
+            entity_extraction_processor,
+            sentiment_analysis_processor,
+            message_summarization_processor,
+        ]
+        graph = ProcessorGraph(processors)
+        self.assertEqual(len(graph.levels()), 1)
+
+        timings = {}
+        context = {"sentiment_history": []}
+        _, updated = asyncio.run(graph.run(
+            "How much does it cost? Great", context, call, lambda name, seconds: timings.setdefault(name, seconds)
+        ))
+        self.assertEqual(updated["detected_intent"]["name"], "pricing_inquiry")
+        self.assertEqual(updated["sentiment"]["label"], "positive")
+        self.assertEqual(context["sentiment_history"], [])
+        self.assertEqual(set(timings), {p.__name__ for p in processors})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Tests for the transition rule compiler.
+"""
+
+import unittest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.conversation.transitions.rule_compiler import KeywordIndex, TransitionRuleCompiler
+
+
+EVALUATOR_TYPES = frozenset({"keyword_match", "intent_match"})
+
+
+class TestKeywordIndex(unittest.TestCase):
+    """Test cases for the per-state keyword index."""
+
+    def test_finds_overlapping_and_prefix_keywords(self):
+        index = KeywordIndex(["price", "pricing", "pri", "cancel"])
+        found = index.find("what is the pricing?")
+        self.assertEqual(found, {"pri", "pricing"})
+
+    def test_matches_substring_semantics(self):
+        keywords = ["a.b", "ab", "b", "abc", "c*"]
+        index = KeywordIndex(keywords)
+        for message in ["xa.bx", "abc", "c*c", "nothing", "", "bab"]:
+            expected = {k for k in keywords if k in message}
+            self.assertEqual(index.find(message), expected, message)
+
+    def test_empty_index(self):
+        self.assertEqual(KeywordIndex([]).find("anything"), frozenset())
+
+
+class TestTransitionRuleCompiler(unittest.TestCase):
+    """Test cases for TransitionRuleCompiler."""
+
+    def setUp(self):
+        self.compiler = TransitionRuleCompiler()
+        self.rules = {
+            "greeting": [
+                {"target": "low", "conditions": [{"type": "keyword_match", "keywords": ["Hi"]}]},
+                {"target": "high", "priority": 5,
+                 "conditions": [{"type": "keyword_match", "keywords": ["hello"]}]},
+                {"target": "no_conditions", "conditions": []},
+                {"conditions": [{"type": "keyword_match", "keywords": ["x"]}]},
+                {"target": "unknown", "conditions": [{"type": "mystery"}]},
+            ]
+        }
+
+    def test_orders_by_priority_and_drops_invalid(self):
+        compiled = self.compiler.compile("sales", self.rules, EVALUATOR_TYPES)
+        targets = [t.target for t in compiled.transitions_for("greeting")]
+        self.assertEqual(targets, ["high", "low"])
+        self.assertEqual(compiled.transitions_for("missing"), [])
+
+    def test_keyword_conditions_use_state_index(self):
+        compiled = self.compiler.compile("sales", self.rules, EVALUATOR_TYPES)
+        scope = compiled.scope_for("greeting", "Oh HI there", {})
+        self.assertEqual(scope.keywords_found, {"hi"})
+
+    def test_non_native_keyword_match_is_not_indexed(self):
+        compiled = self.compiler.compile(
+            "sales", self.rules, EVALUATOR_TYPES, native_keyword_match=False
+        )
+        for transition in compiled.transitions_for("greeting"):
+            self.assertIsNone(transition.conditions[0].keywords)
+
+    def test_cached_per_version(self):
+        first = self.compiler.compile("sales", self.rules, EVALUATOR_TYPES)
+        self.assertIs(first, self.compiler.compile("sales", dict(self.rules), EVALUATOR_TYPES))
+
+        changed = {"greeting": self.rules["greeting"][:1]}
+        second = self.compiler.compile("sales", changed, EVALUATOR_TYPES)
+        self.assertIsNot(first, second)
+        self.assertNotEqual(first.version, second.version)
+
+        regenerated = self.compiler.compile("sales", self.rules, EVALUATOR_TYPES, generation=1)
+        self.assertIsNot(first, regenerated)
+
+
+if __name__ == "__main__":
+    unittest.main()
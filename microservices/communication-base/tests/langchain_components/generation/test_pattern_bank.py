@@ -0,0 +1,100 @@
+"""
+Tests for the response variation pattern bank.
+"""
+
+import random
+import re
+import unittest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from src.langchain_components.generation.pattern_bank import PatternBank, literal_rules, regex_rules
+from src.langchain_components.generation.anti_ai.response_variator import ResponseVariator
+from src.langchain_components.generation.enhancers.grammar_variator import GrammarVariator
+
+
+class TestPatternBank(unittest.TestCase):
+    """Test cases for PatternBank."""
+
+    def test_substitute_all_respects_boundaries(self):
+        bank = PatternBank(
+            literal_rules({"do not": "don't"}, category="contractions", suffix=r"(?![^\s.,;:!?])")
+            + literal_rules({"obtain": "get"}, category="vocabulary",
+                            prefix=r"(?<![^\s.,;:!?])", suffix=r"(?![^\s.,;:!?])")
+        )
+        text = "I do not obtain, do nothing, reobtain it."
+        result = bank.substitute_all(text, random.Random(0))
+        self.assertEqual(result, "I don't get, do nothing, reobtain it.")
+
+    def test_substitute_all_filters_categories(self):
+        bank = PatternBank(
+            literal_rules({"cannot": "can't"}, category="contractions")
+            + literal_rules({"purchase": "buy"}, category="vocabulary")
+        )
+        result = bank.substitute_all("cannot purchase", random.Random(0), categories=["vocabulary"])
+        self.assertEqual(result, "cannot buy")
+        result = bank.substitute_all("cannot purchase", random.Random(0), chances={"contractions": 1.0})
+        self.assertEqual(result, "can't purchase")
+
+    def test_longest_literal_wins(self):
+        bank = PatternBank(literal_rules({"I have": "I've", "I have not": "I haven't"}))
+        self.assertEqual(bank.substitute_all("I have not", random.Random(0)), "I haven't")
+
+    def test_substitute_one_first_only(self):
+        bank = PatternBank(literal_rules({"and": "plus", "but": "yet"}, prefix=r"\b", suffix=r"\b"))
+        result = bank.substitute_one("black but white and grey", random.Random(0), first_only=True)
+        self.assertEqual(result, "black but white plus grey")
+
+    def test_regex_rules_ignore_case(self):
+        bank = PatternBank(regex_rules({r"\bI think\b": "I believe"}), flags=re.IGNORECASE)
+        self.assertEqual(bank.find_all("i THINK so").keys(), {r"\bI think\b"})
+        self.assertEqual(bank.substitute_one("i THINK so", random.Random(0)), "I believe so")
+
+
+class TestSeededVariators(unittest.TestCase):
+    """Seeded variators produce reproducible output."""
+
+    TEXT = ("I think it is important to review the contract and the terms, but we do not "
+            "need to rush. For example, the report was prepared by the team, so it is ready.")
+
+    def test_response_variator_is_deterministic(self):
+        first = ResponseVariator(level="high", seed=42).enhance(self.TEXT)
+        second = ResponseVariator(level="high", seed=42).enhance(self.TEXT)
+        self.assertEqual(first, second)
+
+    def test_grammar_variator_is_deterministic(self):
+        first = GrammarVariator(variability_level="high", seed=42).enhance(self.TEXT)
+        second = GrammarVariator(variability_level="high", seed=42).enhance(self.TEXT)
+        self.assertEqual(first, second)
+
+    def test_response_variator_keeps_pass_order(self):
+        variator = ResponseVariator(seed=1)
+        calls = []
+        for name in ("_vary_sentence_structure", "_vary_punctuation", "_apply_contractions",
+                     "_add_fillers", "_add_informality", "_vary_vocabulary"):
+            setattr(variator, name, lambda text, name=name: calls.append(name) or text)
+        variator.enhance(self.TEXT)
+        self.assertEqual(calls, ["_vary_sentence_structure", "_vary_punctuation", "_apply_contractions",
+                                 "_add_fillers", "_add_informality", "_vary_vocabulary"])
+
+    def test_lexical_passes_at_full_frequency(self):
+        variator = ResponseVariator(seed=1, techniques=["contractions", "vocabulary"])
+        variator.variability_params.update(contraction_freq=1.0, vocabulary_variation=1.0)
+        self.assertEqual(
+            variator.enhance("We do not require it; subsequently we can utilize it, cannot we."),
+            "We don't need it; later we can use it, can't we."
+        )
+
+    def test_sentence_split_keeps_abbreviations(self):
+        variator = ResponseVariator(seed=1)
+        self.assertEqual(
+            variator._split_into_sentences("Talk to Mr. Smith. Is it done? Then go!"),
+            ["Talk to Mr. Smith.", "Is it done?", "Then go!"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
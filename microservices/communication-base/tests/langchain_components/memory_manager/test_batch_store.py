@@ -0,0 +1,121 @@
+"""
+Tests for batched Redis memory storage.
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from src.langchain_components.memory_manager.batch_store import RedisBatchStore
+
+try:
+    import fakeredis.aioredis
+    HAS_FAKEREDIS = True
+except ImportError:
+    HAS_FAKEREDIS = False
+
+try:
+    import lupa
+    HAS_LUA = True
+except ImportError:
+    HAS_LUA = False
+
+
+@unittest.skipUnless(HAS_FAKEREDIS, "fakeredis is required")
+class TestRedisBatchStore(unittest.TestCase):
+    """Test cases for RedisBatchStore."""
+
+    def run_with_store(self, scenario, **kwargs):
+        async def run():
+            store = RedisBatchStore(client=fakeredis.aioredis.FakeRedis(), **kwargs)
+            try:
+                return await scenario(store)
+            finally:
+                await store.close()
+        return asyncio.run(run())
+
+    def test_get_and_set_many_use_one_round_trip_each(self):
+        async def scenario(store):
+            await store.set_many({"a": {"x": 1}, "b": [1, 2], "c": "text"}, ttl={"a": 60})
+            values = await store.get_many(["a", "b", "c", "missing"])
+            self.assertEqual(values, {"a": {"x": 1}, "b": [1, 2], "c": "text"})
+            self.assertEqual(store.get_metrics()["round_trips"], 2)
+            self.assertGreater(await store.client.ttl("a"), 0)
+            self.assertEqual(await store.client.ttl("b"), -1)
+        self.run_with_store(scenario)
+
+    def test_update_atomic_sets_and_deletes(self):
+        async def scenario(store):
+            await store.set_many({"tier:short": [], "tier:old": 1})
+            await store.update_atomic({"tier:short": ["hi"], "tier:medium": []}, delete=["tier:old"], ttl=30)
+            values = await store.get_many(["tier:short", "tier:medium", "tier:old"])
+            self.assertEqual(values, {"tier:short": ["hi"], "tier:medium": []})
+        self.run_with_store(scenario)
+
+    @unittest.skipUnless(HAS_LUA, "lupa is required for Lua scripts in fakeredis")
+    def test_compare_and_set(self):
+        async def scenario(store):
+            await store.set_many({"version": 1})
+            self.assertTrue(await store.compare_and_set({"version": 1, "lock": None}, {"version": 2, "data": "x"}))
+            self.assertFalse(await store.compare_and_set({"version": 1}, {"version": 3}))
+            self.assertEqual(await store.get_many(["version", "data"]), {"version": 2, "data": "x"})
+        self.run_with_store(scenario)
+
+    def test_hot_keys_fall_back_to_ttl_cache_without_tracking(self):
+        now = [0.0]
+
+        async def scenario(store):
+            await store.set_many({"hot:a": 1, "cold:b": 2})
+            for _ in range(3):
+                await store.get_many(["hot:a", "cold:b"])
+                await asyncio.sleep(0.01)
+            # fakeredis has no client tracking: hot keys are cached by TTL only
+            self.assertFalse(store.tracking)
+            trips = store.get_metrics()["round_trips"]
+            self.assertEqual(await store.get_many(["hot:a"]), {"hot:a": 1})
+            self.assertEqual(store.get_metrics()["round_trips"], trips)
+
+            # Local writes invalidate immediately, expired entries are reloaded
+            await store.set_many({"hot:a": 5})
+            self.assertEqual(await store.get_many(["hot:a"]), {"hot:a": 5})
+            now[0] += 60
+            await store.get_many(["hot:a"])
+            # One write, one reload after the write, one after expiry
+            self.assertEqual(store.get_metrics()["round_trips"], trips + 3)
+
+        self.run_with_store(scenario, hot_key_prefixes=["hot:"], cache_ttl_seconds=30, clock=lambda: now[0])
+
+    def test_invalidation_during_read_is_not_cached(self):
+        async def scenario(store):
+            await store.set_many({"hot:a": 1, "hot:b": 2})
+            await store.get_many(["cold:c"])
+            await asyncio.sleep(0.01)
+            store.invalidate()
+
+            mget = store.client.mget
+
+            async def mget_then_invalidate(keys):
+                values = await mget(keys)
+                # Another client writes hot:a while the reply is in flight
+                await store.client.set("hot:a", "5")
+                store.invalidate(["hot:a"])
+                return values
+
+            store.client.mget = mget_then_invalidate
+            self.assertEqual(await store.get_many(["hot:a", "hot:b"]), {"hot:a": 1, "hot:b": 2})
+            store.client.mget = mget
+
+            trips = store.get_metrics()["round_trips"]
+            self.assertEqual(await store.get_many(["hot:a", "hot:b"]), {"hot:a": 5, "hot:b": 2})
+            self.assertEqual(store.get_metrics()["round_trips"], trips + 1)
+            self.assertEqual(store.get_metrics()["cache_hits"], 1)
+
+        self.run_with_store(scenario, hot_key_prefixes=["hot:"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Tests for the indexed entity store and its use by EnhancedEntityMemory.
+"""
+
+import unittest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from src.langchain_components.memory_manager.entity_index import EntityIndex
+
+try:
+    from langchain.llms.fake import FakeListLLM
+    from src.langchain_components.memory_manager.entity_memory import EnhancedEntityMemory
+    HAS_LANGCHAIN = True
+except ImportError:
+    HAS_LANGCHAIN = False
+
+
+def record(name, entity_type, last_seen, importance=0.5, aliases=()):
+    return {"name": name, "type": entity_type, "last_seen": last_seen, "importance": importance,
+            "aliases": list(aliases), "summary": ""}
+
+
+class TestEntityIndex(unittest.TestCase):
+    """Test cases for EntityIndex."""
+
+    def setUp(self):
+        self.index = EntityIndex()
+        self.index.put(record("Acme Corp", "org", 1.0, 0.9, aliases=["Acme"]))
+        self.index.put(record("Pro Plan", "product", 2.0, 0.4))
+        self.index.put(record("Basic  Plan", "product", 3.0, 0.7))
+
+    def test_lookup_by_normalized_name_and_alias(self):
+        self.assertEqual(self.index.get("acme corp")["name"], "Acme Corp")
+        self.assertEqual(self.index.get(" ACME ")["name"], "Acme Corp")
+        self.assertEqual(self.index.get("basic plan")["name"], "Basic  Plan")
+        self.assertIsNone(self.index.get("unknown"))
+
+    def test_type_recency_and_importance_queries(self):
+        self.assertEqual([r["name"] for r in self.index.by_type("product")], ["Pro Plan", "Basic  Plan"])
+        self.assertEqual([r["name"] for r in self.index.most_recent("product")], ["Basic  Plan"])
+
+        pro = self.index.get("pro plan")
+        pro["last_seen"], pro["importance"] = 4.0, 0.95
+        self.index.touch(self.index.resolve("pro plan"))
+        self.assertEqual([r["name"] for r in self.index.most_recent(limit=2)], ["Pro Plan", "Basic  Plan"])
+        self.assertEqual([r["name"] for r in self.index.by_importance(0.7)], ["Pro Plan", "Acme Corp", "Basic  Plan"])
+
+    def test_remove_and_change_tracking(self):
+        changed, removed = self.index.take_changes()
+        self.assertEqual(set(changed), {"acme corp", "pro plan", "basic plan"})
+
+        self.index.remove("Acme")
+        self.assertIsNone(self.index.get("acme corp"))
+        self.assertEqual(self.index.by_type("org"), [])
+        self.assertEqual(self.index.take_changes(), ({}, {"acme corp"}))
+
+
+class StubMemoryStore:
+    """Memory store recording batched entity writes."""
+
+    def __init__(self):
+        self.saved = {}
+        self.batches = []
+
+    def load_entities(self, session_id):
+        return dict(self.saved)
+
+    def save_entities(self, session_id, changed, removed=(), ttl=None):
+        self.batches.append(sorted(changed))
+        self.saved.update(changed)
+
+
+class StubExtractor:
+    """Entity extraction service returning queued entities."""
+
+    def __init__(self, turns):
+        self.turns = list(turns)
+
+    def extract_entities(self, input_text, output_text, session_id):
+        return self.turns.pop(0) if self.turns else []
+
+
+@unittest.skipUnless(HAS_LANGCHAIN, "langchain is required")
+class TestEnhancedEntityMemory(unittest.TestCase):
+    """Test cases for EnhancedEntityMemory persistence."""
+
+    def test_only_changed_entities_are_persisted(self):
+        store = StubMemoryStore()
+        extractor = StubExtractor([
+            [{"name": "Acme", "type": "org", "context": "vendor"}, {"name": "Pro", "type": "product"}],
+            [{"name": "acme", "type": "org", "sentiment": 1.0}],
+        ])
+        memory = EnhancedEntityMemory(
+            llm=FakeListLLM(responses=["summary"]), session_manager=None, session_id="s1",
+            entity_extraction_service=extractor, memory_store=store
+        )
+        memory.save_context({"question": "q1"}, {"answer": "a1"})
+        memory.save_context({"question": "q2"}, {"answer": "a2"})
+        self.assertEqual(store.batches, [["acme", "pro"], ["acme"]])
+        self.assertEqual(memory.get_entity("ACME")["mentions"], 2)
+
+        restored = EnhancedEntityMemory(
+            llm=FakeListLLM(responses=["summary"]), session_manager=None, session_id="s1",
+            entity_extraction_service=extractor, memory_store=store
+        )
+        self.assertEqual(restored.get_recently_mentioned_entities(1)[0]["name"], "Acme")
+
+
+if __name__ == "__main__":
+    unittest.main()
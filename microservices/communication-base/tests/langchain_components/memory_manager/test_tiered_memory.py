@@ -0,0 +1,162 @@
+"""
+Tests for incremental consolidation in TieredMemory.
+"""
+
+import unittest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+try:
+    from src.langchain_components.memory_manager.consolidation import MediumTermTier, TopicIndex
+    from src.langchain_components.memory_manager.tiered_memory import TieredMemory
+    HAS_LANGCHAIN = True
+except ImportError:
+    HAS_LANGCHAIN = False
+
+
+class StubLLM:
+    """LLM returning fixed importance scores and summaries."""
+
+    def __init__(self, importance="0.9", topics="pricing"):
+        self.importance = importance
+        self.topics = topics
+        self.prompts = []
+
+    def predict(self, prompt):
+        self.prompts.append(prompt)
+        if "rate its importance" in prompt:
+            return self.importance
+        if "Consolidate" in prompt:
+            return "merged summary"
+        return f"SUMMARY: summary {len(self.prompts)}\nTOPICS: {self.topics}"
+
+
+class StubSessionManager:
+    """Session manager recording partial tier writes."""
+
+    def __init__(self):
+        self.writes = []
+        self.stored = {}
+
+    def get_tiered_memory(self, session_id):
+        return dict(self.stored)
+
+    def update_tiered_memory(self, session_id, tiers):
+        self.writes.append(sorted(tiers))
+        self.stored.update(tiers)
+
+
+@unittest.skipUnless(HAS_LANGCHAIN, "langchain is required")
+class TestMediumTermTier(unittest.TestCase):
+    """Test cases for MediumTermTier and TopicIndex."""
+
+    def test_evicts_least_important_and_chunks_promotions(self):
+        tier = MediumTermTier(capacity=2, promotion_threshold=0.8, chunk_size=2)
+        self.assertIsNone(tier.add((1.0, {}, 0.9)))
+        self.assertIsNone(tier.add((2.0, {}, 0.95)))
+        # Evicts the 0.9 entry into the pending chunk
+        self.assertIsNone(tier.add((3.0, {}, 1.0)))
+        self.assertEqual(tier.pending, [(1.0, {}, 0.9)])
+        # Below the promotion threshold: evicted without promotion
+        self.assertIsNone(tier.add((4.0, {}, 0.5)))
+        chunk = tier.add((5.0, {}, 0.97))
+        self.assertEqual(chunk, [(1.0, {}, 0.9), (2.0, {}, 0.95)])
+        self.assertEqual([entry[0] for entry in tier.entries()], [3.0, 5.0])
+
+    def test_topic_index_tracks_dirty_topics(self):
+        index = TopicIndex()
+        first, second = (1.0, "a", ["pricing"], 0.9), (2.0, "b", ["pricing", "support"], 0.9)
+        index.add(first)
+        index.add(second)
+        self.assertEqual(index.take_dirty_groups(), [("pricing", [first, second])])
+        self.assertEqual(index.take_dirty_groups(), [])
+        index.remove(first)
+        self.assertEqual(index.entries["pricing"], [second])
+
+
+@unittest.skipUnless(HAS_LANGCHAIN, "langchain is required")
+class TestTieredMemory(unittest.TestCase):
+    """Test cases for TieredMemory."""
+
+    def make_memory(self, llm=None, **kwargs):
+        self.sessions = StubSessionManager()
+        return TieredMemory(
+            llm or StubLLM(), self.sessions, "s1", "sales",
+            short_term_window=3, medium_term_window=4, long_term_capacity=5,
+            promotion_chunk_size=2, **kwargs
+        )
+
+    def turn(self, memory, n):
+        memory.save_context({"question": f"question {n}"}, {"answer": f"answer {n}"})
+
+    def test_short_term_is_bounded(self):
+        memory = self.make_memory()
+        for n in range(20):
+            self.turn(memory, n)
+        messages = memory.get_memory_variables()["chat_history"]
+        self.assertEqual([m.content for m in messages][-2:], ["question 19", "answer 19"])
+        self.assertEqual(len(messages), 6)
+        self.assertEqual(len(self.sessions.stored["short_term"]), 6)
+
+    def test_input_and_output_keys_are_inferred(self):
+        memory = self.make_memory()
+        memory.save_context({"input": "hi", "chat_history": [], "stop": ["\n"]}, {"response": "hello"})
+        explicit = self.make_memory(input_key="query", output_key="text")
+        explicit.save_context({"query": "price?", "lang": "en"}, {"text": "ten", "sources": []})
+
+        self.assertEqual([m.content for m in memory.short_term.messages], ["hi", "hello"])
+        self.assertEqual([m.content for m in explicit.short_term.messages], ["price?", "ten"])
+        self.assertEqual(memory.medium_term.entries()[0][1], {"human": "hi", "ai": "hello"})
+        with self.assertRaises(ValueError):
+            memory.save_context({"input": "a", "extra": "b"}, {"response": "c"})
+
+    def test_only_changed_tiers_are_saved(self):
+        memory = self.make_memory(llm=StubLLM(importance="0.1"))
+        self.turn(memory, 0)
+        self.turn(memory, 1)
+        # First save writes everything, later unimportant turns only the short tier
+        self.assertEqual(self.sessions.writes[0], ["long_term", "medium_term", "medium_term_pending", "short_term"])
+        self.assertEqual(self.sessions.writes[1], ["short_term"])
+
+    def test_evicted_entries_are_summarized_in_chunks(self):
+        llm = StubLLM()
+        memory = self.make_memory(llm=llm)
+        for n in range(12):
+            self.turn(memory, n)
+        # 8 evictions from medium-term memory, summarized in 4 chunks
+        summaries = [p for p in llm.prompts if "SUMMARY:" in p]
+        self.assertEqual(len(summaries), 4)
+        self.assertIn("question 0", summaries[0])
+        self.assertIn("question 1", summaries[0])
+        self.assertEqual(len(memory.long_term), 4)
+
+    def test_consolidation_only_revisits_changed_topics(self):
+        llm = StubLLM()
+        memory = self.make_memory(llm=llm)
+        for n in range(12):
+            self.turn(memory, n)
+        memory._consolidate_memory()
+        self.assertEqual([entry[1] for entry in memory.long_term], ["merged summary"])
+
+        for entry in ((100.0, "a", ["support"], 0.9), (101.0, "b", ["billing"], 0.9)):
+            memory._add_to_long_term(entry)
+        memory._consolidate_memory()
+        consolidations = [p for p in llm.prompts if "Consolidate" in p]
+        self.assertEqual(len(consolidations), 1)
+        self.assertEqual(len(memory.long_term), 3)
+
+    def test_state_survives_reload(self):
+        memory = self.make_memory()
+        for n in range(8):
+            self.turn(memory, n)
+        restored = TieredMemory(StubLLM(), self.sessions, "s1", "sales", short_term_window=3, medium_term_window=4)
+        self.assertEqual(restored.short_term.serialize(), memory.short_term.serialize())
+        self.assertEqual(restored.medium_term.entries(), memory.medium_term.entries())
+        self.assertEqual(restored.long_term, memory.long_term)
+
+
+if __name__ == "__main__":
+    unittest.main()
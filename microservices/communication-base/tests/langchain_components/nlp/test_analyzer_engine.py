@@ -0,0 +1,165 @@
+"""
+Tests for the concurrent analyzer engine and its use by the hybrid NLP processor.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from src.langchain_components.nlp.analyzer_engine import Analyzer, AnalyzerEngine
+
+try:
+    from src.langchain_components.nlp.hybrid_processor import HybridNLPProcessor
+    HAS_LANGCHAIN = True
+except ImportError:
+    HAS_LANGCHAIN = False
+
+
+class TestAnalyzerEngine(unittest.TestCase):
+    """Test cases for AnalyzerEngine."""
+
+    def setUp(self):
+        self.engine = AnalyzerEngine(default_timeout_seconds=0.5)
+        self.calls = {}
+
+    def analyzer(self, name, delay=0.05, value=None, fail=False, **kwargs):
+        async def run():
+            self.calls[name] = self.calls.get(name, 0) + 1
+            await asyncio.sleep(delay)
+            if fail:
+                raise RuntimeError("boom")
+            return value if value is not None else name
+        return Analyzer(name, run, fallback=f"{name}-fallback", **kwargs)
+
+    def test_runs_concurrently(self):
+        analyzers = [self.analyzer(name, delay=0.1) for name in ("a", "b", "c")]
+        start = time.perf_counter()
+        outcomes = asyncio.run(self.engine.run(analyzers))
+        self.assertLess(time.perf_counter() - start, 0.25)
+        self.assertEqual({name: o.value for name, o in outcomes.items()}, {"a": "a", "b": "b", "c": "c"})
+
+    def test_timeout_and_error_degrade_to_fallback(self):
+        analyzers = [
+            self.analyzer("slow", delay=1, timeout_seconds=0.05),
+            self.analyzer("broken", fail=True),
+            self.analyzer("fine"),
+        ]
+        outcomes = asyncio.run(self.engine.run(analyzers, cache_scope="m1"))
+        self.assertEqual((outcomes["slow"].value, outcomes["slow"].status), ("slow-fallback", "timeout"))
+        self.assertEqual((outcomes["broken"].value, outcomes["broken"].status), ("broken-fallback", "error"))
+        self.assertEqual(outcomes["fine"].status, "ok")
+
+        # Degraded results are not cached
+        outcomes = asyncio.run(self.engine.run(analyzers, cache_scope="m1"))
+        self.assertEqual(self.calls, {"slow": 2, "broken": 2, "fine": 1})
+        self.assertEqual(outcomes["fine"].status, "cached")
+
+    def test_analyzer_scope_separates_cache_entries(self):
+        asyncio.run(self.engine.run([self.analyzer("a", scope="s1")], cache_scope="m1"))
+        asyncio.run(self.engine.run([self.analyzer("a", scope="s1")], cache_scope="m1"))
+        asyncio.run(self.engine.run([self.analyzer("a", scope="s2")], cache_scope="m1"))
+        self.assertEqual(self.calls, {"a": 2})
+
+    def test_cache_is_scoped(self):
+        analyzers = [self.analyzer("a"), self.analyzer("uncached", cacheable=False)]
+        asyncio.run(self.engine.run(analyzers, cache_scope="m1"))
+        asyncio.run(self.engine.run(analyzers, cache_scope="m1"))
+        asyncio.run(self.engine.run(analyzers, cache_scope="m2"))
+        self.assertEqual(self.calls, {"a": 2, "uncached": 3})
+
+    def test_cpu_bound_analyzers_run_in_threads(self):
+        threads = []
+
+        def blocking():
+            threads.append(threading.current_thread())
+            time.sleep(0.05)
+            return "done"
+
+        outcomes = asyncio.run(self.engine.run([Analyzer("model", blocking, cpu_bound=True)]))
+        self.assertEqual(outcomes["model"].value, "done")
+        self.assertIsNot(threads[0], threading.main_thread())
+
+
+class StubConfig:
+    """Config integration returning fixed per-bot settings."""
+
+    def __init__(self, settings):
+        self.settings = settings
+
+    def get_config(self, bot_type):
+        return self.settings
+
+
+if HAS_LANGCHAIN:
+    class StubProcessor(HybridNLPProcessor):
+        """Hybrid processor with stub analyzers."""
+
+        delays = {"entities": 0.1, "intents": 0.1, "sentiment": 0.1}
+
+        async def _extract_entities(self, message, bot_type, session_id):
+            await asyncio.sleep(self.delays["entities"])
+            return [{"type": "product", "value": "pro", "confidence": 0.9}]
+
+        async def _extract_intents(self, message, bot_type):
+            await asyncio.sleep(self.delays["intents"])
+            return [{"name": "pricing_inquiry", "confidence": 0.8}]
+
+        async def _analyze_sentiment(self, message, bot_type):
+            await asyncio.sleep(self.delays["sentiment"])
+            return {"sentiment": "positive", "score": 0.9}
+
+
+@unittest.skipUnless(HAS_LANGCHAIN, "langchain is required")
+class TestHybridProcessorFanOut(unittest.TestCase):
+    """Test cases for concurrent analysis in HybridNLPProcessor."""
+
+    def make_processor(self, **settings):
+        return StubProcessor(config_integration=StubConfig(settings))
+
+    def test_analyzers_run_concurrently(self):
+        processor = self.make_processor()
+        start = time.perf_counter()
+        result = asyncio.run(processor.process_message("how much is pro?", "s1", "sales", "u1"))
+        self.assertLess(time.perf_counter() - start, 0.25)
+        self.assertEqual(result["entities"][0]["value"], "pro")
+        self.assertEqual(result["intents"][0]["name"], "pricing_inquiry")
+        self.assertEqual(result["sentiment"]["sentiment"], "positive")
+        self.assertEqual(result["metadata"]["degraded"], [])
+
+    def test_slow_analyzer_degrades(self):
+        processor = self.make_processor(**{"nlp.processing": {"analyzer_timeouts": {"sentiment": 0.02}}})
+        result = asyncio.run(processor.process_message("how much is pro?", "s1", "sales", "u1"))
+        self.assertEqual(result["sentiment"], {"sentiment": "neutral", "score": 0.5})
+        self.assertEqual(result["metadata"]["degraded"], ["sentiment"])
+        self.assertEqual(len(result["intents"]), 1)
+
+    def test_repeated_messages_use_cache_with_private_copies(self):
+        processor = self.make_processor()
+        first = asyncio.run(processor.process_message("how much is pro?", "s1", "sales", "u1"))
+        first["entities"][0]["value"] = "changed"
+
+        second = asyncio.run(processor.process_message("how much is pro?", "s1", "sales", "u1"))
+        self.assertEqual(second["entities"][0]["value"], "pro")
+        self.assertEqual(set(second["metadata"]["analyzers"].values()), {"cached"})
+
+    def test_entity_results_are_cached_per_session(self):
+        processor = self.make_processor()
+        asyncio.run(processor.process_message("how much is pro?", "s1", "sales", "u1"))
+
+        other = asyncio.run(processor.process_message("how much is pro?", "s2", "sales", "u1"))
+        self.assertEqual(
+            other["metadata"]["analyzers"], {"entities": "ok", "intents": "cached", "sentiment": "cached"}
+        )
+
+        text = asyncio.run(processor.process_text("how much is pro?", "sales", session_id="s2"))
+        self.assertEqual(text["metadata"]["analyzers"], {"entities": "cached"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Tests for filter-aware vector search.
+"""
+
+import unittest
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+try:
+    import faiss
+    from langchain.docstore.in_memory import InMemoryDocstore
+    from langchain.schema import Document
+    from langchain.vectorstores import FAISS
+    from langchain.vectorstores.utils import maximal_marginal_relevance
+    from src.langchain_components.rag.filtered_search import FilteredSearch, to_chroma_where
+    HAS_FAISS = True
+except ImportError:
+    HAS_FAISS = False
+
+
+def build_store(count=200, dimensions=8, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.random((count, dimensions), dtype=np.float32)
+    table = {f"text-{i}": vectors[i] for i in range(count)}
+
+    index = faiss.IndexFlatL2(dimensions)
+    index.add(vectors)
+    docs = {
+        str(i): Document(page_content=f"text-{i}", metadata={"tenant": f"t{i % 10}", "lang": "en" if i % 2 else "de"})
+        for i in range(count)
+    }
+    store = FAISS(lambda text: table[text].tolist(), index, InMemoryDocstore(docs), {i: str(i) for i in range(count)})
+    return store, vectors, table
+
+
+def brute_force(store, vectors, query_vector, k, filters):
+    matching = [
+        i for i in range(len(vectors))
+        if all(store.docstore.search(str(i)).metadata.get(key) == value for key, value in filters.items())
+    ]
+    distances = ((vectors[matching] - query_vector) ** 2).sum(axis=1)
+    return [matching[i] for i in np.argsort(distances)[:k]]
+
+
+@unittest.skipUnless(HAS_FAISS, "faiss and langchain are required")
+class TestFilteredSearch(unittest.TestCase):
+    """Test cases for FilteredSearch."""
+
+    def setUp(self):
+        self.store, self.vectors, self.table = build_store()
+        self.filters = {"tenant": "t3", "lang": "en"}
+
+    def result_ids(self, results):
+        return [int(doc.page_content.split("-")[1]) for doc, _ in results]
+
+    def test_exact_scan_returns_k_matching_documents(self):
+        search = FilteredSearch(exact_scan_max=1000)
+        results = search.search(self.store, "text-0", 5, self.filters)
+
+        expected = brute_force(self.store, self.vectors, self.vectors[0], 5, self.filters)
+        self.assertEqual(self.result_ids(results), expected)
+        self.assertEqual(search.get_metrics()["exact_scans"], 1)
+
+    def test_filtered_ann_for_large_candidate_sets(self):
+        search = FilteredSearch(exact_scan_max=0, dense_fraction=1.0)
+        results = search.search(self.store, "text-0", 5, self.filters)
+
+        expected = brute_force(self.store, self.vectors, self.vectors[0], 5, self.filters)
+        self.assertEqual(self.result_ids(results), expected)
+        self.assertEqual(search.get_metrics()["filtered_ann"], 1)
+
+    def test_overfetch_for_dense_filters(self):
+        search = FilteredSearch(exact_scan_max=0, dense_fraction=0.01)
+        results = search.search(self.store, "text-0", 5, self.filters)
+
+        expected = brute_force(self.store, self.vectors, self.vectors[0], 5, self.filters)
+        self.assertEqual(self.result_ids(results), expected)
+        self.assertEqual(search.get_metrics()["overfetch_searches"], 1)
+
+    def test_no_candidates(self):
+        search = FilteredSearch()
+        self.assertEqual(search.search(self.store, "text-0", 5, {"tenant": "missing"}), [])
+
+    def test_index_follows_added_documents(self):
+        search = FilteredSearch()
+        search.search(self.store, "text-0", 5, self.filters)
+
+        vector = np.full(8, 0.5, dtype=np.float32)
+        self.table["new"] = vector
+        self.store.add_embeddings([("new", vector.tolist())], metadatas=[{"tenant": "t3", "lang": "en"}])
+        search.refresh(self.store)
+
+        results = search.search(self.store, "new", 1, self.filters)
+        self.assertEqual(results[0][0].page_content, "new")
+
+    def test_searches_do_not_sync_a_built_index(self):
+        search = FilteredSearch()
+        search.search(self.store, "text-0", 5, self.filters)
+
+        self.store.delete([self.store.index_to_docstore_id[3]])
+        self.assertEqual(search.get_metrics()["positions_indexed"], len(self.vectors))
+        search.search(self.store, "text-0", 5, self.filters)
+        self.assertEqual(search.get_metrics()["positions_indexed"], len(self.vectors))
+
+        search.refresh(self.store, rebuild=True)
+        results = search.search(self.store, "text-0", 200, self.filters)
+        self.assertNotIn(3, self.result_ids(results))
+        self.assertEqual(search.get_metrics()["positions_indexed"], 2 * len(self.vectors) - 1)
+
+    def test_mmr_reranks_filtered_candidates(self):
+        search = FilteredSearch()
+        documents = search.max_marginal_relevance_search(
+            self.store, "text-0", 3, self.filters, fetch_k=8, lambda_mult=0.3
+        )
+
+        candidates = brute_force(self.store, self.vectors, self.vectors[0], 8, self.filters)
+        selected = maximal_marginal_relevance(self.vectors[0], self.vectors[candidates], lambda_mult=0.3, k=3)
+        self.assertEqual([doc.page_content for doc in documents], [f"text-{candidates[i]}" for i in selected])
+        self.assertEqual(search.get_metrics()["mmr_searches"], 1)
+
+    def test_concurrent_searches_build_one_index(self):
+        search = FilteredSearch()
+        expected = self.result_ids(search.search(build_store()[0], "text-0", 5, self.filters))
+
+        search = FilteredSearch()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda _: self.result_ids(search.search(self.store, "text-0", 5, self.filters)), range(32)
+            ))
+
+        self.assertEqual(results, [expected] * 32)
+        self.assertEqual(search.get_metrics()["positions_indexed"], len(self.vectors))
+
+    def test_chroma_where_clause(self):
+        self.assertEqual(to_chroma_where({"tenant": "t1"}), {"tenant": {"$eq": "t1"}})
+        self.assertEqual(
+            to_chroma_where({"tenant": "t1", "lang": "en"}),
+            {"$and": [{"tenant": {"$eq": "t1"}}, {"lang": {"$eq": "en"}}]}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests for the async memoization cache.
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from src.langchain_components.rag.memo_cache import AsyncMemoCache
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAsyncMemoCache(unittest.TestCase):
+    """Test cases for AsyncMemoCache."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = AsyncMemoCache(max_entries=2, ttl_seconds=10, clock=self.clock)
+        self.calls = 0
+
+    async def compute(self, value="value", delay=0.0):
+        self.calls += 1
+        await asyncio.sleep(delay)
+        return value
+
+    def test_memoizes_until_ttl(self):
+        run = lambda: asyncio.run(self.cache.get_or_compute("k", self.compute))
+        self.assertEqual(run(), "value")
+        self.assertEqual(run(), "value")
+        self.assertEqual(self.calls, 1)
+
+        self.clock.now = 10
+        run()
+        self.assertEqual(self.calls, 2)
+
+    def test_coalesces_concurrent_requests(self):
+        async def scenario():
+            return await asyncio.gather(*(
+                self.cache.get_or_compute("k", lambda: self.compute(delay=0.01)) for _ in range(5)
+            ))
+
+        self.assertEqual(asyncio.run(scenario()), ["value"] * 5)
+        self.assertEqual(self.calls, 1)
+        metrics = self.cache.get_metrics()
+        self.assertEqual(metrics["coalesced"], 4)
+        self.assertEqual(metrics["inflight"], 0)
+
+    def test_failures_propagate_and_are_not_cached(self):
+        async def failing():
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def scenario():
+            return await asyncio.gather(
+                *(self.cache.get_or_compute("k", failing) for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(scenario())
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_should_cache_predicate(self):
+        asyncio.run(self.cache.get_or_compute("k", lambda: self.compute("degraded"), lambda v: v != "degraded"))
+        self.assertEqual(self.cache.get("k"), (False, None))
+        self.assertEqual(self.cache.get_metrics()["uncached"], 1)
+
+    def test_lru_eviction(self):
+        for key in ["a", "b"]:
+            self.cache.set(key, key)
+        self.cache.get("a")
+        self.cache.set("c", "c")
+        self.assertEqual(self.cache.get("b"), (False, None))
+        self.assertEqual(self.cache.get("a"), (True, "a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Tests for intent analysis and memoization in the query preprocessor.
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+try:
+    from src.langchain_components.nlp.hybrid_processor import HybridNLPProcessor
+    import src.langchain_components.rag.query_preprocessor as query_preprocessor_module
+    from src.langchain_components.rag.query_preprocessor import QueryPreprocessor, REFORMULATION_ERROR
+    HAS_PREPROCESSOR = True
+except ImportError:
+    HAS_PREPROCESSOR = False
+
+
+class FakeExtractionChain:
+    """Extraction chain returning a fixed entity and counting calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def arun(self, input, session_id, bot_type):
+        self.calls += 1
+        return {"entities": [{"type": "PRODUCT", "value": "subscription"}]}
+
+
+@unittest.skipUnless(HAS_PREPROCESSOR, "query preprocessor dependencies are required")
+class TestQueryPreprocessor(unittest.TestCase):
+    """Test cases for QueryPreprocessor with the real hybrid NLP processor."""
+
+    def setUp(self):
+        self.chain = FakeExtractionChain()
+        chain_initializer = mock.Mock()
+        chain_initializer.initialize_extraction_chain = mock.AsyncMock(return_value=self.chain)
+        self.processor = HybridNLPProcessor(chain_initializer=chain_initializer)
+
+        patcher = mock.patch.object(query_preprocessor_module, "hybrid_processor", self.processor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.preprocessor = QueryPreprocessor()
+        self.preprocessor.config_inheritance = mock.Mock()
+        self.preprocessor.config_inheritance.get_config.return_value = {}
+
+    def test_intent_uses_extracted_entities_and_is_memoized(self):
+        """Test that entities come from the processor and intents are cached."""
+        async def run():
+            first = await self.preprocessor.analyze_intent("How do I cancel my subscription", "support")
+            second = await self.preprocessor.analyze_intent("how do i cancel my subscription?", "support")
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual(first.primary_intent, "procedural")
+        self.assertEqual(first.entities, [{"type": "PRODUCT", "value": "subscription"}])
+        self.assertIs(second, first)
+        self.assertEqual(self.chain.calls, 1)
+        self.assertEqual(self.preprocessor.get_cache_metrics()["hits"], 1)
+
+    def test_preprocessing_uses_entities_and_is_memoized(self):
+        """Test that entity-based system selection is cached across calls."""
+        async def run():
+            first = await self.preprocessor.preprocess_query("compare plans", "support")
+            second = await self.preprocessor.preprocess_query("Compare plans", "support")
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        self.assertIn("database", first["rag_systems"])
+        self.assertEqual(self.chain.calls, 1)
+        self.assertEqual(second["original_query"], "Compare plans")
+        self.assertIs(second["reformulations"], first["reformulations"])
+
+    def test_fast_path_requires_an_intent_rule(self):
+        """Test that short queries no rule matches are not fast-pathed."""
+        self.assertTrue(self.preprocessor._is_fast_path("compare plans"))
+        self.assertFalse(self.preprocessor._is_fast_path("pricing"))
+        self.assertFalse(self.preprocessor._is_fast_path("refund policy"))
+        self.assertFalse(self.preprocessor._is_fast_path("how do I cancel my paid subscription"))
+
+    def test_fallback_reformulations_are_not_cached(self):
+        """Test that results degraded by a reformulation error are recomputed."""
+        self.preprocessor._basic_reformulation = mock.Mock(side_effect=RuntimeError("boom"))
+
+        async def run():
+            await self.preprocessor.preprocess_query("refund policy", "support")
+            return await self.preprocessor.preprocess_query("refund policy", "support")
+
+        result = asyncio.run(run())
+
+        self.assertTrue(result["reformulations"])
+        for reformulation in result["reformulations"].values():
+            self.assertEqual(reformulation.explanation, REFORMULATION_ERROR)
+        self.assertEqual(self.preprocessor._basic_reformulation.call_count, 2 * len(result["reformulations"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Tests for the two-level RAG result cache.
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from src.langchain_components.rag.result_cache import RAGResultCache, normalize_query
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def bag_of_words(text):
+    """Tiny deterministic embedding over a fixed vocabulary."""
+    vocabulary = ["price", "plan", "pro", "cancel", "refund", "the", "of", "is", "what"]
+    words = text.split()
+    return [float(words.count(word)) for word in vocabulary]
+
+
+class TestRAGResultCache(unittest.TestCase):
+    """Test cases for RAGResultCache."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = RAGResultCache(
+            embedding_function=bag_of_words, ttl_seconds=60, similarity_threshold=0.9, clock=self.clock
+        )
+        self.scope = RAGResultCache.make_scope("sales", "user-1", {"tier": "pro"})
+
+    def roundtrip(self, query, documents=None, scope=None):
+        scope = scope or self.scope
+        lookup = asyncio.run(self.cache.lookup(query, scope))
+        if lookup.documents is None and documents is not None:
+            self.cache.store(lookup, scope, documents)
+        return lookup
+
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query("  What is the   PRICE? "), "what is the price")
+
+    def test_exact_hit_after_normalization(self):
+        self.assertIsNone(self.roundtrip("What is the price?", ["doc"]).level)
+        lookup = self.roundtrip("what is the   price")
+        self.assertEqual(lookup.level, "exact")
+        self.assertEqual(lookup.documents, ["doc"])
+
+    def test_semantic_hit_within_scope_only(self):
+        self.roundtrip("what is the price of the pro plan", ["doc"])
+        lookup = self.roundtrip("what is the price of pro plan")
+        self.assertEqual(lookup.level, "semantic")
+
+        other_user = RAGResultCache.make_scope("sales", "user-2", {"tier": "pro"})
+        self.assertIsNone(self.roundtrip("what is the price of pro plan", scope=other_user).documents)
+
+        # The paraphrase is now an exact entry
+        self.assertEqual(self.roundtrip("what is the price of pro plan").level, "exact")
+
+    def test_dissimilar_query_misses(self):
+        self.roundtrip("what is the price", ["doc"])
+        self.assertIsNone(self.roundtrip("cancel refund").documents)
+
+    def test_ttl_expiry(self):
+        self.roundtrip("what is the price", ["doc"])
+        self.clock.now = 61
+        self.assertIsNone(self.roundtrip("what is the price").documents)
+        self.assertEqual(self.cache.get_metrics()["expirations"], 1)
+
+    def test_invalidation_drops_entries_and_stale_stores(self):
+        self.roundtrip("what is the price", ["doc"])
+        pending = asyncio.run(self.cache.lookup("cancel refund", self.scope))
+        self.assertEqual(self.cache.invalidate("sales", "faq"), 1)
+        self.assertFalse(self.cache.store(pending, self.scope, ["stale"]))
+        self.assertIsNone(self.roundtrip("what is the price").documents)
+
+    def test_lru_eviction_and_metrics(self):
+        self.cache.max_entries = 2
+        for query in ["price", "plan", "refund"]:
+            self.roundtrip(query, [query])
+        self.assertIsNone(self.roundtrip("price").documents)
+        self.assertEqual(self.roundtrip("refund").level, "exact")
+
+        metrics = self.cache.get_metrics()
+        self.assertEqual(metrics["exact_hits"], 1)
+        self.assertGreaterEqual(metrics["evictions"], 1)
+        self.assertAlmostEqual(metrics["hit_ratio"], 1 / metrics["lookups"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""
+Tests for write persistence in the vector store service.
+"""
+
+import asyncio
+import hashlib
+import tempfile
+import threading
+import time
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+try:
+    import faiss
+    from langchain.embeddings.base import Embeddings
+    from langchain.schema import Document
+    from src.langchain_components.rag.vector_store_service import VectorStoreService
+    HAS_FAISS = True
+except ImportError:
+    HAS_FAISS = False
+    Embeddings = object
+
+
+class HashEmbeddings(Embeddings):
+    """Deterministic embeddings derived from a hash of the text."""
+
+    def embed_query(self, text):
+        digest = hashlib.sha256(text.encode()).digest()
+        return [byte / 255 for byte in digest[:8]]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+@unittest.skipUnless(HAS_FAISS, "faiss and langchain are required")
+class TestVectorStoreServiceWrites(unittest.TestCase):
+    """Test cases for document writes surviving store eviction."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+        config_integration = mock.Mock()
+        config_integration.get_config.return_value = {
+            "vector_store": {"persist_directory": self.directory.name, "embedding": {"dimensions": 8}}
+        }
+        self.service = VectorStoreService(config_integration=config_integration, max_resident_stores=1)
+        self.service.embeddings = {"support": HashEmbeddings(), "sales": HashEmbeddings()}
+
+    def test_writes_survive_eviction(self):
+        """Test that added and deleted documents are persisted before the store is evicted."""
+        documents = [Document(page_content=f"doc {i}", metadata={"i": i}) for i in range(3)]
+
+        async def scenario():
+            self.assertTrue(await self.service.add_documents(documents, "support", "kb"))
+            store = await self.service._get_vectorstore("support", "kb", self.service._get_vs_config("support"))
+            doc_id = store.index_to_docstore_id[0]
+            self.assertTrue(await self.service.delete_documents([doc_id], "support", "kb"))
+
+            # Loading another collection evicts the written one
+            await self.service.add_documents([Document(page_content="other")], "sales", "kb")
+            self.assertNotIn(("support", "kb"), self.service.store_cache)
+
+            return await self.service._get_vectorstore("support", "kb", self.service._get_vs_config("support"))
+
+        reloaded = asyncio.run(scenario())
+
+        self.assertEqual(reloaded.index.ntotal, 2)
+        self.assertEqual(
+            sorted(doc.page_content for doc in reloaded.docstore._dict.values()), ["doc 1", "doc 2"]
+        )
+
+    def test_write_updates_resident_size(self):
+        """Test that the cache entry grows with the saved index."""
+        async def scenario():
+            await self.service.add_documents([Document(page_content="first")], "support", "kb")
+            first = self.service.store_cache.resident_bytes
+            await self.service.add_documents(
+                [Document(page_content=f"more {i}") for i in range(50)], "support", "kb"
+            )
+            return first, self.service.store_cache.resident_bytes
+
+        first, second = asyncio.run(scenario())
+
+        self.assertGreater(first, 0)
+        self.assertGreater(second, first)
+
+    def test_concurrent_adds_and_filtered_searches(self):
+        """Test filtered searches running alongside writes to the same collection."""
+        initial = [Document(page_content=f"doc {i}", metadata={"tenant": f"t{i % 2}"}) for i in range(40)]
+
+        overlaps = []
+        writing = threading.Event()
+
+        async def scenario():
+            await self.service.add_documents(initial, "support", "kb")
+            store = await self.service._get_vectorstore("support", "kb", self.service._get_vs_config("support"))
+
+            # Slow writes down and record any search running during one
+            add_documents, search_documents = store.add_documents, self.service.filtered_search.search
+
+            def slow_add(documents):
+                writing.set()
+                time.sleep(0.02)
+                try:
+                    return add_documents(documents)
+                finally:
+                    writing.clear()
+
+            def observed_search(*args):
+                overlaps.append(writing.is_set())
+                time.sleep(0.005)
+                result = search_documents(*args)
+                overlaps[-1] = overlaps[-1] or writing.is_set()
+                return result
+
+            store.add_documents = slow_add
+            self.service.filtered_search.search = observed_search
+
+            async def write(i):
+                return await self.service.add_documents(
+                    [Document(page_content=f"new {i}.{j}", metadata={"tenant": "t1"}) for j in range(20)],
+                    "support", "kb"
+                )
+
+            async def search():
+                return await self.service.retrieve("doc", "session", "support", "kb", limit=1000,
+                                                   filters={"tenant": "t1"})
+
+            results = await asyncio.gather(*[write(i) for i in range(8)], *[search() for _ in range(40)])
+            return results[:8], results[8:], await search()
+
+        writes, searches, final = asyncio.run(scenario())
+
+        self.assertEqual(writes, [True] * 8)
+        self.assertEqual(len(overlaps), 41)
+        self.assertFalse(any(overlaps))
+        for documents in searches:
+            self.assertGreaterEqual(len(documents), 20)
+            self.assertTrue(all(doc.metadata["tenant"] == "t1" for doc in documents))
+        self.assertEqual(len(final), 20 + 8 * 20)
+        self.assertEqual(len({doc.page_content for doc in final}), len(final))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Tests for the resident vector store cache.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+import sys
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from src.langchain_components.rag.vectorstore_cache import StoreLoad, VectorStoreCache, path_signature
+
+
+class TestVectorStoreCache(unittest.TestCase):
+    """Test cases for VectorStoreCache."""
+
+    def setUp(self):
+        self.evicted = []
+        self.reloaded = []
+        self.cache = VectorStoreCache(
+            max_bytes=100, on_evict=self.evicted.append, on_reload=self.reloaded.append
+        )
+        self.loads = []
+
+    def loader(self, name, size, signature=None, delay=0.0):
+        async def load():
+            self.loads.append(name)
+            await asyncio.sleep(delay)
+            return StoreLoad(f"store-{name}-{len(self.loads)}", size, signature)
+        return load
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        async def scenario():
+            await self.cache.get_or_load("a", self.loader("a", 40))
+            await self.cache.get_or_load("b", self.loader("b", 40))
+            await self.cache.get_or_load("a", self.loader("a", 40))
+            await self.cache.get_or_load("c", self.loader("c", 40))
+
+        asyncio.run(scenario())
+        self.assertEqual(self.evicted, ["b"])
+        self.assertIn("a", self.cache)
+        self.assertEqual(self.cache.resident_bytes, 80)
+
+    def test_concurrent_misses_share_one_load(self):
+        async def scenario():
+            return await asyncio.gather(*(
+                self.cache.get_or_load("a", self.loader("a", 10, delay=0.01)) for _ in range(4)
+            ))
+
+        stores = asyncio.run(scenario())
+        self.assertEqual(len(set(stores)), 1)
+        self.assertEqual(self.loads, ["a"])
+        metrics = self.cache.get_metrics()
+        self.assertEqual(metrics["coalesced"], 3)
+        self.assertGreater(metrics["load_seconds_p50"], 0.0)
+
+    def test_unavailable_store_is_not_cached(self):
+        async def missing():
+            return None
+
+        self.assertIsNone(asyncio.run(self.cache.get_or_load("a", missing)))
+        self.assertNotIn("a", self.cache)
+
+    def test_reload_when_index_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.faiss")
+            with open(path, "w") as handle:
+                handle.write("v1")
+
+            def loader():
+                return self.loader("a", 10, path_signature(path))()
+
+            async def scenario():
+                first = await self.cache.get_or_load("a", loader, lambda: path_signature(path))
+                await self.cache.get_or_load("b", self.loader("b", 10))
+                self.assertEqual(await self.cache.refresh_changed(), [])
+
+                with open(path, "w") as handle:
+                    handle.write("version 2")
+                self.assertEqual(await self.cache.refresh_changed(), ["a"])
+                self.assertNotEqual(self.cache.peek("a"), first)
+
+                # Reloading is not an access, so "a" stays least recently used
+                await self.cache.get_or_load("c", self.loader("c", 90))
+
+            asyncio.run(scenario())
+            self.assertEqual(self.reloaded, ["a"])
+            self.assertEqual(self.evicted, ["a"])
+
+    def test_warmup_reports_resident_keys(self):
+        async def failing():
+            raise RuntimeError("broken index")
+
+        warmed = asyncio.run(self.cache.warmup([
+            ("a", self.loader("a", 10), None),
+            ("b", failing, None),
+        ]))
+        self.assertEqual(warmed, ["a"])
+        self.assertEqual(self.cache.get_metrics()["load_failures"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests for ending sessions in the LangChain session manager.
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from src.langchain_components.session.session_manager import SessionManager, SessionState
+from src.session.session_digest import CrossSessionDigest
+
+
+class RecordingContextBuilder:
+    """Context builder folding closed sessions into in-memory digests."""
+
+    def __init__(self):
+        self.digests = {}
+
+    async def record_session_close(self, user_id, session_data, campaign_id=None):
+        digest = self.digests.setdefault((user_id, campaign_id), CrossSessionDigest())
+        digest.add_session(session_data)
+        return True
+
+
+class TestSessionManagerEndSession(unittest.TestCase):
+    """Test cases for SessionManager.end_session."""
+
+    def setUp(self):
+        self.builder = RecordingContextBuilder()
+        self.manager = SessionManager(context_builder=self.builder)
+
+    def test_end_session_updates_cross_session_digest(self):
+        session = SessionState(
+            session_id="s1",
+            user_id="u1",
+            bot_type="sales",
+            summary="pricing questions",
+            metadata={"campaign_id": "c1"},
+            entities={"PRODUCT": [{"value": "crm", "importance": 0.9}], "CONCERN": "cost"},
+            context={"topics": [{"name": "pricing"}], "questions": [{"topic": "billing"}]}
+        )
+        self.manager.sessions["s1"] = session
+
+        asyncio.run(self.manager.end_session("s1"))
+
+        self.assertNotIn("s1", self.manager.sessions)
+        digest = self.builder.digests[("u1", "c1")]
+        context = digest.to_context(1)
+        self.assertEqual(context["conversation_topics"], ["pricing"])
+        self.assertEqual(context["question_topics"], ["billing"])
+        self.assertEqual(context["frequent_concerns"], ["cost"])
+        self.assertEqual(context["entity_history"]["PRODUCT"][0]["value"], "crm")
+        self.assertEqual(digest.last_conversation(str)["summary"], "pricing questions")
+
+    def test_anonymous_sessions_are_not_recorded(self):
+        self.manager.sessions["s2"] = SessionState(session_id="s2", bot_type="sales")
+        asyncio.run(self.manager.end_session("s2"))
+        self.assertEqual(self.builder.digests, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
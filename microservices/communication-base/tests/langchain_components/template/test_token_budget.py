@@ -0,0 +1,145 @@
+"""
+Tests for cached token counting and context budget packing.
+"""
+
+import unittest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from src.langchain_components.template.token_budget import HistoryTokens, Segment, TokenBudget, TokenCounter
+
+try:
+    from src.langchain_components.template.context_injector import ContextInjector
+    HAS_INJECTOR = True
+except ImportError:
+    HAS_INJECTOR = False
+
+
+class CountingTokenizer:
+    """Word tokenizer that records how often it is called."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        return len(text.split())
+
+
+class TestTokenCounter(unittest.TestCase):
+    """Test cases for TokenCounter and HistoryTokens."""
+
+    def setUp(self):
+        self.tokenizer = CountingTokenizer()
+        self.counter = TokenCounter(self.tokenizer, max_entries=2)
+
+    def test_counts_are_cached_by_content(self):
+        self.assertEqual(self.counter.count("one two three"), 3)
+        self.assertEqual(self.counter.count("one two three"), 3)
+        self.assertEqual(self.tokenizer.calls, 1)
+
+        self.counter.count("a")
+        self.counter.count("b")
+        self.counter.count("one two three")
+        self.assertEqual(self.tokenizer.calls, 4)
+
+    def test_history_counts_only_appended_messages(self):
+        counter = TokenCounter(self.tokenizer)
+        history = HistoryTokens()
+        self.assertEqual(history.sync(["hi there", "hello"], counter), [2, 1])
+        calls = self.tokenizer.calls
+
+        self.assertEqual(history.sync(["hi there", "hello", "how are you"], counter), [2, 1, 3])
+        self.assertEqual(self.tokenizer.calls, calls + 1)
+        self.assertEqual(history.total, 6)
+
+        # A trimmed history no longer extends the tracked one and is recounted
+        self.assertEqual(history.sync(["hello", "how are you"], counter), [1, 3])
+        self.assertEqual(history.total, 4)
+
+    def test_history_edit_before_last_message_is_recounted(self):
+        counter = TokenCounter(self.tokenizer)
+        history = HistoryTokens()
+        history.sync(["hi there", "hello", "how are you"], counter)
+
+        self.assertEqual(history.sync(["hi", "hello", "how are you", "fine"], counter), [1, 1, 3, 1])
+        self.assertEqual(history.total, 6)
+
+
+class TestTokenBudget(unittest.TestCase):
+    """Test cases for TokenBudget packing."""
+
+    def test_required_segments_and_fit(self):
+        segments = [Segment("input", 0, 10, 0.0, required=True), Segment("doc", 0, 5, 0.5)]
+        result = TokenBudget().pack(segments, 20)
+        self.assertEqual((result.strategy, result.tokens, result.dropped), ("all", 15, []))
+
+    def test_knapsack_beats_greedy_on_value(self):
+        # One large high-priority segment versus two smaller ones worth more together
+        segments = [Segment("doc", 0, 60, 0.9), Segment("doc", 1, 50, 0.6), Segment("doc", 2, 50, 0.6)]
+        greedy = TokenBudget(strategy="greedy").pack(segments, 100)
+        knapsack = TokenBudget(strategy="knapsack").pack(segments, 100)
+        self.assertEqual([s.index for s in greedy.selected], [0])
+        self.assertEqual([s.index for s in knapsack.selected], [1, 2])
+        self.assertLessEqual(knapsack.tokens, 100)
+
+    def test_contiguous_history_keeps_newest_without_gaps(self):
+        history = [Segment("chat_history", i, tokens, 1.0 * 0.9 ** (3 - i), contiguous=True)
+                   for i, tokens in enumerate([5, 5, 30, 5])]
+        for strategy in ("greedy", "knapsack"):
+            result = TokenBudget(strategy=strategy).pack(history, 20)
+            # The oldest two would fit, but not without the 30-token message
+            self.assertEqual([s.index for s in result.selected], [3], strategy)
+
+
+@unittest.skipUnless(HAS_INJECTOR, "context injector dependencies are required")
+class TestContextInjectorBudget(unittest.TestCase):
+    """Test cases for budgeting in ContextInjector."""
+
+    def setUp(self):
+        self.tokenizer = CountingTokenizer()
+        self.injector = ContextInjector(token_counter=TokenCounter(self.tokenizer), context_truncation_limit=20)
+
+    def test_budget_drops_low_priority_context(self):
+        variables = {
+            "input": "what does it cost",
+            "chat_history": [{"role": "user", "content": "hello"}, {"role": "assistant", "content": "hi how can I help"}],
+            "knowledge_context": ["pricing starts at ten dollars", "unrelated " * 20],
+            "user_profile": {"name": "Ann", "notes": "long " * 30},
+        }
+        budgeted = self.injector.budget_context(variables, history_key="sales:s1")
+        self.assertEqual(budgeted["input"], variables["input"])
+        self.assertEqual(budgeted["chat_history"], variables["chat_history"])
+        self.assertEqual(budgeted["knowledge_context"], ["pricing starts at ten dollars"])
+        self.assertIsNone(budgeted["user_profile"])
+
+    def test_budget_keeps_dropped_variables_renderable(self):
+        class Profile:
+            def __init__(self, notes):
+                self.notes = notes
+
+            def __str__(self):
+                return self.notes
+
+        variables = {
+            "input": "hello",
+            "memory_summary": "old " * 30,
+            "user_profile": Profile("long " * 30),
+        }
+        budgeted = self.injector.budget_context(variables)
+        self.assertEqual(budgeted["memory_summary"], "")
+        self.assertIsNone(budgeted["user_profile"])
+
+    def test_truncate_context_fits_budget(self):
+        text = " ".join(f"w{i}" for i in range(100))
+        self.assertEqual(self.injector.truncate_context("short text"), "short text")
+        truncated = self.injector.truncate_context(text)
+        self.assertTrue(truncated.endswith("... [truncated]"))
+        self.assertLessEqual(len(truncated[:-len("... [truncated]")].split()), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests for model lookup through the shared cache in BaseLLMManager.
+"""
+
+import gc
+import unittest
+import weakref
+import sys
+import os
+from unittest import mock
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from src.models.llm.model_cache import ModelCacheEngine
+
+try:
+    import src.models.llm.base_llm_manager as base_llm_manager
+    HAS_MANAGER = True
+except ImportError:
+    HAS_MANAGER = False
+
+
+class Model:
+    """Weak-referenceable stand-in for a loaded model."""
+
+    def __init__(self, path):
+        self.path = path
+
+
+@unittest.skipUnless(HAS_MANAGER, "LLM manager dependencies are required")
+class TestBaseLLMManager(unittest.TestCase):
+    """Test cases for BaseLLMManager model lifecycle."""
+
+    def setUp(self):
+        self.cache = ModelCacheEngine(max_memory_bytes=100, size_estimator=lambda model: 60)
+        config_integration = mock.Mock()
+        config_integration.get_config.return_value = {}
+        for name, value in (("ModelCache", lambda: self.cache), ("AdapterManager", mock.Mock),
+                            ("AdapterRegistry", mock.Mock), ("ConfigIntegration", lambda: config_integration)):
+            patcher = mock.patch.object(base_llm_manager, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch("src.models.llm.model_registry.ModelRegistry")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        class Manager(base_llm_manager.BaseLLMManager):
+            def _load_specific_model(self, model_path):
+                return Model(model_path)
+
+            def prepare_inference_params(self, model_name, **kwargs):
+                return kwargs
+
+        self.manager = Manager("support")
+
+    def test_model_evicted_for_budget_is_collectable(self):
+        model = self.manager.load_model("first", "models/first")
+        evicted = weakref.ref(model)
+        del model
+
+        self.manager.load_model("second", "models/second")
+        gc.collect()
+
+        self.assertIsNone(evicted())
+        self.assertNotIn("first", self.manager.models)
+        self.assertEqual(list(self.manager.models), ["second"])
+        self.assertEqual(self.manager.get_model("first").path, "models/first")
+
+    def test_pinned_model_is_kept_until_released(self):
+        with self.manager.use_model("first") as model:
+            self.manager.load_model("second", "models/second")
+            self.assertIs(self.manager.models["first"], model)
+        self.assertNotIn("second", self.manager.models)
+        self.manager.release_all_models()
+        self.assertEqual(self.manager.model_paths, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
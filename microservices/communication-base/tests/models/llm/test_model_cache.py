@@ -0,0 +1,105 @@
+"""
+Tests for the memory-aware model cache.
+"""
+
+import threading
+import time
+import unittest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from src.models.llm.model_cache import ModelCacheEngine, estimate_model_bytes
+
+
+class TestModelCacheEngine(unittest.TestCase):
+    """Test cases for ModelCacheEngine."""
+
+    def make_cache(self, **kwargs):
+        kwargs.setdefault("max_cache_size", 10)
+        return ModelCacheEngine(**kwargs)
+
+    def test_memory_budget_evicts_lru(self):
+        cache = self.make_cache(max_memory_bytes=100)
+        cache.put("a", "A", size_bytes=40)
+        cache.put("b", "B", size_bytes=40)
+        cache.get("a")
+        cache.put("c", "C", size_bytes=40)
+        self.assertEqual(set(cache.get_stats()["models"]), {"a", "c"})
+        self.assertEqual(cache.resident_bytes, 80)
+
+    def test_lfu_keeps_frequently_used(self):
+        cache = self.make_cache(max_cache_size=2, eviction_policy="lfu")
+        cache.put("hot", "H")
+        cache.put("cold", "C")
+        for _ in range(3):
+            cache.get("hot")
+        cache.get("cold")
+        cache.put("new", "N")
+        self.assertEqual(set(cache.get_stats()["models"]), {"hot", "new"})
+
+    def test_pinned_models_are_not_evicted(self):
+        cache = self.make_cache(max_memory_bytes=100)
+        cache.put("big", "B", size_bytes=80)
+        with cache.use("big") as model:
+            self.assertEqual(model, "B")
+            cache.put("other", "O", size_bytes=50)
+            self.assertIn("big", cache.get_stats()["pinned"])
+            self.assertEqual(cache.get("big"), "B")
+        # Deferred eviction happens once the pin is released ("big" was used last)
+        self.assertEqual(cache.get_stats()["models"], ["big"])
+        self.assertLessEqual(cache.resident_bytes, 100)
+
+    def test_expiration(self):
+        now = [0.0]
+        cache = self.make_cache(expiration_time=10, clock=lambda: now[0])
+        cache.put("a", "A", size_bytes=1)
+        now[0] = 11
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.resident_bytes, 0)
+
+    def test_background_load_is_shared_and_does_not_hold_lock(self):
+        cache = self.make_cache()
+        cache.put("ready", "R", size_bytes=1)
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "M"
+
+        first = cache.load_async("slow", slow_loader, size_bytes=1)
+        second = cache.load_async("slow", slow_loader, size_bytes=1)
+        self.assertTrue(started.wait(5))
+        # Lookups of other models proceed while the load is running
+        self.assertEqual(cache.get("ready"), "R")
+        release.set()
+        self.assertEqual(first.result(5), "M")
+        self.assertEqual(second.result(5), "M")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.get("slow"), "M")
+
+    def test_failed_load_is_not_cached(self):
+        cache = self.make_cache()
+
+        def failing():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_load("bad", failing, timeout=5)
+        self.assertIsNone(cache.get("bad"))
+        self.assertEqual(cache.get_stats()["load_failures"], 1)
+
+    def test_estimate_model_bytes(self):
+        class Array:
+            nbytes = 1000
+
+        self.assertGreaterEqual(estimate_model_bytes({"model": Array(), "tokenizer": Array()}), 2000)
+
+
+if __name__ == "__main__":
+    unittest.main()
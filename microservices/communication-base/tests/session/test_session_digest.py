@@ -0,0 +1,94 @@
+"""
+Tests for the incremental cross-session digest.
+"""
+
+import unittest
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.session.session_digest import CrossSessionDigest, digest_scope
+
+
+def make_session(n, topics=(), questions=(), concerns=(), summary=""):
+    entities = [{"type": "PRODUCT", "value": f"product {n}", "importance": 0.9 if n % 2 else 0.2}]
+    entities += [{"type": "CONCERN", "value": concern} for concern in concerns]
+    return {
+        "session_id": f"s{n}",
+        "timestamp": 1000.0 + n,
+        "summary": summary or f"session {n}",
+        "entities": entities,
+        "topics": [{"name": topic} for topic in topics],
+        "questions": [{"topic": topic} for topic in questions],
+    }
+
+
+class TestCrossSessionDigest(unittest.TestCase):
+    """Test cases for CrossSessionDigest."""
+
+    def test_context_combines_most_recent_sessions(self):
+        sessions = [
+            make_session(1, topics=["pricing", "setup"], concerns=["cost"]),
+            make_session(2, topics=["pricing"], questions=["billing"], concerns=["cost", "speed"]),
+            make_session(3, topics=["support"], questions=["billing", "api"], concerns=["speed"]),
+        ]
+        digest = CrossSessionDigest.from_sessions(sessions, window=5)
+
+        context = digest.to_context(2)
+        self.assertEqual(context["conversation_topics"], ["support", "pricing"])
+        self.assertEqual(context["question_topics"], ["billing", "api"])
+        self.assertEqual(context["frequent_concerns"], ["speed", "cost"])
+        # Newest session first, like the repository history
+        self.assertEqual([e["value"] for e in context["entity_history"]["PRODUCT"]], ["product 3", "product 2"])
+        self.assertEqual(context["session_count"], 3)
+
+        self.assertEqual(digest.to_context(3)["conversation_topics"][0], "pricing")
+        self.assertEqual(digest.to_context(0), {})
+
+        # Callers may add keys to the returned context without affecting the digest
+        context["user_profile"] = {}
+        self.assertNotIn("user_profile", digest.to_context(2))
+        digest.add_session(make_session(4, topics=["api"] * 3))
+        self.assertEqual(digest.to_context(2)["conversation_topics"][0], "api")
+
+    def test_window_bounds_detail_but_not_lifetime_counts(self):
+        digest = CrossSessionDigest(window=3)
+        for n in range(10):
+            digest.add_session(make_session(n, topics=["old" if n < 7 else "new"]))
+
+        self.assertEqual(len(digest.recent), 3)
+        self.assertEqual(digest.session_count, 10)
+        self.assertEqual(digest.to_context(3)["conversation_topics"], ["new"])
+        self.assertEqual(digest.to_context(3)["lifetime_topics"], ["old", "new"])
+        self.assertTrue(digest.covers(3))
+        self.assertFalse(digest.covers(4))
+        self.assertTrue(CrossSessionDigest.from_sessions([make_session(1)], window=3).covers(10))
+
+    def test_last_conversation(self):
+        digest = CrossSessionDigest()
+        self.assertEqual(digest.last_conversation(str), {})
+        digest.add_session(make_session(1, summary="onboarding"))
+        last = digest.last_conversation(lambda timestamp: f"at {timestamp:.0f}")
+        self.assertEqual(last["summary"], "onboarding")
+        self.assertEqual(last["time_ago"], "at 1001")
+        self.assertEqual([e["value"] for e in last["key_entities"]], ["product 1"])
+
+    def test_round_trip(self):
+        digest = CrossSessionDigest.from_sessions(
+            [make_session(n, topics=["t"], concerns=["c"]) for n in range(4)], window=2
+        )
+        restored = CrossSessionDigest.from_dict(digest.to_dict())
+        self.assertEqual(restored.to_dict(), digest.to_dict())
+        self.assertEqual(restored.to_context(2), digest.to_context(2))
+        self.assertIsNone(CrossSessionDigest.from_dict({}))
+        self.assertIsNone(CrossSessionDigest.from_dict({"version": 0}))
+
+    def test_digest_scope(self):
+        self.assertEqual(digest_scope(), "system")
+        self.assertEqual(digest_scope("c1"), "campaign:c1")
+
+
+if __name__ == "__main__":
+    unittest.main()